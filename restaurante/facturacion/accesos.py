@@ -0,0 +1,194 @@
+"""
+Roles y acceso a módulos.
+
+Los grupos y permisos de módulo se crean en una migración de datos
+(0027_grupos_y_permisos), no en las vistas. Los grupos de un usuario se
+resuelven una sola vez por sesión y se guardan como dos mapas de bits
+(grupos y módulos permitidos); ``MiddlewareAccesos`` los deja en
+``request.user`` para que ``verificar_acceso_modulo`` y el filtro
+``has_group`` no consulten la base de datos.
+
+Cuando cambia la pertenencia a grupos (o se edita un usuario o un grupo) se
+incrementa la versión de su etiqueta en la cache (ver cache_modelos.py) y la
+sesión vuelve a resolverse en la siguiente petición. La versión tiene que
+verla cualquier worker, por eso la cache debe ser compartida (CACHE_BACKEND
+``archivo`` o ``redis``, ver settings.py).
+"""
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .cache_modelos import invalidar_al_confirmar, versiones
+from .registro import obtener_logger
+
+logger = obtener_logger('accesos')
+
+CLAVE_SESION = '_accesos'
+ETIQUETA_GLOBAL = 'accesos'
+
+# Grupos por defecto (el orden define el bit de cada uno: no reordenar)
+GRUPOS_POR_DEFECTO = [
+    ('Administrador', 'Tiene acceso completo al sistema'),
+    ('Gerente', 'Gestiona operaciones del restaurante'),
+    ('Cajero', 'Maneja facturación y pagos'),
+    ('Mesero', 'Toma pedidos y atiende mesas'),
+    ('Cocinero', 'Prepara pedidos en cocina'),
+    ('Usuario Normal', 'Acceso a inventario, facturación y pedidos'),
+]
+GRUPOS = [nombre for nombre, _ in GRUPOS_POR_DEFECTO]
+
+PERMISOS_MODULOS = [
+    ('access_inventario', 'Puede acceder al módulo de inventario'),
+    ('access_facturacion', 'Puede acceder al módulo de facturación'),
+    ('access_pedidos', 'Puede acceder al módulo de pedidos'),
+    ('access_gestion_pedidos', 'Puede acceder al módulo de gestión de pedidos'),
+]
+CODIGOS_PERMISOS_MODULOS = [codename for codename, _ in PERMISOS_MODULOS]
+
+# Mapeo de módulos a grupos permitidos (el orden define el bit de cada módulo)
+GRUPOS_POR_MODULO = {
+    # Módulos específicos para Usuario Normal
+    'inventario': ['Usuario Normal', 'Administrador', 'Gerente'],
+    'pedidos': ['Usuario Normal', 'Administrador', 'Gerente', 'Cajero', 'Mesero'],
+    'gestiondepedidos': ['Usuario Normal', 'Administrador', 'Gerente', 'Cocinero'],
+    'facturacion': ['Usuario Normal', 'Administrador', 'Gerente', 'Cajero'],
+    'salida': ['Usuario Normal', 'Administrador', 'Gerente'],
+
+    # Módulos solo para ciertos grupos (no Usuario Normal)
+    'entradadeproductos': ['Administrador', 'Gerente'],
+    'entradadeplatillos': ['Administrador', 'Gerente'],
+    'listadeplatillos': ['Administrador', 'Gerente'],
+    # Solo administradores pueden gestionar usuarios
+    'roles': ['Administrador'],
+}
+MODULOS = list(GRUPOS_POR_MODULO)
+
+
+def _bit(lista, nombre):
+    return 1 << lista.index(nombre) if nombre in lista else 0
+
+
+# Bits de grupos que dan acceso a cada módulo
+MASCARA_MODULO = {
+    modulo: sum(_bit(GRUPOS, grupo) for grupo in grupos)
+    for modulo, grupos in GRUPOS_POR_MODULO.items()
+}
+TODOS_LOS_MODULOS = (1 << len(MODULOS)) - 1
+
+
+class Accesos:
+    """Grupos y módulos permitidos de un usuario, como mapas de bits"""
+
+    __slots__ = ('grupos', 'modulos', 'otros_grupos')
+
+    def __init__(self, grupos=0, modulos=0, otros_grupos=()):
+        self.grupos = grupos
+        self.modulos = modulos
+        # Grupos creados a mano que no están en GRUPOS (poco frecuentes)
+        self.otros_grupos = tuple(otros_grupos)
+
+    @classmethod
+    def de_usuario(cls, user):
+        """Resolver con una sola consulta a los grupos del usuario"""
+        nombres = list(user.groups.values_list('name', flat=True))
+        grupos = sum(_bit(GRUPOS, nombre) for nombre in nombres)
+        if user.is_superuser:
+            modulos = TODOS_LOS_MODULOS
+        else:
+            modulos = sum(
+                _bit(MODULOS, modulo)
+                for modulo, mascara in MASCARA_MODULO.items() if grupos & mascara
+            )
+        return cls(grupos, modulos, [nombre for nombre in nombres if nombre not in GRUPOS])
+
+    def tiene_grupo(self, nombre):
+        if nombre in GRUPOS:
+            return bool(self.grupos & _bit(GRUPOS, nombre))
+        return nombre in self.otros_grupos
+
+    def puede(self, modulo):
+        return bool(self.modulos & _bit(MODULOS, modulo))
+
+    def nombres(self):
+        """Nombres de los grupos del usuario"""
+        return [nombre for nombre in GRUPOS if self.grupos & _bit(GRUPOS, nombre)] + list(self.otros_grupos)
+
+    def a_sesion(self, version):
+        return {'v': version, 'g': self.grupos, 'm': self.modulos, 'x': list(self.otros_grupos)}
+
+
+def _etiqueta_usuario(user_id):
+    return f'accesos_{user_id}'
+
+
+def accesos_de_sesion(request):
+    """
+    Accesos del usuario de la petición. Se leen de la sesión mientras su
+    versión coincida con la de la cache; si no, se resuelven y se guardan.
+    """
+    user = request.user
+    version = versiones([ETIQUETA_GLOBAL, _etiqueta_usuario(user.pk)])
+    guardados = request.session.get(CLAVE_SESION)
+    if guardados and guardados.get('v') == version:
+        return Accesos(guardados['g'], guardados['m'], guardados.get('x', ()))
+
+    accesos = Accesos.de_usuario(user)
+    request.session[CLAVE_SESION] = accesos.a_sesion(version)
+    logger.debug('🔑 Accesos resueltos para %s', user.username)
+    return accesos
+
+
+def accesos_usuario(user):
+    """Accesos ya resueltos para esta petición o, fuera de una petición, desde la base de datos"""
+    accesos = getattr(user, '_accesos', None)
+    if accesos is None:
+        accesos = Accesos.de_usuario(user)
+        user._accesos = accesos
+    return accesos
+
+
+class MiddlewareAccesos:
+    """Deja los accesos de la sesión en ``request.user._accesos``"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            user._accesos = accesos_de_sesion(request)
+        return self.get_response(request)
+
+
+# ==========================================
+# Invalidación
+# ==========================================
+
+def _grupos_cambiados(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        # user.groups.add/remove/clear
+        invalidar_al_confirmar(_etiqueta_usuario(instance.pk))
+    elif pk_set:
+        # group.user_set.add/remove
+        invalidar_al_confirmar(*[_etiqueta_usuario(user_id) for user_id in pk_set])
+    else:
+        # group.user_set.clear(): no se sabe a quién afectó
+        invalidar_al_confirmar(ETIQUETA_GLOBAL)
+
+
+def _usuario_cambiado(sender, instance, **kwargs):
+    invalidar_al_confirmar(_etiqueta_usuario(instance.pk))
+
+
+def _grupo_cambiado(sender, **kwargs):
+    invalidar_al_confirmar(ETIQUETA_GLOBAL)
+
+
+def conectar_senales():
+    """Conectar cambios de usuarios y grupos (se llama desde apps.ready)"""
+    m2m_changed.connect(_grupos_cambiados, sender=User.groups.through, dispatch_uid='accesos_grupos')
+    post_save.connect(_usuario_cambiado, sender=User, dispatch_uid='accesos_usuario_save')
+    post_delete.connect(_usuario_cambiado, sender=User, dispatch_uid='accesos_usuario_delete')
+    post_save.connect(_grupo_cambiado, sender=Group, dispatch_uid='accesos_grupo_save')
+    post_delete.connect(_grupo_cambiado, sender=Group, dispatch_uid='accesos_grupo_delete')
@@ -3,3 +3,27 @@ from django.apps import AppConfig
 
 class FacturacionConfig(AppConfig):
     name = 'facturacion'
+
+    def ready(self):
+        # Invalidación de cache al guardar/borrar (ver cache_modelos.py y accesos.py)
+        from .accesos import conectar_senales as conectar_accesos
+        from .cache_modelos import conectar_senales
+        conectar_senales()
+        conectar_accesos()
+
+        # Índice de búsqueda (ver busqueda.py)
+        from .busqueda import conectar_senales as conectar_busqueda
+        conectar_busqueda()
+
+        # Agregados de visitas de clientes (ver visitas.py)
+        from .visitas import conectar_senales as conectar_visitas
+        conectar_visitas()
+
+        # Historial de precios de platos y productos (ver precios.py)
+        from .precios import conectar_senales as conectar_precios
+        conectar_precios()
+
+        # Consultas por petición para /metrics (ver metricas.py)
+        from django.db.backends.signals import connection_created
+        from .metricas import instalar_contador_sql
+        connection_created.connect(instalar_contador_sql, dispatch_uid='metricas_contador_sql')
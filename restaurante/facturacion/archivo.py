@@ -0,0 +1,311 @@
+"""
+Archivo de datos fríos.
+
+Los pedidos cerrados (completados o cancelados) cuyas facturas también están
+cerradas y que son más antiguos que el horizonte configurado
+(``ARCHIVO_HORIZONTE_DIAS``) se mueven a ``PedidoArchivado`` /
+``FacturaArchivada`` en lotes, cada lote en su propia transacción. Los
+detalles, el historial de estados y las devoluciones viajan embebidos como
+JSON, así las tablas vivas se mantienen pequeñas. Los movimientos de cuentas
+por cobrar se quedan en la tabla viva con su copia de ``numero_factura``; los
+trabajos de la cola de impresión de lo archivado se borran.
+
+Para leer facturas/pedidos sin importar dónde estén se usan las funciones de
+lectura unificada de este módulo (``buscar_factura``, ``facturas_en_rango``,
+``resumen_facturas``...).
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from . import busqueda
+from .models import Factura, FacturaArchivada, MovimientoCuenta, Pedido, PedidoArchivado, TrabajoImpresion
+from .registro import obtener_logger
+
+logger = obtener_logger('archivo')
+
+
+ESTADOS_PEDIDO_CERRADO = ['completado', 'cancelado']
+ESTADOS_FACTURA_CERRADA = ['pagada', 'anulada', 'parcialmente_devuelta', 'totalmente_devuelta']
+
+LOTE_POR_DEFECTO = 500
+
+
+def horizonte_archivo(dias=None):
+    """Fecha límite: todo lo cerrado antes de esta fecha se puede archivar"""
+    if dias is None:
+        dias = getattr(settings, 'ARCHIVO_HORIZONTE_DIAS', 365)
+    return timezone.now() - timedelta(days=int(dias))
+
+
+def pedidos_archivables(limite):
+    """Pedidos cerrados, anteriores al límite y sin facturas abiertas o recientes"""
+    facturas_bloqueantes = Factura.objects.filter(pedido=OuterRef('pk')).filter(
+        ~Q(estado__in=ESTADOS_FACTURA_CERRADA) | Q(fecha_factura__gte=limite)
+    )
+    return Pedido.objects.filter(
+        estado__in=ESTADOS_PEDIDO_CERRADO,
+        fecha_pedido__lt=limite,
+    ).filter(~Exists(facturas_bloqueantes))
+
+
+def _fecha_iso(valor):
+    return valor.isoformat() if valor else None
+
+
+def _pedido_a_archivo(pedido):
+    return PedidoArchivado(
+        id=pedido.id,
+        codigo_pedido=pedido.codigo_pedido,
+        tipo_pedido=pedido.tipo_pedido,
+        mesa_numero=pedido.mesa.numero if pedido.mesa else '',
+        codigo_delivery=pedido.codigo_delivery,
+        nombre_cliente=pedido.nombre_cliente,
+        telefono_cliente=pedido.telefono_cliente,
+        cliente_id=pedido.cliente_id,
+        direccion_entrega=pedido.direccion_entrega,
+        items=pedido.items,
+        items_version=pedido.items_version,
+        subtotal=pedido.subtotal,
+        envio=pedido.envio,
+        total=pedido.total,
+        estado=pedido.estado,
+        fecha_pedido=pedido.fecha_pedido,
+        fecha_entrega=pedido.fecha_entrega,
+        notas=pedido.notas,
+        creado_por_id=pedido.creado_por_id,
+        detalles_items=[
+            {
+                'id_plato': detalle.id_plato,
+                'nombre_plato': detalle.nombre_plato,
+                'cantidad': detalle.cantidad,
+                'precio_unitario': str(detalle.precio_unitario),
+                'subtotal_item': str(detalle.subtotal_item),
+                'tipo_item': detalle.tipo_item,
+                'notas': detalle.notas,
+            }
+            for detalle in pedido.detalles_items.all()
+        ],
+        historial_estados=[
+            {
+                'estado_anterior': cambio.estado_anterior,
+                'estado_nuevo': cambio.estado_nuevo,
+                'usuario_id': cambio.usuario_id,
+                'fecha_cambio': _fecha_iso(cambio.fecha_cambio),
+                'motivo': cambio.motivo,
+            }
+            for cambio in pedido.historial_estados.all()
+        ],
+        created_at=pedido.created_at,
+    )
+
+
+def _factura_a_archivo(factura):
+    return FacturaArchivada(
+        id=factura.id,
+        pedido_id=factura.pedido_id,
+        numero_factura=factura.numero_factura,
+        fecha_factura=factura.fecha_factura,
+        tipo_pedido=factura.tipo_pedido,
+        numero_mesa_codigo=factura.numero_mesa_codigo,
+        nombre_cliente=factura.nombre_cliente,
+        telefono_cliente=factura.telefono_cliente,
+        cliente_id=factura.cliente_id,
+        direccion_entrega=factura.direccion_entrega,
+        metodo_pago=factura.metodo_pago,
+        estado=factura.estado,
+        productos_devueltos=factura.productos_devueltos,
+        cantidades_devueltas=factura.cantidades_devueltas,
+        fecha_devolucion=factura.fecha_devolucion,
+        motivo_anulacion=factura.motivo_anulacion,
+        subtotal=factura.subtotal,
+        iva=factura.iva,
+        envio=factura.envio,
+        descuento=factura.descuento,
+        total=factura.total,
+        items=factura.items,
+        items_version=factura.items_version,
+        notas=factura.notas,
+        impresa=factura.impresa,
+        fecha_impresion=factura.fecha_impresion,
+        creado_por_id=factura.creado_por_id,
+        fecha_creacion=factura.fecha_creacion,
+        devoluciones_archivadas=[
+            {
+                'tipo_devolucion': devolucion.tipo_devolucion,
+                'productos_devueltos': devolucion.productos_devueltos,
+                'monto_devuelto': str(devolucion.monto_devuelto),
+                'motivo': devolucion.motivo,
+                'fecha_devolucion': _fecha_iso(devolucion.fecha_devolucion),
+                'procesado_por_id': devolucion.procesado_por_id,
+            }
+            for devolucion in factura.devoluciones.all()
+        ],
+    )
+
+
+def archivar_lote(ids, limite):
+    """Mover un lote de pedidos (y sus facturas) al archivo en una sola transacción"""
+    with transaction.atomic():
+        # Se vuelve a filtrar dentro de la transacción por si algo cambió
+        pedidos = list(
+            pedidos_archivables(limite)
+            .filter(id__in=ids)
+            .select_for_update(of=('self',))
+            .select_related('mesa')
+            .prefetch_related('detalles_items', 'historial_estados', 'facturas__devoluciones')
+        )
+        if not pedidos:
+            return 0, 0
+
+        pedidos_archivo = [_pedido_a_archivo(pedido) for pedido in pedidos]
+        facturas_archivo = [
+            _factura_a_archivo(factura)
+            for pedido in pedidos
+            for factura in pedido.facturas.all()
+        ]
+
+        PedidoArchivado.objects.bulk_create(pedidos_archivo)
+        FacturaArchivada.objects.bulk_create(facturas_archivo)
+
+        pedidos_ids = [pedido.id for pedido in pedidos]
+        facturas_ids = [factura.id for factura in facturas_archivo]
+
+        # Borrar la factura deja MovimientoCuenta.factura en NULL: el cargo
+        # conserva el número para la cartera y los estados de cuenta
+        MovimientoCuenta.objects.filter(factura_id__in=facturas_ids, numero_factura='').update(
+            numero_factura=Subquery(
+                Factura.objects.filter(id=OuterRef('factura_id')).values('numero_factura')[:1]
+            )
+        )
+        # Un trabajo de impresión sin pedido ni factura no se puede reimprimir ni rastrear
+        TrabajoImpresion.objects.filter(Q(pedido_id__in=pedidos_ids) | Q(factura_id__in=facturas_ids)).delete()
+
+        # El borrado en cascada elimina facturas, devoluciones, detalles e historial
+        Pedido.objects.filter(id__in=pedidos_ids).delete()
+        busqueda.indexar_archivados(pedidos_archivo, facturas_archivo)
+
+    return len(pedidos_archivo), len(facturas_archivo)
+
+
+def archivar(dias=None, lote=LOTE_POR_DEFECTO, maximo=None):
+    """
+    Archivar todo lo que superó el horizonte, lote por lote.
+    Se puede interrumpir y volver a ejecutar: cada lote es independiente.
+    Devuelve (pedidos_archivados, facturas_archivadas).
+    """
+    limite = horizonte_archivo(dias)
+    total_pedidos = total_facturas = 0
+
+    while maximo is None or total_pedidos < maximo:
+        tamano = lote if maximo is None else min(lote, maximo - total_pedidos)
+        ids = list(
+            pedidos_archivables(limite).order_by('id').values_list('id', flat=True)[:tamano]
+        )
+        if not ids:
+            break
+
+        pedidos, facturas = archivar_lote(ids, limite)
+        if not pedidos:
+            break
+        total_pedidos += pedidos
+        total_facturas += facturas
+        logger.info('📦 Lote archivado: %s pedido(s), %s factura(s)', pedidos, facturas)
+
+    return total_pedidos, total_facturas
+
+
+# ==========================================
+# Lectura unificada (tablas vivas + archivo)
+# ==========================================
+
+def buscar_factura(numero_factura):
+    """Buscar una factura por número, primero en la tabla viva y luego en el archivo"""
+    for modelo in (Factura, FacturaArchivada):
+        factura = modelo.objects.filter(numero_factura__iexact=numero_factura).first()
+        if factura:
+            return factura
+    # Número parcial ('42', '202610-42'): solo por número, nunca por cliente o mesa
+    for modelo in (Factura, FacturaArchivada):
+        factura = (modelo.objects.filter(numero_factura__icontains=numero_factura)
+                   .order_by('-fecha_factura').first())
+        if factura:
+            return factura
+    return None
+
+
+def obtener_factura(factura_id):
+    """Obtener una factura por ID sin importar si está archivada"""
+    return (Factura.objects.filter(id=factura_id).first()
+            or FacturaArchivada.objects.filter(id=factura_id).first())
+
+
+def buscar_pedido(codigo_pedido):
+    """Buscar un pedido por código, primero en la tabla viva y luego en el archivo"""
+    return (Pedido.objects.filter(codigo_pedido=codigo_pedido).first()
+            or PedidoArchivado.objects.filter(codigo_pedido=codigo_pedido).first())
+
+
+def _incluye_archivo(inicio):
+    """Solo se consulta el archivo si el rango llega a fechas archivables"""
+    return inicio is None or inicio < horizonte_archivo()
+
+
+def facturas_en_rango(inicio=None, fin=None, **filtros):
+    """
+    Facturas vivas y archivadas entre dos fechas, ordenadas de la más reciente
+    a la más antigua. Los filtros extra deben usar campos comunes a ambas tablas.
+    """
+    rango = {}
+    if inicio:
+        rango['fecha_factura__gte'] = inicio
+    if fin:
+        rango['fecha_factura__lt'] = fin
+
+    facturas = list(Factura.objects.filter(**rango, **filtros))
+    if _incluye_archivo(inicio):
+        facturas += list(FacturaArchivada.objects.filter(**rango, **filtros))
+
+    facturas.sort(key=lambda factura: factura.fecha_factura, reverse=True)
+    return facturas
+
+
+def pedidos_en_rango(inicio=None, fin=None, **filtros):
+    """Pedidos vivos y archivados entre dos fechas"""
+    rango = {}
+    if inicio:
+        rango['fecha_pedido__gte'] = inicio
+    if fin:
+        rango['fecha_pedido__lt'] = fin
+
+    pedidos = list(Pedido.objects.filter(**rango, **filtros))
+    if _incluye_archivo(inicio):
+        pedidos += list(PedidoArchivado.objects.filter(**rango, **filtros))
+
+    pedidos.sort(key=lambda pedido: pedido.fecha_pedido, reverse=True)
+    return pedidos
+
+
+def resumen_facturas(inicio=None, fin=None, **filtros):
+    """Cantidad y total facturado sumando tablas vivas y archivo (con agregados SQL)"""
+    rango = {}
+    if inicio:
+        rango['fecha_factura__gte'] = inicio
+    if fin:
+        rango['fecha_factura__lt'] = fin
+
+    modelos = [Factura, FacturaArchivada] if _incluye_archivo(inicio) else [Factura]
+    cantidad = 0
+    total = Decimal('0.00')
+    for modelo in modelos:
+        datos = modelo.objects.filter(**rango, **filtros).aggregate(
+            cantidad=Count('id'), total=Sum('total')
+        )
+        cantidad += datos['cantidad']
+        total += datos['total'] or Decimal('0.00')
+
+    return {'cantidad': cantidad, 'total': total}
@@ -0,0 +1,116 @@
+"""
+Costo de arrancar un worker: tiempo de importación y memoria.
+
+Cada medición corre en un intérprete nuevo que hace lo mismo que un worker
+de gunicorn antes de su primera petición: ``django.setup()``, la aplicación
+WSGI y las URLs (que importan todas las vistas). Se informa el tiempo, la
+memoria residente máxima (RSS), los módulos más lentos según
+``python -X importtime`` y los módulos de ``MODULOS_DIFERIDOS`` que quedaron
+cargados: esos solo deben importarse al usarse (ReportLab al generar un PDF).
+
+Uso: ``python manage.py medir_arranque --max-segundos 1 --max-rss-mb 80``.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+
+from .registro import obtener_logger
+
+logger = obtener_logger('arranque')
+
+# Paquetes pesados que un worker no debe cargar al arrancar
+MODULOS_DIFERIDOS = ('reportlab', 'PIL')
+
+_SCRIPT = '''
+import json, resource, sys, time
+inicio = time.perf_counter()
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+segundos = time.perf_counter() - inicio
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss //= 1024
+print(json.dumps({
+    'segundos': segundos,
+    'rss_mb': rss / 1024,
+    'modulos': len(sys.modules),
+    'diferidos': sorted({m.split('.')[0] for m in sys.modules} & set(%r)),
+}))
+'''
+
+
+class ErrorArranque(Exception):
+    """El intérprete de medición terminó con error"""
+    pass
+
+
+def _entorno():
+    entorno = dict(os.environ)
+    entorno['DJANGO_SETTINGS_MODULE'] = settings.SETTINGS_MODULE
+    rutas = [str(settings.BASE_DIR)] + [p for p in sys.path if p]
+    entorno['PYTHONPATH'] = os.pathsep.join(dict.fromkeys(rutas))
+    return entorno
+
+
+def _ejecutar(importtime=False):
+    comando = [sys.executable]
+    if importtime:
+        comando += ['-X', 'importtime']
+    comando += ['-c', _SCRIPT % (MODULOS_DIFERIDOS,)]
+    proceso = subprocess.run(comando, capture_output=True, text=True, env=_entorno(),
+                             cwd=str(settings.BASE_DIR))
+    if proceso.returncode != 0:
+        raise ErrorArranque(proceso.stderr.strip().splitlines()[-1] if proceso.stderr else 'sin salida')
+    return json.loads(proceso.stdout.strip().splitlines()[-1]), proceso.stderr
+
+
+def importaciones_lentas(salida_importtime, cantidad=15):
+    """Paquetes de primer nivel con más tiempo acumulado (en ms) según -X importtime"""
+    tiempos = {}
+    for linea in salida_importtime.splitlines():
+        if not linea.startswith('import time:'):
+            continue
+        partes = linea[len('import time:'):].split('|')
+        if len(partes) != 3 or not partes[1].strip().isdigit():
+            continue
+        nombre = partes[2].rstrip()
+        # Solo los de primer nivel: su tiempo acumulado incluye el de sus dependencias
+        if nombre.startswith(' ') and not nombre.startswith('  '):
+            tiempos[nombre.strip()] = tiempos.get(nombre.strip(), 0) + int(partes[1]) / 1000
+    return sorted(tiempos.items(), key=lambda par: par[1], reverse=True)[:cantidad]
+
+
+def medir(repeticiones=3):
+    """Mediana de tiempo y RSS de ``repeticiones`` arranques, más el desglose de importaciones"""
+    muestras = [_ejecutar()[0] for _ in range(repeticiones)]
+    _, salida = _ejecutar(importtime=True)
+    resultado = {
+        'segundos': statistics.median(m['segundos'] for m in muestras),
+        'rss_mb': statistics.median(m['rss_mb'] for m in muestras),
+        'modulos': muestras[-1]['modulos'],
+        'diferidos': muestras[-1]['diferidos'],
+        'lentas': importaciones_lentas(salida),
+    }
+    logger.info('🚀 Arranque: %.2fs, %.1f MB, %d módulos',
+                resultado['segundos'], resultado['rss_mb'], resultado['modulos'])
+    return resultado
+
+
+def verificar(resultado, max_segundos=None, max_rss_mb=None):
+    """Lista de problemas del arranque medido (vacía si cumple los límites)"""
+    problemas = []
+    if resultado['diferidos']:
+        problemas.append(f"Se importan al arrancar: {', '.join(resultado['diferidos'])}")
+    if max_segundos is not None and resultado['segundos'] > max_segundos:
+        problemas.append(f"Arranque de {resultado['segundos']:.2f}s (máximo {max_segundos:g}s)")
+    if max_rss_mb is not None and resultado['rss_mb'] > max_rss_mb:
+        problemas.append(f"RSS de {resultado['rss_mb']:.1f} MB (máximo {max_rss_mb:g} MB)")
+    return problemas
@@ -0,0 +1,378 @@
+"""
+Índice de búsqueda unificado: pedidos, facturas, clientes, productos y platos.
+
+Cada objeto tiene una fila en ``EntradaBusqueda`` con un título, un detalle
+para mostrar y ``claves``: los tokens normalizados de sus campos de búsqueda
+(minúsculas, sin acentos, separados en palabras). Los códigos se indexan
+también sin guiones y los números sin ceros a la izquierda, así
+'FAC-202610-000042' se encuentra con 'fac', '202610', '42' o
+'fac202610000042'. Una consulta encuentra los objetos en los que cada palabra
+es prefijo de algún token.
+
+El índice sobre ``claves`` depende de la base de datos:
+
+- SQLite: tabla virtual FTS5 de contenido externo, mantenida con triggers;
+- MySQL: índice FULLTEXT consultado en modo booleano (``+palabra*``);
+- otra: LIKE sin índice (solo desarrollo).
+
+MySQL no indexa palabras más cortas que ``innodb_ft_min_token_size`` (3) ni
+stopwords; por eso cada token se guarda con el prefijo ``MARCA`` (la mesa
+'5' se indexa como 'qz5' y se busca como 'qz5*') sin tocar la configuración
+del servidor.
+
+Las entradas se mantienen con señales post_save/post_delete
+(``conectar_senales``, desde apps.ready). ``update()`` y ``bulk_create()`` no
+envían señales: después de una carga masiva, ``python manage.py
+reindexar_busqueda``. Los pedidos y facturas archivados conservan su entrada
+(``archivado``), ver archivo.py.
+"""
+import re
+import unicodedata
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+
+from .models import (Cliente, EntradaBusqueda, Factura, FacturaArchivada, Pedido, PedidoArchivado,
+                     Plato, Producto)
+from .registro import obtener_logger
+
+logger = obtener_logger('busqueda')
+
+MARCA = 'qz'
+LARGO_TOKEN = 40
+MAXIMO_PALABRAS = 8
+LIMITE_POR_DEFECTO = 10
+LIMITE_MAXIMO = 50
+
+TABLA = EntradaBusqueda._meta.db_table
+TABLA_FTS = f'{TABLA}_fts'
+
+TIPOS = [tipo for tipo, _ in EntradaBusqueda.TIPO_CHOICES]
+
+_PALABRA = re.compile(r'[a-z0-9]+')
+
+
+class ErrorBusqueda(Exception):
+    """Tipo de búsqueda desconocido"""
+    pass
+
+
+# ==========================================
+# Normalización
+# ==========================================
+
+def normalizar(texto):
+    """Minúsculas y sin acentos"""
+    texto = unicodedata.normalize('NFKD', str(texto))
+    return texto.encode('ascii', 'ignore').decode('ascii').lower()
+
+
+def tokens(*valores):
+    """Tokens de búsqueda de los valores de un objeto (sin repetir)"""
+    resultado = []
+    for valor in valores:
+        if valor in (None, ''):
+            continue
+        for trozo in normalizar(valor).split():
+            partes = _PALABRA.findall(trozo)
+            if len(partes) > 1:
+                # Código completo sin separadores: 'fac202610000042'
+                resultado.append(''.join(partes))
+            for parte in partes:
+                resultado.append(parte)
+                sin_ceros = parte.lstrip('0')
+                if parte.isdigit() and sin_ceros and sin_ceros != parte:
+                    resultado.append(sin_ceros)
+    return list(dict.fromkeys(token[:LARGO_TOKEN] for token in resultado))
+
+
+def palabras_consulta(texto):
+    """Palabras de una consulta; cada una debe ser prefijo de algún token"""
+    palabras = []
+    for parte in _PALABRA.findall(normalizar(texto or '')):
+        if parte.isdigit():
+            parte = parte.lstrip('0') or '0'
+        palabras.append(parte[:LARGO_TOKEN])
+    return list(dict.fromkeys(palabras))[:MAXIMO_PALABRAS]
+
+
+def _claves(lista_tokens):
+    # Empieza con espacio para que el LIKE de respaldo busque ' qz<palabra>'
+    return ''.join(f' {MARCA}{token}' for token in lista_tokens)
+
+
+# ==========================================
+# Documentos por tipo: (título, detalle, valores a indexar)
+# ==========================================
+
+def _relacionado(objeto, campo, columna):
+    """Valor de un objeto relacionado sin cargarlo si no está en memoria"""
+    if campo in objeto._state.fields_cache:
+        relacionado = getattr(objeto, campo)
+        return getattr(relacionado, columna) if relacionado else ''
+    pk = getattr(objeto, f'{campo}_id')
+    if pk is None:
+        return ''
+    modelo = objeto._meta.get_field(campo).related_model
+    return modelo.objects.filter(pk=pk).values_list(columna, flat=True).first() or ''
+
+
+def _documento_pedido(pedido):
+    if hasattr(pedido, 'mesa_numero'):
+        mesa = pedido.mesa_numero or ''  # PedidoArchivado
+    else:
+        mesa = _relacionado(pedido, 'mesa', 'numero')
+    mesa_display = mesa[5:] if mesa.startswith('mesa ') else mesa
+    detalle = [f'Mesa {mesa_display}' if mesa else '', pedido.codigo_delivery,
+               pedido.nombre_cliente, pedido.get_estado_display()]
+    return (
+        pedido.codigo_pedido,
+        ' · '.join(parte for parte in detalle if parte),
+        [pedido.codigo_pedido, pedido.nombre_cliente, pedido.telefono_cliente,
+         pedido.codigo_delivery, mesa],
+    )
+
+
+def _documento_factura(factura):
+    codigo_pedido = _relacionado(factura, 'pedido', 'codigo_pedido')
+    detalle = [factura.nombre_cliente, factura.numero_mesa_codigo,
+               f'RD$ {factura.total:,.2f}', factura.get_estado_display()]
+    return (
+        factura.numero_factura,
+        ' · '.join(parte for parte in detalle if parte),
+        [factura.numero_factura, factura.nombre_cliente, factura.telefono_cliente,
+         factura.numero_mesa_codigo, codigo_pedido],
+    )
+
+
+def _documento_cliente(cliente):
+    return (
+        cliente.nombre_completo,
+        ' · '.join(parte for parte in [cliente.cedula, cliente.telefono_principal] if parte),
+        [cliente.nombre_completo, cliente.cedula, cliente.telefono_principal,
+         cliente.telefono_alternativo],
+    )
+
+
+def _documento_producto(producto):
+    return (
+        producto.nombre,
+        f'{producto.codigo} · {producto.get_categoria_display()}',
+        [producto.nombre, producto.codigo],
+    )
+
+
+def _documento_plato(plato):
+    return (
+        plato.nombre,
+        f'{plato.codigo} · {plato.get_categoria_display()}',
+        [plato.nombre, plato.codigo],
+    )
+
+
+# tipo -> (modelo vivo, modelo archivado, documento, campos que cambian el documento)
+DEFINICIONES = {
+    'pedido': (Pedido, PedidoArchivado, _documento_pedido,
+               {'codigo_pedido', 'nombre_cliente', 'telefono_cliente', 'codigo_delivery', 'mesa',
+                'estado'}),
+    'factura': (Factura, FacturaArchivada, _documento_factura,
+                {'numero_factura', 'nombre_cliente', 'telefono_cliente', 'numero_mesa_codigo',
+                 'pedido', 'total', 'estado'}),
+    'cliente': (Cliente, None, _documento_cliente,
+                {'nombre_completo', 'cedula', 'telefono_principal', 'telefono_alternativo'}),
+    'producto': (Producto, None, _documento_producto, {'nombre', 'codigo', 'categoria'}),
+    'plato': (Plato, None, _documento_plato, {'nombre', 'codigo', 'categoria'}),
+}
+TIPO_DE_MODELO = {definicion[0]: tipo for tipo, definicion in DEFINICIONES.items()}
+
+
+def _entrada(tipo, objeto, archivado=False):
+    titulo, detalle, valores = DEFINICIONES[tipo][2](objeto)
+    return {
+        'titulo': (titulo or '')[:200],
+        'detalle': (detalle or '')[:255],
+        'claves': _claves(tokens(*valores)),
+        'archivado': archivado,
+    }
+
+
+# ==========================================
+# Mantenimiento del índice
+# ==========================================
+
+def indexar(tipo, objeto, archivado=False):
+    """Crear o actualizar la entrada de un objeto"""
+    campos = _entrada(tipo, objeto, archivado)
+    if EntradaBusqueda.objects.filter(tipo=tipo, objeto_id=objeto.pk).update(**campos):
+        return
+    try:
+        with transaction.atomic():
+            EntradaBusqueda.objects.create(tipo=tipo, objeto_id=objeto.pk, **campos)
+    except IntegrityError:
+        # Otra petición la creó al mismo tiempo
+        EntradaBusqueda.objects.filter(tipo=tipo, objeto_id=objeto.pk).update(**campos)
+
+
+def desindexar(tipo, ids):
+    EntradaBusqueda.objects.filter(tipo=tipo, objeto_id__in=list(ids)).delete()
+
+
+def indexar_ids(tipo, ids):
+    """Volver a indexar objetos vivos tocados con ``update()``/``bulk_create()`` (sin señales)"""
+    ids = list(ids)
+    if not ids:
+        return
+    consulta = DEFINICIONES[tipo][0].objects.filter(pk__in=ids)
+    relacion = {'pedido': 'mesa', 'factura': 'pedido'}.get(tipo)
+    if relacion:
+        consulta = consulta.select_related(relacion)
+    entradas = [EntradaBusqueda(tipo=tipo, objeto_id=objeto.pk, **_entrada(tipo, objeto))
+                for objeto in consulta]
+    desindexar(tipo, ids)
+    EntradaBusqueda.objects.bulk_create(entradas)
+
+
+def indexar_archivados(pedidos, facturas):
+    """Entradas de lo que se acaba de mover al archivo (ver archivo.archivar_lote)"""
+    por_id = {pedido.pk: pedido for pedido in pedidos}
+    entradas = [EntradaBusqueda(tipo='pedido', objeto_id=pedido.pk, **_entrada('pedido', pedido, True))
+                for pedido in pedidos]
+    for factura in facturas:
+        if factura.pedido_id in por_id:
+            factura.pedido = por_id[factura.pedido_id]
+        entradas.append(EntradaBusqueda(tipo='factura', objeto_id=factura.pk,
+                                        **_entrada('factura', factura, True)))
+    # El borrado de los vivos ya quitó sus entradas (post_delete); esto cubre un lote repetido
+    desindexar('pedido', por_id)
+    desindexar('factura', [factura.pk for factura in facturas])
+    EntradaBusqueda.objects.bulk_create(entradas)
+
+
+def reconstruir(tipo, modelos, lote=1000):
+    """
+    Borrar y volver a crear las entradas de ``tipo`` a partir de ``modelos``
+    (pares modelo, archivado). Devuelve la cantidad de entradas creadas.
+    """
+    relacion = {'pedido': 'mesa', 'factura': 'pedido'}.get(tipo)
+    total = 0
+    EntradaBusqueda.objects.filter(tipo=tipo).delete()
+    for modelo, archivado in modelos:
+        consulta = modelo.objects.order_by('pk')
+        if relacion and any(campo.name == relacion for campo in modelo._meta.fields):
+            consulta = consulta.select_related(relacion)
+        entradas = []
+        for objeto in consulta.iterator(chunk_size=lote):
+            entradas.append(EntradaBusqueda(tipo=tipo, objeto_id=objeto.pk,
+                                            **_entrada(tipo, objeto, archivado)))
+            if len(entradas) >= lote:
+                EntradaBusqueda.objects.bulk_create(entradas)
+                total += len(entradas)
+                entradas = []
+        EntradaBusqueda.objects.bulk_create(entradas)
+        total += len(entradas)
+    return total
+
+
+def reindexar(tipos=None, lote=1000):
+    """Reconstruir el índice de los tipos indicados; devuelve la cantidad de entradas por tipo"""
+    totales = {}
+    for tipo in tipos or TIPOS:
+        if tipo not in DEFINICIONES:
+            raise ErrorBusqueda(f'Tipo de búsqueda desconocido: {tipo}')
+        vivo, archivado = DEFINICIONES[tipo][:2]
+        modelos = [(vivo, False)] + ([(archivado, True)] if archivado else [])
+        with transaction.atomic():
+            totales[tipo] = reconstruir(tipo, modelos, lote)
+        logger.info('🔎 Índice de %s reconstruido: %s entrada(s)', tipo, totales[tipo])
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('optimize')")
+    return totales
+
+
+def _objeto_guardado(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    tipo = TIPO_DE_MODELO[sender]
+    if update_fields and not set(update_fields) & DEFINICIONES[tipo][3]:
+        return
+    indexar(tipo, instance)
+
+
+def _objeto_eliminado(sender, instance, **kwargs):
+    desindexar(TIPO_DE_MODELO[sender], [instance.pk])
+
+
+def conectar_senales():
+    """Mantener el índice al guardar y eliminar (se llama desde apps.ready)"""
+    for modelo, tipo in TIPO_DE_MODELO.items():
+        post_save.connect(_objeto_guardado, sender=modelo, dispatch_uid=f'busqueda_{tipo}_save')
+        post_delete.connect(_objeto_eliminado, sender=modelo, dispatch_uid=f'busqueda_{tipo}_delete')
+
+
+# ==========================================
+# Consultas
+# ==========================================
+
+def _sql_coincidencias(tipo, palabras, columna):
+    """SELECT de ``columna`` (id o objeto_id) de las entradas que coinciden, y sus parámetros"""
+    vendor = connection.vendor
+    if vendor == 'sqlite':
+        # tipo y palabras solo tienen [a-z0-9]: se pueden citar sin escapar
+        expresion = ' AND '.join(f'claves : "{MARCA}{palabra}" *' for palabra in palabras)
+        if tipo:
+            expresion = f'tipo : {tipo} AND {expresion}'
+        sql = (f'SELECT {columna} FROM {TABLA} WHERE id IN '
+               f'(SELECT rowid FROM {TABLA_FTS} WHERE {TABLA_FTS} MATCH %s)')
+        return sql, [expresion]
+    if vendor == 'mysql':
+        condicion = 'MATCH(claves) AGAINST (%s IN BOOLEAN MODE)'
+        parametros = [' '.join(f'+{MARCA}{palabra}*' for palabra in palabras)]
+    else:
+        condicion = ' AND '.join(['claves LIKE %s'] * len(palabras))
+        parametros = [f'% {MARCA}{palabra}%' for palabra in palabras]
+    if tipo:
+        condicion = f'tipo = %s AND {condicion}'
+        parametros.insert(0, tipo)
+    return f'SELECT {columna} FROM {TABLA} WHERE {condicion}', parametros
+
+
+def filtrar(queryset, tipo, texto):
+    """
+    Filtrar un queryset por el índice (reemplaza los ``icontains`` sobre varias
+    columnas). Sin palabras buscables devuelve el queryset sin cambios.
+    """
+    palabras = palabras_consulta(texto)
+    if not palabras:
+        return queryset
+    sql, parametros = _sql_coincidencias(tipo, palabras, 'objeto_id')
+    return queryset.filter(pk__in=RawSQL(sql, parametros))
+
+
+def buscar(texto, tipo, limite=LIMITE_POR_DEFECTO):
+    """
+    Entradas de ``tipo`` que coinciden con ``texto``, las más recientes primero
+    (autocompletado). Solo lee el índice: no toca las tablas de los objetos.
+    """
+    if tipo not in DEFINICIONES:
+        raise ErrorBusqueda(f'Tipo de búsqueda desconocido: {tipo}')
+    palabras = palabras_consulta(texto)
+    if not palabras:
+        return []
+    limite = max(1, min(int(limite), LIMITE_MAXIMO))
+    sql, parametros = _sql_coincidencias(tipo, palabras, 'id')
+    with connection.cursor() as cursor:
+        cursor.execute(f'{sql} ORDER BY objeto_id DESC LIMIT %s', parametros + [limite])
+        ids = [fila[0] for fila in cursor.fetchall()]
+    entradas = EntradaBusqueda.objects.in_bulk(ids)
+    return [
+        {
+            'tipo': tipo,
+            'id': entradas[id_].objeto_id,
+            'titulo': entradas[id_].titulo,
+            'detalle': entradas[id_].detalle,
+            'archivado': entradas[id_].archivado,
+        }
+        for id_ in ids if id_ in entradas
+    ]
@@ -0,0 +1,250 @@
+"""
+Cache con etiquetas por modelo.
+
+Cada entrada se guarda bajo una clave que incluye la versión actual de las
+etiquetas de las que depende (``producto``, ``plato``, ``pedido``, ``factura``,
+``mesa``, ``cliente``). Cuando un modelo cambia solo se incrementa la versión
+de su etiqueta: las entradas viejas dejan de encontrarse y expiran solas, sin
+recorrer ni borrar claves.
+
+Las versiones suben automáticamente:
+
+- con ``save()`` y ``delete()`` (señales post_save / post_delete);
+- con ``update()``, ``bulk_create()`` y ``bulk_update()`` del queryset, que no
+  envían señales (``ManagerEtiquetado``).
+
+Dentro de una transacción el incremento se hace al confirmarla, así nadie
+guarda en cache datos que todavía pueden revertirse.
+
+Uso::
+
+    @cacheado(Producto)
+    def productos_para_salida(): ...
+
+    @vista_cacheada(Factura)
+    def api_facturas_estadisticas(request): ...
+
+El backend se elige en settings (``CACHE_BACKEND``): memoria local para una
+instalación de un solo proceso, archivo o redis para varios workers de gunicorn.
+Los contadores de aciertos/fallos por etiqueta son por proceso
+(``estadisticas_cache``).
+"""
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+
+from .registro import obtener_logger
+
+logger = obtener_logger('cache')
+
+PREFIJO = 'etq'
+
+# Modelos cuyas escrituras invalidan la cache
+MODELOS_ETIQUETADOS = ('Producto', 'Plato', 'Pedido', 'Factura', 'Mesa', 'Cliente')
+
+_AUSENTE = object()
+_contadores = defaultdict(lambda: {'aciertos': 0, 'fallos': 0})
+_candado = threading.Lock()
+
+
+def _timeout_por_defecto():
+    return getattr(settings, 'CACHE_TIMEOUT', 300)
+
+
+def etiqueta_de(modelo):
+    """Etiqueta de un modelo (clase, instancia o nombre): 'producto', 'factura'..."""
+    if isinstance(modelo, str):
+        return modelo.lower()
+    return modelo._meta.model_name
+
+
+def _clave_version(etiqueta):
+    return f'{PREFIJO}:v:{etiqueta}'
+
+
+def versiones(etiquetas):
+    """Versión actual de cada etiqueta, con una sola lectura a la cache"""
+    claves = [_clave_version(etiqueta) for etiqueta in etiquetas]
+    actuales = cache.get_many(claves)
+    for clave in claves:
+        if clave not in actuales:
+            # Se arranca desde el reloj: si la versión se perdió (expulsión,
+            # reinicio) nunca vuelve a un valor que ya se usó
+            cache.add(clave, time.time_ns(), timeout=None)
+            actuales[clave] = cache.get(clave)
+    return [actuales[clave] for clave in claves]
+
+
+def invalidar(*modelos):
+    """Incrementar la versión de las etiquetas indicadas"""
+    for modelo in modelos:
+        clave = _clave_version(etiqueta_de(modelo))
+        try:
+            cache.incr(clave)
+        except ValueError:
+            cache.set(clave, time.time_ns(), timeout=None)
+    logger.debug('🧹 Cache invalidada: %s', [etiqueta_de(modelo) for modelo in modelos])
+
+
+def invalidar_al_confirmar(*modelos):
+    """Invalidar cuando la transacción actual se confirme (o ya, si no hay transacción)"""
+    transaction.on_commit(lambda: invalidar(*modelos))
+
+
+def clave_cache(nombre, etiquetas, *partes):
+    """Clave de una entrada: nombre + huella de los argumentos + versiones de sus etiquetas"""
+    huella = hashlib.md5(repr(partes).encode('utf-8')).hexdigest()
+    sello = '.'.join(str(version) for version in versiones(etiquetas))
+    return f'{PREFIJO}:{nombre}:{huella}:{sello}'
+
+
+def _contar(etiquetas, resultado):
+    with _candado:
+        for etiqueta in etiquetas:
+            _contadores[etiqueta][resultado] += 1
+
+
+def estadisticas_cache():
+    """Aciertos y fallos por etiqueta en este proceso"""
+    with _candado:
+        return {etiqueta: dict(valores) for etiqueta, valores in _contadores.items()}
+
+
+def obtener_o_generar(nombre, etiquetas, partes, generar, timeout=None):
+    """
+    Valor guardado para ``nombre`` + ``partes`` con las versiones actuales de
+    ``etiquetas``; si no está, se llama a ``generar()`` y se guarda.
+    """
+    clave = clave_cache(nombre, etiquetas, *partes)
+    valor = cache.get(clave, _AUSENTE)
+    if valor is not _AUSENTE:
+        _contar(etiquetas, 'aciertos')
+        return valor
+
+    _contar(etiquetas, 'fallos')
+    valor = generar()
+    cache.set(clave, valor, timeout if timeout is not None else _timeout_por_defecto())
+    return valor
+
+
+def cacheado(*modelos, timeout=None):
+    """
+    Decorador para funciones que devuelven datos (dicts, listas para JSON...).
+    El resultado se guarda por combinación de argumentos y se descarta en
+    cuanto cambia cualquiera de los modelos indicados.
+    """
+    etiquetas = tuple(etiqueta_de(modelo) for modelo in modelos)
+
+    def decorador(funcion):
+        nombre = f'{funcion.__module__}.{funcion.__qualname__}'
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            return obtener_o_generar(
+                nombre, etiquetas, (args, sorted(kwargs.items())),
+                lambda: funcion(*args, **kwargs), timeout=timeout,
+            )
+
+        envoltura.invalidar = lambda: invalidar(*etiquetas)
+        return envoltura
+
+    return decorador
+
+
+def vista_cacheada(*modelos, timeout=None, por_usuario=False):
+    """
+    Decorador para vistas GET que devuelven JSON o fragmentos HTML. Se guarda
+    el contenido de las respuestas 200 por URL completa (y por usuario si
+    ``por_usuario``). No usar en vistas que rinden formularios con token CSRF.
+    """
+    etiquetas = tuple(etiqueta_de(modelo) for modelo in modelos)
+
+    def decorador(vista):
+        nombre = f'{vista.__module__}.{vista.__qualname__}'
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return vista(request, *args, **kwargs)
+
+            partes = [request.get_full_path()]
+            if por_usuario:
+                partes.append(request.user.pk)
+            clave = clave_cache(nombre, etiquetas, *partes)
+
+            guardada = cache.get(clave)
+            if guardada is not None:
+                _contar(etiquetas, 'aciertos')
+                contenido, tipo = guardada
+                respuesta = HttpResponse(contenido, content_type=tipo)
+                respuesta['X-Cache'] = 'HIT'
+                return respuesta
+
+            _contar(etiquetas, 'fallos')
+            respuesta = vista(request, *args, **kwargs)
+            if (respuesta.status_code == 200 and not respuesta.streaming
+                    and not respuesta.cookies):
+                cache.set(
+                    clave,
+                    (respuesta.content, respuesta['Content-Type']),
+                    timeout if timeout is not None else _timeout_por_defecto(),
+                )
+                respuesta['X-Cache'] = 'MISS'
+            return respuesta
+
+        return envoltura
+
+    return decorador
+
+
+# ==========================================
+# Invalidación automática
+# ==========================================
+
+class QuerySetEtiquetado(models.QuerySet):
+    """Queryset que invalida la etiqueta del modelo en escrituras masivas"""
+
+    def update(self, **kwargs):
+        filas = super().update(**kwargs)
+        if filas:
+            invalidar_al_confirmar(self.model)
+        return filas
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        creados = super().bulk_create(objs, *args, **kwargs)
+        if creados:
+            invalidar_al_confirmar(self.model)
+        return creados
+
+    def bulk_update(self, objs, *args, **kwargs):
+        filas = super().bulk_update(objs, *args, **kwargs)
+        if filas:
+            invalidar_al_confirmar(self.model)
+        return filas
+
+
+ManagerEtiquetado = models.Manager.from_queryset(QuerySetEtiquetado)
+
+
+def _al_cambiar(sender, **kwargs):
+    invalidar_al_confirmar(sender)
+
+
+def conectar_senales():
+    """Conectar save/delete de los modelos etiquetados (se llama desde apps.ready)"""
+    from django.apps import apps
+
+    for nombre in MODELOS_ETIQUETADOS:
+        modelo = apps.get_model('facturacion', nombre)
+        post_save.connect(_al_cambiar, sender=modelo, dispatch_uid=f'cache_{nombre}_save')
+        post_delete.connect(_al_cambiar, sender=modelo, dispatch_uid=f'cache_{nombre}_delete')
@@ -0,0 +1,278 @@
+"""
+Turnos de caja (cuadre de caja).
+
+Un cajero abre un turno en una caja (``abrir_turno``). Cada cobro
+(``registrar_pagos``) y cada devolución o anulación (``registrar_devolucion``)
+suma al turno abierto con expresiones F: el turno guarda los totales
+generales y ``TotalTurno`` los desglosa por método de pago y usuario. Nada se
+recalcula a partir de las facturas.
+
+Los abonos de clientes a su cuenta (``registrar_abono_turno``) entran al
+turno aparte de las ventas: no son facturas, pero el efectivo sí está en la
+caja.
+
+Con varias cajas abiertas el movimiento va al turno que abrió el propio
+usuario o a la caja indicada; si no se puede decidir, ``turno_para`` lanza
+``ErrorCaja`` y el cobro se rechaza en lugar de quedar fuera del cuadre.
+
+``cerrar_turno`` congela esos totales en ``TurnoCaja.resumen``; a partir de
+ahí el turno no cambia y el cuadre se imprime solo desde el resumen. Cada
+caja tiene su propio turno, así varias cajas abren y cierran por separado;
+la columna única ``caja_abierta`` (NULL al cerrar) impide abrir dos turnos
+en la misma caja.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from . import metricas
+from .models import Factura, TotalTurno, TurnoCaja
+from .registro import obtener_logger
+
+logger = obtener_logger('caja')
+
+
+class ErrorCaja(Exception):
+    """Operación de turno inválida (caja ocupada, turno cerrado...)"""
+
+
+def turno_abierto(caja):
+    """Turno abierto de una caja, o None"""
+    return TurnoCaja.objects.filter(caja=caja, estado='abierto').first()
+
+
+def turno_para(usuario, caja=None):
+    """
+    Turno en el que se registran los movimientos de un usuario: el de la caja
+    indicada, el que él mismo abrió o, si solo hay una caja abierta, esa.
+    None si no hay ninguna caja abierta; con varias abiertas y ninguna propia
+    lanza ErrorCaja (hay que indicar la caja).
+    """
+    if caja:
+        turno = turno_abierto(caja)
+        if not turno:
+            raise ErrorCaja(f"La caja '{caja}' no tiene un turno abierto")
+        return turno
+    propio = TurnoCaja.objects.filter(estado='abierto', abierto_por=usuario).first()
+    if propio:
+        return propio
+    abiertos = list(TurnoCaja.objects.filter(estado='abierto')[:2])
+    if len(abiertos) > 1:
+        raise ErrorCaja('Hay varias cajas abiertas: indique la caja del movimiento')
+    return abiertos[0] if abiertos else None
+
+
+def abrir_turno(caja, usuario, monto_inicial=Decimal('0.00')):
+    """Abrir un turno en la caja indicada"""
+    try:
+        with transaction.atomic():
+            turno = TurnoCaja.objects.create(
+                caja=caja, caja_abierta=caja, abierto_por=usuario, monto_inicial=monto_inicial
+            )
+    except IntegrityError:
+        raise ErrorCaja(f"La caja '{caja}' ya tiene un turno abierto")
+    logger.info('🔓 Turno %s abierto en caja %s por %s', turno.id, caja, usuario)
+    return turno
+
+
+def _sumar_total(turno_id, metodo_pago, usuario, **incrementos):
+    """Sumar a la fila TotalTurno (turno, método, usuario), creándola si no existe"""
+    total, _ = TotalTurno.objects.get_or_create(
+        turno_id=turno_id, metodo_pago=metodo_pago, usuario=usuario
+    )
+    TotalTurno.objects.filter(pk=total.pk).update(
+        **{campo: F(campo) + valor for campo, valor in incrementos.items()}
+    )
+
+
+def registrar_pagos(facturas_ids, usuario, caja=None):
+    """
+    Sumar facturas recién cobradas (por ID) al turno del usuario. Cada factura se
+    cuenta una sola vez (queda enlazada al turno). Devuelve el turno o None
+    si no hay turno abierto; ErrorCaja si no se sabe en qué turno va o se
+    cerró mientras tanto (el llamador revierte el cobro).
+    """
+    metricas.incrementar('facturas_pagadas', len(facturas_ids))
+    turno = turno_para(usuario, caja)
+    if not turno:
+        logger.debug('Cobro sin turno abierto: %s factura(s)', len(facturas_ids))
+        return None
+
+    with transaction.atomic():
+        # Bloquear las facturas aún no contadas: un segundo registro las verá ya enlazadas
+        nuevas = list(
+            Factura.objects.select_for_update()
+            .filter(id__in=facturas_ids, estado='pagada', turno__isnull=True)
+            .values_list('id', 'metodo_pago', 'total')
+        )
+        if not nuevas:
+            return turno
+
+        totales = [total for _, _, total in nuevas]
+        actualizado = TurnoCaja.objects.filter(id=turno.id, estado='abierto').update(
+            cantidad_facturas=F('cantidad_facturas') + len(nuevas),
+            total_ventas=F('total_ventas') + sum(totales),
+            factura_maxima=Greatest(Coalesce('factura_maxima', Value(max(totales))), Value(max(totales))),
+            factura_minima=Least(Coalesce('factura_minima', Value(min(totales))), Value(min(totales))),
+        )
+        if not actualizado:
+            raise ErrorCaja(f"El turno de la caja '{turno.caja}' se cerró mientras tanto")
+
+        Factura.objects.filter(id__in=[factura_id for factura_id, _, _ in nuevas]).update(turno=turno)
+
+        por_metodo = {}
+        for _, metodo, total in nuevas:
+            cantidad, suma = por_metodo.get(metodo, (0, Decimal('0.00')))
+            por_metodo[metodo] = (cantidad + 1, suma + total)
+        for metodo, (cantidad, suma) in por_metodo.items():
+            _sumar_total(turno.id, metodo, usuario, cantidad_facturas=cantidad, total_ventas=suma)
+
+    return turno
+
+
+def registrar_pago(factura, usuario, caja=None):
+    """Sumar una factura cobrada al turno del usuario"""
+    return registrar_pagos([factura.id], usuario, caja)
+
+
+def registrar_devolucion(factura, monto, usuario, caja=None):
+    """Restar una devolución o anulación en el turno donde ocurre"""
+    if not monto:
+        return None
+    turno = turno_para(usuario, caja)
+    if not turno:
+        return None
+
+    with transaction.atomic():
+        actualizado = TurnoCaja.objects.filter(id=turno.id, estado='abierto').update(
+            cantidad_devoluciones=F('cantidad_devoluciones') + 1,
+            total_devoluciones=F('total_devoluciones') + Decimal(str(monto)),
+        )
+        if not actualizado:
+            raise ErrorCaja(f"El turno de la caja '{turno.caja}' se cerró mientras tanto")
+        _sumar_total(turno.id, factura.metodo_pago, usuario,
+                     cantidad_devoluciones=1, total_devoluciones=Decimal(str(monto)))
+    return turno
+
+
+def registrar_abono_turno(monto, metodo_pago, usuario, caja=None):
+    """Sumar al turno el dinero que un cliente abona a su cuenta"""
+    turno = turno_para(usuario, caja)
+    if not turno:
+        return None
+
+    with transaction.atomic():
+        actualizado = TurnoCaja.objects.filter(id=turno.id, estado='abierto').update(
+            cantidad_abonos=F('cantidad_abonos') + 1,
+            total_abonos=F('total_abonos') + monto,
+        )
+        if not actualizado:
+            raise ErrorCaja(f"El turno de la caja '{turno.caja}' se cerró mientras tanto")
+        _sumar_total(turno.id, metodo_pago, usuario, cantidad_abonos=1, total_abonos=monto)
+    return turno
+
+
+def _dinero(valor):
+    return str(valor if valor is not None else Decimal('0.00'))
+
+
+def cerrar_turno(turno_id, usuario, efectivo_contado=None):
+    """
+    Cerrar el turno y congelar el cuadre en ``resumen``. Después del cierre
+    el turno no admite más movimientos.
+    """
+    with transaction.atomic():
+        turno = TurnoCaja.objects.select_for_update().get(id=turno_id)
+        if turno.estado != 'abierto':
+            raise ErrorCaja(f"El turno {turno_id} ya está cerrado")
+
+        ahora = timezone.now()
+        metodos = dict(Factura.METODO_PAGO_CHOICES)
+        por_metodo = {}
+        por_usuario = {}
+        for total in turno.totales.select_related('usuario'):
+            for clave, grupo in ((total.metodo_pago, por_metodo),
+                                 (total.usuario.username if total.usuario else '-', por_usuario)):
+                fila = grupo.setdefault(clave, {
+                    'facturas': 0, 'ventas': Decimal('0.00'),
+                    'devoluciones': 0, 'devuelto': Decimal('0.00'),
+                    'abonos': 0, 'abonado': Decimal('0.00'),
+                })
+                fila['facturas'] += total.cantidad_facturas
+                fila['ventas'] += total.total_ventas
+                fila['devoluciones'] += total.cantidad_devoluciones
+                fila['devuelto'] += total.total_devoluciones
+                fila['abonos'] += total.cantidad_abonos
+                fila['abonado'] += total.total_abonos
+
+        efectivo = por_metodo.get('efectivo', {})
+        efectivo_esperado = (turno.monto_inicial + efectivo.get('ventas', Decimal('0.00'))
+                             - efectivo.get('devuelto', Decimal('0.00'))
+                             + efectivo.get('abonado', Decimal('0.00')))
+        neto = turno.total_ventas - turno.total_devoluciones
+        promedio = (turno.total_ventas / turno.cantidad_facturas
+                    if turno.cantidad_facturas else Decimal('0.00'))
+
+        resumen = {
+            'caja': turno.caja,
+            'abierto_por': turno.abierto_por.username,
+            'cerrado_por': usuario.username,
+            'fecha_apertura': turno.fecha_apertura.isoformat(),
+            'fecha_cierre': ahora.isoformat(),
+            'monto_inicial': _dinero(turno.monto_inicial),
+            'cantidad_facturas': turno.cantidad_facturas,
+            'total_ventas': _dinero(turno.total_ventas),
+            'cantidad_devoluciones': turno.cantidad_devoluciones,
+            'total_devoluciones': _dinero(turno.total_devoluciones),
+            'cantidad_abonos': turno.cantidad_abonos,
+            'total_abonos': _dinero(turno.total_abonos),
+            'neto': _dinero(neto),
+            'promedio': _dinero(promedio.quantize(Decimal('0.01'))),
+            'factura_maxima': _dinero(turno.factura_maxima),
+            'factura_minima': _dinero(turno.factura_minima),
+            'efectivo_esperado': _dinero(efectivo_esperado),
+            'efectivo_contado': _dinero(efectivo_contado) if efectivo_contado is not None else None,
+            'diferencia': (_dinero(Decimal(str(efectivo_contado)) - efectivo_esperado)
+                           if efectivo_contado is not None else None),
+            'por_metodo': [
+                {'metodo': metodo, 'nombre': metodos.get(metodo, metodo), **_serializar(fila)}
+                for metodo, fila in sorted(por_metodo.items())
+            ],
+            'por_usuario': [
+                {'usuario': nombre, **_serializar(fila)}
+                for nombre, fila in sorted(por_usuario.items())
+            ],
+            'facturas': [
+                {'numero': numero, 'fecha': fecha.isoformat(), 'cliente': cliente, 'total': _dinero(total)}
+                for numero, fecha, cliente, total in turno.facturas.order_by('fecha_factura').values_list(
+                    'numero_factura', 'fecha_factura', 'nombre_cliente', 'total')
+            ],
+        }
+
+        TurnoCaja.objects.filter(id=turno.id, estado='abierto').update(
+            estado='cerrado',
+            caja_abierta=None,
+            fecha_cierre=ahora,
+            cerrado_por=usuario,
+            efectivo_contado=efectivo_contado,
+            resumen=resumen,
+        )
+
+    logger.info('🔒 Turno %s cerrado en caja %s: %s factura(s), neto $%s',
+                turno.id, turno.caja, turno.cantidad_facturas, neto)
+    turno.refresh_from_db()
+    return turno
+
+
+def _serializar(fila):
+    return {
+        'facturas': fila['facturas'],
+        'ventas': _dinero(fila['ventas']),
+        'devoluciones': fila['devoluciones'],
+        'devuelto': _dinero(fila['devuelto']),
+        'abonos': fila['abonos'],
+        'abonado': _dinero(fila['abonado']),
+    }
@@ -0,0 +1,488 @@
+"""
+Prueba de carga de hora pico contra un servidor de desarrollo.
+
+Se simulan tres tipos de sesión concurrentes, cada una con su propia cookie
+de sesión y hablando HTTP con el servidor (``runserver`` o gunicorn):
+
+- tabletas: toman una mesa libre (o un pedido para llevar) y llaman a
+  ``crear_pedido``;
+- pantallas de cocina: refrescan ``gestiondepedidos`` y pasan cada pedido a
+  preparación y a listo con ``cambiar_estado_pedido`` (algunos se cancelan);
+- cajeros: cobran con ``crear_factura`` y a veces devuelven una bebida con
+  ``procesar_devolucion_parcial``.
+
+Las sesiones leen la base de datos directamente solo para encontrar el pedido
+o la factura que acaban de crear; toda escritura pasa por las vistas. Los
+datos de la prueba (bebidas, plato y mesas) se identifican con el prefijo
+``Carga`` y se reinician en cada corrida. Las sesiones entran con un usuario
+desechable (``USUARIO``, marcado en ``last_name``): si existe un usuario con
+ese nombre que no creó la prueba, no se corre; al terminar se desactiva.
+
+Al terminar se informa latencia (p50/p95/p99) y rendimiento por endpoint y se
+verifican los invariantes: stock = inicial - vendido + devuelto, sin números
+de pedido ni de factura duplicados y cada mesa liberada una sola vez.
+"""
+import json
+import queue
+import random
+import secrets
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from decimal import Decimal
+from http.cookiejar import CookieJar
+
+from django.contrib.auth.models import Group, User
+from django.db import connections
+from django.db.models import Count, Max, Sum
+from django.urls import reverse
+
+from .models import DetalleItemPedido, Devolucion, Factura, Mesa, Pedido, Plato, Producto
+from .registro import obtener_logger
+
+logger = obtener_logger('carga')
+
+PREFIJO = 'Carga'
+USUARIO = '__prueba_carga__'
+MARCA_USUARIO = 'Usuario temporal de prueba_carga'
+ESTADOS_ACTIVOS = ['pendiente', 'confirmado', 'preparacion', 'listo', 'entregado']
+
+
+class ErrorCarga(Exception):
+    """La prueba no pudo prepararse o iniciar sesión"""
+
+
+# ==========================================
+# Registro de latencias
+# ==========================================
+
+def percentil(valores, p):
+    """Percentil por rango más cercano (valores ya ordenados)"""
+    if not valores:
+        return 0.0
+    indice = max(int(round(p / 100 * len(valores) + 0.5)) - 1, 0)
+    return valores[min(indice, len(valores) - 1)]
+
+
+class Registro:
+    """Latencias y errores por endpoint, compartido entre hilos"""
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(int)
+        self.mensajes = defaultdict(set)
+        self.eventos = defaultdict(int)
+
+    def anotar(self, endpoint, segundos, estado, cuerpo=b''):
+        with self._candado:
+            self.latencias[endpoint].append(segundos)
+            if estado >= 400:
+                self.errores[endpoint] += 1
+                if len(self.mensajes[endpoint]) < 5:
+                    self.mensajes[endpoint].add(f'{estado}: {cuerpo[:200].decode("utf-8", "replace")}')
+
+    def contar(self, evento):
+        with self._candado:
+            self.eventos[evento] += 1
+
+    def resumen(self, duracion):
+        filas = []
+        for endpoint in sorted(self.latencias):
+            valores = sorted(self.latencias[endpoint])
+            filas.append({
+                'endpoint': endpoint,
+                'peticiones': len(valores),
+                'errores': self.errores[endpoint],
+                'por_segundo': len(valores) / duracion if duracion else 0,
+                'p50': percentil(valores, 50) * 1000,
+                'p95': percentil(valores, 95) * 1000,
+                'p99': percentil(valores, 99) * 1000,
+                'maximo': valores[-1] * 1000,
+            })
+        return filas
+
+
+# ==========================================
+# Sesión HTTP
+# ==========================================
+
+class _SinRedirecciones(urllib.request.HTTPRedirectHandler):
+    """Medir solo la vista llamada, no la página a la que redirige"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class SesionHttp:
+    """Un navegador: cookies propias, token CSRF y latencia por petición"""
+
+    def __init__(self, base, registro, timeout=30):
+        self.base = base.rstrip('/')
+        self.registro = registro
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.abridor = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), _SinRedirecciones,
+        )
+
+    def _cookie(self, nombre):
+        for cookie in self.cookies:
+            if cookie.name == nombre:
+                return cookie.value
+        return ''
+
+    def pedir(self, endpoint, ruta, datos=None, medir=True):
+        """GET (sin ``datos``) o POST de formulario; devuelve (estado, cuerpo)"""
+        url = self.base + ruta
+        cuerpo = urllib.parse.urlencode(datos).encode() if datos is not None else None
+        peticion = urllib.request.Request(url, data=cuerpo, headers={
+            'X-CSRFToken': self._cookie('csrftoken'),
+            'Referer': url,
+        })
+        inicio = time.perf_counter()
+        try:
+            with self.abridor.open(peticion, timeout=self.timeout) as respuesta:
+                estado, contenido = respuesta.status, respuesta.read()
+        except urllib.error.HTTPError as e:
+            estado, contenido = e.code, e.read()
+        except (urllib.error.URLError, OSError) as e:
+            estado, contenido = 599, str(e).encode()
+        if medir:
+            self.registro.anotar(endpoint, time.perf_counter() - inicio, estado, contenido)
+        return estado, contenido
+
+    def iniciar(self, usuario, clave):
+        ruta = reverse('index')
+        self.pedir('login', ruta, medir=False)
+        self.pedir('login', ruta, {
+            'username': usuario, 'password': clave,
+            'csrfmiddlewaretoken': self._cookie('csrftoken'),
+        }, medir=False)
+        if not self._cookie('sessionid'):
+            raise ErrorCarga(f'No se pudo iniciar sesión en {self.base} como {usuario}')
+
+
+# ==========================================
+# Preparación
+# ==========================================
+
+class Prueba:
+    """Estado compartido de una corrida"""
+
+    def __init__(self, base, mesas=10, bebidas=3, stock=500, pausa=0.2,
+                 cancelar=0.05, devolver=0.1, llevar=0.2):
+        self.base = base
+        self.pausa = pausa
+        self.prob_cancelar = cancelar
+        self.prob_devolver = devolver
+        self.prob_llevar = llevar
+        self.stock_inicial = Decimal(stock)
+        self.cantidad_mesas = mesas
+        self.cantidad_bebidas = bebidas
+
+        self.registro = Registro()
+        self.mesas_libres = queue.Queue()
+        self.cola_cocina = queue.Queue()
+        self.cola_caja = queue.Queue()
+        self.parar = threading.Event()
+        self.fin_tabletas = threading.Event()
+        self.fin_cocina = threading.Event()
+        self._secuencia = 0
+        self._candado = threading.Lock()
+
+    def siguiente(self):
+        with self._candado:
+            self._secuencia += 1
+            return self._secuencia
+
+    def preparar(self):
+        """Crear o reiniciar los datos de la prueba y marcar desde dónde se cuenta"""
+        self.clave = secrets.token_urlsafe(16)
+        usuario = User.objects.filter(username=USUARIO).first()
+        if usuario is None:
+            usuario = User(username=USUARIO, first_name=PREFIJO, last_name=MARCA_USUARIO)
+        elif usuario.last_name != MARCA_USUARIO:
+            raise ErrorCarga(f"Ya existe el usuario '{USUARIO}' y no lo creó la prueba de carga")
+        usuario.set_password(self.clave)
+        usuario.is_active = True
+        usuario.save()
+        usuario.groups.add(Group.objects.get(name='Administrador'))
+        self.usuario = usuario
+
+        self.bebidas = []
+        for i in range(1, self.cantidad_bebidas + 1):
+            producto = Producto.objects.filter(nombre=f'{PREFIJO} Bebida {i}', categoria='bebida').first()
+            if producto is None:
+                producto = Producto(nombre=f'{PREFIJO} Bebida {i}', categoria='bebida',
+                                    precio_compra=Decimal('50'), cantidad=self.stock_inicial)
+            producto.cantidad = self.stock_inicial
+            producto.save()
+            self.bebidas.append(producto)
+
+        self.plato, _ = Plato.objects.get_or_create(
+            codigo='CARGA01',
+            defaults={'nombre': f'{PREFIJO} Plato', 'categoria': 'principal', 'precio': Decimal('300')},
+        )
+
+        self.mesas = []
+        for i in range(1, self.cantidad_mesas + 1):
+            mesa, _ = Mesa.objects.get_or_create(numero=f'carga {i:02d}', defaults={'ubicacion': PREFIJO})
+            mesa.estado = 'disponible'
+            mesa.save()
+            self.mesas.append(mesa)
+            self.mesas_libres.put(mesa.id)
+
+        self.base_pedido = Pedido.objects.aggregate(m=Max('id'))['m'] or 0
+        self.base_factura = Factura.objects.aggregate(m=Max('id'))['m'] or 0
+        self.base_devolucion = Devolucion.objects.aggregate(m=Max('id'))['m'] or 0
+
+    def finalizar(self):
+        """Desactivar el usuario de la prueba (queda sin contraseña utilizable)"""
+        usuario = getattr(self, 'usuario', None)
+        if usuario is None:
+            return
+        usuario.is_active = False
+        usuario.set_unusable_password()
+        usuario.save(update_fields=['is_active', 'password'])
+        logger.info('🔒 Usuario %s desactivado', usuario.username)
+
+    def sesion(self):
+        sesion = SesionHttp(self.base, self.registro)
+        sesion.iniciar(USUARIO, self.clave)
+        return sesion
+
+    def esperar(self):
+        if self.pausa:
+            time.sleep(random.uniform(0, self.pausa))
+
+    def carrito(self):
+        bebida = random.choice(self.bebidas)
+        cantidad = random.randint(1, 3)
+        return [
+            {'id': f'bebida_{bebida.id}', 'name': bebida.nombre, 'quantity': cantidad, 'price': 60,
+             'total': 60 * cantidad, 'tipo': 'bebida', 'es_bebida': True, 'categoria': 'bebida',
+             'codigo': bebida.codigo},
+            {'id': f'plato_{self.plato.id}', 'name': self.plato.nombre, 'quantity': 1,
+             'price': float(self.plato.precio), 'total': float(self.plato.precio), 'tipo': 'plato',
+             'categoria': self.plato.categoria},
+        ]
+
+
+# ==========================================
+# Sesiones simuladas
+# ==========================================
+
+def _hilo(funcion):
+    """Cerrar las conexiones a la base de datos del hilo al terminar"""
+    def envoltura(prueba, *args):
+        try:
+            funcion(prueba, *args)
+        except Exception:
+            logger.error('❌ Sesión de carga %s terminó con error', funcion.__name__, exc_info=True)
+            prueba.registro.contar(f'{funcion.__name__}_caida')
+        finally:
+            connections.close_all()
+    envoltura.__name__ = funcion.__name__
+    return envoltura
+
+
+@_hilo
+def tableta(prueba):
+    sesion = prueba.sesion()
+    ruta = reverse('crear_pedido')
+    while not prueba.parar.is_set():
+        items = prueba.carrito()
+        total = sum(item['total'] for item in items)
+        datos = {'cart_items': json.dumps(items), 'subtotal': total, 'envio': 0, 'total': total}
+
+        mesa_id = None
+        if random.random() >= prueba.prob_llevar:
+            try:
+                mesa_id = prueba.mesas_libres.get(timeout=1)
+            except queue.Empty:
+                pass
+        if mesa_id:
+            datos.update(tipo_pedido='mesa', mesa_id=mesa_id)
+        else:
+            codigo = f'CARGA-{prueba.siguiente()}'
+            datos.update(tipo_pedido='llevar', codigo_llevar=codigo)
+
+        sesion.pedir('crear_pedido', ruta, datos)
+
+        pedidos = Pedido.objects.filter(id__gt=prueba.base_pedido, estado='pendiente')
+        if mesa_id:
+            pedido = pedidos.filter(mesa_id=mesa_id).order_by('-id').first()
+        else:
+            pedido = pedidos.filter(codigo_delivery=codigo).order_by('-id').first()
+
+        if pedido is None:
+            # Rechazado (sin stock o error): la mesa no llegó a ocuparse
+            prueba.registro.contar('pedidos_rechazados')
+            if mesa_id:
+                prueba.mesas_libres.put(mesa_id)
+        else:
+            prueba.registro.contar('pedidos_creados')
+            prueba.cola_cocina.put((pedido.id, mesa_id))
+        prueba.esperar()
+
+
+@_hilo
+def cocina(prueba):
+    sesion = prueba.sesion()
+    ruta_lista = reverse('gestiondepedidos')
+    while True:
+        try:
+            pedido_id, mesa_id = prueba.cola_cocina.get(timeout=0.5)
+        except queue.Empty:
+            if prueba.fin_tabletas.is_set():
+                return
+            continue
+
+        sesion.pedir('gestiondepedidos', ruta_lista)
+        ruta = reverse('cambiar_estado_pedido', kwargs={'pedido_id': pedido_id})
+        if random.random() < prueba.prob_cancelar:
+            estado, _ = sesion.pedir('cambiar_estado_pedido', ruta, {'estado': 'cancelado'})
+            prueba.registro.contar('pedidos_cancelados')
+            # La vista libera la mesa al cancelar
+            if mesa_id and estado < 400:
+                prueba.mesas_libres.put(mesa_id)
+            continue
+
+        for nuevo_estado in ('preparacion', 'listo'):
+            sesion.pedir('cambiar_estado_pedido', ruta, {'estado': nuevo_estado})
+            prueba.esperar()
+        prueba.cola_caja.put((pedido_id, mesa_id))
+
+
+@_hilo
+def cajero(prueba):
+    sesion = prueba.sesion()
+    ruta = reverse('crear_factura')
+    ruta_devolucion = reverse('procesar_devolucion_parcial')
+    while True:
+        try:
+            pedido_id, mesa_id = prueba.cola_caja.get(timeout=0.5)
+        except queue.Empty:
+            if prueba.fin_cocina.is_set():
+                return
+            continue
+
+        pedido = Pedido.objects.get(id=pedido_id)
+        items = pedido.get_items_detalle()
+        sesion.pedir('crear_factura', ruta, {
+            'pedido_id': pedido.id, 'subtotal': pedido.subtotal, 'total': pedido.total,
+            'items': json.dumps(items), 'metodo_pago': 'efectivo',
+        })
+
+        factura = Factura.objects.filter(pedido_id=pedido_id, estado='pagada').order_by('-id').first()
+        if factura is None:
+            prueba.registro.contar('cobros_fallidos')
+            continue
+        prueba.registro.contar('facturas_cobradas')
+        if mesa_id:
+            prueba.mesas_libres.put(mesa_id)
+
+        if random.random() < prueba.prob_devolver:
+            bebida = next((item for item in items if item.get('tipo') == 'bebida'), None)
+            if bebida:
+                sesion.pedir('procesar_devolucion_parcial', ruta_devolucion, {
+                    'numero_factura': factura.numero_factura,
+                    'version': factura.version,
+                    'productos_devueltos': json.dumps([
+                        {'nombre': bebida['name'], 'cantidad': 1, 'categoria': 'bebida'},
+                    ]),
+                })
+        prueba.esperar()
+
+
+def correr(prueba, duracion, tabletas=6, cocinas=2, cajeros=2):
+    """Correr las sesiones ``duracion`` segundos y esperar a que se vacíen las colas"""
+    prueba.sesion()  # verificar credenciales antes de lanzar los hilos
+
+    def lanzar(funcion, cantidad):
+        hilos = [threading.Thread(target=funcion, args=(prueba,), name=f'{funcion.__name__}-{i}', daemon=True)
+                 for i in range(cantidad)]
+        for hilo in hilos:
+            hilo.start()
+        return hilos
+
+    inicio = time.perf_counter()
+    hilos_tabletas = lanzar(tableta, tabletas)
+    hilos_cocina = lanzar(cocina, cocinas)
+    hilos_caja = lanzar(cajero, cajeros)
+
+    prueba.parar.wait(duracion)
+    prueba.parar.set()
+    for hilo in hilos_tabletas:
+        hilo.join()
+    prueba.fin_tabletas.set()
+    for hilo in hilos_cocina:
+        hilo.join()
+    prueba.fin_cocina.set()
+    for hilo in hilos_caja:
+        hilo.join()
+    return time.perf_counter() - inicio
+
+
+# ==========================================
+# Invariantes
+# ==========================================
+
+def verificar_invariantes(prueba):
+    """Lista de (nombre, ok, detalle) con los invariantes de la corrida"""
+    resultados = []
+    pedidos = Pedido.objects.filter(id__gt=prueba.base_pedido)
+
+    # 1. Stock = inicial - vendido + devuelto
+    devoluciones = Devolucion.objects.filter(id__gt=prueba.base_devolucion)
+    for bebida in prueba.bebidas:
+        vendido = DetalleItemPedido.objects.filter(
+            pedido__in=pedidos, tipo_item='bebida', id_plato=bebida.id,
+        ).exclude(pedido__estado='cancelado').aggregate(total=Sum('cantidad'))['total'] or 0
+        devuelto = sum(
+            Decimal(str(producto.get('cantidad', 0)))
+            for devolucion in devoluciones
+            for producto in devolucion.productos_devueltos or []
+            if producto.get('nombre') == bebida.nombre
+        )
+        esperado = prueba.stock_inicial - vendido + devuelto
+        actual = Producto.objects.get(id=bebida.id).cantidad
+        resultados.append((
+            f'stock {bebida.nombre}', actual == esperado,
+            f'inicial {prueba.stock_inicial} - vendido {vendido} + devuelto {devuelto} '
+            f'= {esperado}, en base de datos {actual}',
+        ))
+
+    # 2. Sin números duplicados
+    for modelo, campo in ((Pedido, 'codigo_pedido'), (Factura, 'numero_factura')):
+        duplicados = list(
+            modelo.objects.values(campo).annotate(veces=Count('id')).filter(veces__gt=1)
+            .values_list(campo, 'veces')[:10]
+        )
+        resultados.append((
+            f'{campo} únicos', not duplicados,
+            ', '.join(f'{numero} x{veces}' for numero, veces in duplicados) or 'sin duplicados',
+        ))
+
+    # 3. Mesas liberadas una sola vez: un solo cobro por pedido y nada activo al final
+    cobros_dobles = list(
+        Factura.objects.filter(id__gt=prueba.base_factura, estado__in=['pagada', 'parcialmente_devuelta'])
+        .values('pedido_id').annotate(veces=Count('id')).filter(veces__gt=1)
+        .values_list('pedido_id', 'veces')[:10]
+    )
+    resultados.append((
+        'un cobro por pedido', not cobros_dobles,
+        ', '.join(f'pedido {pedido} x{veces}' for pedido, veces in cobros_dobles) or 'sin cobros dobles',
+    ))
+    activos = pedidos.filter(mesa__in=prueba.mesas, estado__in=ESTADOS_ACTIVOS).count()
+    ocupadas = [mesa.numero for mesa in Mesa.objects.filter(id__in=[m.id for m in prueba.mesas])
+                if mesa.estado != 'disponible']
+    resultados.append((
+        'mesas liberadas', not ocupadas and not activos,
+        f'{len(ocupadas)} mesa(s) sin liberar {ocupadas[:10]}, {activos} pedido(s) de mesa activos',
+    ))
+    return resultados
@@ -0,0 +1,375 @@
+"""
+Cuentas por cobrar de clientes.
+
+Cada cliente lleva su saldo en ``Cliente.saldo`` y el detalle en
+``MovimientoCuenta`` (cargos, pagos y ajustes). Las operaciones bloquean solo
+la fila del cliente y actualizan el saldo con expresiones F, así:
+
+- la verificación de crédito en caja lee una sola fila (``credito_cliente``);
+- la antigüedad de saldos (0-30, 31-60, 61-90, 90+ días vencidos) se calcula
+  con ``fecha_vencimiento`` y ``saldo_pendiente`` de los cargos abiertos;
+- los estados de cuenta del mes salen de una sola consulta agrupada.
+
+Un abono es dinero que entra a la caja: se suma al turno abierto
+(``caja.registrar_abono_turno``) en la misma transacción, así el cuadre
+cuenta también lo cobrado a cuenta.
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .caja import registrar_abono_turno
+from .models import Cliente, MovimientoCuenta
+from .registro import obtener_logger
+
+logger = obtener_logger('cuentas')
+
+CERO = Decimal('0.00')
+
+# (clave, días vencidos desde, hasta) — None = sin límite
+RANGOS_ANTIGUEDAD = [
+    ('dias_0_30', None, 30),
+    ('dias_31_60', 31, 60),
+    ('dias_61_90', 61, 90),
+    ('dias_90_mas', 91, None),
+]
+
+
+# Un abono no puede hacerse a crédito
+METODOS_ABONO = ('efectivo', 'tarjeta', 'transferencia')
+
+
+class ErrorCredito(Exception):
+    """Operación de crédito rechazada (límite excedido, cliente inactivo...)"""
+
+
+def credito_cliente(cliente_id):
+    """Límite, saldo y disponible de un cliente con una sola lectura"""
+    datos = Cliente.objects.filter(id=cliente_id).values(
+        'id', 'nombre_completo', 'activo', 'limite_credito', 'dias_credito', 'saldo'
+    ).first()
+    if datos:
+        datos['disponible'] = max(datos['limite_credito'] - datos['saldo'], CERO)
+    return datos
+
+
+def _bloquear_cliente(cliente_id):
+    try:
+        return Cliente.objects.select_for_update().only(
+            'id', 'activo', 'limite_credito', 'dias_credito', 'saldo'
+        ).get(id=cliente_id)
+    except Cliente.DoesNotExist:
+        raise ErrorCredito('Cliente no encontrado')
+
+
+def _mover_saldo(cliente, monto):
+    """Sumar ``monto`` (con signo) al saldo y devolver el saldo resultante"""
+    Cliente.objects.filter(id=cliente.id).update(saldo=F('saldo') + monto)
+    cliente.saldo += monto
+    return cliente.saldo
+
+
+def _aplicar_abono(cliente_id, monto):
+    """Descontar un abono de los cargos abiertos, empezando por el que vence primero"""
+    restante = monto
+    cargos = MovimientoCuenta.objects.select_for_update().filter(
+        cliente_id=cliente_id, saldo_pendiente__gt=0
+    ).order_by('fecha_vencimiento', 'id').only('id', 'saldo_pendiente')
+    for cargo in cargos:
+        if restante <= 0:
+            break
+        aplicado = min(cargo.saldo_pendiente, restante)
+        MovimientoCuenta.objects.filter(id=cargo.id).update(
+            saldo_pendiente=F('saldo_pendiente') - aplicado
+        )
+        restante -= aplicado
+    return restante
+
+
+def registrar_cargo(cliente_id, monto, factura=None, usuario=None, descripcion=''):
+    """Cargar una venta a crédito verificando el límite del cliente"""
+    monto = Decimal(str(monto))
+    if monto <= 0:
+        raise ErrorCredito('El monto del cargo debe ser mayor que cero')
+
+    with transaction.atomic():
+        cliente = _bloquear_cliente(cliente_id)
+        if not cliente.activo:
+            raise ErrorCredito('El cliente está inactivo')
+        if cliente.saldo + monto > cliente.limite_credito:
+            disponible = max(cliente.limite_credito - cliente.saldo, CERO)
+            raise ErrorCredito(f'Límite de crédito excedido. Disponible: ${disponible:,.2f}')
+
+        saldo = _mover_saldo(cliente, monto)
+        movimiento = MovimientoCuenta.objects.create(
+            cliente_id=cliente.id,
+            tipo='cargo',
+            monto=monto,
+            saldo_resultante=saldo,
+            saldo_pendiente=monto,
+            fecha_vencimiento=timezone.localdate() + timedelta(days=cliente.dias_credito),
+            factura=factura,
+            numero_factura=factura.numero_factura if factura else '',
+            descripcion=descripcion or (f'Factura {factura.numero_factura}' if factura else ''),
+            creado_por=usuario,
+        )
+
+    logger.info('💳 Cargo de $%s al cliente %s (saldo $%s)', monto, cliente.id, saldo)
+    return movimiento
+
+
+def registrar_abono(cliente_id, monto, usuario=None, descripcion='', metodo_pago='efectivo', caja=None):
+    """
+    Registrar un abono del cliente; se aplica a los cargos más antiguos y se
+    suma al turno de caja donde se recibe (ErrorCaja si no se sabe cuál)
+    """
+    monto = Decimal(str(monto))
+    if monto <= 0:
+        raise ErrorCredito('El monto del pago debe ser mayor que cero')
+    if metodo_pago not in METODOS_ABONO:
+        raise ErrorCredito(f"Método de pago inválido: '{metodo_pago}'")
+
+    with transaction.atomic():
+        cliente = _bloquear_cliente(cliente_id)
+        if monto > cliente.saldo:
+            raise ErrorCredito(f'El pago excede el saldo pendiente (${cliente.saldo:,.2f})')
+
+        _aplicar_abono(cliente.id, monto)
+        saldo = _mover_saldo(cliente, -monto)
+        movimiento = MovimientoCuenta.objects.create(
+            cliente_id=cliente.id,
+            tipo='pago',
+            monto=-monto,
+            saldo_resultante=saldo,
+            descripcion=descripcion or 'Abono a cuenta',
+            creado_por=usuario,
+        )
+        registrar_abono_turno(monto, metodo_pago, usuario, caja)
+
+    logger.info('💵 Pago de $%s del cliente %s (saldo $%s)', monto, cliente.id, saldo)
+    return movimiento
+
+
+def registrar_ajuste(cliente_id, monto, usuario=None, descripcion=''):
+    """
+    Ajuste manual con signo: positivo aumenta la deuda (vence hoy), negativo
+    la reduce como un abono. No verifica el límite de crédito.
+    """
+    monto = Decimal(str(monto))
+    if not monto:
+        raise ErrorCredito('El monto del ajuste no puede ser cero')
+
+    with transaction.atomic():
+        cliente = _bloquear_cliente(cliente_id)
+        if monto < 0:
+            if -monto > cliente.saldo:
+                raise ErrorCredito(f'El ajuste excede el saldo pendiente (${cliente.saldo:,.2f})')
+            _aplicar_abono(cliente.id, -monto)
+
+        saldo = _mover_saldo(cliente, monto)
+        movimiento = MovimientoCuenta.objects.create(
+            cliente_id=cliente.id,
+            tipo='ajuste',
+            monto=monto,
+            saldo_resultante=saldo,
+            saldo_pendiente=max(monto, CERO),
+            fecha_vencimiento=timezone.localdate() if monto > 0 else None,
+            descripcion=descripcion or 'Ajuste manual',
+            creado_por=usuario,
+        )
+
+    logger.info('✏️ Ajuste de $%s al cliente %s (saldo $%s)', monto, cliente.id, saldo)
+    return movimiento
+
+
+def revertir_cargo_factura(factura, monto, usuario=None, descripcion=''):
+    """
+    Acreditar a la cuenta del cliente lo anulado o devuelto de una factura a
+    crédito (ajuste negativo ligado a la factura). Se descuenta primero de lo
+    pendiente del cargo de esa factura y el resto de los demás cargos
+    abiertos; si el cliente ya lo había pagado, queda saldo a su favor.
+    Nunca revierte más de lo que se cargó por la factura. Devuelve el
+    movimiento, o None si la factura no tiene cargo que revertir.
+    """
+    if factura.metodo_pago != 'credito':
+        return None
+    monto = Decimal(str(monto))
+    if monto <= 0:
+        return None
+
+    with transaction.atomic():
+        cargos = MovimientoCuenta.objects.filter(factura=factura, tipo='cargo')
+        cliente_id = cargos.values_list('cliente_id', flat=True).first()
+        if not cliente_id:
+            return None
+        cliente = _bloquear_cliente(cliente_id)
+
+        movimientos = MovimientoCuenta.objects.filter(factura=factura).aggregate(
+            cargado=_suma_si(Q(tipo='cargo'), 'monto'),
+            revertido=_suma_si(Q(tipo='ajuste', monto__lt=0), 'monto'),
+        )
+        monto = min(monto, movimientos['cargado'] + movimientos['revertido'])
+        if monto <= 0:
+            return None
+
+        restante = monto
+        for cargo in cargos.select_for_update().filter(saldo_pendiente__gt=0).only('id', 'saldo_pendiente'):
+            aplicado = min(cargo.saldo_pendiente, restante)
+            MovimientoCuenta.objects.filter(id=cargo.id).update(saldo_pendiente=F('saldo_pendiente') - aplicado)
+            restante -= aplicado
+        if restante > 0:
+            _aplicar_abono(cliente.id, restante)
+
+        saldo = _mover_saldo(cliente, -monto)
+        movimiento = MovimientoCuenta.objects.create(
+            cliente_id=cliente.id,
+            tipo='ajuste',
+            monto=-monto,
+            saldo_resultante=saldo,
+            factura=factura,
+            numero_factura=factura.numero_factura,
+            descripcion=descripcion or f'Reverso de factura {factura.numero_factura}',
+            creado_por=usuario,
+        )
+
+    logger.info('↩️ Reverso de $%s de la factura %s al cliente %s (saldo $%s)',
+                monto, factura.numero_factura, cliente.id, saldo)
+    return movimiento
+
+
+def _suma_si(condicion, campo):
+    return Coalesce(
+        Sum(Case(When(condicion, then=F(campo)), output_field=DecimalField(max_digits=12, decimal_places=2))),
+        Value(CERO),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def antiguedad_saldos(cliente_id=None, fecha=None):
+    """
+    Antigüedad de saldos por cliente a una fecha: lo pendiente de cada cargo
+    se ubica según los días vencidos (lo que aún no vence cuenta como 0-30).
+    """
+    hoy = fecha or timezone.localdate()
+    rangos = {}
+    for clave, desde, hasta in RANGOS_ANTIGUEDAD:
+        condicion = Q()
+        if desde is not None:
+            condicion &= Q(fecha_vencimiento__lte=hoy - timedelta(days=desde))
+        if hasta is not None:
+            condicion &= Q(fecha_vencimiento__gt=hoy - timedelta(days=hasta + 1))
+        rangos[clave] = _suma_si(condicion, 'saldo_pendiente')
+
+    abiertos = MovimientoCuenta.objects.filter(saldo_pendiente__gt=0)
+    if cliente_id:
+        abiertos = abiertos.filter(cliente_id=cliente_id)
+
+    return list(
+        abiertos.values('cliente_id', 'cliente__nombre_completo', 'cliente__cedula')
+        .annotate(total=Sum('saldo_pendiente'), **rangos)
+        .order_by('cliente__nombre_completo')
+    )
+
+
+def estados_de_cuenta(anio, mes):
+    """
+    Estado de cuenta del mes para todos los clientes con movimientos, con una
+    sola consulta agrupada: saldo inicial, cargos, pagos, ajustes y saldo final.
+    """
+    inicio = timezone.make_aware(datetime(anio, mes, 1))
+    fin = timezone.make_aware(datetime(anio + (mes == 12), mes % 12 + 1, 1))
+    en_mes = Q(fecha__gte=inicio)
+
+    return list(
+        MovimientoCuenta.objects.filter(fecha__lt=fin)
+        .values('cliente_id', 'cliente__nombre_completo', 'cliente__cedula')
+        .annotate(
+            saldo_inicial=_suma_si(Q(fecha__lt=inicio), 'monto'),
+            cargos=_suma_si(en_mes & Q(tipo='cargo'), 'monto'),
+            pagos=_suma_si(en_mes & Q(tipo='pago'), 'monto'),
+            ajustes=_suma_si(en_mes & Q(tipo='ajuste'), 'monto'),
+            saldo_final=Sum('monto'),
+        )
+        .order_by('cliente__nombre_completo')
+    )
+
+
+def _nivel_deuda(dias_vencida):
+    """Nivel de la deuda según el cargo más atrasado: alta (+30 días), media o baja"""
+    if dias_vencida > 30:
+        return 'alta'
+    return 'media' if dias_vencida > 0 else 'baja'
+
+
+def cartera(fecha=None, pagos_por_cliente=10):
+    """
+    Clientes con saldo, cada uno con sus cargos abiertos (lo que vence primero
+    arriba) y sus últimos pagos, para la pantalla de cuentas por cobrar. Son
+    tres consultas sin importar cuántos clientes haya.
+    """
+    hoy = fecha or timezone.localdate()
+    clientes = {}
+    for datos in Cliente.objects.filter(saldo__gt=0).values(
+        'id', 'cedula', 'nombre_completo', 'telefono_principal', 'direccion', 'notas_credito', 'saldo'
+    ).order_by('nombre_completo'):
+        clientes[datos['id']] = {
+            'id': datos['id'],
+            'cedula': datos['cedula'],
+            'nombre_completo': datos['nombre_completo'],
+            'telefono': datos['telefono_principal'] or '',
+            'direccion': datos['direccion'] or '',
+            'notas': datos['notas_credito'] or '',
+            'total_adeudado': datos['saldo'],
+            'deuda_vencida': CERO,
+            'cantidad_facturas': 0,
+            'facturas_vencidas': 0,
+            'facturas': [],
+            'historial_pagos': [],
+        }
+
+    atraso = {}
+    cargos = MovimientoCuenta.objects.filter(cliente_id__in=clientes, saldo_pendiente__gt=0).values(
+        'id', 'cliente_id', 'monto', 'saldo_pendiente', 'fecha', 'fecha_vencimiento', 'descripcion',
+        'numero_factura',
+    ).order_by('fecha_vencimiento', 'id')
+    for cargo in cargos:
+        cliente = clientes[cargo['cliente_id']]
+        vence = cargo['fecha_vencimiento'] or hoy
+        dias = (vence - hoy).days
+        vencida = dias < 0
+        cliente['cantidad_facturas'] += 1
+        if vencida:
+            cliente['facturas_vencidas'] += 1
+            cliente['deuda_vencida'] += cargo['saldo_pendiente']
+        atraso[cargo['cliente_id']] = max(atraso.get(cargo['cliente_id'], 0), -dias)
+        cliente['facturas'].append({
+            'id': cargo['id'],
+            'numero': cargo['numero_factura'] or f"AJ-{cargo['id']}",
+            'fecha_emision': timezone.localtime(cargo['fecha']).date().isoformat(),
+            'fecha_vencimiento': vence.isoformat(),
+            'dias_vencimiento': dias,
+            'vencida': vencida,
+            'monto_total': cargo['monto'],
+            'saldo_pendiente': cargo['saldo_pendiente'],
+            'concepto': cargo['descripcion'],
+        })
+
+    pagos = MovimientoCuenta.objects.filter(cliente_id__in=clientes, tipo='pago').values(
+        'cliente_id', 'fecha', 'monto', 'descripcion'
+    ).order_by('-fecha', '-id')
+    for pago in pagos.iterator():
+        historial = clientes[pago['cliente_id']]['historial_pagos']
+        if len(historial) < pagos_por_cliente:
+            historial.append({
+                'fecha': timezone.localtime(pago['fecha']).date().isoformat(),
+                'monto': -pago['monto'],
+                'metodo': pago['descripcion'] or 'Abono a cuenta',
+            })
+
+    for cliente in clientes.values():
+        cliente['nivel_deuda'] = _nivel_deuda(atraso.get(cliente['id'], 0))
+    return list(clientes.values())
@@ -0,0 +1,326 @@
+"""
+Importación masiva de productos y platos desde CSV.
+
+El archivo se lee como flujo (``csv.DictReader``) y se procesa por lotes:
+cada lote se valida, se resuelve contra lo existente y se escribe con
+``bulk_create``/``bulk_update`` en su propia transacción. Los códigos de las
+filas nuevas se asignan de una vez por lote (``Plato.siguientes_codigos``,
+``Producto.generar_codigos``) en lugar de una consulta por fila. Los códigos y
+nombres existentes se cargan una sola vez al empezar.
+
+Columnas (encabezados sin importar mayúsculas ni acentos; separador ',' o ';'):
+
+- producto: codigo, nombre, categoria, cantidad, precio_compra
+- plato: codigo, nombre, categoria, precio, activo
+
+``codigo`` es opcional. Si existe, se actualiza esa fila; si no viene, se
+busca por nombre; si no se encuentra, se crea. En una actualización las
+celdas vacías conservan el valor actual. Las filas con errores no se
+importan y se informan con su línea; las demás sí. Volver a importar el
+mismo archivo actualiza en lugar de duplicar.
+
+Uso: ``python manage.py importar_catalogo producto proveedores.csv``
+o ``POST importar/<tipo>/`` con el archivo en ``archivo``.
+"""
+import csv
+import unicodedata
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+
+from .busqueda import indexar_ids
+from .models import Plato, Producto
+from .precios import registrar as registrar_precios
+from .registro import obtener_logger
+
+logger = obtener_logger('importacion')
+
+LOTE_POR_DEFECTO = 1000
+MAXIMO_ERRORES = 200
+MAXIMO_DECIMAL = Decimal('99999999.99')
+
+# tipo -> (modelo, columnas obligatorias al crear, columnas opcionales)
+DEFINICIONES = {
+    'producto': (Producto, ('nombre', 'categoria', 'precio_compra'), ('codigo', 'cantidad')),
+    'plato': (Plato, ('nombre', 'categoria', 'precio'), ('codigo', 'activo')),
+}
+
+VERDADEROS = {'1', 'si', 'true', 'verdadero', 'activo', 'x'}
+FALSOS = {'0', 'no', 'false', 'falso', 'inactivo'}
+
+
+class ErrorImportacion(Exception):
+    """Archivo que no se puede importar (tipo, encabezados o codificación)"""
+    pass
+
+
+def _clave(texto):
+    """Minúsculas, sin acentos ni espacios sobrantes (encabezados, categorías y nombres)"""
+    texto = unicodedata.normalize('NFKD', str(texto or '')).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(texto.lower().split())
+
+
+# ==========================================
+# Validación de celdas
+# ==========================================
+
+def _decimal(texto, campo, errores):
+    texto = texto.replace('RD$', '').replace('$', '').replace(' ', '')
+    if ',' in texto and '.' in texto:
+        texto = texto.replace(',', '')  # 1,250.50
+    else:
+        texto = texto.replace(',', '.')  # 1250,50
+    try:
+        valor = Decimal(texto).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        errores.append(f'{campo}: "{texto}" no es un número')
+        return None
+    if valor < 0 or valor > MAXIMO_DECIMAL:
+        errores.append(f'{campo}: {valor} fuera de rango')
+        return None
+    return valor
+
+
+def _categorias(modelo):
+    categorias = {}
+    for codigo, etiqueta in modelo.CATEGORIAS:
+        categorias[_clave(codigo)] = codigo
+        categorias[_clave(etiqueta)] = codigo
+    return categorias
+
+
+def _validar(tipo, fila, categorias, errores):
+    """Valores limpios de las celdas que vinieron con algo (las vacías no se incluyen)"""
+    modelo = DEFINICIONES[tipo][0]
+    datos = {}
+    for campo, valor in fila.items():
+        valor = (valor or '').strip()
+        if not valor:
+            continue
+        if campo == 'codigo':
+            largo = modelo._meta.get_field('codigo').max_length
+            if len(valor) > largo:
+                errores.append(f'codigo: más de {largo} caracteres')
+            datos[campo] = valor.upper()
+        elif campo == 'nombre':
+            if len(valor) > 200:
+                errores.append('nombre: más de 200 caracteres')
+            datos[campo] = valor
+        elif campo == 'categoria':
+            categoria = categorias.get(_clave(valor))
+            if categoria is None:
+                errores.append(f'categoria: "{valor}" no es válida')
+            datos[campo] = categoria
+        elif campo in ('cantidad', 'precio_compra', 'precio'):
+            datos[campo] = _decimal(valor, campo, errores)
+        elif campo == 'activo':
+            if _clave(valor) in VERDADEROS:
+                datos[campo] = True
+            elif _clave(valor) in FALSOS:
+                datos[campo] = False
+            else:
+                errores.append(f'activo: "{valor}" debe ser sí o no')
+    if tipo == 'plato' and datos.get('precio') == 0:
+        errores.append('precio: debe ser mayor a 0')
+    return datos
+
+
+# ==========================================
+# Lectura
+# ==========================================
+
+def _lector(archivo, tipo):
+    """DictReader con los encabezados normalizados; valida que estén las columnas obligatorias"""
+    try:
+        primera = archivo.readline()
+    except UnicodeDecodeError:
+        raise ErrorImportacion("El archivo no está en UTF-8; guárdelo como 'CSV UTF-8'")
+    if not primera.strip():
+        raise ErrorImportacion('El archivo está vacío')
+    separador = ';' if primera.count(';') > primera.count(',') else ','
+    encabezados = [_clave(nombre).replace(' ', '_') for nombre in next(csv.reader([primera], delimiter=separador))]
+
+    _, obligatorias, opcionales = DEFINICIONES[tipo]
+    faltantes = [columna for columna in obligatorias if columna not in encabezados]
+    if faltantes:
+        raise ErrorImportacion(f"Faltan columnas: {', '.join(faltantes)}")
+    conocidas = set(obligatorias) | set(opcionales)
+    ignoradas = [columna for columna in encabezados if columna not in conocidas]
+    if ignoradas:
+        logger.info('📥 Columnas ignoradas: %s', ', '.join(ignoradas))
+    return csv.DictReader(archivo, fieldnames=encabezados, delimiter=separador), conocidas
+
+
+def _lotes(lector, conocidas, lote):
+    """(línea, fila) de a ``lote`` filas; la línea 1 es el encabezado"""
+    filas = []
+    for fila in lector:
+        if not any((valor or '').strip() for valor in fila.values() if isinstance(valor, str)):
+            continue
+        filas.append((lector.line_num + 1, {campo: fila.get(campo) for campo in conocidas if campo in fila}))
+        if len(filas) >= lote:
+            yield filas
+            filas = []
+    if filas:
+        yield filas
+
+
+# ==========================================
+# Escritura
+# ==========================================
+
+def _crear(tipo, filas):
+    """Objetos nuevos con sus códigos asignados de una vez"""
+    modelo = DEFINICIONES[tipo][0]
+    sin_codigo = [datos for datos in filas if not datos.get('codigo')]
+    if tipo == 'plato':
+        ocupados = {datos['codigo'] for datos in filas if datos.get('codigo')}
+        codigos = Plato.siguientes_codigos(len(sin_codigo), ocupados)
+    else:
+        codigos = Producto.generar_codigos([datos['categoria'] for datos in sin_codigo])
+    for datos, codigo in zip(sin_codigo, codigos):
+        datos['codigo'] = codigo
+
+    objetos = []
+    for datos in filas:
+        objeto = modelo(**datos)
+        if tipo == 'producto':
+            # bulk_create no pasa por save()
+            objeto.cantidad = datos.get('cantidad', Decimal('0'))
+            objeto.subtotal = objeto.cantidad * objeto.precio_compra
+        objetos.append(objeto)
+    return objetos
+
+
+def _actualizar(tipo, cambios):
+    """
+    Objetos existentes cuyos valores cambian, y los campos a escribir. Las
+    filas iguales a lo guardado se omiten: reimportar el mismo archivo no
+    escribe nada.
+    """
+    objetos = DEFINICIONES[tipo][0].objects.in_bulk(list(cambios))
+    modificados = []
+    campos = set()
+    for objeto_id, datos in cambios.items():
+        objeto = objetos[objeto_id]
+        distintos = {campo for campo, valor in datos.items()
+                     if campo != 'codigo' and getattr(objeto, campo) != valor}
+        if not distintos:
+            continue
+        for campo in distintos:
+            setattr(objeto, campo, datos[campo])
+        if tipo == 'producto':
+            # bulk_update no pasa por save() ni por auto_now
+            objeto.subtotal = objeto.cantidad * objeto.precio_compra
+            objeto.fecha_actualizacion = timezone.now()
+            distintos |= {'subtotal', 'fecha_actualizacion'}
+        campos |= distintos
+        modificados.append(objeto)
+    return modificados, sorted(campos)
+
+
+def importar(tipo, archivo, lote=LOTE_POR_DEFECTO, simular=False):
+    """
+    Importar ``archivo`` (texto abierto, se lee como flujo) en el catálogo de
+    ``tipo``. Devuelve filas leídas, creadas, actualizadas, sin cambios y los
+    errores por línea (a lo sumo ``MAXIMO_ERRORES``; ``con_errores`` tiene el total).
+    """
+    if tipo not in DEFINICIONES:
+        raise ErrorImportacion(f'Tipo de importación desconocido: {tipo}')
+    modelo, obligatorias, _ = DEFINICIONES[tipo]
+    lector, conocidas = _lector(archivo, tipo)
+    categorias = _categorias(modelo)
+
+    # Lo existente, una sola vez: código -> id y nombre -> id (None si el nombre se repite)
+    por_codigo = {}
+    por_nombre = {}
+    for objeto_id, codigo, nombre in modelo.objects.values_list('id', 'codigo', 'nombre').iterator():
+        por_codigo[codigo.upper()] = objeto_id
+        por_nombre[_clave(nombre)] = None if _clave(nombre) in por_nombre else objeto_id
+
+    resultado = {'filas': 0, 'creados': 0, 'actualizados': 0, 'sin_cambios': 0, 'con_errores': 0,
+                 'errores': []}
+    vistos = {}  # código/nombre/id -> línea donde apareció, para detectar repetidos en el archivo
+
+    def rechazar(linea, errores):
+        resultado['con_errores'] += 1
+        if len(resultado['errores']) < MAXIMO_ERRORES:
+            resultado['errores'].append({'linea': linea, 'errores': errores})
+
+    try:
+        for filas in _lotes(lector, conocidas, lote):
+            nuevos = []
+            cambios = {}
+            for linea, fila in filas:
+                resultado['filas'] += 1
+                errores = []
+                datos = _validar(tipo, fila, categorias, errores)
+
+                codigo = datos.get('codigo')
+                nombre = _clave(datos.get('nombre'))
+                if codigo:
+                    objeto_id = por_codigo.get(codigo)
+                else:
+                    objeto_id = por_nombre.get(nombre)
+                    if nombre in por_nombre and objeto_id is None:
+                        errores.append('nombre repetido en el catálogo: indique el código')
+                if objeto_id is None:
+                    faltantes = [campo for campo in obligatorias if datos.get(campo) is None]
+                    if faltantes and not any(e.startswith(tuple(faltantes)) for e in errores):
+                        errores.append(f"faltan para crear: {', '.join(faltantes)}")
+
+                claves = [('id', objeto_id)] if objeto_id else [('codigo', codigo), ('nombre', nombre)]
+                repetida = next((vistos[c] for c in claves if c[1] and c in vistos), None)
+                if repetida:
+                    errores.append(f'repetido en el archivo (línea {repetida})')
+                if errores:
+                    rechazar(linea, errores)
+                    continue
+                for c in claves:
+                    if c[1]:
+                        vistos[c] = linea
+
+                if objeto_id:
+                    cambios[objeto_id] = datos
+                else:
+                    nuevos.append(datos)
+
+            actualizados, campos = _actualizar(tipo, cambios)
+            resultado['creados'] += len(nuevos)
+            resultado['actualizados'] += len(actualizados)
+            resultado['sin_cambios'] += len(cambios) - len(actualizados)
+            if simular or not (nuevos or actualizados):
+                continue
+
+            with transaction.atomic():
+                creados = _crear(tipo, nuevos)
+                modelo.objects.bulk_create(creados, batch_size=lote)
+                if actualizados:
+                    modelo.objects.bulk_update(actualizados, campos, batch_size=lote)
+
+                # bulk_create no devuelve IDs en MySQL: se buscan por código
+                ids_creados = dict(modelo.objects.filter(
+                    codigo__in=[objeto.codigo for objeto in creados]
+                ).values_list('codigo', 'id'))
+                for objeto in creados:
+                    por_codigo[objeto.codigo.upper()] = ids_creados[objeto.codigo]
+                    clave = _clave(objeto.nombre)
+                    por_nombre[clave] = None if clave in por_nombre else ids_creados[objeto.codigo]
+                    vistos[('id', ids_creados[objeto.codigo])] = vistos.get(('nombre', clave))
+
+                # Sin señales: el índice de búsqueda y el historial de precios se actualizan aquí
+                escritos = list(ids_creados.values()) + [objeto.id for objeto in actualizados]
+                indexar_ids(tipo, escritos)
+                registrar_precios(tipo, modelo.objects.filter(id__in=escritos))
+            logger.info('📥 %s: %s fila(s) leídas, %s creadas, %s actualizadas',
+                        tipo, resultado['filas'], resultado['creados'], resultado['actualizados'])
+    except UnicodeDecodeError:
+        raise ErrorImportacion(
+            f"El archivo no está en UTF-8 (se importaron {resultado['creados']} nuevas y "
+            f"{resultado['actualizados']} actualizadas antes del error); guárdelo como 'CSV UTF-8'"
+        )
+    except csv.Error as e:
+        raise ErrorImportacion(f'CSV inválido cerca de la línea {lector.line_num}: {e}')
+
+    return resultado
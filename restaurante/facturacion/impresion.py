@@ -0,0 +1,364 @@
+"""
+Impresión térmica ESC/POS.
+
+Los tickets de cocina/bar y las facturas se renderizan directamente a bytes
+ESC/POS y se guardan en la cola ``TrabajoImpresion``. Un worker local
+(``python manage.py procesar_cola_impresion``) entrega cada trabajo a su
+impresora (socket de red ``tcp://host:9100`` o dispositivo/archivo
+``/dev/usb/lp0``) y reintenta con espera exponencial si la impresora falla.
+"""
+import socket
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Factura, TrabajoImpresion
+from .registro import obtener_logger
+
+logger = obtener_logger('impresion')
+
+
+# Comandos ESC/POS
+ESC = b'\x1b'
+GS = b'\x1d'
+
+INICIALIZAR = ESC + b'@'
+CODEPAGE_PC850 = ESC + b't\x02'
+ALINEAR_IZQUIERDA = ESC + b'a\x00'
+ALINEAR_CENTRO = ESC + b'a\x01'
+ALINEAR_DERECHA = ESC + b'a\x02'
+NEGRITA_ON = ESC + b'E\x01'
+NEGRITA_OFF = ESC + b'E\x00'
+TAMANO_NORMAL = GS + b'!\x00'
+TAMANO_DOBLE = GS + b'!\x11'
+CORTE_PARCIAL = GS + b'V\x42\x00'
+
+# Papel de 80mm con fuente A
+COLUMNAS = 48
+CODIFICACION = 'cp850'
+
+# Espera entre reintentos: 5s, 10s, 20s, 40s... hasta 5 minutos
+ESPERA_BASE_SEGUNDOS = 5
+ESPERA_MAXIMA_SEGUNDOS = 300
+TIMEOUT_SOCKET = 5
+
+EMPRESA = {
+    'nombre': '402 FASTFOOD',
+    'direccion': 'Av. Principal 30 DE MAYO',
+    'telefono': '849-362-1791',
+}
+
+
+class ErrorImpresora(Exception):
+    """La impresora no pudo recibir el trabajo"""
+
+
+class TicketEscPos:
+    """Constructor de un documento ESC/POS línea por línea"""
+
+    def __init__(self, columnas=COLUMNAS):
+        self.columnas = columnas
+        self.buffer = bytearray(INICIALIZAR + CODEPAGE_PC850)
+
+    def _codificar(self, texto):
+        return str(texto).encode(CODIFICACION, errors='replace')
+
+    def texto(self, texto='', alinear='izquierda', negrita=False, doble=False):
+        self.buffer += {
+            'izquierda': ALINEAR_IZQUIERDA,
+            'centro': ALINEAR_CENTRO,
+            'derecha': ALINEAR_DERECHA,
+        }[alinear]
+        if negrita:
+            self.buffer += NEGRITA_ON
+        if doble:
+            self.buffer += TAMANO_DOBLE
+        self.buffer += self._codificar(texto) + b'\n'
+        if doble:
+            self.buffer += TAMANO_NORMAL
+        if negrita:
+            self.buffer += NEGRITA_OFF
+        return self
+
+    def columnas_lr(self, izquierda, derecha, negrita=False):
+        """Texto a la izquierda y valor alineado a la derecha en la misma línea"""
+        derecha = str(derecha)
+        ancho = self.columnas - len(derecha) - 1
+        izquierda = str(izquierda)[:ancho]
+        return self.texto(f"{izquierda:<{ancho}} {derecha}", negrita=negrita)
+
+    def separador(self, caracter='-'):
+        return self.texto(caracter * self.columnas)
+
+    def avanzar(self, lineas=1):
+        self.buffer += ESC + b'd' + bytes([max(0, min(lineas, 255))])
+        return self
+
+    def cortar(self):
+        self.avanzar(4)
+        self.buffer += CORTE_PARCIAL
+        return self
+
+    def bytes(self):
+        return bytes(self.buffer)
+
+
+def _valor(item, *claves, default=None):
+    """Leer un campo del item aceptando claves en español o inglés"""
+    for clave in claves:
+        if item.get(clave) not in (None, ''):
+            return item[clave]
+    return default
+
+
+def _decimal(valor):
+    try:
+        return Decimal(str(valor))
+    except (InvalidOperation, TypeError, ValueError):
+        return Decimal('0.00')
+
+
+def _es_bebida(item):
+    return (item.get('tipo') == 'bebida' or bool(item.get('es_bebida'))
+            or str(item.get('categoria', '')).lower() == 'bebida')
+
+
+def _codigo_display(pedido):
+    if pedido.tipo_pedido == 'mesa' and pedido.mesa:
+        return f"M{pedido.mesa.numero_display}"
+    return pedido.codigo_delivery or ''
+
+
+def render_ticket_cocina(pedido, items, titulo='COCINA'):
+    """Renderizar el ticket de preparación (cocina o bar) a bytes ESC/POS"""
+    fecha = timezone.localtime(timezone.now()).strftime('%d/%m/%Y %H:%M')
+    ticket = TicketEscPos()
+
+    ticket.texto(titulo, alinear='centro', negrita=True, doble=True)
+    ticket.texto(fecha, alinear='centro')
+    ticket.separador('=')
+    ticket.texto(f"PEDIDO {pedido.codigo_pedido}", alinear='centro', negrita=True)
+
+    if pedido.tipo_pedido == 'mesa':
+        ticket.texto(f"MESA {_codigo_display(pedido)}", alinear='centro', doble=True)
+    elif pedido.tipo_pedido == 'delivery':
+        ticket.texto(f"DELIVERY {_codigo_display(pedido)}", alinear='centro', doble=True)
+    else:
+        ticket.texto(f"PARA LLEVAR {_codigo_display(pedido)}", alinear='centro', doble=True)
+
+    if pedido.nombre_cliente:
+        ticket.texto(f"Cliente: {pedido.nombre_cliente}")
+    ticket.separador()
+
+    total_items = 0
+    for item in items:
+        cantidad = int(_decimal(_valor(item, 'quantity', 'cantidad', default=1)))
+        nombre = _valor(item, 'name', 'nombre', default='Sin nombre')
+        total_items += cantidad
+        ticket.texto(f"{cantidad}x {nombre}", negrita=True)
+        notas = _valor(item, 'notas', 'notes')
+        if notas:
+            ticket.texto(f"   * {notas}")
+
+    ticket.separador()
+    ticket.columnas_lr('TOTAL ITEMS:', total_items, negrita=True)
+    ticket.texto(
+        f"Hora: {timezone.localtime(timezone.now()).strftime('%H:%M:%S')}",
+        alinear='centro'
+    )
+    return ticket.cortar().bytes()
+
+
+def render_factura(factura):
+    """Renderizar la factura térmica de caja a bytes ESC/POS"""
+    fecha = timezone.localtime(factura.fecha_factura or timezone.now())
+    ticket = TicketEscPos()
+
+    ticket.texto(EMPRESA['nombre'], alinear='centro', negrita=True, doble=True)
+    ticket.texto(EMPRESA['direccion'], alinear='centro')
+    ticket.texto(f"Tel: {EMPRESA['telefono']}", alinear='centro')
+    ticket.separador('=')
+    ticket.columnas_lr('Factura:', factura.numero_factura, negrita=True)
+    ticket.columnas_lr('Fecha:', fecha.strftime('%d/%m/%Y %I:%M %p'))
+    ticket.columnas_lr('Pedido:', factura.pedido.codigo_pedido)
+    ticket.columnas_lr('Tipo:', factura.pedido.get_tipo_pedido_display())
+    if factura.numero_mesa_codigo:
+        ticket.columnas_lr('Mesa/Código:', factura.numero_mesa_codigo)
+    ticket.columnas_lr('Estado:', factura.get_estado_display())
+    ticket.columnas_lr('Método de pago:', factura.get_metodo_pago_display())
+
+    if factura.nombre_cliente:
+        ticket.separador()
+        ticket.texto(f"Cliente: {factura.nombre_cliente}")
+        if factura.telefono_cliente:
+            ticket.texto(f"Tel: {factura.telefono_cliente}")
+        if factura.direccion_entrega:
+            ticket.texto(f"Dir: {factura.direccion_entrega}")
+
+    ticket.separador()
+    ticket.columnas_lr('DESCRIPCIÓN', 'TOTAL', negrita=True)
+    for item in factura.items or []:
+        cantidad = _decimal(_valor(item, 'quantity', 'cantidad', default=1))
+        precio = _decimal(_valor(item, 'price', 'precio', default=0))
+        total = _decimal(_valor(item, 'total', 'subtotal', default=0)) or cantidad * precio
+        nombre = _valor(item, 'name', 'nombre', default='Sin nombre')
+        ticket.columnas_lr(f"{int(cantidad)}x {nombre}", f"${total:,.2f}")
+
+    ticket.separador()
+    ticket.columnas_lr('Subtotal:', f"${factura.subtotal:,.2f}")
+    if factura.iva:
+        ticket.columnas_lr('ITBIS:', f"${factura.iva:,.2f}")
+    if factura.envio:
+        ticket.columnas_lr('Envío:', f"${factura.envio:,.2f}")
+    if factura.descuento:
+        ticket.columnas_lr('Descuento:', f"-${factura.descuento:,.2f}")
+    ticket.columnas_lr('TOTAL:', f"${factura.total:,.2f}", negrita=True)
+
+    if factura.notas:
+        ticket.separador()
+        ticket.texto(f"Notas: {factura.notas}")
+
+    ticket.separador('=')
+    if factura.creado_por:
+        ticket.texto(f"Atendido por: {factura.creado_por.get_full_name() or factura.creado_por.username}",
+                     alinear='centro')
+    ticket.texto('¡Gracias por su compra!', alinear='centro', negrita=True)
+    return ticket.cortar().bytes()
+
+
+def destino_impresora(impresora):
+    """Destino configurado para una impresora ('' si no está configurada)"""
+    return getattr(settings, 'IMPRESORAS_ESCPOS', {}).get(impresora, '') or ''
+
+
+def encolar(impresora, documento, datos, pedido=None, factura=None):
+    """Guardar un trabajo en la cola de la impresora indicada"""
+    if not destino_impresora(impresora):
+        return None
+    return TrabajoImpresion.objects.create(
+        impresora=impresora,
+        documento=documento,
+        datos=datos,
+        pedido=pedido,
+        factura=factura,
+    )
+
+
+def encolar_ticket_pedido(pedido, items):
+    """Enviar los platos a la cocina y las bebidas al bar"""
+    platos = [item for item in items if not _es_bebida(item)]
+    bebidas = [item for item in items if _es_bebida(item)]
+    # Sin impresora de bar configurada, las bebidas salen en la cocina
+    impresora_bebidas = 'bar' if destino_impresora('bar') else 'cocina'
+    trabajos = []
+
+    # Solo se arma el ticket si hay una impresora que lo reciba
+    if platos and destino_impresora('cocina'):
+        trabajos.append(encolar('cocina', 'ticket_cocina',
+                                render_ticket_cocina(pedido, platos, 'COCINA'), pedido=pedido))
+    if bebidas and destino_impresora(impresora_bebidas):
+        trabajos.append(encolar(impresora_bebidas, 'ticket_bar',
+                                render_ticket_cocina(pedido, bebidas, 'BAR'), pedido=pedido))
+
+    return [trabajo for trabajo in trabajos if trabajo]
+
+
+def encolar_factura(factura):
+    """Enviar la factura a la impresora de caja (si hay una configurada)"""
+    if not destino_impresora('caja'):
+        return None
+    return encolar('caja', 'factura', render_factura(factura),
+                   pedido=factura.pedido, factura=factura)
+
+
+def enviar(destino, datos):
+    """Entregar los bytes a la impresora: tcp://host:puerto o ruta de dispositivo/archivo"""
+    try:
+        if destino.startswith('tcp://'):
+            direccion = destino[len('tcp://'):]
+            host, _, puerto = direccion.partition(':')
+            with socket.create_connection((host, int(puerto or 9100)), timeout=TIMEOUT_SOCKET) as conexion:
+                conexion.sendall(datos)
+        else:
+            ruta = destino[len('file://'):] if destino.startswith('file://') else destino
+            with open(ruta, 'ab') as dispositivo:
+                dispositivo.write(datos)
+    except (OSError, ValueError) as e:
+        raise ErrorImpresora(str(e)) from e
+
+
+def _reclamar(trabajo_id):
+    """Marcar el trabajo como 'enviando' solo si nadie más lo tomó"""
+    return TrabajoImpresion.objects.filter(
+        id=trabajo_id, estado='pendiente'
+    ).update(estado='enviando', proximo_intento=timezone.now()) == 1
+
+
+def procesar_cola(impresora=None, limite=50):
+    """
+    Entregar los trabajos pendientes cuyo próximo intento ya venció.
+    Devuelve (impresos, fallidos).
+    """
+    ahora = timezone.now()
+    pendientes = TrabajoImpresion.objects.filter(
+        estado='pendiente', proximo_intento__lte=ahora
+    )
+    if impresora:
+        pendientes = pendientes.filter(impresora=impresora)
+
+    impresos = fallidos = 0
+    for trabajo in pendientes.order_by('fecha_creacion')[:limite]:
+        if not _reclamar(trabajo.id):
+            continue
+
+        destino = destino_impresora(trabajo.impresora)
+        try:
+            if not destino:
+                raise ErrorImpresora(f"Impresora '{trabajo.impresora}' sin destino configurado")
+            enviar(destino, bytes(trabajo.datos))
+        except ErrorImpresora as e:
+            intentos = trabajo.intentos + 1
+            espera = min(ESPERA_BASE_SEGUNDOS * 2 ** (intentos - 1), ESPERA_MAXIMA_SEGUNDOS)
+            TrabajoImpresion.objects.filter(id=trabajo.id).update(
+                estado='error' if intentos >= trabajo.max_intentos else 'pendiente',
+                intentos=intentos,
+                ultimo_error=str(e),
+                proximo_intento=timezone.now() + timedelta(seconds=espera),
+            )
+            fallidos += 1
+            logger.warning('⚠️ Trabajo de impresión %s (%s) falló: %s', trabajo.id, trabajo.impresora, e)
+            continue
+
+        momento = timezone.now()
+        with transaction.atomic():
+            TrabajoImpresion.objects.filter(id=trabajo.id).update(
+                estado='impreso',
+                intentos=trabajo.intentos + 1,
+                fecha_impresion=momento,
+            )
+            if trabajo.factura_id:
+                Factura.objects.filter(id=trabajo.factura_id).update(
+                    impresa=True, fecha_impresion=momento
+                )
+        impresos += 1
+
+    return impresos, fallidos
+
+
+def reintentar_fallidos(impresora=None):
+    """Devolver a la cola los trabajos en error (p. ej. tras cambiar el papel)"""
+    trabajos = TrabajoImpresion.objects.filter(estado='error')
+    if impresora:
+        trabajos = trabajos.filter(impresora=impresora)
+    return trabajos.update(estado='pendiente', intentos=0, proximo_intento=timezone.now())
+
+
+def recuperar_huerfanos(minutos=5):
+    """Liberar trabajos que quedaron en 'enviando' porque el worker murió"""
+    limite = timezone.now() - timedelta(minutes=minutos)
+    return TrabajoImpresion.objects.filter(
+        estado='enviando', proximo_intento__lte=limite
+    ).update(estado='pendiente')
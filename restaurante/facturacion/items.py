@@ -0,0 +1,267 @@
+"""
+Esquema canónico de items (versión 2) para ``Pedido.items`` y ``Factura.items``.
+
+Cada item se guarda con un único juego de claves::
+
+    {
+        "id": "bebida_5",          # ID original del carrito (plato_3, bebida_5, 12...)
+        "codigo": "PROD-BEB-...",   # '' si no se conoce
+        "name": "Coca Cola",
+        "quantity": 2,
+        "price": 50.0,
+        "total": 100.0,
+        "tipo": "bebida",          # 'plato' o 'bebida'
+        "categoria": "bebida",     # categoría del producto ('otro' si no se conoce)
+    }
+
+más cualquier clave extra del carrito (prepTime, notas, es_bebida...). Se usan las
+claves del carrito porque son las que leen las pantallas de pedidos.
+
+``canonicalizar_items`` convierte cualquier forma histórica (nombre/name,
+cantidad/quantity/qty, precio/price/unit_price, ``{"items": [...]}``, cadenas
+con comillas simples...) y se ejecuta al guardar. Las filas marcadas con
+``items_version == ITEMS_VERSION`` se leen sin ninguna reparación.
+"""
+import json
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .registro import obtener_logger
+
+logger = obtener_logger('items')
+
+ITEMS_VERSION = 2
+
+# Claves alternativas que se absorben en las canónicas
+ALIAS_NOMBRE = ('name', 'nombre', 'producto', 'product', 'nombre_plato')
+ALIAS_CANTIDAD = ('quantity', 'cantidad', 'qty')
+ALIAS_PRECIO = ('price', 'precio', 'unit_price', 'precio_unitario')
+ALIAS_TOTAL = ('total', 'subtotal', 'subtotal_item')
+ALIAS_CATEGORIA = ('categoria', 'category', 'categ')
+ALIAS_CODIGO = ('codigo', 'code')
+ALIAS_ID = ('id', 'producto_id', 'product_id')
+
+CLAVES_ABSORBIDAS = set(
+    ALIAS_NOMBRE + ALIAS_CANTIDAD + ALIAS_PRECIO + ALIAS_TOTAL +
+    ALIAS_CATEGORIA + ALIAS_CODIGO + ALIAS_ID
+)
+CLAVES_CANONICAS = {'id', 'codigo', 'name', 'quantity', 'price', 'total', 'tipo', 'categoria'}
+
+
+def parsear_items(items_raw):
+    """Convertir cualquier forma histórica del campo items en una lista de dicts"""
+    if not items_raw:
+        return []
+
+    items = items_raw
+    if isinstance(items, str):
+        texto = items.strip()
+        if not texto:
+            return []
+        try:
+            items = json.loads(texto)
+        except json.JSONDecodeError:
+            # JSON guardado con comillas simples
+            try:
+                if texto.startswith("'") and texto.endswith("'"):
+                    texto = texto[1:-1]
+                items = json.loads(texto.replace("'", '"'))
+            except json.JSONDecodeError as e:
+                logger.warning('⚠️ No se pudo reparar el JSON de items: %s', e)
+                return []
+
+    if isinstance(items, dict):
+        if 'items' in items:
+            items = items['items']
+        elif 'productos' in items:
+            items = items['productos']
+        else:
+            items = [items]
+
+    if not isinstance(items, list):
+        items = [items] if items else []
+
+    return [item for item in items if isinstance(item, dict)]
+
+
+def _primero(item, claves, default=None):
+    for clave in claves:
+        valor = item.get(clave)
+        if valor not in (None, ''):
+            return valor
+    return default
+
+
+def _numero(valor, default):
+    try:
+        numero = float(str(valor))
+    except (TypeError, ValueError):
+        return default
+    return int(numero) if numero.is_integer() else numero
+
+
+def _id_producto(item_id):
+    """ID numérico de Producto a partir de 'bebida_5', '5', 5..."""
+    if isinstance(item_id, (int, float)):
+        return int(item_id)
+    item_id = str(item_id or '')
+    if item_id.startswith('bebida_'):
+        item_id = item_id[len('bebida_'):]
+    return int(item_id) if item_id.isdigit() else None
+
+
+def es_canonico(item):
+    """El item ya tiene exactamente las claves v2 (sin alias sueltos)"""
+    claves = item.keys()
+    return (
+        CLAVES_CANONICAS <= claves
+        and not claves & (CLAVES_ABSORBIDAS - CLAVES_CANONICAS)
+        and bool(item['categoria'])
+    )
+
+
+def _canonicalizar(items_raw):
+    """Convertir a v2 sin tocar la base de datos; devuelve (items, pendientes)"""
+    items = parsear_items(items_raw)
+    if all(es_canonico(item) for item in items):
+        return items, []
+
+    canonicos = []
+    pendientes = []  # items a completar desde Producto
+    for i, item in enumerate(items):
+        nombre = str(_primero(item, ALIAS_NOMBRE, f'Producto {i + 1}'))
+        cantidad = _numero(_primero(item, ALIAS_CANTIDAD, 1), 1)
+        precio = _numero(_primero(item, ALIAS_PRECIO, 0), 0)
+        total = _numero(_primero(item, ALIAS_TOTAL, 0), 0) or _numero(cantidad * precio, 0)
+        categoria = str(_primero(item, ALIAS_CATEGORIA, '')).lower()
+        es_bebida = item.get('tipo') == 'bebida' or bool(item.get('es_bebida')) or categoria == 'bebida'
+
+        canonico = {
+            clave: valor for clave, valor in item.items() if clave not in CLAVES_ABSORBIDAS
+        }
+        canonico.update({
+            'id': _primero(item, ALIAS_ID, ''),
+            'codigo': str(_primero(item, ALIAS_CODIGO, '')),
+            'name': nombre,
+            'quantity': cantidad,
+            'price': precio,
+            'total': total,
+            'tipo': 'bebida' if es_bebida else 'plato',
+            'categoria': categoria if categoria and categoria != 'otro' else '',
+        })
+        if not canonico['codigo'] or not canonico['categoria']:
+            pendientes.append(canonico)
+        canonicos.append(canonico)
+
+    return canonicos, pendientes
+
+
+def _categoria_por_defecto(items):
+    for item in items:
+        if not item['categoria']:
+            item['categoria'] = 'bebida' if item['tipo'] == 'bebida' else 'otro'
+
+
+def canonicalizar_items(items_raw):
+    """
+    Devolver la lista de items en el esquema canónico v2.
+    Los códigos y categorías que falten se completan desde Producto con una
+    sola consulta para todo el lote.
+    """
+    canonicos, pendientes = _canonicalizar(items_raw)
+    if pendientes:
+        _completar_desde_productos(pendientes)
+        _categoria_por_defecto(canonicos)
+    return canonicos
+
+
+def canonicalizar_filas(filas):
+    """
+    Canonicalizar los items de varias filas (pedidos o facturas) con una sola
+    consulta a Producto para todas. Las filas quedan listas para bulk_update.
+    """
+    pendientes = []
+    for fila in filas:
+        fila.items, pendientes_fila = _canonicalizar(fila.items)
+        fila.items_version = ITEMS_VERSION
+        pendientes += pendientes_fila
+
+    if pendientes:
+        _completar_desde_productos(pendientes)
+        _categoria_por_defecto(pendientes)
+    return filas
+
+
+def migrar_items(modelo, lote=500):
+    """
+    Reescribir en v2 todas las filas de ``modelo`` con items antiguos, por
+    lotes en orden de ID y cada lote en su propia transacción. Se puede
+    interrumpir y volver a ejecutar: solo toma filas con ``items_version < 2``.
+    Devuelve la cantidad de filas migradas.
+    """
+    total = 0
+    ultimo_id = 0
+    while True:
+        with transaction.atomic():
+            filas = list(
+                modelo.objects.select_for_update()
+                .filter(id__gt=ultimo_id, items_version__lt=ITEMS_VERSION)
+                .order_by('id')
+                .only('id', 'items', 'items_version')[:lote]
+            )
+            if not filas:
+                break
+            canonicalizar_filas(filas)
+            modelo.objects.bulk_update(filas, ['items', 'items_version'])
+
+        ultimo_id = filas[-1].id
+        total += len(filas)
+        logger.info('🔄 %s: %s fila(s) migradas a items v%s', modelo.__name__, total, ITEMS_VERSION)
+    return total
+
+
+def _completar_desde_productos(items):
+    """Completar código/categoría desde Producto (por ID y luego por nombre)"""
+    from .models import Producto
+
+    ids = {_id_producto(item['id']) for item in items} - {None}
+    nombres = {item['name'].strip().lower() for item in items}
+
+    por_id = {}
+    por_nombre = {}
+    productos = Producto.objects.annotate(nombre_lower=Lower('nombre')).filter(
+        Q(nombre_lower__in=nombres) | Q(id__in=ids)
+    ).values('id', 'codigo', 'categoria', 'nombre_lower')
+
+    for producto in productos:
+        por_id[producto['id']] = producto
+        por_nombre.setdefault(producto['nombre_lower'], producto)
+
+    for item in items:
+        producto = por_id.get(_id_producto(item['id'])) or por_nombre.get(item['name'].strip().lower())
+        if not producto:
+            continue
+        if not item['codigo']:
+            item['codigo'] = producto['codigo']
+        if not item['categoria']:
+            item['categoria'] = producto['categoria'].lower()
+
+
+def items_detalle_v2(items):
+    """Vista de items v2 con las claves en español que usan reportes y devoluciones"""
+    detalle = []
+    for item in items:
+        cantidad = float(item['quantity'])
+        precio = float(item['price'])
+        detalle.append({
+            'producto_id': item.get('id'),
+            'codigo': item['codigo'],
+            'nombre': item['name'],
+            'cantidad': cantidad,
+            'precio': precio,
+            'subtotal': cantidad * precio,
+            'categoria': item['categoria'],
+        })
+    return detalle
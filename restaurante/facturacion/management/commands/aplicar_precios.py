@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from facturacion.precios import aplicar_pendientes
+
+
+class Command(BaseCommand):
+    help = 'Worker que aplica los cambios masivos de precios programados cuando llega su vigencia'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--una-vez', action='store_true',
+                            help='Aplicar los cambios vencidos una sola vez y salir (cron)')
+        parser.add_argument('--intervalo', type=float, default=30.0,
+                            help='Segundos de espera entre revisiones')
+
+    def handle(self, *args, **options):
+        while True:
+            aplicados = aplicar_pendientes()
+            if aplicados:
+                self.stdout.write(f"Cambios de precios aplicados: {aplicados}")
+
+            if options['una_vez']:
+                break
+            time.sleep(options['intervalo'])
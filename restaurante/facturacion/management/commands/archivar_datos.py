@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from facturacion.archivo import LOTE_POR_DEFECTO, archivar, horizonte_archivo, pedidos_archivables
+
+
+class Command(BaseCommand):
+    help = 'Mueve pedidos y facturas cerrados más antiguos que el horizonte a las tablas de archivo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int,
+                            help='Horizonte en días (por defecto ARCHIVO_HORIZONTE_DIAS)')
+        parser.add_argument('--lote', type=int, default=LOTE_POR_DEFECTO,
+                            help='Pedidos por transacción')
+        parser.add_argument('--maximo', type=int,
+                            help='Detenerse después de archivar esta cantidad de pedidos')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Solo mostrar cuántos pedidos se archivarían')
+
+    def handle(self, *args, **options):
+        limite = horizonte_archivo(options['dias'])
+
+        if options['dry_run']:
+            total = pedidos_archivables(limite).count()
+            self.stdout.write(f"{total} pedido(s) anteriores a {limite:%d/%m/%Y} se archivarían")
+            return
+
+        pedidos, facturas = archivar(options['dias'], options['lote'], options['maximo'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archivados {pedidos} pedido(s) y {facturas} factura(s) anteriores a {limite:%d/%m/%Y}"
+        ))
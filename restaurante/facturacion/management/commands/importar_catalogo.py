@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from facturacion.importacion import DEFINICIONES, LOTE_POR_DEFECTO, ErrorImportacion, importar
+
+
+class Command(BaseCommand):
+    help = ('Importa productos o platos desde un CSV (crea los nuevos y actualiza los existentes '
+            'por código o nombre). Las filas con errores se informan y no se importan')
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipo', choices=sorted(DEFINICIONES), help='Catálogo a importar')
+        parser.add_argument('ruta', help='Archivo CSV (UTF-8, separado por coma o punto y coma)')
+        parser.add_argument('--lote', type=int, default=LOTE_POR_DEFECTO, help='Filas por transacción')
+        parser.add_argument('--simular', action='store_true', help='Solo validar, sin escribir')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['ruta'], encoding='utf-8-sig', newline='') as archivo:
+                resultado = importar(options['tipo'], archivo, options['lote'], options['simular'])
+        except OSError as e:
+            raise CommandError(f'No se pudo abrir el archivo: {e}')
+        except ErrorImportacion as e:
+            raise CommandError(str(e))
+
+        for error in resultado['errores']:
+            self.stdout.write(self.style.WARNING(f"Línea {error['linea']}: {'; '.join(error['errores'])}"))
+        if resultado['con_errores'] > len(resultado['errores']):
+            self.stdout.write(f"... y {resultado['con_errores'] - len(resultado['errores'])} fila(s) más con errores")
+        prefijo = 'Simulación: ' if options['simular'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefijo}{resultado['filas']} fila(s) leídas, {resultado['creados']} creada(s), "
+            f"{resultado['actualizados']} actualizada(s), {resultado['sin_cambios']} sin cambios, "
+            f"{resultado['con_errores']} con errores"
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from facturacion.arranque import ErrorArranque, medir, verificar
+
+
+class Command(BaseCommand):
+    help = ('Mide el arranque de un worker (tiempo de importación y RSS) en intérpretes nuevos '
+            'y falla si supera los límites o si carga módulos que deben importarse al usarse')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=3, help='Arranques a medir (se usa la mediana)')
+        parser.add_argument('--max-segundos', type=float, help='Tiempo máximo de arranque')
+        parser.add_argument('--max-rss-mb', type=float, help='Memoria residente máxima en MB')
+        parser.add_argument('--lentas', type=int, default=10, help='Importaciones más lentas a mostrar')
+
+    def handle(self, *args, **options):
+        try:
+            resultado = medir(options['repeticiones'])
+        except ErrorArranque as e:
+            raise CommandError(f'No se pudo medir el arranque: {e}')
+
+        self.stdout.write(
+            f"Arranque: {resultado['segundos']:.3f}s, RSS {resultado['rss_mb']:.1f} MB, "
+            f"{resultado['modulos']} módulos (mediana de {options['repeticiones']})"
+        )
+        self.stdout.write('')
+        self.stdout.write(f"{'paquete':<30}{'ms':>10}")
+        for paquete, ms in resultado['lentas'][:options['lentas']]:
+            self.stdout.write(f'{paquete:<30}{ms:>10.1f}')
+        self.stdout.write('')
+
+        problemas = verificar(resultado, options['max_segundos'], options['max_rss_mb'])
+        for problema in problemas:
+            self.stdout.write(self.style.ERROR(f'✘ {problema}'))
+        if problemas:
+            raise CommandError(f'{len(problemas)} problema(s) en el arranque')
+        self.stdout.write(self.style.SUCCESS('✔ Arranque dentro de los límites'))
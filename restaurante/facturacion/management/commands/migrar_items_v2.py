@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from facturacion.items import ITEMS_VERSION, migrar_items
+from facturacion.models import Factura, FacturaArchivada, Pedido, PedidoArchivado
+
+
+MODELOS = {
+    'pedido': [Pedido, PedidoArchivado],
+    'factura': [Factura, FacturaArchivada],
+}
+
+
+class Command(BaseCommand):
+    help = 'Reescribe los items de pedidos y facturas antiguos en el esquema canónico v2'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modelo', choices=['pedido', 'factura', 'todos'], default='todos',
+                            help='Qué tablas migrar (incluye sus tablas de archivo)')
+        parser.add_argument('--lote', type=int, default=500,
+                            help='Filas por transacción')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Solo mostrar cuántas filas faltan por migrar')
+
+    def handle(self, *args, **options):
+        if options['modelo'] == 'todos':
+            modelos = MODELOS['pedido'] + MODELOS['factura']
+        else:
+            modelos = MODELOS[options['modelo']]
+
+        for modelo in modelos:
+            if options['dry_run']:
+                pendientes = modelo.objects.filter(items_version__lt=ITEMS_VERSION).count()
+                self.stdout.write(f"{modelo.__name__}: {pendientes} fila(s) pendientes")
+                continue
+
+            total = migrar_items(modelo, options['lote'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{modelo.__name__}: {total} fila(s) migradas a items v{ITEMS_VERSION}"
+            ))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from facturacion.impresion import procesar_cola, recuperar_huerfanos, reintentar_fallidos
+
+
+class Command(BaseCommand):
+    help = 'Worker local que entrega los trabajos ESC/POS pendientes a las impresoras térmicas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--impresora', choices=['cocina', 'bar', 'caja'],
+                            help='Procesar solo la cola de esta impresora')
+        parser.add_argument('--una-vez', action='store_true',
+                            help='Procesar la cola una sola vez y salir')
+        parser.add_argument('--intervalo', type=float, default=1.0,
+                            help='Segundos de espera entre revisiones de la cola')
+        parser.add_argument('--reintentar-fallidos', action='store_true',
+                            help='Devolver a la cola los trabajos marcados con error')
+
+    def handle(self, *args, **options):
+        impresora = options['impresora']
+
+        if options['reintentar_fallidos']:
+            total = reintentar_fallidos(impresora)
+            self.stdout.write(f"{total} trabajo(s) devueltos a la cola")
+
+        recuperar_huerfanos()
+
+        while True:
+            impresos, fallidos = procesar_cola(impresora)
+            if impresos or fallidos:
+                self.stdout.write(f"Impresos: {impresos} | Fallidos: {fallidos}")
+
+            if options['una_vez']:
+                break
+            time.sleep(options['intervalo'])
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from facturacion.carga import ErrorCarga, Prueba, correr, verificar_invariantes
+
+
+class Command(BaseCommand):
+    help = ('Simula la hora pico (tabletas, pantallas de cocina y cajeros) contra un servidor '
+            'de desarrollo, informa latencias por endpoint y verifica invariantes de stock, '
+            'numeración y mesas')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000',
+                            help='Servidor a probar (debe usar la misma base de datos)')
+        parser.add_argument('--duracion', type=float, default=60, help='Segundos creando pedidos')
+        parser.add_argument('--tabletas', type=int, default=6)
+        parser.add_argument('--cocinas', type=int, default=2)
+        parser.add_argument('--cajeros', type=int, default=2)
+        parser.add_argument('--mesas', type=int, default=10)
+        parser.add_argument('--bebidas', type=int, default=3, help='Bebidas distintas en los pedidos')
+        parser.add_argument('--stock', type=int, default=500, help='Stock inicial de cada bebida')
+        parser.add_argument('--pausa', type=float, default=0.2,
+                            help='Pausa máxima entre acciones de una sesión, en segundos')
+        parser.add_argument('--cancelar', type=float, default=0.05, help='Proporción de pedidos cancelados')
+        parser.add_argument('--devolver', type=float, default=0.1,
+                            help='Proporción de facturas con devolución parcial')
+        parser.add_argument('--llevar', type=float, default=0.2, help='Proporción de pedidos para llevar')
+
+    def handle(self, *args, **options):
+        prueba = Prueba(
+            options['url'], mesas=options['mesas'], bebidas=options['bebidas'], stock=options['stock'],
+            pausa=options['pausa'], cancelar=options['cancelar'], devolver=options['devolver'],
+            llevar=options['llevar'],
+        )
+        try:
+            prueba.preparar()
+            self.stdout.write(
+                f"Hora pico contra {options['url']}: {options['tabletas']} tableta(s), "
+                f"{options['cocinas']} cocina(s), {options['cajeros']} cajero(s) durante {options['duracion']:g}s"
+            )
+            duracion = correr(prueba, options['duracion'], options['tabletas'],
+                              options['cocinas'], options['cajeros'])
+        except ErrorCarga as e:
+            raise CommandError(str(e))
+        finally:
+            prueba.finalizar()
+
+        self.stdout.write('')
+        self.stdout.write(f"{'endpoint':<30}{'peticiones':>11}{'errores':>9}{'req/s':>8}"
+                          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'máx ms':>9}")
+        for fila in prueba.registro.resumen(duracion):
+            self.stdout.write(
+                f"{fila['endpoint']:<30}{fila['peticiones']:>11}{fila['errores']:>9}"
+                f"{fila['por_segundo']:>8.1f}{fila['p50']:>9.0f}{fila['p95']:>9.0f}"
+                f"{fila['p99']:>9.0f}{fila['maximo']:>9.0f}"
+            )
+        self.stdout.write('')
+        for evento, veces in sorted(prueba.registro.eventos.items()):
+            self.stdout.write(f'{evento}: {veces}')
+        for endpoint, mensajes in sorted(prueba.registro.mensajes.items()):
+            for mensaje in mensajes:
+                self.stdout.write(self.style.WARNING(f'{endpoint} {mensaje}'))
+
+        self.stdout.write('')
+        fallas = 0
+        for nombre, ok, detalle in verificar_invariantes(prueba):
+            if ok:
+                self.stdout.write(self.style.SUCCESS(f'✔ {nombre}: {detalle}'))
+            else:
+                fallas += 1
+                self.stdout.write(self.style.ERROR(f'✘ {nombre}: {detalle}'))
+        if fallas:
+            raise CommandError(f'{fallas} invariante(s) no se cumplen')
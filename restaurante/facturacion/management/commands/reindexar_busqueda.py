@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from facturacion.busqueda import TIPOS, ErrorBusqueda, reindexar
+
+
+class Command(BaseCommand):
+    help = ('Reconstruye el índice de búsqueda (pedidos, facturas, clientes, productos y platos, '
+            'incluidos los archivados). Usar después de cargas masivas que no envían señales')
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipos', nargs='*', help=f"Tipos a reconstruir ({', '.join(TIPOS)}); todos si se omite")
+        parser.add_argument('--lote', type=int, default=1000, help='Filas por inserción')
+
+    def handle(self, *args, **options):
+        try:
+            totales = reindexar(options['tipos'] or None, options['lote'])
+        except ErrorBusqueda as e:
+            raise CommandError(str(e))
+
+        for tipo, total in totales.items():
+            self.stdout.write(f'{tipo:<10}{total:>10}')
+        self.stdout.write(self.style.SUCCESS(f'Índice reconstruido: {sum(totales.values())} entrada(s)'))
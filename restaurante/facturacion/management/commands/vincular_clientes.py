@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from facturacion.visitas import LOTE_POR_DEFECTO, vincular_historial
+
+
+class Command(BaseCommand):
+    help = ('Vincula pedidos y facturas sin cliente (vivos y archivados) por teléfono normalizado, '
+            'pedido o cargo a crédito, y recalcula los agregados de visitas de los clientes')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=LOTE_POR_DEFECTO, help='Filas por transacción')
+
+    def handle(self, *args, **options):
+        totales = vincular_historial(options['lote'])
+        for modelo, total in totales.items():
+            self.stdout.write(f'{modelo:<20}{total:>10}')
+        self.stdout.write(self.style.SUCCESS(f'{sum(totales.values())} fila(s) vinculadas a clientes'))
@@ -0,0 +1,424 @@
+"""
+Métricas en formato de texto de Prometheus (``/metrics``).
+
+``MiddlewareMetricas`` registra por URL con nombre (``request.resolver_match``):
+cantidad de peticiones por método y estado, histograma de latencia, cantidad
+y tiempo de consultas SQL y bytes de respuesta. Los contadores de negocio se
+suman con ``incrementar('pedidos_creados')`` desde el código.
+
+Los bloques de plantilla marcados con ``{% medir %}`` o ``{% fragmento %}``
+(ver templatetags/fragmentos.py) suman su tiempo de render por vista y bloque
+(``http_template_block_seconds_total``). Con ``METRICAS_SERVER_TIMING`` el
+desglose de cada petición (SQL y bloques) se envía también en la cabecera
+``Server-Timing``, visible en la pestaña de red del navegador.
+
+Cada worker de gunicorn acumula en memoria y, si ``METRICAS_DIR`` está
+configurado, vuelca su instantánea a ``<METRICAS_DIR>/<pid>.json`` como máximo
+una vez por ``METRICAS_INTERVALO`` segundos. ``/metrics`` suma los contadores
+de todos los archivos, así el resultado es el del servidor completo y no solo
+el del worker que atendió la petición. Los medidores (pool de conexiones) se
+publican por pid y solo para workers vivos. Los archivos de workers
+terminados se suman a ``retirados.json`` y se borran al agregar, así el
+directorio no crece con cada reinicio y los contadores no retroceden.
+
+Las consultas se cuentan con un ``execute_wrapper`` fijo en cada conexión que
+suma en la medida de la petición actual (``ContextVar``), la misma donde se
+suman los bloques de plantilla.
+"""
+import contextvars
+import glob
+import hmac
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+try:
+    import fcntl
+except ImportError:  # Windows: un solo proceso, no hay agregaciones concurrentes
+    fcntl = None
+
+from django.conf import settings
+
+from .registro import obtener_logger
+
+logger = obtener_logger('metricas')
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HISTOGRAMAS = {'http_request_duration_seconds'}
+
+AYUDA = {
+    'http_requests_total': 'Peticiones atendidas por vista, método y estado',
+    'http_request_duration_seconds': 'Latencia de las peticiones por vista',
+    'http_sql_queries_total': 'Consultas SQL ejecutadas por vista',
+    'http_sql_duration_seconds_total': 'Tiempo en consultas SQL por vista',
+    'http_response_bytes_total': 'Bytes de respuesta por vista',
+    'http_template_block_seconds_total': 'Tiempo de render por bloque de plantilla',
+    'http_template_block_renders_total': 'Renders por bloque de plantilla',
+    'negocio_pedidos_creados_total': 'Pedidos creados',
+    'negocio_facturas_pagadas_total': 'Facturas cobradas',
+    'negocio_rechazos_sin_stock_total': 'Pedidos rechazados por falta de stock',
+    'cache_aciertos_total': 'Aciertos de la cache por etiqueta',
+    'cache_fallos_total': 'Fallos de la cache por etiqueta',
+    'db_pool_en_uso': 'Conexiones del pool en uso',
+    'db_pool_libres': 'Conexiones libres en el pool',
+    'db_pool_tamano': 'Tamaño máximo del pool',
+    'db_pool_esperas_total': 'Veces que se esperó una conexión',
+    'db_pool_espera_segundos_total': 'Tiempo total esperando conexiones',
+    'db_pool_agotado_total': 'Veces que se agotó la espera de conexión',
+    'db_pool_creadas_total': 'Conexiones abiertas',
+    'db_pool_recicladas_total': 'Conexiones cerradas por edad',
+    'db_pool_caidas_total': 'Conexiones descartadas por no responder',
+}
+
+_contadores = defaultdict(float)
+_candado = threading.Lock()
+_ultimo_volcado = 0.0
+_pendiente = False
+_hilo_volcado = None
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def serie(nombre, **etiquetas):
+    """Nombre de serie con etiquetas: nombre{a="1",b="2"}"""
+    if not etiquetas:
+        return nombre
+    pares = ','.join(f'{clave}="{_escapar(valor)}"' for clave, valor in sorted(etiquetas.items()))
+    return f'{nombre}{{{pares}}}'
+
+
+def _sumar(series):
+    global _pendiente
+    with _candado:
+        for nombre, valor in series:
+            _contadores[nombre] += valor
+        _pendiente = True
+
+
+def incrementar(contador, cantidad=1, **etiquetas):
+    """Sumar a un contador de negocio (negocio_<contador>_total)"""
+    _sumar([(serie(f'negocio_{contador}_total', **etiquetas), cantidad)])
+
+
+def observar_peticion(vista, metodo, estado, duracion, consultas, tiempo_sql, tamano, bloques=None):
+    series = [
+        (serie('http_requests_total', vista=vista, metodo=metodo, estado=estado), 1),
+        (serie('http_sql_queries_total', vista=vista), consultas),
+        (serie('http_sql_duration_seconds_total', vista=vista), tiempo_sql),
+        (serie('http_response_bytes_total', vista=vista), tamano),
+        (serie('http_request_duration_seconds_sum', vista=vista), duracion),
+        (serie('http_request_duration_seconds_count', vista=vista), 1),
+    ]
+    # Buckets acumulativos: cada observación suma en todos los límites >= duración
+    # (los demás se publican en 0 para que el histograma siempre esté completo)
+    for limite in BUCKETS_LATENCIA:
+        series.append((
+            serie('http_request_duration_seconds_bucket', vista=vista, le=limite),
+            1 if duracion <= limite else 0,
+        ))
+    series.append((serie('http_request_duration_seconds_bucket', vista=vista, le='+Inf'), 1))
+    for bloque, (tiempo, renders) in (bloques or {}).items():
+        series.append((serie('http_template_block_seconds_total', vista=vista, bloque=bloque), tiempo))
+        series.append((serie('http_template_block_renders_total', vista=vista, bloque=bloque), renders))
+    _sumar(series)
+    _volcar_si_corresponde()
+
+
+# ==========================================
+# Instantáneas y agregación entre workers
+# ==========================================
+
+def _instantanea():
+    """Contadores y medidores de este proceso (incluye cache y pool de conexiones)"""
+    from .cache_modelos import estadisticas_cache
+    from .pool_mysql.pool import estadisticas_pool
+
+    with _candado:
+        contadores = dict(_contadores)
+    medidores = {}
+
+    for etiqueta, valores in estadisticas_cache().items():
+        contadores[serie('cache_aciertos_total', etiqueta=etiqueta)] = valores['aciertos']
+        contadores[serie('cache_fallos_total', etiqueta=etiqueta)] = valores['fallos']
+
+    pid = os.getpid()
+    for alias, datos in estadisticas_pool().items():
+        for campo in ('en_uso', 'libres', 'tamano'):
+            medidores[serie(f'db_pool_{campo}', alias=alias, pid=pid)] = datos[campo]
+        contadores[serie('db_pool_esperas_total', alias=alias)] = datos['esperas']
+        contadores[serie('db_pool_espera_segundos_total', alias=alias)] = datos['tiempo_espera']
+        for campo in ('agotado', 'creadas', 'recicladas', 'caidas'):
+            contadores[serie(f'db_pool_{campo}_total', alias=alias)] = datos[campo]
+
+    return {'pid': pid, 'contadores': contadores, 'medidores': medidores}
+
+
+def _directorio():
+    return getattr(settings, 'METRICAS_DIR', '')
+
+
+def volcar():
+    """Escribir la instantánea de este worker en METRICAS_DIR (reemplazo atómico)"""
+    global _ultimo_volcado, _pendiente
+    directorio = _directorio()
+    if not directorio:
+        return
+    datos = _instantanea()
+    os.makedirs(directorio, exist_ok=True)
+    destino = os.path.join(directorio, f"{datos['pid']}.json")
+    temporal = f'{destino}.tmp'
+    try:
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo)
+        os.replace(temporal, destino)
+    except OSError as e:
+        logger.warning('⚠️ No se pudieron volcar las métricas: %s', e)
+        return
+    with _candado:
+        _ultimo_volcado = time.monotonic()
+        _pendiente = False
+
+
+def _volcar_si_corresponde():
+    if not _directorio():
+        return
+    _iniciar_hilo_volcado()
+    if time.monotonic() - _ultimo_volcado >= getattr(settings, 'METRICAS_INTERVALO', 1):
+        volcar()
+
+
+def _iniciar_hilo_volcado():
+    """Hilo que vuelca lo pendiente aunque el worker deje de recibir peticiones"""
+    global _hilo_volcado
+    if _hilo_volcado is not None and _hilo_volcado.pid == os.getpid():
+        return
+
+    def ciclo():
+        while True:
+            time.sleep(getattr(settings, 'METRICAS_INTERVALO', 1))
+            if _pendiente:
+                volcar()
+
+    with _candado:
+        if _hilo_volcado is not None and _hilo_volcado.pid == os.getpid():
+            return
+        hilo = threading.Thread(target=ciclo, name='metricas-volcado', daemon=True)
+        hilo.pid = os.getpid()
+        hilo.start()
+        _hilo_volcado = hilo
+
+
+def _proceso_vivo(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+ARCHIVO_RETIRADOS = 'retirados.json'
+
+
+def _leer(ruta):
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _agregar():
+    """Sumar las instantáneas de todos los workers (o solo la propia sin METRICAS_DIR)"""
+    directorio = _directorio()
+    if not directorio:
+        propia = _instantanea()
+        return propia['contadores'], propia['medidores']
+
+    volcar()
+    # Una agregación a la vez: la que pliega a un worker terminado no debe
+    # cruzarse con otra que lo esté sumando
+    with open(os.path.join(directorio, '.candado'), 'w') as candado:
+        if fcntl is not None:
+            fcntl.flock(candado, fcntl.LOCK_EX)
+        return _agregar_directorio(directorio)
+
+
+def _agregar_directorio(directorio):
+    ruta_retirados = os.path.join(directorio, ARCHIVO_RETIRADOS)
+    retirados = (_leer(ruta_retirados) or {}).get('contadores', {})
+    contadores = defaultdict(float, retirados)
+    medidores = {}
+    terminados = []
+    for ruta in glob.glob(os.path.join(directorio, '*.json')):
+        if ruta == ruta_retirados:
+            continue
+        datos = _leer(ruta)
+        if datos is None:
+            continue
+        for nombre, valor in datos.get('contadores', {}).items():
+            contadores[nombre] += valor
+        # Los contadores de workers terminados se conservan; sus medidores no
+        if _proceso_vivo(datos.get('pid', 0)):
+            medidores.update(datos.get('medidores', {}))
+        else:
+            terminados.append((ruta, datos))
+
+    if terminados:
+        for _, datos in terminados:
+            for nombre, valor in datos.get('contadores', {}).items():
+                retirados[nombre] = retirados.get(nombre, 0) + valor
+        temporal = f'{ruta_retirados}.tmp'
+        try:
+            with open(temporal, 'w', encoding='utf-8') as archivo:
+                json.dump({'contadores': retirados}, archivo)
+            os.replace(temporal, ruta_retirados)
+            for ruta, _ in terminados:
+                os.remove(ruta)
+        except OSError as e:
+            logger.warning('⚠️ No se pudieron plegar las métricas de workers terminados: %s', e)
+        else:
+            logger.debug('🧹 Métricas de %s worker(s) terminados plegadas', len(terminados))
+    return contadores, medidores
+
+
+_NOMBRE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)')
+
+
+def _familia(nombre_serie):
+    nombre = _NOMBRE.match(nombre_serie).group(1)
+    for sufijo in ('_bucket', '_sum', '_count'):
+        base = nombre[:-len(sufijo)]
+        if nombre.endswith(sufijo) and base in HISTOGRAMAS:
+            return base
+    return nombre
+
+
+_LE = re.compile(r'le="([^"]*)",?')
+
+
+def _orden(par):
+    """Ordenar series por nombre y, en histogramas, por límite numérico"""
+    nombre = par[0]
+    limite = _LE.search(nombre)
+    if not limite:
+        return nombre, 0.0
+    return _LE.sub('', nombre), float(limite.group(1).replace('+Inf', 'inf'))
+
+
+def _formatear(valor):
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+def exportar():
+    """Todas las métricas en formato de texto de Prometheus 0.0.4"""
+    contadores, medidores = _agregar()
+    familias = defaultdict(list)
+    for nombre, valor in list(contadores.items()) + list(medidores.items()):
+        familias[_familia(nombre)].append((nombre, valor))
+
+    lineas = []
+    for familia in sorted(familias):
+        if familia in HISTOGRAMAS:
+            tipo = 'histogram'
+        elif familia.endswith('_total'):
+            tipo = 'counter'
+        else:
+            tipo = 'gauge'
+        if familia in AYUDA:
+            lineas.append(f'# HELP {familia} {AYUDA[familia]}')
+        lineas.append(f'# TYPE {familia} {tipo}')
+        for nombre, valor in sorted(familias[familia], key=_orden):
+            lineas.append(f'{nombre} {_formatear(valor)}')
+    return '\n'.join(lineas) + '\n'
+
+
+def autorizado(request):
+    """Acceso a /metrics: token Bearer (METRICAS_TOKEN) o usuario staff/superusuario"""
+    token = getattr(settings, 'METRICAS_TOKEN', '')
+    if token and hmac.compare_digest(request.headers.get('Authorization', '').encode(),
+                                     f'Bearer {token}'.encode()):
+        return True
+    user = request.user
+    return user.is_authenticated and (user.is_staff or user.is_superuser)
+
+
+# ==========================================
+# Middleware
+# ==========================================
+
+_medida_sql = contextvars.ContextVar('medida_sql', default=None)
+
+
+def _contar_sql(execute, sql, params, many, context):
+    medida = _medida_sql.get()
+    if medida is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medida['consultas'] += 1
+        medida['tiempo'] += time.perf_counter() - inicio
+
+
+def medir_bloque(bloque, duracion):
+    """Sumar el render de un bloque de plantilla a la medida de la petición actual"""
+    medida = _medida_sql.get()
+    if medida is None:
+        return
+    tiempo, renders = medida['bloques'].get(bloque, (0.0, 0))
+    medida['bloques'][bloque] = (tiempo + duracion, renders + 1)
+
+
+def _server_timing(medida):
+    """Cabecera Server-Timing: sql;dur=12.3, menu_lateral;dur=0.1 (milisegundos)"""
+    partes = [f"sql;desc=\"{medida['consultas']} consultas\";dur={medida['tiempo'] * 1000:.1f}"]
+    for bloque, (tiempo, _) in medida['bloques'].items():
+        partes.append(f'{re.sub(r"[^A-Za-z0-9_-]", "_", bloque)};dur={tiempo * 1000:.1f}')
+    return ', '.join(partes)
+
+
+def instalar_contador_sql(sender=None, connection=None, **kwargs):
+    """Agregar el contador de consultas a una conexión (señal connection_created)"""
+    if _contar_sql not in connection.execute_wrappers:
+        # Al principio: los execute_wrapper temporales se agregan y quitan al final
+        connection.execute_wrappers.insert(0, _contar_sql)
+
+
+class MiddlewareMetricas:
+    """Latencia, consultas SQL y tamaño de respuesta por URL con nombre"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        medida = {'consultas': 0, 'tiempo': 0.0, 'bloques': {}}
+        marca = _medida_sql.set(medida)
+        inicio = time.perf_counter()
+        try:
+            respuesta = self.get_response(request)
+        finally:
+            _medida_sql.reset(marca)
+        self._observar(request, respuesta, medida, time.perf_counter() - inicio)
+        return respuesta
+
+    @staticmethod
+    def _observar(request, respuesta, medida, duracion):
+        coincidencia = getattr(request, 'resolver_match', None)
+        vista = (coincidencia.view_name if coincidencia else '') or 'sin_ruta'
+        tamano = 0 if respuesta.streaming else len(respuesta.content)
+        try:
+            observar_peticion(vista, request.method, respuesta.status_code, duracion,
+                              medida['consultas'], medida['tiempo'], tamano, medida['bloques'])
+        except Exception:
+            logger.error('Error al registrar métricas', exc_info=True)
+        if getattr(settings, 'METRICAS_SERVER_TIMING', False):
+            respuesta['Server-Timing'] = _server_timing(medida)
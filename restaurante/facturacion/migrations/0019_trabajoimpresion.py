@@ -0,0 +1,39 @@
+# Generated by Django 4.2.20 on 2026-10-19 15:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0018_cliente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabajoImpresion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('impresora', models.CharField(choices=[('cocina', 'Cocina'), ('bar', 'Bar'), ('caja', 'Caja')], max_length=20, verbose_name='Impresora')),
+                ('documento', models.CharField(choices=[('ticket_cocina', 'Ticket de Cocina'), ('ticket_bar', 'Ticket de Bar'), ('factura', 'Factura')], max_length=20, verbose_name='Tipo de Documento')),
+                ('datos', models.BinaryField(verbose_name='Datos ESC/POS')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('enviando', 'Enviando'), ('impreso', 'Impreso'), ('error', 'Error')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('intentos', models.PositiveIntegerField(default=0, verbose_name='Intentos')),
+                ('max_intentos', models.PositiveIntegerField(default=5, verbose_name='Máximo de Intentos')),
+                ('ultimo_error', models.TextField(blank=True, verbose_name='Último Error')),
+                ('proximo_intento', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próximo Intento')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_impresion', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Impresión')),
+                ('factura', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trabajos_impresion', to='facturacion.factura', verbose_name='Factura')),
+                ('pedido', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trabajos_impresion', to='facturacion.pedido', verbose_name='Pedido')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de Impresión',
+                'verbose_name_plural': 'Trabajos de Impresión',
+                'ordering': ['fecha_creacion'],
+                'indexes': [models.Index(fields=['impresora', 'estado', 'proximo_intento'], name='facturacion_impreso_b304cb_idx')],
+            },
+        ),
+    ]
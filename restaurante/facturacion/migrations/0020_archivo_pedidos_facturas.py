@@ -0,0 +1,100 @@
+# Generated by Django 4.2.20 on 2026-10-19 15:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('facturacion', '0019_trabajoimpresion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PedidoArchivado',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('codigo_pedido', models.CharField(max_length=20, unique=True, verbose_name='Código de Pedido')),
+                ('tipo_pedido', models.CharField(choices=[('mesa', 'Mesa'), ('delivery', 'Delivery'), ('llevar', 'Para Llevar')], max_length=20, verbose_name='Tipo de Pedido')),
+                ('mesa_numero', models.CharField(blank=True, max_length=20, verbose_name='Mesa')),
+                ('codigo_delivery', models.CharField(blank=True, max_length=10, verbose_name='Código Delivery')),
+                ('nombre_cliente', models.CharField(blank=True, max_length=200, verbose_name='Nombre del Cliente')),
+                ('telefono_cliente', models.CharField(blank=True, max_length=20, verbose_name='Teléfono')),
+                ('direccion_entrega', models.TextField(blank=True, verbose_name='Dirección de Entrega')),
+                ('items', models.JSONField(verbose_name='Items del Pedido')),
+                ('subtotal', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Subtotal')),
+                ('envio', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Costo de Envío')),
+                ('total', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Total')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('confirmado', 'Confirmado'), ('preparacion', 'En Preparación'), ('listo', 'Listo para Servir'), ('entregado', 'Entregado'), ('cancelado', 'Cancelado'), ('completado', 'Completado')], max_length=20, verbose_name='Estado del Pedido')),
+                ('fecha_pedido', models.DateTimeField(verbose_name='Fecha del Pedido')),
+                ('fecha_entrega', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Entrega')),
+                ('notas', models.TextField(blank=True, verbose_name='Notas del Pedido')),
+                ('detalles_items', models.JSONField(default=list, verbose_name='Detalles de Items')),
+                ('historial_estados', models.JSONField(default=list, verbose_name='Historial de Estados')),
+                ('created_at', models.DateTimeField(verbose_name='Creado')),
+                ('fecha_archivado', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Archivado')),
+                ('creado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Creado por')),
+            ],
+            options={
+                'verbose_name': 'Pedido Archivado',
+                'verbose_name_plural': 'Pedidos Archivados',
+                'ordering': ['-fecha_pedido'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FacturaArchivada',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('numero_factura', models.CharField(max_length=50, unique=True, verbose_name='Número de Factura')),
+                ('fecha_factura', models.DateTimeField(verbose_name='Fecha de Factura')),
+                ('tipo_pedido', models.CharField(max_length=20, verbose_name='Tipo de Pedido')),
+                ('numero_mesa_codigo', models.CharField(blank=True, max_length=20, verbose_name='Número de Mesa/Código')),
+                ('nombre_cliente', models.CharField(blank=True, max_length=200, verbose_name='Nombre del Cliente')),
+                ('telefono_cliente', models.CharField(blank=True, max_length=20, verbose_name='Teléfono del Cliente')),
+                ('direccion_entrega', models.TextField(blank=True, verbose_name='Dirección de Entrega')),
+                ('metodo_pago', models.CharField(choices=[('efectivo', 'Efectivo'), ('tarjeta', 'Tarjeta de Crédito/Débito'), ('transferencia', 'Transferencia Bancaria')], max_length=20, verbose_name='Método de Pago')),
+                ('estado', models.CharField(choices=[('pagada', 'Pagada'), ('pendiente', 'Pendiente'), ('anulada', 'Anulada'), ('parcialmente_devuelta', 'Parcialmente Devuelta'), ('totalmente_devuelta', 'Totalmente Devuelta')], max_length=30, verbose_name='Estado de la Factura')),
+                ('productos_devueltos', models.JSONField(blank=True, null=True, verbose_name='Productos Devueltos')),
+                ('fecha_devolucion', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Devolución')),
+                ('motivo_anulacion', models.TextField(blank=True, verbose_name='Motivo de Anulación')),
+                ('subtotal', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Subtotal')),
+                ('iva', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='IVA 12%')),
+                ('envio', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Costo de Envío')),
+                ('descuento', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Descuento')),
+                ('total', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Total')),
+                ('items', models.JSONField(verbose_name='Items de la Factura')),
+                ('notas', models.TextField(blank=True, verbose_name='Notas Adicionales')),
+                ('impresa', models.BooleanField(default=False, verbose_name='Factura Impresa')),
+                ('fecha_impresion', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Impresión')),
+                ('fecha_creacion', models.DateTimeField(verbose_name='Fecha de Creación')),
+                ('devoluciones_archivadas', models.JSONField(default=list, verbose_name='Devoluciones')),
+                ('fecha_archivado', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Archivado')),
+                ('creado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Creado por')),
+                ('pedido', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facturas', to='facturacion.pedidoarchivado', verbose_name='Pedido')),
+            ],
+            options={
+                'verbose_name': 'Factura Archivada',
+                'verbose_name_plural': 'Facturas Archivadas',
+                'ordering': ['-fecha_factura'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pedidoarchivado',
+            index=models.Index(fields=['fecha_pedido'], name='facturacion_fecha_p_d4ad2d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pedidoarchivado',
+            index=models.Index(fields=['estado'], name='facturacion_estado_b6638b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facturaarchivada',
+            index=models.Index(fields=['fecha_factura'], name='facturacion_fecha_f_3a3332_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facturaarchivada',
+            index=models.Index(fields=['estado'], name='facturacion_estado_356f86_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-19 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0020_archivo_pedidos_facturas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='factura',
+            index=models.Index(fields=['fecha_factura', 'id'], name='facturacion_fecha_f_e6550b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='factura',
+            index=models.Index(fields=['estado', 'fecha_factura'], name='facturacion_estado_4fd912_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0021_factura_indices_paginacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='factura',
+            name='items_version',
+            field=models.PositiveSmallIntegerField(default=1, help_text='2 = items en formato canónico (ver facturacion/items.py)', verbose_name='Versión del Esquema de Items'),
+        ),
+        migrations.AddField(
+            model_name='facturaarchivada',
+            name='items_version',
+            field=models.PositiveSmallIntegerField(default=1, verbose_name='Versión del Esquema de Items'),
+        ),
+        migrations.AddField(
+            model_name='pedido',
+            name='items_version',
+            field=models.PositiveSmallIntegerField(default=1, help_text='2 = items en formato canónico (ver facturacion/items.py)', verbose_name='Versión del Esquema de Items'),
+        ),
+        migrations.AddField(
+            model_name='pedidoarchivado',
+            name='items_version',
+            field=models.PositiveSmallIntegerField(default=1, verbose_name='Versión del Esquema de Items'),
+        ),
+    ]
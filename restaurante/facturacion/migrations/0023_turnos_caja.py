@@ -0,0 +1,78 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('facturacion', '0022_items_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TurnoCaja',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('caja', models.CharField(default='principal', max_length=30, verbose_name='Caja')),
+                ('estado', models.CharField(choices=[('abierto', 'Abierto'), ('cerrado', 'Cerrado')], default='abierto', max_length=10, verbose_name='Estado')),
+                ('caja_abierta', models.CharField(blank=True, editable=False, max_length=30, null=True, unique=True, verbose_name='Caja Abierta')),
+                ('fecha_apertura', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Apertura')),
+                ('fecha_cierre', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Cierre')),
+                ('monto_inicial', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Fondo Inicial')),
+                ('efectivo_contado', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Efectivo Contado')),
+                ('cantidad_facturas', models.PositiveIntegerField(default=0, verbose_name='Facturas Cobradas')),
+                ('total_ventas', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total Ventas')),
+                ('cantidad_devoluciones', models.PositiveIntegerField(default=0, verbose_name='Devoluciones')),
+                ('total_devoluciones', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total Devuelto')),
+                ('cantidad_abonos', models.PositiveIntegerField(default=0, verbose_name='Abonos a Cuenta')),
+                ('total_abonos', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total Abonado')),
+                ('factura_maxima', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Factura más Alta')),
+                ('factura_minima', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Factura más Baja')),
+                ('resumen', models.JSONField(blank=True, null=True, verbose_name='Resumen del Cierre')),
+                ('abierto_por', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='turnos_abiertos', to=settings.AUTH_USER_MODEL, verbose_name='Abierto por')),
+                ('cerrado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='turnos_cerrados', to=settings.AUTH_USER_MODEL, verbose_name='Cerrado por')),
+            ],
+            options={
+                'verbose_name': 'Turno de Caja',
+                'verbose_name_plural': 'Turnos de Caja',
+                'ordering': ['-fecha_apertura'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TotalTurno',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metodo_pago', models.CharField(choices=[('efectivo', 'Efectivo'), ('tarjeta', 'Tarjeta de Crédito/Débito'), ('transferencia', 'Transferencia Bancaria')], max_length=20, verbose_name='Método de Pago')),
+                ('cantidad_facturas', models.PositiveIntegerField(default=0, verbose_name='Facturas')),
+                ('total_ventas', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Ventas')),
+                ('cantidad_devoluciones', models.PositiveIntegerField(default=0, verbose_name='Devoluciones')),
+                ('total_devoluciones', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Devuelto')),
+                ('cantidad_abonos', models.PositiveIntegerField(default=0, verbose_name='Abonos')),
+                ('total_abonos', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Abonado')),
+                ('turno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='totales', to='facturacion.turnocaja', verbose_name='Turno')),
+                ('usuario', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Total de Turno',
+                'verbose_name_plural': 'Totales de Turno',
+            },
+        ),
+        migrations.AddField(
+            model_name='factura',
+            name='turno',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='facturas', to='facturacion.turnocaja', verbose_name='Turno de Caja'),
+        ),
+        migrations.AddIndex(
+            model_name='turnocaja',
+            index=models.Index(fields=['estado', 'abierto_por'], name='facturacion_estado_afe1ad_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='totalturno',
+            unique_together={('turno', 'metodo_pago', 'usuario')},
+        ),
+    ]
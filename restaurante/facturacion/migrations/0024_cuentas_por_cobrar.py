@@ -0,0 +1,60 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('facturacion', '0023_turnos_caja'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='saldo',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Saldo Pendiente'),
+        ),
+        migrations.AlterField(
+            model_name='factura',
+            name='metodo_pago',
+            field=models.CharField(choices=[('efectivo', 'Efectivo'), ('tarjeta', 'Tarjeta de Crédito/Débito'), ('transferencia', 'Transferencia Bancaria'), ('credito', 'Crédito (Cuenta por Cobrar)')], default='efectivo', max_length=20, verbose_name='Método de Pago'),
+        ),
+        migrations.AlterField(
+            model_name='facturaarchivada',
+            name='metodo_pago',
+            field=models.CharField(choices=[('efectivo', 'Efectivo'), ('tarjeta', 'Tarjeta de Crédito/Débito'), ('transferencia', 'Transferencia Bancaria'), ('credito', 'Crédito (Cuenta por Cobrar)')], max_length=20, verbose_name='Método de Pago'),
+        ),
+        migrations.AlterField(
+            model_name='totalturno',
+            name='metodo_pago',
+            field=models.CharField(choices=[('efectivo', 'Efectivo'), ('tarjeta', 'Tarjeta de Crédito/Débito'), ('transferencia', 'Transferencia Bancaria'), ('credito', 'Crédito (Cuenta por Cobrar)')], max_length=20, verbose_name='Método de Pago'),
+        ),
+        migrations.CreateModel(
+            name='MovimientoCuenta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('cargo', 'Cargo'), ('pago', 'Pago'), ('ajuste', 'Ajuste')], max_length=10, verbose_name='Tipo')),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Monto')),
+                ('saldo_resultante', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Saldo después del Movimiento')),
+                ('saldo_pendiente', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Pendiente por Cobrar')),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha')),
+                ('fecha_vencimiento', models.DateField(blank=True, null=True, verbose_name='Fecha de Vencimiento')),
+                ('numero_factura', models.CharField(blank=True, max_length=50, verbose_name='Número de Factura')),
+                ('descripcion', models.CharField(blank=True, max_length=200, verbose_name='Descripción')),
+                ('cliente', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='movimientos', to='facturacion.cliente', verbose_name='Cliente')),
+                ('creado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Registrado por')),
+                ('factura', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimientos_cuenta', to='facturacion.factura', verbose_name='Factura')),
+            ],
+            options={
+                'verbose_name': 'Movimiento de Cuenta',
+                'verbose_name_plural': 'Movimientos de Cuenta',
+                'ordering': ['-fecha', '-id'],
+                'indexes': [models.Index(fields=['cliente', 'fecha'], name='facturacion_cliente_d428e2_idx'), models.Index(fields=['fecha_vencimiento', 'saldo_pendiente'], name='facturacion_fecha_v_73299f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:05
+
+from django.db import migrations, models
+
+
+def _acumular(productos_por_devolucion):
+    cantidades = {}
+    productos = []
+    for lista in productos_por_devolucion:
+        for producto in lista or []:
+            clave = str(producto.get('nombre', '')).strip().lower()
+            cantidades[clave] = cantidades.get(clave, 0) + float(producto.get('cantidad', 0))
+            productos.append(producto)
+    return cantidades, productos
+
+
+def llenar_cantidades_devueltas(apps, schema_editor):
+    """Construir el mapa y el registro de productos devueltos desde las devoluciones existentes"""
+    Factura = apps.get_model('facturacion', 'Factura')
+    FacturaArchivada = apps.get_model('facturacion', 'FacturaArchivada')
+    Devolucion = apps.get_model('facturacion', 'Devolucion')
+
+    por_factura = {}
+    for factura_id, productos in Devolucion.objects.order_by('id').values_list('factura_id', 'productos_devueltos'):
+        por_factura.setdefault(factura_id, []).append(productos)
+    for factura_id, listas in por_factura.items():
+        cantidades, productos = _acumular(listas)
+        Factura.objects.filter(id=factura_id).update(
+            cantidades_devueltas=cantidades, productos_devueltos=productos
+        )
+
+    for factura in FacturaArchivada.objects.exclude(devoluciones_archivadas=[]).only('id', 'devoluciones_archivadas'):
+        cantidades, productos = _acumular(
+            devolucion.get('productos_devueltos') for devolucion in factura.devoluciones_archivadas
+        )
+        FacturaArchivada.objects.filter(id=factura.id).update(
+            cantidades_devueltas=cantidades, productos_devueltos=productos
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0024_cuentas_por_cobrar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='factura',
+            name='cantidades_devueltas',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Cantidades Devueltas'),
+        ),
+        migrations.AddField(
+            model_name='facturaarchivada',
+            name='cantidades_devueltas',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Cantidades Devueltas'),
+        ),
+        migrations.RunPython(llenar_cantidades_devueltas, migrations.RunPython.noop),
+    ]
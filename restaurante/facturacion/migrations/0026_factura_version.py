@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0025_cantidades_devueltas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='factura',
+            name='ultima_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Última Actualización'),
+        ),
+        migrations.AddField(
+            model_name='factura',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Versión'),
+        ),
+    ]
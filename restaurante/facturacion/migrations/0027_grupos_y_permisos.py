@@ -0,0 +1,40 @@
+from django.db import migrations
+
+GRUPOS = ['Administrador', 'Gerente', 'Cajero', 'Mesero', 'Cocinero', 'Usuario Normal']
+
+PERMISOS_MODULOS = [
+    ('access_inventario', 'Puede acceder al módulo de inventario'),
+    ('access_facturacion', 'Puede acceder al módulo de facturación'),
+    ('access_pedidos', 'Puede acceder al módulo de pedidos'),
+    ('access_gestion_pedidos', 'Puede acceder al módulo de gestión de pedidos'),
+]
+
+
+def crear_grupos_y_permisos(apps, schema_editor):
+    """Grupos por defecto y permisos de módulo (antes se creaban en cada GET de roles)"""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Permission = apps.get_model('auth', 'Permission')
+    Group = apps.get_model('auth', 'Group')
+
+    content_type, _ = ContentType.objects.get_or_create(app_label='auth', model='user')
+    for codename, nombre in PERMISOS_MODULOS:
+        Permission.objects.get_or_create(
+            codename=codename,
+            content_type=content_type,
+            defaults={'name': nombre},
+        )
+    for nombre in GRUPOS:
+        Group.objects.get_or_create(name=nombre)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('facturacion', '0026_factura_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_grupos_y_permisos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:36
+
+from django.db import migrations, models
+
+TABLA = 'facturacion_entradabusqueda'
+TABLA_FTS = f'{TABLA}_fts'
+
+# SQLite: tabla FTS5 de contenido externo (solo guarda el índice) sincronizada
+# con triggers. prefix acelera las búsquedas 'qz<1 a 4 caracteres>*'.
+SQLITE_CREAR = [
+    f"""CREATE VIRTUAL TABLE {TABLA_FTS} USING fts5(
+        tipo, claves, content='{TABLA}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='3 4 5 6')""",
+    f"""CREATE TRIGGER {TABLA}_ai AFTER INSERT ON {TABLA} BEGIN
+        INSERT INTO {TABLA_FTS}(rowid, tipo, claves) VALUES (new.id, new.tipo, new.claves);
+    END""",
+    f"""CREATE TRIGGER {TABLA}_ad AFTER DELETE ON {TABLA} BEGIN
+        INSERT INTO {TABLA_FTS}({TABLA_FTS}, rowid, tipo, claves)
+        VALUES ('delete', old.id, old.tipo, old.claves);
+    END""",
+    f"""CREATE TRIGGER {TABLA}_au AFTER UPDATE ON {TABLA} BEGIN
+        INSERT INTO {TABLA_FTS}({TABLA_FTS}, rowid, tipo, claves)
+        VALUES ('delete', old.id, old.tipo, old.claves);
+        INSERT INTO {TABLA_FTS}(rowid, tipo, claves) VALUES (new.id, new.tipo, new.claves);
+    END""",
+]
+SQLITE_ELIMINAR = [
+    f'DROP TRIGGER IF EXISTS {TABLA}_ai',
+    f'DROP TRIGGER IF EXISTS {TABLA}_ad',
+    f'DROP TRIGGER IF EXISTS {TABLA}_au',
+    f'DROP TABLE IF EXISTS {TABLA_FTS}',
+]
+
+# MySQL: índice FULLTEXT (InnoDB) consultado con MATCH ... IN BOOLEAN MODE
+MYSQL_CREAR = [f'ALTER TABLE {TABLA} ADD FULLTEXT INDEX {TABLA}_claves_ft (claves)']
+MYSQL_ELIMINAR = [f'ALTER TABLE {TABLA} DROP INDEX {TABLA}_claves_ft']
+
+
+def _ejecutar(schema_editor, por_motor):
+    for sentencia in por_motor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sentencia)
+
+
+def crear_indice(apps, schema_editor):
+    """Índice de texto de claves según la base de datos (otras usan LIKE)"""
+    _ejecutar(schema_editor, {'sqlite': SQLITE_CREAR, 'mysql': MYSQL_CREAR})
+
+
+def eliminar_indice(apps, schema_editor):
+    _ejecutar(schema_editor, {'sqlite': SQLITE_ELIMINAR, 'mysql': MYSQL_ELIMINAR})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0027_grupos_y_permisos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntradaBusqueda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('pedido', 'Pedido'), ('factura', 'Factura'), ('cliente', 'Cliente'), ('producto', 'Producto'), ('plato', 'Plato')], max_length=10, verbose_name='Tipo')),
+                ('objeto_id', models.IntegerField(verbose_name='ID del Objeto')),
+                ('titulo', models.CharField(max_length=200, verbose_name='Título')),
+                ('detalle', models.CharField(blank=True, max_length=255, verbose_name='Detalle')),
+                ('claves', models.TextField(verbose_name='Claves de Búsqueda')),
+                ('archivado', models.BooleanField(default=False, verbose_name='Archivado')),
+                ('actualizado', models.DateTimeField(auto_now=True, verbose_name='Actualizado')),
+            ],
+            options={
+                'verbose_name': 'Entrada de Búsqueda',
+                'verbose_name_plural': 'Índice de Búsqueda',
+                'unique_together': {('tipo', 'objeto_id')},
+            },
+        ),
+        # Las filas existentes se indexan con `manage.py reindexar_busqueda`
+        # después de migrar: la migración no depende de busqueda.py
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
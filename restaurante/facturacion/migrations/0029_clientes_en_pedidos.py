@@ -0,0 +1,78 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0028_indice_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='primera_visita',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Primera Visita'),
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='total_gastado',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total Gastado'),
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='ultima_visita',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Última Visita'),
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='visitas',
+            field=models.PositiveIntegerField(default=0, verbose_name='Visitas'),
+        ),
+        migrations.AddField(
+            model_name='factura',
+            name='cliente',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='facturas', to='facturacion.cliente', verbose_name='Cliente'),
+        ),
+        migrations.AddField(
+            model_name='facturaarchivada',
+            name='cliente',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='facturas_archivadas', to='facturacion.cliente', verbose_name='Cliente'),
+        ),
+        migrations.AddField(
+            model_name='pedido',
+            name='cliente',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pedidos', to='facturacion.cliente', verbose_name='Cliente'),
+        ),
+        migrations.AddField(
+            model_name='pedidoarchivado',
+            name='cliente',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pedidos_archivados', to='facturacion.cliente', verbose_name='Cliente'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['telefono_principal'], name='facturacion_telefon_9ede1d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['telefono_alternativo'], name='facturacion_telefon_6decd2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['primera_visita'], name='facturacion_primera_5a8c10_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['ultima_visita'], name='facturacion_ultima__14ff75_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='factura',
+            index=models.Index(fields=['cliente', 'fecha_factura'], name='facturacion_cliente_bac69f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facturaarchivada',
+            index=models.Index(fields=['cliente', 'fecha_factura'], name='facturacion_cliente_1d4364_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def sembrar_historial(apps, schema_editor):
+    """Precio actual de cada plato y producto, vigente desde su creación"""
+    HistorialPrecio = apps.get_model('facturacion', 'HistorialPrecio')
+    for tipo, nombre, campo in (('plato', 'Plato', 'precio'), ('producto', 'Producto', 'precio_compra')):
+        modelo = apps.get_model('facturacion', nombre)
+        entradas = []
+        for objeto_id, precio, fecha in modelo.objects.values_list('id', campo, 'fecha_creacion').iterator():
+            entradas.append(HistorialPrecio(tipo=tipo, objeto_id=objeto_id, precio=precio, vigente_desde=fecha))
+            if len(entradas) == 1000:
+                HistorialPrecio.objects.bulk_create(entradas)
+                entradas = []
+        HistorialPrecio.objects.bulk_create(entradas)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('facturacion', '0029_clientes_en_pedidos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CambioPrecio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('plato', 'Platos'), ('producto', 'Productos')], max_length=10, verbose_name='Catálogo')),
+                ('modo', models.CharField(choices=[('porcentaje', 'Porcentaje'), ('monto', 'Monto fijo')], max_length=10, verbose_name='Modo')),
+                ('valor', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Valor')),
+                ('categoria', models.CharField(blank=True, max_length=50, verbose_name='Categoría')),
+                ('codigos', models.JSONField(blank=True, default=list, verbose_name='Códigos')),
+                ('vigente_desde', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Vigente Desde')),
+                ('estado', models.CharField(choices=[('programado', 'Programado'), ('aplicado', 'Aplicado'), ('cancelado', 'Cancelado')], default='programado', max_length=10, verbose_name='Estado')),
+                ('filas_afectadas', models.PositiveIntegerField(default=0, verbose_name='Filas Afectadas')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_aplicacion', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Aplicación')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cambios_precio', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Cambio de Precio',
+                'verbose_name_plural': 'Cambios de Precio',
+                'ordering': ['-fecha_creacion'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HistorialPrecio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('plato', 'Platos'), ('producto', 'Productos')], max_length=10, verbose_name='Catálogo')),
+                ('objeto_id', models.IntegerField(verbose_name='ID del Objeto')),
+                ('precio', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Precio')),
+                ('vigente_desde', models.DateTimeField(verbose_name='Vigente Desde')),
+                ('cambio', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='historial', to='facturacion.cambioprecio', verbose_name='Cambio Masivo')),
+            ],
+            options={
+                'verbose_name': 'Historial de Precio',
+                'verbose_name_plural': 'Historial de Precios',
+                'indexes': [models.Index(fields=['tipo', 'objeto_id', 'vigente_desde'], name='facturacion_tipo_159162_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cambioprecio',
+            index=models.Index(fields=['estado', 'vigente_desde'], name='facturacion_estado_5d5f91_idx'),
+        ),
+        migrations.RunPython(sembrar_historial, migrations.RunPython.noop),
+    ]
@@ -4,10 +4,17 @@ import random
 import string
 from decimal import Decimal
 from django.db.models import Max
-import re
+from django.db.models.functions import Length
+from django.db.models.signals import post_save
 from django.contrib.auth.models import User
 import json
 from django.core.validators import MinValueValidator, MaxValueValidator
+from .cache_modelos import ManagerEtiquetado
+from .items import ITEMS_VERSION, canonicalizar_items, items_detalle_v2
+from .registro import obtener_logger
+
+logger = obtener_logger('modelos')
+
 
 class Producto(models.Model):
     # Opciones de categoría
@@ -70,6 +77,8 @@ class Producto(models.Model):
         verbose_name="Fecha de actualización"
     )
     
+    objects = ManagerEtiquetado()
+    
     class Meta:
         verbose_name = "Producto"
         verbose_name_plural = "Productos"
@@ -78,16 +87,41 @@ class Producto(models.Model):
     def save(self, *args, **kwargs):
         # Generar código automático si no existe
         if not self.codigo:
-            categoria_abrev = self.categoria[:3].upper() if self.categoria else 'GEN'
-            fecha = timezone.now().strftime("%y%m%d")
             random_str = ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
-            self.codigo = f"PROD-{categoria_abrev}-{fecha}-{random_str}"
+            self.codigo = f"{self.prefijo_codigo(self.categoria)}{random_str}"
         
         # Calcular subtotal automáticamente
         self.subtotal = self.cantidad * self.precio_compra
         
         super().save(*args, **kwargs)
     
+    @staticmethod
+    def prefijo_codigo(categoria):
+        """PROD-<categoría>-<fecha>-: los códigos de hoy solo difieren en 4 caracteres al azar"""
+        categoria_abrev = categoria[:3].upper() if categoria else 'GEN'
+        return f"PROD-{categoria_abrev}-{timezone.now().strftime('%y%m%d')}-"
+    
+    @classmethod
+    def generar_codigos(cls, categorias):
+        """
+        Un código nuevo por cada categoría de la lista (importación masiva), sin
+        repetir entre sí ni con los existentes: una consulta por prefijo en lugar
+        de confiar en el azar fila por fila.
+        """
+        prefijos = {categoria: cls.prefijo_codigo(categoria) for categoria in set(categorias)}
+        ocupados = set()
+        for prefijo in set(prefijos.values()):
+            ocupados.update(cls.objects.filter(codigo__startswith=prefijo).values_list('codigo', flat=True))
+        codigos = []
+        for categoria in categorias:
+            codigo = None
+            while codigo is None or codigo in ocupados:
+                random_str = ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
+                codigo = f"{prefijos[categoria]}{random_str}"
+            ocupados.add(codigo)
+            codigos.append(codigo)
+        return codigos
+    
     def get_category_label(self):
         """Obtener etiqueta legible de la categoría"""
         for code, label in self.CATEGORIAS:
@@ -147,6 +181,8 @@ class Plato(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
     activo = models.BooleanField(default=True, verbose_name="Activo")
     
+    objects = ManagerEtiquetado()
+    
     class Meta:
         verbose_name = "Plato"
         verbose_name_plural = "Platos"
@@ -163,20 +199,27 @@ class Plato(models.Model):
     
     @classmethod
     def generar_codigo(cls):
-        # Obtener el último código existente
-        ultimo_plato = cls.objects.filter(
-            codigo__regex=r'^COD\d{3}$'
-        ).order_by('codigo').last()
-        
-        if ultimo_plato:
-            # Extraer el número del último código
-            ultimo_numero = int(re.search(r'\d+', ultimo_plato.codigo).group())
-            nuevo_numero = ultimo_numero + 1
-        else:
-            nuevo_numero = 1
+        return cls.siguientes_codigos(1)[0]
+    
+    @classmethod
+    def siguientes_codigos(cls, cantidad, ocupados=()):
+        """
+        ``cantidad`` códigos consecutivos libres (COD001, COD002... COD1000) con
+        una sola consulta. Se ordena por largo y luego por texto para que
+        COD1000 quede después de COD999.
+        """
+        ultimo = cls.objects.filter(
+            codigo__regex=r'^COD\d+$'
+        ).annotate(largo=Length('codigo')).order_by('-largo', '-codigo').values_list('codigo', flat=True).first()
+        numero = int(ultimo[3:]) if ultimo else 0
         
-        # Formatear como COD001, COD002, etc.
-        return f"COD{nuevo_numero:03d}"
+        codigos = []
+        while len(codigos) < cantidad:
+            numero += 1
+            codigo = f"COD{numero:03d}"
+            if codigo not in ocupados:
+                codigos.append(codigo)
+        return codigos
     
     def get_categoria_display_color(self):
         """Devuelve el color según la categoría para mostrar en el frontend"""
@@ -228,6 +271,8 @@ class Mesa(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ManagerEtiquetado()
+    
     @property
     def numero_display(self):
         """Propiedad para obtener solo el número sin la palabra 'mesa'"""
@@ -356,6 +401,15 @@ class Pedido(models.Model):
         blank=True, 
         verbose_name="Teléfono"
     )
+    # Cliente registrado, si se pudo identificar (ver facturacion/visitas.py)
+    cliente = models.ForeignKey(
+        'Cliente',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='pedidos',
+        verbose_name="Cliente"
+    )
     direccion_entrega = models.TextField(
         blank=True, 
         verbose_name="Dirección de Entrega"
@@ -366,6 +420,11 @@ class Pedido(models.Model):
         verbose_name="Items del Pedido",
         help_text="Lista de platos en formato JSON"
     )
+    items_version = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name="Versión del Esquema de Items",
+        help_text="2 = items en formato canónico (ver facturacion/items.py)"
+    )
     subtotal = models.DecimalField(
         max_digits=10, 
         decimal_places=2,
@@ -421,6 +480,10 @@ class Pedido(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ManagerEtiquetado()
+
+    archivado = False
     
     def __str__(self):
         return f"Pedido {self.codigo_pedido} - {self.get_tipo_pedido_display()}"
@@ -432,13 +495,13 @@ class Pedido(models.Model):
             if self.facturas.filter(estado='pagada').exists():
                 self.mesa.estado = 'disponible'
                 self.mesa.save()
-                print(f"✅ Mesa {self.mesa.numero_display} liberada por factura pagada")
+                logger.debug('✅ Mesa %s liberada por factura pagada', self.mesa.numero_display)
                 return True
             # Si el pedido está cancelado, también liberar mesa
             elif self.estado == 'cancelado':
                 self.mesa.estado = 'disponible'
                 self.mesa.save()
-                print(f"✅ Mesa {self.mesa.numero_display} liberada por pedido cancelado")
+                logger.debug('✅ Mesa %s liberada por pedido cancelado', self.mesa.numero_display)
                 return True
         return False
     
@@ -459,6 +522,10 @@ class Pedido(models.Model):
             
             self.codigo_pedido = f'ORD-{timestamp}-{new_num:04d}'
         
+        # Guardar siempre los items en el esquema canónico
+        self.items = canonicalizar_items(self.items)
+        self.items_version = ITEMS_VERSION
+        
         # Guardar el pedido
         super().save(*args, **kwargs)
         
@@ -469,7 +536,9 @@ class Pedido(models.Model):
                 if self.mesa.estado != 'ocupada':
                     self.mesa.estado = 'ocupada'
                     self.mesa.save()
-                    print(f"✅ Mesa {self.mesa.numero_display} ocupada por pedido {self.codigo_pedido} (estado: {self.estado})")
+                    logger.debug(
+                        '✅ Mesa %s ocupada por pedido %s (estado: %s)',
+                        self.mesa.numero_display, self.codigo_pedido, self.estado)
             elif self.estado in ['completado', 'cancelado']:
                 # Solo liberar si tiene factura pagada o está cancelado
                 self.liberar_mesa_si_corresponde()
@@ -500,6 +569,8 @@ class Pedido(models.Model):
     
     def get_items_detalle(self):
         """Obtener los items del pedido como lista"""
+        if self.items_version >= ITEMS_VERSION:
+            return self.items
         try:
             return json.loads(self.items) if isinstance(self.items, str) else self.items
         except:
@@ -607,6 +678,31 @@ import json
 from django.core.serializers.json import DjangoJSONEncoder
 
 
+class ConflictoVersion(Exception):
+    """Otro usuario modificó la factura entre la lectura y la escritura"""
+
+    def __init__(self, factura, version_actual=None):
+        self.factura = factura
+        self.version_actual = version_actual
+        super().__init__(
+            f'La factura {factura.numero_factura} fue modificada por otro usuario. '
+            'Recarga e intenta de nuevo.'
+        )
+
+
+class PedidoYaFacturado(ConflictoVersion):
+    """Otro cajero cobró el pedido mientras esta pantalla seguía abierta"""
+
+    def __init__(self, factura):
+        self.factura = factura
+        self.version_actual = factura.version
+        Exception.__init__(
+            self,
+            f'El pedido ya se cobró en la factura {factura.numero_factura}. '
+            'Recarga e intenta de nuevo.'
+        )
+
+
 class Factura(models.Model):
     """Modelo para almacenar facturas generadas"""
     
@@ -614,6 +710,7 @@ class Factura(models.Model):
         ('efectivo', 'Efectivo'),
         ('tarjeta', 'Tarjeta de Crédito/Débito'),
         ('transferencia', 'Transferencia Bancaria'),
+        ('credito', 'Crédito (Cuenta por Cobrar)'),
     ]
     
     ESTADO_FACTURA_CHOICES = [
@@ -663,6 +760,14 @@ class Factura(models.Model):
         blank=True,
         verbose_name="Teléfono del Cliente"
     )
+    cliente = models.ForeignKey(
+        'Cliente',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='facturas',
+        verbose_name="Cliente"
+    )
     direccion_entrega = models.TextField(
         blank=True,
         verbose_name="Dirección de Entrega"
@@ -688,6 +793,13 @@ class Factura(models.Model):
         verbose_name="Productos Devueltos",
         help_text="Registro de productos devueltos en formato JSON"
     )
+    # Unidades devueltas por producto ({nombre normalizado: cantidad}),
+    # se actualiza en la misma transacción que crea cada Devolucion
+    cantidades_devueltas = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Cantidades Devueltas"
+    )
     
     fecha_devolucion = models.DateTimeField(
         null=True,
@@ -734,6 +846,11 @@ class Factura(models.Model):
         verbose_name="Items de la Factura",
         help_text="Items en formato JSON"
     )
+    items_version = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name="Versión del Esquema de Items",
+        help_text="2 = items en formato canónico (ver facturacion/items.py)"
+    )
     
     # Notas adicionales
     notas = models.TextField(
@@ -761,7 +878,30 @@ class Factura(models.Model):
         verbose_name="Creado por"
     )
     fecha_creacion = models.DateTimeField(auto_now_add=True)
-    
+
+    # Turno de caja en el que se cobró (None si se cobró sin turno abierto)
+    turno = models.ForeignKey(
+        'TurnoCaja',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='facturas',
+        verbose_name="Turno de Caja"
+    )
+
+    # Control de concurrencia optimista: cada escritura incrementa la versión
+    version = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Versión"
+    )
+    ultima_actualizacion = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Última Actualización"
+    )
+
+    objects = ManagerEtiquetado()
+
+    archivado = False
     
     def __str__(self):
         return f"Factura {self.numero_factura} - Pedido: {self.pedido.codigo_pedido}"
@@ -786,54 +926,86 @@ class Factura(models.Model):
             
             self.numero_factura = f'FAC-{timestamp}-{new_num:06d}'
         
+        # Guardar siempre los items en el esquema canónico
+        self.items = canonicalizar_items(self.items)
+        self.items_version = ITEMS_VERSION
+        
+        if not self._state.adding:
+            self.version += 1
+        
         super().save(*args, **kwargs)
     
+    def guardar_con_version(self, *campos):
+        """
+        Guardar los campos indicados solo si nadie modificó la factura desde que
+        se leyó (UPDATE ... WHERE id = ? AND version = ?). Si otra escritura ganó,
+        lanza ConflictoVersion y no se modifica nada.
+        """
+        ahora = timezone.now()
+        valores = {campo: getattr(self, campo) for campo in campos}
+        actualizadas = Factura.objects.filter(pk=self.pk, version=self.version).update(
+            version=models.F('version') + 1,
+            ultima_actualizacion=ahora,
+            **valores
+        )
+        if not actualizadas:
+            version_actual = Factura.objects.filter(pk=self.pk).values_list('version', flat=True).first()
+            raise ConflictoVersion(self, version_actual)
+        self.version += 1
+        self.ultima_actualizacion = ahora
+        # Avisar como un save() normal (índice de búsqueda, visitas del cliente)
+        post_save.send(sender=Factura, instance=self, created=False, raw=False,
+                       using=Factura.objects.db, update_fields=frozenset(campos))
+    
     def get_items_detalle(self):
         """Obtener los items de la factura como lista normalizada"""
+        # Camino rápido: items canónicos, sin reparaciones ni consultas
+        if self.items_version >= ITEMS_VERSION:
+            return items_detalle_v2(self.items)
         try:
             # Obtener items como JSON
             items_raw = self.items
             
-            print(f"\n🔍 GET_ITEMS_DETALLE - Factura: {self.numero_factura}")
-            print(f"   Tipo de items_raw: {type(items_raw)}")
+            logger.debug('🔍 GET_ITEMS_DETALLE - Factura: %s', self.numero_factura)
+            logger.debug('Tipo de items_raw: %s', type(items_raw))
             
             # Si items_raw es None o vacío
             if not items_raw:
-                print(f"   ❌ Campo 'items' está vacío o es None")
+                logger.debug("Campo 'items' está vacío o es None")
                 return []
             
             # Si es una cadena, intentar convertir a JSON
             if isinstance(items_raw, str):
-                print(f"   📝 Es una cadena, intentando parsear JSON...")
-                print(f"   📝 Longitud: {len(items_raw)}")
+                logger.debug('📝 Es una cadena, intentando parsear JSON...')
+                logger.debug('📝 Longitud: %s', len(items_raw))
                 
                 items_raw = items_raw.strip()
                 
                 if not items_raw:
-                    print(f"   ❌ Cadena vacía después de strip()")
+                    logger.debug('Cadena vacía después de strip()')
                     return []
                 
                 try:
                     items = json.loads(items_raw)
-                    print(f"   ✅ JSON parseado exitosamente")
+                    logger.debug('✅ JSON parseado exitosamente')
                 except json.JSONDecodeError as e:
-                    print(f"   ❌ Error de decodificación JSON: {e}")
+                    logger.error('❌ Error de decodificación JSON: %s', e)
                     try:
                         if items_raw.startswith("'") and items_raw.endswith("'"):
                             items_raw = items_raw[1:-1].replace("'", '"')
                         items_raw = items_raw.replace("'", '"')
                         items = json.loads(items_raw)
-                        print(f"   ✅ JSON reparado y parseado")
+                        logger.debug('✅ JSON reparado y parseado')
                     except Exception as e2:
-                        print(f"   ❌ No se pudo reparar el JSON: {e2}")
+                        logger.error('❌ No se pudo reparar el JSON: %s', e2)
                         return []
             else:
                 items = items_raw
-                print(f"   ✅ Ya es de tipo: {type(items)}")
+                logger.debug('✅ Ya es de tipo: %s', type(items))
             
             # Si items es un diccionario, convertirlo a lista
             if isinstance(items, dict):
-                print(f"   🔄 Convirtiendo diccionario a lista...")
+                logger.debug('🔄 Convirtiendo diccionario a lista...')
                 if 'items' in items:
                     items = items['items']
                 elif 'productos' in items:
@@ -843,20 +1015,20 @@ class Factura(models.Model):
             
             # Asegurarse de que items es una lista
             if not isinstance(items, list):
-                print(f"   ⚠️  Items no es una lista, es: {type(items)}. Convirtiendo...")
+                logger.warning('⚠️  Items no es una lista, es: %s. Convirtiendo...', type(items))
                 items = [items] if items else []
             
-            print(f"   📋 Total de items encontrados: {len(items)}")
+            logger.debug('📋 Total de items encontrados: %s', len(items))
             
             if not items:
-                print(f"   ⚠️  Lista de items vacía")
+                logger.warning('⚠️  Lista de items vacía')
                 return []
             
             # Normalizar estructura
             items_normalizados = []
             
             for i, item in enumerate(items):
-                print(f"\n   🔍 Procesando item {i+1}:")
+                logger.debug('🔍 Procesando item %s:', i+1)
                 
                 nombre = (
                     item.get('nombre') or 
@@ -866,7 +1038,7 @@ class Factura(models.Model):
                     f'Producto {i+1}'
                 )
                 
-                print(f"      Nombre: {nombre}")
+                logger.debug('Nombre: %s', nombre)
                 
                 # Asegurar que cantidad sea numérico
                 cantidad_str = str(item.get('cantidad') or item.get('quantity') or item.get('qty') or '1')
@@ -874,9 +1046,9 @@ class Factura(models.Model):
                     cantidad = float(cantidad_str)
                 except (ValueError, TypeError):
                     cantidad = 1.0
-                    print(f"      ⚠️  Cantidad inválida '{cantidad_str}', usando 1.0")
+                    logger.warning("⚠️  Cantidad inválida '%s', usando 1.0", cantidad_str)
                 
-                print(f"      Cantidad: {cantidad}")
+                logger.debug('Cantidad: %s', cantidad)
                 
                 # Asegurar que precio sea numérico
                 precio_str = str(item.get('precio') or item.get('price') or item.get('unit_price') or '0')
@@ -884,9 +1056,9 @@ class Factura(models.Model):
                     precio = float(precio_str)
                 except (ValueError, TypeError):
                     precio = 0.0
-                    print(f"      ⚠️  Precio inválido '{precio_str}', usando 0.0")
+                    logger.warning("⚠️  Precio inválido '%s', usando 0.0", precio_str)
                 
-                print(f"      Precio: {precio}")
+                logger.debug('Precio: %s', precio)
                 
                 # Calcular subtotal
                 subtotal = cantidad * precio
@@ -899,7 +1071,7 @@ class Factura(models.Model):
                     'otro'
                 ).lower()
                 
-                print(f"      Categoría: {categoria}")
+                logger.debug('Categoría: %s', categoria)
                 
                 # Obtener IDs
                 producto_id = item.get('producto_id') or item.get('product_id') or item.get('id')
@@ -917,9 +1089,9 @@ class Factura(models.Model):
                         try:
                             producto_db = Producto.objects.filter(id=producto_id).first()
                             if producto_db:
-                                print(f"      ✅ Producto encontrado por ID: {producto_db.nombre}")
+                                logger.debug('✅ Producto encontrado por ID: %s', producto_db.nombre)
                         except Exception as e:
-                            print(f"      ❌ Error al buscar producto por ID: {e}")
+                            logger.error('❌ Error al buscar producto por ID: %s', e)
                     
                     # Si no se encontró por ID, buscar por nombre
                     if not producto_db and nombre:
@@ -928,18 +1100,18 @@ class Factura(models.Model):
                                 nombre__iexact=nombre.strip()
                             ).first()
                             if producto_db:
-                                print(f"      ✅ Producto encontrado por nombre: {producto_db.nombre}")
+                                logger.debug('✅ Producto encontrado por nombre: %s', producto_db.nombre)
                         except Exception as e:
-                            print(f"      ❌ Error al buscar producto por nombre: {e}")
+                            logger.error('❌ Error al buscar producto por nombre: %s', e)
                     
                     # Completar información con datos de la base de datos
                     if producto_db:
                         if not codigo:
                             codigo = producto_db.codigo
-                            print(f"      ✅ Código actualizado: {codigo}")
+                            logger.debug('✅ Código actualizado: %s', codigo)
                         if categoria == 'otro':
                             categoria = producto_db.categoria.lower()
-                            print(f"      ✅ Categoría actualizada: {categoria}")
+                            logger.debug('✅ Categoría actualizada: %s', categoria)
                 
                 items_normalizados.append({
                     'producto_id': producto_id,
@@ -951,33 +1123,33 @@ class Factura(models.Model):
                     'categoria': categoria
                 })
             
-            print(f"\n   ✅ Items normalizados: {len(items_normalizados)}")
+            logger.debug('✅ Items normalizados: %s', len(items_normalizados))
             return items_normalizados
             
         except Exception as e:
-            print(f"\n❌ ERROR en get_items_detalle para factura {self.numero_factura}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error('❌ ERROR en get_items_detalle para factura %s: %s', self.numero_factura, str(e), exc_info=True)
             return []
     
+    @staticmethod
+    def clave_devolucion(producto_nombre):
+        """Clave de un producto en cantidades_devueltas (sin mayúsculas ni espacios extra)"""
+        return str(producto_nombre).strip().lower()
+    
     def get_cantidad_ya_devuelta(self, producto_nombre):
         """Calcular cuántas unidades de un producto ya fueron devueltas"""
-        total_devuelto = 0
-        
-        # Obtener todas las devoluciones de esta factura
-        devoluciones = self.devoluciones.all()
-        
-        for devolucion in devoluciones:
-            if devolucion.productos_devueltos:
-                for producto in devolucion.productos_devueltos:
-                    # Comparar nombres (case-insensitive y sin espacios extra)
-                    nombre_dev = str(producto.get('nombre', '')).strip().lower()
-                    nombre_buscar = str(producto_nombre).strip().lower()
-                    
-                    if nombre_dev == nombre_buscar:
-                        total_devuelto += float(producto.get('cantidad', 0))
-        
-        return total_devuelto
+        return float((self.cantidades_devueltas or {}).get(self.clave_devolucion(producto_nombre), 0))
+    
+    def agregar_productos_devueltos(self, productos):
+        """
+        Sumar una devolución al mapa de cantidades y al registro de productos
+        devueltos. Se llama dentro de la transacción de la devolución, antes de guardar.
+        """
+        cantidades = dict(self.cantidades_devueltas or {})
+        for producto in productos:
+            clave = self.clave_devolucion(producto.get('nombre', ''))
+            cantidades[clave] = cantidades.get(clave, 0) + float(producto.get('cantidad', 0))
+        self.cantidades_devueltas = cantidades
+        self.productos_devueltos = list(self.productos_devueltos or []) + list(productos)
     
     def get_productos_disponibles_devolucion(self):
         """Obtener productos con cantidades disponibles para devolución"""
@@ -1000,24 +1172,16 @@ class Factura(models.Model):
     
     def get_resumen_devoluciones(self):
         """Obtener resumen completo de devoluciones"""
-        devoluciones = self.devoluciones.all()
         resumen = {
             'total_devuelto': Decimal('0.00'),
             'productos': {}
         }
         
-        for devolucion in devoluciones:
-            resumen['total_devuelto'] += devolucion.monto_devuelto
-            
-            if devolucion.productos_devueltos:
-                for producto in devolucion.productos_devueltos:
-                    nombre = producto.get('nombre', '')
-                    cantidad = float(producto.get('cantidad', 0))
-                    
-                    if nombre in resumen['productos']:
-                        resumen['productos'][nombre] += cantidad
-                    else:
-                        resumen['productos'][nombre] = cantidad
+        for producto in self.productos_devueltos or []:
+            nombre = producto.get('nombre', '')
+            cantidad = float(producto.get('cantidad', 0))
+            resumen['total_devuelto'] += Decimal(str(producto.get('subtotal', 0)))
+            resumen['productos'][nombre] = resumen['productos'].get(nombre, 0) + cantidad
         
         return resumen
     
@@ -1037,10 +1201,10 @@ class Factura(models.Model):
             self.pedido.save()
     
     def marcar_impresa(self):
-        """Marcar la factura como impresa"""
+        """Marcar la factura como impresa (sin save(): imprimir no cambia la versión)"""
         self.impresa = True
         self.fecha_impresion = timezone.now()
-        self.save()
+        Factura.objects.filter(pk=self.pk).update(impresa=True, fecha_impresion=self.fecha_impresion)
     
     def get_resumen_productos(self):
         """Obtener resumen de productos para depuración"""
@@ -1059,23 +1223,28 @@ class Factura(models.Model):
     
     def imprimir_info_depuracion(self):
         """Imprimir información de depuración en consola"""
-        print(f"\n{'='*60}")
-        print(f"📄 FACTURA: {self.numero_factura}")
-        print(f"📦 Items en factura ({len(self.get_items_detalle())}):")
+        logger.debug('%s', '='*60)
+        logger.debug('📄 FACTURA: %s', self.numero_factura)
+        logger.debug('📦 Items en factura (%s):', len(self.get_items_detalle()))
         
         for i, item in enumerate(self.get_items_detalle(), 1):
-            print(f"  {i}. {item.get('nombre', 'Sin nombre')}")
-            print(f"     Código: '{item.get('codigo', 'Sin código')}'")
-            print(f"     Cantidad: {item.get('cantidad', 0)}")
-            print(f"     Categoría: '{item.get('categoria', '')}'")
-            print(f"     Precio: ${item.get('precio', 0):.2f}")
+            logger.debug('%s. %s', i, item.get('nombre', 'Sin nombre'))
+            logger.debug("Código: '%s'", item.get('codigo', 'Sin código'))
+            logger.debug('Cantidad: %s', item.get('cantidad', 0))
+            logger.debug("Categoría: '%s'", item.get('categoria', ''))
+            logger.debug('Precio: $%.2f', item.get('precio', 0))
         
-        print(f"{'='*60}\n")
+        logger.debug('%s', '='*60)
     
     class Meta:
         verbose_name = "Factura"
         verbose_name_plural = "Facturas"
         ordering = ['-fecha_factura']
+        indexes = [
+            models.Index(fields=['fecha_factura', 'id']),
+            models.Index(fields=['estado', 'fecha_factura']),
+            models.Index(fields=['cliente', 'fecha_factura']),
+        ]
 
 class SalidaProducto(models.Model):
     MOTIVOS = [
@@ -1237,6 +1406,13 @@ class Cliente(models.Model):
         null=True,
         verbose_name="Notas sobre Crédito"
     )
+    # Saldo de la cuenta por cobrar, mantenido por facturacion/cuentas.py
+    saldo = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name="Saldo Pendiente"
+    )
     fecha_registro = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Fecha de Registro"
@@ -1249,6 +1425,29 @@ class Cliente(models.Model):
         default=True,
         verbose_name="Cliente Activo"
     )
+    # Agregados de visitas (facturas cobradas), mantenidos por facturacion/visitas.py
+    primera_visita = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Primera Visita"
+    )
+    ultima_visita = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Última Visita"
+    )
+    visitas = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Visitas"
+    )
+    total_gastado = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name="Total Gastado"
+    )
+
+    objects = ManagerEtiquetado()
 
     class Meta:
         verbose_name = "Cliente"
@@ -1257,6 +1456,10 @@ class Cliente(models.Model):
         indexes = [
             models.Index(fields=['cedula']),
             models.Index(fields=['nombre_completo']),
+            models.Index(fields=['telefono_principal']),
+            models.Index(fields=['telefono_alternativo']),
+            models.Index(fields=['primera_visita']),
+            models.Index(fields=['ultima_visita']),
         ]
 
     def __str__(self):
@@ -1270,4 +1473,615 @@ class Cliente(models.Model):
     @property
     def venta_contado(self):
         """Verifica si el cliente es solo al contado"""
-        return self.dias_credito == 0
\ No newline at end of file
+        return self.dias_credito == 0
+
+    @property
+    def credito_disponible(self):
+        """Crédito que aún puede usar el cliente"""
+        return max(self.limite_credito - self.saldo, Decimal('0.00'))
+
+
+class MovimientoCuenta(models.Model):
+    """
+    Movimiento del libro de cuentas por cobrar de un cliente. ``monto`` lleva
+    signo: los cargos suman al saldo y los pagos restan. Cada cargo guarda lo
+    que falta por cobrar en ``saldo_pendiente`` (los pagos se aplican a los
+    cargos más antiguos), así la antigüedad de saldos sale de
+    ``fecha_vencimiento`` sin recorrer el historial.
+    """
+
+    TIPO_CHOICES = [
+        ('cargo', 'Cargo'),
+        ('pago', 'Pago'),
+        ('ajuste', 'Ajuste'),
+    ]
+
+    cliente = models.ForeignKey(
+        'Cliente',
+        on_delete=models.PROTECT,
+        related_name='movimientos',
+        verbose_name="Cliente"
+    )
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES, verbose_name="Tipo")
+    monto = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Monto")
+    saldo_resultante = models.DecimalField(
+        max_digits=12, decimal_places=2, verbose_name="Saldo después del Movimiento"
+    )
+    saldo_pendiente = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Pendiente por Cobrar"
+    )
+    fecha = models.DateTimeField(default=timezone.now, verbose_name="Fecha")
+    fecha_vencimiento = models.DateField(null=True, blank=True, verbose_name="Fecha de Vencimiento")
+    factura = models.ForeignKey(
+        'Factura',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='movimientos_cuenta',
+        verbose_name="Factura"
+    )
+    # Copia del número: la factura puede pasar al archivo (archivo.archivar_lote)
+    numero_factura = models.CharField(max_length=50, blank=True, verbose_name="Número de Factura")
+    descripcion = models.CharField(max_length=200, blank=True, verbose_name="Descripción")
+    creado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name="Registrado por"
+    )
+
+    class Meta:
+        verbose_name = "Movimiento de Cuenta"
+        verbose_name_plural = "Movimientos de Cuenta"
+        ordering = ['-fecha', '-id']
+        indexes = [
+            models.Index(fields=['cliente', 'fecha']),
+            models.Index(fields=['fecha_vencimiento', 'saldo_pendiente']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.monto} - {self.cliente_id}"
+
+
+class TrabajoImpresion(models.Model):
+    """Cola (spool) de trabajos ESC/POS para las impresoras térmicas"""
+
+    IMPRESORA_CHOICES = [
+        ('cocina', 'Cocina'),
+        ('bar', 'Bar'),
+        ('caja', 'Caja'),
+    ]
+
+    DOCUMENTO_CHOICES = [
+        ('ticket_cocina', 'Ticket de Cocina'),
+        ('ticket_bar', 'Ticket de Bar'),
+        ('factura', 'Factura'),
+    ]
+
+    ESTADO_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('enviando', 'Enviando'),
+        ('impreso', 'Impreso'),
+        ('error', 'Error'),
+    ]
+
+    impresora = models.CharField(
+        max_length=20,
+        choices=IMPRESORA_CHOICES,
+        verbose_name="Impresora"
+    )
+    documento = models.CharField(
+        max_length=20,
+        choices=DOCUMENTO_CHOICES,
+        verbose_name="Tipo de Documento"
+    )
+    pedido = models.ForeignKey(
+        Pedido,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='trabajos_impresion',
+        verbose_name="Pedido"
+    )
+    factura = models.ForeignKey(
+        Factura,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='trabajos_impresion',
+        verbose_name="Factura"
+    )
+    datos = models.BinaryField(
+        verbose_name="Datos ESC/POS"
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADO_CHOICES,
+        default='pendiente',
+        verbose_name="Estado"
+    )
+    intentos = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Intentos"
+    )
+    max_intentos = models.PositiveIntegerField(
+        default=5,
+        verbose_name="Máximo de Intentos"
+    )
+    ultimo_error = models.TextField(
+        blank=True,
+        verbose_name="Último Error"
+    )
+    proximo_intento = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Próximo Intento"
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_impresion = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Fecha de Impresión"
+    )
+
+    class Meta:
+        verbose_name = "Trabajo de Impresión"
+        verbose_name_plural = "Trabajos de Impresión"
+        ordering = ['fecha_creacion']
+        indexes = [
+            models.Index(fields=['impresora', 'estado', 'proximo_intento']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_documento_display()} → {self.get_impresora_display()} ({self.estado})"
+
+
+class PedidoArchivado(models.Model):
+    """Pedido cerrado movido fuera de la tabla viva (ver facturacion/archivo.py)"""
+
+    # Se conserva el ID original para que las referencias sigan siendo válidas
+    id = models.IntegerField(primary_key=True)
+    codigo_pedido = models.CharField(
+        max_length=20,
+        unique=True,
+        verbose_name="Código de Pedido"
+    )
+    tipo_pedido = models.CharField(
+        max_length=20,
+        choices=Pedido.TIPO_PEDIDO_CHOICES,
+        verbose_name="Tipo de Pedido"
+    )
+    mesa_numero = models.CharField(
+        max_length=20,
+        blank=True,
+        verbose_name="Mesa"
+    )
+    codigo_delivery = models.CharField(
+        max_length=10,
+        blank=True,
+        verbose_name="Código Delivery"
+    )
+    nombre_cliente = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name="Nombre del Cliente"
+    )
+    telefono_cliente = models.CharField(
+        max_length=20,
+        blank=True,
+        verbose_name="Teléfono"
+    )
+    cliente = models.ForeignKey(
+        'Cliente',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='pedidos_archivados',
+        verbose_name="Cliente"
+    )
+    direccion_entrega = models.TextField(
+        blank=True,
+        verbose_name="Dirección de Entrega"
+    )
+    items = models.JSONField(verbose_name="Items del Pedido")
+    items_version = models.PositiveSmallIntegerField(default=1, verbose_name="Versión del Esquema de Items")
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Subtotal")
+    envio = models.DecimalField(max_digits=10, decimal_places=2, default=0, verbose_name="Costo de Envío")
+    total = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Total")
+    estado = models.CharField(
+        max_length=20,
+        choices=Pedido.ESTADO_PEDIDO_CHOICES,
+        verbose_name="Estado del Pedido"
+    )
+    fecha_pedido = models.DateTimeField(verbose_name="Fecha del Pedido")
+    fecha_entrega = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de Entrega")
+    notas = models.TextField(blank=True, verbose_name="Notas del Pedido")
+    creado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name="Creado por"
+    )
+
+    # DetalleItemPedido e HistorialEstadoPedido quedan embebidos como JSON
+    detalles_items = models.JSONField(default=list, verbose_name="Detalles de Items")
+    historial_estados = models.JSONField(default=list, verbose_name="Historial de Estados")
+
+    created_at = models.DateTimeField(verbose_name="Creado")
+    fecha_archivado = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Archivado")
+
+    archivado = True
+
+    def __str__(self):
+        return f"Pedido {self.codigo_pedido} (archivado)"
+
+    def get_items_detalle(self):
+        """Obtener los items del pedido como lista"""
+        return Pedido.get_items_detalle(self)
+
+    class Meta:
+        verbose_name = "Pedido Archivado"
+        verbose_name_plural = "Pedidos Archivados"
+        ordering = ['-fecha_pedido']
+        indexes = [
+            models.Index(fields=['fecha_pedido']),
+            models.Index(fields=['estado']),
+        ]
+
+
+class FacturaArchivada(models.Model):
+    """Factura cerrada movida fuera de la tabla viva (ver facturacion/archivo.py)"""
+
+    id = models.IntegerField(primary_key=True)
+    pedido = models.ForeignKey(
+        PedidoArchivado,
+        on_delete=models.CASCADE,
+        related_name='facturas',
+        verbose_name="Pedido"
+    )
+    numero_factura = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name="Número de Factura"
+    )
+    fecha_factura = models.DateTimeField(verbose_name="Fecha de Factura")
+    tipo_pedido = models.CharField(max_length=20, verbose_name="Tipo de Pedido")
+    numero_mesa_codigo = models.CharField(max_length=20, blank=True, verbose_name="Número de Mesa/Código")
+    nombre_cliente = models.CharField(max_length=200, blank=True, verbose_name="Nombre del Cliente")
+    telefono_cliente = models.CharField(max_length=20, blank=True, verbose_name="Teléfono del Cliente")
+    cliente = models.ForeignKey(
+        'Cliente',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='facturas_archivadas',
+        verbose_name="Cliente"
+    )
+    direccion_entrega = models.TextField(blank=True, verbose_name="Dirección de Entrega")
+    metodo_pago = models.CharField(
+        max_length=20,
+        choices=Factura.METODO_PAGO_CHOICES,
+        verbose_name="Método de Pago"
+    )
+    estado = models.CharField(
+        max_length=30,
+        choices=Factura.ESTADO_FACTURA_CHOICES,
+        verbose_name="Estado de la Factura"
+    )
+    productos_devueltos = models.JSONField(null=True, blank=True, verbose_name="Productos Devueltos")
+    cantidades_devueltas = models.JSONField(default=dict, blank=True, verbose_name="Cantidades Devueltas")
+    fecha_devolucion = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de Devolución")
+    motivo_anulacion = models.TextField(blank=True, verbose_name="Motivo de Anulación")
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Subtotal")
+    iva = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="IVA 12%")
+    envio = models.DecimalField(max_digits=10, decimal_places=2, default=0, verbose_name="Costo de Envío")
+    descuento = models.DecimalField(max_digits=10, decimal_places=2, default=0, verbose_name="Descuento")
+    total = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Total")
+    items = models.JSONField(verbose_name="Items de la Factura")
+    items_version = models.PositiveSmallIntegerField(default=1, verbose_name="Versión del Esquema de Items")
+    notas = models.TextField(blank=True, verbose_name="Notas Adicionales")
+    impresa = models.BooleanField(default=False, verbose_name="Factura Impresa")
+    fecha_impresion = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de Impresión")
+    creado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name="Creado por"
+    )
+    fecha_creacion = models.DateTimeField(verbose_name="Fecha de Creación")
+
+    # Devoluciones embebidas como JSON (mismas claves que Devolucion)
+    devoluciones_archivadas = models.JSONField(default=list, verbose_name="Devoluciones")
+    fecha_archivado = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Archivado")
+
+    archivado = True
+
+    def __str__(self):
+        return f"Factura {self.numero_factura} (archivada)"
+
+    def get_items_detalle(self):
+        """Obtener los items de la factura como lista normalizada"""
+        return Factura.get_items_detalle(self)
+
+    def get_cantidad_ya_devuelta(self, producto_nombre):
+        """Calcular cuántas unidades de un producto ya fueron devueltas"""
+        return Factura.get_cantidad_ya_devuelta(self, producto_nombre)
+
+    clave_devolucion = staticmethod(Factura.clave_devolucion)
+
+    def get_productos_disponibles_devolucion(self):
+        """Obtener productos con cantidades disponibles para devolución"""
+        return Factura.get_productos_disponibles_devolucion(self)
+
+    class Meta:
+        verbose_name = "Factura Archivada"
+        verbose_name_plural = "Facturas Archivadas"
+        ordering = ['-fecha_factura']
+        indexes = [
+            models.Index(fields=['fecha_factura']),
+            models.Index(fields=['estado']),
+            models.Index(fields=['cliente', 'fecha_factura']),
+        ]
+
+
+class TurnoCaja(models.Model):
+    """
+    Turno de una caja registradora. Mientras está abierto acumula totales
+    (ver TotalTurno); al cerrarse se congela en ``resumen`` y ya no cambia.
+    """
+
+    ESTADO_CHOICES = [
+        ('abierto', 'Abierto'),
+        ('cerrado', 'Cerrado'),
+    ]
+
+    caja = models.CharField(max_length=30, default='principal', verbose_name="Caja")
+    estado = models.CharField(
+        max_length=10,
+        choices=ESTADO_CHOICES,
+        default='abierto',
+        verbose_name="Estado"
+    )
+    # Igual a ``caja`` mientras el turno está abierto y NULL al cerrarlo: el
+    # índice único impide dos turnos abiertos en la misma caja (MySQL no
+    # admite restricciones únicas condicionales y admite varios NULL)
+    caja_abierta = models.CharField(
+        max_length=30,
+        null=True,
+        blank=True,
+        unique=True,
+        editable=False,
+        verbose_name="Caja Abierta"
+    )
+    abierto_por = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name='turnos_abiertos',
+        verbose_name="Abierto por"
+    )
+    cerrado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='turnos_cerrados',
+        verbose_name="Cerrado por"
+    )
+    fecha_apertura = models.DateTimeField(default=timezone.now, verbose_name="Fecha de Apertura")
+    fecha_cierre = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de Cierre")
+    monto_inicial = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0, verbose_name="Fondo Inicial"
+    )
+    efectivo_contado = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Efectivo Contado"
+    )
+
+    # Totales acumulados (se actualizan con expresiones F, nunca se recalculan)
+    cantidad_facturas = models.PositiveIntegerField(default=0, verbose_name="Facturas Cobradas")
+    total_ventas = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Total Ventas"
+    )
+    cantidad_devoluciones = models.PositiveIntegerField(default=0, verbose_name="Devoluciones")
+    total_devoluciones = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Total Devuelto"
+    )
+    cantidad_abonos = models.PositiveIntegerField(default=0, verbose_name="Abonos a Cuenta")
+    total_abonos = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Total Abonado"
+    )
+    factura_maxima = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Factura más Alta"
+    )
+    factura_minima = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Factura más Baja"
+    )
+
+    # Cuadre congelado al cerrar (ver caja.cerrar_turno)
+    resumen = models.JSONField(null=True, blank=True, verbose_name="Resumen del Cierre")
+
+    class Meta:
+        verbose_name = "Turno de Caja"
+        verbose_name_plural = "Turnos de Caja"
+        ordering = ['-fecha_apertura']
+        indexes = [
+            models.Index(fields=['estado', 'abierto_por']),
+        ]
+
+    def __str__(self):
+        return f"Turno {self.id} - Caja {self.caja} ({self.get_estado_display()})"
+
+    def save(self, *args, **kwargs):
+        # Un turno cerrado es inmutable
+        if self.pk and TurnoCaja.objects.filter(pk=self.pk, estado='cerrado').exists():
+            raise ValueError(f"El turno {self.pk} ya está cerrado y no se puede modificar")
+        super().save(*args, **kwargs)
+
+
+class TotalTurno(models.Model):
+    """Totales corrientes de un turno por método de pago y usuario"""
+
+    turno = models.ForeignKey(
+        TurnoCaja,
+        on_delete=models.CASCADE,
+        related_name='totales',
+        verbose_name="Turno"
+    )
+    metodo_pago = models.CharField(
+        max_length=20,
+        choices=Factura.METODO_PAGO_CHOICES,
+        verbose_name="Método de Pago"
+    )
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name="Usuario"
+    )
+    cantidad_facturas = models.PositiveIntegerField(default=0, verbose_name="Facturas")
+    total_ventas = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Ventas"
+    )
+    cantidad_devoluciones = models.PositiveIntegerField(default=0, verbose_name="Devoluciones")
+    total_devoluciones = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Devuelto"
+    )
+    cantidad_abonos = models.PositiveIntegerField(default=0, verbose_name="Abonos")
+    total_abonos = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Abonado"
+    )
+
+    class Meta:
+        verbose_name = "Total de Turno"
+        verbose_name_plural = "Totales de Turno"
+        unique_together = ['turno', 'metodo_pago', 'usuario']
+
+    def __str__(self):
+        return f"Turno {self.turno_id} - {self.metodo_pago}"
+
+
+class EntradaBusqueda(models.Model):
+    """
+    Entrada del índice de búsqueda (ver facturacion/busqueda.py). ``claves``
+    tiene los tokens normalizados; el índice de texto completo sobre esa
+    columna (FTS5 en SQLite, FULLTEXT en MySQL) se crea en la migración.
+    """
+
+    TIPO_CHOICES = [
+        ('pedido', 'Pedido'),
+        ('factura', 'Factura'),
+        ('cliente', 'Cliente'),
+        ('producto', 'Producto'),
+        ('plato', 'Plato'),
+    ]
+
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES, verbose_name="Tipo")
+    objeto_id = models.IntegerField(verbose_name="ID del Objeto")
+    titulo = models.CharField(max_length=200, verbose_name="Título")
+    detalle = models.CharField(max_length=255, blank=True, verbose_name="Detalle")
+    claves = models.TextField(verbose_name="Claves de Búsqueda")
+    archivado = models.BooleanField(default=False, verbose_name="Archivado")
+    actualizado = models.DateTimeField(auto_now=True, verbose_name="Actualizado")
+
+    class Meta:
+        verbose_name = "Entrada de Búsqueda"
+        verbose_name_plural = "Índice de Búsqueda"
+        unique_together = ['tipo', 'objeto_id']
+
+    def __str__(self):
+        return f"{self.tipo} {self.objeto_id}: {self.titulo}"
+
+
+class CambioPrecio(models.Model):
+    """
+    Cambio masivo de precios (ver facturacion/precios.py): qué se pidió, quién,
+    para cuándo y a cuántas filas se aplicó. Sirve de auditoría y de cola para
+    los cambios programados.
+    """
+
+    TIPO_CHOICES = [
+        ('plato', 'Platos'),
+        ('producto', 'Productos'),
+    ]
+
+    MODO_CHOICES = [
+        ('porcentaje', 'Porcentaje'),
+        ('monto', 'Monto fijo'),
+    ]
+
+    ESTADO_CHOICES = [
+        ('programado', 'Programado'),
+        ('aplicado', 'Aplicado'),
+        ('cancelado', 'Cancelado'),
+    ]
+
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES, verbose_name="Catálogo")
+    modo = models.CharField(max_length=10, choices=MODO_CHOICES, verbose_name="Modo")
+    valor = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Valor")
+    categoria = models.CharField(max_length=50, blank=True, verbose_name="Categoría")
+    codigos = models.JSONField(default=list, blank=True, verbose_name="Códigos")
+    vigente_desde = models.DateTimeField(default=timezone.now, verbose_name="Vigente Desde")
+    estado = models.CharField(
+        max_length=10,
+        choices=ESTADO_CHOICES,
+        default='programado',
+        verbose_name="Estado"
+    )
+    filas_afectadas = models.PositiveIntegerField(default=0, verbose_name="Filas Afectadas")
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='cambios_precio',
+        verbose_name="Usuario"
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_aplicacion = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de Aplicación")
+
+    class Meta:
+        verbose_name = "Cambio de Precio"
+        verbose_name_plural = "Cambios de Precio"
+        ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'vigente_desde']),
+        ]
+
+    def __str__(self):
+        signo = '%' if self.modo == 'porcentaje' else ''
+        return f"{self.get_tipo_display()} {self.valor:+}{signo} ({self.estado})"
+
+
+class HistorialPrecio(models.Model):
+    """
+    Precio de un plato o producto a partir de ``vigente_desde``. El precio en
+    un momento dado es la última fila con ``vigente_desde`` anterior a ese
+    momento (una búsqueda en el índice, ver ``precios.precios_en``).
+    """
+
+    TIPO_CHOICES = CambioPrecio.TIPO_CHOICES
+
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES, verbose_name="Catálogo")
+    objeto_id = models.IntegerField(verbose_name="ID del Objeto")
+    precio = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Precio")
+    vigente_desde = models.DateTimeField(verbose_name="Vigente Desde")
+    cambio = models.ForeignKey(
+        CambioPrecio,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='historial',
+        verbose_name="Cambio Masivo"
+    )
+
+    class Meta:
+        verbose_name = "Historial de Precio"
+        verbose_name_plural = "Historial de Precios"
+        indexes = [
+            models.Index(fields=['tipo', 'objeto_id', 'vigente_desde']),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} {self.objeto_id}: {self.precio} desde {self.vigente_desde:%Y-%m-%d %H:%M}"
@@ -0,0 +1,8 @@
+"""
+Backend MySQL con pool de conexiones (ENGINE = 'facturacion.pool_mysql').
+
+Igual que ``django.db.backends.mysql`` pero al terminar cada petición la
+conexión vuelve al pool del worker en lugar de cerrarse, así no se paga el
+handshake TCP + autenticación en cada petición. Se configura con la clave
+``POOL`` de DATABASES (ver settings.py y pool.py).
+"""
@@ -0,0 +1,30 @@
+from django.db.backends.mysql.base import Database
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+
+from .pool import PoolAgotado, obtener_pool
+
+
+class DatabaseWrapper(MySQLDatabaseWrapper):
+    """Conexiones tomadas y devueltas al pool en lugar de abrirse y cerrarse"""
+
+    def _pool(self):
+        return obtener_pool(self.alias, self.settings_dict.get('POOL', {}))
+
+    def get_new_connection(self, conn_params):
+        crear = super().get_new_connection
+        try:
+            return self._pool().tomar(lambda: crear(conn_params))
+        except PoolAgotado as e:
+            raise Database.OperationalError(str(e)) from e
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # Una conexión con errores o cerrada a mitad de transacción no se reutiliza
+        descartar = self.errors_occurred or self.in_atomic_block
+        if not descartar and not self.get_autocommit():
+            try:
+                self.connection.rollback()
+            except Database.Error:
+                descartar = True
+        self._pool().devolver(self.connection, descartar=descartar)
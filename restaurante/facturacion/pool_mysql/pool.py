@@ -0,0 +1,164 @@
+"""
+Pool de conexiones por proceso (cada worker de gunicorn tiene el suyo).
+
+- ``tamano``: máximo de conexiones abiertas (en uso + libres).
+- ``espera``: segundos que se espera una conexión cuando el pool está
+  agotado; después se lanza ``PoolAgotado`` (contrapresión en lugar de
+  abrir conexiones sin límite).
+- ``reciclar``: edad máxima en segundos; una conexión más vieja se cierra al
+  tomarla y se reemplaza por una nueva.
+
+Al tomar una conexión libre se verifica que siga viva (``ping``).
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from ..registro import obtener_logger
+
+logger = obtener_logger('pool')
+
+
+class PoolAgotado(Exception):
+    """No se obtuvo conexión dentro del tiempo de espera"""
+
+
+class PoolConexiones:
+
+    def __init__(self, tamano=5, espera=10, reciclar=3600):
+        self.tamano = max(int(tamano), 1)
+        self.espera = float(espera)
+        self.reciclar = float(reciclar)
+        self.pid = os.getpid()
+
+        self._libres = deque()  # (conexion, creada)
+        self._creadas = {}      # id(conexion) -> momento de creación
+        self._en_uso = 0
+        self._condicion = threading.Condition()
+
+        self.esperas = 0
+        self.tiempo_espera = 0.0
+        self.agotado = 0
+        self.creadas = 0
+        self.recicladas = 0
+        self.caidas = 0
+
+    def tomar(self, crear):
+        """Tomar una conexión libre (o crear una con ``crear()`` si hay cupo)"""
+        inicio = time.monotonic()
+        espero = False
+        with self._condicion:
+            while True:
+                if self._libres:
+                    conexion, creada = self._libres.pop()
+                    break
+                if self._en_uso + len(self._libres) < self.tamano:
+                    conexion = creada = None
+                    break
+                espero = True
+                restante = self.espera - (time.monotonic() - inicio)
+                if restante <= 0:
+                    self.agotado += 1
+                    raise PoolAgotado(
+                        f'Pool de conexiones agotado ({self.tamano} en uso, '
+                        f'espera de {self.espera:g}s)'
+                    )
+                self._condicion.wait(restante)
+            self._en_uso += 1
+            if espero:
+                self.esperas += 1
+                self.tiempo_espera += time.monotonic() - inicio
+
+        try:
+            if conexion is not None:
+                if time.time() - creada > self.reciclar:
+                    self.recicladas += 1
+                    self._cerrar(conexion)
+                    conexion = None
+                elif not self._viva(conexion):
+                    self.caidas += 1
+                    logger.warning('⚠️ Conexión caída descartada del pool')
+                    self._cerrar(conexion)
+                    conexion = None
+            if conexion is None:
+                conexion = crear()
+                self._creadas[id(conexion)] = time.time()
+                self.creadas += 1
+        except BaseException:
+            self._liberar_cupo()
+            raise
+        return conexion
+
+    def devolver(self, conexion, descartar=False):
+        """Devolver una conexión al pool (o cerrarla si ``descartar``)"""
+        with self._condicion:
+            self._en_uso -= 1
+            creada = self._creadas.get(id(conexion))
+            if descartar or creada is None:
+                self._cerrar(conexion)
+            else:
+                self._libres.append((conexion, creada))
+            self._condicion.notify()
+
+    def cerrar_todas(self):
+        """Cerrar las conexiones libres (las que están en uso se cierran al devolverse)"""
+        with self._condicion:
+            while self._libres:
+                conexion, _ = self._libres.pop()
+                self._cerrar(conexion)
+
+    def estadisticas(self):
+        with self._condicion:
+            return {
+                'tamano': self.tamano,
+                'en_uso': self._en_uso,
+                'libres': len(self._libres),
+                'esperas': self.esperas,
+                'tiempo_espera': round(self.tiempo_espera, 6),
+                'agotado': self.agotado,
+                'creadas': self.creadas,
+                'recicladas': self.recicladas,
+                'caidas': self.caidas,
+            }
+
+    def _liberar_cupo(self):
+        with self._condicion:
+            self._en_uso -= 1
+            self._condicion.notify()
+
+    @staticmethod
+    def _viva(conexion):
+        try:
+            conexion.ping()
+            return True
+        except Exception:
+            return False
+
+    def _cerrar(self, conexion):
+        self._creadas.pop(id(conexion), None)
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_candado = threading.Lock()
+
+
+def obtener_pool(alias, opciones):
+    """Pool del alias de base de datos para este proceso"""
+    with _candado:
+        pool = _pools.get(alias)
+        if pool is None or pool.pid != os.getpid():
+            # Proceso nuevo (fork de gunicorn): no reutilizar sockets del padre
+            pool = _pools[alias] = PoolConexiones(**opciones)
+        return pool
+
+
+def estadisticas_pool():
+    """Estadísticas de todos los pools de este proceso, por alias"""
+    with _candado:
+        pools = dict(_pools)
+    return {alias: pool.estadisticas() for alias, pool in pools.items() if pool.pid == os.getpid()}
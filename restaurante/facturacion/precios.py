@@ -0,0 +1,282 @@
+"""
+Cambios masivos de precios e historial de precios.
+
+Un cambio (``CambioPrecio``) sube o baja por porcentaje o por monto fijo los
+precios de los platos (``precio``) o de los productos (``precio_compra``,
+que es el precio de venta de las bebidas), filtrados por categoría y/o por
+lista de códigos. ``previsualizar`` calcula en SQL cuántas filas cambian y
+una muestra de precios actual -> nuevo. ``aplicar`` hace un solo ``update()``
+con la misma expresión. El cambio queda auditado con su usuario y filas
+afectadas. La cache del menú (etiqueta ``plato``/``producto``) se invalida
+una vez, al confirmar.
+
+Si ``vigente_desde`` es futura, el cambio queda programado y lo aplica el
+worker: ``python manage.py aplicar_precios`` (o ``--una-vez`` desde cron).
+
+``HistorialPrecio`` guarda cada precio con su inicio de vigencia. Se llena al
+guardar un plato o producto (señal post_save), al aplicar un cambio y en la
+importación masiva. ``precios_en(tipo, ids, momento)`` resuelve el precio
+vigente en un momento con una búsqueda en el índice (tipo, objeto, fecha),
+sin recorrer facturas ni el historial completo.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, Exists, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Round
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .models import CambioPrecio, HistorialPrecio, Plato, Producto
+from .registro import obtener_logger
+
+logger = obtener_logger('precios')
+
+# tipo -> (modelo, campo de precio, precio mínimo permitido)
+CATALOGOS = {
+    'plato': (Plato, 'precio', Decimal('0.01')),
+    'producto': (Producto, 'precio_compra', Decimal('0.00')),
+}
+PRECIO_MAXIMO = Decimal('99999999.99')
+MUESTRA = 20
+LOTE = 1000
+
+
+class ErrorPrecio(Exception):
+    """Cambio de precios inválido (parámetros o precios resultantes fuera de rango)"""
+    pass
+
+
+# ==========================================
+# Selección y cálculo
+# ==========================================
+
+def validar(tipo, modo, valor, categoria='', codigos=()):
+    """Parámetros limpios (valor Decimal, códigos en mayúsculas) o ErrorPrecio"""
+    if tipo not in CATALOGOS:
+        raise ErrorPrecio(f'Catálogo desconocido: {tipo}')
+    if modo not in dict(CambioPrecio.MODO_CHOICES):
+        raise ErrorPrecio(f'Modo desconocido: {modo}')
+    try:
+        valor = Decimal(str(valor).replace(',', '.')).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        raise ErrorPrecio(f'Valor inválido: {valor}')
+    if not valor:
+        raise ErrorPrecio('El valor del cambio no puede ser 0')
+    if modo == 'porcentaje' and valor <= -100:
+        raise ErrorPrecio('Un descuento porcentual debe ser menor al 100%')
+
+    modelo = CATALOGOS[tipo][0]
+    categoria = (categoria or '').strip()
+    if categoria and categoria not in dict(modelo.CATEGORIAS):
+        raise ErrorPrecio(f'Categoría desconocida: {categoria}')
+    codigos = sorted({codigo.strip().upper() for codigo in codigos if codigo and codigo.strip()})
+    if not categoria and not codigos:
+        raise ErrorPrecio('Indique una categoría o una lista de códigos')
+    return valor, categoria, codigos
+
+
+def _seleccion(tipo, categoria, codigos):
+    consulta = CATALOGOS[tipo][0].objects.all()
+    if categoria:
+        consulta = consulta.filter(categoria=categoria)
+    if codigos:
+        consulta = consulta.filter(codigo__in=codigos)
+    return consulta
+
+
+def _expresion(tipo, modo, valor):
+    """Precio nuevo en SQL; la misma expresión sirve para la vista previa y para el update"""
+    campo = CATALOGOS[tipo][1]
+    salida = DecimalField(max_digits=12, decimal_places=2)
+    if modo == 'porcentaje':
+        factor = Value(1 + valor / 100, output_field=DecimalField(max_digits=8, decimal_places=4))
+        return Round(F(campo) * factor, 2, output_field=salida)
+    return Round(F(campo) + Value(valor, output_field=salida), 2, output_field=salida)
+
+
+def _fuera_de_rango(tipo):
+    minimo = CATALOGOS[tipo][2]
+    return Q(nuevo__lt=minimo) | Q(nuevo__gt=PRECIO_MAXIMO)
+
+
+def previsualizar(tipo, modo, valor, categoria='', codigos=()):
+    """
+    Filas que cambiarían, las que quedarían fuera de rango (se omiten al
+    aplicar), códigos pedidos que no existen y una muestra actual -> nuevo.
+    """
+    valor, categoria, codigos = validar(tipo, modo, valor, categoria, codigos)
+    campo = CATALOGOS[tipo][1]
+    consulta = _seleccion(tipo, categoria, codigos).annotate(nuevo=_expresion(tipo, modo, valor))
+
+    conteo = consulta.aggregate(filas=Count('id'), fuera_de_rango=Count('id', filter=_fuera_de_rango(tipo)))
+    desconocidos = []
+    if codigos:
+        existentes = set(CATALOGOS[tipo][0].objects.filter(codigo__in=codigos).values_list('codigo', flat=True))
+        desconocidos = [codigo for codigo in codigos if codigo not in existentes]
+    muestra = [
+        {'codigo': codigo, 'nombre': nombre, 'actual': actual, 'nuevo': Decimal(nuevo).quantize(Decimal('0.01'))}
+        for codigo, nombre, actual, nuevo in consulta.order_by('codigo').values_list(
+            'codigo', 'nombre', campo, 'nuevo')[:MUESTRA]
+    ]
+    return {**conteo, 'codigos_desconocidos': desconocidos, 'muestra': muestra}
+
+
+# ==========================================
+# Aplicación
+# ==========================================
+
+def crear_cambio(tipo, modo, valor, categoria='', codigos=(), vigente_desde=None, usuario=None):
+    """
+    Registrar un cambio. Se aplica ya si su vigencia no es futura; si no,
+    queda programado. Rechaza el cambio si todas las filas quedarían fuera
+    de rango o si no selecciona ninguna.
+    """
+    vista = previsualizar(tipo, modo, valor, categoria, codigos)
+    if not vista['filas']:
+        raise ErrorPrecio('El filtro no selecciona ningún precio')
+    if vista['fuera_de_rango'] == vista['filas']:
+        raise ErrorPrecio('Todos los precios resultantes quedarían fuera de rango')
+
+    valor, categoria, codigos = validar(tipo, modo, valor, categoria, codigos)
+    cambio = CambioPrecio.objects.create(
+        tipo=tipo, modo=modo, valor=valor, categoria=categoria, codigos=codigos,
+        vigente_desde=vigente_desde or timezone.now(), usuario=usuario,
+    )
+    if cambio.vigente_desde <= timezone.now():
+        aplicar(cambio)
+    else:
+        logger.info('💲 Cambio de precios %s programado para %s', cambio.id, cambio.vigente_desde)
+    return cambio
+
+
+def aplicar(cambio):
+    """
+    Aplicar un cambio programado con un solo update (las filas que quedarían
+    fuera de rango se omiten) y registrar los precios nuevos en el historial.
+    Devuelve las filas actualizadas; 0 si otro proceso ya lo tomó o se canceló.
+    """
+    campo = CATALOGOS[cambio.tipo][1]
+    ahora = timezone.now()
+    with transaction.atomic():
+        # Reclamar el cambio: solo un worker lo aplica
+        if CambioPrecio.objects.filter(id=cambio.id, estado='programado').update(
+                estado='aplicado', fecha_aplicacion=ahora) != 1:
+            return 0
+
+        seleccion = _seleccion(cambio.tipo, cambio.categoria, cambio.codigos)
+        sembrar(cambio.tipo, seleccion)
+
+        nuevo = _expresion(cambio.tipo, cambio.modo, cambio.valor)
+        valores = {campo: nuevo}
+        if cambio.tipo == 'producto':
+            # subtotal primero: MySQL evalúa el SET de izquierda a derecha y
+            # debe multiplicar por el precio nuevo calculado desde el anterior
+            valores = {'subtotal': F('cantidad') * nuevo, campo: nuevo, 'fecha_actualizacion': ahora}
+        filas = seleccion.alias(nuevo=nuevo).exclude(_fuera_de_rango(cambio.tipo)).update(**valores)
+
+        CambioPrecio.objects.filter(id=cambio.id).update(filas_afectadas=filas)
+        registrar(cambio.tipo, seleccion, desde=ahora, cambio=cambio)
+    cambio.estado, cambio.fecha_aplicacion, cambio.filas_afectadas = 'aplicado', ahora, filas
+    logger.info('💲 Cambio de precios %s aplicado: %s %s %s -> %s fila(s)',
+                cambio.id, cambio.tipo, cambio.modo, cambio.valor, filas)
+    return filas
+
+
+def aplicar_pendientes():
+    """Aplicar los cambios programados cuya vigencia ya empezó, en orden. Devuelve cuántos"""
+    pendientes = CambioPrecio.objects.filter(
+        estado='programado', vigente_desde__lte=timezone.now()
+    ).order_by('vigente_desde', 'id')
+    aplicados = 0
+    for cambio in pendientes:
+        aplicar(cambio)
+        aplicados += 1
+    return aplicados
+
+
+def cancelar(cambio_id):
+    """Cancelar un cambio que todavía no se aplicó"""
+    return CambioPrecio.objects.filter(id=cambio_id, estado='programado').update(estado='cancelado') == 1
+
+
+# ==========================================
+# Historial
+# ==========================================
+
+def _ultimo_precio(tipo):
+    return Subquery(
+        HistorialPrecio.objects.filter(tipo=tipo, objeto_id=OuterRef('pk'))
+        .order_by('-vigente_desde', '-id').values('precio')[:1]
+    )
+
+
+def _insertar(tipo, filas, desde=None, cambio=None):
+    """Filas (id, precio, vigente desde); ``desde`` reemplaza la fecha de cada fila"""
+    entradas = [
+        HistorialPrecio(tipo=tipo, objeto_id=objeto_id, precio=precio,
+                        vigente_desde=desde or fecha, cambio=cambio)
+        for objeto_id, precio, fecha in filas
+    ]
+    HistorialPrecio.objects.bulk_create(entradas, batch_size=LOTE)
+    return len(entradas)
+
+
+def sembrar(tipo, consulta):
+    """Registrar el precio actual, vigente desde su creación, de las filas que no tienen historial"""
+    campo = CATALOGOS[tipo][1]
+    sin_historial = consulta.filter(~Exists(
+        HistorialPrecio.objects.filter(tipo=tipo, objeto_id=OuterRef('pk'))
+    )).values_list('id', campo, 'fecha_creacion')
+    return _insertar(tipo, sin_historial.iterator())
+
+
+def registrar(tipo, consulta, desde=None, cambio=None):
+    """
+    Agregar al historial el precio actual de las filas de ``consulta`` cuyo
+    último precio registrado es otro (o no tienen ninguno).
+    """
+    campo = CATALOGOS[tipo][1]
+    distintos = consulta.annotate(ultimo=_ultimo_precio(tipo)).filter(
+        Q(ultimo__isnull=True) | ~Q(ultimo=F(campo))
+    ).values_list('id', campo)
+    desde = desde or timezone.now()
+    return _insertar(tipo, ((objeto_id, precio, desde) for objeto_id, precio in distintos.iterator()),
+                     cambio=cambio)
+
+
+def precios_en(tipo, ids, momento):
+    """
+    Precio vigente de cada objeto en ``momento``: {id: precio}. Incluye los
+    platos y productos ya borrados; los que no existían entonces no aparecen.
+    """
+    posterior = HistorialPrecio.objects.filter(
+        tipo=tipo, objeto_id=OuterRef('objeto_id'),
+        vigente_desde__gt=OuterRef('vigente_desde'), vigente_desde__lte=momento,
+    )
+    filas = HistorialPrecio.objects.filter(
+        tipo=tipo, objeto_id__in=list(ids), vigente_desde__lte=momento
+    ).exclude(Exists(posterior)).order_by('id').values_list('objeto_id', 'precio')
+    return dict(filas)
+
+
+def _guardado(tipo, sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields and CATALOGOS[tipo][1] not in update_fields:
+        return
+    registrar(tipo, sender.objects.filter(pk=instance.pk))
+
+
+def _plato_guardado(sender, **kwargs):
+    _guardado('plato', sender, **kwargs)
+
+
+def _producto_guardado(sender, **kwargs):
+    _guardado('producto', sender, **kwargs)
+
+
+def conectar_senales():
+    """Registrar el historial al guardar platos y productos (se llama desde apps.ready)"""
+    post_save.connect(_plato_guardado, sender=Plato, dispatch_uid='precios_plato_save')
+    post_save.connect(_producto_guardado, sender=Producto, dispatch_uid='precios_producto_save')
@@ -0,0 +1,145 @@
+"""
+Registro (logging) de la aplicación.
+
+Cada subsistema usa su propio logger con nombre ``facturacion.<subsistema>``
+(pedidos, facturas, inventario, devoluciones, reportes, modelos, impresion,
+archivo...). Los mensajes usan formato perezoso (``logger.debug('x %s', y)``),
+así que si el nivel está desactivado no se formatea nada.
+
+La escritura real ocurre en un hilo aparte: ``ColaLogHandler`` solo encola el
+registro y un ``QueueListener`` lo escribe en stderr o en un archivo. El
+``FiltroMuestreo`` deja pasar 1 de cada N eventos de alta frecuencia.
+Todo se configura en ``LOGGING`` (settings.py).
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+
+
+def obtener_logger(subsistema):
+    """Logger con nombre para un subsistema de la aplicación"""
+    return logging.getLogger(f'facturacion.{subsistema}')
+
+
+class FiltroMuestreo(logging.Filter):
+    """
+    Deja pasar 1 de cada N registros de los loggers indicados.
+
+    ``tasas`` relaciona un prefijo de logger con N, p. ej.
+    ``{'facturacion.modelos': 50}``. El conteo es por mensaje (plantilla sin
+    formatear), así cada tipo de evento se muestrea por separado. Las
+    advertencias y errores nunca se descartan.
+    """
+
+    MAX_CONTADORES = 10000
+
+    def __init__(self, tasas=None, nivel_maximo='INFO'):
+        super().__init__()
+        self.tasas = sorted((tasas or {}).items(), key=lambda par: len(par[0]), reverse=True)
+        self.nivel_maximo = logging._checkLevel(nivel_maximo)
+        self.contadores = {}
+        self.lock = threading.Lock()
+
+    def _tasa(self, nombre):
+        for prefijo, tasa in self.tasas:
+            if nombre == prefijo or nombre.startswith(prefijo + '.'):
+                return tasa
+        return 1
+
+    def filter(self, record):
+        if record.levelno > self.nivel_maximo:
+            return True
+        tasa = self._tasa(record.name)
+        if tasa <= 1:
+            return True
+
+        clave = (record.name, record.msg)
+        with self.lock:
+            if len(self.contadores) > self.MAX_CONTADORES:
+                self.contadores.clear()
+            cuenta = self.contadores.get(clave, 0)
+            self.contadores[clave] = cuenta + 1
+        if cuenta % tasa:
+            return False
+        if tasa > 1:
+            record.muestreo = tasa
+        return True
+
+
+class FormatoJSON(logging.Formatter):
+    """Una línea JSON por registro, para el recolector de logs"""
+
+    def format(self, record):
+        datos = {
+            'fecha': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensaje': record.getMessage(),
+            'proceso': record.process,
+        }
+        if getattr(record, 'muestreo', None):
+            datos['muestreo'] = record.muestreo
+        if record.exc_info:
+            datos['traza'] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+class ColaLogHandler(QueueHandler):
+    """
+    Handler que encola los registros; un QueueListener los escribe fuera del
+    hilo de la petición. Si ``archivo`` está vacío se escribe en stderr.
+
+    El listener se (re)inicia por proceso, así sigue funcionando después del
+    fork de los workers de gunicorn.
+    """
+
+    def __init__(self, archivo='', capacidad=10000):
+        super().__init__(queue.Queue(capacidad))
+        self.archivo = archivo
+        self.listener = None
+        self.pid = None
+        self.lock_inicio = threading.Lock()
+        atexit.register(self.detener)
+
+    def _destino(self):
+        if self.archivo:
+            destino = WatchedFileHandler(self.archivo, encoding='utf-8')
+        else:
+            destino = logging.StreamHandler(sys.stderr)
+        # El mensaje ya llega formateado desde prepare()
+        destino.setFormatter(logging.Formatter('%(message)s'))
+        return destino
+
+    def _asegurar_listener(self):
+        if self.pid == os.getpid():
+            return
+        with self.lock_inicio:
+            if self.pid == os.getpid():
+                return
+            # Tras un fork la cola y el hilo del padre no sirven
+            self.queue = queue.Queue(self.queue.maxsize)
+            self.listener = QueueListener(self.queue, self._destino(), respect_handler_level=False)
+            self.listener.start()
+            self.pid = os.getpid()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Nunca bloquear la petición por el log: se descarta el registro
+            pass
+
+    def emit(self, record):
+        self._asegurar_listener()
+        super().emit(record)
+
+    def detener(self):
+        if self.listener and self.pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+            self.pid = None
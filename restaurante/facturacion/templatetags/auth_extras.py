@@ -1,6 +1,7 @@
 # tu_app/templatetags/auth_extras.py
 from django import template
-from django.contrib.auth.models import Group
+
+from facturacion.accesos import accesos_usuario
 
 register = template.Library()
 
@@ -13,8 +14,8 @@ def has_group(user, group_name):
         return False
     
     try:
-        # Forma más eficiente de verificar
-        return user.groups.filter(name=group_name).exists()
+        # Grupos ya resueltos para la sesión (ver facturacion/accesos.py)
+        return accesos_usuario(user).tiene_grupo(group_name)
     except:
         return False
 
@@ -23,4 +24,14 @@ def check_group(user, group_name):
     """
     Tag simple para verificar grupos
     """
-    return has_group(user, group_name)
\ No newline at end of file
+    return has_group(user, group_name)
+
+@register.filter(name='nombres_grupos')
+def nombres_grupos(user, separador=','):
+    """
+    Nombres de los grupos del usuario unidos por ``separador``, desde los
+    accesos de la sesión (reemplaza ``user.groups.all|join:","``, que consulta)
+    """
+    if not user or not user.is_authenticated:
+        return ''
+    return separador.join(accesos_usuario(user).nombres())
@@ -0,0 +1,109 @@
+"""
+Fragmentos de plantilla cacheados por roles y medición del render.
+
+``{% fragmento 'menu_lateral' %}...{% endfragmento %}`` guarda el HTML del
+bloque en la cache. La clave depende de los grupos del usuario (ya resueltos
+en la sesión, ver accesos.py), de si es superusuario, de la vista actual (el
+menú marca la opción activa), de ``VERSION_APP`` y de la fecha de
+modificación de la plantilla: los usuarios con los mismos roles comparten el
+fragmento y una plantilla editada no sirve el HTML viejo. El contenido no
+debe depender de nada más (nombre del usuario, token CSRF, datos del negocio).
+
+``{% medir 'pagina' %}...{% endmedir %}`` solo mide. Ambos suman su tiempo en
+la medida de la petición (ver metricas.py); los bloques anidados se cuentan
+también dentro del bloque que los contiene.
+"""
+import os
+import time
+
+from django import template
+from django.conf import settings
+from django.utils.safestring import mark_safe
+
+from facturacion.accesos import accesos_usuario
+from facturacion.cache_modelos import obtener_o_generar
+from facturacion.metricas import medir_bloque
+
+register = template.Library()
+
+# Etiqueta de versión propia: invalidar('fragmentos') descarta todos los fragmentos
+ETIQUETAS = ('fragmentos',)
+
+
+def firma_roles(user):
+    """Lo único del usuario que puede cambiar un fragmento: superusuario y grupos"""
+    if user is None or not user.is_authenticated:
+        return ('anonimo',)
+    accesos = accesos_usuario(user)
+    return (user.is_superuser, accesos.grupos, accesos.otros_grupos)
+
+
+def _sello_plantilla(origen):
+    try:
+        return os.path.getmtime(origen.name)
+    except (AttributeError, TypeError, OSError):
+        return 0
+
+
+def _nombre_bloque(parser, token):
+    partes = token.split_contents()
+    if len(partes) != 2:
+        raise template.TemplateSyntaxError(f"'{partes[0]}' requiere el nombre del bloque")
+    nodos = parser.parse((f'end{partes[0]}',))
+    parser.delete_first_token()
+    return nodos, parser.compile_filter(partes[1])
+
+
+class NodoMedir(template.Node):
+    def __init__(self, nodos, nombre):
+        self.nodos = nodos
+        self.nombre = nombre
+
+    def render(self, context):
+        inicio = time.perf_counter()
+        try:
+            return self.generar(context)
+        finally:
+            medir_bloque(str(self.nombre.resolve(context)), time.perf_counter() - inicio)
+
+    def generar(self, context):
+        return self.nodos.render(context)
+
+
+class NodoFragmento(NodoMedir):
+    def __init__(self, nodos, nombre, plantilla, sello):
+        super().__init__(nodos, nombre)
+        self.plantilla = plantilla
+        self.sello = sello
+
+    def generar(self, context):
+        request = context.get('request')
+        user = context.get('user', getattr(request, 'user', None))
+        coincidencia = getattr(request, 'resolver_match', None)
+        partes = (
+            firma_roles(user),
+            coincidencia.view_name if coincidencia else '',
+            getattr(settings, 'VERSION_APP', ''),
+            self.sello,
+        )
+        html = obtener_o_generar(
+            f'fragmento:{self.plantilla}:{self.nombre.resolve(context)}', ETIQUETAS, partes,
+            lambda: str(self.nodos.render(context)),
+            timeout=getattr(settings, 'FRAGMENTOS_TIMEOUT', 86400),
+        )
+        return mark_safe(html)
+
+
+@register.tag
+def medir(parser, token):
+    """{% medir 'nombre' %}...{% endmedir %}"""
+    return NodoMedir(*_nombre_bloque(parser, token))
+
+
+@register.tag
+def fragmento(parser, token):
+    """{% fragmento 'nombre' %}...{% endfragmento %}"""
+    nodos, nombre = _nombre_bloque(parser, token)
+    origen = getattr(parser, 'origin', None)
+    plantilla = getattr(origen, 'template_name', None) or getattr(origen, 'name', '')
+    return NodoFragmento(nodos, nombre, plantilla, _sello_plantilla(origen))
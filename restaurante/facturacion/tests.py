@@ -1,3 +1,1054 @@
-from django.test import TestCase
+"""
+Presupuesto de consultas SQL por ruta.
 
-# Create your tests here.
+Se siembra un conjunto de datos representativo, se recorre cada URL de
+facturacion/urls.py con un usuario de cada rol y se cuentan las consultas.
+Las rutas que modifican datos se piden con un cuerpo válido (PETICIONES) y
+toda respuesta debe ser correcta: estado menor a 400, sin ``success: false``
+ni mensajes de error, o 403 para los roles sin acceso. Las rutas EXCLUIDAS
+se omiten con su motivo.
+Cada vista tiene un presupuesto máximo (PRESUPUESTO) y además la cantidad de
+consultas no puede crecer con la cantidad de filas: se mide con
+FILAS_PEQUENO y con FILAS_GRANDE filas por modelo y las dos cifras deben
+coincidir. Si algo falla se imprimen las consultas repetidas (huellas SQL con
+los literales reemplazados por ?), que es donde suele estar el N+1.
+
+Cada petición corre dentro de una transacción que se revierte, así las rutas
+que modifican datos no cambian el conjunto para las siguientes.
+
+ArranqueTests verifica que un worker recién arrancado no cargue los módulos
+pesados que solo se usan al generar PDFs (ver arranque.py).
+
+Las demás clases cubren el comportamiento de los caminos de dinero e
+inventario (turnos de caja, stock al cobrar, crédito al anular o devolver, ...).
+"""
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib import messages
+from django.contrib.auth.models import Group, User
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection, transaction
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import busqueda, impresion, metricas, precios
+from .accesos import accesos_usuario
+from .archivo import archivar
+from .arranque import medir, verificar
+from .caja import ErrorCaja, abrir_turno, cerrar_turno
+from .cuentas import (ErrorCredito, antiguedad_saldos, cartera, registrar_abono, registrar_cargo,
+                      revertir_cargo_factura)
+from .importacion import ErrorImportacion, importar
+from .models import (CambioPrecio, Cliente, DetalleItemPedido, Devolucion, Factura, FacturaArchivada,
+                     HistorialEstadoPedido, HistorialPrecio, Mesa, MovimientoCuenta, Pedido, Plato, Producto,
+                     TrabajoImpresion, TurnoCaja)
+from .pool_mysql.pool import PoolAgotado, PoolConexiones
+from .urls import urlpatterns
+
+FILAS_PEQUENO = 2
+FILAS_GRANDE = 8
+
+ROLES = ['Administrador', 'Gerente', 'Cajero', 'Mesero', 'Cocinero', 'Usuario Normal']
+
+PRESUPUESTO_POR_DEFECTO = 25
+
+# Vistas que hoy necesitan más que el presupuesto por defecto (no debe crecer)
+PRESUPUESTO = {
+    # Una suma por cada día y mes de los gráficos: costo fijo, no depende de las filas
+    'dashbort': 46,
+}
+
+# Parámetros GET para que la ruta ejecute su camino completo
+PARAMETROS = {
+    'anulacionydevolucion': lambda datos: {'numero_factura': datos['factura'].numero_factura},
+    'api_facturas': lambda datos: {'page': 1, 'q': 'cliente'},
+    'gestiondepedidos': lambda datos: {'search': 'cliente 1'},
+    'historial_pedidos': lambda datos: {'search': 'cliente'},
+    'buscar': lambda datos: {'q': 'cliente'},
+    'autocompletar': lambda datos: {'q': datos['pedido'].codigo_pedido},
+}
+
+
+def _json(cuerpo):
+    return {'data': json.dumps(cuerpo), 'content_type': 'application/json'}
+
+
+def _items(datos):
+    """Un plato y una bebida con stock, como los arma el carrito"""
+    plato, bebida = datos['plato'], datos['bebida']
+    return [
+        {'id': f'plato_{plato.id}', 'name': plato.nombre, 'quantity': 1, 'price': 300, 'total': 300,
+         'tipo': 'plato', 'categoria': 'principal'},
+        {'id': f'bebida_{bebida.id}', 'name': bebida.nombre, 'quantity': 1, 'price': 60, 'total': 60,
+         'tipo': 'bebida', 'categoria': 'bebida', 'codigo': bebida.codigo},
+    ]
+
+
+# Rutas que modifican datos: método y cuerpo de una petición válida. Las demás
+# se piden con GET y los PARAMETROS de arriba.
+PETICIONES = {
+    'guardar_producto': lambda datos: ('post', _json({
+        'productName': 'Jugo de prueba', 'category': 'bebida', 'quantity': 10, 'price': 35})),
+    'eliminar_producto': lambda datos: ('post', {}),
+    'actualizar_cantidad': lambda datos: ('post', {'data': {'cantidad': 30, 'precio_compra': 150}}),
+    'guardar_plato': lambda datos: ('post', {'data': {
+        'nombre': 'Plato de prueba', 'categoria': 'principal', 'precio': '350'}}),
+    'eliminar_plato': lambda datos: ('delete', {}),
+    'actualizar_plato': lambda datos: ('put', _json({'nombre': 'Plato renombrado', 'precio': '320'})),
+    'crear_pedido': lambda datos: ('post', {'data': {
+        'tipo_pedido': 'llevar', 'codigo_llevar': 'L1', 'cart_items': json.dumps(_items(datos)),
+        'subtotal': '360', 'total': '360'}}),
+    'limpiar_carrito': lambda datos: ('post', {}),
+    'cambiar_estado_pedido': lambda datos: ('post', {'data': {'estado': 'preparacion'}}),
+    'eliminar_pedido': lambda datos: ('post', {'data': {'eliminar_vista': 'true'}}),
+    'editar_pedido': lambda datos: ('post', {'data': {
+        'nuevos_items': json.dumps(_items(datos)), 'nombre_cliente': 'Cliente editado'}}),
+    'verificar_stock_multiples_gestion': lambda datos: ('post', _json({'items': _items(datos)})),
+    'crear_factura': lambda datos: ('post', {'data': {
+        'pedido_id': datos['pedido_sin_factura'].id, 'metodo_pago': 'efectivo',
+        'items': json.dumps(_items(datos))}}),
+    'marcar_factura_pagada': lambda datos: ('post', {'data': {'version': datos['factura_pendiente'].version}}),
+    'liquidar_lote': lambda datos: ('post', _json({
+        'pedidos': [{'id': datos['pedido_sin_factura'].id, 'metodo_pago': 'efectivo'}]})),
+    'abrir_turno_caja': lambda datos: ('post', _json({'caja': 'barra', 'monto_inicial': '500'})),
+    'cerrar_turno_caja': lambda datos: ('post', _json({'efectivo_contado': '500'})),
+    'eliminar_factura': lambda datos: ('post', {}),
+    'imprimir_factura_escpos': lambda datos: ('post', {}),
+    'imprimir_factura': lambda datos: ('post', {}),
+    'registrar_salida': lambda datos: ('post', _json({
+        'producto_id': datos['insumo'].id, 'cantidad': 1, 'motivo': 'consumo', 'responsable': 'Prueba'})),
+    'reabastecer_producto': lambda datos: ('post', _json({
+        'producto_id': datos['bebida'].id, 'cantidad': 5, 'motivo': 'compra'})),
+    'edit_user': lambda datos: ('post', {'data': {
+        'editUsername': 'presupuesto_otro', 'editRole': Group.objects.get(name='Mesero').id,
+        'editStatus': 'active'}}),
+    'procesar_devolucion_total': lambda datos: ('post', {'data': {
+        'numero_factura': datos['factura'].numero_factura}}),
+    'procesar_devolucion_parcial': lambda datos: ('post', {'data': {
+        'numero_factura': datos['factura'].numero_factura,
+        'productos_devueltos': json.dumps([{'nombre': datos['factura'].items[0]['name'], 'cantidad': 1,
+                                            'categoria': 'bebida'}])}}),
+    'procesar_anulacion_factura': lambda datos: ('post', {'data': {
+        'numero_factura': datos['factura'].numero_factura, 'motivo': 'Prueba'}}),
+    'registrar_pago_cliente': lambda datos: ('post', _json({'monto': 100, 'descripcion': 'Abono'})),
+    'registrar_ajuste_cliente': lambda datos: ('post', _json({'monto': 50, 'descripcion': 'Ajuste'})),
+    'importar_catalogo': lambda datos: ('post', {'data': {'archivo': SimpleUploadedFile(
+        'productos.csv', b'nombre,categoria,cantidad,precio_compra\nJugo CSV,bebida,12,30\n')}}),
+    'cancelar_cambio_precios': lambda datos: ('post', {}),
+    'cambiar_precios': lambda datos: ('post', {'data': {
+        'modo': 'porcentaje', 'valor': '5', 'categoria': 'principal'}}),
+}
+
+# Objeto de la URL cuando no es el de DATOS (p. ej. una factura pendiente para cobrarla)
+ARGUMENTOS = {
+    'marcar_factura_pagada': {'factura_id': 'factura_pendiente'},
+    'eliminar_factura': {'factura_id': 'factura_pendiente'},
+    'pdf_cuadre_turno': {'turno_id': 'turno_cerrado'},
+    'cerrar_turno_caja': {'turno_id': 'turno'},
+    'importar_catalogo': {'tipo': 'producto'},
+    'cambiar_precios': {'tipo': 'plato'},
+}
+
+# Rutas restringidas: solo las puede usar quien tenga el módulo (o el superusuario);
+# los demás deben recibir 403
+SOLO_SUPERUSUARIO = {'roles', 'edit_user', 'delete_user', 'metricas'}
+MODULO_RUTA = {
+    'autocompletar': 'gestiondepedidos',
+    'importar_catalogo': 'entradadeproductos',
+    'cambiar_precios': 'listadeplatillos',
+    'cancelar_cambio_precios': 'listadeplatillos',
+}
+
+# Rutas que no se pueden medir: sus plantillas no están en el repositorio y
+# responden 500 con cualquier dato
+EXCLUIDAS = {
+    'detalle_factura': 'falta la plantilla facturacion/detalle_factura.html',
+    'productos_vendidos_dia': 'falta la plantilla facturacion/productos_vendidos_dia.html',
+}
+
+
+def huella(sql):
+    """SQL con los literales reemplazados, para agrupar consultas repetidas"""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    sql = re.sub(r'\((?:\?\s*,\s*)+\?\)', '(?...)', sql)
+    return sql
+
+
+def repetidas(consultas):
+    conteo = Counter(huella(consulta['sql']) for consulta in consultas)
+    return [(veces, sql) for sql, veces in conteo.most_common() if veces > 1]
+
+
+def sembrar(cantidad, usuario):
+    """Crear ``cantidad`` filas de cada modelo principal con datos realistas"""
+    ahora = timezone.now()
+    sufijo = Producto.objects.count()
+    bebidas = []
+    for i in range(cantidad):
+        bebidas.append(Producto.objects.create(
+            nombre=f'Refresco {sufijo + i}', categoria='bebida',
+            cantidad=Decimal('50'), precio_compra=Decimal('40'),
+        ))
+        Producto.objects.create(
+            nombre=f'Carne {sufijo + i}', categoria='carne',
+            cantidad=Decimal('20'), precio_compra=Decimal('150'),
+        )
+        Plato.objects.create(nombre=f'Plato {sufijo + i}', categoria='principal', precio=Decimal('300'))
+
+    mesas = [Mesa.objects.create(numero=f'M{sufijo + i}') for i in range(cantidad)]
+    turno = TurnoCaja.objects.filter(estado='abierto').first()
+
+    for i in range(cantidad):
+        bebida = bebidas[i]
+        items = [
+            {'id': f'bebida_{bebida.id}', 'name': bebida.nombre, 'quantity': 2, 'price': 60,
+             'categoria': 'bebida', 'tipo': 'bebida', 'codigo': bebida.codigo},
+            {'id': i + 1, 'name': f'Plato {sufijo + i}', 'quantity': 1, 'price': 300, 'categoria': 'principal'},
+        ]
+        for estado in ('pendiente', 'preparacion', 'completado'):
+            pedido = Pedido.objects.create(
+                tipo_pedido='mesa' if estado != 'completado' else 'llevar',
+                mesa=mesas[i] if estado != 'completado' else None,
+                nombre_cliente=f'Cliente {i}', items=items,
+                subtotal=Decimal('420'), total=Decimal('420'), estado=estado, creado_por=usuario,
+            )
+            DetalleItemPedido.objects.create(
+                pedido=pedido, id_plato=i + 1, nombre_plato=f'Plato {sufijo + i}', cantidad=1,
+                precio_unitario=Decimal('300'), subtotal_item=Decimal('300'), tipo_item='plato',
+            )
+            HistorialEstadoPedido.objects.create(
+                pedido=pedido, estado_anterior='pendiente', estado_nuevo=estado, usuario=usuario,
+            )
+            if estado != 'completado':
+                continue
+            for estado_factura in ('pagada', 'pendiente', 'parcialmente_devuelta'):
+                factura = Factura.objects.create(
+                    pedido=pedido, tipo_pedido=pedido.tipo_pedido, estado=estado_factura,
+                    nombre_cliente=pedido.nombre_cliente, subtotal=Decimal('420'), iva=0,
+                    total=Decimal('420'), items=items, creado_por=usuario, turno=turno,
+                    fecha_factura=ahora - timedelta(minutes=i),
+                )
+                if estado_factura == 'parcialmente_devuelta':
+                    devueltos = [{'nombre': bebida.nombre, 'cantidad': 1, 'precio_unitario': 60,
+                                  'subtotal': 60, 'categoria': 'bebida'}]
+                    Devolucion.objects.create(
+                        factura=factura, tipo_devolucion='parcial', productos_devueltos=devueltos,
+                        monto_devuelto=Decimal('60'), motivo='Prueba', procesado_por=usuario,
+                    )
+                    factura.agregar_productos_devueltos(devueltos)
+                    factura.save()
+
+        cliente = Cliente.objects.create(
+            cedula=f'{sufijo + i:011d}', nombre_completo=f'Cliente Crédito {sufijo + i}',
+            limite_credito=Decimal('5000'), saldo=Decimal('420'),
+        )
+        MovimientoCuenta.objects.create(
+            cliente=cliente, tipo='cargo', monto=Decimal('420'), saldo_resultante=Decimal('420'),
+            saldo_pendiente=Decimal('420'), fecha_vencimiento=timezone.localdate() - timedelta(days=40 * i),
+        )
+
+
+def rutas():
+    """Todas las rutas con nombre de facturacion/urls.py, menos las EXCLUIDAS"""
+    return [patron for patron in urlpatterns if patron.name and patron.name not in EXCLUIDAS]
+
+
+def error_en_respuesta(respuesta):
+    """Motivo por el que la respuesta es un error, aunque el estado sea 2xx/3xx"""
+    if respuesta.status_code >= 400:
+        return f'estado {respuesta.status_code}'
+    if respuesta.get('Content-Type', '').startswith('application/json'):
+        datos = respuesta.json()
+        if isinstance(datos, dict) and (datos.get('success') is False or datos.get('exito') is False
+                                        or datos.get('status') == 'error'):
+            return f"respuesta de error: {datos.get('error') or datos.get('message') or datos.get('mensaje')}"
+    errores = [str(mensaje) for mensaje in get_messages(respuesta.wsgi_request)
+               if mensaje.level == messages.ERROR]
+    if errores:
+        return 'mensaje de error: ' + '; '.join(errores)
+    return None
+
+
+@override_settings(
+    # Sin collectstatic no hay manifiesto: las plantillas usan el almacenamiento simple
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    IMPRESORAS_ESCPOS={'caja': os.devnull},
+)
+class PresupuestoConsultasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('presupuesto_admin', password='x')
+        cls.usuarios = {'Superusuario': cls.admin}
+        for rol in ROLES:
+            usuario = User.objects.create_user(f"presupuesto_{rol.replace(' ', '_').lower()}", password='x')
+            usuario.groups.add(Group.objects.get(name=rol))
+            cls.usuarios[rol] = usuario
+        cls.otro = User.objects.create_user('presupuesto_otro', password='x')
+        cls.turno = TurnoCaja.objects.create(caja='principal', abierto_por=cls.admin)
+        cajero = User.objects.create_user('presupuesto_terraza', password='x')
+        cls.turno_cerrado = cerrar_turno(abrir_turno('terraza', cajero).id, cajero)
+        cls.cambio_precio = CambioPrecio.objects.create(
+            tipo='plato', modo='porcentaje', valor=Decimal('5'), categoria='principal',
+            vigente_desde=timezone.now() + timedelta(days=1),
+        )
+
+    def datos(self):
+        """Objetos a usar en los parámetros de las rutas"""
+        return {
+            'producto': Producto.objects.order_by('id').first(),
+            'bebida': Producto.objects.filter(categoria='bebida').order_by('id').first(),
+            'insumo': Producto.objects.exclude(categoria='bebida').order_by('id').first(),
+            'plato': Plato.objects.order_by('id').first(),
+            'pedido': Pedido.objects.order_by('id').first(),
+            'pedido_sin_factura': Pedido.objects.filter(facturas__isnull=True).order_by('id').first(),
+            'factura': Factura.objects.filter(estado='pagada').order_by('id').first(),
+            'factura_pendiente': Factura.objects.filter(estado='pendiente').order_by('id').first(),
+            'cliente': Cliente.objects.order_by('id').first(),
+            'turno': self.turno,
+            'turno_cerrado': self.turno_cerrado,
+            'cambio': self.cambio_precio,
+            'usuario': self.otro,
+        }
+
+    def url(self, patron, datos):
+        objetos = {
+            'producto_id': 'producto', 'plato_id': 'plato', 'pedido_id': 'pedido', 'factura_id': 'factura',
+            'cliente_id': 'cliente', 'turno_id': 'turno', 'cambio_id': 'cambio', 'user_id': 'usuario',
+        }
+        objetos.update(ARGUMENTOS.get(patron.name, {}))
+        kwargs = {}
+        for nombre in patron.pattern.converters:
+            valor = objetos.get(nombre, 'pedido')
+            kwargs[nombre] = datos[valor].id if nombre.endswith('_id') else valor
+        return reverse(patron.name, kwargs=kwargs)
+
+    def peticion(self, patron, datos):
+        """Método y argumentos del cliente de pruebas para la ruta"""
+        if patron.name in PETICIONES:
+            return PETICIONES[patron.name](datos)
+        return 'get', {'data': PARAMETROS.get(patron.name, lambda datos: {})(datos)}
+
+    def permitida(self, nombre, usuario):
+        if nombre in SOLO_SUPERUSUARIO:
+            return usuario.is_superuser
+        if nombre in MODULO_RUTA:
+            return accesos_usuario(usuario).puede(MODULO_RUTA[nombre])
+        return True
+
+    def medir(self, usuario, url, peticion):
+        """
+        Consultas de una petición, después de una de calentamiento. Cada una
+        corre en su propia transacción revertida, así las rutas que modifican
+        datos se miden sobre el mismo estado. ``peticion()`` arma el método y
+        los argumentos de nuevo cada vez (los archivos subidos se consumen).
+        """
+        cliente = Client(raise_request_exception=False)
+        cliente.force_login(usuario)
+        for _ in range(2):
+            metodo, argumentos = peticion()
+            with transaction.atomic():
+                cache.clear()
+                with CaptureQueriesContext(connection) as capturadas:
+                    respuesta = getattr(cliente, metodo)(url, **argumentos)
+                transaction.set_rollback(True)
+        return respuesta, capturadas.captured_queries
+
+    def medir_todo(self):
+        datos = self.datos()
+        resultados = {}
+        errores = []
+        for patron in rutas():
+            url = self.url(patron, datos)
+            metodo = self.peticion(patron, datos)[0]
+            for rol, usuario in self.usuarios.items():
+                respuesta, consultas = self.medir(usuario, url, lambda: self.peticion(patron, datos))
+                if self.permitida(patron.name, usuario):
+                    error = error_en_respuesta(respuesta)
+                else:
+                    error = (None if respuesta.status_code == 403
+                             else f'estado {respuesta.status_code}, se esperaba 403')
+                if error:
+                    errores.append(f'{metodo.upper()} {patron.name} [{rol}]: {error}')
+                resultados[patron.name, rol] = consultas
+        if errores:
+            self.fail('Rutas que no ejecutaron su camino completo:\n' + '\n'.join(errores))
+        return resultados
+
+    def test_presupuesto_por_ruta(self):
+        sembrar(FILAS_PEQUENO, self.admin)
+        pequeno = self.medir_todo()
+        sembrar(FILAS_GRANDE - FILAS_PEQUENO, self.admin)
+        grande = self.medir_todo()
+
+        fallas = []
+        for (nombre, rol), consultas in sorted(grande.items()):
+            antes = len(pequeno[nombre, rol])
+            despues = len(consultas)
+            presupuesto = PRESUPUESTO.get(nombre, PRESUPUESTO_POR_DEFECTO)
+            problemas = []
+            if despues > antes:
+                problemas.append(f'crece con las filas: {antes} → {despues} consultas '
+                                 f'({FILAS_PEQUENO} → {FILAS_GRANDE} filas)')
+            if despues > presupuesto:
+                problemas.append(f'{despues} consultas, presupuesto {presupuesto}')
+            if problemas:
+                detalle = '\n'.join(f'      {veces}x {sql[:200]}' for veces, sql in repetidas(consultas))
+                fallas.append(f'{nombre} [{rol}]: ' + '; '.join(problemas)
+                              + ('\n    Consultas repetidas:\n' + detalle if detalle else ''))
+
+        if fallas:
+            self.fail('Presupuesto de consultas excedido:\n' + '\n'.join(fallas))
+
+
+class ArranqueTests(SimpleTestCase):
+    def test_arranque_sin_modulos_diferidos(self):
+        resultado = medir(repeticiones=1)
+        self.assertEqual(verificar(resultado), [])
+
+
+class FalsaConexion:
+    """Conexión MySQL de mentira: solo ping y close"""
+
+    def __init__(self, viva=True):
+        self.viva = viva
+        self.cerrada = False
+
+    def ping(self):
+        if not self.viva:
+            raise OSError('MySQL server has gone away')
+
+    def close(self):
+        self.cerrada = True
+
+
+class PoolConexionesTests(SimpleTestCase):
+    """Pool de facturacion.pool_mysql con conexiones falsas (no necesita MySQL)"""
+
+    def test_reutiliza_la_conexion_devuelta(self):
+        pool = PoolConexiones(tamano=2)
+        conexion = pool.tomar(FalsaConexion)
+        pool.devolver(conexion)
+        self.assertIs(pool.tomar(FalsaConexion), conexion)
+        self.assertEqual(pool.estadisticas()['creadas'], 1)
+
+    def test_agotado_tras_la_espera(self):
+        pool = PoolConexiones(tamano=1, espera=0.01)
+        pool.tomar(FalsaConexion)
+        with self.assertRaises(PoolAgotado):
+            pool.tomar(FalsaConexion)
+        self.assertEqual(pool.estadisticas()['agotado'], 1)
+
+    def test_descarta_caidas_viejas_y_con_error(self):
+        pool = PoolConexiones(tamano=1, reciclar=3600)
+        caida = pool.tomar(FalsaConexion)
+        caida.viva = False
+        pool.devolver(caida)
+        nueva = pool.tomar(FalsaConexion)
+        self.assertTrue(caida.cerrada)
+        self.assertIsNot(nueva, caida)
+
+        pool.devolver(nueva, descartar=True)
+        self.assertTrue(nueva.cerrada)
+        self.assertEqual(pool.estadisticas()['libres'], 0)
+
+        pool.reciclar = 0
+        vieja = pool.tomar(FalsaConexion)
+        pool.devolver(vieja)
+        self.assertIsNot(pool.tomar(FalsaConexion), vieja)
+        self.assertTrue(vieja.cerrada)
+        self.assertEqual(pool.estadisticas()['caidas'], 1)
+        self.assertEqual(pool.estadisticas()['recicladas'], 1)
+
+    def test_fallo_al_conectar_libera_el_cupo(self):
+        pool = PoolConexiones(tamano=1, espera=0.01)
+
+        def fallar():
+            raise OSError('Connection refused')
+
+        with self.assertRaises(OSError):
+            pool.tomar(fallar)
+        self.assertEqual(pool.estadisticas()['en_uso'], 0)
+        pool.tomar(FalsaConexion)
+
+
+class ApiFacturasTests(TestCase):
+    """Paginación de api_facturas e impresión de facturas ya cobradas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('api_admin', password='x')
+        for _ in range(3):
+            pedido = Pedido.objects.create(tipo_pedido='llevar', items=[], subtotal=Decimal('100'),
+                                           total=Decimal('100'), estado='completado', creado_por=cls.admin)
+            Factura.objects.create(pedido=pedido, tipo_pedido='llevar', estado='pagada', items=[],
+                                   subtotal=Decimal('100'), iva=0, total=Decimal('100'), creado_por=cls.admin)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_limite(self):
+        url = reverse('api_facturas')
+        for limite, filas in (('0', 1), ('-5', 1), ('2', 2), ('', 3)):
+            datos = self.client.get(url, {'limite': limite}).json()
+            self.assertEqual(len(datos['facturas']), filas, limite)
+        self.assertEqual(self.client.get(url, {'limite': 'abc'}).status_code, 400)
+
+    def test_imprimir_no_cambia_la_version(self):
+        factura = Factura.objects.first()
+        self.client.get(reverse('imprimir_factura', args=[factura.id]))
+        impresa = Factura.objects.get(id=factura.id)
+        self.assertTrue(impresa.impresa)
+        self.assertIsNotNone(impresa.fecha_impresion)
+        self.assertEqual(impresa.version, factura.version)
+
+
+class CobroConcurrenteTests(TestCase):
+    """Cobrar exige la versión de la factura; un pedido ya cobrado no se factura dos veces"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('cobro_admin', password='x')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def pedido(self):
+        return Pedido.objects.create(tipo_pedido='llevar', items=[], subtotal=Decimal('200'),
+                                     total=Decimal('200'), estado='pendiente', creado_por=self.admin)
+
+    def test_marcar_pagada_exige_version(self):
+        factura = Factura.objects.create(pedido=self.pedido(), tipo_pedido='llevar', estado='pendiente',
+                                         items=[], subtotal=Decimal('200'), iva=0, total=Decimal('200'),
+                                         creado_por=self.admin)
+        url = reverse('marcar_factura_pagada', args=[factura.id])
+        ajax = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+        self.assertEqual(self.client.post(url, **ajax).status_code, 400)
+        respuesta = self.client.post(url, {'version': factura.version + 1}, **ajax)
+        self.assertEqual(respuesta.status_code, 409)
+        self.assertTrue(respuesta.json()['conflicto'])
+        self.assertEqual(Factura.objects.get(id=factura.id).estado, 'pendiente')
+
+        self.client.post(url, {'version': factura.version}, **ajax)
+        self.assertEqual(Factura.objects.get(id=factura.id).estado, 'pagada')
+
+    def test_pedido_cobrado_dos_veces(self):
+        pedido = self.pedido()
+        self.client.post(reverse('crear_factura'), {'pedido_id': pedido.id, 'metodo_pago': 'efectivo'})
+
+        # La segunda caja tenía el pedido en pantalla: vuelve a facturación con el aviso
+        respuesta = self.client.post(reverse('crear_factura'), {'pedido_id': pedido.id, 'metodo_pago': 'tarjeta'},
+                                     follow=True)
+        self.assertEqual(Factura.objects.filter(pedido=pedido).count(), 1)
+        avisos = [m for m in get_messages(respuesta.wsgi_request) if m.level == messages.WARNING]
+        self.assertEqual(len(avisos), 1)
+        self.assertContains(respuesta, 'ya se cobr')
+
+
+class BusquedaTests(TestCase):
+    """Tokens del índice, coincidencia por prefijo (FTS5 en SQLite) y mantenimiento por señales"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('busqueda_admin', password='x')
+
+    def factura(self, numero, cliente):
+        pedido = Pedido.objects.create(tipo_pedido='llevar', items=[], subtotal=Decimal('100'),
+                                       total=Decimal('100'), estado='completado', creado_por=self.admin)
+        return Factura.objects.create(pedido=pedido, numero_factura=numero, nombre_cliente=cliente,
+                                      tipo_pedido='llevar', estado='pagada', items=[], subtotal=Decimal('100'),
+                                      iva=0, total=Decimal('100'), creado_por=self.admin)
+
+    def numeros(self, texto):
+        return [entrada['titulo'] for entrada in busqueda.buscar(texto, 'factura')]
+
+    def test_tokens_y_palabras(self):
+        self.assertEqual(busqueda.tokens('FAC-202610-000042'),
+                         ['fac202610000042', 'fac', '202610', '000042', '42'])
+        self.assertEqual(busqueda.tokens('José  Pérez', None, ''), ['jose', 'perez'])
+        self.assertEqual(busqueda.palabras_consulta(' Mesa 05 ÁB mesa '), ['mesa', '5', 'ab'])
+        self.assertEqual(busqueda.palabras_consulta('000'), ['0'])
+        self.assertEqual(busqueda.palabras_consulta('-- ¿?'), [])
+        self.assertEqual(len(busqueda.palabras_consulta(' '.join(str(n) for n in range(1, 20)))),
+                         busqueda.MAXIMO_PALABRAS)
+
+    def test_coincidencia_por_prefijo(self):
+        self.factura('FAC-202610-000042', 'Ana Núñez')
+        self.factura('FAC-202610-000143', 'Luis Peña')
+
+        self.assertCountEqual(self.numeros('fac'), ['FAC-202610-000042', 'FAC-202610-000143'])
+        self.assertEqual(self.numeros('42'), ['FAC-202610-000042'])
+        self.assertEqual(self.numeros('fac 14'), ['FAC-202610-000143'])
+        self.assertEqual(self.numeros('nunez'), ['FAC-202610-000042'])
+        self.assertEqual(self.numeros('fac202610000143'), ['FAC-202610-000143'])
+        self.assertEqual(self.numeros('43'), [])
+        self.assertEqual(busqueda.filtrar(Factura.objects.all(), 'factura', '42').count(), 1)
+
+    def test_senales_mantienen_el_indice(self):
+        factura = self.factura('FAC-202610-000042', 'Ana Núñez')
+        factura.nombre_cliente = 'Marta Gómez'
+        factura.save()
+        self.assertEqual(self.numeros('marta'), ['FAC-202610-000042'])
+        self.assertEqual(self.numeros('ana'), [])
+
+        # update() no envía señales: el índice se pone al día con reindexar
+        Factura.objects.filter(id=factura.id).update(nombre_cliente='Zoila Rosa')
+        self.assertEqual(self.numeros('zoila'), [])
+        self.assertEqual(busqueda.reindexar(['factura']), {'factura': 1})
+        self.assertEqual(self.numeros('zoila'), ['FAC-202610-000042'])
+
+        factura.delete()
+        self.assertEqual(self.numeros('fac'), [])
+
+
+class MetricasTests(SimpleTestCase):
+    """Token de /metrics y plegado de instantáneas de workers terminados"""
+
+    def test_token(self):
+        fabrica = RequestFactory()
+        with self.settings(METRICAS_TOKEN='secreto'):
+            peticion = fabrica.get('/metrics', HTTP_AUTHORIZATION='Bearer secreto')
+            self.assertTrue(metricas.autorizado(peticion))
+            peticion = fabrica.get('/metrics', HTTP_AUTHORIZATION='Bearer otro')
+            peticion.user = User()
+            self.assertFalse(metricas.autorizado(peticion))
+
+    def test_pliega_workers_terminados(self):
+        proceso = subprocess.Popen([sys.executable, '-c', 'pass'])
+        proceso.wait()
+        with tempfile.TemporaryDirectory() as directorio, override_settings(METRICAS_DIR=directorio):
+            ruta = os.path.join(directorio, f'{proceso.pid}.json')
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                json.dump({'pid': proceso.pid, 'contadores': {'negocio_prueba_total': 3},
+                           'medidores': {'db_pool_en_uso{pid="1"}': 1}}, archivo)
+
+            for _ in range(2):
+                contadores, medidores = metricas._agregar()
+                self.assertEqual(contadores['negocio_prueba_total'], 3)
+                self.assertNotIn('db_pool_en_uso{pid="1"}', medidores)
+            self.assertFalse(os.path.exists(ruta))
+            self.assertTrue(os.path.exists(os.path.join(directorio, metricas.ARCHIVO_RETIRADOS)))
+
+
+class ImpresionTests(SimpleTestCase):
+    """Sin impresora configurada no se arma el ticket (un objeto vacío fallaría al renderizar)"""
+
+    @override_settings(IMPRESORAS_ESCPOS={})
+    def test_sin_impresora_no_renderiza(self):
+        items = [{'name': 'Mofongo', 'quantity': 1}, {'name': 'Jugo', 'quantity': 1, 'tipo': 'bebida'}]
+        self.assertEqual(impresion.encolar_ticket_pedido(object(), items), [])
+        self.assertIsNone(impresion.encolar_factura(object()))
+
+
+class TurnoCajaTests(TestCase):
+    """Apertura, cobro y cierre de turnos: una caja no admite dos turnos abiertos"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('turno_admin', password='x')
+
+    def test_abrir_cobrar_y_cerrar(self):
+        turno = abrir_turno('principal', self.admin, Decimal('500'))
+        with self.assertRaises(ErrorCaja):
+            abrir_turno('principal', self.admin)
+        otro = User.objects.create_user('turno_barra', password='x')
+        self.assertEqual(abrir_turno('barra', otro).caja_abierta, 'barra')
+
+        self.client.force_login(self.admin)
+        pedido = Pedido.objects.create(tipo_pedido='llevar', items=[], subtotal=Decimal('300'),
+                                       total=Decimal('300'), estado='pendiente', creado_por=self.admin)
+        self.client.post(reverse('crear_factura'), {'pedido_id': pedido.id, 'metodo_pago': 'efectivo'})
+        self.assertEqual(Factura.objects.get(pedido=pedido).turno_id, turno.id)
+
+        cerrado = cerrar_turno(turno.id, self.admin, efectivo_contado=Decimal('800'))
+        self.assertEqual(cerrado.estado, 'cerrado')
+        self.assertIsNone(cerrado.caja_abierta)
+        self.assertEqual(cerrado.resumen['cantidad_facturas'], 1)
+        self.assertEqual(cerrado.resumen['efectivo_esperado'], '800.00')
+        self.assertEqual(cerrado.resumen['diferencia'], '0.00')
+        with self.assertRaises(ErrorCaja):
+            cerrar_turno(turno.id, self.admin)
+
+        # Cerrado el turno, la caja se puede volver a abrir
+        self.assertEqual(abrir_turno('principal', self.admin).caja_abierta, 'principal')
+
+    def test_anulacion_descuenta_del_cuadre(self):
+        turno = abrir_turno('principal', self.admin, Decimal('500'))
+        self.client.force_login(self.admin)
+        pedido = Pedido.objects.create(tipo_pedido='llevar', items=[], subtotal=Decimal('300'),
+                                       total=Decimal('300'), estado='pendiente', creado_por=self.admin)
+        self.client.post(reverse('crear_factura'), {'pedido_id': pedido.id, 'metodo_pago': 'efectivo'})
+        factura = Factura.objects.get(pedido=pedido)
+        self.client.post(reverse('procesar_anulacion_factura'), {'numero_factura': factura.numero_factura})
+
+        resumen = cerrar_turno(turno.id, self.admin, efectivo_contado=Decimal('500')).resumen
+        self.assertEqual((resumen['cantidad_devoluciones'], resumen['total_devoluciones'], resumen['neto']),
+                         (1, '300.00', '0.00'))
+        self.assertEqual((resumen['efectivo_esperado'], resumen['diferencia']), ('500.00', '0.00'))
+
+    def test_varias_cajas_abiertas_exigen_caja(self):
+        principal = abrir_turno('principal', User.objects.create_user('turno_principal', password='x'))
+        abrir_turno('barra', User.objects.create_user('turno_barra2', password='x'))
+        self.client.force_login(self.admin)
+        pedido = Pedido.objects.create(tipo_pedido='llevar', items=[], subtotal=Decimal('300'),
+                                       total=Decimal('300'), estado='pendiente', creado_por=self.admin)
+
+        # Sin turno propio y sin caja no se sabe dónde va el cobro: no se factura
+        self.client.post(reverse('crear_factura'), {'pedido_id': pedido.id, 'metodo_pago': 'efectivo'})
+        self.assertFalse(Factura.objects.filter(pedido=pedido).exists())
+
+        self.client.post(reverse('crear_factura'), {'pedido_id': pedido.id, 'metodo_pago': 'efectivo',
+                                                    'caja': 'principal'})
+        self.assertEqual(Factura.objects.get(pedido=pedido).turno_id, principal.id)
+
+    def test_abono_entra_al_cuadre(self):
+        turno = abrir_turno('principal', self.admin, Decimal('500'))
+        cliente = Cliente.objects.create(cedula='00198765432', nombre_completo='Cliente Abono',
+                                         limite_credito=Decimal('5000'), dias_credito=30)
+        registrar_cargo(cliente.id, Decimal('1000'), usuario=self.admin)
+        registrar_abono(cliente.id, Decimal('400'), self.admin)
+        registrar_abono(cliente.id, Decimal('100'), self.admin, metodo_pago='tarjeta')
+        with self.assertRaises(ErrorCredito):
+            registrar_abono(cliente.id, Decimal('50'), self.admin, metodo_pago='credito')
+
+        resumen = cerrar_turno(turno.id, self.admin, efectivo_contado=Decimal('900')).resumen
+        self.assertEqual((resumen['cantidad_abonos'], resumen['total_abonos']), (2, '500.00'))
+        self.assertEqual((resumen['efectivo_esperado'], resumen['diferencia']), ('900.00', '0.00'))
+
+    def test_la_base_rechaza_dos_turnos_abiertos(self):
+        # La restricción única de caja_abierta también vale si se salta abrir_turno
+        abrir_turno('principal', self.admin)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TurnoCaja.objects.create(caja='principal', caja_abierta='principal', abierto_por=self.admin)
+
+
+class InventarioCobroTests(TestCase):
+    """Las bebidas se descuentan una sola vez, al tomar el pedido; cobrar no mueve stock"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('inventario_admin', password='x')
+        cls.coca = Producto.objects.create(nombre='Coca Cola', categoria='bebida',
+                                           cantidad=Decimal('10'), precio_compra=Decimal('50'))
+        cls.energetica = Producto.objects.create(nombre='Bebida Energetica', categoria='bebida',
+                                                 cantidad=Decimal('10'), precio_compra=Decimal('80'))
+        cls.plato = Plato.objects.create(nombre='Pica Pollo', categoria='principal', precio=Decimal('250'))
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def pedir(self, codigo, cantidad=2):
+        items = [
+            {'id': f'bebida_{self.coca.id}', 'name': 'Coca Cola', 'quantity': cantidad, 'price': 50,
+             'total': 50 * cantidad, 'tipo': 'bebida', 'es_bebida': True, 'categoria': 'bebida'},
+            {'id': f'plato_{self.plato.id}', 'name': 'Pica Pollo', 'quantity': 1, 'price': 250,
+             'total': 250, 'tipo': 'plato', 'categoria': 'principal'},
+        ]
+        total = sum(item['total'] for item in items)
+        self.client.post(reverse('crear_pedido'), {
+            'cart_items': json.dumps(items), 'subtotal': total, 'envio': 0, 'total': total,
+            'tipo_pedido': 'llevar', 'codigo_llevar': codigo,
+        })
+        return Pedido.objects.get(codigo_delivery=codigo)
+
+    def stock(self):
+        return (Producto.objects.get(id=self.coca.id).cantidad,
+                Producto.objects.get(id=self.energetica.id).cantidad)
+
+    def test_cobrar_factura_no_descuenta_otra_vez(self):
+        pedido = self.pedir('L-INV-1')
+        self.assertEqual(self.stock(), (Decimal('8'), Decimal('10')))
+
+        self.client.post(reverse('crear_factura'), {'pedido_id': pedido.id, 'metodo_pago': 'efectivo'})
+        self.assertTrue(Factura.objects.filter(pedido=pedido, estado='pagada').exists())
+        self.assertEqual(self.stock(), (Decimal('8'), Decimal('10')))
+
+    def test_liquidar_lote_no_descuenta_otra_vez(self):
+        pedido = self.pedir('L-INV-2', cantidad=3)
+        respuesta = self.client.post(reverse('liquidar_lote'), json.dumps(
+            {'pedidos': [{'id': pedido.id, 'metodo_pago': 'efectivo'}]}), content_type='application/json')
+        self.assertTrue(respuesta.json()['success'])
+        self.assertEqual(self.stock(), (Decimal('7'), Decimal('10')))
+
+
+class CreditoFacturaTests(TestCase):
+    """Venta a crédito: el cargo sube el saldo del cliente; anular o devolver lo acredita"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('credito_admin', password='x')
+        cls.cliente = Cliente.objects.create(cedula='00112345678', nombre_completo='Cliente Crédito',
+                                             limite_credito=Decimal('5000'), dias_credito=30)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def vender_a_credito(self):
+        items = [{'id': 'plato_1', 'name': 'Mofongo', 'quantity': 2, 'price': 500, 'total': 1000,
+                  'tipo': 'plato', 'categoria': 'principal'}]
+        pedido = Pedido.objects.create(tipo_pedido='llevar', items=items, subtotal=Decimal('1000'),
+                                       total=Decimal('1000'), estado='pendiente', creado_por=self.admin)
+        self.client.post(reverse('crear_factura'), {
+            'pedido_id': pedido.id, 'metodo_pago': 'credito', 'customer_cedula': '001-1234567-8',
+            'items': json.dumps(items),
+        })
+        return Factura.objects.get(pedido=pedido)
+
+    def saldo(self):
+        return Cliente.objects.get(id=self.cliente.id).saldo
+
+    def test_cargo_y_anulacion(self):
+        factura = self.vender_a_credito()
+        self.assertEqual(self.saldo(), Decimal('1000'))
+        self.assertEqual(antiguedad_saldos(self.cliente.id)[0]['total'], Decimal('1000'))
+
+        self.client.post(reverse('procesar_anulacion_factura'), {'numero_factura': factura.numero_factura})
+        self.assertEqual(Factura.objects.get(id=factura.id).estado, 'anulada')
+        self.assertEqual(self.saldo(), Decimal('0'))
+        self.assertEqual(antiguedad_saldos(self.cliente.id), [])
+        self.assertTrue(MovimientoCuenta.objects.filter(factura=factura, tipo='ajuste',
+                                                        monto=Decimal('-1000')).exists())
+
+    def test_devolucion_parcial_no_revierte_de_mas(self):
+        factura = self.vender_a_credito()
+        self.client.post(reverse('procesar_devolucion_parcial'), {
+            'numero_factura': factura.numero_factura,
+            'productos_devueltos': json.dumps([{'nombre': 'Mofongo', 'cantidad': 1, 'categoria': 'principal'}]),
+        })
+        self.assertEqual(self.saldo(), Decimal('500'))
+
+        # Lo que queda por revertir es lo que se cargó menos lo ya acreditado
+        revertir_cargo_factura(Factura.objects.get(id=factura.id), Decimal('5000'))
+        self.assertEqual(self.saldo(), Decimal('0'))
+        self.assertIsNone(revertir_cargo_factura(Factura.objects.get(id=factura.id), Decimal('1')))
+
+    def test_credito_exige_cliente_registrado(self):
+        pedido = Pedido.objects.create(tipo_pedido='llevar', items=[], subtotal=Decimal('300'),
+                                       total=Decimal('300'), estado='pendiente', creado_por=self.admin)
+        for cedula in ('', '999-9999999-9'):
+            self.client.post(reverse('crear_factura'), {'pedido_id': pedido.id, 'metodo_pago': 'credito',
+                                                        'customer_cedula': cedula})
+            self.assertFalse(Factura.objects.filter(pedido=pedido).exists(), cedula)
+
+        # El cliente identificado al tomar el pedido basta para venderle a crédito
+        Pedido.objects.filter(id=pedido.id).update(cliente=self.cliente)
+        self.client.post(reverse('crear_factura'), {'pedido_id': pedido.id, 'metodo_pago': 'credito'})
+        self.assertEqual(Factura.objects.get(pedido=pedido).cliente_id, self.cliente.id)
+        self.assertEqual(self.saldo(), Decimal('300'))
+
+    def test_pedido_identifica_cliente_por_cedula(self):
+        plato = Plato.objects.create(nombre='Mangú', categoria='principal', precio=Decimal('150'))
+        items = [{'id': f'plato_{plato.id}', 'name': 'Mangú', 'quantity': 1, 'price': 150, 'total': 150,
+                  'tipo': 'plato', 'categoria': 'principal'}]
+        self.client.post(reverse('crear_pedido'), {
+            'cart_items': json.dumps(items), 'subtotal': 150, 'envio': 0, 'total': 150,
+            'tipo_pedido': 'llevar', 'codigo_llevar': 'L-CED', 'customer_cedula': '001-1234567-8',
+        })
+        self.assertEqual(Pedido.objects.get(codigo_delivery='L-CED').cliente_id, self.cliente.id)
+
+    def test_archivar_conserva_numero_en_la_cuenta(self):
+        factura = self.vender_a_credito()
+        # Movimiento anterior a la copia del número: la toma al archivarse la factura
+        MovimientoCuenta.objects.filter(factura=factura).update(numero_factura='')
+        TrabajoImpresion.objects.create(impresora='caja', documento='factura', factura=factura, datos=b'x')
+
+        self.assertEqual(archivar(dias=0), (1, 1))
+        self.assertTrue(FacturaArchivada.objects.filter(numero_factura=factura.numero_factura).exists())
+        movimiento = MovimientoCuenta.objects.get(cliente=self.cliente, tipo='cargo')
+        self.assertIsNone(movimiento.factura_id)
+        self.assertEqual(movimiento.numero_factura, factura.numero_factura)
+        self.assertEqual(cartera()[0]['facturas'][0]['numero'], factura.numero_factura)
+        self.assertFalse(TrabajoImpresion.objects.exists())
+
+    def test_liquidar_lote_rechaza_credito(self):
+        pedido = Pedido.objects.create(tipo_pedido='llevar', items=[], subtotal=Decimal('300'),
+                                       total=Decimal('300'), estado='pendiente', creado_por=self.admin)
+        respuesta = self.client.post(reverse('liquidar_lote'), json.dumps(
+            {'pedidos': [{'id': pedido.id, 'metodo_pago': 'credito'}]}), content_type='application/json')
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertEqual(respuesta.json()['rechazados'][0]['id'], pedido.id)
+        self.assertFalse(Factura.objects.filter(pedido=pedido).exists())
+
+    def test_movimiento_rechaza_cuerpos_y_montos_invalidos(self):
+        url = reverse('registrar_ajuste_cliente', args=[self.cliente.id])
+        for cuerpo in ('[500]', '"500"', '{"monto": "NaN"}', '{"monto": "Infinity"}',
+                       '{"monto": "1e12"}', '{"monto": null}', '{nada'):
+            respuesta = self.client.post(url, cuerpo, content_type='application/json')
+            self.assertEqual(respuesta.status_code, 400, cuerpo)
+        self.assertFalse(MovimientoCuenta.objects.filter(cliente=self.cliente).exists())
+
+        respuesta = self.client.post(url, '{"monto": "150.50"}', content_type='application/json')
+        self.assertEqual(respuesta.json()['saldo'], 150.5)
+
+    def test_pantalla_cuentas_por_cobrar(self):
+        factura = self.vender_a_credito()
+        MovimientoCuenta.objects.filter(factura=factura).update(
+            fecha_vencimiento=timezone.localdate() - timedelta(days=40))
+
+        respuesta = self.client.get(reverse('cuentaporcobrar'))
+        clientes = json.loads(re.search(r'id="clientes-data"[^>]*>(.*?)</script>', respuesta.content.decode(),
+                                        re.S).group(1))
+        self.assertEqual(len(clientes), 1)
+        cliente = clientes[0]
+        self.assertEqual((cliente['total_adeudado'], cliente['deuda_vencida'], cliente['nivel_deuda']),
+                         (1000.0, 1000.0, 'alta'))
+        self.assertEqual(cliente['facturas'][0]['numero'], factura.numero_factura)
+        self.assertEqual(cliente['facturas'][0]['dias_vencimiento'], -40)
+
+        # El pago de la pantalla va al libro de cuentas
+        self.client.post(reverse('registrar_pago_cliente', args=[self.cliente.id]),
+                         '{"monto": 400, "descripcion": "Pago efectivo"}', content_type='application/json')
+        cliente = cartera()[0]
+        self.assertEqual(cliente['total_adeudado'], Decimal('600'))
+        self.assertEqual(cliente['historial_pagos'][0]['monto'], Decimal('400'))
+
+
+class ImportacionTests(TestCase):
+    """Importación de catálogo por CSV: crear, actualizar, no repetir y reportar errores por línea"""
+
+    def importar(self, tipo, texto):
+        return importar(tipo, io.StringIO(texto))
+
+    def test_crear_actualizar_y_reimportar(self):
+        archivo = ('Nombre;Categoría;Cantidad;Precio Compra\n'
+                   'Harina;otro;10;25,50\n'
+                   'Queso Blanco;Lácteo;4;120\n')
+        resultado = self.importar('producto', archivo)
+        self.assertEqual((resultado['creados'], resultado['actualizados'], resultado['errores']), (2, 0, []))
+        queso = Producto.objects.get(nombre='Queso Blanco')
+        self.assertEqual((queso.categoria, queso.subtotal), ('lacteo', Decimal('480.00')))
+
+        # El mismo archivo otra vez: se encuentra por nombre y no se escribe nada
+        resultado = self.importar('producto', archivo)
+        self.assertEqual((resultado['creados'], resultado['actualizados'], resultado['sin_cambios']), (0, 0, 2))
+        self.assertEqual(Producto.objects.count(), 2)
+
+        # Por código; la celda vacía conserva la cantidad
+        resultado = self.importar('producto', f'codigo,nombre,categoria,cantidad,precio_compra\n'
+                                              f'{queso.codigo.lower()},,,,150\n')
+        self.assertEqual((resultado['actualizados'], resultado['sin_cambios']), (1, 0))
+        queso.refresh_from_db()
+        self.assertEqual((queso.cantidad, queso.precio_compra, queso.subtotal),
+                         (Decimal('4'), Decimal('150.00'), Decimal('600.00')))
+
+    def test_errores_por_linea(self):
+        resultado = self.importar('plato', 'nombre,categoria,precio,activo\n'
+                                           'Mofongo,principal,350,si\n'
+                                           'Tostones,aperitivo,150,\n'
+                                           'Habichuelas,postre,0,\n'
+                                           'Chivo Guisado,principal,,\n'
+                                           'Mofongo,principal,360,\n'
+                                           'Sancocho,Plato Principal,400,quizás\n'
+                                           'Yaroa,Comida Rápida,"1,250.00",no\n')
+        errores = {error['linea']: error['errores'] for error in resultado['errores']}
+        self.assertEqual(sorted(errores), [3, 4, 5, 6, 7])
+        self.assertIn('categoria: "aperitivo" no es válida', errores[3])
+        self.assertIn('precio: debe ser mayor a 0', errores[4])
+        self.assertIn('faltan para crear: precio', errores[5])
+        self.assertIn('repetido en el archivo (línea 2)', errores[6])
+        self.assertIn('activo: "quizás" debe ser sí o no', errores[7])
+
+        self.assertEqual((resultado['filas'], resultado['creados'], resultado['con_errores']), (7, 2, 5))
+        yaroa = Plato.objects.get(nombre='Yaroa')
+        self.assertEqual((yaroa.categoria, yaroa.precio, yaroa.activo), ('rapida', Decimal('1250.00'), False))
+
+        with self.assertRaisesMessage(ErrorImportacion, 'Faltan columnas'):
+            self.importar('plato', 'nombre,precio\nMangú,120\n')
+
+    def test_codigos_despues_de_cod999(self):
+        Plato.objects.create(codigo='COD999', nombre='Locrio', categoria='principal', precio=Decimal('300'))
+        resultado = self.importar('plato', 'codigo,nombre,categoria,precio\n'
+                                           ',Pastelón,principal,275\n'
+                                           'COD1001,Arepita,entrada,90\n'
+                                           ',Majarete,postre,80\n')
+        self.assertEqual(resultado['creados'], 3)
+        self.assertEqual(dict(Plato.objects.values_list('nombre', 'codigo')),
+                         {'Locrio': 'COD999', 'Pastelón': 'COD1000', 'Arepita': 'COD1001',
+                          'Majarete': 'COD1002'})
+
+
+class PreciosTests(TestCase):
+    """Cambios masivos de precios: un solo update, filas fuera de rango omitidas e historial"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('precios_admin', password='x')
+        cls.chicharron = Plato.objects.create(codigo='COD001', nombre='Chicharrón', categoria='principal',
+                                              precio=Decimal('199.99'))
+        cls.arepa = Plato.objects.create(codigo='COD002', nombre='Arepa', categoria='entrada',
+                                         precio=Decimal('50.00'))
+        cls.refresco = Producto.objects.create(nombre='Refresco', categoria='bebida',
+                                               cantidad=Decimal('3'), precio_compra=Decimal('20.00'))
+
+    def cambio(self, **datos):
+        return CambioPrecio.objects.create(usuario=self.admin, **datos)
+
+    def test_porcentaje_recalcula_subtotal_de_productos(self):
+        filas = precios.aplicar(self.cambio(tipo='producto', modo='porcentaje', valor=Decimal('10'),
+                                            categoria='bebida'))
+        self.assertEqual(filas, 1)
+        self.refresco.refresh_from_db()
+        self.assertEqual((self.refresco.precio_compra, self.refresco.subtotal), (Decimal('22.00'), Decimal('66.00')))
+
+        filas = precios.aplicar(self.cambio(tipo='plato', modo='porcentaje', valor=Decimal('10'),
+                                            codigos=['COD001']))
+        self.assertEqual(filas, 1)
+        self.chicharron.refresh_from_db()
+        self.assertEqual(self.chicharron.precio, Decimal('219.99'))
+
+    def test_monto_fijo_omite_fuera_de_rango(self):
+        cambio = self.cambio(tipo='plato', modo='monto', valor=Decimal('-100'), codigos=['COD001', 'COD002'])
+        self.assertEqual(precios.previsualizar('plato', 'monto', '-100', codigos=['COD001', 'COD002'])
+                         ['fuera_de_rango'], 1)
+        self.assertEqual(precios.aplicar(cambio), 1)
+
+        self.chicharron.refresh_from_db()
+        self.arepa.refresh_from_db()
+        self.assertEqual((self.chicharron.precio, self.arepa.precio), (Decimal('99.99'), Decimal('50.00')))
+        cambio.refresh_from_db()
+        self.assertEqual((cambio.estado, cambio.filas_afectadas), ('aplicado', 1))
+
+    def test_cambio_programado_se_aplica_una_vez(self):
+        cambio = precios.crear_cambio('plato', 'monto', '25', categoria='entrada',
+                                      vigente_desde=timezone.now() + timedelta(days=1), usuario=self.admin)
+        self.assertEqual(cambio.estado, 'programado')
+        self.assertEqual(precios.aplicar_pendientes(), 0)
+
+        otra_copia = CambioPrecio.objects.get(id=cambio.id)
+        self.assertEqual(precios.aplicar(cambio), 1)
+        # Un segundo worker con su propia copia del cambio no lo vuelve a aplicar
+        self.assertEqual(precios.aplicar(otra_copia), 0)
+        self.arepa.refresh_from_db()
+        self.assertEqual(self.arepa.precio, Decimal('75.00'))
+        self.assertFalse(precios.cancelar(cambio.id))
+
+    def test_precios_en_un_momento_pasado(self):
+        ahora = timezone.now()
+        HistorialPrecio.objects.filter(tipo='plato', objeto_id=self.arepa.id).update(
+            vigente_desde=ahora - timedelta(days=10))
+        self.arepa.precio = Decimal('65.00')
+        self.arepa.save()
+        precios.aplicar(self.cambio(tipo='plato', modo='monto', valor=Decimal('5'), codigos=['COD002']))
+        HistorialPrecio.objects.filter(tipo='plato', objeto_id=self.arepa.id, cambio__isnull=True,
+                                       precio=Decimal('65.00')).update(vigente_desde=ahora - timedelta(days=3))
+
+        ids = [self.arepa.id]
+        self.assertEqual(precios.precios_en('plato', ids, ahora - timedelta(days=20)), {})
+        self.assertEqual(precios.precios_en('plato', ids, ahora - timedelta(days=5)), {self.arepa.id: Decimal('50.00')})
+        self.assertEqual(precios.precios_en('plato', ids, ahora - timedelta(days=1)), {self.arepa.id: Decimal('65.00')})
+        self.assertEqual(precios.precios_en('plato', ids, timezone.now()), {self.arepa.id: Decimal('70.00')})
@@ -37,11 +37,19 @@ path('gestiondepedidos/verificar-stock-multiples/', views.verificar_stock_multip
     path('facturacion/', views.facturacion, name='facturacion'),
     path('crear/', views.crear_factura, name='crear_factura'),
     path('marcar-pagada/<int:factura_id>/', views.marcar_factura_pagada, name='marcar_factura_pagada'),
+    path('liquidar-lote/', views.liquidar_lote, name='liquidar_lote'),
+    path('turnos/abrir/', views.abrir_turno_caja, name='abrir_turno_caja'),
+    path('turnos/actual/', views.turno_caja_actual, name='turno_caja_actual'),
+    path('turnos/<int:turno_id>/cerrar/', views.cerrar_turno_caja, name='cerrar_turno_caja'),
+    path('turnos/<int:turno_id>/cuadre.pdf', views.pdf_cuadre_turno, name='pdf_cuadre_turno'),
     path('eliminar/<int:factura_id>/', views.eliminar_factura, name='eliminar_factura'),
     path('detalle/<int:factura_id>/', views.detalle_factura, name='detalle_factura'),
     path('imprimir-termica/<int:factura_id>/', views.imprimir_factura_termica, name='imprimir_factura_termica'),
+    path('imprimir-escpos/<int:factura_id>/', views.imprimir_factura_escpos, name='imprimir_factura_escpos'),
     path('imprimir/<int:factura_id>/', views.imprimir_factura, name='imprimir_factura'),
     path('exportar/', views.exportar_facturas, name='exportar_facturas'),
+    path('api/facturas/', views.api_facturas, name='api_facturas'),
+    path('api/facturas/estadisticas/', views.api_facturas_estadisticas, name='api_facturas_estadisticas'),
 
     path('salida', views.salida, name='salida'),
      path('obtener-productos-salida/', views.obtener_productos_salida, name='obtener_productos_salida'),
@@ -65,4 +73,18 @@ path('gestiondepedidos/verificar-stock-multiples/', views.verificar_stock_multip
     path('generar-pdf-productos-dia-a4/', views.generar_pdf_productos_dia_a4, name='generar_pdf_a4_dia'), # URL para generar PDF de productos vendidos en A4
     path('registrodeclientes/', views.registrodeclientes, name='registrodeclientes'),  # URL para registro de clientes
     path('registro-clientes/', views.registrodeclientes, name='registro_clientes'),
+    path('clientes/<int:cliente_id>/credito/', views.credito_disponible_cliente, name='credito_disponible_cliente'),
+    path('clientes/<int:cliente_id>/cuenta/', views.cuenta_cliente, name='cuenta_cliente'),
+    path('clientes/<int:cliente_id>/historial/', views.historial_cliente, name='historial_cliente'),
+    path('clientes/<int:cliente_id>/cuenta/pago/', views.registrar_movimiento_cliente, {'tipo': 'pago'}, name='registrar_pago_cliente'),
+    path('clientes/<int:cliente_id>/cuenta/ajuste/', views.registrar_movimiento_cliente, {'tipo': 'ajuste'}, name='registrar_ajuste_cliente'),
+    path('cuentas-por-cobrar/', views.cuentaporcobrar, name='cuentaporcobrar'),
+    path('cuentas-por-cobrar/antiguedad/', views.cuentas_por_cobrar_antiguedad, name='cuentas_por_cobrar_antiguedad'),
+    path('cuentas-por-cobrar/estados/', views.cuentas_por_cobrar_estados, name='cuentas_por_cobrar_estados'),
+    path('metrics', views.metricas_prometheus, name='metricas'),
+    path('buscar/', views.buscar, name='buscar'),
+    path('buscar/<str:tipo>/', views.autocompletar, name='autocompletar'),
+    path('importar/<str:tipo>/', views.importar_catalogo, name='importar_catalogo'),
+    path('precios/cambios/<int:cambio_id>/cancelar/', views.cancelar_cambio_precios, name='cancelar_cambio_precios'),
+    path('precios/<str:tipo>/', views.cambiar_precios, name='cambiar_precios'),
 ]
\ No newline at end of file
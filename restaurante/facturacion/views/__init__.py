@@ -0,0 +1,35 @@
+"""
+Vistas de la aplicación, separadas por subsistema (pedidos, facturas,
+reportes...). Aquí solo se reexportan las vistas que usa ``urls.py``.
+
+ReportLab se importa dentro de las vistas que generan PDF
+(``reportes``, ``turnos``): un worker que nunca imprime un PDF no paga su
+tiempo de importación ni su memoria. ``python manage.py medir_arranque``
+verifica que siga siendo así.
+"""
+from .sesion import index, logout_view
+from .inventario import (guardar_producto, entradadeproductos, inventario, eliminar_producto,
+                         actualizar_cantidad, verificar_stock_multiples, verificar_stock, salida,
+                         obtener_productos_salida, registrar_salida, reabastecer_producto)
+from .platos import (entradadeplatillos, guardar_plato, listadeplatillos, eliminar_plato,
+                     obtener_plato, actualizar_plato)
+from .pedidos import (pedidos, crear_pedido, limpiar_carrito, gestiondepedidos,
+                      historial_pedidos_pagados, detalle_pedido, cambiar_estado_pedido,
+                      eliminar_pedido, platos_disponibles, editar_pedido)
+from .facturas import (facturacion, api_facturas, api_facturas_estadisticas, crear_factura,
+                       marcar_factura_pagada, liquidar_lote, eliminar_factura, detalle_factura,
+                       imprimir_factura_termica, imprimir_factura_escpos, imprimir_factura,
+                       exportar_facturas)
+from .turnos import abrir_turno_caja, turno_caja_actual, cerrar_turno_caja, pdf_cuadre_turno
+from .devoluciones import (anulacionydevolucion, procesar_devolucion_total,
+                           procesar_devolucion_parcial, procesar_anulacion_factura)
+from .reportes import generar_pdf_ticket_dia, productos_vendidos_dia, generar_pdf_productos_dia_a4
+from .dashboard import dashbort, dashboard_stats
+from .usuarios import roles, edit_user, delete_user
+from .clientes import (registrodeclientes, cuentaporcobrar, credito_disponible_cliente,
+                       cuenta_cliente, historial_cliente, registrar_movimiento_cliente,
+                       cuentas_por_cobrar_antiguedad, cuentas_por_cobrar_estados)
+from .monitoreo import metricas_prometheus
+from .busqueda import autocompletar, buscar
+from .importacion import importar_catalogo
+from .precios import cambiar_precios, cancelar_cambio_precios
@@ -0,0 +1,75 @@
+"""Autocompletado sobre el índice de búsqueda (ver busqueda.py)."""
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.urls import reverse
+
+from .. import busqueda
+from ..accesos import accesos_usuario
+
+# Módulo que hay que poder abrir para buscar cada tipo
+MODULO_POR_TIPO = {
+    'pedido': 'gestiondepedidos',
+    'factura': 'facturacion',
+    'cliente': 'facturacion',
+    'producto': 'inventario',
+    'plato': 'pedidos',
+}
+
+# Vista de detalle de cada tipo (solo para los objetos que no están archivados)
+DETALLE_POR_TIPO = {
+    'pedido': 'detalle_pedido',
+    'factura': 'detalle_factura',
+    'cliente': 'cuenta_cliente',
+    'plato': 'obtener_plato',
+}
+
+
+def _tipos_permitidos(user):
+    accesos = accesos_usuario(user)
+    return [tipo for tipo, modulo in MODULO_POR_TIPO.items() if accesos.puede(modulo)]
+
+
+def _url_detalle(resultado):
+    nombre = DETALLE_POR_TIPO.get(resultado['tipo'])
+    if not nombre or resultado['archivado']:
+        return None
+    return reverse(nombre, args=[resultado['id']])
+
+
+def _buscar(texto, tipos, limite):
+    resultados = []
+    for tipo in tipos:
+        for resultado in busqueda.buscar(texto, tipo, limite):
+            resultado['url'] = _url_detalle(resultado)
+            resultados.append(resultado)
+    return resultados
+
+
+def _limite(request):
+    try:
+        return int(request.GET.get('limite', busqueda.LIMITE_POR_DEFECTO))
+    except ValueError:
+        return busqueda.LIMITE_POR_DEFECTO
+
+
+@login_required
+def autocompletar(request, tipo):
+    """Sugerencias de un tipo (pedido, factura, cliente, producto, plato) para ?q="""
+    if tipo not in MODULO_POR_TIPO:
+        return JsonResponse({'success': False, 'error': f'Tipo de búsqueda desconocido: {tipo}'},
+                            status=404)
+    if tipo not in _tipos_permitidos(request.user):
+        return JsonResponse({'success': False, 'error': 'No tienes permiso para buscar en este módulo'},
+                            status=403)
+
+    resultados = _buscar(request.GET.get('q', ''), [tipo], _limite(request))
+    return JsonResponse({'success': True, 'resultados': resultados})
+
+
+@login_required
+def buscar(request):
+    """Búsqueda global: las mejores coincidencias de cada tipo que el usuario puede ver"""
+    tipos = _tipos_permitidos(request.user)
+    limite = min(_limite(request), busqueda.LIMITE_POR_DEFECTO)
+    resultados = _buscar(request.GET.get('q', ''), tipos, limite)
+    return JsonResponse({'success': True, 'resultados': resultados})
@@ -0,0 +1,310 @@
+"""Registro de clientes y cuentas por cobrar."""
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth.decorators import login_required
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from ..caja import ErrorCaja
+from ..cuentas import (ErrorCredito, antiguedad_saldos, cartera, credito_cliente, estados_de_cuenta,
+                       registrar_abono, registrar_ajuste)
+from ..models import Cliente, MovimientoCuenta
+from ..visitas import historial
+
+# Tope de MovimientoCuenta.monto (12 dígitos, 2 decimales)
+MONTO_MAXIMO = Decimal('1e10')
+
+
+def registrodeclientes(request):
+    """Vista para el registro de clientes"""
+    
+    # Si es POST y es AJAX
+    if request.method == 'POST' and request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        try:
+            # Obtener datos del formulario
+            cedula = request.POST.get('cedula', '').strip()
+            nombre_completo = request.POST.get('nombre_completo', '').strip()
+            direccion = request.POST.get('direccion', '').strip()
+            telefono_principal = request.POST.get('telefono_principal', '').strip()
+            telefono_alternativo = request.POST.get('telefono_alternativo', '').strip()
+            
+            # Obtener valores numéricos
+            limite_credito = request.POST.get('limite_credito', '0')
+            dias_credito = request.POST.get('dias_credito', '30')
+            
+            # Convertir a tipos correctos
+            try:
+                limite_credito_decimal = Decimal(limite_credito)
+            except:
+                limite_credito_decimal = Decimal('0.00')
+            
+            try:
+                dias_credito_int = int(dias_credito)
+            except:
+                dias_credito_int = 30
+                
+            notas_credito = request.POST.get('notas_credito', '').strip()
+            
+            # === VALIDACIONES DEL BACKEND ===
+            
+            # Validar cédula
+            if not cedula:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'La cédula es requerida'
+                })
+            
+            # Limpiar cédula (solo números)
+            cedula_limpia = ''.join(filter(str.isdigit, cedula))
+            if len(cedula_limpia) != 11:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'La cédula debe tener exactamente 11 dígitos'
+                })
+            
+            # Validar nombre
+            if not nombre_completo or len(nombre_completo) < 5:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'El nombre debe tener al menos 5 caracteres'
+                })
+            
+            # Validar dirección
+            if not direccion or len(direccion) < 10:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'La dirección debe tener al menos 10 caracteres'
+                })
+            
+            # Validar teléfono principal
+            telefono_principal_limpio = ''.join(filter(str.isdigit, telefono_principal))
+            if not telefono_principal_limpio or len(telefono_principal_limpio) != 10:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'El teléfono principal debe tener 10 dígitos'
+                })
+            
+            # Validar teléfono alternativo si existe
+            if telefono_alternativo:
+                telefono_alt_limpio = ''.join(filter(str.isdigit, telefono_alternativo))
+                if telefono_alt_limpio and len(telefono_alt_limpio) != 10:
+                    return JsonResponse({
+                        'success': False,
+                        'error': 'El teléfono alternativo debe tener 10 dígitos'
+                    })
+                telefono_alternativo = telefono_alt_limpio
+            else:
+                telefono_alternativo = None
+            
+            # Validar límite de crédito
+            if limite_credito_decimal < 0:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'El límite de crédito no puede ser negativo'
+                })
+            
+            if limite_credito_decimal > 1000000:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'El límite de crédito máximo es $1,000,000'
+                })
+            
+            # Validar días de crédito
+            if dias_credito_int < 0:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Los días de crédito no pueden ser negativos'
+                })
+            
+            if dias_credito_int > 365:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Los días de crédito máximo son 365'
+                })
+            
+            # Verificar si la cédula ya existe
+            if Cliente.objects.filter(cedula=cedula_limpia).exists():
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Ya existe un cliente con la cédula {cedula_limpia}'
+                })
+            
+            # === CREAR CLIENTE ===
+            cliente = Cliente.objects.create(
+                cedula=cedula_limpia,
+                nombre_completo=nombre_completo,
+                direccion=direccion,
+                telefono_principal=telefono_principal_limpio,
+                telefono_alternativo=telefono_alternativo,
+                limite_credito=limite_credito_decimal,
+                dias_credito=dias_credito_int,
+                notas_credito=notas_credito if notas_credito else None
+            )
+            
+            # Respuesta exitosa
+            return JsonResponse({
+                'success': True,
+                'mensaje': f'✅ Cliente "{nombre_completo}" registrado exitosamente',
+                'cliente': {
+                    'id': cliente.id,
+                    'cedula': cliente.cedula,
+                    'nombre': cliente.nombre_completo,
+                    'limite_credito': str(cliente.limite_credito),
+                    'dias_credito': cliente.dias_credito
+                }
+            })
+            
+        except IntegrityError as e:
+            return JsonResponse({
+                'success': False,
+                'error': f'Error de integridad en la base de datos: {str(e)}'
+            })
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': f'Error inesperado: {str(e)}'
+            })
+    
+    # Si es GET, mostrar el formulario
+    return render(request, 'facturacion/registrodeclientes.html')
+
+
+# ==========================================
+# CUENTAS POR COBRAR
+# ==========================================
+
+def _decimal_json(fila):
+    """Convertir los Decimal de una fila de values() a float para JsonResponse"""
+    return {clave: float(valor) if isinstance(valor, Decimal) else valor for clave, valor in fila.items()}
+
+
+@login_required
+def cuentaporcobrar(request):
+    """Pantalla de cuentas por cobrar: clientes con saldo, cargos abiertos y pagos"""
+    clientes = []
+    for cliente in cartera():
+        cliente = _decimal_json(cliente)
+        cliente['facturas'] = [_decimal_json(cargo) for cargo in cliente['facturas']]
+        cliente['historial_pagos'] = [_decimal_json(pago) for pago in cliente['historial_pagos']]
+        clientes.append(cliente)
+    return render(request, 'facturacion/cuentaporcobrar.html', {'clientes': clientes})
+
+
+@login_required
+def credito_disponible_cliente(request, cliente_id):
+    """Crédito disponible de un cliente (lectura de una sola fila, para la caja)"""
+    datos = credito_cliente(cliente_id)
+    if not datos:
+        return JsonResponse({'success': False, 'error': 'Cliente no encontrado'}, status=404)
+    return JsonResponse({'success': True, 'cliente': _decimal_json(datos)})
+
+
+@login_required
+def cuenta_cliente(request, cliente_id):
+    """Saldo, antigüedad y últimos movimientos de la cuenta de un cliente"""
+    datos = credito_cliente(cliente_id)
+    if not datos:
+        return JsonResponse({'success': False, 'error': 'Cliente no encontrado'}, status=404)
+
+    antiguedad = antiguedad_saldos(cliente_id)
+    movimientos = MovimientoCuenta.objects.filter(cliente_id=cliente_id).values(
+        'id', 'tipo', 'monto', 'saldo_resultante', 'saldo_pendiente',
+        'fecha', 'fecha_vencimiento', 'descripcion', 'factura__numero_factura',
+    )[:100]
+
+    return JsonResponse({
+        'success': True,
+        'cliente': _decimal_json(datos),
+        'antiguedad': _decimal_json(antiguedad[0]) if antiguedad else None,
+        'movimientos': [_decimal_json(movimiento) for movimiento in movimientos],
+    })
+
+
+@login_required
+def historial_cliente(request, cliente_id):
+    """Agregados de visitas y últimas facturas de un cliente (ver visitas.py)"""
+    datos = Cliente.objects.filter(id=cliente_id).values(
+        'id', 'nombre_completo', 'cedula', 'primera_visita', 'ultima_visita', 'visitas', 'total_gastado',
+    ).first()
+    if not datos:
+        return JsonResponse({'success': False, 'error': 'Cliente no encontrado'}, status=404)
+
+    return JsonResponse({
+        'success': True,
+        'cliente': _decimal_json(datos),
+        'facturas': [_decimal_json(factura) for factura in historial(cliente_id)],
+    })
+
+
+@login_required
+@require_POST
+def registrar_movimiento_cliente(request, cliente_id, tipo):
+    """
+    Registrar un pago o ajuste. Cuerpo JSON: {"monto": 500, "descripcion": "..."};
+    un pago admite además "metodo_pago" (efectivo por defecto) y "caja"
+    """
+    try:
+        data = json.loads(request.body) if request.body else {}
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'JSON inválido'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'success': False, 'error': 'Se esperaba un objeto JSON'}, status=400)
+    try:
+        monto = Decimal(str(data.get('monto')))
+        # NaN/Infinity no son montos, ni lo que no cabe en MovimientoCuenta.monto
+        if not monto.is_finite() or abs(monto) >= MONTO_MAXIMO:
+            raise InvalidOperation
+        monto = monto.quantize(Decimal('0.01'))
+    except InvalidOperation:
+        return JsonResponse({'success': False, 'error': 'Monto inválido'}, status=400)
+
+    descripcion = str(data.get('descripcion', ''))[:200]
+    try:
+        if tipo == 'pago':
+            movimiento = registrar_abono(cliente_id, monto, request.user, descripcion,
+                                         str(data.get('metodo_pago') or 'efectivo'), data.get('caja'))
+        else:
+            movimiento = registrar_ajuste(cliente_id, monto, request.user, descripcion)
+    except (ErrorCredito, ErrorCaja) as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=409)
+
+    return JsonResponse({
+        'success': True,
+        'message': f'{movimiento.get_tipo_display()} registrado',
+        'saldo': float(movimiento.saldo_resultante),
+    })
+
+
+@login_required
+def cuentas_por_cobrar_antiguedad(request):
+    """Antigüedad de saldos (0-30, 31-60, 61-90, 90+) de todos los clientes"""
+    clientes = [_decimal_json(fila) for fila in antiguedad_saldos()]
+    totales = {}
+    for fila in clientes:
+        for clave in ('total', 'dias_0_30', 'dias_31_60', 'dias_61_90', 'dias_90_mas'):
+            totales[clave] = totales.get(clave, 0) + fila[clave]
+    return JsonResponse({'success': True, 'clientes': clientes, 'totales': totales})
+
+
+@login_required
+def cuentas_por_cobrar_estados(request):
+    """Estados de cuenta del mes (?anio=2025&mes=1) de todos los clientes"""
+    hoy = timezone.localdate()
+    try:
+        anio = int(request.GET.get('anio', hoy.year))
+        mes = int(request.GET.get('mes', hoy.month))
+        if not 1 <= mes <= 12:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Período inválido'}, status=400)
+
+    return JsonResponse({
+        'success': True,
+        'anio': anio,
+        'mes': mes,
+        'estados': [_decimal_json(fila) for fila in estados_de_cuenta(anio, mes)],
+    })
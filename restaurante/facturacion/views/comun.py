@@ -0,0 +1,41 @@
+"""Utilidades compartidas por las vistas (concurrencia optimista de facturas)."""
+from django.contrib import messages
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+
+from ..models import ConflictoVersion
+from ..registro import obtener_logger
+
+logger_devoluciones = obtener_logger('devoluciones')
+
+
+def version_solicitud(request):
+    """Versión de la factura que el cliente tenía en pantalla (None si no la envió)"""
+    try:
+        return int(request.POST['version'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def verificar_version_factura(factura, version):
+    """Rechazar la operación si el cliente trabajó sobre una versión vieja"""
+    if version is not None and version != factura.version:
+        raise ConflictoVersion(factura, factura.version)
+
+
+def respuesta_conflicto(error):
+    """409 para clientes AJAX: recargar la factura y reintentar con la versión actual"""
+    return JsonResponse({
+        'success': False,
+        'conflicto': True,
+        'message': str(error),
+        'version_factura': error.version_actual,
+    }, status=409)
+
+
+def redirigir_conflicto(request, error):
+    """Volver a la factura con los datos actuales para que el usuario reintente"""
+    logger_devoluciones.warning('⚠️ Conflicto de versión en factura %s', error.factura.numero_factura)
+    messages.warning(request, f'⚠️ {error}')
+    return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={error.factura.numero_factura}')
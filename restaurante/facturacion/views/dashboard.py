@@ -0,0 +1,514 @@
+"""Dashboard de ventas."""
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import Sum
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+
+from ..models import Cliente, Factura, Pedido
+from ..registro import obtener_logger
+
+logger_reportes = obtener_logger('reportes')
+
+
+@login_required
+def dashbort(request):
+    # Obtener hora local actual
+    ahora_local = timezone.localtime()
+    hoy_local = ahora_local.date()
+    hora_actual = ahora_local.time()
+
+    # DEFINICIÓN DEL "DÍA": De 6:00 AM a 5:59 AM del día siguiente
+    if ahora_local.hour >= 6:
+        # Si son las 6:00 AM o más tarde, el día actual comenzó hoy a las 6:00 AM
+        inicio_dia = timezone.make_aware(
+            datetime.combine(hoy_local, datetime(2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(hoy_local + timedelta(days=1),
+                             datetime(2000, 1, 1, 5, 59, 59).time())
+        )
+    else:
+        # Si es antes de las 6:00 AM, estamos en el día que comenzó ayer a las 6:00 AM
+        inicio_dia = timezone.make_aware(
+            datetime.combine(hoy_local - timedelta(days=1),
+                             datetime(2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(hoy_local, datetime(2000, 1, 1, 5, 59, 59).time())
+        )
+
+    # Obtener rango visual para mostrar (para información)
+    rango_dia_inicio = timezone.localtime(inicio_dia)
+    rango_dia_fin = timezone.localtime(fin_dia)
+
+    # 1. VENTA DEL DÍA - Facturas del "día" según nueva definición (6 AM a 5:59 AM)
+    facturas_hoy = Factura.objects.filter(
+        fecha_factura__gte=inicio_dia,
+        fecha_factura__lte=fin_dia,
+        estado='pagada'
+    )
+
+    venta_dia = facturas_hoy.aggregate(total_dia=Sum('total'))[
+        'total_dia'] or Decimal('0.00')
+
+    # 2. VENTA DEL MES - Esto se mantiene igual (mes calendario)
+    primer_dia_mes = hoy_local.replace(day=1)
+    inicio_mes = timezone.make_aware(
+        datetime.combine(primer_dia_mes, datetime.min.time())
+    )
+
+    # El fin del mes es el último día del mes actual a las 23:59:59
+    if hoy_local.month == 12:
+        ultimo_dia_mes = hoy_local.replace(day=31)
+    else:
+        ultimo_dia_mes = hoy_local.replace(
+            month=hoy_local.month + 1, day=1) - timedelta(days=1)
+
+    fin_mes = timezone.make_aware(
+        datetime.combine(ultimo_dia_mes, datetime.max.time())
+    )
+
+    facturas_mes = Factura.objects.filter(
+        fecha_factura__gte=inicio_mes,
+        fecha_factura__lte=fin_mes,
+        estado='pagada'
+    )
+
+    venta_mes = facturas_mes.aggregate(total_mes=Sum('total'))[
+        'total_mes'] or Decimal('0.00')
+
+    # 3. PEDIDOS HOY - Usar misma definición de "día" (6 AM a 5:59 AM)
+    total_pedidos = Pedido.objects.filter(
+        fecha_pedido__gte=inicio_dia,
+        fecha_pedido__lte=fin_dia
+    ).count()
+
+    # 4. GASTOS TOTALES - Mantener igual
+    gastos_totales = venta_mes * Decimal('0.60')
+
+    # 5. GANANCIAS NETAS
+    ganancias_netas = venta_mes - gastos_totales
+
+    # 6. NUEVOS CLIENTES - Primera visita dentro del "día" (índice de Cliente, ver visitas.py)
+    nuevos_clientes = Cliente.objects.filter(
+        primera_visita__gte=inicio_dia,
+        primera_visita__lte=fin_dia
+    ).count()
+    clientes_recurrentes = Cliente.objects.filter(
+        ultima_visita__gte=inicio_dia,
+        ultima_visita__lte=fin_dia,
+        primera_visita__lt=inicio_dia
+    ).count()
+
+    # 7. ACTIVIDADES RECIENTES - Mantener igual (últimas 5 facturas sin filtrar por día)
+    actividades_recientes = Factura.objects.filter(
+        estado='pagada'
+    ).order_by('-fecha_factura')[:5]
+
+    # 8. PRODUCTOS MÁS VENDIDOS - Usar facturas del "día" (6 AM a 5:59 AM)
+    productos_vendidos = {}
+
+    for factura in facturas_hoy:  # Ahora usa facturas_hoy (definición del día)
+        try:
+            items = factura.get_items_detalle()
+            if items and isinstance(items, list):
+                for item in items:
+                    nombre = item.get('name', '').strip()
+                    if not nombre:
+                        nombre = item.get('nombre', '').strip()
+
+                    if not nombre:
+                        continue
+
+                    cantidad = float(item.get('quantity', 0))
+                    if cantidad <= 0:
+                        continue
+
+                    precio = float(item.get('price', 0))
+
+                    if nombre in productos_vendidos:
+                        productos_vendidos[nombre]['cantidad'] += cantidad
+                        productos_vendidos[nombre]['ingresos'] += Decimal(
+                            str(cantidad * precio))
+                    else:
+                        productos_vendidos[nombre] = {
+                            'nombre': nombre,
+                            'cantidad': cantidad,
+                            'ingresos': Decimal(str(cantidad * precio))
+                        }
+        except Exception as e:
+            logger_reportes.error('Error procesando items de factura %s: %s', factura.numero_factura, e)
+            continue
+
+    productos_top = sorted(
+        productos_vendidos.values(),
+        key=lambda x: x['cantidad'],
+        reverse=True
+    )[:5]
+
+    # 9. DATOS PARA GRÁFICO DE VENTAS - Últimos 7 "días" (cada uno de 6 AM a 5:59 AM)
+    ultimos_7_dias = []
+    ventas_7_dias = []
+
+    for i in range(6, -1, -1):
+        # Para cada día en el gráfico, aplicar la misma lógica de 6 AM a 5:59 AM
+        dia_referencia = hoy_local - timedelta(days=i)
+
+        # Determinar rango para este día
+        if i == 0:
+            # Para hoy, usar los rangos ya calculados
+            dia_inicio = inicio_dia
+            dia_fin = fin_dia
+            dia_str = "Hoy"
+        else:
+            # Para días anteriores
+            dia_anterior = dia_referencia
+            # Crear rango de 6 AM a 5:59 AM del día siguiente
+            dia_inicio = timezone.make_aware(
+                datetime.combine(dia_anterior, datetime(
+                    2000, 1, 1, 6, 0, 0).time())
+            )
+            dia_fin = timezone.make_aware(
+                datetime.combine(dia_anterior + timedelta(days=1),
+                                 datetime(2000, 1, 1, 5, 59, 59).time())
+            )
+            dia_str = dia_anterior.strftime('%a')
+
+        venta_dia_grafico = Factura.objects.filter(
+            fecha_factura__gte=dia_inicio,
+            fecha_factura__lte=dia_fin,
+            estado='pagada'
+        ).aggregate(total=Sum('total'))['total'] or Decimal('0.00')
+
+        ultimos_7_dias.append(dia_str)
+        ventas_7_dias.append(float(venta_dia_grafico))
+
+    # 10. DATOS PARA GRÁFICO DE CATEGORÍAS - Mantener igual
+    categorias_data = []
+    ventas_categorias_data = []
+
+    try:
+        # Primero intentar obtener categorías de productos vendidos hoy
+        categorias_dict = {}
+        
+        for factura in facturas_hoy:
+            items = factura.get_items_detalle()
+            if items and isinstance(items, list):
+                for item in items:
+                    categoria = item.get('categoria', 'otro').lower()
+                    cantidad = float(item.get('quantity', 0))
+                    precio = float(item.get('price', 0))
+                    
+                    if categoria in categorias_dict:
+                        categorias_dict[categoria] += cantidad * precio
+                    else:
+                        categorias_dict[categoria] = cantidad * precio
+        
+        # Si no hay categorías hoy, intentar del mes
+        if not categorias_dict:
+            for factura in facturas_mes:
+                items = factura.get_items_detalle()
+                if items and isinstance(items, list):
+                    for item in items:
+                        categoria = item.get('categoria', 'otro').lower()
+                        cantidad = float(item.get('quantity', 0))
+                        precio = float(item.get('price', 0))
+                        
+                        if categoria in categorias_dict:
+                            categorias_dict[categoria] += cantidad * precio
+                        else:
+                            categorias_dict[categoria] = cantidad * precio
+        
+        # Si aún no hay datos, usar categorías por defecto
+        if categorias_dict:
+            categorias_data = list(categorias_dict.keys())
+            ventas_categorias_data = list(categorias_dict.values())
+        else:
+            # Datos de ejemplo solo si no hay datos reales
+            categorias_data = ['Entradas', 'Platos Fuertes', 'Postres', 'Bebidas', 'Especiales']
+            ventas_categorias_data = [15, 40, 25, 12, 8]
+    except Exception as e:
+        logger_reportes.error('Error en categorías: %s', e)
+        categorias_data = ['Entradas', 'Platos Fuertes', 'Postres', 'Bebidas', 'Especiales']
+        ventas_categorias_data = [15, 40, 25, 12, 8]
+
+    # 11. DATOS PARA GRÁFICOS DE MES Y AÑO (DATOS REALES)
+    # Etiquetas para gráfico mensual (últimas 4 semanas)
+    labels_mensuales = []
+    proyeccion_mensual = []
+    
+    # Calcular ventas de las últimas 4 semanas
+    for semana in range(4):
+        fecha_inicio_semana = hoy_local - timedelta(weeks=semana, days=hoy_local.weekday())
+        fecha_fin_semana = fecha_inicio_semana + timedelta(days=6)
+        
+        # Ajustar horas para el período
+        inicio_semana = timezone.make_aware(
+            datetime.combine(fecha_inicio_semana, datetime(2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_semana = timezone.make_aware(
+            datetime.combine(fecha_fin_semana + timedelta(days=1),
+                             datetime(2000, 1, 1, 5, 59, 59).time())
+        )
+        
+        # Obtener ventas de esta semana
+        venta_semana = Factura.objects.filter(
+            fecha_factura__gte=inicio_semana,
+            fecha_factura__lte=fin_semana,
+            estado='pagada'
+        ).aggregate(total=Sum('total'))['total'] or Decimal('0.00')
+        
+        labels_mensuales.append(f"Sem {semana+1}")
+        proyeccion_mensual.append(float(venta_semana))
+    
+    # Invertir para que la última semana sea la primera
+    labels_mensuales = labels_mensuales[::-1]
+    proyeccion_mensual = proyeccion_mensual[::-1]
+    
+    # Etiquetas para gráfico anual (últimos 12 meses)
+    labels_anuales = []
+    proyeccion_anual = []
+    
+    # Calcular ventas de los últimos 12 meses
+    for i in range(11, -1, -1):
+        # Calcular fecha del mes
+        fecha_mes = hoy_local.replace(day=1)
+        for _ in range(i):
+            # Retroceder un mes
+            fecha_mes = (fecha_mes.replace(day=1) - timedelta(days=1)).replace(day=1)
+        
+        # Calcular inicio y fin del mes
+        if fecha_mes.month == 12:
+            ultimo_dia = fecha_mes.replace(day=31)
+        else:
+            ultimo_dia = fecha_mes.replace(month=fecha_mes.month + 1, day=1) - timedelta(days=1)
+        
+        inicio_mes_grafico = timezone.make_aware(
+            datetime.combine(fecha_mes, datetime.min.time())
+        )
+        fin_mes_grafico = timezone.make_aware(
+            datetime.combine(ultimo_dia, datetime.max.time())
+        )
+        
+        # Obtener ventas de este mes
+        venta_mes_grafico = Factura.objects.filter(
+            fecha_factura__gte=inicio_mes_grafico,
+            fecha_factura__lte=fin_mes_grafico,
+            estado='pagada'
+        ).aggregate(total=Sum('total'))['total'] or Decimal('0.00')
+        
+        # Nombre del mes en español
+        meses_esp = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 
+                     'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
+        
+        labels_anuales.append(meses_esp[fecha_mes.month - 1])
+        proyeccion_anual.append(float(venta_mes_grafico))
+    
+    # Invertir para que enero sea primero
+    labels_anuales = labels_anuales[::-1]
+    proyeccion_anual = proyeccion_anual[::-1]
+
+    # Datos para depuración y verificación DIRECTA en el dashboard
+    facturas_hoy_todas = Factura.objects.filter(
+        fecha_factura__gte=inicio_dia,
+        fecha_factura__lte=fin_dia
+    ).order_by('-fecha_factura')
+
+    todas_facturas = Factura.objects.filter(
+        estado='pagada'
+    ).order_by('-fecha_factura')[:10]
+
+    # OBTENER DATOS DE VERIFICACIÓN DIRECTA
+    # Total de facturas en la base de datos
+    total_facturas_db = Factura.objects.count()
+    total_facturas_pagadas_db = Factura.objects.filter(estado='pagada').count()
+    
+    # Rango de fechas de facturas
+    primera_factura = Factura.objects.order_by('fecha_factura').first()
+    ultima_factura = Factura.objects.order_by('-fecha_factura').first()
+    
+    # Facturas del último mes completo (para verificar que hay datos)
+    mes_pasado = hoy_local.replace(day=1) - timedelta(days=1)
+    inicio_mes_pasado = mes_pasado.replace(day=1)
+    fin_mes_pasado = mes_pasado
+    
+    inicio_mes_pasado_time = timezone.make_aware(
+        datetime.combine(inicio_mes_pasado, datetime.min.time())
+    )
+    fin_mes_pasado_time = timezone.make_aware(
+        datetime.combine(fin_mes_pasado, datetime.max.time())
+    )
+    
+    facturas_mes_pasado = Factura.objects.filter(
+        fecha_factura__gte=inicio_mes_pasado_time,
+        fecha_factura__lte=fin_mes_pasado_time,
+        estado='pagada'
+    ).count()
+    
+    venta_mes_pasado = Factura.objects.filter(
+        fecha_factura__gte=inicio_mes_pasado_time,
+        fecha_factura__lte=fin_mes_pasado_time,
+        estado='pagada'
+    ).aggregate(total=Sum('total'))['total'] or Decimal('0.00')
+
+    context = {
+        'venta_dia': venta_dia,
+        'venta_mes': venta_mes,
+        'total_pedidos': total_pedidos,
+        'gastos_totales': gastos_totales,
+        'ganancias_netas': ganancias_netas,
+        'nuevos_clientes': nuevos_clientes,
+        'clientes_recurrentes': clientes_recurrentes,
+        'actividades': actividades_recientes,
+        'productos_top': productos_top,
+        'dias_grafico': json.dumps(ultimos_7_dias),
+        'ventas_grafico': json.dumps(ventas_7_dias),
+        'categorias_grafico': json.dumps(categorias_data),
+        'ventas_categorias_grafico': json.dumps(ventas_categorias_data),
+        'labels_mensuales_json': json.dumps(labels_mensuales),
+        'proyeccion_mensual_json': json.dumps(proyeccion_mensual),
+        'labels_anuales_json': json.dumps(labels_anuales),
+        'proyeccion_anual_json': json.dumps(proyeccion_anual),
+        'fecha_actual': ahora_local.strftime('%A, %d de %B de %Y'),
+        'hora_actual': ahora_local.strftime('%I:%M:%S'),
+        'hoy': hoy_local,
+        'now_utc': timezone.now(),
+        'total_facturas_hoy': facturas_hoy_todas.count(),
+        'total_facturas_mes': facturas_mes.count(),
+        'facturas_hoy_todas': facturas_hoy_todas,
+        'todas_facturas': todas_facturas,
+        
+        # Información adicional para depuración
+        'rango_dia_inicio': rango_dia_inicio.strftime('%d/%m/%Y %H:%M'),
+        'rango_dia_fin': rango_dia_fin.strftime('%d/%m/%Y %H:%M'),
+        'definicion_dia': '6:00 AM - 5:59 AM (día siguiente)',
+        
+        # DATOS DE VERIFICACIÓN PARA MOSTRAR DIRECTAMENTE EN EL DASHBOARD
+        'total_facturas_db': total_facturas_db,
+        'total_facturas_pagadas_db': total_facturas_pagadas_db,
+        'primera_factura_fecha': primera_factura.fecha_factura.strftime('%d/%m/%Y') if primera_factura else 'No hay facturas',
+        'ultima_factura_fecha': ultima_factura.fecha_factura.strftime('%d/%m/%Y') if ultima_factura else 'No hay facturas',
+        'facturas_mes_pasado': facturas_mes_pasado,
+        'venta_mes_pasado': venta_mes_pasado,
+        'mes_pasado_nombre': inicio_mes_pasado.strftime('%B %Y'),
+        
+        # DATOS CRUDOS PARA DIAGNÓSTICO
+        'datos_semana_raw': list(zip(ultimos_7_dias, ventas_7_dias)),
+        'datos_categorias_raw': list(zip(categorias_data, ventas_categorias_data)),
+        'datos_mensual_raw': list(zip(labels_mensuales, proyeccion_mensual)),
+        'datos_anual_raw': list(zip(labels_anuales, proyeccion_anual)),
+    }
+
+    return render(request, 'facturacion/dashbort.html', context)
+
+
+@login_required
+def dashboard_stats(request):
+    """Vista API para obtener estadísticas en formato JSON"""
+    try:
+        # Obtener hora local actual
+        ahora_local = timezone.localtime()
+        hoy_local = ahora_local.date()
+
+        # DEFINICIÓN DEL "DÍA": De 6:00 AM a 5:59 AM del día siguiente
+        if ahora_local.hour >= 6:
+            inicio_dia = timezone.make_aware(
+                datetime.combine(hoy_local, datetime(
+                    2000, 1, 1, 6, 0, 0).time())
+            )
+            fin_dia = timezone.make_aware(
+                datetime.combine(hoy_local + timedelta(days=1),
+                                 datetime(2000, 1, 1, 5, 59, 59).time())
+            )
+        else:
+            inicio_dia = timezone.make_aware(
+                datetime.combine(hoy_local - timedelta(days=1),
+                                 datetime(2000, 1, 1, 6, 0, 0).time())
+            )
+            fin_dia = timezone.make_aware(
+                datetime.combine(hoy_local, datetime(
+                    2000, 1, 1, 5, 59, 59).time())
+            )
+
+        # 1. VENTA DEL DÍA
+        facturas_hoy = Factura.objects.filter(
+            fecha_factura__gte=inicio_dia,
+            fecha_factura__lte=fin_dia,
+            estado='pagada'
+        )
+
+        venta_dia = facturas_hoy.aggregate(total_dia=Sum('total'))[
+            'total_dia'] or Decimal('0.00')
+
+        # 2. VENTA DEL MES
+        primer_dia_mes = hoy_local.replace(day=1)
+        inicio_mes = timezone.make_aware(
+            datetime.combine(primer_dia_mes, datetime.min.time()))
+
+        if hoy_local.month == 12:
+            ultimo_dia_mes = hoy_local.replace(day=31)
+        else:
+            ultimo_dia_mes = hoy_local.replace(
+                month=hoy_local.month + 1, day=1) - timedelta(days=1)
+
+        fin_mes = timezone.make_aware(datetime.combine(
+            ultimo_dia_mes, datetime.max.time()))
+
+        facturas_mes = Factura.objects.filter(
+            fecha_factura__gte=inicio_mes,
+            fecha_factura__lte=fin_mes,
+            estado='pagada'
+        )
+
+        venta_mes = facturas_mes.aggregate(total_mes=Sum('total'))[
+            'total_mes'] or Decimal('0.00')
+
+        # 3. PEDIDOS HOY
+        total_pedidos = Pedido.objects.filter(
+            fecha_pedido__gte=inicio_dia,
+            fecha_pedido__lte=fin_dia
+        ).count()
+
+        # 4. GASTOS TOTALES
+        gastos_totales = venta_mes * Decimal('0.60')
+
+        # 5. GANANCIAS NETAS
+        ganancias_netas = venta_mes - gastos_totales
+
+        # 6. NUEVOS CLIENTES
+        nuevos_clientes = Cliente.objects.filter(
+            primera_visita__gte=inicio_dia,
+            primera_visita__lte=fin_dia
+        ).count()
+        clientes_recurrentes = Cliente.objects.filter(
+            ultima_visita__gte=inicio_dia,
+            ultima_visita__lte=fin_dia,
+            primera_visita__lt=inicio_dia
+        ).count()
+
+        # Retornar datos como JSON
+        return JsonResponse({
+            'venta_dia': float(venta_dia),
+            'venta_mes': float(venta_mes),
+            'total_pedidos': total_pedidos,
+            'gastos_totales': float(gastos_totales),
+            'ganancias_netas': float(ganancias_netas),
+            'nuevos_clientes': nuevos_clientes,
+            'clientes_recurrentes': clientes_recurrentes,
+            'fecha_actual': ahora_local.strftime('%A, %d de %B de %Y'),
+            'hora_actual': ahora_local.strftime('%H:%M:%S'),
+            'total_facturas_hoy': facturas_hoy.count(),
+            'total_facturas_mes': facturas_mes.count(),
+            'status': 'success'
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        })
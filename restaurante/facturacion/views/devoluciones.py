@@ -0,0 +1,682 @@
+"""Anulaciones y devoluciones de facturas."""
+import json
+from decimal import Decimal
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archivo import buscar_factura
+from ..caja import registrar_devolucion
+from ..cuentas import revertir_cargo_factura
+from ..items import ITEMS_VERSION
+from ..models import ConflictoVersion, Devolucion, Factura, Producto
+from ..registro import obtener_logger
+from .comun import redirigir_conflicto, verificar_version_factura, version_solicitud
+
+logger_devoluciones = obtener_logger('devoluciones')
+
+
+@login_required
+def anulacionydevolucion(request):
+    """Vista principal para anulación y devolución de facturas"""
+    factura = None
+    items = []
+    items_json = '[]'
+    productos_devueltos_json = '[]'
+    productos_disponibles_json = '[]'
+
+    numero_factura = request.GET.get('numero_factura', '').strip()
+    ultima_factura = request.GET.get('ultima') == 'true'
+
+    try:
+        if ultima_factura:
+            factura = Factura.objects.order_by('-fecha_creacion').first()
+            if factura:
+                messages.success(
+                    request, f'Última factura cargada: {factura.numero_factura}')
+                # Depuración directa
+                logger_devoluciones.debug('%s', '='*60)
+                logger_devoluciones.debug('DEBUG - Factura: %s', factura.numero_factura)
+                logger_devoluciones.debug('Tipo de items: %s', type(factura.items))
+                if isinstance(factura.items, str):
+                    logger_devoluciones.debug('Es una cadena. Longitud: %s', len(factura.items))
+                    logger_devoluciones.debug('Primeros 300 caracteres: %s', factura.items[:300])
+                elif isinstance(factura.items, dict):
+                    logger_devoluciones.debug('Es un diccionario. Claves: %s', list(factura.items.keys()))
+                elif isinstance(factura.items, list):
+                    logger_devoluciones.debug('Es una lista. Longitud: %s', len(factura.items))
+                logger_devoluciones.debug('%s', '='*60)
+            else:
+                messages.error(request, 'No hay facturas registradas')
+
+        elif numero_factura:
+            # Busca en la tabla viva y, si no está, en el archivo
+            factura = buscar_factura(numero_factura)
+
+            if factura and factura.archivado:
+                messages.warning(
+                    request, f'Factura {factura.numero_factura} encontrada en el archivo (solo consulta)')
+            elif factura:
+                messages.success(
+                    request, f'Factura {factura.numero_factura} encontrada')
+                # Depuración directa
+                logger_devoluciones.debug('%s', '='*60)
+                logger_devoluciones.debug('DEBUG - Factura: %s', factura.numero_factura)
+                logger_devoluciones.debug('Tipo de items: %s', type(factura.items))
+                if isinstance(factura.items, str):
+                    logger_devoluciones.debug('Es una cadena. Longitud: %s', len(factura.items))
+                    logger_devoluciones.debug('Primeros 300 caracteres: %s', factura.items[:300])
+                elif isinstance(factura.items, dict):
+                    logger_devoluciones.debug('Es un diccionario. Claves: %s', list(factura.items.keys()))
+                elif isinstance(factura.items, list):
+                    logger_devoluciones.debug('Es una lista. Longitud: %s', len(factura.items))
+                logger_devoluciones.debug('%s', '='*60)
+            else:
+                messages.error(
+                    request, f'Factura {numero_factura} no encontrada')
+
+        if factura:
+            logger_devoluciones.debug('📄 FACTURA ENCONTRADA: %s', factura.numero_factura)
+            logger_devoluciones.debug("📦 Campo 'items' tipo: %s", type(factura.items))
+
+            # DEPURACIÓN DETALLADA
+            if isinstance(factura.items, str):
+                logger_devoluciones.debug('🔍 Contenido de items (string):')
+                logger_devoluciones.debug('%s', factura.items[:500])
+            elif isinstance(factura.items, list):
+                logger_devoluciones.debug(
+                    '🔍 Contenido de items (lista con %s elementos):',
+                    len(factura.items))
+                for i, item in enumerate(factura.items[:3]):  # Muestra solo 3
+                    logger_devoluciones.debug('Item %s: %s', i, item)
+
+            # Obtener items detallados
+            items = factura.get_items_detalle()
+            logger_devoluciones.debug('✅ Items normalizados: %s', len(items))
+
+            # Mostrar primeros 5 items para depuración
+            for i, item in enumerate(items[:5]):
+                logger_devoluciones.debug(
+                    "%s. %s - Cant: %s - Precio: $%s - Cat: '%s'",
+                    i+1, item.get('nombre', 'Sin nombre'), item.get('cantidad', 0), item.get('precio', 0), item.get('categoria', ''))
+
+            items_json = json.dumps(items, cls=DjangoJSONEncoder)
+
+            # Obtener productos disponibles para devolución
+            productos_disponibles = factura.get_productos_disponibles_devolucion()
+            productos_disponibles_json = json.dumps(
+                productos_disponibles, cls=DjangoJSONEncoder)
+            logger_devoluciones.debug('✅ Productos disponibles para devolver: %s', len(productos_disponibles))
+
+            # Historial de productos devueltos (guardado en la propia factura)
+            todos_productos_devueltos = factura.productos_devueltos or []
+
+            productos_devueltos_json = json.dumps(
+                todos_productos_devueltos, cls=DjangoJSONEncoder)
+            logger_devoluciones.debug('✅ Productos ya devueltos: %s', len(todos_productos_devueltos))
+
+    except Exception as e:
+        messages.error(request, f'Error: {str(e)}')
+        logger_devoluciones.error('Error cargando factura para devolución', exc_info=True)
+
+    context = {
+        'factura': factura,
+        'items': items,
+        'items_json': items_json,
+        'productos_devueltos_json': productos_devueltos_json,
+        'productos_disponibles_json': productos_disponibles_json,
+    }
+
+    return render(request, 'facturacion/anulacionydevolucion.html', context)
+
+
+# ============================================================
+# FUNCIONES DE GESTIÓN DE STOCK - SOLO BEBIDAS
+# ============================================================
+
+def buscar_producto_por_identificador(identificador):
+    """
+    Buscar producto por código o nombre con validación mejorada.
+    """
+    if not identificador:
+        return None
+
+    identificador = str(identificador).strip()
+
+    if not identificador:  # Si después del strip está vacío
+        return None
+
+    # 1. Buscar por código exacto (case-insensitive)
+    producto = Producto.objects.filter(codigo__iexact=identificador).first()
+    if producto:
+        logger_devoluciones.debug('✅ Producto encontrado por código exacto: %s', producto.nombre)
+        return producto
+
+    # 2. Buscar por nombre exacto (case-insensitive)
+    producto = Producto.objects.filter(nombre__iexact=identificador).first()
+    if producto:
+        logger_devoluciones.debug('✅ Producto encontrado por nombre exacto: %s', producto.nombre)
+        return producto
+
+    # 3. Buscar por código que contenga
+    producto = Producto.objects.filter(codigo__icontains=identificador).first()
+    if producto:
+        logger_devoluciones.debug('✅ Producto encontrado por código parcial: %s', producto.nombre)
+        return producto
+
+    # 4. Buscar por nombre que contenga
+    producto = Producto.objects.filter(nombre__icontains=identificador).first()
+    if producto:
+        logger_devoluciones.debug('✅ Producto encontrado por nombre parcial: %s', producto.nombre)
+        return producto
+
+    logger_devoluciones.error("❌ Producto no encontrado con identificador: '%s'", identificador)
+    return None
+
+
+def reponer_stock_producto(identificador, cantidad):
+    """
+    Aumentar stock de un producto SOLO SI ES BEBIDA
+    """
+    try:
+        producto = buscar_producto_por_identificador(identificador)
+
+        if producto:
+            # Verificar que sea bebida
+            if producto.categoria.lower() != 'bebida':
+                logger_devoluciones.warning(
+                    "⚠️  Producto '%s' no es bebida (categoría: %s)",
+                    producto.nombre, producto.categoria)
+                return False
+
+            # Reponer stock
+            stock_anterior = producto.cantidad
+            producto.cantidad += Decimal(str(cantidad))
+            producto.save()
+
+            logger_devoluciones.debug('📈 Stock repuesto: %s (%s)', producto.nombre, producto.codigo)
+            logger_devoluciones.debug(
+                'Antes: %s, Añadido: %s, Después: %s',
+                stock_anterior, cantidad, producto.cantidad)
+
+            return True
+
+        return False
+
+    except Exception as e:
+        logger_devoluciones.error('❌ Error al reponer stock: %s', str(e), exc_info=True)
+        return False
+
+
+def disminuir_stock_producto(identificador, cantidad):
+    """
+    Disminuir stock de un producto.
+    """
+    try:
+        producto = buscar_producto_por_identificador(identificador)
+
+        if producto:
+            # Verificar que hay suficiente stock
+            if producto.cantidad >= Decimal(str(cantidad)):
+                producto.cantidad -= Decimal(str(cantidad))
+                producto.save()
+                logger_devoluciones.debug('📉 Stock disminuido: %s (%s)', producto.nombre, producto.codigo)
+                return True
+            else:
+                logger_devoluciones.warning('⚠️  Stock insuficiente: %s < %s', producto.cantidad, cantidad)
+                return False
+
+        return False
+
+    except Exception as e:
+        logger_devoluciones.error('❌ Error al disminuir stock: %s', str(e), exc_info=True)
+        return False
+
+# ============================================================
+# NORMALIZACIÓN DE ITEMS
+# ============================================================
+
+
+def normalizar_items_factura(factura):
+    """Normalizar los items de la factura para tener una estructura consistente"""
+    items_normalizados = []
+    items_detalle = factura.get_items_detalle()
+
+    # Items canónicos: código y categoría ya vienen resueltos
+    if factura.items_version >= ITEMS_VERSION:
+        return [{'id': item['producto_id'] or (i + 1), **item} for i, item in enumerate(items_detalle)]
+
+    for i, item in enumerate(items_detalle):
+        # Extraer datos con múltiples posibles claves
+        nombre = item.get('nombre') or item.get(
+            'name') or item.get('producto') or f'Producto {i+1}'
+        cantidad = float(item.get('cantidad') or item.get('quantity') or 1)
+        precio = float(item.get('precio') or item.get('price') or 0)
+        subtotal = float(item.get('subtotal') or item.get(
+            'total') or (cantidad * precio))
+        categoria = item.get('categoria') or item.get('category') or ''
+
+        # INTENTAR OBTENER EL CÓDIGO DEL PRODUCTO DESDE LA BASE DE DATOS
+        codigo = ''
+        producto_id = item.get('producto_id') or item.get('id')
+
+        # Buscar producto por ID
+        if producto_id:
+            try:
+                producto = Producto.objects.filter(id=producto_id).first()
+                if producto:
+                    codigo = producto.codigo
+                    # Si no hay categoría en el item, usar la del producto
+                    if not categoria or categoria.lower() == 'otro':
+                        categoria = producto.categoria
+            except Exception as e:
+                logger_devoluciones.error('Error al buscar producto por ID %s: %s', producto_id, e)
+
+        # Si no se encontró por ID, buscar por nombre
+        if not codigo and nombre:
+            try:
+                producto = Producto.objects.filter(
+                    nombre__iexact=nombre.strip()).first()
+                if producto:
+                    codigo = producto.codigo
+                    categoria = producto.categoria
+            except Exception as e:
+                logger_devoluciones.error('Error al buscar producto por nombre %s: %s', nombre, e)
+
+        items_normalizados.append({
+            'id': producto_id or (i + 1),
+            'producto_id': producto_id,
+            'codigo': codigo,
+            'nombre': nombre,
+            'cantidad': cantidad,
+            'precio': precio,
+            'subtotal': subtotal,
+            'categoria': categoria,
+        })
+
+    return items_normalizados
+
+
+def buscar_item_por_nombre(items, nombre_buscar):
+    """
+    Buscar un item en la lista de items por nombre.
+    """
+    nombre_buscar_lower = nombre_buscar.lower().strip()
+
+    for item in items:
+        item_nombre = item.get('nombre', '').lower().strip()
+        if item_nombre == nombre_buscar_lower:
+            return item
+
+        # Buscar por similitud
+        if item_nombre.replace(' ', '') == nombre_buscar_lower.replace(' ', ''):
+            return item
+
+    # Si no se encuentra exacto, buscar por nombre que contenga
+    for item in items:
+        item_nombre = item.get('nombre', '').lower()
+        if nombre_buscar_lower in item_nombre:
+            return item
+
+    return None
+
+
+# Campos que escribe una devolución (total o parcial)
+CAMPOS_DEVOLUCION = ('estado', 'fecha_devolucion', 'productos_devueltos', 'cantidades_devueltas')
+
+
+# ============================================================
+# DEVOLUCIÓN TOTAL
+# ============================================================
+
+@login_required
+def procesar_devolucion_total(request):
+    """Procesar devolución total de una factura"""
+    if request.method == 'POST':
+        numero_factura = request.POST.get('numero_factura')
+
+        if not numero_factura:
+            messages.error(request, 'Número de factura requerido')
+            return redirect('anulacionydevolucion')
+
+        try:
+            factura = get_object_or_404(Factura, numero_factura=numero_factura)
+
+            if factura.estado != 'pagada':
+                messages.error(
+                    request,
+                    f'La factura debe estar pagada para procesar devolución. Estado actual: {factura.get_estado_display()}'
+                )
+                return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={factura.numero_factura}')
+
+            with transaction.atomic():
+                verificar_version_factura(factura, version_solicitud(request))
+
+                # Usar el método del modelo para obtener items
+                items = factura.get_items_detalle()
+                productos_devueltos = []
+                monto_total_devuelto = 0
+                bebidas_repuestas = 0
+
+                logger_devoluciones.debug('🔄 PROCESANDO DEVOLUCIÓN TOTAL')
+
+                for item in items:
+                    codigo = item.get('codigo', '')
+                    nombre = item.get('nombre', '')
+                    cantidad = item.get('cantidad', 0)
+                    precio = item.get('precio', 0)
+                    categoria = item.get('categoria', '')
+
+                    logger_devoluciones.debug('📦 Procesando item: %s', nombre)
+                    logger_devoluciones.debug("Código: '%s'", codigo)
+                    logger_devoluciones.debug("Categoría: '%s'", categoria)
+                    logger_devoluciones.debug('Cantidad: %s', cantidad)
+
+                    # REPONER stock para bebidas
+                    if categoria.lower() == 'bebida':
+                        # Usar código si está disponible, sino usar nombre
+                        identificador = codigo if codigo and codigo.strip() else nombre
+                        logger_devoluciones.debug(
+                            "🍺 ES BEBIDA - Reponiendo stock con identificador: '%s'",
+                            identificador)
+
+                        if reponer_stock_producto(identificador, cantidad):
+                            bebidas_repuestas += 1
+                            logger_devoluciones.debug('✅ Stock repuesto exitosamente')
+                        else:
+                            logger_devoluciones.warning('⚠️  No se pudo reponer stock')
+                    else:
+                        logger_devoluciones.debug('ℹ️  No es bebida - no se repone stock')
+
+                    monto_total_devuelto += precio * cantidad
+                    productos_devueltos.append({
+                        'producto_id': item.get('producto_id'),
+                        'codigo': codigo,
+                        'nombre': nombre,
+                        'cantidad': cantidad,
+                        'precio_unitario': precio,
+                        'subtotal': precio * cantidad,
+                        'categoria': categoria
+                    })
+
+                # Crear registro de devolución
+                Devolucion.objects.create(
+                    factura=factura,
+                    tipo_devolucion='total',
+                    productos_devueltos=productos_devueltos,
+                    monto_devuelto=monto_total_devuelto,
+                    motivo='Devolución total procesada desde el sistema',
+                    procesado_por=request.user
+                )
+                registrar_devolucion(factura, monto_total_devuelto, request.user, request.POST.get('caja'))
+                revertir_cargo_factura(factura, monto_total_devuelto, request.user,
+                                       f'Devolución total de factura {factura.numero_factura}')
+                factura.agregar_productos_devueltos(productos_devueltos)
+
+                factura.estado = 'totalmente_devuelta'
+                factura.fecha_devolucion = timezone.now()
+                # Si otra operación modificó la factura, se revierte toda la devolución
+                factura.guardar_con_version(*CAMPOS_DEVOLUCION)
+
+                logger_devoluciones.debug('✅ DEVOLUCIÓN TOTAL COMPLETADA')
+                logger_devoluciones.debug('Bebidas repuestas: %s', bebidas_repuestas)
+                logger_devoluciones.debug('Monto devuelto: $%.2f', monto_total_devuelto)
+
+                messages.success(
+                    request,
+                    f'✅ Devolución total procesada. Monto: ${monto_total_devuelto:.2f}. Bebidas repuestas: {bebidas_repuestas}'
+                )
+
+                return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={factura.numero_factura}')
+
+        except ConflictoVersion as e:
+            return redirigir_conflicto(request, e)
+        except Exception as e:
+            messages.error(
+                request, f'❌ Error al procesar devolución: {str(e)}')
+            logger_devoluciones.error('Error al procesar devolución total', exc_info=True)
+            return redirect('anulacionydevolucion')
+
+    return redirect('anulacionydevolucion')
+
+# ============================================================
+# DEVOLUCIÓN PARCIAL
+# ============================================================
+
+
+@login_required
+def procesar_devolucion_parcial(request):
+    """Procesar devolución parcial con validación mejorada"""
+    if request.method == 'POST':
+        numero_factura = request.POST.get('numero_factura')
+        productos_json = request.POST.get('productos_devueltos', '[]')
+
+        if not numero_factura:
+            messages.error(request, 'Número de factura requerido')
+            return redirect('anulacionydevolucion')
+
+        try:
+            factura = get_object_or_404(Factura, numero_factura=numero_factura)
+
+            if factura.estado not in ['pagada', 'parcialmente_devuelta']:
+                messages.error(
+                    request,
+                    f'Estado inválido para devolución: {factura.get_estado_display()}'
+                )
+                return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={factura.numero_factura}')
+
+            productos_devueltos = json.loads(productos_json)
+
+            if not productos_devueltos:
+                messages.error(request, 'Debes seleccionar productos')
+                return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={factura.numero_factura}')
+
+            with transaction.atomic():
+                verificar_version_factura(factura, version_solicitud(request))
+
+                items_factura = factura.get_items_detalle()
+                productos_procesados = []
+                en_solicitud = {}
+                monto_total_devuelto = Decimal('0.00')
+                bebidas_repuestas = 0
+
+                logger_devoluciones.debug('🔄 PROCESANDO DEVOLUCIÓN PARCIAL')
+
+                for producto_data in productos_devueltos:
+                    producto_nombre = producto_data.get('nombre', '')
+                    cantidad_devolver = float(producto_data.get('cantidad', 0))
+                    categoria = producto_data.get('categoria', '')
+
+                    # Buscar en items de factura
+                    item_factura = buscar_item_por_nombre(
+                        items_factura, producto_nombre)
+                    if not item_factura:
+                        messages.error(
+                            request, f'Producto {producto_nombre} no encontrado')
+                        return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={factura.numero_factura}')
+
+                    cantidad_original = float(item_factura.get('cantidad', 0))
+                    # Lectura directa del mapa, más lo ya pedido en esta misma solicitud
+                    clave = Factura.clave_devolucion(producto_nombre)
+                    cantidad_ya_devuelta = factura.get_cantidad_ya_devuelta(
+                        producto_nombre) + en_solicitud.get(clave, 0)
+                    cantidad_disponible = cantidad_original - cantidad_ya_devuelta
+
+                    # VALIDACIÓN CRÍTICA
+                    if cantidad_devolver > cantidad_disponible:
+                        messages.error(
+                            request,
+                            f'❌ {producto_nombre}: Intentas devolver {cantidad_devolver} pero solo hay {cantidad_disponible} disponible (ya devuelto: {cantidad_ya_devuelta})'
+                        )
+                        return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={factura.numero_factura}')
+                    en_solicitud[clave] = en_solicitud.get(clave, 0) + cantidad_devolver
+
+                    precio = Decimal(str(item_factura.get('precio', 0)))
+                    subtotal = precio * Decimal(str(cantidad_devolver))
+                    codigo = item_factura.get('codigo', '')
+
+                    logger_devoluciones.debug('📦 %s', producto_nombre)
+                    logger_devoluciones.debug(
+                        'Devolver: %s de %s disponibles',
+                        cantidad_devolver, cantidad_disponible)
+                    logger_devoluciones.debug("Código: '%s', Categoría: '%s'", codigo, categoria)
+
+                    # Reponer stock para bebidas
+                    if categoria.lower() == 'bebida':
+                        identificador = codigo if codigo and codigo.strip() else producto_nombre
+                        logger_devoluciones.debug("🍺 Reponiendo con: '%s'", identificador)
+
+                        if reponer_stock_producto(identificador, cantidad_devolver):
+                            bebidas_repuestas += 1
+                            logger_devoluciones.debug('✅ Stock repuesto')
+                        else:
+                            logger_devoluciones.warning('⚠️  Advertencia: No se pudo reponer stock')
+
+                    monto_total_devuelto += subtotal
+                    productos_procesados.append({
+                        'producto_id': item_factura.get('producto_id'),
+                        'codigo': codigo,
+                        'nombre': producto_nombre,
+                        'cantidad': cantidad_devolver,
+                        'precio_unitario': float(precio),
+                        'subtotal': float(subtotal),
+                        'categoria': categoria
+                    })
+
+                # Crear registro de devolución
+                Devolucion.objects.create(
+                    factura=factura,
+                    tipo_devolucion='parcial',
+                    productos_devueltos=productos_procesados,
+                    monto_devuelto=monto_total_devuelto,
+                    motivo='Devolución parcial procesada',
+                    procesado_por=request.user
+                )
+                registrar_devolucion(factura, monto_total_devuelto, request.user, request.POST.get('caja'))
+                revertir_cargo_factura(factura, monto_total_devuelto, request.user,
+                                       f'Devolución parcial de factura {factura.numero_factura}')
+                factura.agregar_productos_devueltos(productos_procesados)
+
+                # Actualizar estado de factura
+                if factura.estado == 'pagada':
+                    factura.estado = 'parcialmente_devuelta'
+
+                # Verificar si ya se devolvió todo
+                productos_disponibles = factura.get_productos_disponibles_devolucion()
+                if not productos_disponibles:
+                    factura.estado = 'totalmente_devuelta'
+
+                factura.fecha_devolucion = timezone.now()
+                # El mapa de cantidades se validó con esta versión de la factura
+                factura.guardar_con_version(*CAMPOS_DEVOLUCION)
+
+                logger_devoluciones.debug('✅ DEVOLUCIÓN COMPLETADA')
+                logger_devoluciones.debug('Bebidas repuestas: %s', bebidas_repuestas)
+                logger_devoluciones.debug('Monto: $%s', monto_total_devuelto)
+
+                messages.success(
+                    request,
+                    f'✅ Devolución procesada: ${monto_total_devuelto:.2f}. Bebidas repuestas: {bebidas_repuestas}'
+                )
+
+                return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={factura.numero_factura}')
+
+        except ConflictoVersion as e:
+            return redirigir_conflicto(request, e)
+        except Exception as e:
+            messages.error(request, f'❌ Error: {str(e)}')
+            logger_devoluciones.error('Error al procesar devolución parcial', exc_info=True)
+            return redirect('anulacionydevolucion')
+
+    return redirect('anulacionydevolucion')
+
+# ============================================================
+# ANULACIÓN DE FACTURA
+# ============================================================
+
+
+@login_required
+def procesar_anulacion_factura(request):
+    """Procesar anulación de una factura (disminuir stock de bebidas)"""
+    if request.method == 'POST':
+        numero_factura = request.POST.get('numero_factura')
+        motivo = request.POST.get('motivo', '')
+
+        if not numero_factura:
+            messages.error(request, 'Número de factura requerido')
+            return redirect('anulacionydevolucion')
+
+        try:
+            factura = get_object_or_404(Factura, numero_factura=numero_factura)
+
+            if factura.estado not in ['pagada', 'pendiente']:
+                messages.error(
+                    request,
+                    f'Solo se pueden anular facturas pagadas o pendientes. Estado actual: {factura.get_estado_display()}'
+                )
+                return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={factura.numero_factura}')
+
+            with transaction.atomic():
+                verificar_version_factura(factura, version_solicitud(request))
+
+                # Usar el método del modelo para obtener items
+                items = factura.get_items_detalle()
+                bebidas_disminuidas = 0
+
+                logger_devoluciones.error('❌ PROCESANDO ANULACIÓN DE FACTURA')
+
+                # DISMINUIR stock para productos bebida
+                for item in items:
+                    nombre = item.get('nombre', '')
+                    codigo = item.get('codigo', '')
+                    cantidad = item.get('cantidad', 0)
+                    categoria = item.get('categoria', '')
+
+                    logger_devoluciones.debug('📦 Procesando item: %s', nombre)
+                    logger_devoluciones.debug("Código: '%s'", codigo)
+                    logger_devoluciones.debug("Categoría: '%s'", categoria)
+
+                    if categoria.lower() == 'bebida':
+                        # Usar código si está disponible, sino usar nombre
+                        identificador = codigo if codigo and codigo.strip() else nombre
+                        logger_devoluciones.debug("🍺 ES BEBIDA - Disminuyendo stock con: '%s'", identificador)
+
+                        if disminuir_stock_producto(identificador, cantidad):
+                            bebidas_disminuidas += 1
+                            logger_devoluciones.debug('✅ Stock disminuido exitosamente')
+
+                # Anular una factura cobrada devuelve el dinero en el turno actual
+                if factura.estado == 'pagada':
+                    registrar_devolucion(factura, factura.total, request.user, request.POST.get('caja'))
+                # A crédito: se acredita a la cuenta del cliente lo que aún se le carga por la factura
+                revertir_cargo_factura(factura, factura.total, request.user,
+                                       f'Anulación de factura {factura.numero_factura}')
+
+                factura.estado = 'anulada'
+                factura.motivo_anulacion = motivo
+                factura.fecha_devolucion = timezone.now()
+                factura.guardar_con_version('estado', 'motivo_anulacion', 'fecha_devolucion')
+
+                logger_devoluciones.debug('✅ ANULACIÓN COMPLETADA')
+                logger_devoluciones.debug('Bebidas ajustadas: %s', bebidas_disminuidas)
+
+                messages.success(
+                    request,
+                    f'✅ Factura {factura.numero_factura} anulada. Bebidas ajustadas: {bebidas_disminuidas}'
+                )
+
+                return redirect(f'{reverse("anulacionydevolucion")}?numero_factura={factura.numero_factura}')
+
+        except ConflictoVersion as e:
+            return redirigir_conflicto(request, e)
+        except Exception as e:
+            messages.error(request, f'❌ Error al anular factura: {str(e)}')
+            logger_devoluciones.error('Error al anular factura', exc_info=True)
+            return redirect('anulacionydevolucion')
+
+    return redirect('anulacionydevolucion')
@@ -0,0 +1,46 @@
+"""Importación masiva de productos y platos desde CSV (ver importacion.py)."""
+import io
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+from ..accesos import accesos_usuario
+from ..importacion import ErrorImportacion, importar
+
+# Módulo que hay que poder abrir para importar cada tipo
+MODULO_POR_TIPO = {
+    'producto': 'entradadeproductos',
+    'plato': 'entradadeplatillos',
+}
+
+
+@login_required
+@require_POST
+def importar_catalogo(request, tipo):
+    """Importar el CSV de ``archivo``; con ``simular=1`` solo valida y cuenta"""
+    if tipo not in MODULO_POR_TIPO:
+        return JsonResponse({'success': False, 'error': f'Tipo de importación desconocido: {tipo}'},
+                            status=404)
+    if not accesos_usuario(request.user).puede(MODULO_POR_TIPO[tipo]):
+        return JsonResponse({'success': False, 'error': 'No tienes permiso para importar en este módulo'},
+                            status=403)
+    archivo = request.FILES.get('archivo')
+    if not archivo:
+        return JsonResponse({'success': False, 'error': 'Seleccione un archivo CSV'}, status=400)
+
+    simular = request.POST.get('simular') in ('1', 'true', 'on')
+    try:
+        resultado = importar(tipo, io.TextIOWrapper(archivo.file, encoding='utf-8-sig', newline=''),
+                             simular=simular)
+    except ErrorImportacion as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    accion = 'validarían' if simular else 'importaron'
+    return JsonResponse({
+        'success': True,
+        'message': (f"Se {accion} {resultado['creados']} nuevo(s) y {resultado['actualizados']} "
+                    f"actualizado(s), {resultado['sin_cambios']} sin cambios; "
+                    f"{resultado['con_errores']} fila(s) con errores"),
+        **resultado,
+    })
@@ -0,0 +1,559 @@
+"""Inventario de productos: entradas, ajustes de stock y salidas."""
+import json
+from decimal import Decimal
+
+from django.core.paginator import Paginator
+from django.db.models import Sum
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.csrf import csrf_exempt
+
+from ..busqueda import filtrar
+from ..cache_modelos import vista_cacheada
+from ..models import Producto
+from ..registro import obtener_logger
+
+logger_inventario = obtener_logger('inventario')
+logger_pedidos = obtener_logger('pedidos')
+
+
+@csrf_exempt
+def guardar_producto(request):
+    """Vista para guardar productos desde el formulario HTML"""
+    logger_inventario.debug('=== RECIBIENDO SOLICITUD ===')
+
+    if request.method != 'POST':
+        return JsonResponse({
+            'success': False,
+            'message': 'Método no permitido'
+        }, status=405)
+
+    try:
+        # Imprimir datos de la solicitud
+        logger_inventario.debug('Headers: %s', dict(request.headers))
+        logger_inventario.debug('Body raw: %s', request.body)
+
+        # Obtener datos del formulario
+        data = json.loads(request.body) if request.body else {}
+        logger_inventario.debug('Datos recibidos: %s', data)
+
+        # Validar datos requeridos
+        required_fields = ['productName', 'category', 'quantity', 'price']
+        for field in required_fields:
+            if field not in data:
+                return JsonResponse({
+                    'success': False,
+                    'message': f'Falta el campo: {field}'
+                }, status=400)
+
+        # Crear producto
+        producto = Producto(
+            nombre=data['productName'],
+            categoria=data['category'],
+            cantidad=float(data['quantity']),
+            precio_compra=float(data['price'])
+        )
+
+        # Guardar
+        producto.save()
+        logger_inventario.debug('Producto guardado en BD: %s %s', producto.id, producto.codigo)
+
+        return JsonResponse({
+            'success': True,
+            'message': 'Producto agregado exitosamente',
+            'producto': {
+                'id': producto.id,
+                'codigo': producto.codigo,
+                'nombre': producto.nombre,
+                'categoria': producto.categoria,
+                'cantidad': str(producto.cantidad),
+                'precio_compra': str(producto.precio_compra),
+                'subtotal': str(producto.subtotal),
+                'fecha': producto.fecha_creacion.strftime('%Y-%m-%d %H:%M:%S')
+            }
+        })
+
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'message': 'Error al decodificar JSON'
+        }, status=400)
+
+    except Exception as e:
+        logger_inventario.error('Error guardando producto: %s', e, exc_info=True)
+        return JsonResponse({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }, status=500)
+
+
+@csrf_exempt
+def entradadeproductos(request):
+    """Vista principal para la entrada de productos"""
+    return render(request, 'facturacion/entradadeproductos.html')
+
+
+@csrf_exempt
+def inventario(request):
+    """Vista principal del inventario con filtros - versión simple"""
+    # Obtener parámetros de filtrado
+    search = request.GET.get('search', '')
+    categoria = request.GET.get('categoria', '')
+    stock = request.GET.get('stock', '')
+    sort_by = request.GET.get('sort', 'nombre')
+    page = request.GET.get('page', 1)
+
+    try:
+        page = int(page)
+    except ValueError:
+        page = 1
+
+    # Mapeo de categorías
+    CATEGORIAS_LABELS = {
+        'bebida': 'Bebida',
+        'postre': 'Postre',
+        'carne': 'Carne',
+        'verdura': 'Verdura',
+        'lacteo': 'Lácteo',
+        'otro': 'Otro',
+    }
+
+    # Mapeo de estados de stock
+    STOCK_LABELS = {
+        'high': 'Alto',
+        'medium': 'Medio',
+        'low': 'Bajo'
+    }
+
+    STOCK_ICONS = {
+        'high': '📈',
+        'medium': '📊',
+        'low': '📉'
+    }
+
+    # Filtrar productos
+    productos = Producto.objects.all()
+
+    # Aplicar filtros
+    if search:
+        productos = filtrar(productos, 'producto', search)
+
+    if categoria:
+        productos = productos.filter(categoria=categoria)
+
+    if stock:
+        if stock == 'low':
+            productos = productos.filter(cantidad__lt=10)
+        elif stock == 'medium':
+            productos = productos.filter(cantidad__gte=10, cantidad__lt=50)
+        elif stock == 'high':
+            productos = productos.filter(cantidad__gte=50)
+
+    # Ordenar
+    if sort_by == 'nombre':
+        productos = productos.order_by('nombre')
+    elif sort_by == 'cantidad':
+        productos = productos.order_by('-cantidad')
+    elif sort_by == 'precio':
+        productos = productos.order_by('-precio_compra')
+    elif sort_by == 'categoria':
+        productos = productos.order_by('categoria')
+    elif sort_by == 'subtotal':
+        productos = productos.order_by('-subtotal')
+    else:
+        productos = productos.order_by('-fecha_creacion')
+
+    # Paginación
+    paginator = Paginator(productos, 8)  # 8 productos por página
+
+    try:
+        page_obj = paginator.get_page(page)
+    except:
+        page_obj = paginator.get_page(1)
+
+    # Calcular estadísticas
+    total_productos = Producto.objects.count()
+
+    total_valor = 0
+    for producto in Producto.objects.all():
+        total_valor += float(producto.subtotal)
+
+    bajo_stock = Producto.objects.filter(cantidad__lt=10).count()
+
+    # Obtener categorías únicas
+    categorias = Producto.objects.values_list(
+        'categoria', flat=True).distinct()
+    categorias_count = categorias.count()
+
+    # Preparar datos de productos para la plantilla
+    productos_data = []
+    for producto in page_obj:
+        # Determinar estado de stock
+        cantidad = float(producto.cantidad)
+        if cantidad >= 50:
+            stock_status = 'high'
+        elif cantidad >= 10:
+            stock_status = 'medium'
+        else:
+            stock_status = 'low'
+
+        productos_data.append({
+            'id': producto.id,
+            'codigo': producto.codigo,
+            'nombre': producto.nombre,
+            'categoria': producto.categoria,
+            'categoria_label': CATEGORIAS_LABELS.get(producto.categoria, producto.categoria),
+            'cantidad': float(producto.cantidad),
+            'precio': float(producto.precio_compra),
+            'subtotal': float(producto.subtotal),
+            'stock_status': stock_status,
+            'stock_label': STOCK_LABELS.get(stock_status, 'Desconocido'),
+            'stock_icon': STOCK_ICONS.get(stock_status, '📦'),
+            'fecha_creacion': producto.fecha_creacion.strftime('%Y-%m-%d')
+        })
+
+    context = {
+        'productos': productos_data,
+        'page_obj': page_obj,
+        'total_productos': total_productos,
+        'total_valor': total_valor,
+        'bajo_stock': bajo_stock,
+        'categorias_count': categorias_count,
+        'search': search,
+        'categoria_filtro': categoria,
+        'stock_filtro': stock,
+        'sort_filtro': sort_by,
+        'current_page': page,
+    }
+
+    return render(request, 'facturacion/inventario.html', context)
+
+
+@csrf_exempt
+def eliminar_producto(request, producto_id):
+    """Eliminar un producto"""
+    if request.method == 'POST':
+        producto = get_object_or_404(Producto, id=producto_id)
+        producto.delete()
+        return redirect('inventario')
+
+    return redirect('inventario')
+
+
+@csrf_exempt
+def actualizar_cantidad(request, producto_id):
+    """Actualizar la cantidad y precio de un producto"""
+    if request.method == 'POST':
+        producto = get_object_or_404(Producto, id=producto_id)
+        nueva_cantidad = request.POST.get('cantidad', 0)
+        nuevo_precio = request.POST.get('precio_compra', None)
+
+        try:
+            producto.cantidad = Decimal(nueva_cantidad)
+
+            # Actualizar precio si se proporcionó
+            if nuevo_precio:
+                producto.precio_compra = Decimal(nuevo_precio)
+                # Recalcular subtotal
+                producto.subtotal = producto.cantidad * producto.precio_compra
+
+            producto.save()
+            return redirect('inventario')
+        except Exception as e:
+            logger_inventario.error('Error al actualizar producto: %s', e)
+            pass
+
+    return redirect('inventario')
+
+
+@csrf_exempt
+def verificar_stock_multiples(request):
+    """Verificar stock de múltiples productos (bebidas) a la vez"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Método no permitido'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        items = data.get('items', [])
+
+        productos_sin_stock = []
+
+        for item in items:
+            item_id = item.get('id', '')
+            item_name = item.get('name', '')
+            cantidad = item.get('quantity', 1)
+
+            # Verificar si es un producto de categoría bebida
+            if isinstance(item_id, str) and item_id.startswith('PROD-'):
+                try:
+                    prod_id = int(item_id.split('-')[1])
+                    producto = Producto.objects.filter(
+                        id=prod_id, categoria='bebida').first()
+
+                    if producto:
+                        cantidad_decimal = Decimal(str(cantidad))
+
+                        # Verificar si hay suficiente stock
+                        if producto.cantidad < cantidad_decimal:
+                            productos_sin_stock.append({
+                                'id': producto.id,
+                                'nombre': producto.nombre,
+                                'stock_actual': float(producto.cantidad),
+                                'cantidad_solicitada': float(cantidad_decimal),
+                                'mensaje': f'Stock insuficiente de {producto.nombre}. Stock actual: {producto.cantidad}, cantidad solicitada: {cantidad_decimal}'
+                            })
+
+                except (IndexError, ValueError) as e:
+                    logger_pedidos.error('Error al parsear ID %s: %s', item_id, e)
+
+            elif item_name:
+                producto = Producto.objects.filter(
+                    nombre__icontains=item_name,
+                    categoria='bebida'
+                ).first()
+
+                if producto:
+                    cantidad_decimal = Decimal(str(cantidad))
+
+                    # Verificar si hay suficiente stock
+                    if producto.cantidad < cantidad_decimal:
+                        productos_sin_stock.append({
+                            'id': producto.id,
+                            'nombre': producto.nombre,
+                            'stock_actual': float(producto.cantidad),
+                            'cantidad_solicitada': float(cantidad_decimal),
+                            'mensaje': f'Stock insuficiente de {producto.nombre}. Stock actual: {producto.cantidad}, cantidad solicitada: {cantidad_decimal}'
+                        })
+
+        if productos_sin_stock:
+            return JsonResponse({
+                'exito': False,
+                'productos_sin_stock': productos_sin_stock,
+                'mensaje': f'Stock insuficiente para {len(productos_sin_stock)} producto(s)'
+            })
+
+        return JsonResponse({
+            'exito': True,
+            'mensaje': 'Stock disponible para todos los productos'
+        })
+
+    except Exception as e:
+        logger_pedidos.error('Error en verificar_stock_multiples: %s', e)
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+def verificar_stock(request, producto_id):
+    """Verificar stock de un producto específico"""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Método no permitido'}, status=405)
+
+    try:
+        cantidad_solicitada = request.GET.get('cantidad', 1)
+
+        # Buscar el producto por ID y que sea de categoría bebida
+        producto = Producto.objects.filter(
+            id=producto_id, categoria='bebida').first()
+
+        if not producto:
+            return JsonResponse({
+                'exito': False,
+                'mensaje': 'Producto no encontrado o no es una bebida'
+            }, status=404)
+
+        cantidad_decimal = Decimal(str(cantidad_solicitada))
+
+        if producto.cantidad >= cantidad_decimal:
+            return JsonResponse({
+                'exito': True,
+                'producto': producto.nombre,
+                'stock_actual': float(producto.cantidad),
+                'cantidad_solicitada': float(cantidad_decimal),
+                'disponible': True
+            })
+        else:
+            return JsonResponse({
+                'exito': False,
+                'producto': producto.nombre,
+                'stock_actual': float(producto.cantidad),
+                'cantidad_solicitada': float(cantidad_decimal),
+                'disponible': False,
+                'mensaje': f'Stock insuficiente de {producto.nombre}. Stock actual: {producto.cantidad}, cantidad solicitada: {cantidad_decimal}'
+            })
+
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+def salida(request):
+    # Obtener productos excluyendo bebidas
+    productos = Producto.objects.exclude(categoria='bebida')
+
+    # Preparar datos para la plantilla
+    productos_list = []
+    for producto in productos:
+        productos_list.append({
+            'id': producto.id,
+            'nombre': producto.nombre,
+            'codigo': producto.codigo,
+            'categoria': producto.categoria,
+            'cantidad': float(producto.cantidad),
+            'precio_compra': float(producto.precio_compra),
+            'subtotal': float(producto.subtotal),
+            'descripcion': f"Código: {producto.codigo} | Precio: ${float(producto.precio_compra):.2f}",
+            'fecha_creacion': producto.fecha_creacion.strftime('%Y-%m-%d'),
+        })
+
+    # Calcular estadísticas
+    total_productos = productos.count()
+    total_cantidad = productos.aggregate(total=Sum('cantidad'))['total'] or 0
+
+    productos_bajos = productos.filter(
+        cantidad__lt=10
+    ).count()
+
+    # Obtener salidas de hoy (necesitarías un modelo para registrar salidas)
+    context = {
+        'productos_list': productos_list,  # Pasar productos al contexto
+        'productos_json': json.dumps(productos_list),  # Para JavaScript
+        'total_productos': total_productos,
+        'total_cantidad': total_cantidad,
+        'productos_bajos': productos_bajos,
+    }
+    return render(request, 'facturacion/salida.html', context)
+
+
+@csrf_exempt
+@vista_cacheada(Producto)
+def obtener_productos_salida(request):
+    """Obtener todos los productos excluyendo bebidas para la página de salida"""
+    if request.method == 'GET':
+        try:
+            # Obtener productos excluyendo bebidas
+            productos = Producto.objects.exclude(categoria='bebida')
+
+            # Formatear los datos para JSON
+            productos_data = []
+            for producto in productos:
+                productos_data.append({
+                    'id': producto.id,
+                    'nombre': producto.nombre,
+                    'codigo': producto.codigo,
+                    'categoria': producto.categoria,
+                    'cantidad': float(producto.cantidad),
+                    'precio_compra': float(producto.precio_compra),
+                    'subtotal': float(producto.subtotal),
+                    'fecha_creacion': producto.fecha_creacion.strftime('%Y-%m-%d'),
+                    'ultima_salida': None  # Necesitarías un campo para esto
+                })
+
+            return JsonResponse({
+                'success': True,
+                'productos': productos_data
+            })
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            })
+
+    return JsonResponse({'success': False, 'error': 'Método no permitido'})
+
+
+@csrf_exempt
+def registrar_salida(request):
+    """Registrar una salida de producto"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            producto_id = data.get('producto_id')
+            cantidad = Decimal(str(data.get('cantidad'))
+                               )  # Convertir a Decimal
+            motivo = data.get('motivo')
+            responsable = data.get('responsable')
+            observaciones = data.get('observaciones')
+
+            # Obtener el producto
+            producto = get_object_or_404(Producto, id=producto_id)
+
+            # Verificar que no sea bebida
+            if producto.categoria == 'bebida':
+                return JsonResponse({
+                    'success': False,
+                    'error': 'No se puede registrar salida de bebidas'
+                })
+
+            # Verificar que haya suficiente cantidad
+            if producto.cantidad < cantidad:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'No hay suficiente stock. Solo hay {producto.cantidad} unidades disponibles'
+                })
+
+            # Actualizar la cantidad del producto
+            producto.cantidad -= cantidad
+            producto.save()
+
+            # Aquí podrías crear un registro en un modelo de Salida si lo tienes
+            # Ejemplo: SalidaProducto.objects.create(...)
+
+            return JsonResponse({
+                'success': True,
+                'nueva_cantidad': float(producto.cantidad),
+                'message': f'Salida registrada: {cantidad} {get_unidad_medida(producto.categoria)} de {producto.nombre}'
+            })
+
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            })
+
+    return JsonResponse({'success': False, 'error': 'Método no permitido'})
+
+
+@csrf_exempt
+def reabastecer_producto(request):
+    """Reabastecer un producto"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            producto_id = data.get('producto_id')
+            cantidad = Decimal(str(data.get('cantidad'))
+                               )  # Convertir a Decimal
+            motivo = data.get('motivo')
+            observaciones = data.get('observaciones')
+
+            producto = get_object_or_404(Producto, id=producto_id)
+
+            # Actualizar la cantidad
+            producto.cantidad += cantidad
+            producto.save()
+
+            return JsonResponse({
+                'success': True,
+                'nueva_cantidad': float(producto.cantidad),
+                'message': f'Reabastecimiento registrado: {cantidad} {get_unidad_medida(producto.categoria)} de {producto.nombre}'
+            })
+
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            })
+
+    return JsonResponse({'success': False, 'error': 'Método no permitido'})
+
+
+def get_unidad_medida(categoria):
+    """Función auxiliar para obtener la unidad de medida"""
+    unidades = {
+        'carne': 'kg',
+        'verdura': 'kg',
+        'lacteo': 'lt',
+        'postre': 'unid',
+        'bebida': 'lt',
+        'otro': 'unid'
+    }
+    return unidades.get(categoria, 'unid')
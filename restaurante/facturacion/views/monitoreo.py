@@ -0,0 +1,11 @@
+"""Métricas de Prometheus (/metrics)."""
+from django.http import HttpResponse
+
+from .. import metricas
+
+
+def metricas_prometheus(request):
+    """Métricas de todos los workers en formato Prometheus (token Bearer o staff)"""
+    if not metricas.autorizado(request):
+        return HttpResponse('No autorizado', status=403, content_type='text/plain')
+    return HttpResponse(metricas.exportar(), content_type='text/plain; version=0.0.4; charset=utf-8')
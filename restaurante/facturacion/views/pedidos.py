@@ -0,0 +1,1752 @@
+"""Toma de pedidos, gestión en cocina e historial de pedidos pagados."""
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.db.models import Exists, OuterRef, Prefetch, Sum
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.timezone import now
+from django.views.decorators.csrf import csrf_exempt
+
+from .. import metricas
+from ..busqueda import filtrar
+from ..impresion import encolar_ticket_pedido
+from ..models import (DeliveryConfig, DetalleItemPedido, Factura, HistorialEstadoPedido, Mesa, Pedido,
+                      Plato, Producto)
+from ..registro import obtener_logger
+from ..visitas import identificar
+
+logger_pedidos = obtener_logger('pedidos')
+
+
+@csrf_exempt
+def pedidos(request):
+    """Vista principal para realizar pedidos - BEBIDAS de Producto y PLATOS de Plato"""
+
+    try:
+        # Obtener mesas disponibles
+        mesas = Mesa.objects.all().order_by('numero')
+
+        # Actualizar estado de mesas según pedidos activos
+        pedidos_activos = Pedido.objects.filter(
+            tipo_pedido='mesa',
+            estado__in=['pendiente', 'confirmado',
+                        'preparacion', 'listo', 'entregado']
+        ).select_related('mesa')
+
+        mesas_ocupadas_activas = set()
+        for pedido in pedidos_activos:
+            if pedido.mesa:
+                mesas_ocupadas_activas.add(pedido.mesa.id)
+
+        for mesa in mesas:
+            if mesa.id in mesas_ocupadas_activas:
+                if mesa.estado != 'ocupada':
+                    mesa.estado = 'ocupada'
+                    mesa.save()
+            else:
+                if mesa.estado != 'disponible':  # ¡CORREGIDO: Quité el paréntesis extra!
+                    mesa.estado = 'disponible'
+                    mesa.save()
+
+        # Crear códigos si no existen
+        if not DeliveryConfig.objects.filter(tipo='delivery').exists():
+            for i in range(1, 11):
+                DeliveryConfig.objects.create(
+                    codigo=f'D{i:03d}',
+                    tipo='delivery',
+                    estado='disponible'
+                )
+
+        if not DeliveryConfig.objects.filter(tipo='llevar').exists():
+            for i in range(1, 11):
+                DeliveryConfig.objects.create(
+                    codigo=f'L{i:03d}',
+                    tipo='llevar',
+                    estado='disponible'
+                )
+
+        # Obtener códigos disponibles
+        delivery_codes = DeliveryConfig.objects.filter(
+            tipo='delivery',
+            estado='disponible'
+        ).order_by('codigo')
+
+        llevar_codes = DeliveryConfig.objects.filter(
+            tipo='llevar',
+            estado='disponible'
+        ).order_by('codigo')
+
+        # 🔥 **BEBIDAS DE PRODUCTO**
+        bebidas = Producto.objects.filter(
+            categoria='bebida',
+            cantidad__gt=0  # Solo bebidas con stock
+        ).order_by('nombre')
+
+        # Convertir bebidas a formato JSON para el frontend
+        bebidas_json = []
+        for bebida in bebidas:
+            bebidas_json.append({
+                'id': f"bebida_{bebida.id}",  # 🔥 AGREGAR PREFIJO
+                'codigo': bebida.codigo,
+                'nombre': bebida.nombre,
+                'categoria': 'bebida',  # Siempre será 'bebida'
+                'precio': float(bebida.precio_compra),
+                'tiempoPreparacion': 5,  # Menos tiempo que los platos
+                'descripcion': f"Bebida: {bebida.nombre}",
+                'popularidad': 'alta' if float(bebida.cantidad) > 20 else 'media',
+                'disponibilidad': 'disponible' if float(bebida.cantidad) > 0 else 'agotado',
+                'stock': float(bebida.cantidad),
+                'tipo': 'bebida',  # Flag para identificar que es una bebida
+                'es_bebida': True,
+                'categoria_display': bebida.get_category_label(),
+                'precio_formateado': f"${float(bebida.precio_compra):.2f}"
+            })
+
+        # 🔥 **PLATOS DE LA TABLA PLATO**
+        platos = Plato.objects.filter(activo=True).order_by('nombre')
+
+        # Convertir platos a formato JSON para el frontend
+        platos_json = []
+        for plato in platos:
+            # Para los platos, el tiempo de preparación puede ser un campo fijo o podemos calcularlo
+            # En este caso, como no tenemos un campo, usamos un valor por defecto
+            tiempo_preparacion = 15  # minutos por defecto para platos
+            if plato.categoria == 'entrada':
+                tiempo_preparacion = 10
+            elif plato.categoria == 'postre':
+                tiempo_preparacion = 5
+            elif plato.categoria == 'bebida':
+                tiempo_preparacion = 5
+            elif plato.categoria == 'rapida':
+                tiempo_preparacion = 10
+            elif plato.categoria == 'especial':
+                tiempo_preparacion = 20
+
+            platos_json.append({
+                'id': f"plato_{plato.id}",  # 🔥 AGREGAR PREFIJO
+                'codigo': plato.codigo,
+                'nombre': plato.nombre,
+                'categoria': plato.categoria,
+                'precio': float(plato.precio),
+                'tiempoPreparacion': tiempo_preparacion,
+                'descripcion': f"Plato: {plato.nombre}",
+                'popularidad': 'alta',  # Podemos ajustar esto si hay un campo en el modelo
+                # Asumimos que todos los platos activos están disponibles
+                'disponibilidad': 'disponible',
+                'stock': 0,  # Los platos no tienen stock, se preparan al momento
+                'tipo': 'plato',  # Flag para identificar que es un plato
+                'es_bebida': False,
+                'categoria_display': plato.get_categoria_display(),
+                'precio_formateado': f"${float(plato.precio):.2f}"
+            })
+
+        # DEBUG: Mostrar información de bebidas y platos
+        logger_pedidos.debug('BEBIDAS ENCONTRADAS: %s', bebidas.count())
+        for bebida in bebidas:
+            logger_pedidos.debug(
+                '- %s: $%s (Stock: %s)',
+                bebida.nombre, bebida.precio_compra, bebida.cantidad)
+        logger_pedidos.debug('PLATOS ENCONTRADOS: %s', platos.count())
+        for plato in platos:
+            logger_pedidos.debug('- %s: $%s (%s)', plato.nombre, plato.precio, plato.get_categoria_display())
+
+        context = {
+            'mesas': mesas,
+            'delivery_codes': delivery_codes,
+            'llevar_codes': llevar_codes,
+            'bebidas_json': json.dumps(bebidas_json),  # Solo bebidas
+            'platos_json': json.dumps(platos_json),    # Solo platos
+            'total_bebidas': bebidas.count(),
+            'total_platos': platos.count(),
+            'title': 'Realizar Pedido',
+        }
+
+        return render(request, 'facturacion/pedidos.html', context)
+
+    except Exception as e:
+        logger_pedidos.error('ERROR en vista pedidos: %s', str(e), exc_info=True)
+
+        context = {
+            'mesas': [],
+            'delivery_codes': [],
+            'llevar_codes': [],
+            'bebidas_json': '[]',
+            'platos_json': '[]',
+            'total_bebidas': 0,
+            'total_platos': 0,
+            'title': 'Realizar Pedido',
+        }
+        return render(request, 'facturacion/pedidos.html', context)
+
+
+@csrf_exempt
+def crear_pedido(request):
+    """Vista para crear un nuevo pedido - funciona sin login"""
+    if request.method == 'POST':
+        try:
+            # Obtener datos del formulario con valores por defecto
+            tipo_pedido = request.POST.get('tipo_pedido')
+            cart_items_json = request.POST.get('cart_items')
+
+            logger_pedidos.debug('CART ITEMS JSON RECIBIDO:')
+            logger_pedidos.debug('%s', cart_items_json)
+
+            # 🔥 Convertir valores numéricos a Decimal (no float)
+            try:
+                subtotal = Decimal(str(request.POST.get('subtotal', 0) or 0))
+                envio = Decimal(str(request.POST.get('envio', 0) or 0))
+                total = Decimal(str(request.POST.get('total', 0) or 0))
+            except (ValueError, TypeError):
+                subtotal = envio = total = Decimal('0.00')
+
+            # Validar datos requeridos
+            if not cart_items_json:
+                messages.error(request, 'El carrito está vacío')
+                return redirect('pedidos')
+
+            # Parsear items del carrito
+            try:
+                cart_items = json.loads(cart_items_json)
+            except json.JSONDecodeError as e:
+                logger_pedidos.error('ERROR parseando JSON: %s', e)
+                messages.error(
+                    request, 'Error al procesar los items del carrito')
+                return redirect('pedidos')
+
+            if not cart_items:
+                messages.error(request, 'El carrito está vacío')
+                return redirect('pedidos')
+
+            logger_pedidos.debug('ITEMS EN EL CARRITO (PARSED):')
+            for idx, item in enumerate(cart_items):
+                logger_pedidos.debug(
+                    '[%s] %s (ID: %s, Tipo: %s, es_bebida: %s, Quantity: %s)',
+                    idx, item.get('name'), item.get('id'), item.get('tipo'), item.get('es_bebida'), item.get('quantity'))
+
+            # 🔥 VALIDAR Y DESCONTAR STOCK DE BEBIDAS ANTES DE CREAR EL PEDIDO
+            logger_pedidos.debug('DESCONTANDO STOCK DE BEBIDAS:')
+
+            bebidas_sin_stock = []
+            bebidas_descontadas = []
+
+            for item in cart_items:
+                # Verificar si es una bebida
+                es_bebida = item.get('tipo') == 'bebida' or item.get(
+                    'es_bebida', False)
+
+                if not es_bebida:
+                    continue  # Saltar si no es bebida
+
+                # Extraer información del item
+                item_id = item.get('id', '')
+                nombre_bebida = item.get('name', 'Bebida sin nombre')
+                cantidad_solicitada = int(item.get('quantity', 1))
+
+                logger_pedidos.debug('[Procesando] %s', nombre_bebida)
+                logger_pedidos.debug('- ID original: %s', item_id)
+                logger_pedidos.debug('- Cantidad solicitada: %s', cantidad_solicitada)
+
+                # 🔥 FUNCIÓN PARA EXTRAER ID REAL
+                def extraer_id_bebida(item_id_str):
+                    """Extrae el ID numérico del string con prefijo 'bebida_'"""
+                    if isinstance(item_id_str, (int, float)):
+                        return int(item_id_str)
+
+                    item_id_str = str(item_id_str)
+
+                    # Caso 1: Tiene prefijo "bebida_"
+                    if item_id_str.startswith('bebida_'):
+                        try:
+                            return int(item_id_str.replace('bebida_', ''))
+                        except ValueError:
+                            return None
+
+                    # Caso 2: Tiene prefijo "PROD-" (viene de Producto)
+                    if item_id_str.startswith('PROD-'):
+                        try:
+                            # Extraer solo el número después de "PROD-"
+                            partes = item_id_str.split('-')
+                            if len(partes) >= 2:
+                                return int(partes[1])
+                        except (ValueError, IndexError):
+                            return None
+
+                    # Caso 3: Es solo un número
+                    try:
+                        return int(item_id_str)
+                    except ValueError:
+                        # Intentar extraer números del string
+                        import re
+                        numeros = re.findall(r'\d+', item_id_str)
+                        if numeros:
+                            return int(numeros[0])
+                        return None
+
+                # Extraer ID de la bebida
+                bebida_id = extraer_id_bebida(item_id)
+
+                if not bebida_id:
+                    error_msg = f'❌ ID inválido para {nombre_bebida}: {item_id}'
+                    bebidas_sin_stock.append(error_msg)
+                    logger_pedidos.warning('%s', error_msg)
+                    continue
+
+                logger_pedidos.debug('- ID extraído: %s', bebida_id)
+
+                # Buscar la bebida en Producto
+                try:
+                    bebida = Producto.objects.get(
+                        id=bebida_id, categoria='bebida')
+
+                    # 🔥 DEBUG: Mostrar información de la bebida encontrada
+                    logger_pedidos.debug('- Bebida encontrada: %s', bebida.nombre)
+                    logger_pedidos.debug('- Stock actual: %s', bebida.cantidad)
+                    logger_pedidos.debug('- Precio: $%s', bebida.precio_compra)
+
+                    # Verificar si hay suficiente stock
+                    stock_disponible = bebida.cantidad
+                    if stock_disponible < cantidad_solicitada:
+                        error_msg = f'❌ No hay suficiente stock de {bebida.nombre}. Disponible: {stock_disponible}, Solicitado: {cantidad_solicitada}'
+                        bebidas_sin_stock.append(error_msg)
+                        logger_pedidos.warning('%s', error_msg)
+                        continue
+
+                    # 🔥 DESCONTAR EL STOCK
+                    stock_anterior = bebida.cantidad
+                    bebida.cantidad = stock_disponible - \
+                        Decimal(str(cantidad_solicitada))
+
+                    # Recalcular subtotal del producto
+                    bebida.subtotal = bebida.cantidad * bebida.precio_compra
+
+                    # Guardar cambios
+                    bebida.save()
+
+                    # Registrar bebida descontada
+                    bebidas_descontadas.append({
+                        'id': bebida.id,
+                        'nombre': bebida.nombre,
+                        'cantidad': cantidad_solicitada,
+                        'stock_anterior': float(stock_anterior),
+                        'stock_nuevo': float(bebida.cantidad)
+                    })
+
+                    logger_pedidos.debug('✅ Stock descontado: %s unidad(es)', cantidad_solicitada)
+                    logger_pedidos.debug('✅ Stock anterior: %s', stock_anterior)
+                    logger_pedidos.debug('✅ Stock nuevo: %s', bebida.cantidad)
+
+                except Producto.DoesNotExist:
+                    # Buscar por código alternativo
+                    try:
+                        # Intentar buscar por nombre o código
+                        codigo_bebida = item.get('codigo', '')
+                        if codigo_bebida:
+                            bebida = Producto.objects.get(
+                                codigo=codigo_bebida, categoria='bebida')
+
+                            logger_pedidos.debug(
+                                '- Bebida encontrada por código: %s (%s)',
+                                bebida.nombre, codigo_bebida)
+                            logger_pedidos.debug('- Stock actual: %s', bebida.cantidad)
+
+                            # Verificar stock
+                            stock_disponible = bebida.cantidad
+                            if stock_disponible < cantidad_solicitada:
+                                error_msg = f'❌ No hay suficiente stock de {bebida.nombre}. Disponible: {stock_disponible}, Solicitado: {cantidad_solicitada}'
+                                bebidas_sin_stock.append(error_msg)
+                                logger_pedidos.warning('%s', error_msg)
+                                continue
+
+                            # Descontar stock
+                            stock_anterior = bebida.cantidad
+                            bebida.cantidad = stock_disponible - \
+                                Decimal(str(cantidad_solicitada))
+                            bebida.subtotal = bebida.cantidad * bebida.precio_compra
+                            bebida.save()
+
+                            bebidas_descontadas.append({
+                                'id': bebida.id,
+                                'nombre': bebida.nombre,
+                                'cantidad': cantidad_solicitada,
+                                'stock_anterior': float(stock_anterior),
+                                'stock_nuevo': float(bebida.cantidad)
+                            })
+
+                            logger_pedidos.debug('✅ Stock descontado: %s unidad(es)', cantidad_solicitada)
+                            logger_pedidos.debug('✅ Stock nuevo: %s', bebida.cantidad)
+
+                        else:
+                            error_msg = f'❌ La bebida "{nombre_bebida}" no existe en la base de datos'
+                            bebidas_sin_stock.append(error_msg)
+                            logger_pedidos.warning('%s', error_msg)
+
+                    except Producto.DoesNotExist:
+                        error_msg = f'❌ La bebida "{nombre_bebida}" no existe en la base de datos (ID: {bebida_id})'
+                        bebidas_sin_stock.append(error_msg)
+                        logger_pedidos.warning('%s', error_msg)
+                    except Exception as e:
+                        error_msg = f'❌ Error al buscar bebida: {str(e)}'
+                        bebidas_sin_stock.append(error_msg)
+                        logger_pedidos.warning('%s', error_msg)
+
+            # 🔥 RESUMEN DEL DESCUENTO
+            logger_pedidos.debug('RESUMEN DEL DESCUENTO DE BEBIDAS:')
+
+            if bebidas_descontadas:
+                logger_pedidos.debug('✅ Bebidas descontadas: %s', len(bebidas_descontadas))
+                for b in bebidas_descontadas:
+                    logger_pedidos.debug(
+                        '- %s: %s unidad(es) | Stock: %s → %s',
+                        b['nombre'], b['cantidad'], b['stock_anterior'], b['stock_nuevo'])
+            else:
+                logger_pedidos.debug('ℹ️ No se descontaron bebidas')
+
+            if bebidas_sin_stock:
+                logger_pedidos.warning('⚠️ Bebidas sin stock: %s', len(bebidas_sin_stock))
+                for error in bebidas_sin_stock:
+                    logger_pedidos.warning('%s', error)
+
+            # Si hay bebidas sin stock, mostrar error y cancelar el pedido
+            if bebidas_sin_stock:
+                metricas.incrementar('rechazos_sin_stock')
+                for error in bebidas_sin_stock:
+                    messages.error(request, error)
+                return redirect('pedidos')
+
+            # 🔥🔥🔥 CAMBIO PRINCIPAL: Crear el pedido con estado 'pendiente'
+            pedido = Pedido(
+                tipo_pedido=tipo_pedido,
+                items=cart_items,
+                subtotal=subtotal,
+                envio=envio,
+                total=total,
+                estado='pendiente',  # 🔥 CAMBIADO A 'pendiente'
+            )
+
+            # Asignar información según tipo de pedido
+            if tipo_pedido == 'mesa':
+                mesa_id = request.POST.get('mesa_id')
+                if not mesa_id:
+                    messages.error(request, 'Se requiere seleccionar una mesa')
+                    return redirect('pedidos')
+
+                try:
+                    mesa = Mesa.objects.get(id=mesa_id)
+                except Mesa.DoesNotExist:
+                    messages.error(request, 'La mesa seleccionada no existe')
+                    return redirect('pedidos')
+
+                pedido.mesa = mesa
+                pedido.nombre_cliente = f"Mesa {mesa.numero_display}"
+
+                # 🔥🔥🔥 IMPORTANTE: OCUPAR LA MESA CUANDO SE CREA EL PEDIDO
+                mesa.estado = 'ocupada'
+                mesa.save()
+                logger_pedidos.debug('✅ Mesa %s ocupada por el pedido', mesa.numero_display)
+
+            elif tipo_pedido == 'delivery':
+                codigo_delivery = request.POST.get('codigo_delivery')
+                if not codigo_delivery:
+                    messages.error(request, 'Se requiere código de delivery')
+                    return redirect('pedidos')
+
+                pedido.codigo_delivery = codigo_delivery
+
+                nombre_cliente = request.POST.get('customer_name', '').strip()
+                telefono_cliente = request.POST.get(
+                    'customer_phone', '').strip()
+                direccion_entrega = request.POST.get(
+                    'customer_address', '').strip()
+
+                if not nombre_cliente:
+                    nombre_cliente = f"Cliente Delivery {codigo_delivery}"
+                if not telefono_cliente:
+                    telefono_cliente = "No especificado"
+                if not direccion_entrega:
+                    direccion_entrega = "Dirección no especificada"
+
+                pedido.nombre_cliente = nombre_cliente
+                pedido.telefono_cliente = telefono_cliente
+                pedido.direccion_entrega = direccion_entrega
+
+                # 🔥 OCUPAR código de delivery
+                try:
+                    delivery_config = DeliveryConfig.objects.get(
+                        tipo='delivery',
+                        codigo=codigo_delivery
+                    )
+                    delivery_config.estado = 'ocupado'
+                    delivery_config.save()
+                    logger_pedidos.debug('✅ Código delivery %s ocupado', codigo_delivery)
+                except DeliveryConfig.DoesNotExist:
+                    logger_pedidos.warning('⚠️ Código delivery %s no encontrado', codigo_delivery)
+
+            elif tipo_pedido == 'llevar':
+                codigo_llevar = request.POST.get('codigo_llevar')
+                if not codigo_llevar:
+                    messages.error(request, 'Se requiere código para llevar')
+                    return redirect('pedidos')
+
+                pedido.codigo_delivery = codigo_llevar
+
+                nombre_cliente = request.POST.get(
+                    'customer_name_takeaway', '').strip()
+                if not nombre_cliente:
+                    nombre_cliente = f"Cliente Para Llevar {codigo_llevar}"
+
+                pedido.nombre_cliente = nombre_cliente
+
+                # 🔥 OCUPAR código para llevar
+                try:
+                    llevar_config = DeliveryConfig.objects.get(
+                        tipo='llevar',
+                        codigo=codigo_llevar
+                    )
+                    llevar_config.estado = 'ocupado'
+                    llevar_config.save()
+                    logger_pedidos.debug('✅ Código para llevar %s ocupado', codigo_llevar)
+                except DeliveryConfig.DoesNotExist:
+                    logger_pedidos.warning('⚠️ Código para llevar %s no encontrado', codigo_llevar)
+            else:
+                messages.error(request, 'Tipo de pedido no válido')
+                return redirect('pedidos')
+
+            # Cliente registrado: por la cédula del formulario o el teléfono del delivery (ver visitas.py)
+            pedido.cliente = identificar(
+                cedula=request.POST.get('customer_cedula', ''),
+                telefono=pedido.telefono_cliente,
+            )
+
+            # Guardar el pedido (esto generará automáticamente el código_pedido)
+            pedido.save()
+            metricas.incrementar('pedidos_creados', tipo=tipo_pedido)
+            logger_pedidos.info(
+                '✅ Pedido %s creado con ID: %s y estado PENDIENTE',
+                pedido.codigo_pedido, pedido.id)
+
+            # 🔥 SOLUCIÓN: Crear DetalleItemPedido con IDs extraídos correctamente
+            try:
+                logger_pedidos.debug('Creando DetalleItemPedido...')
+                for item in cart_items:
+                    # 🔥 FUNCIÓN PARA EXTRAER ID REAL
+                    def extraer_id_real(item_id_str):
+                        """Extrae el ID numérico del string con prefijo"""
+                        if isinstance(item_id_str, (int, float)):
+                            return int(item_id_str)
+
+                        item_id_str = str(item_id_str)
+
+                        # Remover prefijos conocidos
+                        if item_id_str.startswith('bebida_'):
+                            return int(item_id_str.replace('bebida_', ''))
+                        elif item_id_str.startswith('plato_'):
+                            return int(item_id_str.replace('plato_', ''))
+                        else:
+                            # Intentar convertir directamente
+                            try:
+                                return int(item_id_str)
+                            except ValueError:
+                                # Si falla, intentar extraer números
+                                import re
+                                numeros = re.findall(r'\d+', item_id_str)
+                                if numeros:
+                                    return int(numeros[0])
+                                return 0
+
+                    # Extraer datos del item
+                    item_id_original = item.get('id', '')
+                    id_real = extraer_id_real(item_id_original)
+
+                    tipo_item = item.get('tipo', 'plato')
+                    es_bebida = item.get('es_bebida', False)
+
+                    # Si es_bebida es True pero tipo no está definido, corregir
+                    if es_bebida and tipo_item != 'bebida':
+                        tipo_item = 'bebida'
+
+                    nombre_plato = item.get(
+                        'name', item.get('nombre', 'Sin nombre'))
+                    cantidad = int(item.get('quantity', 1))
+                    # 🔥 Convertir a Decimal en lugar de float
+                    precio_unitario = Decimal(
+                        str(item.get('price', item.get('precio', 0))))
+                    subtotal_item = Decimal(str(item.get('total', 0)))
+
+                    # Si no hay subtotal, calcularlo
+                    if subtotal_item == 0:
+                        subtotal_item = precio_unitario * cantidad
+
+                    codigo_item = item.get('codigo', 'N/A')
+
+                    logger_pedidos.debug('- Creando detalle:')
+                    logger_pedidos.debug('ID original: %s', item_id_original)
+                    logger_pedidos.debug('ID extraído: %s', id_real)
+                    logger_pedidos.debug('Nombre: %s', nombre_plato)
+                    logger_pedidos.debug('Tipo: %s', tipo_item)
+                    logger_pedidos.debug('Cantidad: %s', cantidad)
+                    logger_pedidos.debug('Precio unitario: $%s', precio_unitario)
+                    logger_pedidos.debug('Subtotal: $%s', subtotal_item)
+
+                    # Validar que id_real sea válido
+                    if id_real <= 0:
+                        logger_pedidos.warning('⚠️ ADVERTENCIA: ID inválido para %s, usando 0', nombre_plato)
+
+                    # Crear el detalle
+                    DetalleItemPedido.objects.create(
+                        pedido=pedido,
+                        id_plato=id_real,
+                        nombre_plato=nombre_plato,
+                        cantidad=cantidad,
+                        precio_unitario=precio_unitario,
+                        subtotal_item=subtotal_item,
+                        tipo_item=tipo_item,
+                        notas=f"Código: {codigo_item}"
+                    )
+                    logger_pedidos.debug('✅ Detalle creado exitosamente')
+
+                logger_pedidos.debug('✅ Todos los detalles del pedido creados exitosamente')
+            except Exception as e:
+                logger_pedidos.error('⚠️ Error creando detalles del pedido: %s', e, exc_info=True)
+                # No interrumpimos el flujo principal por este error
+
+            # 🔥 ENCOLAR TICKETS ESC/POS PARA COCINA Y BAR (si hay impresoras configuradas)
+            try:
+                trabajos = encolar_ticket_pedido(pedido, cart_items)
+                if trabajos:
+                    logger_pedidos.debug('🖨️ %s ticket(s) enviados a la cola de impresión', len(trabajos))
+            except Exception as e:
+                logger_pedidos.error('⚠️ Error encolando tickets de cocina: %s', e)
+
+            # 🔥 GENERAR TICKET DEL SERVIDOR Y DEVOLVERLO DIRECTAMENTE
+            # Determinar código según tipo
+            codigo_display = ""
+            if pedido.tipo_pedido == 'mesa' and pedido.mesa:
+                codigo_display = f"M{pedido.mesa.numero_display}"
+            elif pedido.codigo_delivery:
+                codigo_display = pedido.codigo_delivery
+
+            # Separar platos y bebidas
+            platos_items = [item for item in cart_items if item.get(
+                'tipo') != 'bebida' and not item.get('es_bebida')]
+            bebidas_items = [item for item in cart_items if item.get(
+                'tipo') == 'bebida' or item.get('es_bebida')]
+
+            # Crear contexto para el ticket
+            context = {
+                'pedido': pedido,
+                'items': cart_items,
+                'platos_items': platos_items,
+                'bebidas_items': bebidas_items,
+                'fecha': now().strftime('%d/%m/%Y %H:%M'),
+                'codigo_display': codigo_display,
+                'codigo_pedido': pedido.codigo_pedido,
+                'total_items': len(cart_items),
+                'platos_count': len(platos_items),
+                'bebidas_count': len(bebidas_items),
+                'tiempo_estimado': sum(item.get('prepTime', 15) for item in cart_items),
+            }
+
+            # Renderizar el template del ticket
+            ticket_html = render_to_string(
+                'facturacion/ticket_chef.html', context)
+
+            # DEBUG: Mostrar información del ticket generado
+            logger_pedidos.debug('TICKET GENERADO:')
+            logger_pedidos.debug('Código Pedido: %s', pedido.codigo_pedido)
+            logger_pedidos.debug('Estado: PENDIENTE (mesa ocupada)')
+            logger_pedidos.debug('Código Display: %s', codigo_display)
+            logger_pedidos.debug('Total Items: %s', len(cart_items))
+            logger_pedidos.debug('Platos: %s', len(platos_items))
+            logger_pedidos.debug('Bebidas: %s', len(bebidas_items))
+
+            # 🔥 DEVOLVER EL TICKET HTML DIRECTAMENTE
+            return HttpResponse(ticket_html)
+
+        except Exception as e:
+            logger_pedidos.error('Error en crear_pedido', exc_info=True)
+            messages.error(request, f'❌ Error al crear el pedido: {str(e)}')
+            return redirect('pedidos')
+
+    return redirect('pedidos')
+
+
+@csrf_exempt
+def generar_ticket_chef_servidor(pedido, cart_items):
+    """Función para generar ticket del chef desde el servidor"""
+    try:
+        from django.template.loader import render_to_string
+        from django.utils.timezone import now
+
+        # Determinar código según tipo
+        codigo_display = ""
+        if pedido.tipo_pedido == 'mesa' and pedido.mesa:
+            codigo_display = f"M{pedido.mesa.numero_display}"
+        elif pedido.codigo_delivery:
+            codigo_display = pedido.codigo_delivery
+
+        # Separar platos y bebidas
+        platos_items = [item for item in cart_items if item.get(
+            'tipo') != 'bebida' and not item.get('es_bebida')]
+        bebidas_items = [item for item in cart_items if item.get(
+            'tipo') == 'bebida' or item.get('es_bebida')]
+
+        context = {
+            'pedido': pedido,
+            'items': cart_items,
+            'platos_items': platos_items,
+            'bebidas_items': bebidas_items,
+            'fecha': now().strftime('%d/%m/%Y %H:%M'),
+            'codigo_display': codigo_display,
+            'codigo_pedido': pedido.codigo_pedido,  # 🔥 AGREGAR ESTO
+            'total_items': len(cart_items),
+            'platos_count': len(platos_items),
+            'bebidas_count': len(bebidas_items),
+            'tiempo_estimado': sum(item.get('prepTime', 15) for item in cart_items),
+        }
+
+        ticket_html = render_to_string('facturacion/ticket_chef.html', context)
+
+        logger_pedidos.debug('TICKET COCINA GENERADO')
+        logger_pedidos.debug('Código Pedido: %s', pedido.codigo_pedido)
+        logger_pedidos.debug('Código Display: %s', codigo_display)
+        logger_pedidos.debug('Fecha: %s', context['fecha'])
+        logger_pedidos.debug('Items totales: %s', len(cart_items))
+        logger_pedidos.debug('- Platos: %s', len(platos_items))
+        logger_pedidos.debug('- Bebidas: %s', len(bebidas_items))
+
+        return ticket_html  # 🔥 RETORNAR EL HTML
+
+    except Exception as e:
+        logger_pedidos.error('Error generando ticket del chef: %s', e)
+        return None
+
+
+@csrf_exempt
+def limpiar_carrito(request):
+    """Vista para limpiar el carrito (opcional)"""
+    # En una aplicación real, esto limpiaría el carrito de la sesión
+    # request.session['cart'] = []
+
+    messages.success(request, 'Carrito limpiado exitosamente')
+    return redirect('pedidos')
+
+
+@csrf_exempt
+def gestiondepedidos(request):
+    """Vista principal de gestión de pedidos - EXCLUYE PEDIDOS PAGADOS"""
+    # Obtener parámetros de filtrado
+    search = request.GET.get('search', '')
+    estado = request.GET.get('estado', '')
+    tipo_pedido = request.GET.get('tipo', '')
+    fecha = request.GET.get('fecha', '')
+    sort_by = request.GET.get('sort', '-fecha_pedido')
+    page = request.GET.get('page', 1)
+
+    # Construir query base - EXCLUIR PEDIDOS CON FACTURAS PAGADAS
+    from django.db.models import Exists, OuterRef
+
+    # Subconsulta para verificar si el pedido tiene facturas pagadas
+    facturas_pagadas = Factura.objects.filter(
+        pedido_id=OuterRef('pk'),
+        estado='pagada'
+    )
+
+    # Consulta principal: todos los pedidos que NO tienen facturas pagadas
+    # Usamos un nombre diferente para la anotación para evitar conflicto con la propiedad
+    pedidos = Pedido.objects.annotate(
+        factura_pagada_annotated=Exists(facturas_pagadas)  # Cambiado el nombre
+    ).filter(
+        factura_pagada_annotated=False  # Solo pedidos SIN facturas pagadas
+    ).select_related('mesa').order_by('-fecha_pedido')
+
+    # Si no se especifica estado, excluir cancelados por defecto
+    if not estado:
+        pedidos = pedidos.exclude(estado='cancelado')
+
+    # Aplicar filtros
+    if search:
+        # Código, cliente, teléfono, delivery o mesa ('5', 'mesa 05'), ver busqueda.py
+        pedidos = filtrar(pedidos, 'pedido', search)
+
+    if estado:
+        pedidos = pedidos.filter(estado=estado)
+
+    if tipo_pedido:
+        pedidos = pedidos.filter(tipo_pedido=tipo_pedido)
+
+    if fecha:
+        today = datetime.now().date()
+        if fecha == 'hoy':
+            pedidos = pedidos.filter(fecha_pedido__date=today)
+        elif fecha == 'ayer':
+            yesterday = today - timedelta(days=1)
+            pedidos = pedidos.filter(fecha_pedido__date=yesterday)
+        elif fecha == 'semana':
+            week_ago = today - timedelta(days=7)
+            pedidos = pedidos.filter(fecha_pedido__date__gte=week_ago)
+        elif fecha == 'mes':
+            month_ago = today - timedelta(days=30)
+            pedidos = pedidos.filter(fecha_pedido__date__gte=month_ago)
+
+    # Aplicar ordenamiento
+    sort_map = {
+        'fecha_desc': '-fecha_pedido',
+        'fecha_asc': 'fecha_pedido',
+        'total_desc': '-total',
+        'total_asc': 'total',
+        'cliente': 'nombre_cliente'
+    }
+    sort_field = sort_map.get(sort_by, '-fecha_pedido')
+    pedidos = pedidos.order_by(sort_field)
+
+    # 🔥 ACTUALIZAR ESTADO DE MESAS SEGÚN PEDIDOS ACTIVOS
+    # Solo para pedidos que no tienen facturas pagadas
+    pedidos_activos = Pedido.objects.annotate(
+        factura_pagada_annotated=Exists(facturas_pagadas)  # Mismo nombre
+    ).filter(
+        factura_pagada_annotated=False,
+        tipo_pedido='mesa',
+        estado__in=['pendiente', 'confirmado',
+                    'preparacion', 'listo', 'entregado']
+    ).select_related('mesa')
+
+    for pedido in pedidos_activos:
+        if pedido.mesa and pedido.mesa.estado != 'ocupada':
+            pedido.mesa.estado = 'ocupada'
+            pedido.mesa.save()
+            logger_pedidos.debug(
+                '✅ Mesa %s actualizada a OCUPADA por pedido activo (sin factura pagada)',
+                pedido.mesa.numero_display)
+
+    # Paginación
+    paginator = Paginator(pedidos, 10)
+    page_obj = paginator.get_page(page)
+
+    # Procesar pedidos para template
+    pedidos_procesados = procesar_pedidos_para_template(page_obj)
+
+    # Calcular estadísticas SOLO de pedidos NO pagados
+    today = datetime.now().date()
+
+    # Total de pedidos activos (sin factura pagada)
+    total_pedidos_activos = Pedido.objects.annotate(
+        factura_pagada_annotated=Exists(facturas_pagadas)  # Mismo nombre
+    ).filter(
+        factura_pagada_annotated=False
+    ).exclude(
+        estado='cancelado'
+    ).count()
+
+    # Pedidos pendientes (sin factura pagada)
+    pedidos_pendientes_count = Pedido.objects.annotate(
+        factura_pagada_annotated=Exists(facturas_pagadas)
+    ).filter(
+        factura_pagada_annotated=False,
+        estado__in=['pendiente', 'confirmado']
+    ).count()
+
+    # Ingresos hoy (solo de pedidos con facturas pagadas - para mostrar diferencia)
+    facturas_hoy_pagadas = Factura.objects.filter(
+        fecha_factura__date=today,
+        estado='pagada'
+    )
+    ingresos_hoy = facturas_hoy_pagadas.aggregate(total=Sum('total'))[
+        'total'] or 0
+
+    # Pedidos a domicilio activos (sin factura pagada)
+    pedidos_domicilio_activos = Pedido.objects.annotate(
+        factura_pagada_annotated=Exists(facturas_pagadas)
+    ).filter(
+        factura_pagada_annotated=False,
+        tipo_pedido='delivery'
+    ).exclude(
+        estado='cancelado'
+    ).count()
+
+    # Obtener estadísticas adicionales para información
+    total_pedidos_completados = Factura.objects.filter(estado='pagada').count()
+    ingresos_totales = Factura.objects.filter(
+        estado='pagada').aggregate(total=Sum('total'))['total'] or 0
+
+    context = {
+        'user': request.user,
+        'page_title': 'Gestión de Pedidos Activos',
+        'pedidos': pedidos_procesados,
+        'estadisticas': {
+            # Solo pedidos activos (sin pagar)
+            'total_pedidos': total_pedidos_activos,
+            'pedidos_pendientes': pedidos_pendientes_count,
+            'ingresos_hoy': ingresos_hoy,  # Solo ingresos de pedidos ya pagados hoy
+            'pedidos_domicilio': pedidos_domicilio_activos,
+            'total_pedidos_pagados': total_pedidos_completados,  # Para información
+            'ingresos_totales': ingresos_totales,  # Para información
+        },
+        'filtros': {
+            'search': search,
+            'estado': estado,
+            'tipo_pedido': tipo_pedido,
+            'fecha': fecha,
+            'sort': sort_by,
+        },
+        'paginator': page_obj,
+        'mostrando_activos': True,  # Flag para mostrar que solo se ven activos
+    }
+    return render(request, 'facturacion/gestiondepedidos.html', context)
+
+
+@csrf_exempt
+def actualizar_inventario_bebidas(items, operacion='restar'):
+    """
+    Actualiza el inventario de bebidas basado en los items de un pedido.
+    Retorna alertas cuando el stock llega a cero o es insuficiente.
+
+    operacion: 'restar' (al agregar al pedido) o 'sumar' (al cancelar o quitar del pedido)
+    Retorna: (alertas, productos_actualizados)
+    """
+    logger_pedidos.debug('🔄 actualizar_inventario_bebidas: %s items, operación: %s', len(items), operacion)
+
+    alertas = []
+    productos_actualizados = []
+
+    for item in items:
+        item_id = item.get('id', '')
+        item_name = item.get('name', '')
+        cantidad = item.get('quantity', 1)
+
+        logger_pedidos.debug('Procesando item: %s (id: %s, cantidad: %s)', item_name, item_id, cantidad)
+
+        # Verificar si es un producto de categoría bebida
+        # Caso 1: El ID empieza con "PROD-" (formato del frontend)
+        if isinstance(item_id, str) and item_id.startswith('PROD-'):
+            try:
+                prod_id = int(item_id.split('-')[1])
+                producto = Producto.objects.filter(
+                    id=prod_id, categoria='bebida').first()
+
+                if producto:
+                    try:
+                        cantidad_decimal = Decimal(str(cantidad))
+                        stock_anterior = producto.cantidad
+
+                        if operacion == 'restar':
+                            producto.cantidad -= cantidad_decimal
+                            mensaje = f"Descontando {cantidad_decimal} de {producto.nombre}"
+
+                            # Verificar si quedó en cero o negativo
+                            if producto.cantidad <= 0:
+                                alertas.append({
+                                    'tipo': 'advertencia',
+                                    'producto': producto.nombre,
+                                    'stock_anterior': float(stock_anterior),
+                                    'stock_actual': float(producto.cantidad),
+                                    'cantidad_solicitada': float(cantidad_decimal),
+                                    'mensaje': f"¡ATENCIÓN! {producto.nombre} quedó con stock CERO o NEGATIVO. Stock actual: {producto.cantidad}"
+                                })
+                                logger_pedidos.warning(
+                                    '⚠️ ALERTA: %s quedó con stock %s',
+                                    producto.nombre, producto.cantidad)
+
+                            # Verificar si el stock es bajo (menos de 10 unidades)
+                            elif producto.cantidad < 10:
+                                alertas.append({
+                                    'tipo': 'bajo_stock',
+                                    'producto': producto.nombre,
+                                    'stock_actual': float(producto.cantidad),
+                                    'mensaje': f"Stock bajo de {producto.nombre}. Quedan solo {producto.cantidad} unidades."
+                                })
+                                logger_pedidos.debug(
+                                    '📉 Stock bajo: %s - %s unidades',
+                                    producto.nombre, producto.cantidad)
+
+                        else:  # 'sumar'
+                            producto.cantidad += cantidad_decimal
+                            mensaje = f"Reponiendo {cantidad_decimal} a {producto.nombre}"
+
+                        producto.save()
+                        logger_pedidos.debug(
+                            '✅ %s (Stock anterior: %s, actual: %s)',
+                            mensaje, stock_anterior, producto.cantidad)
+
+                        productos_actualizados.append({
+                            'id': producto.id,
+                            'nombre': producto.nombre,
+                            'stock_anterior': float(stock_anterior),
+                            'stock_actual': float(producto.cantidad),
+                            'categoria': producto.categoria
+                        })
+
+                    except Exception as e:
+                        logger_pedidos.error('❌ Error con cantidad: %s', e)
+                else:
+                    logger_pedidos.warning('⚠️ Producto no encontrado o no es bebida: %s', item_id)
+
+            except (IndexError, ValueError) as e:
+                logger_pedidos.error('❌ Error al parsear ID %s: %s', item_id, e)
+
+        # Caso 2: Buscar por nombre si no tenemos ID
+        elif item_name:
+            producto = Producto.objects.filter(
+                nombre__icontains=item_name,
+                categoria='bebida'
+            ).first()
+
+            if producto:
+                try:
+                    cantidad_decimal = Decimal(str(cantidad))
+                    stock_anterior = producto.cantidad
+
+                    if operacion == 'restar':
+                        producto.cantidad -= cantidad_decimal
+                        mensaje = f"Descontando {cantidad_decimal} de {producto.nombre}"
+
+                        # Verificar si quedó en cero o negativo
+                        if producto.cantidad <= 0:
+                            alertas.append({
+                                'tipo': 'advertencia',
+                                'producto': producto.nombre,
+                                'stock_anterior': float(stock_anterior),
+                                'stock_actual': float(producto.cantidad),
+                                'cantidad_solicitada': float(cantidad_decimal),
+                                'mensaje': f"¡ATENCIÓN! {producto.nombre} quedó con stock CERO o NEGATIVO. Stock actual: {producto.cantidad}"
+                            })
+                            logger_pedidos.warning(
+                                '⚠️ ALERTA: %s quedó con stock %s',
+                                producto.nombre, producto.cantidad)
+
+                        # Verificar si el stock es bajo (menos de 10 unidades)
+                        elif producto.cantidad < 10:
+                            alertas.append({
+                                'tipo': 'bajo_stock',
+                                'producto': producto.nombre,
+                                'stock_actual': float(producto.cantidad),
+                                'mensaje': f"Stock bajo de {producto.nombre}. Quedan solo {producto.cantidad} unidades."
+                            })
+                            logger_pedidos.debug(
+                                '📉 Stock bajo: %s - %s unidades',
+                                producto.nombre, producto.cantidad)
+
+                    else:  # 'sumar'
+                        producto.cantidad += cantidad_decimal
+                        mensaje = f"Reponiendo {cantidad_decimal} a {producto.nombre}"
+
+                    producto.save()
+                    logger_pedidos.debug(
+                        '✅ %s (Stock anterior: %s, actual: %s)',
+                        mensaje, stock_anterior, producto.cantidad)
+
+                    productos_actualizados.append({
+                        'id': producto.id,
+                        'nombre': producto.nombre,
+                        'stock_anterior': float(stock_anterior),
+                        'stock_actual': float(producto.cantidad),
+                        'categoria': producto.categoria
+                    })
+
+                except Exception as e:
+                    logger_pedidos.error('❌ Error con cantidad: %s', e)
+            else:
+                logger_pedidos.warning('⚠️ No se encontró bebida con nombre: %s', item_name)
+
+        else:
+            logger_pedidos.warning('⚠️ Item sin ID ni nombre válido: %s', item)
+
+    return alertas, productos_actualizados
+
+
+@csrf_exempt
+def procesar_pedidos_para_template(pedidos_queryset):
+    """Procesa los pedidos para ser usados en el template - Incluye info de pago"""
+    pedidos_procesados = []
+
+    for pedido in pedidos_queryset:
+        # Obtener items del pedido
+        try:
+            if isinstance(pedido.items, str):
+                items = json.loads(pedido.items)
+            else:
+                items = pedido.items or []
+        except:
+            items = []
+
+        # Usar la anotación de la consulta si existe (evita una consulta por pedido)
+        tiene_factura_pagada = getattr(pedido, 'factura_pagada_annotated', None)
+        if tiene_factura_pagada is None:
+            tiene_factura_pagada = pedido.tiene_factura_pagada
+
+        # Determinar nombre del cliente basado en el tipo de pedido
+        nombre_cliente = pedido.nombre_cliente
+        if not nombre_cliente:
+            if pedido.tipo_pedido == 'mesa' and pedido.mesa:
+                nombre_cliente = f"Mesa {pedido.mesa.numero_display}"
+            elif pedido.tipo_pedido == 'delivery':
+                nombre_cliente = f"Delivery {pedido.codigo_delivery}"
+            elif pedido.tipo_pedido == 'llevar':
+                nombre_cliente = f"Para Llevar {pedido.codigo_delivery}"
+            else:
+                nombre_cliente = "Cliente no especificado"
+
+        # Convertir el tipo de pedido al formato del frontend
+        tipo_map = {
+            'mesa': 'restaurante',
+            'delivery': 'domicilio',
+            'llevar': 'recoger'
+        }
+        tipo_frontend = tipo_map.get(pedido.tipo_pedido, pedido.tipo_pedido)
+
+        # Calcular cantidad total de items
+        cantidad_items = sum(item.get('quantity', 0) for item in items)
+
+        pedido_procesado = {
+            'id': pedido.id,
+            'codigo_pedido': pedido.codigo_pedido,
+            'nombre_cliente': pedido.nombre_cliente or '',
+            'nombre_cliente_original': pedido.nombre_cliente or '',
+            'customer_name': nombre_cliente,
+            'customer_phone': pedido.telefono_cliente or '',
+            'customer_address': pedido.direccion_entrega or '',
+            'fecha_pedido': pedido.fecha_pedido,
+            'items': items,
+            'tipo_pedido': tipo_frontend,
+            'tipo_pedido_original': pedido.tipo_pedido,
+            'estado': pedido.estado,
+            'estado_display': pedido.get_estado_display(),
+            'subtotal': float(pedido.subtotal),
+            'envio': float(pedido.envio),
+            'total': float(pedido.total),
+            'mesa_numero': pedido.mesa.numero_display if pedido.mesa else '',
+            'codigo_delivery': pedido.codigo_delivery or '',
+            'notas': pedido.notas or '',
+            'cantidad_items': cantidad_items,
+            'fecha_formateada': pedido.fecha_pedido.strftime('%d/%m/%Y %H:%M'),
+            'tiene_factura_pagada': tiene_factura_pagada,
+        }
+
+        pedidos_procesados.append(pedido_procesado)
+
+    return pedidos_procesados
+
+
+@csrf_exempt
+def historial_pedidos_pagados(request):
+    """Vista para ver el historial de pedidos ya pagados"""
+    # Obtener parámetros de filtrado
+    search = request.GET.get('search', '')
+    tipo_pedido = request.GET.get('tipo', '')
+    fecha = request.GET.get('fecha', '')
+    page = request.GET.get('page', 1)
+
+    # Subconsulta para pedidos con facturas pagadas
+    facturas_pagadas = Factura.objects.filter(
+        pedido_id=OuterRef('pk'),
+        estado='pagada'
+    )
+
+    # Consulta: solo pedidos CON facturas pagadas
+    pedidos = Pedido.objects.annotate(
+        factura_pagada_annotated=Exists(facturas_pagadas)  # Cambiado el nombre
+    ).filter(
+        factura_pagada_annotated=True  # Solo pedidos CON facturas pagadas
+    ).select_related('mesa').prefetch_related(
+        Prefetch('facturas', queryset=Factura.objects.filter(estado='pagada').order_by('-fecha_factura'),
+                 to_attr='facturas_pagadas')
+    ).order_by('-fecha_pedido')
+
+    # Aplicar filtros
+    if search:
+        pedidos = filtrar(pedidos, 'pedido', search)
+
+    if tipo_pedido:
+        pedidos = pedidos.filter(tipo_pedido=tipo_pedido)
+
+    if fecha:
+        today = datetime.now().date()
+        if fecha == 'hoy':
+            pedidos = pedidos.filter(fecha_pedido__date=today)
+        elif fecha == 'ayer':
+            yesterday = today - timedelta(days=1)
+            pedidos = pedidos.filter(fecha_pedido__date=yesterday)
+        elif fecha == 'semana':
+            week_ago = today - timedelta(days=7)
+            pedidos = pedidos.filter(fecha_pedido__date__gte=week_ago)
+        elif fecha == 'mes':
+            month_ago = today - timedelta(days=30)
+            pedidos = pedidos.filter(fecha_pedido__date__gte=month_ago)
+
+    # Paginación
+    paginator = Paginator(pedidos, 20)
+    page_obj = paginator.get_page(page)
+
+    # Procesar pedidos para template
+    pedidos_procesados = []
+    for pedido in page_obj:
+        # Obtener la factura pagada asociada (precargada)
+        factura = pedido.facturas_pagadas[0] if pedido.facturas_pagadas else None
+
+        pedido_procesado = {
+            'id': pedido.id,
+            'codigo_pedido': pedido.codigo_pedido,
+            'nombre_cliente': pedido.nombre_cliente or '',
+            'tipo_pedido': pedido.tipo_pedido,
+            'estado': 'pagado',
+            'estado_display': 'Pagado',
+            'total': float(pedido.total),
+            'fecha_formateada': pedido.fecha_pedido.strftime('%d/%m/%Y %H:%M'),
+            'mesa_numero': pedido.mesa.numero_display if pedido.mesa else '',
+            'factura_numero': factura.numero_factura if factura else '',
+            'factura_fecha': factura.fecha_factura if factura else pedido.fecha_pedido,
+            'metodo_pago': factura.metodo_pago if factura else '',
+        }
+        pedidos_procesados.append(pedido_procesado)
+
+    # Estadísticas
+    total_pedidos_pagados = pedidos.count()
+    ingresos_totales = Factura.objects.filter(
+        estado='pagada').aggregate(total=Sum('total'))['total'] or 0
+
+    context = {
+        'user': request.user,
+        'page_title': 'Historial de Pedidos Pagados',
+        'pedidos': pedidos_procesados,
+        'estadisticas': {
+            'total_pedidos': total_pedidos_pagados,
+            'ingresos_totales': ingresos_totales,
+        },
+        'filtros': {
+            'search': search,
+            'tipo_pedido': tipo_pedido,
+            'fecha': fecha,
+        },
+        'paginator': page_obj,
+        'mostrando_pagados': True,
+    }
+    return render(request, 'facturacion/historial_pedidos.html', context)
+
+
+@csrf_exempt
+def detalle_pedido(request, pedido_id):
+    """Obtener detalles completos de un pedido para el modal"""
+    pedido = get_object_or_404(Pedido.objects.select_related('mesa'), id=pedido_id)
+
+    # Obtener items del pedido
+    try:
+        if isinstance(pedido.items, str):
+            items = json.loads(pedido.items)
+        else:
+            items = pedido.items or []
+    except:
+        items = []
+
+    # Formatear fecha
+    fecha_pedido = pedido.fecha_pedido.strftime(
+        '%A, %d de %B de %Y a las %H:%M')
+
+    # Determinar información del cliente
+    nombre_cliente = pedido.nombre_cliente
+
+    data = {
+        'id': pedido.id,
+        'codigo_pedido': pedido.codigo_pedido,
+        'fecha_pedido': fecha_pedido,
+        'estado': pedido.estado,
+        'estado_display': pedido.get_estado_display(),
+        'tipo_pedido': pedido.tipo_pedido,
+        'tipo_pedido_display': pedido.get_tipo_pedido_display(),
+        'nombre_cliente': nombre_cliente,
+        'telefono_cliente': pedido.telefono_cliente or '',
+        'direccion_entrega': pedido.direccion_entrega or '',
+        'mesa_numero': pedido.mesa.numero_display if pedido.mesa else '',
+        'items': items,  # Asegúrate de que esto incluya todos los campos necesarios
+        'subtotal': float(pedido.subtotal),
+        'envio': float(pedido.envio),
+        'total': float(pedido.total),
+        'notas': pedido.notas or '',
+        'cantidad_items': len(items),
+    }
+
+    return JsonResponse(data)
+
+
+@csrf_exempt
+def cambiar_estado_pedido(request, pedido_id):
+    """Cambiar estado de un pedido y agregar nuevos items si los hay"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Método no permitido'}, status=405)
+
+    try:
+        pedido = get_object_or_404(Pedido, id=pedido_id)
+        nuevo_estado = request.POST.get('estado')
+        nuevos_items_json = request.POST.get('nuevos_items')
+
+        if not nuevo_estado:
+            return JsonResponse({'error': 'Estado no especificado'}, status=400)
+
+        # Obtener los items actuales del pedido
+        try:
+            if isinstance(pedido.items, str):
+                items_actuales = json.loads(pedido.items)
+            else:
+                items_actuales = pedido.items or []
+        except:
+            items_actuales = []
+
+        alertas_totales = []
+
+        # Si el estado cambia a CANCELADO, reponer bebidas del inventario
+        if nuevo_estado == 'cancelado' and pedido.estado != 'cancelado':
+            logger_pedidos.debug('🔄 Cancelando pedido %s - Reponiendo bebidas...', pedido.codigo_pedido)
+            alertas, _ = actualizar_inventario_bebidas(
+                items_actuales, operacion='sumar')
+            alertas_totales.extend(alertas)
+
+        # Si el estado cambia de CANCELADO a otro, descontar bebidas
+        elif pedido.estado == 'cancelado' and nuevo_estado != 'cancelado':
+            logger_pedidos.debug('🔄 Reactivando pedido %s - Descontando bebidas...', pedido.codigo_pedido)
+            alertas, _ = actualizar_inventario_bebidas(
+                items_actuales, operacion='restar')
+            alertas_totales.extend(alertas)
+
+        # Procesar nuevos items si los hay
+        nuevos_items = []
+        if nuevos_items_json:
+            nuevos_items = json.loads(nuevos_items_json)
+
+        # Si hay nuevos items, descontar bebidas del inventario
+        if nuevos_items:
+            logger_pedidos.debug('🔄 Agregando %s nuevos items - Descontando bebidas...', len(nuevos_items))
+            alertas, _ = actualizar_inventario_bebidas(
+                nuevos_items, operacion='restar')
+            alertas_totales.extend(alertas)
+
+        # Agregar los nuevos items a la lista de items actuales
+        for item in nuevos_items:
+            # Buscar el plato para obtener su información completa
+            plato = Plato.objects.filter(id=item.get('plato_id')).first()
+            if plato:
+                nuevo_item = {
+                    'id': plato.id,
+                    'name': plato.nombre,
+                    'price': float(plato.precio),
+                    'quantity': item.get('cantidad', 1),
+                    'total': float(plato.precio) * item.get('cantidad', 1)
+                }
+                items_actuales.append(nuevo_item)
+
+        # Actualizar el pedido con los nuevos items
+        pedido.items = json.dumps(items_actuales)
+
+        # Recalcular subtotal, total, etc.
+        subtotal = sum(item['total'] for item in items_actuales)
+        total = subtotal + float(pedido.envio)
+
+        pedido.subtotal = subtotal
+        pedido.total = total
+
+        # Registrar cambio en historial
+        HistorialEstadoPedido.objects.create(
+            pedido=pedido,
+            estado_anterior=pedido.estado,
+            estado_nuevo=nuevo_estado,
+            usuario=request.user
+        )
+
+        # Actualizar pedido
+        pedido.estado = nuevo_estado
+
+        # Si se entrega, registrar fecha de entrega
+        if nuevo_estado == 'entregado':
+            pedido.fecha_entrega = timezone.now()
+
+        # Liberar mesa si se cancela
+        if nuevo_estado == 'cancelado':
+            if pedido.mesa:
+                pedido.mesa.estado = 'disponible'
+                pedido.mesa.save()
+
+        pedido.actualizado_por = request.user
+        pedido.save()
+
+        respuesta = {
+            'success': True,
+            'mensaje': f'Estado actualizado a {pedido.get_estado_display()} y items agregados',
+            'estado': pedido.estado,
+            'estado_display': pedido.get_estado_display(),
+            'codigo_pedido': pedido.codigo_pedido
+        }
+
+        # Agregar alertas a la respuesta si existen
+        if alertas_totales:
+            respuesta['alertas'] = alertas_totales
+            logger_pedidos.warning('⚠️ Se generaron %s alertas de stock', len(alertas_totales))
+
+        return JsonResponse(respuesta)
+
+    except Exception as e:
+        logger_pedidos.error('❌ Error en cambiar_estado_pedido: %s', e)
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+def eliminar_pedido(request, pedido_id):
+    """Eliminar un pedido de la base de datos"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Método no permitido'}, status=405)
+
+    try:
+        pedido = get_object_or_404(Pedido, id=pedido_id)
+
+        # Verificar si es para eliminar de la vista o cancelar
+        eliminar_vista = request.POST.get('eliminar_vista', 'false') == 'true'
+
+        # Obtener items del pedido
+        try:
+            if isinstance(pedido.items, str):
+                items = json.loads(pedido.items) if pedido.items else []
+            else:
+                items = pedido.items or []
+        except:
+            items = []
+
+        # Verificar si tiene factura pagada
+        tiene_factura_pagada = pedido.facturas.filter(estado='pagada').exists()
+
+        alertas_totales = []
+
+        if eliminar_vista:
+            # Eliminar permanentemente de la base de datos
+            codigo_pedido = pedido.codigo_pedido
+
+            # Reponer bebidas del inventario si no tiene factura pagada
+            if not tiene_factura_pagada:
+                logger_pedidos.debug('🔄 Eliminando pedido %s - Reponiendo bebidas...', codigo_pedido)
+                alertas, _ = actualizar_inventario_bebidas(
+                    items, operacion='sumar')
+                alertas_totales.extend(alertas)
+
+            # Verificar si tiene facturas antes de eliminar
+            if pedido.facturas.exists():
+                return JsonResponse({
+                    'error': 'No se puede eliminar el pedido porque tiene facturas asociadas'
+                }, status=400)
+
+            # LIBERAR MESA solo si NO tiene factura pagada
+            if pedido.mesa and not tiene_factura_pagada:
+                pedido.mesa.estado = 'disponible'
+                pedido.mesa.save()
+
+            pedido.delete()
+
+            respuesta = {
+                'success': True,
+                'mensaje': f'Pedido {codigo_pedido} eliminado de la vista',
+                'eliminado': True
+            }
+
+        else:
+            # Marcar como cancelado (comportamiento anterior)
+
+            # Reponer bebidas del inventario si no tiene factura pagada
+            if not tiene_factura_pagada:
+                logger_pedidos.debug('🔄 Cancelando pedido %s - Reponiendo bebidas...', pedido.codigo_pedido)
+                alertas, _ = actualizar_inventario_bebidas(
+                    items, operacion='sumar')
+                alertas_totales.extend(alertas)
+
+            # LIBERAR MESA solo si NO tiene factura pagada
+            if pedido.mesa and not tiene_factura_pagada:
+                pedido.mesa.estado = 'disponible'
+                pedido.mesa.save()
+
+            pedido.estado = 'cancelado'
+            pedido.actualizado_por = request.user
+            pedido.save()
+
+            respuesta = {
+                'success': True,
+                'mensaje': f'Pedido {pedido.codigo_pedido} cancelado'
+            }
+
+        # Agregar alertas a la respuesta si existen
+        if alertas_totales:
+            respuesta['alertas'] = alertas_totales
+            logger_pedidos.warning('⚠️ Se generaron %s alertas de stock', len(alertas_totales))
+
+        return JsonResponse(respuesta)
+
+    except Exception as e:
+        logger_pedidos.error('❌ Error al eliminar pedido: %s', e)
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+def platos_disponibles(request):
+    """Obtener lista de productos disponibles (bebidas y platos) para agregar a un pedido"""
+    search = request.GET.get('search', '')
+    tipo = request.GET.get('tipo', 'todos')  # 'bebida', 'plato', 'todos'
+
+    try:
+        resultados = []
+
+        # Si se solicita bebidas o todos
+        if tipo in ['bebida', 'todos']:
+            # Filtrar productos de categoría bebida
+            productos = Producto.objects.filter(categoria='bebida')
+            if search:
+                productos = filtrar(productos, 'producto', search)
+
+            for producto in productos:
+                resultados.append({
+                    'id': f"PROD-{producto.id}",
+                    'codigo': producto.codigo,
+                    'nombre': producto.nombre,
+                    'precio': float(producto.precio_compra),
+                    'tipo': 'bebida',
+                    'categoria': producto.get_category_label(),
+                    'cantidad_disponible': float(producto.cantidad),
+                    'stock_status': producto.get_stock_status(),
+                    'stock_label': producto.get_stock_label(),
+                    'stock_icon': producto.get_stock_icon(),
+                    'es_producto': True,
+                })
+
+        # Si se solicita platos o todos
+        if tipo in ['plato', 'todos']:
+            # Filtrar platos activos
+            platos = Plato.objects.filter(activo=True)
+            if search:
+                platos = filtrar(platos, 'plato', search)
+
+            for plato in platos:
+                resultados.append({
+                    'id': f"PLATO-{plato.id}",
+                    'codigo': plato.codigo,
+                    'nombre': plato.nombre,
+                    'precio': float(plato.precio),
+                    'tipo': 'plato',
+                    'categoria': plato.get_categoria_display(),
+                    'cantidad_disponible': None,  # Platos no tienen inventario directo
+                    'stock_status': 'high',
+                    'stock_label': 'Disponible',
+                    'stock_icon': '🍽️',
+                    'es_producto': False,
+                })
+
+        # Ordenar por tipo y nombre
+        resultados.sort(key=lambda x: (x['tipo'] != 'bebida', x['nombre']))
+
+        return JsonResponse(resultados, safe=False)
+
+    except Exception as e:
+        logger_pedidos.error('Error en platos_disponibles: %s', e)
+        return JsonResponse([], safe=False)
+
+
+@csrf_exempt
+def editar_pedido(request, pedido_id):
+    """Editar un pedido existente - agregar/eliminar items, cambiar estado"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Método no permitido'}, status=405)
+
+    try:
+        pedido = get_object_or_404(Pedido, id=pedido_id)
+
+        logger_pedidos.debug('=== EDITANDO PEDIDO %s ===', pedido.codigo_pedido)
+
+        # Obtener datos del formulario
+        nuevos_items_json = request.POST.get('nuevos_items')
+        nombre_cliente = request.POST.get('nombre_cliente')
+        telefono_cliente = request.POST.get('telefono_cliente')
+        notas = request.POST.get('notas')
+
+        if not nuevos_items_json:
+            return JsonResponse({'error': 'No se proporcionaron items'}, status=400)
+
+        # Obtener los items actuales del pedido (antes de cambiar)
+        try:
+            if isinstance(pedido.items, str):
+                items_actuales = json.loads(
+                    pedido.items) if pedido.items else []
+            else:
+                items_actuales = pedido.items or []
+        except Exception as e:
+            logger_pedidos.error('❌ Error al cargar items actuales: %s', e)
+            items_actuales = []
+
+        logger_pedidos.debug('Items actuales: %s items', len(items_actuales))
+
+        # Parsear los nuevos items
+        nuevos_items = json.loads(nuevos_items_json)
+        logger_pedidos.debug('Nuevos items: %s items', len(nuevos_items))
+
+        # 🔄 GESTIÓN DE INVENTARIO DE BEBIDAS
+
+        # 1. Identificar items que se van a eliminar (están en items_actuales pero no en nuevos_items)
+        items_a_eliminar = []
+        for item_actual in items_actuales:
+            encontrado = False
+            for item_nuevo in nuevos_items:
+                # Comparar por id o nombre
+                if (item_nuevo.get('id') == item_actual.get('id') or
+                        item_nuevo.get('name') == item_actual.get('name')):
+                    encontrado = True
+                    break
+
+            if not encontrado:
+                items_a_eliminar.append(item_actual)
+
+        # 2. Identificar items nuevos (están en nuevos_items pero no en items_actuales)
+        items_a_agregar = []
+        for item_nuevo in nuevos_items:
+            encontrado = False
+            for item_actual in items_actuales:
+                if (item_nuevo.get('id') == item_actual.get('id') or
+                        item_nuevo.get('name') == item_actual.get('name')):
+                    encontrado = True
+                    break
+
+            if not encontrado:
+                items_a_agregar.append(item_nuevo)
+
+        # 3. Identificar items modificados (cambia la cantidad)
+        items_modificados = []
+        for item_nuevo in nuevos_items:
+            for item_actual in items_actuales:
+                if (item_nuevo.get('id') == item_actual.get('id') or
+                        item_nuevo.get('name') == item_actual.get('name')):
+
+                    cantidad_actual = item_actual.get('quantity', 1)
+                    cantidad_nueva = item_nuevo.get('quantity', 1)
+
+                    if cantidad_actual != cantidad_nueva:
+                        items_modificados.append({
+                            'item': item_nuevo,
+                            'cantidad_anterior': cantidad_actual,
+                            'cantidad_nueva': cantidad_nueva,
+                            'diferencia': cantidad_nueva - cantidad_actual
+                        })
+                    break
+
+        logger_pedidos.debug('🔍 Análisis de cambios:')
+        logger_pedidos.debug('Items a eliminar: %s', len(items_a_eliminar))
+        logger_pedidos.debug('Items a agregar: %s', len(items_a_agregar))
+        logger_pedidos.debug('Items modificados: %s', len(items_modificados))
+
+        # 4. Aplicar cambios al inventario de bebidas
+        alertas_totales = []
+
+        # Reponer bebidas de items eliminados
+        if items_a_eliminar:
+            logger_pedidos.debug('🔄 Reponiendo bebidas de %s items eliminados...', len(items_a_eliminar))
+            alertas, _ = actualizar_inventario_bebidas(
+                items_a_eliminar, operacion='sumar')
+            alertas_totales.extend(alertas)
+
+        # Descontar bebidas de items nuevos
+        if items_a_agregar:
+            logger_pedidos.debug('🔄 Descontando bebidas de %s items nuevos...', len(items_a_agregar))
+            alertas, _ = actualizar_inventario_bebidas(
+                items_a_agregar, operacion='restar')
+            alertas_totales.extend(alertas)
+
+        # Ajustar bebidas de items modificados
+        for item_mod in items_modificados:
+            item = item_mod['item']
+            diferencia = item_mod['diferencia']
+
+            if diferencia != 0:
+                # Crear un item temporal con la diferencia
+                item_diferencia = {
+                    'id': item.get('id'),
+                    'name': item.get('name'),
+                    'quantity': abs(diferencia),
+                    'price': item.get('price'),
+                    'total': item.get('total')
+                }
+
+                if diferencia > 0:
+                    # Se aumentó la cantidad, descontar diferencia
+                    logger_pedidos.debug(
+                        '📈 Aumentando cantidad de %s en %s - Descontando...',
+                        item['name'], diferencia)
+                    alertas, _ = actualizar_inventario_bebidas(
+                        [item_diferencia], operacion='restar')
+                    alertas_totales.extend(alertas)
+                else:
+                    # Se disminuyó la cantidad, reponer diferencia
+                    logger_pedidos.debug(
+                        '📉 Disminuyendo cantidad de %s en %s - Reponiendo...',
+                        item['name'], abs(diferencia))
+                    alertas, _ = actualizar_inventario_bebidas(
+                        [item_diferencia], operacion='sumar')
+                    alertas_totales.extend(alertas)
+
+        # Actualizar información del cliente si se proporciona
+        if nombre_cliente:
+            pedido.nombre_cliente = nombre_cliente
+        if telefono_cliente:
+            pedido.telefono_cliente = telefono_cliente
+        if notas is not None:
+            pedido.notas = notas
+
+        # Actualizar items del pedido
+        pedido.items = json.dumps(nuevos_items)
+
+        # Recalcular subtotal y total
+        subtotal = sum(item.get('total', 0) for item in nuevos_items)
+        total = subtotal + float(pedido.envio)
+
+        pedido.subtotal = subtotal
+        pedido.total = total
+
+        # Guardar cambios
+        pedido.actualizado_por = request.user
+        pedido.save()
+
+        logger_pedidos.debug('✅ Pedido %s actualizado correctamente', pedido.codigo_pedido)
+
+        # Preparar respuesta con alertas si las hay
+        respuesta = {
+            'success': True,
+            'mensaje': f'Pedido {pedido.codigo_pedido} actualizado correctamente',
+            'nuevo_total': total,
+            'cantidad_items': len(nuevos_items)
+        }
+
+        # Agregar alertas a la respuesta si existen
+        if alertas_totales:
+            respuesta['alertas'] = alertas_totales
+            logger_pedidos.warning('⚠️ Se generaron %s alertas de stock', len(alertas_totales))
+
+        return JsonResponse(respuesta)
+
+    except Exception as e:
+        logger_pedidos.error('❌ Error al editar pedido: %s', e)
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+def liberar_mesa_si_corresponde(self):
+    """Libera la mesa si la factura está pagada"""
+    # Estados que liberan mesa cuando hay factura PAGADA
+    # Solo cancelado libera sin factura
+    estados_que_liberan_mesa = ['cancelado']
+
+    # Verificar si tiene factura PAGADA
+    tiene_factura_pagada = self.facturas.filter(estado='pagada').exists()
+
+    if tiene_factura_pagada and self.mesa:
+        # Si tiene factura pagada, liberar mesa
+        self.mesa.estado = 'disponible'
+        self.mesa.save()
+        return True
+    elif self.estado in estados_que_liberan_mesa and self.mesa:
+        # Solo liberar mesa si está cancelado (sin factura)
+        self.mesa.estado = 'disponible'
+        self.mesa.save()
+        return True
+
+    return False
@@ -0,0 +1,228 @@
+"""Alta, edición y listado de platos."""
+import json
+from datetime import date
+
+from django.contrib import messages
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.csrf import csrf_exempt
+
+from ..models import Plato
+
+
+@csrf_exempt
+def entradadeplatillos(request):
+    """Vista para mostrar el formulario de entrada de platos"""
+    # Obtener el próximo código disponible
+    proximo_codigo = Plato.generar_codigo()
+
+    context = {
+        'proximo_codigo': proximo_codigo
+    }
+    return render(request, 'facturacion/entradadeplatillos.html', context)
+
+
+@csrf_exempt
+def guardar_plato(request):
+    """Vista para guardar un nuevo plato (acepta AJAX y POST normal)"""
+    if request.method == 'POST':
+        try:
+            # Obtener datos del formulario
+            nombre = request.POST.get('nombre', '').strip()
+            categoria = request.POST.get('categoria', '')
+            precio = request.POST.get('precio', '0')
+
+            # Validaciones básicas
+            if not nombre or not categoria:
+                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                    return JsonResponse({'success': False, 'error': 'Nombre y categoría son requeridos'})
+                else:
+                    messages.error(
+                        request, 'Nombre y categoría son requeridos')
+                    return redirect('entrada_platos')
+
+            try:
+                precio_decimal = float(precio)
+                if precio_decimal <= 0:
+                    raise ValueError("Precio debe ser mayor a 0")
+            except ValueError:
+                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                    return JsonResponse({'success': False, 'error': 'Precio inválido'})
+                else:
+                    messages.error(request, 'Precio inválido')
+                    return redirect('entrada_platos')
+
+            # Crear y guardar el plato (el código se genera automáticamente)
+            plato = Plato(
+                nombre=nombre,
+                categoria=categoria,
+                precio=precio_decimal
+            )
+            plato.save()
+
+            # Obtener el próximo código para la vista
+            proximo_codigo = Plato.generar_codigo()
+
+            # Responder según el tipo de petición
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'success': True,
+                    'message': f'Plato "{nombre}" guardado exitosamente',
+                    'plato_id': plato.id,
+                    'codigo_asignado': plato.codigo,
+                    'proximo_codigo': proximo_codigo
+                })
+            else:
+                messages.success(
+                    request, f'Plato "{nombre}" (Código: {plato.codigo}) guardado exitosamente')
+                return redirect('entrada_platos')
+
+        except Exception as e:
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({'success': False, 'error': str(e)})
+            else:
+                messages.error(request, f'Error al guardar: {str(e)}')
+                return redirect('entrada_platos')
+
+    # Si no es POST, redirigir
+    return redirect('entrada_platos')
+
+
+@csrf_exempt
+def listadeplatillos(request):
+    """Vista para mostrar la lista de platos"""
+    # Obtener todos los platos activos ordenados por código
+    platos = Plato.objects.filter(activo=True).order_by('codigo')
+
+    # Calcular estadísticas
+    total_platos = platos.count()
+
+    if total_platos > 0:
+        precio_promedio = sum(p.precio for p in platos) / total_platos
+        categorias = platos.values_list(
+            'categoria', flat=True).distinct().count()
+        hoy = date.today()
+        platos_hoy = platos.filter(fecha_creacion__date=hoy).count()
+    else:
+        precio_promedio = 0
+        categorias = 0
+        platos_hoy = 0
+
+    context = {
+        'platos': platos,
+        'total_platos': total_platos,
+        'precio_promedio': precio_promedio,
+        'categorias': categorias,
+        'platos_hoy': platos_hoy,
+    }
+    return render(request, 'facturacion/listadeplatillos.html', context)
+
+
+@csrf_exempt
+def eliminar_plato(request, plato_id):
+    """Vista para eliminar un plato (acepta AJAX)"""
+    if request.method == 'DELETE':
+        try:
+            plato = get_object_or_404(Plato, id=plato_id)
+            # Cambiar estado a inactivo en lugar de eliminar
+            plato.activo = False
+            plato.save()
+
+            return JsonResponse({
+                'success': True,
+                'message': f'Plato "{plato.nombre}" eliminado exitosamente'
+            })
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)})
+
+    return JsonResponse({'success': False, 'error': 'Método no permitido'})
+
+
+@csrf_exempt
+def obtener_plato(request, plato_id):
+    """Vista para obtener datos de un plato específico"""
+    if request.method == 'GET':
+        try:
+            plato = Plato.objects.get(id=plato_id)
+
+            return JsonResponse({
+                'success': True,
+                'plato': {
+                    'id': plato.id,
+                    'codigo': plato.codigo,
+                    'nombre': plato.nombre,
+                    'categoria': plato.categoria,
+                    'precio': float(plato.precio),
+                    'fecha_creacion': plato.fecha_creacion.strftime('%Y-%m-%d'),
+                    'activo': plato.activo
+                }
+            })
+        except Plato.DoesNotExist:
+            return JsonResponse({'success': False, 'error': 'Plato no encontrado'})
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)})
+
+    return JsonResponse({'success': False, 'error': 'Método no permitido'})
+
+
+@csrf_exempt
+def actualizar_plato(request, plato_id):
+    """Vista para actualizar un plato"""
+    if request.method in ['POST', 'PUT']:
+        try:
+            plato = Plato.objects.get(id=plato_id)
+
+            # Parsear datos según el método
+            if request.method == 'POST':
+                # Datos desde formulario POST
+                data = {
+                    'nombre': request.POST.get('nombre'),
+                    'categoria': request.POST.get('categoria'),
+                    'precio': request.POST.get('precio')
+                }
+            else:
+                # Datos JSON desde PUT
+                data = json.loads(request.body)
+
+            # Actualizar campos
+            if 'nombre' in data and data['nombre']:
+                plato.nombre = data['nombre'].strip()
+
+            if 'categoria' in data and data['categoria']:
+                plato.categoria = data['categoria']
+
+            if 'precio' in data and data['precio']:
+                try:
+                    precio = float(data['precio'])
+                    if precio >= 0:
+                        plato.precio = precio
+                    else:
+                        return JsonResponse({'success': False, 'error': 'El precio debe ser mayor o igual a 0'})
+                except (ValueError, TypeError):
+                    return JsonResponse({'success': False, 'error': 'Precio inválido'})
+
+            plato.save()
+
+            # Si es POST, redirigir a la lista de platos
+            if request.method == 'POST':
+                from django.shortcuts import redirect
+                return redirect('listadeplatillos')
+
+            # Si es PUT, devolver JSON
+            return JsonResponse({
+                'success': True,
+                'message': f'Plato "{plato.nombre}" actualizado exitosamente',
+                'plato': {
+                    'id': plato.id,
+                    'codigo': plato.codigo,
+                    'nombre': plato.nombre,
+                    'categoria': plato.categoria,
+                    'precio': float(plato.precio)
+                }
+            })
+        except Plato.DoesNotExist:
+            return JsonResponse({'success': False, 'error': 'Plato no encontrado'})
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)})
+
+    return JsonResponse({'success': False, 'error': 'Método no permitido'})
@@ -0,0 +1,100 @@
+"""Cambios masivos de precios de platos y productos (ver precios.py)."""
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_POST
+
+from .. import precios
+from ..accesos import accesos_usuario
+from ..models import CambioPrecio
+
+# Módulo que hay que poder abrir para cambiar los precios de cada catálogo
+MODULO_POR_TIPO = {
+    'plato': 'listadeplatillos',
+    'producto': 'inventario',
+}
+
+
+def _sin_permiso(user, tipo):
+    if not accesos_usuario(user).puede(MODULO_POR_TIPO[tipo]):
+        return JsonResponse({'success': False, 'error': 'No tienes permiso para cambiar estos precios'},
+                            status=403)
+    return None
+
+
+def _vigente_desde(texto):
+    """Fecha del formulario (datetime-local, hora del restaurante) o None para aplicar ya"""
+    if not texto:
+        return None
+    fecha = parse_datetime(texto)
+    if fecha is None:
+        raise precios.ErrorPrecio(f'Fecha inválida: {texto}')
+    if timezone.is_naive(fecha):
+        fecha = timezone.make_aware(fecha)
+    return fecha
+
+
+@login_required
+@require_POST
+def cambiar_precios(request, tipo):
+    """
+    Cambio masivo: ``modo`` (porcentaje/monto), ``valor``, ``categoria`` y/o
+    ``codigos`` (separados por coma), ``vigente_desde`` opcional. Con
+    ``simular=1`` solo devuelve la vista previa.
+    """
+    if tipo not in MODULO_POR_TIPO:
+        return JsonResponse({'success': False, 'error': f'Catálogo desconocido: {tipo}'}, status=404)
+    denegado = _sin_permiso(request.user, tipo)
+    if denegado:
+        return denegado
+
+    parametros = {
+        'modo': request.POST.get('modo', 'porcentaje'),
+        'valor': request.POST.get('valor', ''),
+        'categoria': request.POST.get('categoria', ''),
+        'codigos': request.POST.get('codigos', '').replace(';', ',').split(','),
+    }
+    try:
+        if request.POST.get('simular') in ('1', 'true', 'on'):
+            vista = precios.previsualizar(tipo, **parametros)
+            return JsonResponse({
+                'success': True,
+                'message': (f"{vista['filas']} precio(s) cambiarían; "
+                            f"{vista['fuera_de_rango']} quedarían fuera de rango y se omitirán"),
+                **vista,
+            })
+        cambio = precios.crear_cambio(tipo, vigente_desde=_vigente_desde(request.POST.get('vigente_desde')),
+                                      usuario=request.user, **parametros)
+    except precios.ErrorPrecio as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    if cambio.estado == 'aplicado':
+        mensaje = f'{cambio.filas_afectadas} precio(s) actualizados'
+    else:
+        mensaje = f"Cambio programado para {timezone.localtime(cambio.vigente_desde):%d/%m/%Y %H:%M}"
+    return JsonResponse({
+        'success': True,
+        'message': mensaje,
+        'cambio': {
+            'id': cambio.id,
+            'estado': cambio.estado,
+            'vigente_desde': cambio.vigente_desde.isoformat(),
+            'filas_afectadas': cambio.filas_afectadas,
+        },
+    })
+
+
+@login_required
+@require_POST
+def cancelar_cambio_precios(request, cambio_id):
+    """Cancelar un cambio programado que todavía no se aplicó"""
+    cambio = get_object_or_404(CambioPrecio, id=cambio_id)
+    denegado = _sin_permiso(request.user, cambio.tipo)
+    if denegado:
+        return denegado
+    if not precios.cancelar(cambio.id):
+        return JsonResponse({'success': False, 'error': f'El cambio ya está {cambio.get_estado_display().lower()}'},
+                            status=400)
+    return JsonResponse({'success': True, 'message': 'Cambio de precios cancelado'})
@@ -0,0 +1,1274 @@
+"""Reportes de ventas del día (pantalla, CSV y PDF)."""
+import io
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Max, Min, Q, Sum
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+
+from ..models import Factura, Producto
+from ..registro import obtener_logger
+
+logger_reportes = obtener_logger('reportes')
+
+
+@login_required
+def generar_pdf_ticket_dia(request):
+    """Generar PDF del ticket de venta del día para impresora 80mm"""
+    from reportlab.lib.units import mm
+    from reportlab.pdfgen import canvas
+    # Obtener hora local actual - forzar zona horaria de República Dominicana
+    import pytz
+    tz_rd = pytz.timezone('America/Santo_Domingo')
+    ahora_local = timezone.now().astimezone(tz_rd)
+    hoy_local = ahora_local.date()
+
+    # DEFINICIÓN DEL "DÍA": De 6:00 AM a 5:59 AM del día siguiente
+    if ahora_local.hour >= 6:
+        # Si son las 6:00 AM o más tarde, el día actual comenzó hoy a las 6:00 AM
+        inicio_dia = timezone.make_aware(
+            datetime.combine(hoy_local, datetime(2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(hoy_local + timedelta(days=1),
+                             datetime(2000, 1, 1, 5, 59, 59).time())
+        )
+        periodo_texto = f"{hoy_local.strftime('%d/%m/%Y')} 06:00 - {(hoy_local + timedelta(days=1)).strftime('%d/%m/%Y')} 05:59"
+        periodo_corto = f"{hoy_local.strftime('%d/%m')} 06:00 a {(hoy_local + timedelta(days=1)).strftime('%d/%m')} 06:00"
+    else:
+        # Si es antes de las 6:00 AM, estamos en el día que comenzó ayer a las 6:00 AM
+        inicio_dia = timezone.make_aware(
+            datetime.combine(hoy_local - timedelta(days=1),
+                             datetime(2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(hoy_local, datetime(2000, 1, 1, 5, 59, 59).time())
+        )
+        periodo_texto = f"{(hoy_local - timedelta(days=1)).strftime('%d/%m/%Y')} 06:00 - {hoy_local.strftime('%d/%m/%Y')} 05:59"
+        periodo_corto = f"{(hoy_local - timedelta(days=1)).strftime('%d/%m')} 06:00 a {hoy_local.strftime('%d/%m')} 06:00"
+
+    # Obtener facturas del período
+    facturas_hoy = Factura.objects.filter(
+        fecha_factura__gte=inicio_dia,
+        fecha_factura__lte=fin_dia,
+        estado='pagada'
+    ).order_by('fecha_factura')
+
+    # Un solo agregado para total, cantidad, máximo y mínimo
+    resumen_dia = facturas_hoy.aggregate(
+        total_dia=Sum('total'), cantidad=Count('id'),
+        max_total=Max('total'), min_total=Min('total'),
+    )
+    venta_dia = resumen_dia['total_dia'] or Decimal('0.00')
+    cantidad_facturas = resumen_dia['cantidad']
+    facturas_hoy = list(facturas_hoy.only('numero_factura', 'fecha_factura', 'nombre_cliente', 'total'))
+
+    # Crear un buffer para el PDF
+    buffer = io.BytesIO()
+
+    # Configurar el tamaño de la página para impresora térmica 80mm
+    ancho_pagina = 80 * mm  # 226.77 puntos
+    alto_pagina = 297 * mm  # Alto estándar para ticket continuo
+
+    # Crear el documento PDF con tamaño personalizado
+    c = canvas.Canvas(buffer, pagesize=(ancho_pagina, alto_pagina))
+
+    # Configurar fuentes y estilos para impresora térmica
+    c.setFont("Helvetica", 8)
+
+    # Coordenadas iniciales (de arriba hacia abajo)
+    y = alto_pagina - 10 * mm  # Comenzar 10mm desde el borde superior
+
+    # 1. ENCABEZADO DEL RESTAURANTE CON LOGO
+    # Intentar cargar el logo
+    try:
+        logo_path = os.path.join(
+            settings.STATIC_ROOT or settings.BASE_DIR, 'static', 'img', 'fastfood.png')
+        if not os.path.exists(logo_path):
+            # Intentar ruta alternativa
+            logo_path = os.path.join(
+                settings.BASE_DIR, 'static', 'img', 'fastfood.png')
+
+        if os.path.exists(logo_path):
+            # Dibujar logo centrado (pequeño: 15mm x 15mm)
+            logo_size = 15 * mm
+            logo_x = (ancho_pagina - logo_size) / 2
+            c.drawImage(logo_path, logo_x, y - logo_size, width=logo_size,
+                        height=logo_size, preserveAspectRatio=True, mask='auto')
+            y -= (logo_size + 3 * mm)
+    except Exception as e:
+        # Si falla la carga del logo, continuar sin él
+        pass
+
+    c.setFont("Helvetica-Bold", 12)
+    c.drawCentredString(ancho_pagina / 2, y, "404 FASTFOOD")
+    y -= 6 * mm
+
+    c.setFont("Helvetica", 9)
+    c.drawCentredString(ancho_pagina / 2, y, "REPORTE DE CUADRE DE VENTAS")
+    y -= 5 * mm
+
+    # Línea separadora
+    c.line(5 * mm, y, ancho_pagina - 5 * mm, y)
+    y -= 4 * mm
+
+    # 2. PERÍODO DE REPORTE (con nueva definición)
+    c.setFont("Helvetica-Bold", 9)
+    c.drawCentredString(ancho_pagina / 2, y, "PERÍODO DE REPORTE")
+    y -= 4 * mm
+
+    c.setFont("Helvetica", 8)
+    c.drawCentredString(ancho_pagina / 2, y, periodo_corto)
+    y -= 4 * mm
+
+    c.drawCentredString(ancho_pagina / 2, y, "(De 6:00 AM a 5:59 AM)")
+    y -= 6 * mm
+
+    # 3. FECHA Y HORA DE GENERACIÓN
+    c.setFont("Helvetica", 8)
+    c.drawString(5 * mm, y, f"Generado:")
+    c.drawRightString(ancho_pagina - 5 * mm, y,
+                      ahora_local.strftime('%d/%m/%Y %I:%M'))
+    y -= 4 * mm
+
+    # Línea separadora
+    c.line(5 * mm, y, ancho_pagina - 5 * mm, y)
+    y -= 4 * mm
+
+    # 4. RESUMEN DE VENTAS
+    c.setFont("Helvetica-Bold", 10)
+    c.drawCentredString(ancho_pagina / 2, y, "RESUMEN DE VENTAS")
+    y -= 4 * mm
+
+    c.setFont("Helvetica", 8)
+    c.drawString(5 * mm, y, f"Total de Facturas:")
+    c.setFont("Helvetica-Bold", 12)
+    c.drawRightString(ancho_pagina - 5 * mm, y, f"{cantidad_facturas}")
+    y -= 4 * mm
+
+    # Línea separadora punteada
+    c.setDash(1, 2)
+    c.line(5 * mm, y, ancho_pagina - 5 * mm, y)
+    c.setDash()
+    y -= 6 * mm
+
+    # 5. DETALLE DE FACTURAS (si hay)
+    if cantidad_facturas:
+        c.setFont("Helvetica-Bold", 9)
+        c.drawCentredString(ancho_pagina / 2, y, "DETALLE DE FACTURAS")
+        y -= 5 * mm
+
+        # Encabezado de tabla
+        c.setFont("Helvetica-Bold", 8)
+        c.drawString(5 * mm, y, "FACTURA")
+        c.drawString(30 * mm, y, "HORA")
+        c.drawString(42 * mm, y, "CLIENTE")
+        c.drawRightString(ancho_pagina - 5 * mm, y, "TOTAL")
+        y -= 4 * mm
+
+        c.setFont("Helvetica", 7)
+        for factura in facturas_hoy:
+            # Verificar si hay espacio en la página
+            if y < 25 * mm:  # Si queda poco espacio
+                c.showPage()
+                c.setFont("Helvetica", 8)
+                y = alto_pagina - 10 * mm
+                # Reimprimir encabezado de tabla
+                c.setFont("Helvetica-Bold", 8)
+                c.drawString(5 * mm, y, "FACTURA")
+                c.drawString(30 * mm, y, "HORA")
+                c.drawString(42 * mm, y, "CLIENTE")
+                c.drawRightString(ancho_pagina - 5 * mm, y, "TOTAL")
+                y -= 4 * mm
+                c.setFont("Helvetica", 7)
+
+            # Número de factura (mostrar solo los últimos 8 dígitos)
+            num_factura = factura.numero_factura
+            if len(num_factura) > 8:
+                num_factura = "..." + num_factura[-8:]
+            c.drawString(5 * mm, y, f"#{num_factura}")
+
+            # Hora
+            hora_factura = factura.fecha_factura.astimezone(tz_rd)
+            c.drawString(30 * mm, y, hora_factura.strftime('%I:%M'))
+
+            # Cliente (truncar si es muy largo)
+            cliente = factura.nombre_cliente or "CLIENTE"
+            if len(cliente) > 10:
+                cliente = cliente[:10] + "."
+            c.drawString(42 * mm, y, cliente)
+
+            # Total de la factura
+            c.drawRightString(ancho_pagina - 5 * mm, y,
+                              f"${factura.total:,.2f}")
+            y -= 3.5 * mm
+
+        # Línea separadora después de la lista
+        c.line(5 * mm, y, ancho_pagina - 5 * mm, y)
+        y -= 8 * mm
+
+    # 6. TOTAL DEL DÍA
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(5 * mm, y, "TOTAL DEL DÍA:")
+    c.setFont("Helvetica-Bold", 14)
+    c.drawRightString(ancho_pagina - 5 * mm, y, f"${venta_dia:,.2f}")
+    y -= 8 * mm
+
+    # Línea doble para énfasis
+    c.setLineWidth(0.8)
+    c.line(5 * mm, y, ancho_pagina - 5 * mm, y)
+    y -= 1.5 * mm
+    c.line(5 * mm, y, ancho_pagina - 5 * mm, y)
+    c.setLineWidth(1)
+    y -= 6 * mm
+
+    # 7. ESTADÍSTICAS ADICIONALES
+    c.setFont("Helvetica", 8)
+    c.drawCentredString(ancho_pagina / 2, y, "ESTADÍSTICAS")
+    y -= 4 * mm
+
+    # Promedio por factura
+    promedio = venta_dia / cantidad_facturas if cantidad_facturas else Decimal('0.00')
+    c.drawString(5 * mm, y, f"Promedio por factura:")
+    c.drawRightString(ancho_pagina - 5 * mm, y, f"${promedio:,.2f}")
+    y -= 3.5 * mm
+
+    # Factura más alta
+    if cantidad_facturas:
+        max_factura = resumen_dia['max_total'] or Decimal('0.00')
+        c.drawString(5 * mm, y, f"Factura más alta:")
+        c.drawRightString(ancho_pagina - 5 * mm, y, f"${max_factura:,.2f}")
+        y -= 3.5 * mm
+
+    # Factura más baja
+    if cantidad_facturas:
+        min_factura = resumen_dia['min_total'] or Decimal('0.00')
+        c.drawString(5 * mm, y, f"Factura más baja:")
+        c.drawRightString(ancho_pagina - 5 * mm, y, f"${min_factura:,.2f}")
+        y -= 3.5 * mm
+
+    y -= 4 * mm
+
+    # 8. PIE DE PÁGINA
+    c.setFont("Helvetica", 8)
+    c.drawCentredString(ancho_pagina / 2, y, "*** GRACIAS POR SU VISITA ***")
+    y -= 3 * mm
+
+    c.setFont("Helvetica", 7)
+    c.drawCentredString(ancho_pagina / 2, y,
+                        "Sistema de Gestión de Restaurantes")
+    y -= 3 * mm
+
+    c.drawCentredString(ancho_pagina / 2, y, "www.mirestaurante.com")
+    y -= 5 * mm
+
+    # 9. CÓDIGO DE BARRAS (simulado para referencia)
+    c.setFont("Helvetica", 6)
+    c.drawCentredString(ancho_pagina / 2, y, "| | | | | | | | | | | | | | | |")
+    y -= 2 * mm
+    c.drawCentredString(ancho_pagina / 2, y,
+                        f"REF: {ahora_local.strftime('%Y%m%d%H%M')}")
+    y -= 3 * mm
+
+    # 10. NOTA IMPORTANTE
+    c.setFont("Helvetica", 6)
+    nota_texto = "Nota: Este reporte incluye ventas desde las 6:00 AM hasta las 5:59 AM del día siguiente."
+    # Dividir texto largo en líneas
+    max_chars_per_line = 45
+    lines = []
+    for i in range(0, len(nota_texto), max_chars_per_line):
+        lines.append(nota_texto[i:i+max_chars_per_line])
+
+    for line in lines:
+        c.drawCentredString(ancho_pagina / 2, y, line)
+        y -= 2.5 * mm
+
+    # Guardar el PDF
+    c.save()
+
+    # Obtener el valor del buffer y devolver como respuesta HTTP
+    buffer.seek(0)
+
+    # Configurar respuesta HTTP
+    response = HttpResponse(buffer, content_type='application/pdf')
+    filename = f"reporte_ventas_{ahora_local.strftime('%Y%m%d_%H%M')}.pdf"
+    response['Content-Disposition'] = f'inline; filename="{filename}"'
+    return response
+
+
+@login_required
+def productos_vendidos_dia(request):
+    """Vista para mostrar los productos vendidos en el día"""
+    # Obtener hora local actual
+    ahora_local = timezone.localtime()
+    hoy_local = ahora_local.date()
+
+    # DEFINICIÓN DEL "DÍA": De 6:00 AM a 5:59 AM del día siguiente
+    if ahora_local.hour >= 6:
+        inicio_dia = timezone.make_aware(
+            datetime.combine(hoy_local, datetime(2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(hoy_local + timedelta(days=1),
+                             datetime(2000, 1, 1, 5, 59, 59).time())
+        )
+    else:
+        inicio_dia = timezone.make_aware(
+            datetime.combine(hoy_local - timedelta(days=1),
+                             datetime(2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(hoy_local, datetime(2000, 1, 1, 5, 59, 59).time())
+        )
+
+    # Obtener facturas del período
+    facturas_hoy = Factura.objects.filter(
+        fecha_factura__gte=inicio_dia,
+        fecha_factura__lte=fin_dia,
+        estado='pagada'
+    )
+
+    # Obtener productos vendidos en el día
+    productos_vendidos = {}
+
+    for factura in facturas_hoy:
+        try:
+            items = factura.get_items_detalle()
+            if items and isinstance(items, list):
+                for item in items:
+                    nombre = item.get('name', '').strip()
+                    if not nombre:
+                        nombre = item.get('nombre', '').strip()
+
+                    if not nombre:
+                        continue
+
+                    cantidad = float(item.get('quantity', 0))
+                    if cantidad <= 0:
+                        continue
+
+                    precio = float(item.get('price', 0))
+
+                    if nombre in productos_vendidos:
+                        productos_vendidos[nombre]['cantidad'] += cantidad
+                        productos_vendidos[nombre]['ingresos'] += Decimal(
+                            str(cantidad * precio))
+                        # Actualizar precio unitario (promedio)
+                        productos_vendidos[nombre]['precio_unitario'] = productos_vendidos[nombre]['ingresos'] / Decimal(
+                            str(productos_vendidos[nombre]['cantidad']))
+                    else:
+                        productos_vendidos[nombre] = {
+                            'nombre': nombre,
+                            'cantidad': cantidad,
+                            'precio_unitario': Decimal(str(precio)),
+                            'ingresos': Decimal(str(cantidad * precio))
+                        }
+        except Exception as e:
+            logger_reportes.error('Error procesando items de factura %s: %s', factura.numero_factura, e)
+            continue
+
+    # Ordenar por cantidad descendente
+    productos_dia_detalle = sorted(
+        productos_vendidos.values(),
+        key=lambda x: x['cantidad'],
+        reverse=True
+    )
+
+    # Calcular totales
+    total_unidades = sum([p['cantidad'] for p in productos_dia_detalle])
+    total_ventas = sum([p['ingresos'] for p in productos_dia_detalle])
+
+    # Obtener venta del día
+    venta_dia = facturas_hoy.aggregate(total_dia=Sum('total'))[
+        'total_dia'] or Decimal('0.00')
+
+    context = {
+        'productos_dia_detalle': productos_dia_detalle,
+        'total_unidades': total_unidades,
+        'total_ventas': total_ventas,
+        'venta_dia': venta_dia,
+        'fecha_actual': ahora_local.strftime('%A, %d de %B de %Y'),
+        'hora_actual': ahora_local.strftime('%H:%M:%S'),
+        'rango_inicio': inicio_dia,
+        'rango_fin': fin_dia,
+        'facturas_hoy': facturas_hoy.count(),
+        'hoy': hoy_local,
+    }
+
+    return render(request, 'facturacion/productos_vendidos_dia.html', context)
+
+
+@login_required
+def reporte_productos_vendidos(request):
+    """Vista para mostrar reporte de productos vendidos"""
+    # Obtener parámetros de fecha
+    fecha_inicio = request.GET.get('fecha_inicio')
+    fecha_fin = request.GET.get('fecha_fin')
+
+    # Si no se especifican fechas, usar el día actual (de 6:00 a 5:59 del día siguiente)
+    if not fecha_inicio or not fecha_fin:
+        ahora_local = timezone.localtime()
+        hoy_local = ahora_local.date()
+
+        # DEFINICIÓN DEL "DÍA": De 6:00 AM a 5:59 AM del día siguiente
+        if ahora_local.hour >= 6:
+            fecha_inicio = hoy_local
+            fecha_fin = hoy_local + timedelta(days=1)
+        else:
+            fecha_inicio = hoy_local - timedelta(days=1)
+            fecha_fin = hoy_local
+
+    # Convertir fechas string a objetos date
+    try:
+        fecha_inicio_obj = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
+        fecha_fin_obj = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
+
+        # Ajustar horas para el período (6:00 AM a 5:59 AM del día siguiente)
+        inicio_dia = timezone.make_aware(
+            datetime.combine(fecha_inicio_obj, datetime(
+                2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(fecha_fin_obj, datetime(
+                2000, 1, 1, 5, 59, 59).time())
+        )
+
+    except (ValueError, TypeError):
+        # Si hay error en el formato, usar día actual
+        ahora_local = timezone.localtime()
+        hoy_local = ahora_local.date()
+
+        if ahora_local.hour >= 6:
+            fecha_inicio_obj = hoy_local
+            fecha_fin_obj = hoy_local + timedelta(days=1)
+        else:
+            fecha_inicio_obj = hoy_local - timedelta(days=1)
+            fecha_fin_obj = hoy_local
+
+        inicio_dia = timezone.make_aware(
+            datetime.combine(fecha_inicio_obj, datetime(
+                2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(fecha_fin_obj, datetime(
+                2000, 1, 1, 5, 59, 59).time())
+        )
+
+    # CONSULTA 1: Obtener productos vendidos directamente desde las facturas
+    facturas = Factura.objects.filter(
+        fecha_factura__gte=inicio_dia,
+        fecha_factura__lte=fin_dia,
+        estado='pagada'
+    )
+
+    productos_vendidos = {}
+
+    for factura in facturas:
+        items = factura.get_items_detalle()
+
+        for item in items:
+            nombre = item.get('nombre', '').strip()
+            if not nombre:
+                continue
+
+            cantidad = float(item.get('cantidad', 0))
+            if cantidad <= 0:
+                continue
+
+            precio = float(item.get('precio', 0))
+
+            # Buscar producto en la base de datos por nombre o código
+            producto_db = None
+            producto_id = item.get('producto_id')
+            codigo = item.get('codigo', '')
+
+            if producto_id:
+                try:
+                    producto_db = Producto.objects.filter(
+                        id=producto_id).first()
+                except:
+                    pass
+
+            if not producto_db and codigo:
+                try:
+                    producto_db = Producto.objects.filter(
+                        codigo=codigo).first()
+                except:
+                    pass
+
+            if not producto_db and nombre:
+                try:
+                    producto_db = Producto.objects.filter(
+                        Q(nombre__iexact=nombre) |
+                        Q(nombre__icontains=nombre)
+                    ).first()
+                except:
+                    pass
+
+            # Agregar a productos vendidos
+            if nombre in productos_vendidos:
+                productos_vendidos[nombre]['cantidad'] += cantidad
+                productos_vendidos[nombre]['ingresos'] += Decimal(
+                    str(cantidad * precio))
+                productos_vendidos[nombre]['precio_unitario'] = productos_vendidos[nombre]['ingresos'] / \
+                    Decimal(str(productos_vendidos[nombre]['cantidad']))
+                productos_vendidos[nombre]['facturas'].add(
+                    factura.numero_factura)
+            else:
+                productos_vendidos[nombre] = {
+                    'nombre': nombre,
+                    'cantidad': cantidad,
+                    'precio_unitario': Decimal(str(precio)),
+                    'ingresos': Decimal(str(cantidad * precio)),
+                    'producto_db': producto_db,
+                    'categoria': item.get('categoria', 'otro'),
+                    'codigo': codigo,
+                    'facturas': set([factura.numero_factura])
+                }
+
+    # CONSULTA 2: Obtener productos más vendidos por categoría
+    productos_por_categoria = {}
+    for nombre, datos in productos_vendidos.items():
+        categoria = datos['categoria']
+        if categoria not in productos_por_categoria:
+            productos_por_categoria[categoria] = []
+
+        productos_por_categoria[categoria].append({
+            'nombre': nombre,
+            'cantidad': datos['cantidad'],
+            'precio_unitario': datos['precio_unitario'],
+            'ingresos': datos['ingresos']
+        })
+
+    # Ordenar por cantidad descendente en cada categoría
+    for categoria in productos_por_categoria:
+        productos_por_categoria[categoria].sort(
+            key=lambda x: x['cantidad'], reverse=True)
+
+    # CONSULTA 3: Totales generales
+    total_unidades = sum([p['cantidad'] for p in productos_vendidos.values()])
+    total_ventas = sum([p['ingresos'] for p in productos_vendidos.values()])
+
+    # CONSULTA 4: Productos que no se han vendido (en stock)
+    productos_stock = Producto.objects.all()
+    productos_no_vendidos = []
+    for producto in productos_stock:
+        if producto.nombre not in productos_vendidos:
+            productos_no_vendidos.append({
+                'nombre': producto.nombre,
+                'codigo': producto.codigo,
+                'categoria': producto.get_category_label(),
+                'stock': producto.cantidad,
+                'precio_compra': producto.precio_compra,
+                'subtotal': producto.subtotal
+            })
+
+    # Ordenar productos vendidos por cantidad
+    productos_dia_detalle = sorted(
+        productos_vendidos.values(),
+        key=lambda x: x['cantidad'],
+        reverse=True
+    )
+
+    # Convertir set de facturas a lista
+    for producto in productos_dia_detalle:
+        producto['facturas'] = list(producto['facturas'])
+        producto['num_facturas'] = len(producto['facturas'])
+
+    # Preparar datos para el template
+    context = {
+        'productos': productos_dia_detalle,
+        'productos_por_categoria': productos_por_categoria,
+        'productos_no_vendidos': productos_no_vendidos,
+        'total_unidades': total_unidades,
+        'total_ventas': total_ventas,
+        'fecha_inicio': fecha_inicio_obj.strftime('%Y-%m-%d'),
+        'fecha_fin': fecha_fin_obj.strftime('%Y-%m-%d'),
+        'periodo_texto': f"{fecha_inicio_obj.strftime('%d/%m/%Y')} 06:00 - {fecha_fin_obj.strftime('%d/%m/%Y')} 05:59",
+        'num_facturas': facturas.count(),
+        'venta_total_dia': facturas.aggregate(total_dia=Sum('total'))['total_dia'] or Decimal('0.00'),
+        'num_productos_distintos': len(productos_dia_detalle),
+    }
+
+    return render(request, 'reportes/productos_vendidos.html', context)
+
+
+@login_required
+def reporte_productos_vendidos_json(request):
+    """API para obtener productos vendidos en formato JSON"""
+    # Parámetros
+    fecha_inicio = request.GET.get('fecha_inicio')
+    fecha_fin = request.GET.get('fecha_fin')
+    categoria = request.GET.get('categoria')
+    limite = int(request.GET.get('limite', 50))
+
+    # Configurar fechas
+    if not fecha_inicio or not fecha_fin:
+        ahora_local = timezone.localtime()
+        hoy_local = ahora_local.date()
+
+        if ahora_local.hour >= 6:
+            fecha_inicio_obj = hoy_local
+            fecha_fin_obj = hoy_local + timedelta(days=1)
+        else:
+            fecha_inicio_obj = hoy_local - timedelta(days=1)
+            fecha_fin_obj = hoy_local
+    else:
+        fecha_inicio_obj = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
+        fecha_fin_obj = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
+
+    # Ajustar horas para el período
+    inicio_dia = timezone.make_aware(
+        datetime.combine(fecha_inicio_obj, datetime(
+            2000, 1, 1, 6, 0, 0).time())
+    )
+    fin_dia = timezone.make_aware(
+        datetime.combine(fecha_fin_obj, datetime(2000, 1, 1, 5, 59, 59).time())
+    )
+
+    # Obtener facturas
+    facturas = Factura.objects.filter(
+        fecha_factura__gte=inicio_dia,
+        fecha_factura__lte=fin_dia,
+        estado='pagada'
+    )
+
+    # Procesar productos vendidos
+    productos_vendidos = {}
+
+    for factura in facturas:
+        items = factura.get_items_detalle()
+
+        for item in items:
+            nombre = item.get('nombre', '').strip()
+            if not nombre:
+                continue
+
+            # Filtrar por categoría si se especifica
+            item_categoria = item.get('categoria', 'otro').lower()
+            if categoria and categoria != 'todas' and item_categoria != categoria:
+                continue
+
+            cantidad = float(item.get('cantidad', 0))
+            if cantidad <= 0:
+                continue
+
+            precio = float(item.get('precio', 0))
+
+            if nombre in productos_vendidos:
+                productos_vendidos[nombre]['cantidad'] += cantidad
+                productos_vendidos[nombre]['ingresos'] += Decimal(
+                    str(cantidad * precio))
+                productos_vendidos[nombre]['precio_unitario'] = productos_vendidos[nombre]['ingresos'] / \
+                    Decimal(str(productos_vendidos[nombre]['cantidad']))
+            else:
+                productos_vendidos[nombre] = {
+                    'nombre': nombre,
+                    'cantidad': cantidad,
+                    'precio_unitario': Decimal(str(precio)),
+                    'ingresos': Decimal(str(cantidad * precio)),
+                    'categoria': item_categoria,
+                    'codigo': item.get('codigo', '')
+                }
+
+    # Ordenar y limitar
+    productos_lista = sorted(
+        productos_vendidos.values(),
+        key=lambda x: x['cantidad'],
+        reverse=True
+    )[:limite]
+
+    # Calcular totales
+    total_unidades = sum([p['cantidad'] for p in productos_lista])
+    total_ventas = sum([p['ingresos'] for p in productos_lista])
+
+    # Preparar respuesta JSON
+    response_data = {
+        'success': True,
+        'data': {
+            'productos': productos_lista,
+            'totales': {
+                'unidades_vendidas': total_unidades,
+                'venta_total': float(total_ventas),
+                'num_productos': len(productos_lista)
+            },
+            'periodo': {
+                'inicio': inicio_dia.strftime('%Y-%m-%d %H:%M:%S'),
+                'fin': fin_dia.strftime('%Y-%m-%d %H:%M:%S'),
+                'texto': f"{fecha_inicio_obj.strftime('%d/%m/%Y')} 06:00 - {fecha_fin_obj.strftime('%d/%m/%Y')} 05:59"
+            },
+            'filtros': {
+                'categoria': categoria or 'todas',
+                'limite': limite
+            }
+        }
+    }
+
+    return JsonResponse(response_data)
+
+
+@login_required
+def detalle_producto_vendido(request, producto_nombre):
+    """Vista para ver el detalle de ventas de un producto específico"""
+    # Obtener parámetros de fecha
+    fecha_inicio = request.GET.get('fecha_inicio')
+    fecha_fin = request.GET.get('fecha_fin')
+
+    # Configurar fechas por defecto (últimos 30 días)
+    if not fecha_inicio or not fecha_fin:
+        fecha_fin_obj = timezone.localtime().date()
+        fecha_inicio_obj = fecha_fin_obj - timedelta(days=30)
+    else:
+        fecha_inicio_obj = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
+        fecha_fin_obj = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
+
+    # Ajustar horas para el período
+    inicio_dia = timezone.make_aware(
+        datetime.combine(fecha_inicio_obj, datetime(
+            2000, 1, 1, 6, 0, 0).time())
+    )
+    fin_dia = timezone.make_aware(
+        datetime.combine(fecha_fin_obj, datetime(2000, 1, 1, 5, 59, 59).time())
+    )
+
+    # Obtener todas las facturas en el período
+    facturas = Factura.objects.filter(
+        fecha_factura__gte=inicio_dia,
+        fecha_factura__lte=fin_dia,
+        estado='pagada'
+    )
+
+    # Buscar producto en la base de datos
+    producto_db = None
+    try:
+        producto_db = Producto.objects.filter(
+            Q(nombre__iexact=producto_nombre) |
+            Q(nombre__icontains=producto_nombre) |
+            Q(codigo__iexact=producto_nombre)
+        ).first()
+    except:
+        pass
+
+    # Recolectar todas las ventas de este producto
+    ventas_producto = []
+    total_cantidad = Decimal('0.00')
+    total_ingresos = Decimal('0.00')
+
+    for factura in facturas:
+        items = factura.get_items_detalle()
+
+        for item in items:
+            nombre_item = item.get('nombre', '').strip()
+            # Buscar coincidencias (exacta o parcial)
+            if (producto_nombre.lower() in nombre_item.lower() or
+                nombre_item.lower() in producto_nombre.lower() or
+                    (producto_db and producto_db.nombre.lower() in nombre_item.lower())):
+
+                cantidad = Decimal(str(item.get('cantidad', 0)))
+                precio = Decimal(str(item.get('precio', 0)))
+                subtotal = cantidad * precio
+
+                ventas_producto.append({
+                    'factura': factura.numero_factura,
+                    'fecha': factura.fecha_factura,
+                    'cantidad': cantidad,
+                    'precio_unitario': precio,
+                    'subtotal': subtotal,
+                    'cliente': factura.nombre_cliente or 'Sin nombre',
+                    'metodo_pago': factura.get_metodo_pago_display(),
+                    'tipo_pedido': factura.tipo_pedido
+                })
+
+                total_cantidad += cantidad
+                total_ingresos += subtotal
+
+    # Ordenar por fecha
+    ventas_producto.sort(key=lambda x: x['fecha'], reverse=True)
+
+    # Calcular estadísticas
+    if ventas_producto:
+        precios = [v['precio_unitario'] for v in ventas_producto]
+        precio_promedio = sum(precios) / len(precios)
+        precio_min = min(precios)
+        precio_max = max(precios)
+    else:
+        precio_promedio = Decimal('0.00')
+        precio_min = Decimal('0.00')
+        precio_max = Decimal('0.00')
+
+    context = {
+        'producto_nombre': producto_nombre,
+        'producto_db': producto_db,
+        'ventas': ventas_producto,
+        'total_cantidad': total_cantidad,
+        'total_ingresos': total_ingresos,
+        'precio_promedio': precio_promedio,
+        'precio_min': precio_min,
+        'precio_max': precio_max,
+        'num_ventas': len(ventas_producto),
+        'fecha_inicio': fecha_inicio_obj,
+        'fecha_fin': fecha_fin_obj,
+        'periodo_dias': (fecha_fin_obj - fecha_inicio_obj).days,
+    }
+
+    return render(request, 'reportes/detalle_producto.html', context)
+
+
+@login_required
+def generar_reporte_productos_excel(request):
+    """Generar reporte de productos vendidos en formato Excel/CSV"""
+    # Obtener parámetros de fecha
+    fecha_inicio = request.GET.get('fecha_inicio')
+    fecha_fin = request.GET.get('fecha_fin')
+
+    # Configurar fechas
+    if not fecha_inicio or not fecha_fin:
+        ahora_local = timezone.localtime()
+        hoy_local = ahora_local.date()
+
+        if ahora_local.hour >= 6:
+            fecha_inicio_obj = hoy_local
+            fecha_fin_obj = hoy_local + timedelta(days=1)
+        else:
+            fecha_inicio_obj = hoy_local - timedelta(days=1)
+            fecha_fin_obj = hoy_local
+    else:
+        fecha_inicio_obj = datetime.strptime(fecha_inicio, '%Y-%m-%d').date()
+        fecha_fin_obj = datetime.strptime(fecha_fin, '%Y-%m-%d').date()
+
+    # Ajustar horas para el período
+    inicio_dia = timezone.make_aware(
+        datetime.combine(fecha_inicio_obj, datetime(
+            2000, 1, 1, 6, 0, 0).time())
+    )
+    fin_dia = timezone.make_aware(
+        datetime.combine(fecha_fin_obj, datetime(2000, 1, 1, 5, 59, 59).time())
+    )
+
+    # Obtener facturas
+    facturas = Factura.objects.filter(
+        fecha_factura__gte=inicio_dia,
+        fecha_factura__lte=fin_dia,
+        estado='pagada'
+    )
+
+    # Procesar productos vendidos
+    productos_vendidos = {}
+
+    for factura in facturas:
+        items = factura.get_items_detalle()
+
+        for item in items:
+            nombre = item.get('nombre', '').strip()
+            if not nombre:
+                continue
+
+            cantidad = float(item.get('cantidad', 0))
+            if cantidad <= 0:
+                continue
+
+            precio = float(item.get('precio', 0))
+
+            if nombre in productos_vendidos:
+                productos_vendidos[nombre]['cantidad'] += cantidad
+                productos_vendidos[nombre]['ingresos'] += Decimal(
+                    str(cantidad * precio))
+                productos_vendidos[nombre]['precio_unitario'] = productos_vendidos[nombre]['ingresos'] / \
+                    Decimal(str(productos_vendidos[nombre]['cantidad']))
+                productos_vendidos[nombre]['facturas'].add(
+                    factura.numero_factura)
+            else:
+                productos_vendidos[nombre] = {
+                    'nombre': nombre,
+                    'cantidad': cantidad,
+                    'precio_unitario': Decimal(str(precio)),
+                    'ingresos': Decimal(str(cantidad * precio)),
+                    'categoria': item.get('categoria', 'otro'),
+                    'codigo': item.get('codigo', ''),
+                    'facturas': set([factura.numero_factura])
+                }
+
+    # Ordenar por cantidad
+    productos_lista = sorted(
+        productos_vendidos.values(),
+        key=lambda x: x['cantidad'],
+        reverse=True
+    )
+
+    # Convertir set de facturas a string
+    for producto in productos_lista:
+        producto['facturas'] = ', '.join(list(producto['facturas'])[
+                                         :5])  # Limitar a 5 facturas
+        if len(producto['facturas']) > 50:  # Si es muy largo, truncar
+            producto['facturas'] = producto['facturas'][:50] + '...'
+
+    # Crear CSV
+    import csv
+
+    response = HttpResponse(content_type='text/csv')
+    filename = f"productos_vendidos_{fecha_inicio_obj.strftime('%Y%m%d')}_{fecha_fin_obj.strftime('%Y%m%d')}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+    writer = csv.writer(response)
+
+    # Escribir encabezados
+    writer.writerow(['REPORTE DE PRODUCTOS VENDIDOS'])
+    writer.writerow(
+        [f'Período: {fecha_inicio_obj.strftime("%d/%m/%Y")} 06:00 - {fecha_fin_obj.strftime("%d/%m/%Y")} 05:59'])
+    writer.writerow(
+        [f'Generado: {timezone.localtime().strftime("%d/%m/%Y %H:%M:%S")}'])
+    writer.writerow([])
+
+    # Escribir encabezados de datos
+    writer.writerow(['#', 'PRODUCTO', 'CÓDIGO', 'CATEGORÍA',
+                    'CANTIDAD', 'PRECIO UNITARIO', 'INGRESOS', 'FACTURAS'])
+
+    # Escribir datos
+    for i, producto in enumerate(productos_lista, 1):
+        writer.writerow([
+            i,
+            producto['nombre'][:50],  # Limitar a 50 caracteres
+            producto['codigo'],
+            producto['categoria'],
+            f"{producto['cantidad']:,.2f}",
+            f"${producto['precio_unitario']:,.2f}",
+            f"${producto['ingresos']:,.2f}",
+            producto['facturas']
+        ])
+
+    # Totales
+    writer.writerow([])
+    total_unidades = sum([p['cantidad'] for p in productos_lista])
+    total_ventas = sum([p['ingresos'] for p in productos_lista])
+
+    writer.writerow(['TOTALES:', '', '', '',
+                    f'{total_unidades:,.2f}', '', f'${total_ventas:,.2f}', ''])
+    writer.writerow(['TOTAL FACTURAS:', '', '', '',
+                    facturas.count(), '', '', ''])
+
+    return response
+
+
+@login_required
+def generar_pdf_productos_dia_a4(request):
+    """Generar PDF de productos vendidos en el día en formato A4"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+    # Obtener hora local actual
+    ahora_local = timezone.localtime()
+    hoy_local = ahora_local.date()
+
+    # DEFINICIÓN DEL "DÍA": De 6:00 AM a 5:59 AM del día siguiente
+    if ahora_local.hour >= 6:
+        inicio_dia = timezone.make_aware(
+            datetime.combine(hoy_local, datetime(2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(hoy_local + timedelta(days=1),
+                             datetime(2000, 1, 1, 5, 59, 59).time())
+        )
+        periodo_texto = f"{hoy_local.strftime('%d/%m/%Y')} 06:00 - {(hoy_local + timedelta(days=1)).strftime('%d/%m/%Y')} 05:59"
+        periodo_corto = f"{hoy_local.strftime('%d/%m')} 06:00 a {(hoy_local + timedelta(days=1)).strftime('%d/%m')} 06:00"
+    else:
+        inicio_dia = timezone.make_aware(
+            datetime.combine(hoy_local - timedelta(days=1),
+                             datetime(2000, 1, 1, 6, 0, 0).time())
+        )
+        fin_dia = timezone.make_aware(
+            datetime.combine(hoy_local, datetime(2000, 1, 1, 5, 59, 59).time())
+        )
+        periodo_texto = f"{(hoy_local - timedelta(days=1)).strftime('%d/%m/%Y')} 06:00 - {hoy_local.strftime('%d/%m/%Y')} 05:59"
+        periodo_corto = f"{(hoy_local - timedelta(days=1)).strftime('%d/%m')} 06:00 a {hoy_local.strftime('%d/%m')} 06:00"
+
+    # Obtener facturas del período
+    facturas_hoy = Factura.objects.filter(
+        fecha_factura__gte=inicio_dia,
+        fecha_factura__lte=fin_dia,
+        estado='pagada'
+    )
+
+    venta_dia = facturas_hoy.aggregate(total_dia=Sum('total'))[
+        'total_dia'] or Decimal('0.00')
+
+    logger_reportes.debug('🔍 DEBUG: Encontradas %s facturas en el período', facturas_hoy.count())
+    logger_reportes.debug('🔍 DEBUG: Venta total del día: $%s', venta_dia)
+
+    # Obtener productos vendidos en el día
+    productos_vendidos = {}
+
+    for factura in facturas_hoy:
+        try:
+            items = factura.get_items_detalle()
+            logger_reportes.debug('🔍 DEBUG: Factura %s tiene %s items', factura.numero_factura, len(items))
+
+            if items and isinstance(items, list):
+                for item in items:
+                    # DEBUG: Imprimir todas las claves del item
+                    logger_reportes.debug('📦 Item keys: %s', item.keys())
+
+                    # Obtener nombre del producto - probar todas las posibles claves
+                    nombre = item.get('nombre', '').strip()
+                    if not nombre:
+                        nombre = item.get('name', '').strip()
+                    if not nombre:
+                        nombre = item.get('producto', '').strip()
+                    if not nombre:
+                        nombre = item.get('product', '').strip()
+
+                    logger_reportes.debug("🔍 Nombre encontrado: '%s'", nombre)
+
+                    if not nombre or nombre.lower() == 'desconocido':
+                        logger_reportes.warning("⚠️  Nombre vacío o 'Desconocido', saltando...")
+                        continue
+
+                    # Obtener cantidad - probar todas las posibles claves
+                    cantidad = 0
+                    cantidad_keys = ['cantidad', 'quantity', 'qty']
+                    for key in cantidad_keys:
+                        if key in item:
+                            try:
+                                cantidad = float(item[key])
+                                logger_reportes.debug("🔍 Cantidad de '%s': %s", key, cantidad)
+                                break
+                            except (ValueError, TypeError):
+                                pass
+
+                    if cantidad <= 0:
+                        logger_reportes.warning('⚠️  Cantidad inválida (%s), saltando...', cantidad)
+                        continue
+
+                    # Obtener precio - probar todas las posibles claves
+                    precio = 0
+                    precio_keys = ['precio', 'price', 'unit_price']
+                    for key in precio_keys:
+                        if key in item:
+                            try:
+                                precio = float(item[key])
+                                logger_reportes.debug("🔍 Precio de '%s': %s", key, precio)
+                                break
+                            except (ValueError, TypeError):
+                                pass
+
+                    # Calcular ingresos
+                    ingresos = Decimal(str(cantidad * precio))
+
+                    logger_reportes.debug('✅ Procesado: %s x%s = $%s', nombre, cantidad, ingresos)
+
+                    if nombre in productos_vendidos:
+                        productos_vendidos[nombre]['cantidad'] += cantidad
+                        productos_vendidos[nombre]['ingresos'] += ingresos
+                        productos_vendidos[nombre]['precio_unitario'] = productos_vendidos[nombre]['ingresos'] / Decimal(
+                            str(productos_vendidos[nombre]['cantidad']))
+                    else:
+                        productos_vendidos[nombre] = {
+                            'nombre': nombre,
+                            'cantidad': cantidad,
+                            'precio_unitario': Decimal(str(precio)),
+                            'ingresos': ingresos
+                        }
+            else:
+                logger_reportes.warning(
+                    '⚠️  Factura %s no tiene items o no es una lista',
+                    factura.numero_factura)
+
+        except Exception as e:
+            logger_reportes.error('❌ ERROR procesando items de factura %s: %s', factura.numero_factura, e, exc_info=True)
+            continue
+
+    logger_reportes.debug('🔍 DEBUG: Total productos encontrados: %s', len(productos_vendidos))
+
+    # Ordenar por cantidad descendente
+    productos_dia_detalle = sorted(
+        productos_vendidos.values(),
+        key=lambda x: x['cantidad'],
+        reverse=True
+    )
+
+    # Calcular totales
+    total_unidades = sum([p['cantidad'] for p in productos_dia_detalle])
+    total_ventas = sum([p['ingresos'] for p in productos_dia_detalle])
+
+    logger_reportes.debug('🔍 DEBUG: Total unidades: %s', total_unidades)
+    logger_reportes.debug('🔍 DEBUG: Total ventas productos: $%s', total_ventas)
+
+    # Crear un buffer para el PDF
+    buffer = io.BytesIO()
+
+    # Configurar el tamaño de la página para A4
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=20*mm,
+        leftMargin=20*mm,
+        topMargin=20*mm,
+        bottomMargin=20*mm
+    )
+
+    # Estilos
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        alignment=1,  # Centrado
+        spaceAfter=12
+    )
+
+    subtitle_style = ParagraphStyle(
+        'CustomSubtitle',
+        parent=styles['Heading2'],
+        fontSize=12,
+        alignment=1,
+        spaceAfter=6
+    )
+
+    normal_style = styles['Normal']
+
+    # Contenido del documento
+    story = []
+
+    # 1. LOGO ENCIMA DEL TÍTULO
+    try:
+        # Buscar el logo en diferentes ubicaciones posibles
+        posibles_rutas = [
+            os.path.join(settings.STATIC_ROOT or settings.BASE_DIR,
+                         'static', 'img', 'fastfood.png'),
+            os.path.join(settings.BASE_DIR, 'static', 'img', 'fastfood.png'),
+            os.path.join(settings.STATIC_ROOT or settings.BASE_DIR,
+                         'img', 'fastfood.png'),
+            os.path.join(settings.BASE_DIR, 'img', 'fastfood.png'),
+            os.path.join(
+                settings.STATIC_ROOT or settings.BASE_DIR, 'fastfood.png'),
+        ]
+
+        logo_encontrado = False
+        logo_path = None
+
+        for ruta in posibles_rutas:
+            if os.path.exists(ruta):
+                logo_path = ruta
+                logo_encontrado = True
+                logger_reportes.debug('✅ Logo encontrado en: %s', ruta)
+                break
+
+        if logo_encontrado and logo_path:
+            # Crear una tabla de una celda para centrar el logo
+            logo = Image(logo_path, width=30*mm, height=30*mm)
+            # Ancho completo de la página
+            logo_table = Table([[logo]], colWidths=[doc.width])
+            logo_table.setStyle(TableStyle([
+                ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+                ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+                ('BOTTOMPADDING', (0, 0), (0, 0), 5),
+            ]))
+            story.append(logo_table)
+            story.append(Spacer(1, 5))
+        else:
+            logger_reportes.warning('⚠️ Logo no encontrado. Se mostrará sin logo.')
+
+    except Exception as e:
+        logger_reportes.error('❌ Error al cargar el logo: %s', e)
+        # Continuar sin logo si hay error
+
+    # 2. TÍTULOS DESPUÉS DEL LOGO
+    story.append(Paragraph("404 FASTFOOD", title_style))
+    story.append(Paragraph("REPORTE DE PRODUCTOS VENDIDOS", subtitle_style))
+    story.append(Paragraph(f"Período: {periodo_corto}", normal_style))
+    story.append(
+        Paragraph("(De 6:00 AM a 5:59 AM del día siguiente)", normal_style))
+    story.append(Spacer(1, 15))
+
+    # Información del reporte
+    info_data = [
+        ["Fecha De Generación:", ahora_local.strftime('%d/%m/%Y %I:%M:%S')],
+        ["Período Del Reporte:", periodo_texto],
+        ["Total De Facturas:", str(facturas_hoy.count())],
+        ["Venta Total Del Día:", f"RD$ {venta_dia:,.2f}"],
+        ["Total De Productos Distintos:", str(len(productos_dia_detalle))],
+        ["Total de Undidades Vendidas:", f"{total_unidades:,.2f}"],
+    ]
+
+    info_table = Table(info_data, colWidths=[200, 240])
+    info_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ]))
+    story.append(info_table)
+    story.append(Spacer(1, 20))
+
+    # Tabla de productos vendidos
+    if productos_dia_detalle:
+        # Encabezados de la tabla
+        encabezados = ['#', 'PRODUCTO', 'CANTIDAD',
+                       'P. UNITARIO RD$', 'TOTAL RD$']
+
+        # Datos de la tabla
+        datos = [encabezados]
+        for i, producto in enumerate(productos_dia_detalle, 1):
+            datos.append([
+                str(i),
+                producto['nombre'][:50],  # Limitar a 50 caracteres
+                f"{producto['cantidad']:,.2f}",
+                f"{producto['precio_unitario']:,.2f}",
+                f"{producto['ingresos']:,.2f}"
+            ])
+
+        # Crear tabla
+        tabla = Table(datos, colWidths=[30, 230, 60, 95, 90])
+        tabla.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4CAF50')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+            # Estilo para filas de datos
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Columna #
+            # Columnas numéricas alineadas a la derecha
+            ('ALIGN', (2, 1), (4, -1), 'RIGHT'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1),
+             [colors.white, colors.HexColor('#f9f9f9')]),
+        ]))
+
+        story.append(tabla)
+        story.append(Spacer(1, 20))
+
+    # Pie de página
+    story.append(
+        Paragraph("*** SISTEMA DE GESTIÓN DE RESTAURANTES ***", normal_style))
+    story.append(Paragraph("Reporte generado automáticamente", normal_style))
+    story.append(
+        Paragraph("404 FASTFOOD - Todos los derechos reservados", normal_style))
+
+    # Construir el PDF
+    doc.build(story)
+
+    # Obtener el valor del buffer
+    pdf = buffer.getvalue()
+    buffer.close()
+
+    # Configurar respuesta HTTP
+    response = HttpResponse(content_type='application/pdf')
+    filename = f"productos_vendidos_{ahora_local.strftime('%Y%m%d_%H%M')}.pdf"
+    response['Content-Disposition'] = f'inline; filename="{filename}"'
+    response.write(pdf)
+
+    return response
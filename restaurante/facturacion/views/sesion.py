@@ -0,0 +1,45 @@
+"""Inicio y cierre de sesión."""
+from django.contrib import messages
+from django.contrib.auth import authenticate, login, logout
+from django.shortcuts import redirect, render
+from django.views.decorators.csrf import csrf_exempt
+
+
+@csrf_exempt
+def index(request):
+    """
+    Vista principal que maneja tanto el login como el dashboard
+    """
+    if request.user.is_authenticated:
+        return render(request, 'facturacion/index.html')
+
+    if request.method == 'POST':
+        username = request.POST.get('username')
+        password = request.POST.get('password')
+        remember_me = request.POST.get('remember') == 'on'
+
+        user = authenticate(request, username=username, password=password)
+
+        if user is not None:
+            login(request, user)
+
+            if not remember_me:
+                request.session.set_expiry(0)
+            else:
+                request.session.set_expiry(1209600)
+
+            messages.success(request, f'¡Bienvenido {user.username}!')
+            return redirect('index')
+        else:
+            messages.error(request, 'Usuario o contraseña incorrectos')
+
+    return render(request, 'facturacion/index.html')
+
+
+def logout_view(request):
+    """
+    Cierra la sesión del usuario y redirige al index (login)
+    """
+    logout(request)
+    messages.success(request, 'Has cerrado sesión correctamente')
+    return redirect('index')
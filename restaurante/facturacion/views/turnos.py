@@ -0,0 +1,225 @@
+"""Turnos de caja (apertura, cierre y cuadre)."""
+import io
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+
+from ..caja import ErrorCaja, abrir_turno, cerrar_turno, turno_para
+from ..models import TurnoCaja
+
+
+def _turno_json(turno):
+    """Datos de un turno para las respuestas JSON"""
+    return {
+        'id': turno.id,
+        'caja': turno.caja,
+        'estado': turno.estado,
+        'abierto_por': turno.abierto_por.username,
+        'fecha_apertura': turno.fecha_apertura.isoformat(),
+        'monto_inicial': float(turno.monto_inicial),
+        'cantidad_facturas': turno.cantidad_facturas,
+        'total_ventas': float(turno.total_ventas),
+        'cantidad_devoluciones': turno.cantidad_devoluciones,
+        'total_devoluciones': float(turno.total_devoluciones),
+        'cantidad_abonos': turno.cantidad_abonos,
+        'total_abonos': float(turno.total_abonos),
+    }
+
+
+def _leer_monto(valor):
+    """Convertir un monto del formulario/JSON a Decimal (None si viene vacío)"""
+    if valor in (None, ''):
+        return None
+    monto = Decimal(str(valor))
+    if monto < 0:
+        raise InvalidOperation
+    return monto
+
+
+@login_required
+@require_POST
+def abrir_turno_caja(request):
+    """Abrir un turno en una caja. Cuerpo JSON: {"caja": "principal", "monto_inicial": 1000}"""
+    try:
+        data = json.loads(request.body) if request.body else {}
+        monto_inicial = _leer_monto(data.get('monto_inicial')) or Decimal('0.00')
+    except (json.JSONDecodeError, InvalidOperation):
+        return JsonResponse({'success': False, 'message': 'Datos inválidos'}, status=400)
+
+    caja = str(data.get('caja') or 'principal').strip()[:30]
+    try:
+        turno = abrir_turno(caja, request.user, monto_inicial)
+    except ErrorCaja as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=409)
+
+    return JsonResponse({
+        'success': True,
+        'message': f'Turno abierto en caja {turno.caja}',
+        'turno': _turno_json(turno),
+    })
+
+
+@login_required
+def turno_caja_actual(request):
+    """Totales corrientes del turno abierto del usuario (?caja= con varias cajas abiertas)"""
+    try:
+        turno = turno_para(request.user, request.GET.get('caja'))
+    except ErrorCaja as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=409)
+    if not turno:
+        return JsonResponse({'success': True, 'turno': None})
+
+    datos = _turno_json(turno)
+    datos['totales'] = [
+        {
+            'metodo_pago': total['metodo_pago'],
+            'usuario': total['usuario__username'],
+            'cantidad_facturas': total['cantidad_facturas'],
+            'total_ventas': float(total['total_ventas']),
+            'cantidad_devoluciones': total['cantidad_devoluciones'],
+            'total_devoluciones': float(total['total_devoluciones']),
+            'cantidad_abonos': total['cantidad_abonos'],
+            'total_abonos': float(total['total_abonos']),
+        }
+        for total in turno.totales.values(
+            'metodo_pago', 'usuario__username', 'cantidad_facturas', 'total_ventas',
+            'cantidad_devoluciones', 'total_devoluciones', 'cantidad_abonos', 'total_abonos',
+        )
+    ]
+    return JsonResponse({'success': True, 'turno': datos})
+
+
+@login_required
+@require_POST
+def cerrar_turno_caja(request, turno_id):
+    """Cerrar un turno y congelar su cuadre. Cuerpo JSON: {"efectivo_contado": 5230.50}"""
+    try:
+        data = json.loads(request.body) if request.body else {}
+        efectivo_contado = _leer_monto(data.get('efectivo_contado'))
+    except (json.JSONDecodeError, InvalidOperation):
+        return JsonResponse({'success': False, 'message': 'Datos inválidos'}, status=400)
+
+    try:
+        turno = cerrar_turno(turno_id, request.user, efectivo_contado)
+    except TurnoCaja.DoesNotExist:
+        return JsonResponse({'success': False, 'message': 'Turno no encontrado'}, status=404)
+    except ErrorCaja as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=409)
+
+    return JsonResponse({
+        'success': True,
+        'message': f'Turno {turno.id} cerrado',
+        'resumen': turno.resumen,
+        'pdf_url': reverse('pdf_cuadre_turno', args=[turno.id]),
+    })
+
+
+@login_required
+def pdf_cuadre_turno(request, turno_id):
+    """PDF 80mm del cuadre de un turno cerrado, generado solo desde su resumen congelado"""
+    from reportlab.lib.units import mm
+    from reportlab.pdfgen import canvas
+    import pytz
+    tz_rd = pytz.timezone('America/Santo_Domingo')
+
+    turno = get_object_or_404(TurnoCaja.objects.only('id', 'estado', 'resumen'), id=turno_id)
+    if turno.estado != 'cerrado':
+        return JsonResponse({'success': False, 'message': 'El turno aún está abierto'}, status=409)
+    resumen = turno.resumen
+
+    def hora_local(iso):
+        return datetime.fromisoformat(iso).astimezone(tz_rd)
+
+    def dinero(valor):
+        return f"${Decimal(valor):,.2f}"
+
+    buffer = io.BytesIO()
+    ancho_pagina = 80 * mm
+    alto_pagina = 297 * mm
+    c = canvas.Canvas(buffer, pagesize=(ancho_pagina, alto_pagina))
+    y = alto_pagina - 10 * mm
+
+    def fila(etiqueta, valor, negrita=False):
+        nonlocal y
+        if y < 15 * mm:
+            c.showPage()
+            y = alto_pagina - 10 * mm
+        c.setFont("Helvetica-Bold" if negrita else "Helvetica", 8)
+        c.drawString(5 * mm, y, etiqueta)
+        c.drawRightString(ancho_pagina - 5 * mm, y, valor)
+        y -= 4 * mm
+
+    def titulo(texto):
+        nonlocal y
+        c.line(5 * mm, y, ancho_pagina - 5 * mm, y)
+        y -= 5 * mm
+        c.setFont("Helvetica-Bold", 9)
+        c.drawCentredString(ancho_pagina / 2, y, texto)
+        y -= 5 * mm
+
+    c.setFont("Helvetica-Bold", 12)
+    c.drawCentredString(ancho_pagina / 2, y, "404 FASTFOOD")
+    y -= 6 * mm
+    c.setFont("Helvetica", 9)
+    c.drawCentredString(ancho_pagina / 2, y, f"CUADRE DE CAJA - TURNO #{turno.id}")
+    y -= 6 * mm
+
+    titulo("TURNO")
+    fila("Caja:", resumen['caja'])
+    fila("Abierto por:", resumen['abierto_por'])
+    fila("Apertura:", hora_local(resumen['fecha_apertura']).strftime('%d/%m/%Y %I:%M %p'))
+    fila("Cerrado por:", resumen['cerrado_por'])
+    fila("Cierre:", hora_local(resumen['fecha_cierre']).strftime('%d/%m/%Y %I:%M %p'))
+
+    titulo("RESUMEN")
+    fila("Facturas cobradas:", str(resumen['cantidad_facturas']))
+    fila("Ventas:", dinero(resumen['total_ventas']))
+    fila(f"Devoluciones ({resumen['cantidad_devoluciones']}):", dinero(resumen['total_devoluciones']))
+    if resumen.get('cantidad_abonos'):
+        fila(f"Abonos a cuenta ({resumen['cantidad_abonos']}):", dinero(resumen['total_abonos']))
+    fila("NETO:", dinero(resumen['neto']), negrita=True)
+    fila("Promedio por factura:", dinero(resumen['promedio']))
+    fila("Factura más alta:", dinero(resumen['factura_maxima']))
+    fila("Factura más baja:", dinero(resumen['factura_minima']))
+
+    titulo("POR MÉTODO DE PAGO")
+    for metodo in resumen['por_metodo']:
+        fila(f"{metodo['nombre']} ({metodo['facturas']}):", dinero(metodo['ventas']))
+        if metodo['devoluciones']:
+            fila("   Devuelto:", f"-{dinero(metodo['devuelto'])}")
+        if metodo.get('abonos'):
+            fila("   Abonado:", dinero(metodo['abonado']))
+
+    titulo("POR USUARIO")
+    for usuario in resumen['por_usuario']:
+        fila(f"{usuario['usuario']} ({usuario['facturas']}):", dinero(usuario['ventas']))
+
+    titulo("EFECTIVO")
+    fila("Fondo inicial:", dinero(resumen['monto_inicial']))
+    fila("Esperado en caja:", dinero(resumen['efectivo_esperado']), negrita=True)
+    if resumen['efectivo_contado'] is not None:
+        fila("Contado:", dinero(resumen['efectivo_contado']))
+        fila("Diferencia:", dinero(resumen['diferencia']), negrita=True)
+
+    if resumen['facturas']:
+        titulo("DETALLE DE FACTURAS")
+        for factura in resumen['facturas']:
+            numero = factura['numero']
+            if len(numero) > 8:
+                numero = "..." + numero[-8:]
+            cliente = (factura['cliente'] or "CLIENTE")[:10]
+            fila(f"#{numero} {hora_local(factura['fecha']).strftime('%I:%M')} {cliente}",
+                 dinero(factura['total']))
+
+    c.save()
+    buffer.seek(0)
+
+    response = HttpResponse(buffer, content_type='application/pdf')
+    response['Content-Disposition'] = f'inline; filename="cuadre_turno_{turno.id}.pdf"'
+    return response
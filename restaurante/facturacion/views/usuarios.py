@@ -0,0 +1,195 @@
+"""Gestión de usuarios y roles."""
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+from django.contrib.auth.models import Group, Permission, User
+from django.db import transaction
+from django.shortcuts import redirect, render
+
+from ..accesos import CODIGOS_PERMISOS_MODULOS, accesos_usuario
+
+
+@login_required
+@permission_required('auth.change_user', raise_exception=True)
+def roles(request):
+    """
+    Vista de gestión de roles y permisos
+    """
+    # Los grupos y permisos por defecto los crea la migración 0027_grupos_y_permisos
+
+    # Obtener todos los usuarios
+    users = User.objects.all()
+
+    # Obtener todos los grupos para mostrar en el formulario
+    groups = Group.objects.all()
+
+    # Obtener permisos personalizados para los módulos específicos
+    permisos_modulos = Permission.objects.filter(codename__in=CODIGOS_PERMISOS_MODULOS)
+
+    if request.method == 'POST':
+        if 'crear_usuario' in request.POST:
+            # Crear nuevo usuario
+            username = request.POST.get('username')
+            password = request.POST.get('password')
+            confirm_password = request.POST.get('confirmPassword')
+            group_id = request.POST.get('role')
+            status = request.POST.get('status')
+
+            # Validaciones
+            if not username or not password or not confirm_password or not group_id:
+                messages.error(
+                    request, 'Por favor complete todos los campos obligatorios')
+                return redirect('roles')
+
+            if password != confirm_password:
+                messages.error(request, 'Las contraseñas no coinciden')
+                return redirect('roles')
+
+            if User.objects.filter(username=username).exists():
+                messages.error(request, 'El nombre de usuario ya existe')
+                return redirect('roles')
+
+            if len(password) < 4:
+                messages.error(
+                    request, 'La contraseña debe tener al menos 4 caracteres')
+                return redirect('roles')
+
+            try:
+                with transaction.atomic():
+                    # Crear usuario
+                    user = User.objects.create_user(
+                        username=username,
+                        password=password,
+                        is_active=(status == 'active')
+                    )
+
+                    # Asignar grupo
+                    group = Group.objects.get(id=group_id)
+                    user.groups.add(group)
+
+                    # Si es "Usuario Normal", asignar permisos específicos
+                    if group.name == 'Usuario Normal':
+                        # Asignar permisos para los 4 módulos
+                        for perm in permisos_modulos:
+                            user.user_permissions.add(perm)
+
+                    messages.success(
+                        request, f'Usuario {username} creado exitosamente')
+
+            except Exception as e:
+                messages.error(request, f'Error al crear usuario: {str(e)}')
+
+            return redirect('roles')
+
+    context = {
+        'users': users,
+        'groups': groups,
+        'permisos_modulos': permisos_modulos,
+    }
+    return render(request, 'facturacion/roles.html', context)
+
+
+@login_required
+@permission_required('auth.change_user', raise_exception=True)
+def edit_user(request, user_id):
+    """
+    Vista para editar usuario existente
+    """
+    try:
+        user = User.objects.get(id=user_id)
+
+        if request.method == 'POST':
+            username = request.POST.get('editUsername')
+            group_id = request.POST.get('editRole')
+            status = request.POST.get('editStatus')
+
+            # Actualizar datos básicos
+            user.username = username
+            user.is_active = (status == 'active')
+
+            # Obtener grupo
+            group = Group.objects.get(id=group_id)
+
+            # Actualizar grupos (remover todos y agregar el nuevo)
+            user.groups.clear()
+            user.groups.add(group)
+
+            # Obtener permisos de módulos
+            permisos_modulos = Permission.objects.filter(codename__in=CODIGOS_PERMISOS_MODULOS)
+
+            # Limpiar permisos personalizados
+            for perm in permisos_modulos:
+                user.user_permissions.remove(perm)
+
+            # Si es "Usuario Normal", asignar permisos específicos
+            if group.name == 'Usuario Normal':
+                for perm in permisos_modulos:
+                    user.user_permissions.add(perm)
+
+            user.save()
+            messages.success(
+                request, f'Usuario {username} actualizado exitosamente')
+            return redirect('roles')
+
+    except User.DoesNotExist:
+        messages.error(request, 'Usuario no encontrado')
+        return redirect('roles')
+
+    except Exception as e:
+        messages.error(request, f'Error al actualizar usuario: {str(e)}')
+        return redirect('roles')
+
+
+@login_required
+@permission_required('auth.delete_user', raise_exception=True)
+def delete_user(request, user_id):
+    """
+    Vista para eliminar usuario
+    """
+    try:
+        user = User.objects.get(id=user_id)
+        username = user.username
+
+        # No permitir eliminar al propio usuario o superusuarios
+        if user == request.user:
+            messages.error(request, 'No puedes eliminar tu propio usuario')
+        elif user.is_superuser:
+            messages.error(request, 'No puedes eliminar un superusuario')
+        else:
+            user.delete()
+            messages.success(
+                request, f'Usuario {username} eliminado exitosamente')
+
+    except User.DoesNotExist:
+        messages.error(request, 'Usuario no encontrado')
+
+    except Exception as e:
+        messages.error(request, f'Error al eliminar usuario: {str(e)}')
+
+    return redirect('roles')
+
+
+def verificar_acceso_modulo(user, modulo):
+    """
+    Verifica si un usuario tiene acceso a un módulo específico
+    (mapa de bits resuelto una vez por sesión, ver accesos.py)
+    """
+    return accesos_usuario(user).puede(modulo)
+
+# Decorador personalizado para verificar acceso
+
+
+def acceso_modulo_requerido(modulo):
+    """
+    Decorador para verificar acceso a un módulo
+    """
+    def decorator(view_func):
+        @login_required
+        def wrapper(request, *args, **kwargs):
+            if verificar_acceso_modulo(request.user, modulo):
+                return view_func(request, *args, **kwargs)
+            else:
+                messages.error(
+                    request, 'No tienes permiso para acceder a este módulo')
+                return redirect('index')
+        return wrapper
+    return decorator
@@ -0,0 +1,230 @@
+"""
+Clientes de pedidos y facturas, y sus agregados de visitas.
+
+Pedidos y facturas guardan el nombre y el teléfono del cliente como texto;
+además apuntan al ``Cliente`` registrado cuando se puede identificar
+(``identificar``): por cédula o por teléfono normalizado a 10 dígitos, el
+mismo formato que guarda el registro de clientes.
+
+Cada cliente lleva sus agregados: primera y última visita, cantidad de
+visitas y total facturado. Una visita es una factura cobrada
+(``ESTADOS_VISITA``, vivas o archivadas); las anuladas y las devueltas por
+completo no cuentan. Con esos campos indexados, "clientes nuevos hoy" es un
+rango sobre ``primera_visita`` y el historial de un cliente es un filtro por
+``cliente_id``.
+
+Los agregados se recalculan al guardar una factura con cliente (señal
+post_save). ``update()`` y ``bulk_create()`` no envían señales: quien los use
+llama a ``recalcular``. Para los datos anteriores a este vínculo:
+``python manage.py vincular_clientes`` (por lotes, se puede repetir).
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.signals import post_save
+
+from .models import Cliente, Factura, FacturaArchivada, MovimientoCuenta, Pedido, PedidoArchivado
+from .registro import obtener_logger
+
+logger = obtener_logger('visitas')
+
+ESTADOS_VISITA = ['pagada', 'parcialmente_devuelta']
+
+# Campos de la factura que cambian los agregados de su cliente
+CAMPOS_AGREGADOS = {'cliente', 'estado', 'total', 'fecha_factura'}
+
+LOTE_POR_DEFECTO = 1000
+
+
+def _digitos(texto):
+    return ''.join(caracter for caracter in str(texto or '') if caracter.isdigit())
+
+
+def normalizar_telefono(texto):
+    """10 dígitos ('809-555-1234', '+1 809 555 1234' -> '8095551234') o '' si no es un teléfono"""
+    digitos = _digitos(texto)
+    if len(digitos) == 11 and digitos.startswith('1'):
+        digitos = digitos[1:]
+    return digitos if len(digitos) == 10 else ''
+
+
+def normalizar_cedula(texto):
+    digitos = _digitos(texto)
+    return digitos if len(digitos) == 11 else ''
+
+
+def identificar(cedula='', telefono=''):
+    """Cliente registrado con esa cédula o, si no, con ese teléfono (principal o alternativo)"""
+    cedula = normalizar_cedula(cedula)
+    if cedula:
+        cliente = Cliente.objects.filter(cedula=cedula).first()
+        if cliente:
+            return cliente
+    telefono = normalizar_telefono(telefono)
+    if telefono:
+        return Cliente.objects.filter(
+            Q(telefono_principal=telefono) | Q(telefono_alternativo=telefono)
+        ).order_by('id').first()
+    return None
+
+
+# ==========================================
+# Agregados
+# ==========================================
+
+def _agregados(modelo, cliente_ids):
+    return {
+        fila['cliente_id']: fila
+        for fila in modelo.objects.filter(cliente_id__in=cliente_ids, estado__in=ESTADOS_VISITA)
+        .order_by().values('cliente_id')
+        .annotate(primera=Min('fecha_factura'), ultima=Max('fecha_factura'),
+                  visitas=Count('id'), gastado=Sum('total'))
+    }
+
+
+def recalcular(cliente_ids):
+    """Recalcular los agregados de visitas de los clientes indicados (facturas vivas y archivadas)"""
+    cliente_ids = [cliente_id for cliente_id in set(cliente_ids) if cliente_id]
+    if not cliente_ids:
+        return
+    vivas = _agregados(Factura, cliente_ids)
+    archivadas = _agregados(FacturaArchivada, cliente_ids)
+    for cliente_id in cliente_ids:
+        filas = [fila for fila in (vivas.get(cliente_id), archivadas.get(cliente_id)) if fila]
+        Cliente.objects.filter(id=cliente_id).update(
+            primera_visita=min((fila['primera'] for fila in filas), default=None),
+            ultima_visita=max((fila['ultima'] for fila in filas), default=None),
+            visitas=sum(fila['visitas'] for fila in filas),
+            total_gastado=sum((fila['gastado'] or Decimal('0') for fila in filas), Decimal('0')),
+        )
+
+
+def historial(cliente_id, limite=50):
+    """Últimas facturas del cliente, vivas y archivadas (índice cliente + fecha_factura)"""
+    campos = ('id', 'numero_factura', 'fecha_factura', 'tipo_pedido', 'metodo_pago', 'estado', 'total')
+    facturas = []
+    for modelo, archivada in ((Factura, False), (FacturaArchivada, True)):
+        for fila in (modelo.objects.filter(cliente_id=cliente_id)
+                     .order_by('-fecha_factura').values(*campos)[:limite]):
+            fila['archivada'] = archivada
+            facturas.append(fila)
+    facturas.sort(key=lambda fila: fila['fecha_factura'], reverse=True)
+    return facturas[:limite]
+
+
+def _factura_guardada(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or not instance.cliente_id:
+        return
+    if update_fields and not set(update_fields) & CAMPOS_AGREGADOS:
+        return
+    recalcular([instance.cliente_id])
+
+
+def conectar_senales():
+    """Mantener los agregados al guardar facturas (se llama desde apps.ready)"""
+    post_save.connect(_factura_guardada, sender=Factura, dispatch_uid='visitas_factura_save')
+
+
+# ==========================================
+# Vínculo de los datos históricos
+# ==========================================
+
+def _vincular(modelo, consulta, cliente_de, lote):
+    """
+    Asignar cliente a las filas de ``consulta`` (pares id, dato) por lotes en
+    orden de ID, cada lote en su propia transacción. Devuelve las filas vinculadas.
+    """
+    total = 0
+    ultimo_id = 0
+    while True:
+        filas = list(consulta.filter(id__gt=ultimo_id).order_by('id')[:lote])
+        if not filas:
+            break
+        ultimo_id = filas[-1][0]
+
+        por_cliente = defaultdict(list)
+        for fila_id, dato in filas:
+            cliente_id = cliente_de(dato)
+            if cliente_id:
+                por_cliente[cliente_id].append(fila_id)
+        with transaction.atomic():
+            for cliente_id, ids in por_cliente.items():
+                total += modelo.objects.filter(id__in=ids, cliente__isnull=True).update(cliente_id=cliente_id)
+    if total:
+        logger.info('👥 %s: %s fila(s) vinculadas a clientes', modelo.__name__, total)
+    return total
+
+
+def _clientes_por_telefono():
+    """Teléfono normalizado -> ID de cliente (el principal manda; ante repetidos, el más antiguo)"""
+    telefonos = {}
+    filas = list(Cliente.objects.order_by('id').values_list('id', 'telefono_principal', 'telefono_alternativo'))
+    for posicion in (1, 2):
+        for fila in filas:
+            telefono = normalizar_telefono(fila[posicion])
+            if telefono:
+                telefonos.setdefault(telefono, fila[0])
+    return telefonos
+
+
+def vincular_historial(lote=LOTE_POR_DEFECTO):
+    """
+    Vincular pedidos y facturas sin cliente (vivos y archivados) y recalcular
+    los agregados de todos los clientes. Orden de las reglas:
+
+    1. pedidos por teléfono;
+    2. facturas por el cliente de su pedido;
+    3. facturas a crédito por el cliente de su cargo en cuenta;
+    4. facturas restantes por teléfono.
+
+    Devuelve la cantidad de filas vinculadas por modelo.
+    """
+    telefonos = _clientes_por_telefono()
+
+    def por_telefono(telefono):
+        return telefonos.get(normalizar_telefono(telefono))
+
+    def mismo(cliente_id):
+        return cliente_id
+
+    totales = defaultdict(int)
+
+    for pedido_modelo, factura_modelo in ((Pedido, Factura), (PedidoArchivado, FacturaArchivada)):
+        totales[pedido_modelo.__name__] += _vincular(
+            pedido_modelo,
+            pedido_modelo.objects.filter(cliente__isnull=True).exclude(telefono_cliente='')
+            .values_list('id', 'telefono_cliente'),
+            por_telefono, lote,
+        )
+        totales[factura_modelo.__name__] += _vincular(
+            factura_modelo,
+            factura_modelo.objects.filter(cliente__isnull=True, pedido__cliente__isnull=False)
+            .values_list('id', 'pedido__cliente_id'),
+            mismo, lote,
+        )
+
+    # Al archivar, el cargo pierde su factura (SET_NULL): esta regla solo sirve para las vivas
+    cargos_con_factura = MovimientoCuenta.objects.filter(tipo='cargo', factura_id__isnull=False)
+    cargos = dict(cargos_con_factura.values_list('factura_id', 'cliente_id'))
+    totales['Factura'] += _vincular(
+        Factura,
+        Factura.objects.filter(cliente__isnull=True, id__in=cargos_con_factura.values('factura_id'))
+        .values_list('id', 'id'),
+        cargos.get, lote,
+    )
+    for factura_modelo in (Factura, FacturaArchivada):
+        totales[factura_modelo.__name__] += _vincular(
+            factura_modelo,
+            factura_modelo.objects.filter(cliente__isnull=True).exclude(telefono_cliente='')
+            .values_list('id', 'telefono_cliente'),
+            por_telefono, lote,
+        )
+
+    cliente_ids = list(Cliente.objects.order_by('id').values_list('id', flat=True))
+    for inicio in range(0, len(cliente_ids), lote):
+        with transaction.atomic():
+            recalcular(cliente_ids[inicio:inicio + lote])
+    logger.info('👥 Agregados de visitas recalculados para %s cliente(s)', len(cliente_ids))
+    return dict(totales)
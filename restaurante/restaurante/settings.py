@@ -65,12 +65,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'facturacion.metricas.MiddlewareMetricas',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'facturacion.accesos.MiddlewareAccesos',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -100,10 +102,15 @@ WSGI_APPLICATION = 'restaurante.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Pool de conexiones por worker (ver facturacion/pool_mysql). Desactivado por defecto
+# (DB_POOL_TAMANO=0); se activa dándole un tamaño. Con gunicorn sync basta 1-2 por
+# worker; con --threads, al menos el número de hilos.
+DB_POOL_TAMANO = int(os.environ.get('DB_POOL_TAMANO', 0))
+
 DATABASES = {
 
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'facturacion.pool_mysql' if DB_POOL_TAMANO else 'django.db.backends.mysql',
         # 'ENGINE': 'django.db.backends.postgresql',
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
@@ -112,7 +119,14 @@ DATABASES = {
         'PORT': os.environ.get('DB_PORT'),
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'", # esto es para mysql
-        }
+        },
+        'POOL': {
+            'tamano': DB_POOL_TAMANO or 1,
+            # Segundos esperando una conexión libre antes de fallar
+            'espera': float(os.environ.get('DB_POOL_ESPERA', 10)),
+            # Edad máxima de una conexión (menor que wait_timeout de MySQL)
+            'reciclar': int(os.environ.get('DB_POOL_RECICLAR', 1800)),
+        },
 
     }
 }
@@ -199,3 +213,107 @@ USE_TZ = True
 #STATIC_URL = 'static/'
 
 
+
+# Impresoras térmicas ESC/POS (worker: python manage.py procesar_cola_impresion)
+# Destino por impresora: "tcp://192.168.1.50:9100" o ruta de dispositivo "/dev/usb/lp0".
+# Vacío = impresora no configurada (se sigue usando la impresión desde el navegador).
+IMPRESORAS_ESCPOS = {
+    'cocina': os.environ.get('IMPRESORA_COCINA', ''),
+    'bar': os.environ.get('IMPRESORA_BAR', ''),
+    'caja': os.environ.get('IMPRESORA_CAJA', ''),
+}
+
+# Archivo de datos fríos (python manage.py archivar_datos)
+# Pedidos y facturas cerrados más antiguos que este horizonte salen de las tablas vivas.
+ARCHIVO_HORIZONTE_DIAS = int(os.environ.get('ARCHIVO_HORIZONTE_DIAS', 365))
+
+# Cache (ver facturacion/cache_modelos.py)
+# CACHE_BACKEND=archivo (por defecto): directorio compartido por todos los workers de gunicorn del servidor.
+# CACHE_BACKEND=redis: servidor compartido entre varios nodos (CACHE_URL=redis://host:6379/1).
+# CACHE_BACKEND=local: memoria del proceso, solo para desarrollo o un único proceso.
+# Con varios workers no usar "local": la invalidación de un worker (versiones de accesos,
+# catálogos cacheados) no llega a los demás.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'archivo')
+CACHE_TIMEOUT = int(os.environ.get('CACHE_TIMEOUT', 300))
+_BACKENDS_CACHE = {
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'restaurante',
+    },
+    'archivo': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', str(BASE_DIR / 'cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+CACHES = {
+    'default': {**_BACKENDS_CACHE[CACHE_BACKEND], 'TIMEOUT': CACHE_TIMEOUT},
+}
+
+# Fragmentos de plantilla cacheados por roles ({% fragmento %}, ver facturacion/templatetags/fragmentos.py)
+# VERSION_APP entra en la clave: cambiarlo al desplegar descarta los fragmentos guardados
+# (los cambios en las plantillas ya se detectan por su fecha de modificación).
+VERSION_APP = os.environ.get('VERSION_APP', '')
+FRAGMENTOS_TIMEOUT = int(os.environ.get('FRAGMENTOS_TIMEOUT', 86400))
+
+# Métricas Prometheus en /metrics (ver facturacion/metricas.py)
+# METRICAS_DIR: directorio compartido por los workers de gunicorn para sumar sus métricas
+# (vaciarlo al desplegar si se quiere reiniciar los contadores). Vacío = solo el proceso actual.
+# METRICAS_TOKEN: token Bearer para el scraper; sin token solo acceden usuarios staff.
+METRICAS_DIR = os.environ.get('METRICAS_DIR', '')
+METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN', '')
+METRICAS_INTERVALO = float(os.environ.get('METRICAS_INTERVALO', 1))
+# METRICAS_SERVER_TIMING: enviar el desglose de cada petición (SQL y bloques de plantilla)
+# en la cabecera Server-Timing. Por defecto solo con DEBUG.
+METRICAS_SERVER_TIMING = os.environ.get('METRICAS_SERVER_TIMING', str(DEBUG)) == 'True'
+
+# Logging (ver facturacion/registro.py)
+# LOG_LEVEL=DEBUG activa la salida detallada; por defecto solo INFO y superior.
+# Los registros se encolan y se escriben en un hilo aparte (stderr o LOG_ARCHIVO).
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'texto': {
+            'format': '%(asctime)s %(levelname)s %(name)s [%(process)d] %(message)s',
+        },
+        'json': {
+            '()': 'facturacion.registro.FormatoJSON',
+        },
+    },
+    'filters': {
+        # 1 de cada N eventos repetidos (DEBUG/INFO) por logger
+        'muestreo': {
+            '()': 'facturacion.registro.FiltroMuestreo',
+            'tasas': {
+                'facturacion.modelos': int(os.environ.get('LOG_MUESTREO_MODELOS', 50)),
+                'facturacion.reportes': int(os.environ.get('LOG_MUESTREO_REPORTES', 20)),
+            },
+        },
+    },
+    'handlers': {
+        'cola': {
+            '()': 'facturacion.registro.ColaLogHandler',
+            'archivo': os.environ.get('LOG_ARCHIVO', ''),
+            'formatter': os.environ.get('LOG_FORMATO', 'texto'),
+            'filters': ['muestreo'],
+        },
+    },
+    'loggers': {
+        'facturacion': {
+            'handlers': ['cola'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+        'django': {
+            'handlers': ['cola'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
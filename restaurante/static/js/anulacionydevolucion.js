@@ -0,0 +1,734 @@
+    // Datos de la factura actual (si existe)
+    const facturaActual = PAGINA.factura;
+
+    if (facturaActual) {
+        console.log('✅ Factura actual cargada:', facturaActual.numero);
+        console.log('📦 Items en factura:', facturaActual.items.length);
+        console.log('✅ Productos disponibles para devolver:', facturaActual.productosDisponibles.length);
+        console.log('🔄 Productos ya devueltos:', facturaActual.productosDevueltos.length);
+
+        if (facturaActual.items && facturaActual.items.length > 0) {
+            console.log('📋 Detalle de productos:');
+            facturaActual.items.forEach((item, index) => {
+                console.log(`  ${index + 1}. ${item.nombre || 'Sin nombre'}`);
+                console.log(`     Código: "${item.codigo || 'No disponible'}"`);
+                console.log(`     Categoría: "${item.categoria || 'No disponible'}"`);
+                console.log(`     Cantidad: ${item.cantidad || 0}`);
+                console.log(`     Precio: $${item.precio || 0}`);
+            });
+    } else {
+            console.warn('⚠️  No hay items en la factura');
+    }
+
+    } else {
+    console.log('ℹ️  No hay factura cargada');
+    }
+
+    // Inicializar la aplicación
+    document.addEventListener('DOMContentLoaded', function() {
+        console.log('🚀 DOM cargado completamente');
+        setupEventListeners();
+
+        // Permitir búsqueda con Enter
+        const invoiceInput = document.getElementById('invoiceNumber');
+        if (invoiceInput) {
+            invoiceInput.addEventListener('keypress', function(e) {
+                if (e.key === 'Enter') {
+                    this.form.submit();
+                }
+            });
+        }
+
+        // Si hay factura cargada, preparar el modal
+        if (facturaActual) {
+            console.log('📄 Preparando modales para factura:', facturaActual.numero);
+            prepararModalDevolucionParcial();
+            prepararModalAnulacion();
+            cargarHistorialDevoluciones();
+
+            // Mostrar información de depuración si hay problemas
+            if (!facturaActual.items || facturaActual.items.length === 0) {
+                console.warn('⚠️  La factura no tiene items. Mostrando información de depuración.');
+                setTimeout(() => {
+                    const debugInfo = document.getElementById('debugInfo');
+                    if (debugInfo) {
+                        debugInfo.style.display = 'block';
+                    }
+                }, 1000);
+            }
+        }
+    });
+
+    // Configurar event listeners
+    function setupEventListeners() {
+        // Menú móvil
+        const menuToggle = document.getElementById('menuToggle');
+        const sidebarOverlay = document.getElementById('sidebarOverlay');
+
+        if (menuToggle) {
+            menuToggle.addEventListener('click', toggleSidebar);
+        }
+        if (sidebarOverlay) {
+            sidebarOverlay.addEventListener('click', toggleSidebar);
+        }
+
+        // Cerrar modales con ESC
+        document.addEventListener('keydown', function(e) {
+            if (e.key === 'Escape') {
+                cerrarModalDevolucionParcial();
+                cerrarModalAnulacion();
+            }
+        });
+    }
+
+    // Alternar barra lateral en móvil
+    function toggleSidebar() {
+        const sidebar = document.getElementById('sidebar');
+        const overlay = document.getElementById('sidebarOverlay');
+        sidebar.classList.toggle('open');
+        overlay.classList.toggle('open');
+    }
+
+    // Limpiar campo de búsqueda
+    function clearInvoiceInput() {
+        const invoiceInput = document.getElementById('invoiceNumber');
+        if (invoiceInput) {
+            invoiceInput.value = '';
+            invoiceInput.focus();
+        }
+
+        // Redirigir a la página sin parámetros
+        window.location.href = PAGINA.urls.anulacionydevolucion;
+    }
+
+    // Alternar información de depuración
+    function toggleDebugInfo() {
+        const debugInfo = document.getElementById('debugInfo');
+        if (debugInfo) {
+            debugInfo.style.display = debugInfo.style.display === 'none' ? 'block' : 'none';
+        }
+    }
+
+    // Confirmación personalizada para devolución total
+    function confirmDevolucionTotal() {
+        if (!facturaActual) return false;
+
+        const bebidas = facturaActual.items.filter(item =>
+            item.categoria && item.categoria.toLowerCase() === 'bebida'
+        );
+
+        let mensaje = '¿Estás seguro de devolver TODOS los productos de esta factura?\n\n';
+
+        if (bebidas.length > 0) {
+            mensaje += `Se repondrá el stock de ${bebidas.length} producto(s) bebida:\n`;
+            bebidas.forEach((bebida, index) => {
+                mensaje += `  • ${bebida.nombre} (${bebida.cantidad} unidad(es))\n`;
+            });
+        } else {
+            mensaje += 'No hay productos bebida para reponer stock.\n';
+        }
+
+        mensaje += `\nMonto total a devolver: $${facturaActual.items.reduce((sum, item) =>
+            sum + (item.cantidad * item.precio), 0).toFixed(2)}`;
+
+        return confirm(mensaje);
+    }
+
+    // Cargar historial de devoluciones
+    function cargarHistorialDevoluciones() {
+        if (!facturaActual || !facturaActual.productosDevueltos) {
+            console.warn('No hay productos devueltos para mostrar');
+            return;
+        }
+
+        const container = document.getElementById('devolucionesContainer');
+        const sinDevoluciones = document.getElementById('sinDevoluciones');
+
+        if (!container) return;
+
+        // Verificar si hay productos devueltos
+        if (facturaActual.productosDevueltos && facturaActual.productosDevueltos.length > 0) {
+            // Ocultar mensaje "sin devoluciones"
+            if (sinDevoluciones) sinDevoluciones.style.display = 'none';
+
+            // Calcular monto total devuelto
+            let montoTotal = 0;
+            let bebidasDevueltas = 0;
+
+            facturaActual.productosDevueltos.forEach(producto => {
+                montoTotal += parseFloat(producto.subtotal) || 0;
+                if (producto.categoria && producto.categoria.toLowerCase() === 'bebida') {
+                    bebidasDevueltas += parseInt(producto.cantidad) || 0;
+                }
+            });
+
+            // Crear encabezado con monto total
+            const headerHTML = `
+                <div style="background: #e8f4f8; border-radius: 10px; padding: 1rem; margin-bottom: 1.5rem;">
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <div>
+                            <strong style="color: #2c3e50;">Total Devuelto:</strong>
+                            <div style="font-size: 1.8rem; font-weight: bold; color: #4CAF50;">
+                                $${montoTotal.toFixed(2)}
+                            </div>
+                        </div>
+                        <div style="color: #718096; font-size: 0.9rem; text-align: right;">
+                            <div><i class="fas fa-boxes"></i> ${facturaActual.productosDevueltos.length} producto(s) devuelto(s)</div>
+                            ${bebidasDevueltas > 0 ? `<div><i class="fas fa-wine-bottle"></i> ${bebidasDevueltas} bebida(s) repuesta(s) en stock</div>` : ''}
+                        </div>
+                    </div>
+                </div>
+            `;
+
+            // Crear lista de productos
+            let productosHTML = '';
+            facturaActual.productosDevueltos.forEach((producto, index) => {
+                const esBebida = producto.categoria && producto.categoria.toLowerCase() === 'bebida';
+                productosHTML += `
+                    <div class="devolucion-product-item" style="animation-delay: ${index * 0.1}s;">
+                        <div style="flex: 1;">
+                            <div style="font-weight: 600; color: #2c3e50;">${producto.nombre}</div>
+                            <div style="font-size: 0.85rem; color: #718096; margin-top: 0.25rem;">
+                                <span>Cantidad: ${producto.cantidad}</span>
+                                ${producto.codigo ? `<span style="margin-left: 1rem;">Código: ${producto.codigo}</span>` : ''}
+                                ${esBebida ? '<span style="margin-left: 1rem; color: #4CAF50;"><i class="fas fa-wine-bottle"></i> Bebida (stock repuesto)</span>' : ''}
+                            </div>
+                        </div>
+                        <div style="font-weight: 700; color: #4CAF50;">
+                            $${parseFloat(producto.subtotal || 0).toFixed(2)}
+                        </div>
+                    </div>
+                `;
+            });
+
+            // Actualizar contenedor
+            container.innerHTML = headerHTML + productosHTML;
+        } else {
+            // Mostrar mensaje "sin devoluciones"
+            if (sinDevoluciones) sinDevoluciones.style.display = 'block';
+        }
+    }
+
+    // Preparar modal de devolución parcial
+    function prepararModalDevolucionParcial() {
+        if (!facturaActual) {
+            console.warn('No hay factura actual para preparar el modal de devolución parcial');
+            return;
+        }
+
+        // Cargar productos en el modal
+        cargarProductosEnModal();
+
+        // Configurar el formulario
+        const form = document.getElementById('formDevolucionParcial');
+        if (form) {
+            form.onsubmit = function(e) {
+                const productosSeleccionados = obtenerProductosSeleccionados();
+                console.log('Productos seleccionados para devolución:', productosSeleccionados);
+
+                if (productosSeleccionados.length === 0) {
+                    e.preventDefault();
+                    mostrarAlerta('Debes seleccionar al menos un producto para devolver', 'warning');
+                    return false;
+                }
+
+                const total = calcularTotalDevolucion();
+                const bebidas = productosSeleccionados.filter(p =>
+                    p.categoria && p.categoria.toLowerCase() === 'bebida'
+                );
+
+                let mensaje = `¿Estás seguro de procesar la devolución de ${productosSeleccionados.length} producto(s) por un total de $${total.toFixed(2)}?\n\n`;
+
+                if (bebidas.length > 0) {
+                    mensaje += `Se repondrá el stock de ${bebidas.length} producto(s) bebida:\n`;
+                    bebidas.forEach((bebida, index) => {
+                        mensaje += `  • ${bebida.nombre} (${bebida.cantidad} unidad(es))\n`;
+                    });
+                }
+
+                return confirm(mensaje);
+            };
+        }
+    }
+
+    // Preparar modal de anulación
+    function prepararModalAnulacion() {
+        const formAnulacion = document.getElementById('formAnulacion');
+        if (formAnulacion) {
+            formAnulacion.onsubmit = function(e) {
+                const motivo = document.getElementById('motivoAnulacion').value.trim();
+                if (!motivo) {
+                    e.preventDefault();
+                    mostrarAlerta('Debes ingresar un motivo para la anulación', 'warning');
+                    return false;
+                }
+
+                // Calcular cuántas bebidas se van a disminuir
+                const bebidas = facturaActual.items.filter(item =>
+                    item.categoria && item.categoria.toLowerCase() === 'bebida'
+                );
+
+                let mensaje = '¿Estás seguro de anular esta factura?\n\n';
+                mensaje += 'EFECTOS:\n';
+                mensaje += '• La factura cambiará a estado "Anulada"\n';
+
+                if (bebidas.length > 0) {
+                    mensaje += `• Se disminuirá el stock de ${bebidas.length} producto(s) bebida:\n`;
+                    bebidas.forEach((bebida, index) => {
+                        mensaje += `    ${bebida.nombre} (${bebida.cantidad} unidad(es))\n`;
+                    });
+                } else {
+                    mensaje += '• No hay productos bebida para ajustar stock\n';
+                }
+
+                mensaje += '• No se podrán realizar devoluciones\n';
+                mensaje += '• Esta acción NO se puede deshacer\n\n';
+                mensaje += 'Motivo: ' + motivo;
+
+                return confirm(mensaje);
+            };
+        }
+    }
+
+    // Abrir modal de devolución parcial
+    function abrirModalDevolucionParcial() {
+        console.log('abrirModalDevolucionParcial llamado');
+
+        if (!facturaActual) {
+            console.error('No hay factura cargada');
+            mostrarAlerta('No hay factura cargada', 'error');
+            return;
+        }
+
+        if (facturaActual.estado !== 'pagada' && facturaActual.estado !== 'parcialmente_devuelta') {
+            console.warn('Estado de factura no válido para devolución:', facturaActual.estado);
+            mostrarAlerta('Solo se pueden devolver facturas pagadas o parcialmente devueltas', 'warning');
+            return;
+        }
+
+        // Asegurarse de que los productos estén cargados
+        cargarProductosEnModal();
+
+        // Mostrar modal
+        const modal = document.getElementById('partialReturnModal');
+        if (modal) {
+            modal.classList.add('active');
+            document.body.style.overflow = 'hidden';
+            console.log('Modal de devolución parcial abierto');
+        } else {
+            console.error('No se encontró el modal con id partialReturnModal');
+        }
+    }
+
+    // Cerrar modal de devolución parcial
+    function cerrarModalDevolucionParcial() {
+        const modal = document.getElementById('partialReturnModal');
+        if (modal) {
+            modal.classList.remove('active');
+        }
+        document.body.style.overflow = '';
+
+        // Resetear selecciones
+        resetearSeleccionesModal();
+    }
+
+    // Abrir modal de anulación
+    function abrirModalAnulacion() {
+        if (!facturaActual) {
+            mostrarAlerta('No hay factura cargada', 'error');
+            return;
+        }
+
+        if (facturaActual.estado !== 'pagada' && facturaActual.estado !== 'pendiente') {
+            mostrarAlerta('Solo se pueden anular facturas pagadas o pendientes', 'warning');
+            return;
+        }
+
+        const modal = document.getElementById('anulacionModal');
+        if (modal) {
+            modal.classList.add('active');
+            document.body.style.overflow = 'hidden';
+        }
+    }
+
+    // Cerrar modal de anulación
+    function cerrarModalAnulacion() {
+        const modal = document.getElementById('anulacionModal');
+        if (modal) {
+            modal.classList.remove('active');
+        }
+        document.body.style.overflow = '';
+
+        // Limpiar el formulario
+        const form = document.getElementById('formAnulacion');
+        if (form) form.reset();
+    }
+
+    // Calcular cantidad ya devuelta de un producto
+    function calcularCantidadYaDevuelta(productoNombre) {
+        if (!facturaActual || !facturaActual.productosDevueltos) return 0;
+
+        let totalDevuelto = 0;
+        const nombreBuscar = productoNombre.toLowerCase().trim();
+
+        facturaActual.productosDevueltos.forEach(producto => {
+            const nombreProducto = (producto.nombre || '').toLowerCase().trim();
+            if (nombreProducto === nombreBuscar) {
+                totalDevuelto += parseFloat(producto.cantidad) || 0;
+            }
+        });
+
+        console.log(`📊 Cantidad ya devuelta de "${productoNombre}": ${totalDevuelto}`);
+        return totalDevuelto;
+    }
+
+    // Cargar productos en el modal
+    function cargarProductosEnModal() {
+        if (!facturaActual || !facturaActual.productosDisponibles) {
+            console.error('No hay productos disponibles para cargar en el modal');
+            return;
+        }
+
+        const productList = document.getElementById('productListModal');
+        if (!productList) {
+            console.error('No se encontró el contenedor de productos en el modal');
+            return;
+        }
+
+        productList.innerHTML = '';
+
+        let tieneProductosDisponibles = false;
+        let productosBebida = 0;
+
+        console.log('📦 Cargando productos disponibles en modal:', facturaActual.productosDisponibles.length);
+
+        facturaActual.productosDisponibles.forEach((item, index) => {
+            console.log('Cargando producto en modal:', item);
+            const productoNombre = item.nombre || 'Producto sin nombre';
+            const cantidadDisponible = item.cantidad_disponible || 0;
+            const cantidadYaDevuelta = item.cantidad_ya_devuelta || 0;
+            const cantidadOriginal = item.cantidad || 0;
+            const codigoProducto = item.codigo || '';
+            const categoria = item.categoria || '';
+
+            // Solo mostrar productos que todavía se pueden devolver
+            if (cantidadDisponible <= 0) {
+                console.log(`Producto ${productoNombre} no disponible para devolver (ya devuelto completamente)`);
+                return;
+            }
+
+            tieneProductosDisponibles = true;
+            const esBebida = categoria.toLowerCase() === 'bebida';
+            if (esBebida) productosBebida++;
+
+            const productItem = document.createElement('div');
+            productItem.className = 'product-item-wrapper';
+            productItem.innerHTML = `
+                <label class="product-item">
+                    <input type="checkbox" class="product-checkbox"
+                           data-index="${index}"
+                           data-nombre="${productoNombre}"
+                           data-codigo="${codigoProducto}"
+                           data-price="${item.precio || 0}"
+                           data-max-qty="${cantidadDisponible}"
+                           data-categoria="${categoria}"
+                           onchange="actualizarTotalDevolucion()">
+                    <div class="product-info">
+                        <div class="product-name">${productoNombre}</div>
+                        <div class="product-details">
+                            <div>Precio unitario: $${(item.precio || 0).toFixed(2)}</div>
+                            <div>Disponible para devolver: ${cantidadDisponible} de ${cantidadOriginal}</div>
+                            ${codigoProducto ? `<div>Código: <strong>${codigoProducto}</strong></div>` : '<div>Código: <em>No disponible</em></div>'}
+                            ${cantidadYaDevuelta > 0 ? `<div style="color: #667eea;">Ya devuelto: ${cantidadYaDevuelta}</div>` : ''}
+                            ${esBebida ? '<div style="color: #4CAF50;"><i class="fas fa-wine-bottle"></i> Bebida (stock se repone)</div>' : ''}
+                        </div>
+                    </div>
+                </label>
+                <div class="product-quantity-control">
+                    <div class="quantity-selector">
+                        <button type="button" class="qty-btn qty-minus" onclick="disminuirCantidad(${index})" title="Disminuir cantidad">
+                            <i class="fas fa-minus"></i>
+                        </button>
+                        <input type="number" class="qty-input product-qty-${index}"
+                               value="1" min="1" max="${cantidadDisponible}"
+                               onchange="actualizarCantidadDesdeInput(${index})"
+                               oninput="validarCantidadInput(${index}, ${cantidadDisponible})">
+                        <button type="button" class="qty-btn qty-plus" onclick="aumentarCantidad(${index}, ${cantidadDisponible})" title="Aumentar cantidad">
+                            <i class="fas fa-plus"></i>
+                        </button>
+                    </div>
+                    <div class="product-total-price" id="price-${index}">$${(item.precio || 0).toFixed(2)}</div>
+                </div>
+            `;
+            productList.appendChild(productItem);
+        });
+
+        // Si no hay productos disponibles para devolver
+        if (!tieneProductosDisponibles) {
+            productList.innerHTML = `
+                <div style="text-align: center; padding: 2rem; color: #718096;">
+                    <i class="fas fa-check-circle" style="font-size: 3rem; margin-bottom: 1rem; color: #4CAF50;"></i>
+                    <p><strong>Todos los productos han sido devueltos</strong></p>
+                    <p>No hay productos disponibles para devolver en esta factura.</p>
+                </div>
+            `;
+            const confirmBtn = document.getElementById('confirmarDevolucionBtn');
+            if (confirmBtn) confirmBtn.disabled = true;
+        } else {
+            console.log(`✅ ${productosBebida} producto(s) bebida disponible(s) para reposición de stock`);
+        }
+
+        actualizarTotalDevolucion();
+    }
+
+    // Aumentar cantidad en el modal
+    function aumentarCantidad(index, maxCantidad) {
+        const input = document.querySelector(`.product-qty-${index}`);
+        if (!input) return;
+
+        const currentValue = parseInt(input.value) || 1;
+        const newValue = currentValue + 1;
+
+        if (newValue <= maxCantidad) {
+            input.value = newValue;
+            actualizarCantidad(index, newValue);
+        }
+    }
+
+    // Disminuir cantidad en el modal
+    function disminuirCantidad(index) {
+        const input = document.querySelector(`.product-qty-${index}`);
+        if (!input) return;
+
+        const currentValue = parseInt(input.value) || 1;
+        if (currentValue > 1) {
+            input.value = currentValue - 1;
+            actualizarCantidad(index, currentValue - 1);
+        }
+    }
+
+    // Actualizar cantidad desde input
+    function actualizarCantidadDesdeInput(index) {
+        const input = document.querySelector(`.product-qty-${index}`);
+        if (!input) return;
+
+        const cantidad = parseInt(input.value) || 1;
+        actualizarCantidad(index, cantidad);
+    }
+
+    // Validar cantidad en input
+    function validarCantidadInput(index, maxCantidad) {
+        const input = document.querySelector(`.product-qty-${index}`);
+        if (!input) return;
+
+        let value = parseInt(input.value) || 1;
+
+        if (isNaN(value) || value < 1) {
+            value = 1;
+        } else if (value > maxCantidad) {
+            value = maxCantidad;
+        }
+
+        input.value = value;
+        actualizarCantidad(index, value);
+    }
+
+    // Actualizar cantidad de un producto
+    function actualizarCantidad(index, cantidad) {
+        const checkbox = document.querySelector(`.product-checkbox[data-index="${index}"]`);
+        if (!checkbox) return;
+
+        // Validar cantidad máxima
+        const maxCantidad = parseInt(checkbox.dataset.maxQty) || 1;
+        if (cantidad > maxCantidad) {
+            cantidad = maxCantidad;
+            const input = document.querySelector(`.product-qty-${index}`);
+            if (input) input.value = cantidad;
+        }
+
+        if (cantidad < 1) {
+            cantidad = 1;
+            const input = document.querySelector(`.product-qty-${index}`);
+            if (input) input.value = cantidad;
+        }
+
+        if (checkbox.checked) {
+            actualizarTotalDevolucion();
+        }
+    }
+
+    // Actualizar total de devolución
+    function actualizarTotalDevolucion() {
+        const selectedCheckboxes = document.querySelectorAll('.product-checkbox:checked');
+        let total = 0;
+        let productosSeleccionados = [];
+
+        selectedCheckboxes.forEach(checkbox => {
+            const index = checkbox.dataset.index;
+            const precio = parseFloat(checkbox.dataset.price);
+            const cantidad = parseInt(document.querySelector(`.product-qty-${index}`).value) || 1;
+            const subtotal = precio * cantidad;
+
+            total += subtotal;
+
+            // Actualizar precio mostrado
+            const priceElement = document.getElementById(`price-${index}`);
+            if (priceElement) {
+                priceElement.textContent = `$${subtotal.toFixed(2)}`;
+            }
+
+            productosSeleccionados.push({
+                nombre: checkbox.dataset.nombre,
+                codigo: checkbox.dataset.codigo || '',
+                cantidad: cantidad,
+                precio: precio,
+                subtotal: subtotal,
+                categoria: checkbox.dataset.categoria
+            });
+        });
+
+        // Actualizar total
+        const totalElement = document.getElementById('partialReturnTotal');
+        if (totalElement) {
+            totalElement.textContent = `$${total.toFixed(2)}`;
+        }
+
+        // Actualizar input hidden con productos seleccionados
+        const productosInput = document.getElementById('productosDevueltosInput');
+        if (productosInput) {
+            productosInput.value = JSON.stringify(productosSeleccionados);
+            console.log('Productos a devolver:', productosSeleccionados);
+        }
+
+        // Habilitar/deshabilitar botón de confirmar
+        const confirmBtn = document.getElementById('confirmarDevolucionBtn');
+        if (confirmBtn) {
+            if (selectedCheckboxes.length > 0) {
+                confirmBtn.disabled = false;
+            } else {
+                confirmBtn.disabled = true;
+            }
+        }
+    }
+
+    // Obtener productos seleccionados
+    function obtenerProductosSeleccionados() {
+        const selectedCheckboxes = document.querySelectorAll('.product-checkbox:checked');
+        let productos = [];
+
+        selectedCheckboxes.forEach(checkbox => {
+            const index = checkbox.dataset.index;
+            const cantidad = parseInt(document.querySelector(`.product-qty-${index}`).value) || 1;
+
+            productos.push({
+                nombre: checkbox.dataset.nombre,
+                codigo: checkbox.dataset.codigo || '',
+                cantidad: cantidad,
+                precio: parseFloat(checkbox.dataset.price),
+                categoria: checkbox.dataset.categoria
+            });
+        });
+
+        return productos;
+    }
+
+    // Calcular total de devolución
+    function calcularTotalDevolucion() {
+        const selectedCheckboxes = document.querySelectorAll('.product-checkbox:checked');
+        let total = 0;
+
+        selectedCheckboxes.forEach(checkbox => {
+            const index = checkbox.dataset.index;
+            const precio = parseFloat(checkbox.dataset.price);
+            const cantidad = parseInt(document.querySelector(`.product-qty-${index}`).value) || 1;
+            total += precio * cantidad;
+        });
+
+        return total;
+    }
+
+    // Resetear selecciones del modal
+    function resetearSeleccionesModal() {
+        document.querySelectorAll('.product-checkbox').forEach(cb => cb.checked = false);
+        document.querySelectorAll('.qty-input').forEach(input => {
+            if (input) input.value = '1';
+        });
+
+        // Resetear todos los precios individuales
+        document.querySelectorAll('.product-total-price').forEach((priceEl, index) => {
+            const checkbox = document.querySelector(`.product-checkbox[data-index="${index}"]`);
+            if (checkbox) {
+                const precio = parseFloat(checkbox.dataset.price) || 0;
+                priceEl.textContent = `$${precio.toFixed(2)}`;
+            }
+        });
+
+        const totalElement = document.getElementById('partialReturnTotal');
+        if (totalElement) {
+            totalElement.textContent = '$0.00';
+        }
+
+        const confirmBtn = document.getElementById('confirmarDevolucionBtn');
+        if (confirmBtn) {
+            confirmBtn.disabled = true;
+        }
+    }
+
+    // Mostrar mensaje para cambio de producto
+    function mostrarMensajeCambio() {
+        mostrarAlerta('La funcionalidad de cambio de producto está en desarrollo. Por ahora, usa la opción "Devolver Items" y crea una nueva factura para el cambio.', 'info');
+    }
+
+    // Mostrar alerta
+    function mostrarAlerta(mensaje, tipo = 'info') {
+        // Crear elemento de alerta
+        const alerta = document.createElement('div');
+        alerta.className = `alert alert-${tipo}`;
+
+        // Icono según tipo
+        let icono = 'info-circle';
+        if (tipo === 'success') icono = 'check-circle';
+        if (tipo === 'error') icono = 'exclamation-circle';
+        if (tipo === 'warning') icono = 'exclamation-triangle';
+
+        alerta.innerHTML = `
+            <i class="fas fa-${icono}"></i>
+            ${mensaje}
+        `;
+
+        // Agregar al contenedor de mensajes
+        const mensajesContainer = document.querySelector('.messages-container');
+        if (mensajesContainer) {
+            mensajesContainer.appendChild(alerta);
+
+            // Remover después de 5 segundos
+            setTimeout(() => {
+                if (alerta.parentElement) {
+                    alerta.style.opacity = '0';
+                    alerta.style.transition = 'opacity 0.3s';
+                    setTimeout(() => {
+                        if (alerta.parentElement) {
+                            alerta.remove();
+                        }
+                    }, 300);
+                }
+            }, 5000);
+        }
+    }
+
+    // Mostrar loading
+    function mostrarLoading() {
+        const loadingElement = document.getElementById('loadingSpinner');
+
+if (loadingElement) {
+        loadingElement.style.display = 'block';
+    }
+}
+
+// Ocultar loading
+function ocultarLoading() {
+    const loadingElement = document.getElementById('loadingSpinner');
+    if (loadingElement) {
+        loadingElement.style.display = 'none';
+    }
+}
@@ -0,0 +1,1087 @@
+// ===== DATOS =====
+// Clientes con saldo, sus cargos abiertos y últimos pagos (ver cuentas.cartera)
+const clientesData = JSON.parse(document.getElementById('clientes-data').textContent);
+
+// ===== VARIABLES GLOBALES =====
+let currentPage = 1;
+const itemsPerPage = 5;
+let filteredClientes = [...clientesData];
+let currentClienteId = null;
+let currentFacturaId = null;
+
+// ===== FUNCIONES DE INICIALIZACIÓN =====
+document.addEventListener('DOMContentLoaded', function () {
+    console.log('=== SISTEMA DE CUENTAS POR COBRAR INICIADO ===');
+
+    // Inicializar componentes
+    initSidebar();
+    initFilters();
+    initButtons();
+    initModals();
+
+    // Cargar datos iniciales
+    loadClientes();
+    updateStats();
+
+    // Establecer fechas por defecto
+    setDefaultDates();
+});
+
+// ===== FUNCIONES DEL SIDEBAR =====
+function initSidebar() {
+    const menuToggle = document.getElementById('menuToggle');
+    const sidebar = document.getElementById('sidebar');
+    const sidebarOverlay = document.getElementById('sidebarOverlay');
+
+    menuToggle.addEventListener('click', toggleSidebar);
+    sidebarOverlay.addEventListener('click', toggleSidebar);
+
+    // Cerrar sidebar al hacer clic en un enlace (en móviles)
+    document.querySelectorAll('.nav-item').forEach(item => {
+        item.addEventListener('click', function () {
+            if (window.innerWidth <= 768) {
+                toggleSidebar();
+            }
+        });
+    });
+}
+
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
+
+// ===== FUNCIONES DE FILTROS =====
+function initFilters() {
+    const btnFiltrar = document.getElementById('btnFiltrar');
+    const searchInput = document.getElementById('searchInput');
+    const deudaFilter = document.getElementById('deudaFilter');
+    const vencimientoFilter = document.getElementById('vencimientoFilter');
+    const fechaDesde = document.getElementById('fechaDesde');
+    const fechaHasta = document.getElementById('fechaHasta');
+
+    btnFiltrar.addEventListener('click', applyFilters);
+    searchInput.addEventListener('keypress', function (e) {
+        if (e.key === 'Enter') applyFilters();
+    });
+
+    deudaFilter.addEventListener('change', applyFilters);
+    vencimientoFilter.addEventListener('change', applyFilters);
+    fechaDesde.addEventListener('change', applyFilters);
+    fechaHasta.addEventListener('change', applyFilters);
+}
+
+function setDefaultDates() {
+    const today = new Date();
+    const thirtyDaysAgo = new Date();
+    thirtyDaysAgo.setDate(today.getDate() - 30);
+
+    document.getElementById('fechaDesde').valueAsDate = thirtyDaysAgo;
+    document.getElementById('fechaHasta').valueAsDate = today;
+}
+
+function applyFilters() {
+    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    const nivelDeuda = document.getElementById('deudaFilter').value;
+    const vencimiento = document.getElementById('vencimientoFilter').value;
+    const fechaDesde = document.getElementById('fechaDesde').value;
+    const fechaHasta = document.getElementById('fechaHasta').value;
+
+    filteredClientes = clientesData.filter(cliente => {
+        // Filtro por búsqueda
+        const matchesSearch = searchTerm === '' ||
+            cliente.cedula.toLowerCase().includes(searchTerm) ||
+            cliente.nombre_completo.toLowerCase().includes(searchTerm) ||
+            cliente.telefono.includes(searchTerm);
+
+        // Filtro por nivel de deuda
+        const matchesDeuda = nivelDeuda === '' || cliente.nivel_deuda === nivelDeuda;
+
+        // Filtro por vencimiento
+        let matchesVencimiento = true;
+        if (vencimiento !== '') {
+            if (vencimiento === 'vencidas') {
+                matchesVencimiento = cliente.facturas_vencidas > 0;
+            } else if (vencimiento === 'por_vencer') {
+                // Facturas que vencen en los próximos 7 días
+                const tienePorVencer = cliente.facturas.some(f =>
+                    f.dias_vencimiento > 0 && f.dias_vencimiento <= 7
+                );
+                matchesVencimiento = tienePorVencer && cliente.facturas_vencidas === 0;
+            } else if (vencimiento === 'al_dia') {
+                matchesVencimiento = cliente.facturas_vencidas === 0;
+            }
+        }
+
+        // Filtro por rango de fechas (si hay fechas seleccionadas)
+        let matchesFecha = true;
+        if (fechaDesde || fechaHasta) {
+            const clienteTieneFacturasEnRango = cliente.facturas.some(factura => {
+                const fechaFactura = new Date(factura.fecha_emision);
+                const desde = fechaDesde ? new Date(fechaDesde) : null;
+                const hasta = fechaHasta ? new Date(fechaHasta) : null;
+
+                if (desde && hasta) {
+                    return fechaFactura >= desde && fechaFactura <= hasta;
+                } else if (desde) {
+                    return fechaFactura >= desde;
+                } else if (hasta) {
+                    return fechaFactura <= hasta;
+                }
+                return true;
+            });
+            matchesFecha = clienteTieneFacturasEnRango;
+        }
+
+        return matchesSearch && matchesDeuda && matchesVencimiento && matchesFecha;
+    });
+
+    currentPage = 1;
+    loadClientes();
+    updateStats();
+}
+
+// ===== FUNCIONES DE BOTONES =====
+function initButtons() {
+    document.getElementById('btnHistorial').addEventListener('click', function () {
+        showNotification('Funcionalidad de historial en desarrollo', 'info');
+    });
+
+    document.getElementById('btnExportar').addEventListener('click', function () {
+        exportToExcel();
+    });
+
+    document.getElementById('prevPage').addEventListener('click', function () {
+        if (currentPage > 1) {
+            currentPage--;
+            loadClientes();
+        }
+    });
+
+    document.getElementById('nextPage').addEventListener('click', function () {
+        const totalPages = Math.ceil(filteredClientes.length / itemsPerPage);
+        if (currentPage < totalPages) {
+            currentPage++;
+            loadClientes();
+        }
+    });
+}
+
+// ===== FUNCIONES DE MODALES =====
+function initModals() {
+    // Botones de cierre
+    document.getElementById('closeCuentasModal').addEventListener('click', closeCuentasModal);
+    document.getElementById('closePagoModal').addEventListener('click', closePagoModal);
+
+    // Cerrar modal al hacer clic fuera
+    document.querySelectorAll('.modal, .cuentas-modal').forEach(modal => {
+        modal.addEventListener('click', function (e) {
+            if (e.target === this) {
+                if (this.id === 'cuentasModal') closeCuentasModal();
+                if (this.id === 'pagoModal') closePagoModal();
+            }
+        });
+    });
+
+    // Cerrar con tecla ESC
+    document.addEventListener('keydown', function (e) {
+        if (e.key === 'Escape') {
+            closeCuentasModal();
+            closePagoModal();
+        }
+    });
+}
+
+// ===== FUNCIONES DE CARGA DE DATOS =====
+function loadClientes() {
+    const tbody = document.getElementById('cuentasBody');
+    const startIndex = (currentPage - 1) * itemsPerPage;
+    const endIndex = startIndex + itemsPerPage;
+    const pageClientes = filteredClientes.slice(startIndex, endIndex);
+
+    if (pageClientes.length === 0) {
+        tbody.innerHTML = `
+            <tr class="empty-state">
+                <td colspan="7">
+                    <svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
+                    </svg>
+                    <h3>No hay clientes con deudas pendientes</h3>
+                    <p>No se encontraron resultados con los filtros aplicados</p>
+                </td>
+            </tr>
+        `;
+    } else {
+        tbody.innerHTML = pageClientes.map(cliente => `
+            <tr class="cliente-row" data-cliente-id="${cliente.id}">
+                <td style="font-weight: 700; color: #2c3e50;">${cliente.cedula}</td>
+                <td>
+                    <div class="customer-info">
+                        <div class="customer-name">
+                            ${cliente.nombre_completo}
+                            ${cliente.tipo_cliente ?
+                `<div style="font-size: 0.85rem; color: #718096;">${cliente.tipo_cliente}</div>` : ''}
+                        </div>
+                    </div>
+                </td>
+                <td>
+                    <div class="contact-info">
+                        ${cliente.telefono ?
+                `<div><i class="fas fa-phone"></i> ${cliente.telefono}</div>` : ''}
+                        ${cliente.email ?
+                `<div><i class="fas fa-envelope"></i> ${cliente.email}</div>` : ''}
+                    </div>
+                </td>
+                <td>
+                    <div class="facturas-count">
+                        <span class="badge" style="background: #667eea; color: white; padding: 0.5rem 1rem; border-radius: 12px; font-weight: 600;">
+                            ${cliente.cantidad_facturas} factura(s)
+                        </span>
+                        ${cliente.facturas_vencidas > 0 ?
+                `<div class="vencido-badge" style="margin-top: 0.25rem;">
+                                ${cliente.facturas_vencidas} vencida(s)
+                            </div>` : ''}
+                    </div>
+                </td>
+                <td>
+                    <div class="deuda-total">
+                        <span style="font-weight: 700; font-size: 1.2rem; color: #ff7e5f;">
+                            $${formatCurrency(cliente.total_adeudado)}
+                        </span>
+                        ${cliente.deuda_vencida > 0 ?
+                `<div style="font-size: 0.85rem; color: #ff416c; margin-top: 0.25rem;">
+                                $${formatCurrency(cliente.deuda_vencida)} vencida
+                            </div>` : ''}
+                    </div>
+                </td>
+                <td>
+                    ${cliente.nivel_deuda === 'alta' ?
+                `<span class="deuda-badge deuda-alta">
+                            <i class="fas fa-exclamation-triangle"></i> Alta
+                        </span>` :
+                cliente.nivel_deuda === 'media' ?
+                    `<span class="deuda-badge deuda-media">
+                            <i class="fas fa-exclamation-circle"></i> Media
+                        </span>` :
+                    `<span class="deuda-badge deuda-baja">
+                            <i class="fas fa-check-circle"></i> Baja
+                        </span>`}
+                </td>
+                <td>
+                    <div class="action-buttons">
+                        <button class="btn-icon btn-view" onclick="verDetallesCliente(${cliente.id})" title="Ver detalles y facturas">
+                            <i class="fas fa-eye"></i>
+                        </button>
+                        <button class="btn-icon btn-edit" onclick="registrarPago(${cliente.id})" title="Registrar pago">
+                            <i class="fas fa-money-bill-wave"></i>
+                        </button>
+                        <button class="btn-icon btn-warning" onclick="contactarCliente('${cliente.telefono}')" title="Contactar cliente">
+                            <i class="fas fa-phone"></i>
+                        </button>
+                    </div>
+                </td>
+            </tr>
+        `).join('');
+
+        // Agregar evento click a las filas
+        document.querySelectorAll('.cliente-row').forEach(row => {
+            row.addEventListener('click', function (e) {
+                if (!e.target.closest('.action-buttons')) {
+                    const clienteId = this.getAttribute('data-cliente-id');
+                    verDetallesCliente(parseInt(clienteId));
+                }
+            });
+        });
+    }
+
+    updatePagination();
+}
+
+function updateStats() {
+    const totalClientes = filteredClientes.length;
+    const totalFacturas = filteredClientes.reduce((sum, c) => sum + c.cantidad_facturas, 0);
+    const totalDeuda = filteredClientes.reduce((sum, c) => sum + c.total_adeudado, 0);
+    const facturasVencidas = filteredClientes.reduce((sum, c) => sum + c.facturas_vencidas, 0);
+
+    document.getElementById('totalClientes').textContent = totalClientes;
+    document.getElementById('facturasPendientes').textContent = totalFacturas;
+    document.getElementById('totalDeudaValor').textContent = formatCurrency(totalDeuda);
+    document.getElementById('facturasVencidas').textContent = facturasVencidas;
+}
+
+function updatePagination() {
+    const totalPages = Math.ceil(filteredClientes.length / itemsPerPage);
+    document.getElementById('pageInfo').textContent = `Página ${currentPage} de ${totalPages}`;
+
+    document.getElementById('prevPage').disabled = currentPage === 1;
+    document.getElementById('nextPage').disabled = currentPage === totalPages;
+}
+
+// ===== FUNCIONES DE DETALLES DEL CLIENTE =====
+function verDetallesCliente(clienteId) {
+    currentClienteId = clienteId;
+    const cliente = clientesData.find(c => c.id === clienteId);
+
+    if (!cliente) {
+        showNotification('Cliente no encontrado', 'error');
+        return;
+    }
+
+    const modalBody = document.getElementById('cuentasModalBody');
+
+    // Calcular resumen
+    const totalFacturas = cliente.cantidad_facturas;
+    const facturasVencidas = cliente.facturas_vencidas;
+    const totalDeuda = cliente.total_adeudado;
+    const deudaVencida = cliente.deuda_vencida;
+
+    // Generar HTML de facturas
+    const facturasHTML = cliente.facturas.map(factura => {
+        const claseVencida = factura.vencida ? 'vencida' : '';
+        const diasTexto = factura.dias_vencimiento > 0 ?
+            `Vence en ${factura.dias_vencimiento} días` :
+            factura.dias_vencimiento === 0 ?
+                'Vence hoy' :
+                `Vencida hace ${Math.abs(factura.dias_vencimiento)} días`;
+
+        return `
+            <div class="factura-item ${claseVencida}" data-factura-id="${factura.id}">
+                <div style="flex: 2;">
+                    <strong>Factura #${factura.numero}</strong>
+                    <div style="font-size: 0.9rem; color: #718096;">
+                        Fecha: ${formatDate(factura.fecha_emision)} | Vence: ${formatDate(factura.fecha_vencimiento)}
+                    </div>
+                    <div class="dias-vencimiento ${factura.vencida ? 'vencido' : ''}">
+                        <i class="fas ${factura.vencida ? 'fa-exclamation-triangle' : 'fa-calendar-alt'}"></i>
+                        ${diasTexto}
+                    </div>
+                </div>
+                <div style="text-align: right;">
+                    <div style="font-size: 1.1rem; font-weight: 700; color: #2c3e50;">
+                        $${formatCurrency(factura.monto_total)}
+                    </div>
+                    <div style="font-size: 0.9rem; color: #ff7e5f;">
+                        Saldo: $${formatCurrency(factura.saldo_pendiente)}
+                    </div>
+                </div>
+                <button class="btn-icon btn-view" onclick="verDetalleFactura(${factura.id})" style="margin-left: 1rem;" title="Ver detalle">
+                    <i class="fas fa-eye"></i>
+                </button>
+            </div>
+        `;
+    }).join('');
+
+    // Historial de pagos
+    const historialHTML = cliente.historial_pagos && cliente.historial_pagos.length > 0 ?
+        cliente.historial_pagos.map(pago => `
+            <div class="pago-item">
+                <div>
+                    <strong>${formatDate(pago.fecha)}</strong>
+                    <div style="font-size: 0.85rem; color: #718096;">${pago.metodo}</div>
+                </div>
+                <div style="font-weight: 700; color: #38a169;">
+                    +$${formatCurrency(pago.monto)}
+                </div>
+            </div>
+        `).join('') :
+        '<p style="color: #718096; text-align: center; padding: 1rem;">No hay historial de pagos</p>';
+
+    modalBody.innerHTML = `
+        <div class="cuentas-tabs">
+            <div class="cuentas-tab active" onclick="cambiarTab('facturas')">Facturas Pendientes</div>
+            <div class="cuentas-tab" onclick="cambiarTab('pagos')">Historial de Pagos</div>
+            <div class="cuentas-tab" onclick="cambiarTab('info')">Información del Cliente</div>
+        </div>
+        
+        <!-- Resumen de deuda -->
+        <div class="resumen-deuda">
+            <h4>Resumen de Deuda</h4>
+            <div class="resumen-item">
+                <span>Total Facturas Pendientes:</span>
+                <span>${totalFacturas}</span>
+            </div>
+            <div class="resumen-item">
+                <span>Facturas Vencidas:</span>
+                <span style="color: #ff416c;">${facturasVencidas}</span>
+            </div>
+            <div class="resumen-item">
+                <span>Deuda Total:</span>
+                <span>$${formatCurrency(totalDeuda)}</span>
+            </div>
+            <div class="resumen-item">
+                <span>Deuda Vencida:</span>
+                <span style="color: #ff416c;">$${formatCurrency(deudaVencida)}</span>
+            </div>
+            <div class="resumen-item resumen-total">
+                <span>Saldo Pendiente:</span>
+                <span>$${formatCurrency(totalDeuda)}</span>
+            </div>
+        </div>
+        
+        <!-- Tab de Facturas Pendientes -->
+        <div id="tab-facturas" class="tab-content active">
+            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
+                <h4 style="color: #2c3e50;">Facturas Pendientes (${totalFacturas})</h4>
+                <button class="btn btn-primary btn-sm" onclick="registrarPago(${cliente.id})">
+                    <span><i class="fas fa-money-bill-wave"></i></span>
+                    <span>Registrar Pago</span>
+                </button>
+            </div>
+            
+            <div id="facturasContainer" style="max-height: 400px; overflow-y: auto;">
+                ${facturasHTML || '<p style="color: #718096; text-align: center; padding: 2rem;">No hay facturas pendientes</p>'}
+            </div>
+            
+            <div style="margin-top: 1.5rem; display: flex; gap: 1rem;">
+                <button class="btn btn-warning" onclick="enviarRecordatorio(${cliente.id})">
+                    <span><i class="fas fa-envelope"></i></span>
+                    <span>Enviar Recordatorio</span>
+                </button>
+                <button class="btn btn-info" onclick="generarEstadoCuenta(${cliente.id})">
+                    <span><i class="fas fa-file-pdf"></i></span>
+                    <span>Generar Estado de Cuenta</span>
+                </button>
+            </div>
+        </div>
+        
+        <!-- Tab de Historial de Pagos -->
+        <div id="tab-pagos" class="tab-content">
+            <h4 style="color: #2c3e50; margin-bottom: 1rem;">Historial de Pagos</h4>
+            <div class="historial-pagos">
+                ${historialHTML}
+            </div>
+        </div>
+        
+        <!-- Tab de Información del Cliente -->
+        <div id="tab-info" class="tab-content">
+            <h4 style="color: #2c3e50; margin-bottom: 1rem;">Información del Cliente</h4>
+            <div style="background: #f8f9ff; padding: 1.5rem; border-radius: 15px;">
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-bottom: 1rem;">
+                    <div>
+                        <strong>Cédula:</strong>
+                        <div>${cliente.cedula}</div>
+                    </div>
+                    <div>
+                        <strong>Nombre:</strong>
+                        <div>${cliente.nombre_completo}</div>
+                    </div>
+                </div>
+                
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-bottom: 1rem;">
+                    <div>
+                        <strong>Teléfono:</strong>
+                        <div>${cliente.telefono || 'No registrado'}</div>
+                    </div>
+                    <div>
+                        <strong>Email:</strong>
+                        <div>${cliente.email || 'No registrado'}</div>
+                    </div>
+                </div>
+                
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;">
+                    <div>
+                        <strong>Dirección:</strong>
+                        <div>${cliente.direccion || 'No registrada'}</div>
+                    </div>
+                    <div>
+                        <strong>Tipo de Cliente:</strong>
+                        <div>${cliente.tipo_cliente || 'Regular'}</div>
+                    </div>
+                </div>
+                
+                ${cliente.notas ? `
+                    <div style="margin-top: 1rem;">
+                        <strong>Notas:</strong>
+                        <div style="background: #fff7ed; padding: 1rem; border-radius: 8px; margin-top: 0.5rem;">
+                            ${cliente.notas}
+                        </div>
+                    </div>
+                ` : ''}
+            </div>
+        </div>
+        
+        <div style="display: flex; gap: 1rem; justify-content: flex-end; margin-top: 2rem;">
+            <button class="btn btn-warning" onclick="closeCuentasModal()">Cerrar</button>
+        </div>
+    `;
+
+    document.getElementById('cuentasModal').classList.add('active');
+}
+
+function cambiarTab(tabName) {
+    // Remover clase active de todas las tabs
+    document.querySelectorAll('.cuentas-tab').forEach(tab => {
+        tab.classList.remove('active');
+    });
+
+    // Remover clase active de todos los contenidos
+    document.querySelectorAll('.tab-content').forEach(content => {
+        content.classList.remove('active');
+    });
+
+    // Agregar clase active a la tab seleccionada
+    document.querySelector(`.cuentas-tab[onclick*="${tabName}"]`).classList.add('active');
+
+    // Mostrar el contenido correspondiente
+    document.getElementById(`tab-${tabName}`).classList.add('active');
+}
+
+function verDetalleFactura(facturaId) {
+    const cliente = clientesData.find(c => c.facturas.some(f => f.id === facturaId));
+    const factura = cliente.facturas.find(f => f.id === facturaId);
+
+    const modalBody = document.getElementById('cuentasModalBody');
+
+    modalBody.innerHTML = `
+        <div style="background: white; border-radius: 15px; padding: 2rem;">
+            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 2rem;">
+                <div>
+                    <h2 style="color: #2c3e50; margin-bottom: 0.5rem;">Factura #${factura.numero}</h2>
+                    <div style="color: #718096;">${cliente.nombre_completo}</div>
+                </div>
+                <div>
+                    ${factura.vencida ?
+            '<span class="vencido-badge"><i class="fas fa-exclamation-triangle"></i> VENCIDA</span>' :
+            '<span class="deuda-badge deuda-baja"><i class="fas fa-check-circle"></i> PENDIENTE</span>'
+        }
+                </div>
+            </div>
+            
+            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 2rem; margin-bottom: 2rem;">
+                <div>
+                    <h4 style="color: #2c3e50; margin-bottom: 1rem;"><i class="fas fa-calendar"></i> Fechas</h4>
+                    <div style="background: #f8f9ff; padding: 1rem; border-radius: 10px;">
+                        <div style="margin-bottom: 0.5rem;">
+                            <strong>Fecha de Emisión:</strong> ${formatDate(factura.fecha_emision)}
+                        </div>
+                        <div style="margin-bottom: 0.5rem;">
+                            <strong>Fecha de Vencimiento:</strong> ${formatDate(factura.fecha_vencimiento)}
+                        </div>
+                        <div style="margin-bottom: 0.5rem; ${factura.vencida ? 'color: #ff416c; font-weight: 600;' : ''}">
+                            <strong>Estado:</strong> ${factura.vencida ? 'VENCIDA' : 'PENDIENTE'}
+                        </div>
+                        ${factura.dias_vencimiento !== undefined ? `
+                            <div style="margin-bottom: 0.5rem;">
+                                <strong>Días:</strong> ${factura.dias_vencimiento > 0 ?
+                `Vence en ${factura.dias_vencimiento} días` :
+                factura.dias_vencimiento === 0 ?
+                    'Vence hoy' :
+                    `Vencida hace ${Math.abs(factura.dias_vencimiento)} días`}
+                            </div>
+                        ` : ''}
+                    </div>
+                </div>
+                
+                <div>
+                    <h4 style="color: #2c3e50; margin-bottom: 1rem;"><i class="fas fa-dollar-sign"></i> Montos</h4>
+                    <div style="background: #f8f9ff; padding: 1rem; border-radius: 10px;">
+                        <div style="display: flex; justify-content: space-between; margin-bottom: 0.5rem;">
+                            <span>Subtotal:</span>
+                            <span>$${formatCurrency(factura.monto_total * 0.82)}</span>
+                        </div>
+                        <div style="display: flex; justify-content: space-between; margin-bottom: 0.5rem;">
+                            <span>ITBIS (18%):</span>
+                            <span>$${formatCurrency(factura.monto_total * 0.18)}</span>
+                        </div>
+                        <div style="display: flex; justify-content: space-between; font-weight: bold; font-size: 1.1rem; margin-bottom: 0.5rem;">
+                            <span>Total:</span>
+                            <span>$${formatCurrency(factura.monto_total)}</span>
+                        </div>
+                        <div style="display: flex; justify-content: space-between; font-weight: bold; font-size: 1.2rem; color: #ff7e5f; padding-top: 0.5rem; border-top: 1px solid #e0e6ff;">
+                            <span>Saldo Pendiente:</span>
+                            <span>$${formatCurrency(factura.saldo_pendiente)}</span>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <div style="margin-bottom: 2rem;">
+                <h4 style="color: #2c3e50; margin-bottom: 1rem;"><i class="fas fa-file-alt"></i> Detalles de la Factura</h4>
+                <div style="background: #f8f9ff; padding: 1rem; border-radius: 10px;">
+                    <div style="margin-bottom: 0.5rem;">
+                        <strong>Concepto:</strong> ${factura.concepto || 'Venta de productos/servicios'}
+                    </div>
+                    ${factura.descripcion ? `
+                        <div style="margin-bottom: 0.5rem;">
+                            <strong>Descripción:</strong> ${factura.descripcion}
+                        </div>
+                    ` : ''}
+                    ${factura.notas ? `
+                        <div style="margin-bottom: 0.5rem;">
+                            <strong>Notas:</strong> ${factura.notas}
+                        </div>
+                    ` : ''}
+                </div>
+            </div>
+            
+            <div style="display: flex; gap: 1rem; justify-content: flex-end;">
+                <button class="btn btn-warning" onclick="verDetallesCliente(${cliente.id})">
+                    <span><i class="fas fa-arrow-left"></i></span>
+                    <span>Volver al Cliente</span>
+                </button>
+                <button class="btn btn-primary" onclick="registrarPagoFactura(${factura.id})">
+                    <span><i class="fas fa-money-bill-wave"></i></span>
+                    <span>Registrar Pago</span>
+                </button>
+            </div>
+        </div>
+    `;
+}
+
+// ===== FUNCIONES DE PAGOS =====
+function registrarPago(clienteId) {
+    currentClienteId = clienteId;
+    const cliente = clientesData.find(c => c.id === clienteId);
+
+    const modalBody = document.getElementById('pagoModalBody');
+    const totalPendiente = cliente.total_adeudado;
+
+    modalBody.innerHTML = `
+        <input type="hidden" id="pagoClienteId" value="${clienteId}">
+        
+        <div style="background: #f8f9ff; padding: 1.5rem; border-radius: 15px; margin-bottom: 1.5rem;">
+            <div style="text-align: center; margin-bottom: 1rem;">
+                <div style="font-size: 1.2rem; color: #2c3e50; margin-bottom: 0.5rem;">
+                    <strong>${cliente.nombre_completo}</strong>
+                </div>
+                <div style="color: #718096;">Cédula: ${cliente.cedula}</div>
+            </div>
+            
+            <div style="text-align: center;">
+                <div style="color: #718096; margin-bottom: 0.5rem;">Saldo Pendiente Total</div>
+                <div style="font-size: 2rem; font-weight: 700; color: #ff7e5f;">
+                    $${formatCurrency(totalPendiente)}
+                </div>
+            </div>
+        </div>
+        
+        <div class="pago-form">
+            <h4 style="color: #2c3e50; margin-bottom: 1rem;"><i class="fas fa-money-bill-wave"></i> Registrar Pago</h4>
+            
+            <div class="form-group">
+                <label for="montoPago"><i class="fas fa-dollar-sign"></i> Monto a Pagar *</label>
+                <input type="number" id="montoPago" 
+                       min="0.01" 
+                       max="${totalPendiente}"
+                       step="0.01"
+                       value="${totalPendiente}"
+                       placeholder="0.00"
+                       oninput="actualizarSaldoRestante()">
+                <div style="font-size: 0.85rem; color: #718096; margin-top: 0.25rem;">
+                    Máximo: $${formatCurrency(totalPendiente)}
+                </div>
+            </div>
+            
+            <div class="form-group">
+                <label for="fechaPago"><i class="fas fa-calendar"></i> Fecha de Pago *</label>
+                <input type="date" id="fechaPago" value="${new Date().toISOString().split('T')[0]}">
+            </div>
+            
+            <div class="form-group">
+                <label><i class="fas fa-credit-card"></i> Método de Pago *</label>
+                <div class="metodo-pago">
+                    <div class="metodo-pago-option" onclick="seleccionarMetodoPago('efectivo')">
+                        <div style="font-size: 2rem; margin-bottom: 0.5rem;">
+                            <i class="fas fa-money-bill-wave"></i>
+                        </div>
+                        <div>Efectivo</div>
+                    </div>
+                    <div class="metodo-pago-option" onclick="seleccionarMetodoPago('tarjeta')">
+                        <div style="font-size: 2rem; margin-bottom: 0.5rem;">
+                            <i class="fas fa-credit-card"></i>
+                        </div>
+                        <div>Tarjeta</div>
+                    </div>
+                    <div class="metodo-pago-option" onclick="seleccionarMetodoPago('transferencia')">
+                        <div style="font-size: 2rem; margin-bottom: 0.5rem;">
+                            <i class="fas fa-university"></i>
+                        </div>
+                        <div>Transferencia</div>
+                    </div>
+                </div>
+                <input type="hidden" id="metodoPago" value="efectivo">
+            </div>
+            
+            <div class="form-group">
+                <label for="referenciaPago"><i class="fas fa-receipt"></i> Referencia/Comprobante</label>
+                <input type="text" id="referenciaPago" placeholder="Número de referencia, comprobante, etc.">
+            </div>
+            
+            <div class="form-group">
+                <label for="notasPago"><i class="fas fa-sticky-note"></i> Notas Adicionales</label>
+                <textarea id="notasPago" rows="2" placeholder="Observaciones sobre el pago..."></textarea>
+            </div>
+            
+            <div id="saldoRestanteContainer" style="background: #e6fffa; padding: 1rem; border-radius: 10px; margin-top: 1rem; display: none;">
+                <div style="display: flex; justify-content: space-between; align-items: center;">
+                    <div>
+                        <strong>Saldo Restante:</strong>
+                        <div style="color: #718096; font-size: 0.9rem;">Después de este pago</div>
+                    </div>
+                    <div style="font-size: 1.5rem; font-weight: 700; color: #38a169;" id="saldoRestante">
+                        $0.00
+                    </div>
+                </div>
+            </div>
+            
+            <div style="display: flex; gap: 1rem; justify-content: flex-end; margin-top: 1.5rem;">
+                <button class="btn btn-warning" onclick="closePagoModal()">Cancelar</button>
+                <button class="btn btn-primary" onclick="procesarPago()">
+                    <span><i class="fas fa-check-circle"></i></span>
+                    <span>Registrar Pago</span>
+                </button>
+            </div>
+        </div>
+    `;
+
+    seleccionarMetodoPago('efectivo');
+    actualizarSaldoRestante();
+
+    document.getElementById('pagoModal').classList.add('active');
+}
+
+function registrarPagoFactura(facturaId) {
+    currentFacturaId = facturaId;
+    const cliente = clientesData.find(c => c.facturas.some(f => f.id === facturaId));
+    const factura = cliente.facturas.find(f => f.id === facturaId);
+
+    const modalBody = document.getElementById('pagoModalBody');
+
+    modalBody.innerHTML = `
+        <input type="hidden" id="pagoFacturaId" value="${facturaId}">
+        <input type="hidden" id="pagoClienteId" value="${cliente.id}">
+        
+        <div style="background: #f8f9ff; padding: 1.5rem; border-radius: 15px; margin-bottom: 1.5rem;">
+            <div style="text-align: center; margin-bottom: 1rem;">
+                <div style="font-size: 1.2rem; color: #2c3e50; margin-bottom: 0.5rem;">
+                    <strong>Factura #${factura.numero}</strong>
+                </div>
+                <div style="color: #718096;">${cliente.nombre_completo}</div>
+            </div>
+            
+            <div style="text-align: center;">
+                <div style="color: #718096; margin-bottom: 0.5rem;">Saldo Pendiente de esta Factura</div>
+                <div style="font-size: 2rem; font-weight: 700; color: #ff7e5f;">
+                    $${formatCurrency(factura.saldo_pendiente)}
+                </div>
+            </div>
+        </div>
+        
+        <div class="pago-form">
+            <h4 style="color: #2c3e50; margin-bottom: 1rem;"><i class="fas fa-money-bill-wave"></i> Registrar Pago</h4>
+            
+            <div class="form-group">
+                <label for="montoPago"><i class="fas fa-dollar-sign"></i> Monto a Pagar *</label>
+                <input type="number" id="montoPago" 
+                       min="0.01" 
+                       max="${factura.saldo_pendiente}"
+                       step="0.01"
+                       value="${factura.saldo_pendiente}"
+                       placeholder="0.00"
+                       oninput="actualizarSaldoRestanteFactura()">
+                <div style="font-size: 0.85rem; color: #718096; margin-top: 0.25rem;">
+                    Máximo: $${formatCurrency(factura.saldo_pendiente)}
+                </div>
+            </div>
+            
+            <div class="form-group">
+                <label for="fechaPago"><i class="fas fa-calendar"></i> Fecha de Pago *</label>
+                <input type="date" id="fechaPago" value="${new Date().toISOString().split('T')[0]}">
+            </div>
+            
+            <div class="form-group">
+                <label><i class="fas fa-credit-card"></i> Método de Pago *</label>
+                <div class="metodo-pago">
+                    <div class="metodo-pago-option" onclick="seleccionarMetodoPago('efectivo')">
+                        <div style="font-size: 2rem; margin-bottom: 0.5rem;">
+                            <i class="fas fa-money-bill-wave"></i>
+                        </div>
+                        <div>Efectivo</div>
+                    </div>
+                    <div class="metodo-pago-option" onclick="seleccionarMetodoPago('tarjeta')">
+                        <div style="font-size: 2rem; margin-bottom: 0.5rem;">
+                            <i class="fas fa-credit-card"></i>
+                        </div>
+                        <div>Tarjeta</div>
+                    </div>
+                    <div class="metodo-pago-option" onclick="seleccionarMetodoPago('transferencia')">
+                        <div style="font-size: 2rem; margin-bottom: 0.5rem;">
+                            <i class="fas fa-university"></i>
+                        </div>
+                        <div>Transferencia</div>
+                    </div>
+                </div>
+                <input type="hidden" id="metodoPago" value="efectivo">
+            </div>
+            
+            <div class="form-group">
+                <label for="referenciaPago"><i class="fas fa-receipt"></i> Referencia/Comprobante</label>
+                <input type="text" id="referenciaPago" placeholder="Número de referencia, comprobante, etc.">
+            </div>
+            
+            <div class="form-group">
+                <label for="notasPago"><i class="fas fa-sticky-note"></i> Notas Adicionales</label>
+                <textarea id="notasPago" rows="2" placeholder="Observaciones sobre el pago..."></textarea>
+            </div>
+            
+            <div id="saldoRestanteContainer" style="background: #e6fffa; padding: 1rem; border-radius: 10px; margin-top: 1rem;">
+                <div style="display: flex; justify-content: space-between; align-items: center;">
+                    <div>
+                        <strong>Saldo Restante de la Factura:</strong>
+                        <div style="color: #718096; font-size: 0.9rem;">Después de este pago</div>
+                    </div>
+                    <div style="font-size: 1.5rem; font-weight: 700; color: #38a169;" id="saldoRestanteFactura">
+                        $0.00
+                    </div>
+                </div>
+            </div>
+            
+            <div style="display: flex; gap: 1rem; justify-content: flex-end; margin-top: 1.5rem;">
+                <button class="btn btn-warning" onclick="closePagoModal()">Cancelar</button>
+                <button class="btn btn-primary" onclick="procesarPagoFactura()">
+                    <span><i class="fas fa-check-circle"></i></span>
+                    <span>Registrar Pago</span>
+                </button>
+            </div>
+        </div>
+    `;
+
+    seleccionarMetodoPago('efectivo');
+    actualizarSaldoRestanteFactura();
+
+    document.getElementById('pagoModal').classList.add('active');
+}
+
+function seleccionarMetodoPago(metodo) {
+    // Remover selección anterior
+    document.querySelectorAll('.metodo-pago-option').forEach(option => {
+        option.classList.remove('selected');
+    });
+
+    // Marcar como seleccionado
+    const selectedOption = document.querySelector(`.metodo-pago-option[onclick*="${metodo}"]`);
+    if (selectedOption) {
+        selectedOption.classList.add('selected');
+    }
+
+    // Actualizar valor oculto
+    document.getElementById('metodoPago').value = metodo;
+}
+
+function actualizarSaldoRestante() {
+    const montoPago = parseFloat(document.getElementById('montoPago').value) || 0;
+    const clienteId = document.getElementById('pagoClienteId').value;
+    const cliente = clientesData.find(c => c.id === parseInt(clienteId));
+
+    if (!cliente) return;
+
+    const totalPendiente = cliente.total_adeudado;
+    const saldoRestante = totalPendiente - montoPago;
+    const saldoElement = document.getElementById('saldoRestante');
+    const container = document.getElementById('saldoRestanteContainer');
+
+    if (saldoElement) {
+        saldoElement.textContent = `$${formatCurrency(saldoRestante)}`;
+        saldoElement.style.color = saldoRestante > 0 ? '#ff7e5f' : '#38a169';
+
+        if (saldoRestante > 0) {
+            container.style.display = 'block';
+        } else {
+            container.style.display = 'none';
+        }
+    }
+}
+
+function actualizarSaldoRestanteFactura() {
+    const montoPago = parseFloat(document.getElementById('montoPago').value) || 0;
+    const facturaId = document.getElementById('pagoFacturaId').value;
+
+    // Encontrar la factura
+    let saldoFactura = 0;
+    for (const cliente of clientesData) {
+        const factura = cliente.facturas.find(f => f.id === parseInt(facturaId));
+        if (factura) {
+            saldoFactura = factura.saldo_pendiente;
+            break;
+        }
+    }
+
+    const saldoRestante = saldoFactura - montoPago;
+    const saldoElement = document.getElementById('saldoRestanteFactura');
+
+    if (saldoElement) {
+        saldoElement.textContent = `$${formatCurrency(saldoRestante)}`;
+        saldoElement.style.color = saldoRestante > 0 ? '#ff7e5f' : '#38a169';
+    }
+}
+
+function getCsrfToken() {
+    return document.querySelector('[name=csrfmiddlewaretoken]').value;
+}
+
+// Descripción del abono en el libro: método, referencia, factura y notas
+function descripcionPago(factura) {
+    const hoy = new Date().toISOString().split('T')[0];
+    const fecha = document.getElementById('fechaPago').value;
+    const partes = [`Pago ${document.getElementById('metodoPago').value}`];
+    const referencia = document.getElementById('referenciaPago').value.trim();
+    const notas = document.getElementById('notasPago').value.trim();
+
+    if (referencia) partes.push(`Ref. ${referencia}`);
+    if (factura) partes.push(`Factura ${factura.numero}`);
+    if (fecha && fecha !== hoy) partes.push(`Recibido ${fecha}`);
+    if (notas) partes.push(notas);
+    return partes.join(' · ');
+}
+
+// Registrar el abono en la cuenta del cliente y recargar la cartera
+function enviarPago(clienteId, monto, descripcion) {
+    return fetch(PAGINA.urls.registrarPago.replace('/0/', `/${clienteId}/`), {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': getCsrfToken(),
+        },
+        body: JSON.stringify({ monto: monto, descripcion: descripcion }),
+    })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                showNotification(data.error || 'No se pudo registrar el pago', 'error');
+                return;
+            }
+            showNotification(`Pago de $${formatCurrency(monto)} registrado. Saldo: $${formatCurrency(data.saldo)}`, 'success');
+            closePagoModal();
+            setTimeout(() => window.location.reload(), 1000);
+        })
+        .catch(() => showNotification('Error de conexión al registrar el pago', 'error'));
+}
+
+function validarPago(monto) {
+    if (!monto || monto <= 0) {
+        showNotification('El monto del pago debe ser mayor a 0', 'error');
+        return false;
+    }
+    if (!document.getElementById('fechaPago').value) {
+        showNotification('La fecha de pago es requerida', 'error');
+        return false;
+    }
+    return true;
+}
+
+function procesarPago() {
+    const clienteId = parseInt(document.getElementById('pagoClienteId').value);
+    const monto = parseFloat(document.getElementById('montoPago').value) || 0;
+
+    if (!validarPago(monto)) return;
+    enviarPago(clienteId, monto, descripcionPago(null));
+}
+
+// El abono se aplica a los cargos que vencen primero (ver cuentas.registrar_abono);
+// la factura queda anotada en la descripción del pago
+function procesarPagoFactura() {
+    const facturaId = parseInt(document.getElementById('pagoFacturaId').value);
+    const clienteId = parseInt(document.getElementById('pagoClienteId').value);
+    const monto = parseFloat(document.getElementById('montoPago').value) || 0;
+    const cliente = clientesData.find(c => c.id === clienteId);
+    const factura = cliente.facturas.find(f => f.id === facturaId);
+
+    if (!validarPago(monto)) return;
+    enviarPago(clienteId, monto, descripcionPago(factura));
+}
+
+// ===== FUNCIONES AUXILIARES =====
+function contactarCliente(telefono) {
+    if (telefono && telefono !== 'No registrado') {
+        if (confirm(`¿Desea llamar al cliente al número ${telefono}?`)) {
+            // En un entorno real, esto iniciaría una llamada
+            showNotification(`Llamando a ${telefono}...`, 'info');
+        }
+    } else {
+        showNotification('El cliente no tiene teléfono registrado', 'error');
+    }
+}
+
+function enviarRecordatorio(clienteId) {
+    const cliente = clientesData.find(c => c.id === clienteId);
+    if (cliente && confirm(`¿Enviar recordatorio de pago a ${cliente.nombre_completo}?`)) {
+        showNotification(`Recordatorio enviado a ${cliente.email || 'el cliente'}`, 'success');
+    }
+}
+
+function generarEstadoCuenta(clienteId) {
+    const cliente = clientesData.find(c => c.id === clienteId);
+    if (cliente) {
+        showNotification(`Generando estado de cuenta para ${cliente.nombre_completo}...`, 'info');
+        // En una implementación real, aquí se generaría el PDF
+    }
+}
+
+function closeCuentasModal() {
+    document.getElementById('cuentasModal').classList.remove('active');
+    currentClienteId = null;
+}
+
+function closePagoModal() {
+    document.getElementById('pagoModal').classList.remove('active');
+    currentClienteId = null;
+    currentFacturaId = null;
+}
+
+// ===== FUNCIONES DE FORMATO =====
+function formatCurrency(amount) {
+    return parseFloat(amount).toLocaleString('es-DO', {
+        minimumFractionDigits: 2,
+        maximumFractionDigits: 2
+    });
+}
+
+function formatDate(dateString) {
+    const date = new Date(dateString);
+    return date.toLocaleDateString('es-DO', {
+        year: 'numeric',
+        month: 'long',
+        day: 'numeric'
+    });
+}
+
+// ===== FUNCIONES DE EXPORTACIÓN =====
+function exportToExcel() {
+    showNotification('Exportando datos a Excel...', 'info');
+
+    // En una implementación real, aquí se generaría el archivo Excel
+    setTimeout(() => {
+        showNotification('Reporte exportado exitosamente', 'success');
+    }, 1500);
+}
+
+// ===== FUNCIONES DE NOTIFICACIÓN =====
+function showNotification(message, type = 'success') {
+    // Remover notificaciones anteriores
+    const existing = document.querySelectorAll('.notification');
+    existing.forEach(n => n.remove());
+
+    // Crear notificación
+    const notification = document.createElement('div');
+    notification.className = `notification ${type}`;
+    notification.innerHTML = `
+        <i class="fas ${type === 'success' ? 'fa-check-circle' :
+            type === 'error' ? 'fa-exclamation-circle' :
+                type === 'info' ? 'fa-info-circle' :
+                    'fa-exclamation-triangle'}"></i>
+        <span>${message}</span>
+    `;
+
+    document.body.appendChild(notification);
+
+    // Remover después de 5 segundos
+    setTimeout(() => {
+        notification.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => notification.remove(), 300);
+    }, 5000);
+}
+
+// ===== INICIALIZACIÓN FINAL =====
+console.log('✅ Sistema de Cuentas por Cobrar cargado correctamente');
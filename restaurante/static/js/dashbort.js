@@ -0,0 +1,623 @@
+// Variables globales
+let currentChartPeriod = 'week';
+let currentCategoryChart = 'type';
+
+// Variables para los gráficos
+let salesChartInstance = null;
+let categoryChartInstance = null;
+
+// Variables para almacenar datos procesados desde Django
+let semanaData = null;
+let mesData = null;
+let anioData = null;
+let semanaLabels = null;
+let mesLabels = null;
+let anioLabels = null;
+let categoriasData = null;
+let ventasCategoriasData = null;
+
+// Inicializar la aplicación
+document.addEventListener('DOMContentLoaded', function () {
+    updateDateTime();
+
+    // Cargar datos procesados desde Django
+    cargarDatosProcesados();
+
+    // Inicializar gráficos
+    initSalesChart();
+    initCategoryChart();
+
+    // Actualizar fecha y hora cada segundo
+    setInterval(updateDateTime, 1000);
+
+    // Verificar consistencia de datos
+    checkDataConsistency();
+
+    // Actualizar estadísticas cada 30 segundos
+    setInterval(updateStats, 30000);
+
+    // Ejecutar diagnóstico después de 2 segundos
+    setTimeout(diagnosticarDatosGraficos, 2000);
+});
+
+// Función para cargar datos procesados desde Django
+function cargarDatosProcesados() {
+    try {
+        console.log('Cargando datos del gráfico...');
+
+        semanaLabels = JSON.parse(PAGINA.diasGrafico);
+        semanaData = JSON.parse(PAGINA.ventasGrafico);
+        mesLabels = JSON.parse(PAGINA.labelsMensuales);
+        mesData = JSON.parse(PAGINA.proyeccionMensual);
+        anioLabels = JSON.parse(PAGINA.labelsAnuales);
+        anioData = JSON.parse(PAGINA.proyeccionAnual);
+        categoriasData = JSON.parse(PAGINA.categoriasGrafico);
+        ventasCategoriasData = JSON.parse(PAGINA.ventasCategoriasGrafico);
+
+        console.log('Datos de semana cargados:', semanaLabels, semanaData);
+        console.log('Datos mensuales cargados:', mesLabels, mesData);
+        console.log('Datos anuales cargados:', anioLabels, anioData);
+        console.log('Datos categorías cargados:', categoriasData, ventasCategoriasData);
+
+        // Verificar que los datos no estén vacíos
+        if (semanaData.every(val => val === 0)) {
+            console.warn('Los datos de ventas de la semana están vacíos o son cero');
+            // Mostrar mensaje al usuario
+            showNotification('No hay datos de ventas para mostrar en el gráfico. Verifica que tengas facturas pagadas en el sistema.', 'info');
+        }
+
+    } catch (e) {
+        console.error('Error cargando datos procesados:', e);
+        // En caso de error, usar datos vacíos
+        semanaLabels = ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom'];
+        semanaData = [0, 0, 0, 0, 0, 0, 0];
+        mesLabels = ['Sem 1', 'Sem 2', 'Sem 3', 'Sem 4'];
+        mesData = [0, 0, 0, 0];
+        anioLabels = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic'];
+        anioData = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0];
+        categoriasData = ['Entradas', 'Platos Fuertes', 'Postres', 'Bebidas', 'Otros'];
+        ventasCategoriasData = [0, 0, 0, 0, 0];
+    }
+}
+
+// Función para formatear números con comas
+function formatNumberWithCommas(num) {
+    if (typeof num === 'undefined' || num === null) return '0';
+    return num.toString().replace(/\B(?=(\d{3})+(?!\d))/g, ",");
+}
+
+// Función para actualizar estadísticas vía AJAX
+function updateStats() {
+    fetch('/dashboard/stats/')
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('Network response was not ok');
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (data.status === 'success') {
+                const formattedVentaDia = '$' + formatNumberWithCommas(data.venta_dia.toFixed(2));
+                document.getElementById('ventaDia').textContent = formattedVentaDia;
+                document.getElementById('ventaMes').textContent = '$' + formatNumberWithCommas(data.venta_mes.toFixed(2));
+                document.getElementById('gastosTotales').textContent = '$' + formatNumberWithCommas(data.gastos_totales.toFixed(2));
+                document.getElementById('gananciasNetas').textContent = '$' + formatNumberWithCommas(data.ganancias_netas.toFixed(2));
+                document.getElementById('totalPedidos').textContent = data.total_pedidos;
+                document.getElementById('nuevosClientes').textContent = data.nuevos_clientes;
+                document.getElementById('clientesRecurrentes').textContent = data.clientes_recurrentes;
+
+                // Actualizar fecha y hora
+                document.getElementById('currentDate').textContent = data.fecha_actual;
+                document.getElementById('currentTime').textContent = data.hora_actual;
+
+                console.log('Estadísticas actualizadas:', data);
+            } else {
+                console.error('Error en la respuesta del servidor:', data.message);
+            }
+        })
+        .catch(error => {
+            console.error('Error al actualizar estadísticas:', error);
+            // No mostrar error al usuario para no interrumpir la experiencia
+        });
+}
+
+// Función para verificar consistencia de datos
+function checkDataConsistency() {
+    const ventaDiaElement = document.getElementById('ventaDia');
+    const actividades = document.querySelectorAll('.activity-item');
+
+    if (ventaDiaElement && actividades.length > 0) {
+        const ventaDiaText = ventaDiaElement.textContent;
+        const ventaDiaValue = parseFloat(ventaDiaText.replace(/[$,]/g, '')) || 0;
+
+        let ventaCalculada = 0;
+
+        actividades.forEach(actividad => {
+            const amountElement = actividad.querySelector('.activity-amount');
+            if (amountElement && amountElement.classList.contains('positive')) {
+                const amountText = amountElement.textContent;
+                const amountValue = parseFloat(amountText.replace(/[+$,]/g, '')) || 0;
+                ventaCalculada += amountValue;
+            }
+        });
+
+        if (ventaCalculada > 0 && ventaDiaValue === 0) {
+            console.warn('Discrepancia encontrada: Hay actividades de hoy pero venta del día es $0');
+            showNotification('Hay actividades de hoy pero venta del día es $0. Revisa la sección de depuración.', 'info');
+        }
+    }
+}
+
+// Función para diagnóstico de datos
+function diagnosticarDatosGraficos() {
+    console.log('=== DIAGNÓSTICO DE DATOS DE GRÁFICOS ===');
+
+    // Verificar datos de semana
+    console.log('Datos de semana:', semanaData);
+    console.log('Etiquetas semana:', semanaLabels);
+
+    // Verificar si todos son ceros
+    const todosCerosSemana = semanaData.every(val => val === 0);
+    if (todosCerosSemana) {
+        console.warn('⚠️ ADVERTENCIA: Todos los datos de la semana son 0');
+        console.log('Posibles causas:');
+        console.log('1. No hay facturas en la base de datos');
+        console.log('2. Las facturas no tienen estado "pagada"');
+        console.log('3. Las fechas de las facturas no coinciden con el rango consultado');
+        console.log('4. El período de 6:00 AM a 5:59 AM no coincide con las fechas de facturas');
+
+        // Mostrar alerta al usuario
+        showNotification('No hay datos de ventas para mostrar. Verifica que tengas facturas pagadas en el sistema.', 'warning');
+    } else {
+        console.log('✅ Datos de semana OK');
+    }
+
+    // Verificar datos de categorías
+    console.log('Datos de categorías:', ventasCategoriasData);
+    console.log('Etiquetas categorías:', categoriasData);
+
+    // Verificar datos mensuales
+    console.log('Datos mensuales:', mesData);
+    console.log('Etiquetas mensuales:', mesLabels);
+
+    // Verificar datos anuales
+    console.log('Datos anuales:', anioData);
+    console.log('Etiquetas anuales:', anioLabels);
+
+    console.log('=== FIN DIAGNÓSTICO ===');
+}
+
+// Inicializar gráfico de ventas
+function initSalesChart() {
+    const ctx = document.getElementById('salesChart').getContext('2d');
+
+    const config = {
+        type: 'line',
+        data: {
+            labels: semanaLabels,
+            datasets: [{
+                label: 'Ventas ($)',
+                data: semanaData,
+                borderColor: '#ff7e5f',
+                backgroundColor: 'rgba(255, 126, 95, 0.1)',
+                borderWidth: 3,
+                fill: true,
+                tension: 0.4
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false },
+                tooltip: {
+                    mode: 'index',
+                    intersect: false,
+                    callbacks: {
+                        label: function (context) {
+                            return `Ventas: $${formatNumberWithCommas(context.parsed.y.toFixed(2))}`;
+                        }
+                    }
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    grid: { color: 'rgba(0, 0, 0, 0.05)' },
+                    ticks: {
+                        callback: function (value) {
+                            return '$' + formatNumberWithCommas(value);
+                        }
+                    }
+                },
+                x: {
+                    grid: { color: 'rgba(0, 0, 0, 0.05)' }
+                }
+            }
+        }
+    };
+
+    salesChartInstance = new Chart(ctx, config);
+}
+
+// Inicializar gráfico de categorías
+function initCategoryChart() {
+    const ctx = document.getElementById('categoryChart').getContext('2d');
+
+    const typeData = {
+        labels: categoriasData,
+        datasets: [{
+            data: ventasCategoriasData,
+            backgroundColor: [
+                'rgba(255, 126, 95, 0.8)',
+                'rgba(76, 175, 80, 0.8)',
+                'rgba(255, 179, 71, 0.8)',
+                'rgba(33, 150, 243, 0.8)',
+                'rgba(156, 39, 176, 0.8)',
+            ],
+            borderColor: [
+                'rgba(255, 126, 95, 1)',
+                'rgba(76, 175, 80, 1)',
+                'rgba(255, 179, 71, 1)',
+                'rgba(33, 150, 243, 1)',
+                'rgba(156, 39, 176, 1)'
+            ],
+            borderWidth: 2
+        }]
+    };
+
+    const config = {
+        type: 'doughnut',
+        data: typeData,
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    position: 'right',
+                    labels: {
+                        padding: 20,
+                        usePointStyle: true,
+                        pointStyle: 'circle'
+                    }
+                },
+                tooltip: {
+                    callbacks: {
+                        label: function (context) {
+                            const label = context.label || '';
+                            const value = context.parsed || 0;
+                            const total = context.dataset.data.reduce((a, b) => a + b, 0);
+                            const percentage = total > 0 ? Math.round((value / total) * 100) : 0;
+                            return `${label}: ${percentage}% ($${formatNumberWithCommas(value.toFixed(2))})`;
+                        }
+                    }
+                }
+            },
+            cutout: '65%'
+        }
+    };
+
+    categoryChartInstance = new Chart(ctx, config);
+}
+
+// Actualizar gráfico de ventas según período
+function updateSalesChart(period) {
+    if (!salesChartInstance) return;
+
+    let labels, data;
+
+    switch (period) {
+        case 'week':
+            labels = semanaLabels;
+            data = semanaData;
+            break;
+        case 'month':
+            labels = mesLabels;
+            data = mesData;
+            break;
+        case 'year':
+            labels = anioLabels;
+            data = anioData;
+            break;
+        default:
+            labels = semanaLabels;
+            data = semanaData;
+    }
+
+    salesChartInstance.data.labels = labels;
+    salesChartInstance.data.datasets[0].data = data;
+    salesChartInstance.update();
+}
+
+// Actualizar gráfico de categorías
+function updateCategoryChart(type) {
+    if (!categoryChartInstance) return;
+
+    let labels, data, backgroundColor, borderColor;
+
+    switch (type) {
+        case 'type':
+            labels = categoriasData;
+            data = ventasCategoriasData;
+            backgroundColor = [
+                'rgba(255, 126, 95, 0.8)',
+                'rgba(76, 175, 80, 0.8)',
+                'rgba(255, 179, 71, 0.8)',
+                'rgba(33, 150, 243, 0.8)',
+                'rgba(156, 39, 176, 0.8)'
+            ];
+            borderColor = [
+                'rgba(255, 126, 95, 1)',
+                'rgba(76, 175, 80, 1)',
+                'rgba(255, 179, 71, 1)',
+                'rgba(33, 150, 243, 1)',
+                'rgba(156, 39, 176, 1)'
+            ];
+            break;
+
+        case 'time':
+            labels = ['Mañana', 'Mediodía', 'Tarde', 'Noche'];
+            data = [20, 45, 25, 10];
+            backgroundColor = [
+                'rgba(255, 126, 95, 0.8)',
+                'rgba(76, 175, 80, 0.8)',
+                'rgba(33, 150, 243, 0.8)',
+                'rgba(156, 39, 176, 0.8)'
+            ];
+            borderColor = [
+                'rgba(255, 126, 95, 1)',
+                'rgba(76, 175, 80, 1)',
+                'rgba(33, 150, 243, 1)',
+                'rgba(156, 39, 176, 1)'
+            ];
+            break;
+
+        case 'method':
+            labels = ['Efectivo', 'Tarjeta', 'Transferencia'];
+            data = [35, 50, 15];
+            backgroundColor = [
+                'rgba(76, 175, 80, 0.8)',
+                'rgba(33, 150, 243, 0.8)',
+                'rgba(255, 126, 95, 0.8)'
+            ];
+            borderColor = [
+                'rgba(76, 175, 80, 1)',
+                'rgba(33, 150, 243, 1)',
+                'rgba(255, 126, 95, 1)'
+            ];
+            break;
+    }
+
+    categoryChartInstance.data.labels = labels;
+    categoryChartInstance.data.datasets[0].data = data;
+    categoryChartInstance.data.datasets[0].backgroundColor = backgroundColor;
+    categoryChartInstance.data.datasets[0].borderColor = borderColor;
+    categoryChartInstance.update();
+}
+
+// Configurar período del gráfico
+function setChartPeriod(period) {
+    currentChartPeriod = period;
+
+    // Actualizar botones activos
+    document.querySelectorAll('.chart-actions .chart-btn').forEach(btn => {
+        btn.classList.remove('active');
+    });
+    event.target.classList.add('active');
+
+    // Actualizar el gráfico con datos ya procesados
+    updateSalesChart(period);
+
+    showNotification(`Mostrando tendencias de ${getPeriodLabel(period)}`, 'success');
+}
+
+// Configurar gráfico de categorías
+function setCategoryChart(type) {
+    currentCategoryChart = type;
+
+    // Actualizar botones activos
+    const chartActions = event.target.closest('.chart-actions');
+    if (chartActions) {
+        chartActions.querySelectorAll('.chart-btn').forEach(btn => {
+            btn.classList.remove('active');
+        });
+        event.target.classList.add('active');
+    }
+
+    // Actualizar el gráfico
+    updateCategoryChart(type);
+
+    showNotification(`Mostrando distribución por ${getCategoryLabel(type)}`, 'success');
+}
+
+// Actualizar fecha y hora en tiempo real
+function updateDateTime() {
+    const now = new Date();
+    const dateOptions = {
+        weekday: 'long',
+        year: 'numeric',
+        month: 'long',
+        day: 'numeric'
+    };
+    const timeOptions = {
+        hour: '2-digit',
+        minute: '2-digit',
+        second: '2-digit',
+        hour12: false
+    };
+
+    document.getElementById('currentDate').textContent =
+        now.toLocaleDateString('es-ES', dateOptions);
+    document.getElementById('currentTime').textContent =
+        now.toLocaleTimeString('es-ES', timeOptions);
+}
+
+// Refrescar actividades (recarga la página)
+function refreshActivities() {
+    location.reload();
+    showNotification('Actualizando actividades...', 'success');
+}
+
+// Mostrar/ocultar información de depuración
+function toggleDebug() {
+    const debugContent = document.getElementById('debugContent');
+    const toggleButton = event.target;
+
+    if (debugContent.classList.contains('show')) {
+        debugContent.classList.remove('show');
+        toggleButton.textContent = 'Mostrar Depuración';
+    } else {
+        debugContent.classList.add('show');
+        toggleButton.textContent = 'Ocultar Depuración';
+    }
+}
+
+// Función para generar PDF Ticket
+function generarPDFTicket(event) {
+    showNotification('Generando ticket PDF para impresora 80mm...', 'info');
+
+    const button = event.target.closest('.print-pdf-btn');
+    const pdfUrl = button.getAttribute('data-pdf-url');
+
+    if (!pdfUrl) {
+        showNotification('Error: No se encontró la URL del PDF', 'error');
+        return;
+    }
+
+    const fullUrl = window.location.origin + pdfUrl;
+    window.open(fullUrl, '_blank');
+}
+
+// Función para generar PDF A4
+function generarPDFA4(event) {
+    showNotification('Generando PDF A4...', 'info');
+
+    const button = event.target.closest('.print-pdf-btn');
+    const pdfUrl = button.getAttribute('data-pdf-url');
+
+    if (!pdfUrl) {
+        showNotification('Error: No se encontró la URL del PDF', 'error');
+        return;
+    }
+
+    const fullUrl = window.location.origin + pdfUrl;
+    window.open(fullUrl, '_blank');
+}
+
+// Ver todos los productos
+function viewAllProducts() {
+    showNotification('Redirigiendo a gestión de productos...', 'info');
+}
+
+// Helper functions
+function getPeriodLabel(period) {
+    const labels = {
+        'week': 'la semana',
+        'month': 'el mes',
+        'year': 'el año'
+    };
+    return labels[period] || period;
+}
+
+function getCategoryLabel(type) {
+    const labels = {
+        'type': 'tipo de producto',
+        'time': 'horario',
+        'method': 'método de pago'
+    };
+    return labels[type] || type;
+}
+
+// Mostrar notificación
+function showNotification(message, type = 'success') {
+    const notification = document.createElement('div');
+    notification.style.cssText = `
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    background: ${type === 'error' ? 'linear-gradient(135deg, #ff416c 0%, #ff4b2b 100%)' :
+            type === 'info' ? 'linear-gradient(135deg, #2196F3 0%, #21CBF3 100%)' :
+                type === 'warning' ? 'linear-gradient(135deg, #ffb347 0%, #ffcc33 100%)' :
+                    'linear-gradient(135deg, #4CAF50 0%, #45a049 100%)'};
+    color: white;
+    padding: 1rem 1.5rem;
+    border-radius: 12px;
+    box-shadow: 0 10px 25px rgba(0, 0, 0, 0.2);
+    z-index: 1000;
+    animation: slideIn 0.3s ease-out;
+    font-weight: 600;
+    display: flex;
+    align-items: center;
+    gap: 10px;
+    max-width: 400px;
+`;
+
+    // Crear icono según el tipo de notificación
+    let icon = '';
+    if (type === 'success') icon = '<i class="fas fa-check-circle"></i>';
+    else if (type === 'error') icon = '<i class="fas fa-exclamation-circle"></i>';
+    else if (type === 'warning') icon = '<i class="fas fa-exclamation-triangle"></i>';
+    else icon = '<i class="fas fa-info-circle"></i>';
+
+    notification.innerHTML = icon + ' ' + message;
+    document.body.appendChild(notification);
+
+    // Asegurarse de que las animaciones CSS estén definidas
+    const style = document.createElement('style');
+    style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+    @keyframes slideOut {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+`;
+    if (!document.getElementById('notification-styles')) {
+        style.id = 'notification-styles';
+        document.head.appendChild(style);
+    }
+
+    setTimeout(() => {
+        notification.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => {
+            if (notification.parentNode) {
+                notification.parentNode.removeChild(notification);
+            }
+        }, 300);
+    }, 5000);
+}
+
+// Sidebar toggle
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
+
+// Función de respaldo si algo falla
+function generarPDFRespaldo() {
+    const url = '/facturacion/generar-pdf-ticket-dia/';
+    const fullUrl = window.location.origin + url;
+    window.open(fullUrl, '_blank');
+    showNotification('Abriendo PDF...', 'info');
+}
+
+// Añadir animación CSS para notificaciones si no existe
+if (!document.getElementById('notification-styles')) {
+    const style = document.createElement('style');
+    style.id = 'notification-styles';
+    style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+    @keyframes slideOut {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+`;
+    document.head.appendChild(style);
+}
@@ -0,0 +1,283 @@
+// Inicializar la aplicación
+document.addEventListener('DOMContentLoaded', function() {
+    // Configurar evento del formulario
+    const form = document.getElementById('platoForm');
+    form.addEventListener('submit', handleFormSubmit);
+
+    // Configurar eventos para vista previa en tiempo real
+    setupPreviewEvents();
+
+    // Enfocar en el primer campo al cargar
+    document.getElementById('nombrePlato').focus();
+
+    // Actualizar código actual
+    updateCurrentCode();
+});
+
+// Configurar eventos para vista previa
+function setupPreviewEvents() {
+    const inputs = ['nombrePlato', 'categoriaPlato', 'precioPlato'];
+
+    inputs.forEach(inputId => {
+        const input = document.getElementById(inputId);
+        if (input) {
+            input.addEventListener('input', updatePreview);
+            input.addEventListener('change', updatePreview);
+        }
+    });
+
+    // Formateo para el precio
+    const precioInput = document.getElementById('precioPlato');
+    precioInput.addEventListener('input', function(e) {
+        let valor = e.target.value.replace(/[^0-9.]/g, '');
+
+        // Permitir solo un punto decimal
+        const partes = valor.split('.');
+        if (partes.length > 2) {
+            valor = partes[0] + '.' + partes.slice(1).join('');
+        }
+
+        // Limitar decimales a 2
+        if (partes.length === 2 && partes[1].length > 2) {
+            valor = partes[0] + '.' + partes[1].substring(0, 2);
+        }
+
+        // Formatear con comas
+        if (valor) {
+            const [entero, decimal] = valor.split('.');
+            const enteroFormateado = parseInt(entero || 0).toLocaleString('en-US');
+            valor = decimal !== undefined ? enteroFormateado + '.' + decimal : enteroFormateado;
+        }
+
+        e.target.value = valor;
+        updatePreview();
+    });
+}
+
+// Función para desformatear número (quitar comas)
+function desformatearNumero(valor) {
+    return valor.replace(/,/g, '');
+}
+
+// Actualizar vista previa
+function updatePreview() {
+    const codigo = document.getElementById('codigoPlato').value;
+    const nombre = document.getElementById('nombrePlato').value;
+    const categoria = document.getElementById('categoriaPlato').value;
+    const precio = document.getElementById('precioPlato').value;
+
+    const previewSection = document.getElementById('previewSection');
+    const previewContent = document.getElementById('previewContent');
+
+    // Verificar si hay datos para mostrar
+    const hasData = codigo || nombre || categoria || precio;
+
+    if (!hasData) {
+        previewSection.classList.remove('active');
+        return;
+    }
+
+    // Mostrar vista previa
+    previewSection.classList.add('active');
+
+    // Construir contenido de vista previa
+    let previewHTML = '';
+
+    if (codigo) {
+        previewHTML += `
+            <div class="preview-item">
+                <span class="preview-label"><i class="fas fa-barcode"></i> Código:</span>
+                <span class="preview-value" style="font-weight: 700; color: #2c3e50; font-family: 'Courier New', monospace; font-size: 1.2rem;">${codigo}</span>
+            </div>
+        `;
+    }
+
+    if (nombre) {
+        previewHTML += `
+            <div class="preview-item">
+                <span class="preview-label"><i class="fas fa-utensils"></i> Plato:</span>
+                <span class="preview-value" style="font-weight: 600; color: #2c3e50;">${nombre}</span>
+            </div>
+        `;
+    }
+
+    if (categoria) {
+        const categoriaLabel = getCategoriaLabel(categoria);
+        previewHTML += `
+            <div class="preview-item">
+                <span class="preview-label"><i class="fas fa-tags"></i> Categoría:</span>
+                <span class="preview-badge badge-${categoria}">${categoriaLabel}</span>
+            </div>
+        `;
+    }
+
+    if (precio) {
+        const precioNumerico = parseFloat(desformatearNumero(precio));
+        const precioFormateado = !isNaN(precioNumerico) ? precioNumerico.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2}) : '0.00';
+        previewHTML += `
+            <div class="preview-item">
+                <span class="preview-label"><i class="fas fa-dollar-sign"></i> Precio:</span>
+                <span class="preview-value" style="font-weight: 700; color: #ff7e5f;">$${precioFormateado}</span>
+            </div>
+        `;
+    }
+
+    previewContent.innerHTML = previewHTML;
+}
+
+// Manejar envío del formulario
+function handleFormSubmit(e) {
+    e.preventDefault();
+
+    const nombrePlato = document.getElementById('nombrePlato').value.trim();
+    const categoriaPlato = document.getElementById('categoriaPlato').value;
+    const precioValor = desformatearNumero(document.getElementById('precioPlato').value);
+    const precioPlato = parseFloat(precioValor);
+
+    // Validar datos
+    if (!nombrePlato || !categoriaPlato || isNaN(precioPlato)) {
+        showNotification("<i class='fas fa-times-circle'></i> Por favor, complete todos los campos requeridos", "error");
+        return;
+    }
+
+    if (precioPlato < 0) {
+        showNotification("<i class='fas fa-times-circle'></i> El precio debe ser mayor o igual a 0", "error");
+        return;
+    }
+
+    // Enviar datos al servidor usando Fetch API
+    const formData = new FormData();
+    formData.append('nombre', nombrePlato);
+    formData.append('categoria', categoriaPlato);
+    formData.append('precio', precioPlato);
+
+    // Obtener el CSRF token
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
+
+    // Enviar la petición POST
+    fetch(PAGINA.urls.guardarPlato, {
+        method: 'POST',
+        headers: {
+            'X-CSRFToken': csrfToken,
+            'X-Requested-With': 'XMLHttpRequest'
+        },
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            // Actualizar código en la interfaz
+            document.getElementById('codigoDisplay').innerHTML =
+                `<span class="codigo-display">${data.proximo_codigo}</span>`;
+            document.getElementById('codigoPlato').value = data.proximo_codigo;
+
+            // Mostrar confirmación con código asignado
+            document.getElementById('confirmationText').textContent =
+                `El plato "${nombrePlato}" (Código: ${data.codigo_asignado}) ha sido añadido al menú.`;
+
+            showConfirmation();
+
+            // Resetear formulario (excepto código)
+            document.getElementById('nombrePlato').value = '';
+            document.getElementById('categoriaPlato').value = '';
+            document.getElementById('precioPlato').value = '';
+
+            // Ocultar vista previa
+            document.getElementById('previewSection').classList.remove('active');
+
+            // Enfocar en el primer campo
+            document.getElementById('nombrePlato').focus();
+
+            // Mostrar notificación
+            showNotification(`<i class='fas fa-check-circle'></i> "${nombrePlato}" (${data.codigo_asignado}) agregado al menú!`, "success");
+        } else {
+            showNotification(`<i class='fas fa-times-circle'></i> Error: ${data.error}`, "error");
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showNotification("<i class='fas fa-times-circle'></i> Error al guardar el plato", "error");
+    });
+}
+
+// Actualizar código actual
+function updateCurrentCode() {
+    // Esta función podría usarse para actualizar el código dinámicamente si es necesario
+    console.log("Código actual: ", document.getElementById('codigoPlato').value);
+}
+
+// Mostrar confirmación
+function showConfirmation() {
+    const confirmationMessage = document.getElementById('confirmationMessage');
+    confirmationMessage.style.display = 'block';
+
+    setTimeout(() => {
+        confirmationMessage.style.display = 'none';
+    }, 4000);
+}
+
+// Mostrar notificación
+function showNotification(message, type = "success") {
+    // Crear elemento de notificación
+    const notification = document.createElement('div');
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: ${type === 'error' ? 'linear-gradient(135deg, #ff416c 0%, #ff4b2b 100%)' : 'linear-gradient(135deg, #ff7e5f 0%, #feb47b 100%)'};
+        color: white;
+        padding: 1rem 1.5rem;
+        border-radius: 12px;
+        box-shadow: 0 10px 25px rgba(0, 0, 0, 0.2);
+        z-index: 1000;
+        animation: slideIn 0.3s ease-out;
+        font-weight: 600;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+    `;
+
+    notification.innerHTML = message;
+    document.body.appendChild(notification);
+
+    // Remover después de 3 segundos
+    setTimeout(() => {
+        notification.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => notification.remove(), 300);
+    }, 3000);
+}
+
+// Helper functions
+function getCategoriaLabel(categoria) {
+    const labels = {
+        'entrada': 'Entrada',
+        'principal': 'Principal',
+        'postre': 'Postre',
+        'bebida': 'Bebida',
+        'rapida': 'Comida Rápida',
+        'especial': 'Especial'
+    };
+    return labels[categoria] || categoria;
+}
+
+// Sidebar toggle
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
+
+// Añadir animación CSS para notificaciones
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+    @keyframes slideOut {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+`;
+document.head.appendChild(style);
@@ -0,0 +1,164 @@
+const form = document.getElementById('productForm');
+const confirmationMessage = document.getElementById('confirmationMessage');
+const quantityInput = document.getElementById('quantity');
+const priceInput = document.getElementById('price');
+
+// Función para formatear número con coma para miles y punto para decimales
+function formatearNumero(valor) {
+    // Eliminar todo excepto números y punto
+    let numeros = valor.replace(/[^\d\.]/g, '');
+
+    // Si hay punto, separar enteros y decimales
+    let partes = numeros.split('.');
+    let enteros = partes[0];
+    let decimales = partes[1] || '';
+
+    // Limitar decimales a 2 dígitos
+    if (decimales.length > 2) {
+        decimales = decimales.substring(0, 2);
+    }
+
+    // Formatear la parte entera con comas para miles
+    enteros = enteros.replace(/\B(?=(\d{3})+(?!\d))/g, ',');
+
+    // Unir con punto decimal si hay decimales
+    return decimales ? enteros + '.' + decimales : enteros;
+}
+
+// Función para convertir formato a número
+function desformatearNumero(valor) {
+    return valor.replace(/,/g, '');
+}
+
+// Event listeners para formatear cantidad
+quantityInput.addEventListener('input', function(e) {
+    let cursorPos = e.target.selectionStart;
+    let valorAnterior = e.target.value;
+    let valor = formatearNumero(e.target.value);
+    e.target.value = valor;
+
+    // Ajustar posición del cursor
+    if (valorAnterior.length < valor.length) {
+        e.target.setSelectionRange(cursorPos + 1, cursorPos + 1);
+    } else {
+        e.target.setSelectionRange(cursorPos, cursorPos);
+    }
+});
+
+// Event listeners para formatear precio
+priceInput.addEventListener('input', function(e) {
+    let cursorPos = e.target.selectionStart;
+    let valorAnterior = e.target.value;
+    let valor = formatearNumero(e.target.value);
+    e.target.value = valor;
+
+    // Ajustar posición del cursor
+    if (valorAnterior.length < valor.length) {
+        e.target.setSelectionRange(cursorPos + 1, cursorPos + 1);
+    } else {
+        e.target.setSelectionRange(cursorPos, cursorPos);
+    }
+});
+
+form.addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    console.log("=== ENVIANDO FORMULARIO ===");
+
+    const productName = document.getElementById('productName').value.trim();
+    const category = document.getElementById('category').value;
+    const quantity = desformatearNumero(quantityInput.value);
+    const price = desformatearNumero(priceInput.value);
+
+    console.log("Datos del formulario:", {
+        productName, category, quantity, price
+    });
+
+    // Validaciones básicas
+    if (!productName || !category || !quantity || !price) {
+        alert('Por favor complete todos los campos');
+        return;
+    }
+
+    // Preparar datos
+    const data = {
+        productName: productName,
+        category: category,
+        quantity: parseFloat(quantity),
+        price: parseFloat(price)
+    };
+
+    console.log("Datos a enviar:", data);
+
+    try {
+        // Obtener token CSRF
+        function getCookie(name) {
+            let cookieValue = null;
+            if (document.cookie && document.cookie !== '') {
+                const cookies = document.cookie.split(';');
+                for (let i = 0; i < cookies.length; i++) {
+                    const cookie = cookies[i].trim();
+                    if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                        cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                        break;
+                    }
+                }
+            }
+            return cookieValue;
+        }
+
+        const csrfToken = getCookie('csrftoken');
+        console.log("CSRF Token:", csrfToken);
+
+        // Enviar datos
+        const response = await fetch('/guardar-producto/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken || ''
+            },
+            body: JSON.stringify(data)
+        });
+
+        console.log("Respuesta HTTP:", response.status, response.statusText);
+
+        const result = await response.json();
+        console.log("Resultado JSON:", result);
+
+        if (result.success) {
+            // Mostrar confirmación
+            confirmationMessage.innerHTML = `
+                <h3><i class="fas fa-check-circle"></i> ${result.message}</h3>
+                <p><strong>Código:</strong> ${result.producto.codigo}</p>
+                <p><strong>Producto:</strong> ${result.producto.nombre}</p>
+                <p><strong>Cantidad:</strong> ${result.producto.cantidad}</p>
+                <p><strong>Precio:</strong> $${result.producto.precio_compra}</p>
+                <p><strong>Total:</strong> $${result.producto.subtotal}</p>
+            `;
+            confirmationMessage.style.display = 'block';
+
+            // Resetear formulario
+            form.reset();
+
+            // Ocultar mensaje después de 5 segundos
+            setTimeout(() => {
+                confirmationMessage.style.display = 'none';
+            }, 5000);
+
+        } else {
+            alert(`Error: ${result.message}`);
+        }
+
+    } catch (error) {
+        console.error("Error completo:", error);
+        alert('Error de conexión. Revisa la consola para más detalles.');
+    }
+});
+
+// Función para el sidebar
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
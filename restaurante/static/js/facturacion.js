@@ -0,0 +1,739 @@
+// Variables globales
+let orders = [];
+let filteredOrders = [];
+let currentOrder = null;
+
+// Inicializar la aplicación
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('=== INICIANDO FACTURACIÓN ===');
+    console.log('DOM completamente cargado, inicializando...');
+
+    try {
+        // Parsear los datos JSON desde Django
+        const pedidosJsonElement = PAGINA.pedidosJson;
+
+        // Limpiar el JSON si tiene caracteres especiales
+        let pedidosJson = pedidosJsonElement.replace(/&quot;/g, '"');
+
+        // Parsear JSON (las estadísticas de facturas vienen de api_facturas_estadisticas)
+        orders = JSON.parse(pedidosJson) || [];
+
+        console.log(`✅ Datos cargados: ${orders.length} pedidos`);
+
+        // Filtrar solo pedidos que no tienen factura (estado: entregado, listo, completado)
+        orders = orders.filter(order => !order.es_factura);
+
+        console.log(`✅ Pedidos disponibles para pagar: ${orders.length}`);
+
+    } catch (error) {
+        console.error('❌ Error parseando JSON:', error);
+
+        orders = [];
+    }
+
+    // Inicializar filteredOrders con todos los pedidos
+    filteredOrders = [...orders];
+
+    // Llamar a las funciones de renderizado
+    filterAndRender();
+    updateStats();
+    setupEventListeners();
+
+    // Mostrar el resultado del último cobro: la página se recarga tras cada pago
+    PAGINA.mensajes.forEach(mensaje => showNotification(mensaje.texto, mensaje.tipo));
+});
+
+// Configurar event listeners
+function setupEventListeners() {
+    const searchInput = document.getElementById('searchInput');
+    const statusFilter = document.getElementById('statusFilter');
+    const tipoFilter = document.getElementById('tipoFilter');
+    const dateFilter = document.getElementById('dateFilter');
+
+    if (searchInput) {
+        searchInput.addEventListener('input', filterAndRender);
+    }
+
+    if (statusFilter) {
+        statusFilter.addEventListener('change', filterAndRender);
+    }
+
+    if (tipoFilter) {
+        tipoFilter.addEventListener('change', filterAndRender);
+    }
+
+    if (dateFilter) {
+        dateFilter.addEventListener('change', filterAndRender);
+    }
+}
+
+// Filtrar y renderizar pedidos
+function filterAndRender() {
+    filterOrders();
+    renderPedidos();
+}
+
+// Filtrar pedidos
+function filterOrders() {
+    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    const selectedStatus = document.getElementById('statusFilter').value;
+    const selectedTipo = document.getElementById('tipoFilter').value;
+    const selectedDate = document.getElementById('dateFilter').value;
+
+    // Si no hay pedidos, retornar array vacío
+    if (!orders || orders.length === 0) {
+        filteredOrders = [];
+        return;
+    }
+
+    filteredOrders = orders.filter(order => {
+        // Validar que el pedido existe
+        if (!order) return false;
+
+        // 1. Filtrar por búsqueda
+        let matchesSearch = true;
+        if (searchTerm) {
+            const searchFields = [
+                order.codigo_pedido,
+                order.nombre_cliente,
+                order.telefono_cliente,
+                order.codigo_delivery,
+                order.numero_mesa_codigo,
+                (order.mesa && order.mesa.numero_display) ? order.mesa.numero_display : '',
+            ].filter(field => field);
+
+            matchesSearch = searchFields.some(field =>
+                field.toString().toLowerCase().includes(searchTerm)
+            );
+        }
+
+        // 2. Filtrar por estado
+        let matchesStatus = true;
+        if (selectedStatus) {
+            matchesStatus = (order.estado_pedido || order.estado) === selectedStatus;
+        }
+
+        // 3. Filtrar por tipo
+        let matchesTipo = true;
+        if (selectedTipo) {
+            matchesTipo = order.tipo_pedido === selectedTipo;
+        }
+
+        // 4. Filtrar por fecha
+        let matchesDate = true;
+        if (selectedDate && order.fecha_pedido) {
+            try {
+                const orderDate = new Date(order.fecha_pedido);
+                const today = new Date();
+                today.setHours(0, 0, 0, 0);
+
+                switch(selectedDate) {
+                    case 'hoy':
+                        const orderDay = new Date(orderDate);
+                        orderDay.setHours(0, 0, 0, 0);
+                        matchesDate = orderDay.getTime() === today.getTime();
+                        break;
+                    case 'ayer':
+                        const yesterday = new Date(today);
+                        yesterday.setDate(yesterday.getDate() - 1);
+                        const orderDay2 = new Date(orderDate);
+                        orderDay2.setHours(0, 0, 0, 0);
+                        matchesDate = orderDay2.getTime() === yesterday.getTime();
+                        break;
+                    case 'semana':
+                        const weekAgo = new Date(today);
+                        weekAgo.setDate(weekAgo.getDate() - 7);
+                        matchesDate = orderDate >= weekAgo;
+                        break;
+                    case 'mes':
+                        const monthAgo = new Date(today);
+                        monthAgo.setMonth(monthAgo.getMonth() - 1);
+                        matchesDate = orderDate >= monthAgo;
+                        break;
+                    default:
+                        matchesDate = true;
+                }
+            } catch (e) {
+                console.error(`Error procesando fecha:`, e);
+                matchesDate = true;
+            }
+        }
+
+        return matchesSearch && matchesStatus && matchesTipo && matchesDate;
+    });
+
+    // Ordenar por fecha más reciente primero
+    filteredOrders.sort((a, b) => {
+        try {
+            const dateA = a.fecha_pedido ? new Date(a.fecha_pedido) : new Date(0);
+            const dateB = b.fecha_pedido ? new Date(b.fecha_pedido) : new Date(0);
+            return dateB - dateA; // Más reciente primero
+        } catch (e) {
+            return 0;
+        }
+    });
+}
+
+// Renderizar pedidos
+function renderPedidos() {
+    const pedidosBody = document.getElementById('pedidosBody');
+
+    if (!pedidosBody) {
+        console.error('ERROR: No se encontró el elemento pedidosBody');
+        return;
+    }
+
+    // Función para formatear moneda al estilo RD (punto para miles, coma para decimales)
+    function formatearMoneda(valor) {
+        const numero = parseFloat(valor) || 0;
+        return numero.toLocaleString('es-DO', {
+            minimumFractionDigits: 2,
+            maximumFractionDigits: 2
+        });
+    }
+
+    // Mostrar estado vacío si no hay pedidos
+    if (filteredOrders.length === 0) {
+        pedidosBody.innerHTML = `
+            <tr class="empty-state">
+                <td colspan="8">
+                    <svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2" />
+                    </svg>
+                    <h3>No se encontraron pedidos</h3>
+                    <p>${orders.length === 0 ? 'No hay pedidos disponibles para facturar.' : 'Intenta con otros filtros de búsqueda'}</p>
+                </td>
+            </tr>
+        `;
+        return;
+    }
+
+    // Renderizar pedidos
+    let htmlContent = '';
+
+    for (let i = 0; i < filteredOrders.length; i++) {
+        const order = filteredOrders[i];
+
+        // Procesar fecha
+        let fecha = new Date();
+        let formattedDate = 'Fecha no disponible';
+
+        try {
+            if (order.fecha_pedido) {
+                fecha = new Date(order.fecha_pedido);
+                formattedDate = fecha.toLocaleDateString('es-ES', {
+                    day: '2-digit',
+                    month: '2-digit',
+                    year: 'numeric'
+                });
+            }
+        } catch (e) {
+            console.error('Error procesando fecha:', e);
+        }
+
+        // Determinar número de mesa o código
+        let numeroMesaCodigo = 'N/A';
+        let displayLabel = '';
+
+        if (order.tipo_pedido === 'mesa') {
+            if (order.mesa && order.mesa.numero_display) {
+                numeroMesaCodigo = order.mesa.numero_display;
+                displayLabel = `Mesa ${numeroMesaCodigo}`;
+            } else if (order.numero_mesa_codigo) {
+                numeroMesaCodigo = order.numero_mesa_codigo;
+                displayLabel = `Mesa ${numeroMesaCodigo}`;
+            }
+        } else if (order.tipo_pedido === 'delivery') {
+            if (order.codigo_delivery) {
+                numeroMesaCodigo = order.codigo_delivery;
+                displayLabel = `Delivery ${numeroMesaCodigo}`;
+            } else if (order.numero_mesa_codigo) {
+                numeroMesaCodigo = order.numero_mesa_codigo;
+                displayLabel = `Delivery ${numeroMesaCodigo}`;
+            }
+        } else if (order.tipo_pedido === 'llevar') {
+            if (order.codigo_delivery) {
+                numeroMesaCodigo = order.codigo_delivery;
+                displayLabel = `Para Llevar ${numeroMesaCodigo}`;
+            } else if (order.numero_mesa_codigo) {
+                numeroMesaCodigo = order.numero_mesa_codigo;
+                displayLabel = `Para Llevar ${numeroMesaCodigo}`;
+            }
+        }
+
+        // Determinar teléfono a mostrar
+        let telefonoMostrar = '';
+        if (order.telefono_cliente) {
+            telefonoMostrar = `<span class="customer-phone">${order.telefono_cliente}</span>`;
+        }
+
+        // Determinar estado a mostrar - SIEMPRE "pendiente" para facturación
+        let estadoMostrar = 'pendiente'; // Cambiado de order.estado_pedido || order.estado || 'pendiente'
+        let estadoClass = getEstadoClass(estadoMostrar);
+
+        // Construir botones de acción - SOLO UN BOTÓN DE PAGO
+        let actionButtons = `
+            <div class="action-buttons">
+                <button class="btn-icon btn-view" onclick="viewOrderDetails('${order.id}')" title="Ver detalle">
+                    <i class="fas fa-eye"></i>
+                </button>
+                <button class="btn-icon btn-pagar" onclick="showPagarModal('${order.id}')" title="Pagar pedido">
+                    <i class="fas fa-credit-card"></i>
+                </button>
+            </div>
+        `;
+
+        // Construir fila HTML
+        htmlContent += `
+            <tr>
+                <td style="font-weight: 700; color: #2c3e50;">${order.codigo_pedido || 'N/A'}</td>
+                <td>
+                    <span class="tipo-badge tipo-${order.tipo_pedido || 'mesa'}">
+                        <span>${getTipoIcon(order.tipo_pedido)}</span>
+                        ${getTipoLabel(order.tipo_pedido)}
+                    </span>
+                </td>
+                <td>
+                    <div style="font-weight: 600;">${displayLabel || numeroMesaCodigo}</div>
+                </td>
+                <td>
+                    <div class="customer-info">
+                        <span class="customer-name">${order.nombre_cliente || 'Cliente no registrado'}</span>
+                        ${telefonoMostrar}
+                    </div>
+                </td>
+                <td>
+                    <div class="date-badge">
+                        <span><i class="fas fa-calendar"></i></span>
+                        <span>${formattedDate}</span>
+                    </div>
+                </td>
+                <td>
+                    <div class="invoice-total">$${formatearMoneda(order.total || 0)}</div>
+                </td>
+                <td>
+                    <span class="status-badge ${estadoClass}">
+                        ${estadoMostrar}
+                    </span>
+                </td>
+                <td>
+                    ${actionButtons}
+                </td>
+            </tr>
+        `;
+    }
+
+    // Insertar HTML en la tabla
+    pedidosBody.innerHTML = htmlContent;
+}
+
+// Actualizar estadísticas (calculadas en el servidor con agregados SQL)
+function updateStats() {
+    // Facturas pendientes (pedidos sin factura)
+    const facturasPendientesElement = document.getElementById('facturasPendientes');
+    if (facturasPendientesElement) {
+        facturasPendientesElement.textContent = orders.length;
+    }
+
+    fetch(PAGINA.urls.apiFacturasEstadisticas, {
+        headers: { 'X-Requested-With': 'XMLHttpRequest' }
+    })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) return;
+            const stats = data.estadisticas;
+            const formato = {minimumFractionDigits: 2, maximumFractionDigits: 2};
+
+            const totalFacturasElement = document.getElementById('totalFacturas');
+            if (totalFacturasElement) {
+                totalFacturasElement.textContent = stats.total_facturas;
+            }
+
+            const ingresosMesElement = document.getElementById('ingresosMes');
+            if (ingresosMesElement) {
+                ingresosMesElement.textContent = `$${stats.ingresos_mes.toLocaleString('es-DO', formato)}`;
+            }
+
+            const promedioFacturaElement = document.getElementById('promedioFactura');
+            if (promedioFacturaElement) {
+                promedioFacturaElement.textContent = `$${stats.promedio_factura.toLocaleString('es-DO', formato)}`;
+            }
+        })
+        .catch(error => console.error('❌ Error cargando estadísticas:', error));
+}
+
+// Ver detalles del pedido
+function viewOrderDetails(pedidoId) {
+    const order = orders.find(o => o.id == pedidoId);
+    if (!order) {
+        showNotification('Pedido no encontrado', 'error');
+        return;
+    }
+
+    const modalBody = document.getElementById('modalBody');
+    const fecha = new Date(order.fecha_pedido || new Date());
+    const formattedDate = fecha.toLocaleDateString('es-ES', {
+        weekday: 'long',
+        year: 'numeric',
+        month: 'long',
+        day: 'numeric',
+        hour: '2-digit',
+        minute: '2-digit'
+    });
+
+    // Construir detalles
+    let clienteInfo = '';
+    if (order.nombre_cliente) {
+        clienteInfo += `<div style="margin-bottom: 0.5rem;"><strong>Cliente:</strong> ${order.nombre_cliente}</div>`;
+    }
+    if (order.telefono_cliente) {
+        clienteInfo += `<div style="margin-bottom: 0.5rem;"><strong>Teléfono:</strong> ${order.telefono_cliente}</div>`;
+    }
+    if (order.direccion_entrega) {
+        clienteInfo += `<div style="margin-bottom: 0.5rem;"><strong>Dirección:</strong> ${order.direccion_entrega}</div>`;
+    }
+
+    // Construir items
+    let itemsHTML = '';
+    if (order.items && order.items.length > 0) {
+        itemsHTML = order.items.map(item => `
+            <tr>
+                <td>${item.name || item.nombre || 'Producto'}</td>
+                <td>${item.quantity || item.cantidad || 1}</td>
+                <td>$${(item.price || item.precio || 0).toLocaleString('es-DO', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
+                <td>$${(item.total || item.subtotal || 0).toLocaleString('es-DO', {minimumFractionDigits: 2, maximumFractionDigits: 2})}</td>
+            </tr>
+        `).join('');
+    } else {
+        itemsHTML = `<tr><td colspan="4" style="text-align: center; padding: 20px;">No hay items disponibles</td></tr>`;
+    }
+
+    // Cambiar el estado mostrado a "pendiente" también en el modal
+    modalBody.innerHTML = `
+        <div class="invoice-header">
+            <div class="invoice-info">
+                <h2>PEDIDO ${order.codigo_pedido || 'N/A'}</h2>
+                <div style="display: flex; gap: 2rem; flex-wrap: wrap;">
+                    <div>
+                        <div style="font-weight: 600; color: #4a5568;">Fecha:</div>
+                        <div>${formattedDate}</div>
+                    </div>
+                    <div>
+                        <div style="font-weight: 600; color: #4a5568;">Tipo:</div>
+                        <span class="tipo-badge tipo-${order.tipo_pedido}">
+                            ${getTipoIcon(order.tipo_pedido)} ${getTipoLabel(order.tipo_pedido)}
+                        </span>
+                    </div>
+                    <div>
+                        <div style="font-weight: 600; color: #4a5568;">Estado:</div>
+                        <span class="status-badge ${getEstadoClass('pendiente')}">
+                            pendiente
+                        </span>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="invoice-details">
+            <div class="invoice-company">
+                <h4>INFORMACIÓN DEL PEDIDO</h4>
+                <div style="margin-bottom: 0.5rem;">
+                    <strong>Tipo:</strong> ${getTipoLabel(order.tipo_pedido)}
+                </div>
+                <div style="margin-bottom: 0.5rem;">
+                    <strong>${order.tipo_pedido === 'mesa' ? 'Mesa:' : 'Código:'}</strong> ${order.numero_mesa_codigo || order.codigo_delivery || 'N/A'}
+                </div>
+                ${clienteInfo}
+            </div>
+
+            <div class="invoice-client">
+                <h4>DETALLES FINANCIEROS</h4>
+                <div style="margin-bottom: 0.5rem;">
+                    <strong>Subtotal:</strong> $${(order.subtotal || 0).toLocaleString('es-DO', {minimumFractionDigits: 2, maximumFractionDigits: 2})}
+                </div>
+                <div style="margin-bottom: 0.5rem;">
+                    <strong>Envío:</strong> $${(order.envio || 0).toLocaleString('es-DO', {minimumFractionDigits: 2, maximumFractionDigits: 2})}
+                </div>
+                <div style="margin-bottom: 0.5rem;">
+                    <strong>Total:</strong> $${(order.total || 0).toLocaleString('es-DO', {minimumFractionDigits: 2, maximumFractionDigits: 2})}
+                </div>
+            </div>
+        </div>
+
+        <div class="invoice-items">
+            <h4 style="color: #2c3e50; margin-bottom: 1rem;">ITEMS DEL PEDIDO</h4>
+            <table class="invoice-table">
+                <thead>
+                    <tr>
+                        <th>Descripción</th>
+                        <th>Cantidad</th>
+                        <th>Precio Unitario</th>
+                        <th>Subtotal</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    ${itemsHTML}
+                </tbody>
+            </table>
+        </div>
+
+        <div style="display: flex; gap: 1rem; justify-content: flex-end; margin-top: 2rem;">
+            <button class="btn btn-success" onclick="showPagarModal('${order.id}')">
+                <span><i class="fas fa-credit-card"></i></span>
+                <span>Pagar Pedido</span>
+            </button>
+        </div>
+    `;
+
+    // Mostrar modal
+    document.getElementById('invoiceModal').classList.add('active');
+}
+
+// Mostrar modal para pagar
+function showPagarModal(pedidoId) {
+    const order = orders.find(o => o.id == pedidoId);
+    if (!order) {
+        showNotification('Pedido no encontrado', 'error');
+        return;
+    }
+
+    currentOrder = order;
+    document.getElementById('pedidoId').value = pedidoId;
+    document.getElementById('customerCedula').value = '';
+    toggleCedulaCredito();
+    document.getElementById('totalAmount').value = `$${(order.total || 0).toLocaleString('es-DO', {minimumFractionDigits: 2, maximumFractionDigits: 2})}`;
+
+    // Mostrar modal
+    document.getElementById('createInvoiceModal').classList.add('active');
+}
+
+// A crédito la cédula es obligatoria (si el pedido no tiene ya un cliente registrado)
+function toggleCedulaCredito() {
+    const credito = document.getElementById('paymentMethod').value === 'credito';
+    document.getElementById('customerCedulaLabel').textContent = credito
+        ? 'Cédula del Cliente (crédito)'
+        : 'Cédula del Cliente (opcional)';
+}
+
+// Pagar pedido (crear factura pagada)
+function pagarPedido() {
+    const pedidoId = document.getElementById('pedidoId').value;
+    const order = orders.find(o => o.id == pedidoId);
+
+    if (!order) {
+        showNotification('Pedido no encontrado', 'error');
+        return;
+    }
+
+    const paymentMethod = document.getElementById('paymentMethod').value;
+    const cedula = document.getElementById('customerCedula').value.trim();
+    if (paymentMethod === 'credito' && !cedula && !order.cliente_id) {
+        showNotification('<i class="fas fa-id-card"></i> Indique la cédula del cliente para la venta a crédito', 'error');
+        return;
+    }
+    const total = order.total || 0;
+    const subtotal = order.subtotal || 0;
+    const envio = order.envio || 0;
+    // const iva = subtotal * 0.12;
+
+    // Crear un formulario dinámico para enviar a Django
+    const form = document.createElement('form');
+    form.method = 'POST';
+    form.action = PAGINA.urls.crearFactura;
+    form.style.display = 'none';
+
+    // Agregar token CSRF
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
+    const csrfInput = document.createElement('input');
+    csrfInput.type = 'hidden';
+    csrfInput.name = 'csrfmiddlewaretoken';
+    csrfInput.value = csrfToken;
+    form.appendChild(csrfInput);
+
+    // Función para agregar campos
+    const addField = (name, value) => {
+        const input = document.createElement('input');
+        input.type = 'hidden';
+        input.name = name;
+        input.value = value;
+        form.appendChild(input);
+    };
+
+    // Agregar datos básicos
+    addField('pedido_id', pedidoId);
+    addField('metodo_pago', paymentMethod);
+    if (cedula) {
+        addField('customer_cedula', cedula);
+    }
+    addField('estado', 'pagada'); // Siempre pagada
+    addField('subtotal', subtotal.toFixed(2));
+    addField('envio', envio.toFixed(2));
+    addField('total', total.toFixed(2));
+
+    // Agregar items como JSON string
+    if (order.items && order.items.length > 0) {
+        addField('items', JSON.stringify(order.items));
+    } else {
+        addField('items', '[]');
+    }
+
+    // Agregar información adicional
+    if (order.nombre_cliente) {
+        addField('nombre_cliente', order.nombre_cliente);
+    }
+    if (order.telefono_cliente) {
+        addField('telefono_cliente', order.telefono_cliente);
+    }
+    if (order.direccion_entrega) {
+        addField('direccion_entrega', order.direccion_entrega);
+    }
+
+    // Determinar número de mesa o código para la factura
+    let numeroMesaCodigo = '';
+    if (order.tipo_pedido === 'mesa') {
+        if (order.mesa && order.mesa.numero_display) {
+            numeroMesaCodigo = order.mesa.numero_display;
+        } else if (order.numero_mesa_codigo) {
+            numeroMesaCodigo = order.numero_mesa_codigo;
+        }
+    } else if (order.codigo_delivery) {
+        numeroMesaCodigo = order.codigo_delivery;
+    }
+
+    if (numeroMesaCodigo) {
+        addField('numero_mesa_codigo', numeroMesaCodigo);
+    }
+
+    // Agregar imprimir por defecto
+    addField('imprimir', 'true');
+
+    // Deshabilitar el botón para evitar múltiples clics
+    const btn = document.getElementById('pagarPedidoBtn');
+    btn.disabled = true;
+    btn.innerHTML = '<span>⏳</span><span>Procesando...</span>';
+
+    showNotification(`<i class="fas fa-credit-card"></i> Procesando pago de $${total.toLocaleString('es-DO', {minimumFractionDigits: 2, maximumFractionDigits: 2})}...`, 'info');
+
+    // Cerrar modal
+    closeCreateInvoiceModal();
+
+    // Enviar formulario después de un breve retraso
+    setTimeout(() => {
+        document.body.appendChild(form);
+        form.submit();
+    }, 1000);
+}
+
+// Generar cuadre del día (PDF)
+function exportInvoices() {
+    // Abrir el PDF del ticket del día en una nueva ventana
+    window.open(PAGINA.urls.generarPdfTicketDia, '_blank');
+}
+
+// Cerrar modales
+function closeModal() {
+    document.getElementById('invoiceModal').classList.remove('active');
+}
+
+function closeCreateInvoiceModal() {
+    document.getElementById('createInvoiceModal').classList.remove('active');
+}
+
+// Mostrar notificación
+function showNotification(message, type = 'success') {
+    // Remover notificaciones anteriores
+    const existingNotifications = document.querySelectorAll('.notification');
+    existingNotifications.forEach(notification => notification.remove());
+
+    const notification = document.createElement('div');
+    notification.className = 'notification';
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: ${type === 'error' ? 'linear-gradient(135deg, #ff416c 0%, #ff4b2b 100%)' :
+                     type === 'warning' ? 'linear-gradient(135deg, #ffb347 0%, #ffcc33 100%)' :
+                     type === 'info' ? 'linear-gradient(135deg, #2196F3 0%, #21CBF3 100%)' :
+                     'linear-gradient(135deg, #38a169 0%, #48bb78 100%)'};
+        color: white;
+        padding: 1rem 1.5rem;
+        border-radius: 12px;
+        box-shadow: 0 10px 25px rgba(0, 0, 0, 0.2);
+        z-index: 10000;
+        animation: slideIn 0.3s ease-out;
+        font-weight: 600;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+        max-width: 400px;
+    `;
+
+    notification.innerHTML = message;
+    document.body.appendChild(notification);
+
+    // Remover después de 5 segundos
+    setTimeout(() => {
+        notification.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => {
+            if (notification.parentNode) {
+                notification.parentNode.removeChild(notification);
+            }
+        }, 300);
+    }, 5000);
+}
+
+// Helper functions
+function getTipoLabel(tipo) {
+    const labels = {
+        'mesa': 'Mesa',
+        'delivery': 'Delivery',
+        'llevar': 'Para Llevar'
+    };
+    return labels[tipo] || tipo || 'Desconocido';
+}
+
+function getTipoIcon(tipo) {
+    const icons = {
+        'mesa': '<i class="fas fa-chair"></i>',
+        'delivery': '<i class="fas fa-truck"></i>',
+        'llevar': '<i class="fas fa-shopping-bag"></i>'
+    };
+    return icons[tipo] || '<i class="fas fa-box"></i>';
+}
+
+function getEstadoClass(estado) {
+    const clases = {
+        'pendiente': 'status-pendiente',
+        'confirmado': 'status-confirmado',
+        'preparacion': 'status-preparacion',
+        'listo': 'status-listo',
+        'entregado': 'status-entregado',
+        'pendiente': 'status-pendiente',
+        'cancelado': 'status-anulada',
+        'pagada': 'status-pagada',
+        'anulada': 'status-anulada'
+    };
+    return clases[estado] || 'status-pendiente';
+}
+
+// Sidebar toggle
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
+
+// Añadir animación CSS para notificaciones
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+    @keyframes slideOut {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+`;
+document.head.appendChild(style);
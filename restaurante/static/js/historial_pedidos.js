@@ -0,0 +1,70 @@
+// Formatear moneda al cargar la página
+document.addEventListener('DOMContentLoaded', function() {
+    // Formatear ingresos totales
+    const ingresosTotalesElement = document.getElementById('ingresosTotalesValor');
+    if (ingresosTotalesElement) {
+        const valor = parseFloat(ingresosTotalesElement.textContent) || 0;
+        ingresosTotalesElement.textContent = valor.toLocaleString('es-DO', {
+            minimumFractionDigits: 2,
+            maximumFractionDigits: 2
+        });
+    }
+
+    // Formatear ingresos del mes
+    const ingresosMesElement = document.getElementById('ingresosMesValor');
+    if (ingresosMesElement) {
+        const valor = parseFloat(ingresosMesElement.textContent) || 0;
+        ingresosMesElement.textContent = valor.toLocaleString('es-DO', {
+            minimumFractionDigits: 2,
+            maximumFractionDigits: 2
+        });
+    }
+
+    // Formatear totales de pedidos en la tabla
+    document.querySelectorAll('.order-total').forEach(element => {
+        const texto = element.textContent.trim();
+        const valor = parseFloat(texto.replace('$', '').replace(/,/g, '')) || 0;
+        element.textContent = '$' + valor.toLocaleString('es-DO', {
+            minimumFractionDigits: 2,
+            maximumFractionDigits: 2
+        });
+    });
+});
+
+// Función para alternar sidebar
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
+
+// Cerrar sidebar al hacer clic en overlay
+document.getElementById('sidebarOverlay').addEventListener('click', toggleSidebar);
+
+// Función para exportar historial
+function exportHistorial() {
+    alert('Funcionalidad de exportación en desarrollo');
+}
+
+// Filtrar al presionar Enter
+document.getElementById('searchInput')?.addEventListener('keypress', function(e) {
+    if (e.key === 'Enter') {
+        document.getElementById('filterForm').submit();
+    }
+});
+
+// Mostrar detalles del pedido al hacer clic en la fila
+document.querySelectorAll('#pedidosTable tbody tr').forEach(row => {
+    row.addEventListener('click', function(e) {
+        // Evitar que se active al hacer clic en enlaces o botones
+        if (e.target.tagName === 'A' || e.target.tagName === 'BUTTON') {
+            return;
+        }
+
+        const pedidoId = this.getAttribute('data-order-id');
+        if (pedidoId) {
+            window.location.href = `/gestiondepedidos/detalle/${pedidoId}/`;
+        }
+    });
+});
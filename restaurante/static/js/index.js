@@ -0,0 +1,94 @@
+// Función para mostrar notificaciones (disponible siempre)
+function showNotification(message, type = 'success') {
+    // Eliminar notificaciones existentes
+    const existingAlerts = document.querySelectorAll('.alert');
+    existingAlerts.forEach(alert => {
+        alert.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => alert.remove(), 300);
+    });
+
+    // Crear nueva notificación
+    const alert = document.createElement('div');
+    alert.className = `alert alert-${type}`;
+
+    // Configurar color según tipo
+    let bgColor = 'linear-gradient(135deg, #ff7e5f 0%, #feb47b 100%)';
+    if (type === 'error') {
+        bgColor = 'linear-gradient(135deg, #ff416c 0%, #ff4b2b 100%)';
+    } else if (type === 'info') {
+        bgColor = 'linear-gradient(135deg, #2196F3 0%, #21CBF3 100%)';
+    } else if (type === 'warning') {
+        bgColor = 'linear-gradient(135deg, #ffb347 0%, #ffcc33 100%)';
+    } else if (type === 'success') {
+        bgColor = 'linear-gradient(135deg, #4CAF50 0%, #8BC34A 100%)';
+    }
+
+    alert.style.background = bgColor;
+    alert.textContent = message;
+
+    // Agregar al contenedor de mensajes
+    const messagesContainer = document.querySelector('.messages');
+    if (!messagesContainer) {
+        // Crear contenedor si no existe
+        const newMessagesContainer = document.createElement('div');
+        newMessagesContainer.className = 'messages';
+        document.body.appendChild(newMessagesContainer);
+        newMessagesContainer.appendChild(alert);
+    } else {
+        messagesContainer.appendChild(alert);
+    }
+
+    // Auto-remover después de 5 segundos
+    setTimeout(() => {
+        alert.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => alert.remove(), 300);
+    }, 5000);
+}
+
+// Función para estado de carga (solo para login)
+function setLoading(isLoading) {
+    const btn = document.querySelector('#loginButton');
+    if (btn) {
+        if (isLoading) {
+            btn.classList.add('loading');
+            btn.innerHTML = '<div class="spinner"></div>';
+            btn.disabled = true;
+        } else {
+            btn.classList.remove('loading');
+            btn.innerHTML = '<span>🚀</span><span>Iniciar Sesión</span>';
+            btn.disabled = false;
+        }
+    }
+}
+
+// Atajos de teclado
+document.addEventListener('keydown', function(e) {
+    // Ctrl + Enter para enviar formulario de login
+    if (e.ctrlKey && e.key === 'Enter') {
+        const loginForm = document.querySelector('.login-form');
+        if (loginForm) {
+            loginForm.requestSubmit();
+        }
+    }
+
+    // Escape para limpiar formulario
+    if (e.key === 'Escape') {
+        const loginForm = document.querySelector('.login-form');
+        if (loginForm) {
+            if (confirm('¿Deseas limpiar el formulario?')) {
+                loginForm.reset();
+                const usernameInput = document.getElementById('username');
+                if (usernameInput) usernameInput.focus();
+            }
+        }
+    }
+});
+
+// Auto-remover mensajes del servidor después de 5 segundos
+setTimeout(() => {
+    const alerts = document.querySelectorAll('.alert');
+    alerts.forEach(alert => {
+        alert.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => alert.remove(), 300);
+    });
+}, 5000);
@@ -0,0 +1,74 @@
+// Elementos del DOM
+const loginForm = document.querySelector('.login-form');
+const usernameInput = document.querySelector('#username');
+const passwordInput = document.querySelector('#password');
+const loginButton = document.querySelector('#loginButton');
+const rememberCheckbox = document.querySelector('#remember');
+
+// Cargar usuario recordado al iniciar
+document.addEventListener('DOMContentLoaded', function() {
+    const rememberedUser = localStorage.getItem('rememberedUser');
+    if (rememberedUser && usernameInput) {
+        try {
+            const user = JSON.parse(rememberedUser);
+            if (user && user.username) {
+                usernameInput.value = user.username;
+                if (rememberCheckbox) rememberCheckbox.checked = true;
+                showNotification(`👋 ¡Hola ${user.username}! Completa tu contraseña.`, 'info');
+                if (passwordInput) passwordInput.focus();
+            }
+        } catch (e) {
+            localStorage.removeItem('rememberedUser');
+        }
+    }
+
+    // Auto-remover mensajes después de 5 segundos
+    setTimeout(() => {
+        const alerts = document.querySelectorAll('.alert');
+        alerts.forEach(alert => {
+            alert.style.animation = 'slideOut 0.3s ease-out';
+            setTimeout(() => alert.remove(), 300);
+        });
+    }, 5000);
+});
+
+// Manejar envío del formulario
+if (loginForm) {
+    loginForm.addEventListener('submit', function(e) {
+        // Mostrar estado de carga
+        setLoading(true);
+
+        // Guardar en localStorage si se seleccionó "Recordar"
+        if (rememberCheckbox && rememberCheckbox.checked && usernameInput && usernameInput.value.trim()) {
+            localStorage.setItem('rememberedUser', JSON.stringify({
+                username: usernameInput.value.trim(),
+                timestamp: new Date().toISOString()
+            }));
+        } else if (rememberCheckbox && !rememberCheckbox.checked) {
+            localStorage.removeItem('rememberedUser');
+        }
+    });
+}
+
+// Función para mostrar/ocultar contraseña
+function togglePassword() {
+    const type = passwordInput.getAttribute('type') === 'password' ? 'text' : 'password';
+    passwordInput.setAttribute('type', type);
+
+    // Cambiar ícono con Font Awesome
+    const toggleBtn = document.querySelector('.toggle-password i');
+    if (toggleBtn) {
+        toggleBtn.className = type === 'password' ? 'fas fa-eye-slash' : 'fas fa-eye';
+    }
+}
+
+// Funciones para mostrar información
+function showForgotPassword() {
+    showNotification(' Para restablecer tu contraseña, contacta al administrador del sistema.', 'info');
+    return false;
+}
+
+function showContactAdmin() {
+    showNotification('Contacta al administrador del sistema para solicitar una cuenta.', 'info');
+    return false;
+}
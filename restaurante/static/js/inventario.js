@@ -0,0 +1,373 @@
+// Función para formatear moneda en formato RD
+function formatearMoneda(valor) {
+    return parseFloat(valor).toLocaleString('es-DO', {
+        minimumFractionDigits: 2,
+        maximumFractionDigits: 2
+    });
+}
+
+// Inicializar la aplicación
+document.addEventListener('DOMContentLoaded', function() {
+    console.log("=== SISTEMA DE INVENTARIO INICIADO ===");
+
+    // Formatear valores monetarios
+    const totalValueElement = document.getElementById('totalValue');
+    if (totalValueElement) {
+        const value = totalValueElement.textContent.replace('$', '').replace(/,/g, '');
+        totalValueElement.textContent = '$' + formatearMoneda(value);
+    }
+
+    // Formatear precios y subtotales en la tabla
+    document.querySelectorAll('td').forEach(cell => {
+        const text = cell.textContent.trim();
+        if (text.startsWith('$')) {
+            const value = text.replace('$', '').replace(/,/g, '');
+            if (!isNaN(value) && value !== '') {
+                cell.textContent = '$' + formatearMoneda(value);
+            }
+        }
+    });
+
+    // Configurar debounce para búsqueda
+    let searchTimeout;
+    document.getElementById('searchInput').addEventListener('input', function() {
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(aplicarFiltros, 500);
+    });
+
+    // Mostrar mensaje si hay parámetros de búsqueda
+    const urlParams = new URLSearchParams(window.location.search);
+    if (urlParams.has('search') || urlParams.has('categoria') || urlParams.has('stock') || urlParams.has('sort')) {
+        console.log("Filtros activos:", Object.fromEntries(urlParams));
+    }
+});
+
+// Función para aplicar filtros
+function aplicarFiltros() {
+    const searchTerm = document.getElementById('searchInput').value;
+    const categoria = document.getElementById('categoryFilter').value;
+    const stock = document.getElementById('stockFilter').value;
+    const sort = document.getElementById('sortFilter').value;
+
+    // Construir URL con parámetros
+    let url = window.location.pathname + '?';
+    const params = [];
+
+    if (searchTerm) params.push(`search=${encodeURIComponent(searchTerm)}`);
+    if (categoria) params.push(`categoria=${encodeURIComponent(categoria)}`);
+    if (stock) params.push(`stock=${encodeURIComponent(stock)}`);
+    if (sort) params.push(`sort=${encodeURIComponent(sort)}`);
+
+    // Mantener la página actual si existe
+    const currentPage = new URLSearchParams(window.location.search).get('page');
+    if (currentPage && currentPage !== '1') {
+        params.push(`page=${currentPage}`);
+    }
+
+    url += params.join('&');
+
+    // Redirigir a la página con filtros
+    window.location.href = url;
+}
+
+// Cambiar página
+function cambiarPagina(nuevaPagina) {
+    const url = new URL(window.location.href);
+    url.searchParams.set('page', nuevaPagina);
+    window.location.href = url.toString();
+}
+
+// Editar producto usando modal
+function editarProducto(productoId, productoNombre, cantidadActual, precioCompra) {
+    console.log('Editando producto:', {productoId, productoNombre, cantidadActual, precioCompra});
+
+    // Llenar el modal con los datos actuales
+    document.getElementById('editProductoId').value = productoId;
+    document.getElementById('editNombre').value = productoNombre;
+
+    // Pre-llenar campos con valores actuales
+    const cantidadValida = cantidadActual && !isNaN(parseFloat(cantidadActual)) ? parseFloat(cantidadActual) : 0;
+    const precioValido = precioCompra && !isNaN(parseFloat(precioCompra)) ? parseFloat(precioCompra) : 0;
+
+    console.log('Valores procesados:', {cantidadValida, precioValido});
+
+    // Formatear y asignar valores
+    const cantidadFormateada = formatearMoneda(cantidadValida).replace('$', '');
+    const precioFormateado = formatearMoneda(precioValido);
+
+    console.log('Valores formateados:', {cantidadFormateada, precioFormateado});
+
+    document.getElementById('editCantidad').value = cantidadFormateada;
+    document.getElementById('editPrecio').value = precioFormateado;
+
+    // Abrir el modal
+    abrirModal();
+}
+
+// Abrir modal
+function abrirModal() {
+    const modal = document.getElementById('editModal');
+    modal.classList.add('active');
+    document.body.style.overflow = 'hidden';
+
+    // Enfocar el campo de cantidad
+    setTimeout(() => {
+        document.getElementById('editCantidad').focus();
+    }, 300);
+}
+
+// Cerrar modal
+function cerrarModal() {
+    const modal = document.getElementById('editModal');
+    modal.classList.remove('active');
+    document.body.style.overflow = 'auto';
+}
+
+// Guardar edición desde el modal
+function guardarEdicion() {
+    const productoId = document.getElementById('editProductoId').value;
+    const nuevaCantidad = document.getElementById('editCantidad').value;
+    const nuevoPrecio = document.getElementById('editPrecio').value.replace(/[^0-9.]/g, '');
+
+    const cantidadNum = parseFloat(nuevaCantidad);
+    const precioNum = parseFloat(nuevoPrecio);
+
+    if (isNaN(cantidadNum) || cantidadNum < 0) {
+        mostrarError('La cantidad debe ser un número mayor o igual a 0');
+        return;
+    }
+
+    if (isNaN(precioNum) || precioNum < 0) {
+        mostrarError('El precio debe ser un número mayor o igual a 0');
+        return;
+    }
+
+    // Crear formulario para enviar
+    const form = document.createElement('form');
+    form.method = 'POST';
+    form.action = `/producto/${productoId}/actualizar-cantidad/`;
+    form.style.display = 'none';
+
+    // Añadir token CSRF
+    const csrfInput = document.createElement('input');
+    csrfInput.type = 'hidden';
+    csrfInput.name = 'csrfmiddlewaretoken';
+    csrfInput.value = getCSRFToken();
+    form.appendChild(csrfInput);
+
+    // Añadir campo de cantidad
+    const cantidadInput = document.createElement('input');
+    cantidadInput.type = 'hidden';
+    cantidadInput.name = 'cantidad';
+    cantidadInput.value = cantidadNum;
+    form.appendChild(cantidadInput);
+
+    // Añadir campo de precio
+    const precioInput = document.createElement('input');
+    precioInput.type = 'hidden';
+    precioInput.name = 'precio_compra';
+    precioInput.value = precioNum;
+    form.appendChild(precioInput);
+
+    // Enviar formulario
+    document.body.appendChild(form);
+    form.submit();
+
+    // Cerrar modal
+    cerrarModal();
+}
+
+// Eliminar producto
+function eliminarProducto(productoId, productoNombre) {
+    if (confirm(`¿Estás seguro de eliminar el producto:\n"${productoNombre}"?\n\nEsta acción no se puede deshacer.`)) {
+        // Crear formulario para enviar
+        const form = document.createElement('form');
+        form.method = 'POST';
+        form.action = `/producto/${productoId}/eliminar/`;
+        form.style.display = 'none';
+
+        // Añadir token CSRF
+        const csrfInput = document.createElement('input');
+        csrfInput.type = 'hidden';
+        csrfInput.name = 'csrfmiddlewaretoken';
+        csrfInput.value = getCSRFToken();
+        form.appendChild(csrfInput);
+
+        // Enviar formulario
+        document.body.appendChild(form);
+        form.submit();
+    }
+}
+
+// Obtener token CSRF
+function getCSRFToken() {
+    const name = 'csrftoken';
+    let cookieValue = null;
+
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+
+    if (!cookieValue) {
+        console.warn('Token CSRF no encontrado.');
+    }
+
+    return cookieValue;
+}
+
+// Mostrar notificación
+function mostrarNotificacion(mensaje) {
+    const notification = document.createElement('div');
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: linear-gradient(135deg, #ff7e5f 0%, #feb47b 100%);
+        color: white;
+        padding: 1rem 1.5rem;
+        border-radius: 12px;
+        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
+        z-index: 1000;
+        animation: slideIn 0.3s ease-out;
+        font-weight: 600;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+        max-width: 400px;
+        word-break: break-word;
+    `;
+
+    notification.innerHTML = mensaje;
+    document.body.appendChild(notification);
+
+    // Remover después de 3 segundos
+    setTimeout(() => {
+        notification.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => notification.remove(), 300);
+    }, 3000);
+}
+
+// Mostrar error
+function mostrarError(mensaje) {
+    mostrarNotificacion(mensaje);
+}
+
+// Función para exportar inventario
+function exportarInventario() {
+    // Crear tabla CSV
+    let csv = 'Código,Nombre,Categoría,Cantidad,Precio,Subtotal,Estado,Fecha\n';
+
+    document.querySelectorAll('#inventoryBody tr').forEach(row => {
+        if (!row.classList.contains('empty-state')) {
+            const cells = row.querySelectorAll('td');
+            if (cells.length >= 6) {
+                const codigo = cells[0].querySelector('small')?.textContent || '';
+                const nombre = cells[0].querySelector('div:first-child')?.textContent || '';
+                const categoria = cells[1].textContent.trim();
+                const cantidad = cells[2].textContent.trim();
+                const precio = cells[3].textContent.trim().replace('$', '');
+                const subtotal = cells[4].textContent.trim().replace('$', '');
+                const estado = cells[5].textContent.trim();
+                const fecha = cells[0].querySelector('div:last-child')?.textContent.replace(/📅\s*/, '') || '';
+
+                csv += `"${codigo}","${nombre}","${categoria}",${cantidad},${precio},${subtotal},"${estado}","${fecha}"\n`;
+            }
+        }
+    });
+
+    // Descargar archivo
+    const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    const url = URL.createObjectURL(blob);
+
+    link.setAttribute('href', url);
+    link.setAttribute('download', `inventario_${new Date().toISOString().split('T')[0]}.csv`);
+    link.style.visibility = 'hidden';
+
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+
+    mostrarNotificacion('Inventario exportado exitosamente');
+}
+
+// Sidebar toggle
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
+
+// Cerrar modal al hacer clic fuera
+document.addEventListener('click', function(e) {
+    const modal = document.getElementById('editModal');
+    if (e.target === modal) {
+        cerrarModal();
+    }
+});
+
+// Teclas de acceso rápido
+document.addEventListener('keydown', function(e) {
+    // Ctrl + F para buscar
+    if (e.ctrlKey && e.key === 'f') {
+        e.preventDefault();
+        document.getElementById('searchInput').focus();
+    }
+
+    // Ctrl + E para exportar
+    if (e.ctrlKey && e.key === 'e') {
+        e.preventDefault();
+        exportarInventario();
+    }
+
+    // Escape para limpiar búsqueda
+    if (e.key === 'Escape') {
+        document.getElementById('searchInput').value = '';
+        aplicarFiltros();
+    }
+});
+
+// Botón flotante para exportar (opcional)
+const exportButton = document.createElement('button');
+exportButton.innerHTML = '<i class="fas fa-file-export"></i> Exportar CSV';
+exportButton.style.cssText = `
+    position: fixed;
+    bottom: 20px;
+    right: 20px;
+    background: linear-gradient(135deg, #4299e1 0%, #3182ce 100%);
+    color: white;
+    border: none;
+    padding: 10px 15px;
+    border-radius: 25px;
+    cursor: pointer;
+    box-shadow: 0 4px 12px rgba(66, 153, 225, 0.3);
+    font-weight: 600;
+    z-index: 100;
+    display: flex;
+    align-items: center;
+    gap: 5px;
+`;
+exportButton.onclick = exportarInventario;
+document.body.appendChild(exportButton);
+
+// Añadir animación CSS para notificaciones
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+    @keyframes slideOut {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+`;
+document.head.appendChild(style);
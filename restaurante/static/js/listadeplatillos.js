@@ -0,0 +1,393 @@
+// Función para formatear moneda con comas para miles
+function formatearMoneda(numero) {
+    return parseFloat(numero).toLocaleString('en-US', {
+        minimumFractionDigits: 2,
+        maximumFractionDigits: 2
+    });
+}
+
+// Inicializar la aplicación
+document.addEventListener('DOMContentLoaded', function() {
+    // Formatear todos los precios al cargar
+    document.querySelectorAll('td[data-precio]').forEach(cell => {
+        const precio = cell.getAttribute('data-precio');
+        if (precio) {
+            cell.textContent = '$' + formatearMoneda(precio);
+        }
+    });
+
+    // Calcular estadísticas iniciales
+    updateStats();
+    setupEventListeners();
+});
+
+// Configurar event listeners
+function setupEventListeners() {
+    const searchInput = document.getElementById('searchInput');
+    const categoryFilter = document.getElementById('categoryFilter');
+    const sortFilter = document.getElementById('sortFilter');
+
+    searchInput.addEventListener('input', filterAndRender);
+    categoryFilter.addEventListener('change', filterAndRender);
+    sortFilter.addEventListener('change', filterAndRender);
+}
+
+// Actualizar estadísticas
+function updateStats() {
+    const filas = document.querySelectorAll('#platosBody tr');
+    const totalPlatos = filas.length - (document.querySelector('.empty-state') ? 1 : 0);
+
+    if (totalPlatos > 0) {
+        let totalPrecio = 0;
+        let categorias = new Set();
+        const hoy = new Date().toISOString().split('T')[0];
+        let platosHoy = 0;
+
+        // Calcular precio promedio, categorías y platos de hoy
+        document.querySelectorAll('#platosBody tr').forEach(row => {
+            if (!row.classList.contains('empty-state')) {
+                // Precio - usar data-precio para cálculos
+                const precioCell = row.cells[3];
+                const precioData = precioCell.getAttribute('data-precio');
+                const precio = parseFloat(precioData || precioCell.textContent.replace('$', '').replace(/,/g, ''));
+                if (!isNaN(precio)) {
+                    totalPrecio += precio;
+                }
+
+                // Categoría
+                const categoriaText = row.cells[2].textContent.trim();
+                categorias.add(categoriaText);
+
+                // Platos de hoy (simulado por ahora)
+                const fechaCreacion = row.cells[4].textContent;
+                if (fechaCreacion.includes(hoy.substring(8, 10))) {
+                    platosHoy++;
+                }
+            }
+        });
+
+        const precioPromedio = totalPlatos > 0 ? totalPrecio / totalPlatos : 0;
+
+        document.getElementById('totalPlatos').textContent = totalPlatos;
+        document.getElementById('precioPromedio').textContent = '$' + formatearMoneda(precioPromedio);
+        document.getElementById('totalCategorias').textContent = categorias.size;
+        document.getElementById('platosHoy').textContent = platosHoy;
+    }
+}
+
+// Filtrar y renderizar platos
+function filterAndRender() {
+    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    const selectedCategory = document.getElementById('categoryFilter').value;
+    const sortBy = document.getElementById('sortFilter').value;
+
+    const filas = document.querySelectorAll('#platosBody tr');
+
+    filas.forEach(row => {
+        if (row.classList.contains('empty-state')) return;
+
+        const codigo = row.cells[0].textContent.toLowerCase();
+        const nombre = row.cells[1].textContent.toLowerCase();
+        const categoria = row.cells[2].textContent.toLowerCase();
+        const categoriaValue = row.querySelector('.category-badge').className.includes('entrada') ? 'entrada' :
+                              row.querySelector('.category-badge').className.includes('principal') ? 'principal' :
+                              row.querySelector('.category-badge').className.includes('postre') ? 'postre' :
+                              row.querySelector('.category-badge').className.includes('bebida') ? 'bebida' :
+                              row.querySelector('.category-badge').className.includes('rapida') ? 'rapida' :
+                              'especial';
+
+        const matchesSearch = !searchTerm ||
+            codigo.includes(searchTerm) ||
+            nombre.includes(searchTerm);
+
+        const matchesCategory = !selectedCategory || categoriaValue === selectedCategory;
+
+        row.style.display = matchesSearch && matchesCategory ? '' : 'none';
+    });
+
+    // Contar filas visibles
+    const filasVisibles = Array.from(filas).filter(row =>
+        row.style.display !== 'none' && !row.classList.contains('empty-state')
+    ).length;
+
+    // Mostrar/Ocultar estado vacío
+    const emptyState = document.querySelector('.empty-state');
+    if (emptyState) {
+        emptyState.style.display = filasVisibles === 0 ? '' : 'none';
+    }
+
+    // Si hay resultados, ordenarlos
+    if (filasVisibles > 0) {
+        ordenarTabla(sortBy);
+    }
+}
+
+// Ordenar tabla
+function ordenarTabla(sortBy) {
+    const tbody = document.getElementById('platosBody');
+    const filas = Array.from(tbody.querySelectorAll('tr'));
+
+    // Filtrar solo las filas de datos (no el empty state)
+    const filasDatos = filas.filter(row => !row.classList.contains('empty-state'));
+
+    filasDatos.sort((a, b) => {
+        switch(sortBy) {
+            case 'codigo':
+                return a.cells[0].textContent.localeCompare(b.cells[0].textContent);
+            case 'nombre':
+                return a.cells[1].textContent.localeCompare(b.cells[1].textContent);
+            case 'nombre_desc':
+                return b.cells[1].textContent.localeCompare(a.cells[1].textContent);
+            case 'precio_asc':
+                const precioA = parseFloat(a.cells[3].textContent.replace('$', ''));
+                const precioB = parseFloat(b.cells[3].textContent.replace('$', ''));
+                return precioA - precioB;
+            case 'precio_desc':
+                const precioA2 = parseFloat(a.cells[3].textContent.replace('$', ''));
+                const precioB2 = parseFloat(b.cells[3].textContent.replace('$', ''));
+                return precioB2 - precioA2;
+            default:
+                return 0;
+        }
+    });
+
+    // Reordenar las filas en el DOM
+    filasDatos.forEach(row => tbody.appendChild(row));
+}
+
+// Editar plato usando modal
+function editarPlato(platoId) {
+    // Obtener datos de la fila directamente del DOM
+    const row = document.querySelector(`button[onclick="editarPlato(${platoId})"]`).closest('tr');
+
+    const codigo = row.cells[0].textContent;
+    const nombreActual = row.cells[1].textContent;
+
+    // Determinar categoría actual basándose en las clases CSS
+    const badgeElement = row.querySelector('.category-badge');
+    let categoriaActual = 'entrada';
+    if (badgeElement.className.includes('principal')) categoriaActual = 'principal';
+    else if (badgeElement.className.includes('postre')) categoriaActual = 'postre';
+    else if (badgeElement.className.includes('bebida')) categoriaActual = 'bebida';
+    else if (badgeElement.className.includes('rapida')) categoriaActual = 'rapida';
+    else if (badgeElement.className.includes('especial')) categoriaActual = 'especial';
+
+    const precioCell = row.cells[3];
+    const precioActual = precioCell.getAttribute('data-precio') || precioCell.textContent.replace('$', '').replace(/,/g, '');
+
+    // Llenar el modal con los datos actuales
+    document.getElementById('editPlatoId').value = platoId;
+    document.getElementById('editCodigo').value = codigo;
+    document.getElementById('editNombre').value = nombreActual;
+    document.getElementById('editCategoria').value = categoriaActual;
+    document.getElementById('editPrecio').value = formatearMoneda(precioActual);
+
+    // Abrir el modal
+    abrirModal();
+}
+
+// Abrir modal
+function abrirModal() {
+    const modal = document.getElementById('editModal');
+    modal.classList.add('active');
+    document.body.style.overflow = 'hidden';
+
+    // Formatear el precio en tiempo real
+    const precioInput = document.getElementById('editPrecio');
+    precioInput.addEventListener('input', formatearPrecioInput);
+}
+
+// Cerrar modal
+function cerrarModal() {
+    const modal = document.getElementById('editModal');
+    modal.classList.remove('active');
+    document.body.style.overflow = 'auto';
+
+    // Remover event listener
+    const precioInput = document.getElementById('editPrecio');
+    precioInput.removeEventListener('input', formatearPrecioInput);
+}
+
+// Formatear precio en el input del modal
+function formatearPrecioInput(e) {
+    let valor = e.target.value.replace(/[^0-9.]/g, '');
+
+    // Permitir solo un punto decimal
+    const partes = valor.split('.');
+    if (partes.length > 2) {
+        valor = partes[0] + '.' + partes.slice(1).join('');
+    }
+
+    // Limitar decimales a 2
+    if (partes.length === 2 && partes[1].length > 2) {
+        valor = partes[0] + '.' + partes[1].substring(0, 2);
+    }
+
+    // Formatear con comas
+    if (valor) {
+        const [entero, decimal] = valor.split('.');
+        const enteroFormateado = parseInt(entero || 0).toLocaleString('en-US');
+        valor = decimal !== undefined ? enteroFormateado + '.' + decimal : enteroFormateado;
+    }
+
+    e.target.value = valor;
+}
+
+// Guardar edición desde el modal
+function guardarEdicion() {
+    const platoId = document.getElementById('editPlatoId').value;
+    const nuevoNombre = document.getElementById('editNombre').value.trim();
+    const nuevaCategoria = document.getElementById('editCategoria').value;
+    const precioFormateado = document.getElementById('editPrecio').value;
+    const nuevoPrecio = parseFloat(precioFormateado.replace(/,/g, ''));
+
+    // Validar datos
+    if (!nuevoNombre || !nuevaCategoria || isNaN(nuevoPrecio)) {
+        showNotification("Por favor, complete todos los campos correctamente", "error");
+        return;
+    }
+
+    if (nuevoPrecio < 0) {
+        showNotification("El precio debe ser mayor o igual a 0", "error");
+        return;
+    }
+
+    // Cerrar el modal
+    cerrarModal();
+
+    // Crear formulario y enviarlo al servidor
+    const form = document.createElement('form');
+    form.method = 'POST';
+    form.action = `/actualizar-plato/${platoId}/`;
+
+    // Agregar CSRF token
+    const csrfInput = document.createElement('input');
+    csrfInput.type = 'hidden';
+    csrfInput.name = 'csrfmiddlewaretoken';
+    csrfInput.value = getCsrfToken();
+    form.appendChild(csrfInput);
+
+    // Agregar datos
+    const nombreInput = document.createElement('input');
+    nombreInput.type = 'hidden';
+    nombreInput.name = 'nombre';
+    nombreInput.value = nuevoNombre;
+    form.appendChild(nombreInput);
+
+    const categoriaInput = document.createElement('input');
+    categoriaInput.type = 'hidden';
+    categoriaInput.name = 'categoria';
+    categoriaInput.value = nuevaCategoria;
+    form.appendChild(categoriaInput);
+
+    const precioInput = document.createElement('input');
+    precioInput.type = 'hidden';
+    precioInput.name = 'precio';
+    precioInput.value = nuevoPrecio;
+    form.appendChild(precioInput);
+
+    // Enviar formulario
+    document.body.appendChild(form);
+    form.submit();
+}
+
+// Eliminar plato
+function eliminarPlato(platoId) {
+    const row = document.querySelector(`button[onclick="eliminarPlato(${platoId})"]`).closest('tr');
+    const nombrePlato = row.cells[1].textContent;
+
+    if (confirm(`¿Estás seguro de eliminar "${nombrePlato}" del menú?`)) {
+        fetch(`/eliminar-plato/${platoId}/`, {
+            method: 'DELETE',
+            headers: {
+                'X-CSRFToken': getCsrfToken()
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                row.remove();
+                updateStats();
+                showNotification(`"${nombrePlato}" eliminado exitosamente!`);
+
+                // Verificar si quedan platos
+                const filasRestantes = document.querySelectorAll('#platosBody tr');
+                if (filasRestantes.length === 1 && filasRestantes[0].classList.contains('empty-state')) {
+                    filasRestantes[0].style.display = '';
+                }
+            } else {
+                showNotification(`Error: ${data.error}`, "error");
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            showNotification("Error al eliminar el plato", "error");
+        });
+    }
+}
+
+// Obtener token CSRF
+function getCsrfToken() {
+    return document.querySelector('[name=csrfmiddlewaretoken]').value;
+}
+
+// Mostrar notificación
+function showNotification(message, type = "success") {
+    // Crear elemento de notificación
+    const notification = document.createElement('div');
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: ${type === 'error' ? 'linear-gradient(135deg, #ff416c 0%, #ff4b2b 100%)' : 'linear-gradient(135deg, #ff7e5f 0%, #feb47b 100%)'};
+        color: white;
+        padding: 1rem 1.5rem;
+        border-radius: 12px;
+        box-shadow: 0 10px 25px rgba(0, 0, 0, 0.2);
+        z-index: 1000;
+        animation: slideIn 0.3s ease-out;
+        font-weight: 600;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+    `;
+
+    notification.innerHTML = message;
+    document.body.appendChild(notification);
+
+    // Remover después de 3 segundos
+    setTimeout(() => {
+        notification.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => notification.remove(), 300);
+    }, 3000);
+}
+
+// Sidebar toggle
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
+
+// Cerrar modal al hacer clic fuera
+document.addEventListener('click', function(e) {
+    const modal = document.getElementById('editModal');
+    if (e.target === modal) {
+        cerrarModal();
+    }
+});
+
+// Añadir animación CSS para notificaciones
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+    @keyframes slideOut {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+`;
+document.head.appendChild(style);
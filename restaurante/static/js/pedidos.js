@@ -0,0 +1,1260 @@
+// ========================================
+// VARIABLES GLOBALES
+// ========================================
+
+// Variables globales - COMBINAR PLATOS Y BEBIDAS
+let platosData = [];
+let bebidasData = [];
+
+// Variable para guardar el estado anterior de la página
+let previousPageState = null;
+
+// Carrito de compras
+let cart = JSON.parse(localStorage.getItem('restaurantCart')) || [];
+
+// Filtros y búsqueda
+let currentFilter = 'todos';
+let currentSearch = '';
+
+// Variables de pedido
+let currentOrderType = 'mesa';
+let currentTableId = '';
+let currentTableNumber = '';
+let currentDeliveryCode = '';
+let currentLlevarCode = '';
+
+// Combinar platos y bebidas
+let menuItems = [];
+
+// ========================================
+// FUNCIONES DE UTILIDAD
+// ========================================
+
+/**
+ * Parsear datos JSON de forma segura
+ */
+function parseJsonSafely(jsonString, defaultValue) {
+    try {
+        if (!jsonString || jsonString === 'undefined' || jsonString === 'null' || jsonString.trim() === '') {
+            return defaultValue || [];
+        }
+        if (typeof jsonString === 'object') {
+            return jsonString;
+        }
+        return JSON.parse(jsonString);
+    } catch (e) {
+        console.error("Error parseando JSON:", e);
+        return defaultValue || [];
+    }
+}
+
+/**
+ * Formatear moneda con comas para miles
+ */
+function formatearMoneda(numero) {
+    return parseFloat(numero).toLocaleString('en-US', {
+        minimumFractionDigits: 2,
+        maximumFractionDigits: 2
+    });
+}
+
+/**
+ * Obtener etiqueta legible de categoría
+ */
+function getCategoriaLabel(categoria) {
+    const labels = {
+        'entrada': 'Entrada',
+        'principal': 'Principal',
+        'postre': 'Postre',
+        'bebida': 'Bebida',
+        'rapida': 'Comida Rápida',
+        'especial': 'Especial'
+    };
+    return labels[categoria] || categoria;
+}
+
+/**
+ * Obtener etiqueta de popularidad
+ */
+function getPopularityLabel(popularidad) {
+    const labels = {
+        'alta': '<span style="color: #4CAF50; font-weight: 600;">Alta</span>',
+        'media': '<span style="color: #ffb347; font-weight: 600;">Media</span>',
+        'baja': '<span style="color: #ff416c; font-weight: 600;">Baja</span>'
+    };
+    return labels[popularidad] || popularidad;
+}
+
+/**
+ * Obtener icono de popularidad
+ */
+function getPopularityIcon(popularidad) {
+    const icons = {
+        'alta': '<i class="fas fa-fire" style="color: #4CAF50;"></i>',
+        'media': '<i class="fas fa-star" style="color: #ffb347;"></i>',
+        'baja': '<i class="fas fa-chart-bar" style="color: #ff416c;"></i>'
+    };
+    return icons[popularidad] || '<i class="fas fa-box"></i>';
+}
+
+/**
+ * Guardar carrito en localStorage
+ */
+function saveCart() {
+    localStorage.setItem('restaurantCart', JSON.stringify(cart));
+}
+
+/**
+ * Mostrar notificación
+ */
+function showNotification(message, type = 'success') {
+    // Eliminar notificaciones anteriores (excepto las de Django)
+    document.querySelectorAll('.notification').forEach(n => {
+        if (n.parentElement !== document.querySelector('.messages')) {
+            n.remove();
+        }
+    });
+
+    const notification = document.createElement('div');
+    notification.className = `notification ${type}`;
+    notification.innerHTML = message;
+    notification.style.position = 'fixed';
+    notification.style.top = '20px';
+    notification.style.right = '20px';
+
+    document.body.appendChild(notification);
+
+    setTimeout(() => {
+        if (notification.parentElement) {
+            notification.style.animation = 'slideOut 0.3s ease-out';
+            setTimeout(() => {
+                if (notification.parentElement) {
+                    notification.remove();
+                }
+            }, 300);
+        }
+    }, 5000);
+}
+
+// ========================================
+// INICIALIZACIÓN
+// ========================================
+
+/**
+ * Inicializar la aplicación cuando el DOM esté listo
+ */
+document.addEventListener('DOMContentLoaded', function() {
+    console.log("=== INICIALIZANDO APLICACIÓN ===");
+
+    // Obtener datos de Django
+    try {
+        platosData = JSON.parse(PAGINA.platosJson);
+        // ✅ NO MODIFICAR IDs - vienen correctos desde el servidor
+        console.log("✅ Platos cargados:", platosData.length);
+    } catch (e) {
+        console.error("❌ Error parseando platos_json:", e);
+        platosData = [];
+    }
+
+    try {
+        bebidasData = JSON.parse(PAGINA.bebidasJson);
+        // ✅ NO MODIFICAR IDs - vienen correctos desde el servidor
+        console.log("✅ Bebidas cargadas:", bebidasData.length);
+    } catch (e) {
+        console.error("❌ Error parseando bebidas_json:", e);
+        bebidasData = [];
+    }
+
+    // Combinar ambos en un solo array
+    menuItems = [...platosData, ...bebidasData];
+    console.log("📦 Total items en menú:", menuItems.length);
+
+    // 🔍 DEBUG: Mostrar los primeros items
+    if (menuItems.length > 0) {
+        console.log("\n📋 Primeros items del menú:");
+        menuItems.slice(0, 3).forEach(item => {
+            console.log(`  - ${item.nombre} (ID: ${item.id}, Tipo: ${item.tipo}, Es bebida: ${item.es_bebida})`);
+        });
+    }
+
+    // Verificar si estamos en modo ticket
+    if (document.body.classList.contains('ticket-mode')) {
+        showTicketContent();
+    } else {
+        showPedidosContent();
+    }
+});
+
+/**
+ * Mostrar contenido de pedidos
+ */
+function showPedidosContent() {
+    renderMenu();
+    renderCart();
+    updateCartSummary();
+    setupEventListeners();
+    updateOrderCode();
+
+    loadFormData();
+    initializeTableSelection();
+
+    setTimeout(updatePlaceOrderButton, 300);
+
+    if (menuItems.length === 0) {
+        showNotification('<i class="fas fa-exclamation-triangle"></i> No hay platos ni bebidas disponibles en el menú', 'warning');
+    }
+}
+
+/**
+ * Mostrar contenido de ticket
+ */
+function showTicketContent() {
+    const closeButton = document.querySelector('.btn-close');
+    if (closeButton) {
+        closeButton.onclick = function() {
+            localStorage.removeItem('restaurantCart');
+            window.location.href = '/pedidos/';
+        };
+    }
+
+    const printButton = document.querySelector('.btn-print');
+    if (printButton) {
+        printButton.onclick = function() {
+            window.print();
+        };
+    }
+
+    window.onafterprint = function() {
+        setTimeout(function() {
+            console.log("Impresión completada");
+        }, 3000);
+    };
+
+    document.addEventListener('keydown', function(e) {
+        if (e.key === 'Escape') {
+            localStorage.removeItem('restaurantCart');
+            window.location.href = '/pedidos/';
+        }
+    });
+}
+
+/**
+ * Cargar datos del formulario desde localStorage
+ */
+function loadFormData() {
+    const savedCart = localStorage.getItem('restaurantCart');
+    if (savedCart) {
+        cart = JSON.parse(savedCart);
+        renderCart();
+        updateCartSummary();
+    }
+}
+
+// ========================================
+// CONFIGURACIÓN DE EVENTOS
+// ========================================
+
+/**
+ * Configurar event listeners
+ */
+function setupEventListeners() {
+    console.log("Configurando event listeners...");
+
+    // Búsqueda
+    const searchInput = document.getElementById('searchInput');
+    if (searchInput) {
+        searchInput.addEventListener('input', function() {
+            currentSearch = this.value.toLowerCase().trim();
+            renderMenu();
+        });
+    }
+
+    // Campos de cliente
+    const customerName = document.getElementById('customerName');
+    const customerPhone = document.getElementById('customerPhone');
+    const customerNameTakeaway = document.getElementById('customerNameTakeaway');
+
+    if (customerName) customerName.addEventListener('input', updatePlaceOrderButton);
+    if (customerPhone) customerPhone.addEventListener('input', updatePlaceOrderButton);
+    if (customerNameTakeaway) customerNameTakeaway.addEventListener('input', updatePlaceOrderButton);
+
+    document.getElementById('customerAddress')?.addEventListener('input', updatePlaceOrderButton);
+
+    // Tipo de pedido
+    document.getElementById('orderType')?.addEventListener('change', function() {
+        updateOrderType();
+    });
+
+    // Formulario de pedido
+    const pedidoForm = document.getElementById('pedidoForm');
+    if (pedidoForm) {
+        pedidoForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+
+            if (!validateForm()) {
+                showNotification('<i class="fas fa-times-circle"></i> Por favor completa todos los campos requeridos', 'error');
+                return false;
+            }
+
+            if (!prepareFormData()) {
+                showNotification('<i class="fas fa-times-circle"></i> Error al preparar los datos del pedido', 'error');
+                return false;
+            }
+
+            // Guardar el estado actual de la página
+            saveCurrentPageState();
+
+            // Mostrar mensaje de procesamiento
+            showNotification('🔄 Procesando tu pedido...', 'success');
+
+            // Obtener los datos del formulario
+            const formData = new FormData(pedidoForm);
+
+            // Enviar por AJAX
+            fetch(pedidoForm.action, {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]').value,
+                    'X-Requested-With': 'XMLHttpRequest',
+                },
+            })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Error en la respuesta del servidor');
+                }
+                return response.text();
+            })
+            .then(ticketHtml => {
+                // Reemplazar el contenido de la página con el ticket
+                document.body.innerHTML = ticketHtml;
+
+                // Marcar el body como modo ticket
+                document.body.classList.add('ticket-mode');
+
+                // Ajustar el ticket para que funcione en esta página
+                adjustTicketForCurrentPage();
+
+                // Limpiar el carrito local
+                localStorage.removeItem('restaurantCart');
+                cart = [];
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                showNotification('<i class="fas fa-times-circle"></i> Error al enviar el pedido', 'error');
+                // Restaurar estado si hay error
+                restorePageState();
+            });
+        });
+    }
+}
+
+/**
+ * Guardar estado actual de la página
+ */
+function saveCurrentPageState() {
+    previousPageState = {
+        appContainer: document.querySelector('.app-container')?.outerHTML,
+        cart: [...cart]
+    };
+}
+
+/**
+ * Restaurar estado de la página
+ */
+function restorePageState() {
+    if (previousPageState && previousPageState.appContainer) {
+        document.body.innerHTML = previousPageState.appContainer;
+        cart = previousPageState.cart || [];
+        saveCart();
+        showPedidosContent();
+    }
+}
+
+/**
+ * Ajustar el ticket para que funcione en la página actual
+ */
+function adjustTicketForCurrentPage() {
+    // Modificar el botón de cerrar
+    const closeButton = document.querySelector('.btn-close');
+    if (closeButton) {
+        closeButton.onclick = function() {
+            window.location.href = 'pedidos';
+        };
+    }
+
+    // Modificar el botón de imprimir
+    const printButton = document.querySelector('.btn-print');
+    if (printButton) {
+        printButton.onclick = function() {
+            window.print();
+        };
+    }
+
+    // Modificar el cierre automático después de imprimir
+    window.onafterprint = function() {
+        setTimeout(function() {
+            console.log("Impresión completada. Cierra el ticket para volver a pedidos.");
+        }, 3000);
+    };
+
+    // Modificar el evento de tecla ESC
+    document.addEventListener('keydown', function(e) {
+        if (e.key === 'Escape') {
+            window.location.href = 'pedidos';
+        }
+    });
+
+    // Agregar estilos para que el ticket se vea bien
+    const style = document.createElement('style');
+    style.textContent = `
+        body.ticket-mode {
+            background: white !important;
+            margin: 0 !important;
+            padding: 20px !important;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            min-height: 100vh;
+        }
+
+        body.ticket-mode .ticket {
+            box-shadow: 0 0 20px rgba(0,0,0,0.1);
+            border-radius: 10px;
+            padding: 20px;
+        }
+
+        body.ticket-mode .no-print {
+            position: fixed;
+            top: 20px;
+            right: 20px;
+            z-index: 1000;
+        }
+    `;
+    document.head.appendChild(style);
+}
+
+// ========================================
+// GESTIÓN DE PEDIDOS
+// ========================================
+
+/**
+ * Actualizar tipo de pedido
+ */
+function updateOrderType() {
+    const orderType = document.getElementById('orderType').value;
+    currentOrderType = orderType;
+    document.getElementById('tipoPedidoInput').value = orderType;
+
+    const tableNumberGroup = document.getElementById('tableNumberGroup');
+    const tablesGrid = document.getElementById('tablesGrid');
+    const deliveryCodeGrid = document.getElementById('deliveryCodeGrid');
+    const llevarCodeGrid = document.getElementById('llevarCodeGrid');
+    const deliveryFields = document.getElementById('deliveryFields');
+    const takeawayFields = document.getElementById('takeawayFields');
+
+    if (orderType === 'mesa') {
+        tableNumberGroup?.classList.remove('hidden');
+        tablesGrid?.classList.remove('hidden');
+        deliveryCodeGrid?.classList.add('hidden');
+        llevarCodeGrid?.classList.add('hidden');
+        deliveryFields?.classList.add('hidden');
+        takeawayFields?.classList.add('hidden');
+
+        document.getElementById('customerName').value = '';
+        document.getElementById('customerPhone').value = '';
+        document.getElementById('customerAddress').value = '';
+        document.getElementById('customerNameTakeaway').value = '';
+
+        setTimeout(() => {
+            if (!currentTableId || currentTableId === '') {
+                initializeTableSelection();
+            }
+        }, 50);
+
+    } else if (orderType === 'delivery') {
+        tableNumberGroup?.classList.add('hidden');
+        tablesGrid?.classList.add('hidden');
+        deliveryCodeGrid?.classList.remove('hidden');
+        llevarCodeGrid?.classList.add('hidden');
+        deliveryFields?.classList.remove('hidden');
+        takeawayFields?.classList.add('hidden');
+
+        currentLlevarCode = '';
+        document.getElementById('codigoLlevarInput').value = '';
+        currentTableId = '';
+        document.getElementById('mesaIdInput').value = '';
+        document.getElementById('customerNameTakeaway').value = '';
+
+        setTimeout(() => {
+            const hasDeliveryCodes = document.querySelectorAll('#deliveryCodeGrid .code-item:not(.ocupada)').length > 0;
+
+            if (hasDeliveryCodes) {
+                if (!currentDeliveryCode || currentDeliveryCode === '') {
+                    const firstAvailableCode = document.querySelector('#deliveryCodeGrid .code-item:not(.ocupada)');
+                    if (firstAvailableCode) {
+                        const codigo = firstAvailableCode.getAttribute('data-codigo');
+                        selectDeliveryCode(codigo, 'disponible');
+                    }
+                }
+            } else {
+                showNotification('<i class="fas fa-exclamation-triangle"></i> No hay códigos de delivery disponibles', 'warning');
+            }
+
+            updatePlaceOrderButton();
+
+            setTimeout(() => {
+                document.getElementById('customerName')?.focus();
+            }, 100);
+        }, 50);
+
+    } else if (orderType === 'llevar') {
+        tableNumberGroup?.classList.add('hidden');
+        tablesGrid?.classList.add('hidden');
+        deliveryCodeGrid?.classList.add('hidden');
+        llevarCodeGrid?.classList.remove('hidden');
+        deliveryFields?.classList.add('hidden');
+        takeawayFields?.classList.remove('hidden');
+
+        document.getElementById('customerName').value = '';
+        document.getElementById('customerPhone').value = '';
+        document.getElementById('customerAddress').value = '';
+        currentDeliveryCode = '';
+        document.getElementById('codigoDeliveryInput').value = '';
+        currentTableId = '';
+        document.getElementById('mesaIdInput').value = '';
+
+        setTimeout(() => {
+            const hasLlevarCodes = document.querySelectorAll('#llevarCodeGrid .code-item:not(.ocupada)').length > 0;
+
+            if (hasLlevarCodes) {
+                if (!currentLlevarCode || currentLlevarCode === '') {
+                    const firstAvailableCode = document.querySelector('#llevarCodeGrid .code-item:not(.ocupada)');
+                    if (firstAvailableCode) {
+                        const codigo = firstAvailableCode.getAttribute('data-codigo');
+                        selectLlevarCode(codigo, 'disponible');
+                    }
+                }
+            } else {
+                showNotification('<i class="fas fa-exclamation-triangle"></i> No hay códigos para llevar disponibles', 'warning');
+            }
+
+            updatePlaceOrderButton();
+
+            setTimeout(() => {
+                document.getElementById('customerNameTakeaway')?.focus();
+            }, 100);
+        }, 50);
+    }
+
+    updateOrderCode();
+    updateShippingCost();
+}
+
+/**
+ * Actualizar código de pedido
+ */
+function updateOrderCode() {
+    const orderType = document.getElementById('orderType').value;
+    let code = '';
+
+    if (orderType === 'mesa') {
+        let mesaNumero = currentTableNumber;
+        if (!mesaNumero) {
+            const selectedTable = document.querySelector('.table-item.selected');
+            if (selectedTable) {
+                mesaNumero = selectedTable.getAttribute('data-mesa-numero');
+            }
+        }
+        code = `M${mesaNumero || '??'}`;
+    } else if (orderType === 'delivery') {
+        code = currentDeliveryCode || 'SELECCIONA';
+    } else if (orderType === 'llevar') {
+        code = currentLlevarCode || 'SELECCIONA';
+    }
+
+    document.getElementById('orderCode').textContent = code;
+}
+
+/**
+ * Inicializar selección de mesa automáticamente
+ */
+function initializeTableSelection() {
+    console.log("Inicializando selección de mesa...");
+
+    const tableSelect = document.getElementById('tableNumber');
+    if (tableSelect && tableSelect.value) {
+        const selectedOption = tableSelect.options[tableSelect.selectedIndex];
+        if (selectedOption && !selectedOption.disabled) {
+            const mesaId = selectedOption.value;
+            const mesaNumero = selectedOption.getAttribute('data-numero') ||
+                              selectedOption.textContent.replace('Mesa ', '').split(' ')[0];
+            const estado = selectedOption.textContent.includes('disponible') ? 'disponible' : 'ocupada';
+
+            if (mesaId && mesaNumero && estado === 'disponible') {
+                selectTable(mesaId, mesaNumero, estado);
+                return;
+            }
+        }
+    }
+
+    const firstAvailableTable = document.querySelector('.table-item:not(.ocupada)');
+    if (firstAvailableTable) {
+        const mesaId = firstAvailableTable.getAttribute('data-mesa-id');
+        const mesaNumero = firstAvailableTable.getAttribute('data-mesa-numero');
+        if (mesaId && mesaNumero) {
+            selectTable(mesaId, mesaNumero, 'disponible');
+            return;
+        }
+    }
+
+    if (document.querySelectorAll('.table-item').length > 0 &&
+        document.querySelectorAll('.table-item:not(.ocupada)').length === 0) {
+        showNotification('<i class="fas fa-exclamation-triangle"></i> Todas las mesas están ocupadas. Selecciona otra opción.', 'warning');
+    }
+}
+
+/**
+ * Seleccionar mesa
+ */
+function selectTable(mesaId, mesaNumero, estado) {
+    if (estado !== 'disponible') {
+        showNotification(`<i class="fas fa-exclamation-triangle"></i> La mesa ${mesaNumero} no está disponible`, 'error');
+        return;
+    }
+
+    document.querySelectorAll('.table-item').forEach(item => {
+        item.classList.remove('selected');
+    });
+
+    const tableItem = document.querySelector(`.table-item[data-mesa-id="${mesaId}"]`);
+    if (tableItem) {
+        tableItem.classList.add('selected');
+    }
+
+    currentTableId = mesaId;
+    currentTableNumber = mesaNumero;
+    document.getElementById('tableNumber').value = mesaId;
+    document.getElementById('mesaIdInput').value = mesaId;
+
+    updateOrderCode();
+    updatePlaceOrderButton();
+}
+
+/**
+ * Seleccionar código delivery
+ */
+function selectDeliveryCode(codigo, estado) {
+    if (estado !== 'disponible') {
+        showNotification(`<i class="fas fa-exclamation-triangle"></i> El código ${codigo} no está disponible`, 'error');
+        return;
+    }
+
+    document.querySelectorAll('#deliveryCodeGrid .code-item').forEach(item => {
+        item.classList.remove('selected');
+    });
+
+    const codeItem = document.querySelector(`#deliveryCodeGrid .code-item[data-codigo="${codigo}"]`);
+    if (codeItem) {
+        codeItem.classList.add('selected');
+    }
+
+    currentDeliveryCode = codigo;
+    document.getElementById('codigoDeliveryInput').value = codigo;
+
+    updateOrderCode();
+    updatePlaceOrderButton();
+}
+
+/**
+ * Seleccionar código para llevar
+ */
+function selectLlevarCode(codigo, estado) {
+    if (estado !== 'disponible') {
+        showNotification(`<i class="fas fa-exclamation-triangle"></i> El código ${codigo} no está disponible`, 'error');
+        return;
+    }
+
+    document.querySelectorAll('#llevarCodeGrid .code-item').forEach(item => {
+        item.classList.remove('selected');
+    });
+
+    const codeItem = document.querySelector(`#llevarCodeGrid .code-item[data-codigo="${codigo}"]`);
+    if (codeItem) {
+        codeItem.classList.add('selected');
+    }
+
+    currentLlevarCode = codigo;
+    document.getElementById('codigoLlevarInput').value = codigo;
+
+    updateOrderCode();
+    updatePlaceOrderButton();
+}
+
+/**
+ * Validar formulario
+ */
+function validateForm() {
+    const orderType = document.getElementById('orderType').value;
+
+    if (cart.length === 0) {
+        showNotification('<i class="fas fa-times-circle"></i> Tu carrito está vacío', 'error');
+        return false;
+    }
+
+    if (orderType === 'mesa') {
+        if (!currentTableId || currentTableId === '') {
+            showNotification('<i class="fas fa-times-circle"></i> Por favor selecciona una mesa', 'error');
+            return false;
+        }
+    } else if (orderType === 'delivery') {
+        if (!currentDeliveryCode || currentDeliveryCode === '') {
+            showNotification('<i class="fas fa-times-circle"></i> Por favor selecciona un código de delivery', 'error');
+            return false;
+        }
+    } else if (orderType === 'llevar') {
+        if (!currentLlevarCode || currentLlevarCode === '') {
+            showNotification('<i class="fas fa-times-circle"></i> Por favor selecciona un código para llevar', 'error');
+            return false;
+        }
+    }
+
+    return true;
+}
+
+/**
+ * Preparar datos del formulario
+ */
+function prepareFormData() {
+    try {
+        const orderType = document.getElementById('orderType').value;
+
+        if (orderType === 'mesa') {
+            document.getElementById('mesaIdInput').value = currentTableId;
+            document.getElementById('codigoDeliveryInput').value = '';
+            document.getElementById('codigoLlevarInput').value = '';
+        } else if (orderType === 'delivery') {
+            document.getElementById('mesaIdInput').value = '';
+            document.getElementById('codigoDeliveryInput').value = currentDeliveryCode;
+            document.getElementById('codigoLlevarInput').value = '';
+        } else if (orderType === 'llevar') {
+            document.getElementById('mesaIdInput').value = '';
+            document.getElementById('codigoDeliveryInput').value = '';
+            document.getElementById('codigoLlevarInput').value = currentLlevarCode;
+        }
+
+        return true;
+    } catch (error) {
+        console.error('Error preparando datos:', error);
+        return false;
+    }
+}
+
+/**
+ * Actualizar botón de confirmar pedido
+ */
+function updatePlaceOrderButton() {
+    const orderType = document.getElementById('orderType').value;
+    const placeOrderBtn = document.getElementById('placeOrderBtn');
+
+    if (cart.length === 0) {
+        placeOrderBtn.disabled = true;
+        placeOrderBtn.innerHTML = '<span><i class="fas fa-check-circle"></i> Confirmar Pedido</span>';
+        return;
+    }
+
+    let isValid = false;
+    let missingFields = [];
+
+    if (orderType === 'mesa') {
+        isValid = currentTableId && currentTableId !== '';
+        if (!isValid) missingFields.push('mesa');
+
+    } else if (orderType === 'delivery') {
+        const hasDeliveryCodes = document.querySelectorAll('#deliveryCodeGrid .code-item:not(.ocupada)').length > 0;
+        const codeValid = currentDeliveryCode && currentDeliveryCode !== '';
+
+        isValid = hasDeliveryCodes && codeValid;
+
+        if (!codeValid) missingFields.push('código delivery');
+        if (!hasDeliveryCodes) missingFields.push('códigos disponibles');
+
+    } else if (orderType === 'llevar') {
+        const hasLlevarCodes = document.querySelectorAll('#llevarCodeGrid .code-item:not(.ocupada)').length > 0;
+        const codeValid = currentLlevarCode && currentLlevarCode !== '';
+
+        isValid = hasLlevarCodes && codeValid;
+
+        if (!codeValid) missingFields.push('código para llevar');
+        if (!hasLlevarCodes) missingFields.push('códigos disponibles');
+    }
+
+    placeOrderBtn.disabled = !isValid;
+
+    if (isValid) {
+        placeOrderBtn.innerHTML = '<span><i class="fas fa-check-circle"></i> Confirmar Pedido</span>';
+    } else {
+        if (missingFields.length > 0) {
+            placeOrderBtn.innerHTML = `<span><i class="fas fa-hourglass-half"></i> Requiere: ${missingFields.join(', ')}</span>`;
+        } else {
+            placeOrderBtn.innerHTML = '<span><i class="fas fa-hourglass-half"></i> Complete los campos</span>';
+        }
+    }
+}
+
+// ========================================
+// RENDERIZADO DE MENÚ
+// ========================================
+
+/**
+ * Renderizar menú (PLATOS Y BEBIDAS)
+ */
+function renderMenu() {
+    const menuGrid = document.getElementById('menuGrid');
+    const searchResults = document.getElementById('searchResults');
+    const resultsCount = document.getElementById('resultsCount');
+
+    let filteredItems = menuItems;
+
+    // Filtrar por categoría
+    if (currentFilter !== 'todos') {
+        filteredItems = filteredItems.filter(item => item.categoria === currentFilter);
+    }
+
+    // Filtrar por búsqueda
+    if (currentSearch) {
+        filteredItems = filteredItems.filter(item => {
+            const searchInName = item.nombre.toLowerCase().includes(currentSearch);
+            const searchInDescription = item.descripcion.toLowerCase().includes(currentSearch);
+            const searchInCategory = getCategoriaLabel(item.categoria).toLowerCase().includes(currentSearch);
+            const searchInCode = item.codigo.toLowerCase().includes(currentSearch);
+
+            return searchInName || searchInDescription || searchInCategory || searchInCode;
+        });
+
+        if (searchResults) {
+            searchResults.style.display = 'flex';
+        }
+        if (resultsCount) {
+            resultsCount.textContent = filteredItems.length;
+        }
+    } else {
+        if (searchResults) {
+            searchResults.style.display = 'none';
+        }
+    }
+
+    // Filtrar items agotados
+    filteredItems = filteredItems.filter(item => item.disponibilidad !== 'agotado');
+
+    // Si no hay items
+    if (filteredItems.length === 0) {
+        menuGrid.innerHTML = `
+            <div class="empty-cart">
+                <svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                    <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 8v4l3 3m6-3a9 9 0 11-18 0 9 9 0 0118 0z" />
+                </svg>
+                <h3>${currentSearch ? 'No se encontraron resultados' : 'No hay platos ni bebidas disponibles'}</h3>
+                <p>${currentSearch ? 'Intenta con otros términos de búsqueda' : 'Agrega platos o bebidas primero'}</p>
+                ${currentSearch ? '<button type="button" class="btn btn-secondary" onclick="clearSearch()" style="margin-top: 1rem;">Limpiar búsqueda</button>' : ''}
+            </div>
+        `;
+        return;
+    }
+
+    // Renderizar items
+    menuGrid.innerHTML = filteredItems.map(item => {
+        const cartItem = cart.find(ci => String(ci.id) === String(item.id));
+        const quantity = cartItem ? cartItem.quantity : 0;
+
+        const esBebida = item.es_bebida || item.tipo === 'bebida';
+        const stock = parseFloat(item.stock || 0);
+        const isLowStock = stock > 0 && stock < 10;
+        const isMediumStock = stock >= 10 && stock < 50;
+        const isHighStock = stock >= 50;
+        const isOutOfStock = stock <= 0;
+
+        let stockIcon = '';
+        let stockColor = '';
+        let stockText = '';
+
+        if (esBebida) {
+            if (isOutOfStock) {
+                stockIcon = '<i class="fas fa-times-circle" style="color: #ff416c;"></i>';
+                stockText = '<span style="color: #ff416c; font-weight: 600;">Agotado</span>';
+            } else if (isLowStock) {
+                stockIcon = '<i class="fas fa-exclamation-triangle" style="color: #ff416c;"></i>';
+                stockText = `<span style="color: #ff416c; font-weight: 600;">Stock <span style="font-size: 1.3rem; font-weight: 700;">${stock}</span></span>`;
+            } else if (isMediumStock) {
+                stockIcon = '<i class="fas fa-chart-bar" style="color: #ffb347;"></i>';
+                stockText = `<span style="color: #ffb347; font-weight: 600;">Stock <span style="font-size: 1.3rem; font-weight: 700;">${stock}</span></span>`;
+            } else if (isHighStock) {
+                stockIcon = '<i class="fas fa-check-circle" style="color: #4CAF50;"></i>';
+                stockText = `<span style="color: #4CAF50; font-weight: 600;">Stock <span style="font-size: 1.3rem; font-weight: 700;">${stock}</span></span>`;
+            }
+        }
+
+        const iconoTipo = esBebida ? '<i class="fas fa-glass-water"></i>' : '<i class="fas fa-utensils"></i>';
+        const tipoTexto = esBebida ? 'Bebida' : 'Plato';
+
+        let highlightedName = item.nombre;
+        let highlightedDescription = item.descripcion;
+
+        if (currentSearch) {
+            const regex = new RegExp(`(${currentSearch})`, 'gi');
+            highlightedName = item.nombre.replace(regex, '<mark>$1</mark>');
+            highlightedDescription = item.descripcion.replace(regex, '<mark>$1</mark>');
+        }
+
+        return `
+            <div class="menu-card">
+                <div class="menu-card-header">
+                    <div class="menu-card-title">
+                        <div class="menu-card-name">${iconoTipo} ${highlightedName}</div>
+                        <div class="menu-card-price">${formatearMoneda(item.precio)}</div>
+                    </div>
+                    <div class="menu-card-category card-${item.categoria}">
+                        ${getCategoriaLabel(item.categoria)} (${tipoTexto})
+                    </div>
+                </div>
+                <div class="menu-card-body">
+                    <p class="menu-card-description">${highlightedDescription}</p>
+                    <div class="menu-card-details">
+                        <div class="menu-card-detail">
+                            <span><i class="fas fa-box"></i></span>
+                            <span>Código: ${item.codigo}</span>
+                        </div>
+                        <div class="menu-card-detail">
+                            <span>${getPopularityIcon(item.popularidad)}</span>
+                            <span>${getPopularityLabel(item.popularidad)}</span>
+                        </div>
+                    </div>
+                    ${esBebida && stockText ? `
+                    <div class="menu-card-details">
+                        <div class="menu-card-detail">
+                            <span>${stockIcon}</span>
+                            <span>${stockText}</span>
+                        </div>
+                    </div>
+                    ` : ''}
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <div class="cart-item-quantity">
+                            <button type="button" class="quantity-btn" onclick="decreaseQuantity('${item.id}')" ${(esBebida && isOutOfStock) ? 'disabled' : ''}>-</button>
+                            <span class="quantity-value">${quantity}</span>
+                            <button type="button" class="quantity-btn" onclick="increaseQuantity('${item.id}')" ${(esBebida && isOutOfStock) ? 'disabled' : ''}>+</button>
+                        </div>
+                        <button type="button" class="btn btn-secondary" onclick="addToCart('${item.id}')" ${(esBebida && isOutOfStock) ? 'disabled' : ''}>
+                            <span>${esBebida ? '<i class="fas fa-glass-water"></i> Agregar Bebida' : '<i class="fas fa-utensils"></i> Agregar Plato'}</span>
+                        </button>
+                    </div>
+                </div>
+            </div>
+        `;
+    }).join('');
+
+    // Agregar estilos para el highlighting
+    const style = document.createElement('style');
+    style.textContent = `
+        mark {
+            background-color: #ffeb3b;
+            padding: 0 2px;
+            border-radius: 2px;
+        }
+    `;
+    if (!document.querySelector('style[data-search-highlight]')) {
+        style.setAttribute('data-search-highlight', 'true');
+        document.head.appendChild(style);
+    }
+}
+
+/**
+ * Filtrar menú por categoría
+ */
+function filterMenu(category) {
+    currentFilter = category;
+
+    document.querySelectorAll('.category-filter').forEach(btn => {
+        btn.classList.remove('active');
+    });
+    event.target.classList.add('active');
+
+    renderMenu();
+}
+
+/**
+ * Realizar búsqueda
+ */
+function performSearch() {
+    const searchInput = document.getElementById('searchInput');
+    currentSearch = searchInput.value.toLowerCase().trim();
+    renderMenu();
+}
+
+/**
+ * Limpiar búsqueda
+ */
+function clearSearch() {
+    const searchInput = document.getElementById('searchInput');
+    searchInput.value = '';
+    currentSearch = '';
+    renderMenu();
+}
+
+// ========================================
+// GESTIÓN DEL CARRITO
+// ========================================
+
+/**
+ * Agregar al carrito
+ */
+function addToCart(itemId) {
+    const item = menuItems.find(i => String(i.id) === String(itemId));
+    if (!item) return;
+
+    const esBebida = item.es_bebida || item.tipo === 'bebida';
+
+    // Validar stock para bebidas
+    if (esBebida) {
+        const stock = parseFloat(item.stock || 0);
+        if (stock <= 0) {
+            showNotification(`<i class="fas fa-times-circle"></i> "${item.nombre}" está agotado`, 'error');
+            return;
+        }
+    }
+
+    const existingItem = cart.find(ci => String(ci.id) === String(itemId));
+
+    if (existingItem) {
+        // Validar stock antes de aumentar cantidad
+        if (esBebida) {
+            const stock = parseFloat(item.stock || 0);
+            if (existingItem.quantity >= stock) {
+                showNotification(`<i class="fas fa-times-circle"></i> No hay suficiente stock de "${item.nombre}". Disponible: ${stock}`, 'error');
+                return;
+            }
+        }
+        existingItem.quantity += 1;
+        existingItem.total = existingItem.quantity * existingItem.price;
+    } else {
+        cart.push({
+            id: item.id,
+            name: item.nombre,
+            price: item.precio,
+            quantity: 1,
+            total: item.precio,
+            category: item.categoria,
+            codigo: item.codigo,
+            prepTime: item.tiempoPreparacion || (esBebida ? 5 : 15),
+            tipo: esBebida ? 'bebida' : 'plato',
+            es_bebida: esBebida,
+            stock: item.stock
+        });
+    }
+
+    saveCart();
+    renderMenu();
+    renderCart();
+    updateCartSummary();
+    updatePlaceOrderButton();
+
+    showNotification(`<i class="fas fa-check-circle"></i> "${item.nombre}" ${esBebida ? '(Bebida)' : '(Plato)'} agregado al carrito!`, 'success');
+}
+
+/**
+ * Aumentar cantidad
+ */
+function increaseQuantity(itemId) {
+    const item = cart.find(ci => String(ci.id) === String(itemId));
+    if (item) {
+        // Validar stock para bebidas
+        if (item.es_bebida) {
+            const menuItem = menuItems.find(i => String(i.id) === String(itemId));
+            if (menuItem) {
+                const stock = parseFloat(menuItem.stock || 0);
+                if (item.quantity >= stock) {
+                    showNotification(`<i class="fas fa-times-circle"></i> No hay suficiente stock de "${item.name}". Disponible: ${stock}`, 'error');
+                    return;
+                }
+            }
+        }
+
+        item.quantity += 1;
+        item.total = item.quantity * item.price;
+        saveCart();
+        renderMenu();
+        renderCart();
+        updateCartSummary();
+    }
+}
+
+/**
+ * Disminuir cantidad
+ */
+function decreaseQuantity(itemId) {
+    const itemIndex = cart.findIndex(ci => String(ci.id) === String(itemId));
+    if (itemIndex !== -1) {
+        if (cart[itemIndex].quantity > 1) {
+            cart[itemIndex].quantity -= 1;
+            cart[itemIndex].total = cart[itemIndex].quantity * cart[itemIndex].price;
+        } else {
+            cart.splice(itemIndex, 1);
+        }
+        saveCart();
+        renderMenu();
+        renderCart();
+        updateCartSummary();
+        updatePlaceOrderButton();
+    }
+}
+
+/**
+ * Remover del carrito
+ */
+function removeFromCart(itemId) {
+    const item = cart.find(ci => String(ci.id) === String(itemId));
+    if (!item) return;
+
+    if (confirm(`¿Eliminar "${item.name}" del carrito?`)) {
+        cart = cart.filter(item => String(item.id) !== String(itemId));
+        saveCart();
+        renderMenu();
+        renderCart();
+        updateCartSummary();
+        updatePlaceOrderButton();
+
+        showNotification(`<i class="fas fa-trash-alt"></i> "${item.name}" eliminado del carrito`, 'success');
+    }
+}
+
+/**
+ * Vaciar carrito
+ */
+function clearCart() {
+    if (cart.length === 0) return;
+
+    if (confirm('¿Estás seguro de vaciar el carrito?')) {
+        cart = [];
+        saveCart();
+        renderMenu();
+        renderCart();
+        updateCartSummary();
+        updatePlaceOrderButton();
+        showNotification('<i class="fas fa-trash-alt"></i> Carrito vaciado', 'success');
+    }
+}
+
+/**
+ * Renderizar carrito
+ */
+function renderCart() {
+    const cartItemsContainer = document.getElementById('cartItemsContainer');
+    const orderSummary = document.getElementById('orderSummary');
+
+    if (cart.length === 0) {
+        cartItemsContainer.innerHTML = `
+            <div class="empty-cart">
+                <svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                    <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M3 3h2l.4 2M7 13h10l4-8H5.4M7 13L5.4 5M7 13l-2.293 2.293c-.63.63-.184 1.707.707 1.707H17m0 0a2 2 0 100 4 2 2 0 000-4zm-8 2a2 2 0 11-4 0 2 2 0 014 0z" />
+                </svg>
+                <h3>Tu carrito está vacío</h3>
+                <p>Agrega platos o bebidas del menú</p>
+            </div>
+        `;
+        if (orderSummary) {
+            orderSummary.style.display = 'none';
+        }
+        return;
+    }
+
+    cartItemsContainer.innerHTML = cart.map(item => `
+        <div class="cart-item">
+            <div class="cart-item-info">
+                <div class="cart-item-name">
+                    ${item.name}
+                    <span style="font-size: 0.9rem; color: ${item.es_bebida ? '#3b82f6' : '#ef4444'};">
+                        ${item.es_bebida ? '<i class="fas fa-glass-water"></i> Bebida' : '<i class="fas fa-utensils"></i> Plato'}
+                    </span>
+                </div>
+                <div class="cart-item-details">
+                    <span>${formatearMoneda(item.price)} c/u</span>
+                    <span>Código: ${item.codigo || 'N/A'}</span>
+                    <span>Categoría: ${getCategoriaLabel(item.category)}</span>
+                </div>
+            </div>
+            <div class="cart-item-quantity">
+                <button type="button" class="quantity-btn" onclick="decreaseQuantity('${item.id}')">-</button>
+                <span class="quantity-value">${item.quantity}</span>
+                <button type="button" class="quantity-btn" onclick="increaseQuantity('${item.id}')">+</button>
+            </div>
+            <div class="cart-item-price">${formatearMoneda(item.total)}</div>
+            <button type="button" class="remove-item" onclick="removeFromCart('${item.id}')" title="Eliminar del carrito">×</button>
+        </div>
+    `).join('');
+
+    if (orderSummary) {
+        orderSummary.style.display = 'block';
+    }
+}
+
+/**
+ * Actualizar resumen del carrito - SIN IVA NI ENVÍO
+ */
+function updateCartSummary() {
+    const subtotal = cart.reduce((sum, item) => sum + item.total, 0);
+    const total = subtotal;
+
+    document.getElementById('subtotalDisplay').textContent = `${formatearMoneda(subtotal)}`;
+    document.getElementById('totalAmountDisplay').textContent = `${formatearMoneda(total)}`;
+
+    document.getElementById('subtotalInput').value = subtotal.toFixed(2);
+    document.getElementById('envioInput').value = "0.00";
+    document.getElementById('totalInput').value = total.toFixed(2);
+
+    document.getElementById('cartItemsInput').value = JSON.stringify(cart);
+}
+
+/**
+ * Calcular costo de envío - SIEMPRE 0
+ */
+function calculateShipping() {
+    return 0;
+}
+
+/**
+ * Actualizar costo de envío cuando cambia el tipo de pedido
+ */
+function updateShippingCost() {
+    updateCartSummary();
+}
+
+// ========================================
+// SIDEBAR Y UI
+// ========================================
+
+/**
+ * Toggle del sidebar en móvil
+ */
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
+
+// ========================================
+// ESTILOS DINÁMICOS
+// ========================================
+
+// Añadir animación CSS para notificaciones
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+    @keyframes slideOut {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+`;
+document.head.appendChild(style);
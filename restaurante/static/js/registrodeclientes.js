@@ -0,0 +1,714 @@
+    // Inicializar la aplicación
+    document.addEventListener('DOMContentLoaded', function () {
+        console.log('=== INICIANDO REGISTRO DE CLIENTES ===');
+
+        setupEventListeners();
+        setupFormValidation();
+
+        // Formatear automáticamente el campo de límite de crédito
+        formatearLimiteCredito();
+    });
+
+    // Configurar event listeners
+    function setupEventListeners() {
+        // Validar cédula mientras se escribe
+        const cedulaInput = document.getElementById('cedula');
+        if (cedulaInput) {
+            cedulaInput.addEventListener('input', validarCedula);
+            cedulaInput.addEventListener('keypress', soloNumeros);
+        }
+
+        // Validar teléfonos mientras se escriben
+        const telefonoPrincipal = document.getElementById('telefono_principal');
+        const telefonoAlternativo = document.getElementById('telefono_alternativo');
+
+        if (telefonoPrincipal) {
+            telefonoPrincipal.addEventListener('input', validarTelefono);
+            telefonoPrincipal.addEventListener('keypress', soloNumeros);
+        }
+
+        if (telefonoAlternativo) {
+            telefonoAlternativo.addEventListener('input', validarTelefono);
+            telefonoAlternativo.addEventListener('keypress', soloNumeros);
+        }
+
+        // Validar límite de crédito mientras se escribe
+        const limiteCreditoInput = document.getElementById('limite_credito');
+        if (limiteCreditoInput) {
+            limiteCreditoInput.addEventListener('input', validarLimiteCredito);
+            limiteCreditoInput.addEventListener('blur', formatearLimiteCredito);
+        }
+
+        // Validar días de crédito
+        const diasCreditoInput = document.getElementById('dias_credito');
+        if (diasCreditoInput) {
+            diasCreditoInput.addEventListener('input', validarDiasCredito);
+        }
+
+        // Manejar envío del formulario
+        const form = document.getElementById('clienteForm');
+        if (form) {
+            form.addEventListener('submit', handleFormSubmit);
+        }
+    }
+
+    // Configurar validación del formulario
+    function setupFormValidation() {
+        // Validación de cédula (11 dígitos exactos)
+        const cedulaInput = document.getElementById('cedula');
+        const cedulaHelp = document.getElementById('cedulaHelp');
+
+        cedulaInput.addEventListener('blur', function () {
+            const valor = cedulaInput.value.trim();
+
+            if (valor.length === 0) {
+                mostrarError(cedulaInput, cedulaHelp, 'La cédula es requerida');
+            } else if (valor.length !== 11) {
+                mostrarError(cedulaInput, cedulaHelp, 'La cédula debe tener exactamente 11 dígitos');
+            } else if (!/^\d+$/.test(valor)) {
+                mostrarError(cedulaInput, cedulaHelp, 'La cédula solo puede contener números');
+            } else {
+                mostrarExito(cedulaInput, cedulaHelp, 'Cédula válida');
+            }
+        });
+
+        // Validación de nombre completo
+        const nombreInput = document.getElementById('nombre_completo');
+        nombreInput.addEventListener('blur', function () {
+            const valor = nombreInput.value.trim();
+            if (valor.length === 0) {
+                mostrarError(nombreInput, null, 'El nombre completo es requerido');
+            } else if (valor.length < 5) {
+                mostrarError(nombreInput, null, 'El nombre debe tener al menos 5 caracteres');
+            } else {
+                mostrarExito(nombreInput, null, 'Nombre válido');
+            }
+        });
+
+        // Validación de dirección
+        const direccionInput = document.getElementById('direccion');
+        direccionInput.addEventListener('blur', function () {
+            const valor = direccionInput.value.trim();
+            if (valor.length === 0) {
+                mostrarError(direccionInput, null, 'La dirección es requerida');
+            } else if (valor.length < 10) {
+                mostrarError(direccionInput, null, 'La dirección debe tener al menos 10 caracteres');
+            } else {
+                mostrarExito(direccionInput, null, 'Dirección válida');
+            }
+        });
+
+        // Validación de teléfono principal
+        const telefonoInput = document.getElementById('telefono_principal');
+        telefonoInput.addEventListener('blur', function () {
+            const valor = telefonoInput.value.trim();
+            if (valor.length === 0) {
+                mostrarError(telefonoInput, null, 'El teléfono principal es requerido');
+            } else if (valor.length !== 10) {
+                mostrarError(telefonoInput, null, 'El teléfono debe tener exactamente 10 dígitos');
+            } else if (!/^\d+$/.test(valor)) {
+                mostrarError(telefonoInput, null, 'El teléfono solo puede contener números');
+            } else {
+                mostrarExito(telefonoInput, null, 'Teléfono válido');
+            }
+        });
+
+        // Validación de teléfono alternativo (opcional)
+        const telefonoAltInput = document.getElementById('telefono_alternativo');
+        if (telefonoAltInput) {
+            telefonoAltInput.addEventListener('blur', function () {
+                const valor = telefonoAltInput.value.trim();
+                if (valor.length > 0) {
+                    if (valor.length !== 10) {
+                        mostrarError(telefonoAltInput, null, 'El teléfono alternativo debe tener exactamente 10 dígitos');
+                    } else if (!/^\d+$/.test(valor)) {
+                        mostrarError(telefonoAltInput, null, 'El teléfono solo puede contener números');
+                    } else {
+                        mostrarExito(telefonoAltInput, null, 'Teléfono válido');
+                    }
+                }
+            });
+        }
+
+        // Validación de límite de crédito
+        const limiteCreditoInput = document.getElementById('limite_credito');
+        const creditoHelp = document.getElementById('creditoHelp');
+
+        if (limiteCreditoInput && creditoHelp) {
+            limiteCreditoInput.addEventListener('blur', function () {
+                const valor = parseFloat(limiteCreditoInput.value) || 0;
+
+                if (valor < 0) {
+                    mostrarError(limiteCreditoInput, creditoHelp, 'El límite de crédito no puede ser negativo');
+                } else if (valor > 1000000) {
+                    mostrarError(limiteCreditoInput, creditoHelp, 'El límite de crédito máximo es $1,000,000');
+                } else {
+                    mostrarExito(limiteCreditoInput, creditoHelp, 'Límite de crédito válido');
+                }
+            });
+        }
+
+        // Validación de días de crédito
+        const diasCreditoInput = document.getElementById('dias_credito');
+        if (diasCreditoInput) {
+            diasCreditoInput.addEventListener('blur', function () {
+                const valor = parseInt(diasCreditoInput.value) || 0;
+
+                if (valor < 0) {
+                    mostrarError(diasCreditoInput, null, 'Los días de crédito no pueden ser negativos');
+                } else if (valor > 365) {
+                    mostrarError(diasCreditoInput, null, 'Los días de crédito máximo son 365');
+                } else {
+                    mostrarExito(diasCreditoInput, null, 'Días de crédito válidos');
+                }
+            });
+        }
+    }
+
+    // Función para validar cédula en tiempo real
+    function validarCedula() {
+        const input = document.getElementById('cedula');
+        const valor = input.value;
+
+        // Solo permitir números
+        const soloNumeros = valor.replace(/\D/g, '');
+
+        // Limitar a 11 dígitos
+        if (soloNumeros.length > 11) {
+            input.value = soloNumeros.substring(0, 11);
+        } else {
+            input.value = soloNumeros;
+        }
+
+        // Actualizar ayuda visual
+        const cedulaHelp = document.getElementById('cedulaHelp');
+        const caracteresRestantes = 11 - soloNumeros.length;
+
+        if (caracteresRestantes > 0) {
+            cedulaHelp.innerHTML = `<i class="fas fa-info-circle"></i> ${caracteresRestantes} dígitos restantes`;
+            cedulaHelp.className = 'form-help';
+        } else {
+            cedulaHelp.innerHTML = `<i class="fas fa-check-circle"></i> Cédula completa (11 dígitos)`;
+            cedulaHelp.className = 'form-help success';
+        }
+    }
+
+    // Función para validar teléfono en tiempo real
+    function validarTelefono(e) {
+        const input = e.target;
+        const valor = input.value;
+
+        // Solo permitir números
+        const soloNumeros = valor.replace(/\D/g, '');
+
+        // Limitar a 10 dígitos
+        if (soloNumeros.length > 10) {
+            input.value = soloNumeros.substring(0, 10);
+        } else {
+            input.value = soloNumeros;
+        }
+    }
+
+    // Función para validar límite de crédito en tiempo real
+    function validarLimiteCredito() {
+        const input = document.getElementById('limite_credito');
+        const valor = input.value;
+
+        // Solo permitir números y un punto decimal
+        const soloNumeros = valor.replace(/[^\d.]/g, '');
+
+        // Limitar a un punto decimal
+        const partes = soloNumeros.split('.');
+        if (partes.length > 2) {
+            input.value = partes[0] + '.' + partes.slice(1).join('');
+        } else {
+            input.value = soloNumeros;
+        }
+
+        // Limitar a 2 decimales
+        if (partes.length === 2 && partes[1].length > 2) {
+            input.value = partes[0] + '.' + partes[1].substring(0, 2);
+        }
+
+        // Limitar máximo a 1,000,000
+        const valorNumerico = parseFloat(input.value) || 0;
+        if (valorNumerico > 1000000) {
+            input.value = '1000000';
+        }
+
+        // Actualizar ayuda visual
+        const creditoHelp = document.getElementById('creditoHelp');
+        const valorFormateado = formatearMoneda(valorNumerico);
+
+        if (valorNumerico === 0) {
+            creditoHelp.innerHTML = `<i class="fas fa-info-circle"></i> Sin crédito - solo ventas al contado`;
+        } else if (valorNumerico > 0) {
+            creditoHelp.innerHTML = `<i class="fas fa-check-circle"></i> Límite establecido: $${valorFormateado}`;
+            creditoHelp.className = 'form-help success';
+        }
+    }
+
+    // Función para formatear límite de crédito
+    function formatearLimiteCredito() {
+        const input = document.getElementById('limite_credito');
+        const valor = parseFloat(input.value) || 0;
+
+        // Formatear a 2 decimales
+        input.value = valor.toFixed(2);
+
+        // Si el valor es 0, establecer como 0.00
+        if (valor === 0) {
+            input.value = '0.00';
+        }
+    }
+
+    // Función para validar días de crédito
+    function validarDiasCredito() {
+        const input = document.getElementById('dias_credito');
+        const valor = input.value;
+
+        // Solo permitir números
+        const soloNumeros = valor.replace(/\D/g, '');
+        input.value = soloNumeros;
+
+        // Limitar a 3 dígitos
+        if (soloNumeros.length > 3) {
+            input.value = soloNumeros.substring(0, 3);
+        }
+
+        const valorNumerico = parseInt(input.value) || 0;
+
+        // Actualizar ayuda visual
+        const helpElement = input.parentElement.querySelector('.form-help');
+        if (helpElement) {
+            if (valorNumerico === 0) {
+                helpElement.innerHTML = `<i class="fas fa-info-circle"></i> Solo ventas al contado`;
+            } else if (valorNumerico > 0 && valorNumerico <= 30) {
+                helpElement.innerHTML = `<i class="fas fa-check-circle"></i> Crédito a corto plazo (${valorNumerico} días)`;
+                helpElement.className = 'form-help success';
+            } else if (valorNumerico > 30) {
+                helpElement.innerHTML = `<i class="fas fa-exclamation-triangle"></i> Crédito a largo plazo (${valorNumerico} días)`;
+                helpElement.className = 'form-help';
+            }
+        }
+    }
+
+    // Función para permitir solo números
+    function soloNumeros(e) {
+        const charCode = e.which ? e.which : e.keyCode;
+
+        // Solo permitir números (0-9)
+        if (charCode < 48 || charCode > 57) {
+            e.preventDefault();
+            return false;
+        }
+        return true;
+    }
+
+    // Función para mostrar error en campo
+    function mostrarError(input, helpElement, mensaje) {
+        input.classList.remove('valid');
+        input.classList.add('error');
+
+        if (helpElement) {
+            helpElement.innerHTML = `<i class="fas fa-exclamation-circle"></i> ${mensaje}`;
+            helpElement.className = 'form-help error';
+        } else {
+            // Crear elemento de ayuda si no existe
+            const parent = input.parentElement;
+            let existingHelp = parent.querySelector('.form-help');
+
+            if (!existingHelp) {
+                existingHelp = document.createElement('div');
+                existingHelp.className = 'form-help error';
+                parent.appendChild(existingHelp);
+            }
+
+            existingHelp.innerHTML = `<i class="fas fa-exclamation-circle"></i> ${mensaje}`;
+        }
+    }
+
+    // Función para mostrar éxito en campo
+    function mostrarExito(input, helpElement, mensaje) {
+        input.classList.remove('error');
+        input.classList.add('valid');
+
+        if (helpElement) {
+            helpElement.innerHTML = `<i class="fas fa-check-circle"></i> ${mensaje}`;
+            helpElement.className = 'form-help success';
+        } else {
+            const parent = input.parentElement;
+            let existingHelp = parent.querySelector('.form-help');
+
+            if (!existingHelp) {
+                existingHelp = document.createElement('div');
+                existingHelp.className = 'form-help success';
+                parent.appendChild(existingHelp);
+            }
+
+            existingHelp.innerHTML = `<i class="fas fa-check-circle"></i> ${mensaje}`;
+        }
+    }
+
+    // Función para formatear moneda
+    function formatearMoneda(valor) {
+        return new Intl.NumberFormat('es-DO', {
+            minimumFractionDigits: 2,
+            maximumFractionDigits: 2
+        }).format(valor);
+    }
+
+    // Manejar envío del formulario
+    function handleFormSubmit(e) {
+        e.preventDefault();
+
+        // Validar todos los campos requeridos
+        const cedula = document.getElementById('cedula').value.trim();
+        const nombre = document.getElementById('nombre_completo').value.trim();
+        const direccion = document.getElementById('direccion').value.trim();
+        const telefono = document.getElementById('telefono_principal').value.trim();
+        const limiteCredito = document.getElementById('limite_credito').value.trim();
+
+        let formularioValido = true;
+
+        // Validar cédula
+        if (cedula.length !== 11 || !/^\d+$/.test(cedula)) {
+            mostrarError(document.getElementById('cedula'), document.getElementById('cedulaHelp'), 'Cédula inválida. Debe tener 11 dígitos numéricos.');
+            formularioValido = false;
+        }
+
+        // Validar nombre
+        if (nombre.length < 5) {
+            mostrarError(document.getElementById('nombre_completo'), null, 'Nombre inválido. Mínimo 5 caracteres.');
+            formularioValido = false;
+        }
+
+        // Validar dirección
+        if (direccion.length < 10) {
+            mostrarError(document.getElementById('direccion'), null, 'Dirección inválida. Mínimo 10 caracteres.');
+            formularioValido = false;
+        }
+
+        // Validar teléfono
+        if (telefono.length !== 10 || !/^\d+$/.test(telefono)) {
+            mostrarError(document.getElementById('telefono_principal'), null, 'Teléfono inválido. Debe tener 10 dígitos numéricos.');
+            formularioValido = false;
+        }
+
+        // Validar teléfono alternativo si tiene valor
+        const telefonoAlt = document.getElementById('telefono_alternativo').value.trim();
+        if (telefonoAlt.length > 0 && (telefonoAlt.length !== 10 || !/^\d+$/.test(telefonoAlt))) {
+            mostrarError(document.getElementById('telefono_alternativo'), null, 'Teléfono alternativo inválido. Debe tener 10 dígitos numéricos.');
+            formularioValido = false;
+        }
+
+        // Validar límite de crédito
+        const limiteCreditoNum = parseFloat(limiteCredito) || 0;
+        if (limiteCreditoNum < 0) {
+            mostrarError(document.getElementById('limite_credito'), document.getElementById('creditoHelp'), 'El límite de crédito no puede ser negativo.');
+            formularioValido = false;
+        }
+
+        // Validar días de crédito
+        const diasCreditoInput = document.getElementById('dias_credito');
+        if (diasCreditoInput) {
+            const diasCredito = parseInt(diasCreditoInput.value) || 0;
+            if (diasCredito < 0) {
+                mostrarError(diasCreditoInput, null, 'Los días de crédito no pueden ser negativos.');
+                formularioValido = false;
+            }
+        }
+
+        if (!formularioValido) {
+            mostrarNotificacion('Por favor, corrija los errores en el formulario.', 'error');
+            return;
+        }
+
+        // Mostrar resumen antes de enviar
+        mostrarResumenCliente({
+            cedula,
+            nombre,
+            direccion,
+            telefono,
+            telefonoAlt,
+            limiteCredito: limiteCreditoNum,
+            diasCredito: parseInt(document.getElementById('dias_credito').value) || 0,
+            notasCredito: document.getElementById('notas_credito').value.trim()
+        });
+    }
+
+    // Función para mostrar resumen del cliente
+    function mostrarResumenCliente(datos) {
+        const limiteFormateado = formatearMoneda(datos.limiteCredito);
+        const mensajeResumen = `
+    <div style="text-align: left; padding: 1rem;">
+        <h4 style="color: #2c3e50; margin-bottom: 1rem; display: flex; align-items: center; gap: 10px;">
+            <i class="fas fa-clipboard-check"></i> Resumen del Cliente
+        </h4>
+
+        <div style="background: #f8f9ff; padding: 1rem; border-radius: 10px; margin-bottom: 1rem;">
+            <div style="display: flex; justify-content: space-between; margin-bottom: 0.5rem;">
+                <strong>Cédula:</strong>
+                <span>${datos.cedula}</span>
+            </div>
+            <div style="display: flex; justify-content: space-between; margin-bottom: 0.5rem;">
+                <strong>Nombre:</strong>
+                <span>${datos.nombre}</span>
+            </div>
+            <div style="display: flex; justify-content: space-between; margin-bottom: 0.5rem;">
+                <strong>Teléfono:</strong>
+                <span>${datos.telefono}</span>
+            </div>
+            ${datos.telefonoAlt ? `
+                <div style="display: flex; justify-content: space-between; margin-bottom: 0.5rem;">
+                    <strong>Teléfono Alt:</strong>
+                    <span>${datos.telefonoAlt}</span>
+                </div>
+            ` : ''}
+            <div style="display: flex; justify-content: space-between; margin-bottom: 0.5rem;">
+                <strong>Límite Crédito:</strong>
+                <span style="color: ${datos.limiteCredito > 0 ? '#38a169' : '#718096'}; font-weight: bold;">
+                    $${limiteFormateado}
+                </span>
+            </div>
+            <div style="display: flex; justify-content: space-between;">
+                <strong>Días Crédito:</strong>
+                <span style="color: ${datos.diasCredito > 0 ? '#3182ce' : '#718096'}; font-weight: bold;">
+                    ${datos.diasCredito} días
+                </span>
+            </div>
+        </div>
+
+        ${datos.notasCredito ? `
+            <div style="background: #fff7ed; padding: 1rem; border-radius: 10px; margin-bottom: 1rem; border-left: 4px solid #ed8936;">
+                <strong>Notas:</strong>
+                <div style="margin-top: 0.5rem; font-size: 0.9rem;">${datos.notasCredito}</div>
+            </div>
+        ` : ''}
+
+        <p style="color: #718096; font-size: 0.9rem; margin-bottom: 1rem;">
+            ¿Está seguro de registrar este cliente?
+        </p>
+
+        <div style="display: flex; gap: 1rem; justify-content: flex-end;">
+            <button id="cancelarRegistro" style="padding: 0.75rem 1.5rem; background: #a0aec0; color: white; border: none; border-radius: 8px; cursor: pointer;">
+                Cancelar
+            </button>
+            <button id="confirmarRegistro" style="padding: 0.75rem 1.5rem; background: #38a169; color: white; border: none; border-radius: 8px; font-weight: bold; cursor: pointer;">
+                Confirmar Registro
+            </button>
+        </div>
+    </div>
+`;
+
+        // Crear modal de confirmación
+        const modal = document.createElement('div');
+        modal.style.cssText = `
+    position: fixed;
+    top: 0;
+    left: 0;
+    width: 100%;
+    height: 100%;
+    background: rgba(0, 0, 0, 0.7);
+    z-index: 9999;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+`;
+
+        modal.innerHTML = `
+    <div style="background: white; border-radius: 15px; max-width: 500px; width: 90%; animation: fadeIn 0.3s;">
+        <div style="background: linear-gradient(135deg, #ff7e5f 0%, #feb47b 100%); color: white; padding: 1.5rem; border-radius: 15px 15px 0 0;">
+            <h3 style="margin: 0; display: flex; align-items: center; gap: 10px;">
+                <i class="fas fa-user-check"></i> Confirmar Registro
+            </h3>
+        </div>
+        <div style="padding: 1.5rem;">
+            ${mensajeResumen}
+        </div>
+    </div>
+`;
+
+        document.body.appendChild(modal);
+
+        // Agregar estilos de animación si no existen
+        if (!document.querySelector('#modal-styles')) {
+            const style = document.createElement('style');
+            style.id = 'modal-styles';
+            style.textContent = `
+        @keyframes fadeIn {
+            from { opacity: 0; transform: scale(0.9); }
+            to { opacity: 1; transform: scale(1); }
+        }
+    `;
+            document.head.appendChild(style);
+        }
+
+        // Event listeners para los botones del modal
+        document.getElementById('cancelarRegistro').addEventListener('click', function () {
+            document.body.removeChild(modal);
+        });
+
+        document.getElementById('confirmarRegistro').addEventListener('click', function () {
+            enviarFormulario(datos);
+            document.body.removeChild(modal);
+        });
+    }
+
+    // Función para enviar el formulario
+    function enviarFormulario(datos) {
+        // Mostrar indicador de carga
+        const submitBtn = document.querySelector('#clienteForm button[type="submit"]');
+        const originalText = submitBtn.innerHTML;
+        submitBtn.innerHTML = '<span><i class="fas fa-spinner fa-spin"></i></span><span>Registrando...</span>';
+        submitBtn.disabled = true;
+
+        // Enviar formulario usando Fetch API
+        const form = document.getElementById('clienteForm');
+        const formData = new FormData(form);
+
+        fetch(form.action, {
+            method: 'POST',
+            body: formData,
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest',
+                'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]').value
+            }
+        })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    mostrarNotificacion(data.mensaje, 'success');
+                    limpiarFormulario();
+                } else {
+                    mostrarNotificacion(data.error || 'Error al registrar cliente', 'error');
+                }
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                mostrarNotificacion('Error de conexión', 'error');
+            })
+            .finally(() => {
+                // Restaurar botón
+                submitBtn.innerHTML = originalText;
+                submitBtn.disabled = false;
+            });
+    }
+
+    // Función para limpiar el formulario
+    function limpiarFormulario() {
+        const form = document.getElementById('clienteForm');
+        form.reset();
+
+        // Limpiar clases de validación
+        const inputs = form.querySelectorAll('input, textarea');
+        inputs.forEach(input => {
+            input.classList.remove('error', 'valid');
+
+            // Limpiar mensajes de ayuda
+            const parent = input.parentElement;
+            const helpElement = parent.querySelector('.form-help');
+            if (helpElement && !helpElement.id) {
+                helpElement.remove();
+            }
+        });
+
+        // Restaurar ayuda de cédula
+        const cedulaHelp = document.getElementById('cedulaHelp');
+        if (cedulaHelp) {
+            cedulaHelp.innerHTML = `<i class="fas fa-info-circle"></i> La cédula debe contener exactamente 11 dígitos`;
+            cedulaHelp.className = 'form-help';
+        }
+
+        // Restaurar ayuda de crédito
+        const creditoHelp = document.getElementById('creditoHelp');
+        if (creditoHelp) {
+            creditoHelp.innerHTML = `<i class="fas fa-info-circle"></i> Establezca el límite máximo de crédito para el cliente`;
+            creditoHelp.className = 'form-help';
+        }
+
+        // Restablecer días de crédito a 30
+        const diasCreditoInput = document.getElementById('dias_credito');
+        if (diasCreditoInput) {
+            diasCreditoInput.value = '30';
+        }
+
+        mostrarNotificacion('Formulario limpiado correctamente', 'success');
+    }
+
+    // Función para mostrar notificaciones
+    function mostrarNotificacion(mensaje, tipo = 'success') {
+        // Remover notificaciones anteriores
+        const existing = document.querySelectorAll('.custom-notification');
+        existing.forEach(n => n.remove());
+
+        // Crear notificación
+        const notification = document.createElement('div');
+        notification.className = 'custom-notification';
+
+        const colors = {
+            success: { bg: '#38a169', color: '#ffffff', icon: 'fa-check-circle' },
+            error: { bg: '#e53e3e', color: '#ffffff', icon: 'fa-exclamation-circle' },
+            info: { bg: '#3182ce', color: '#ffffff', icon: 'fa-info-circle' },
+            warning: { bg: '#d69e2e', color: '#ffffff', icon: 'fa-exclamation-triangle' }
+        };
+
+        const color = colors[tipo] || colors.success;
+
+        notification.style.cssText = `
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    background: ${color.bg};
+    color: ${color.color};
+    padding: 1rem 1.5rem;
+    border-radius: 10px;
+    box-shadow: 0 10px 25px rgba(0, 0, 0, 0.2);
+    z-index: 10000;
+    animation: slideIn 0.3s ease-out;
+    font-weight: 600;
+    display: flex;
+    align-items: center;
+    gap: 10px;
+    max-width: 400px;
+`;
+
+        notification.innerHTML = `<i class="fas ${color.icon}"></i> ${mensaje}`;
+        document.body.appendChild(notification);
+
+        // Animaciones CSS para notificaciones
+        if (!document.querySelector('#notification-styles')) {
+            const style = document.createElement('style');
+            style.id = 'notification-styles';
+            style.textContent = `
+        @keyframes slideIn {
+            from { transform: translateX(100%); opacity: 0; }
+            to { transform: translateX(0); opacity: 1; }
+        }
+        @keyframes slideOut {
+            from { transform: translateX(0); opacity: 1; }
+            to { transform: translateX(100%); opacity: 0; }
+        }
+    `;
+            document.head.appendChild(style);
+        }
+
+        // Remover después de 5 segundos
+        setTimeout(() => {
+            notification.style.animation = 'slideOut 0.3s ease-out';
+            setTimeout(() => notification.remove(), 300);
+        }, 5000);
+    }
+
+    // Función para alternar sidebar
+    function toggleSidebar() {
+        const sidebar = document.getElementById('sidebar');
+        const overlay = document.getElementById('sidebarOverlay');
+        sidebar.classList.toggle('open');
+        overlay.classList.toggle('open');
+    }
+
+    // Cerrar sidebar al hacer clic en overlay
+    document.getElementById('sidebarOverlay').addEventListener('click', toggleSidebar);
+
+    console.log('✅ JavaScript de registro de clientes cargado correctamente');
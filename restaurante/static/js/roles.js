@@ -0,0 +1,180 @@
+// Función para obtener el token CSRF de las cookies
+ function getCSRFToken() {
+     const name = 'csrftoken';
+     let cookieValue = null;
+     if (document.cookie && document.cookie !== '') {
+         const cookies = document.cookie.split(';');
+         for (let i = 0; i < cookies.length; i++) {
+             const cookie = cookies[i].trim();
+             if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                 cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                 break;
+             }
+         }
+     }
+     return cookieValue;
+ }
+
+ // Función para evaluar la fortaleza de la contraseña
+ function checkPasswordStrength(password) {
+     const bar = document.getElementById('passwordStrengthBar');
+     let strength = 0;
+
+     // Contiene mayúsculas
+     if (/[A-Z]/.test(password)) strength++;
+
+     // Contiene números
+     if (/[0-9]/.test(password)) strength++;
+
+     // Contiene caracteres especiales
+     if (/[^A-Za-z0-9]/.test(password)) strength++;
+
+     // Actualizar barra de fortaleza
+     bar.style.width = (strength * 33.33) + '%';
+     bar.className = 'password-strength-bar';
+
+     if (strength <= 1) {
+         bar.classList.add('password-strength-weak');
+     } else if (strength <= 2) {
+         bar.classList.add('password-strength-medium');
+     } else {
+         bar.classList.add('password-strength-strong');
+     }
+ }
+
+ // Función para validar coincidencia de contraseñas
+ function validatePasswordMatch() {
+     const password = document.getElementById('password').value;
+     const confirmPassword = document.getElementById('confirmPassword').value;
+     const passwordMatch = document.getElementById('passwordMatch');
+
+     if (confirmPassword && password !== confirmPassword) {
+         passwordMatch.style.display = 'block';
+         return false;
+     } else {
+         passwordMatch.style.display = 'none';
+         return true;
+     }
+ }
+
+ // Función para resetear el formulario
+ function resetForm() {
+     document.getElementById('passwordStrengthBar').style.width = '0%';
+     document.getElementById('passwordMatch').style.display = 'none';
+ }
+
+ // Función para confirmar eliminación
+ function confirmDelete() {
+     return confirm('¿Está seguro de que desea eliminar este usuario? Esta acción no se puede deshacer.');
+ }
+
+ // Función para abrir modal de edición
+ function openEditModal(userId, username, groupId, status) {
+     document.getElementById('editUserId').value = userId;
+     document.getElementById('editUsername').value = username;
+     document.getElementById('editRole').value = groupId;
+     document.getElementById('editStatus').value = status;
+
+     // Actualizar acción del formulario
+     const editForm = document.getElementById('editUserForm');
+     editForm.action = `/roles/edit/${userId}/`;
+
+     // Mostrar modal
+     document.getElementById('editModal').style.display = 'flex';
+ }
+
+ // Función para cerrar modal de edición
+ function closeEditModal() {
+     document.getElementById('editModal').style.display = 'none';
+ }
+
+ // Función para el sidebar
+ function toggleSidebar() {
+     const sidebar = document.getElementById('sidebar');
+     const overlay = document.getElementById('sidebarOverlay');
+     sidebar.classList.toggle('open');
+     overlay.classList.toggle('open');
+ }
+
+ // Inicializar eventos cuando se carga la página
+ document.addEventListener('DOMContentLoaded', function() {
+     // Inicializar la validación de contraseña
+     const passwordInput = document.getElementById('password');
+     const confirmPasswordInput = document.getElementById('confirmPassword');
+
+     if (passwordInput) {
+         passwordInput.addEventListener('input', function() {
+             checkPasswordStrength(this.value);
+         });
+     }
+
+     if (confirmPasswordInput) {
+         confirmPasswordInput.addEventListener('input', validatePasswordMatch);
+     }
+
+     // Validar formulario de creación de usuario
+     const userForm = document.getElementById('userForm');
+     if (userForm) {
+         userForm.addEventListener('submit', function(e) {
+             // Validar coincidencia de contraseñas
+             if (!validatePasswordMatch()) {
+                 e.preventDefault();
+                 alert('Las contraseñas no coinciden');
+                 return;
+             }
+
+             // Validar que se seleccionó un rol
+             const role = document.getElementById('role').value;
+             if (!role) {
+                 e.preventDefault();
+                 alert('Por favor seleccione un rol');
+                 return;
+             }
+         });
+     }
+
+     // Validar formulario de edición de usuario
+     const editUserForm = document.getElementById('editUserForm');
+     if (editUserForm) {
+         editUserForm.addEventListener('submit', function(e) {
+             // Validar que se seleccionó un rol
+             const editRole = document.getElementById('editRole').value;
+             if (!editRole) {
+                 e.preventDefault();
+                 alert('Por favor seleccione un rol');
+                 return;
+             }
+         });
+     }
+
+     // Cerrar el sidebar si se hace clic fuera de él en móvil
+     document.addEventListener('click', function(event) {
+         const sidebar = document.getElementById('sidebar');
+         const menuToggle = document.querySelector('.menu-toggle');
+         const sidebarOverlay = document.getElementById('sidebarOverlay');
+
+         if (window.innerWidth <= 768 &&
+             sidebar.classList.contains('open') &&
+             !sidebar.contains(event.target) &&
+             !menuToggle.contains(event.target)) {
+             toggleSidebar();
+         }
+     });
+
+     // Cerrar modal al hacer clic fuera
+     const editModal = document.getElementById('editModal');
+     if (editModal) {
+         editModal.addEventListener('click', function(event) {
+             if (event.target === editModal) {
+                 closeEditModal();
+             }
+         });
+     }
+ });
+
+ // Atajo de teclado para cerrar modal con Escape
+ document.addEventListener('keydown', function(event) {
+     if (event.key === 'Escape') {
+         closeEditModal();
+     }
+ });
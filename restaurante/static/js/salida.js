@@ -0,0 +1,1445 @@
+// Función para formatear números con comas para miles
+function formatearNumero(valor) {
+    const numero = parseFloat(valor);
+    if (isNaN(numero)) return '0.00';
+
+    const partes = numero.toFixed(2).split('.');
+    const entero = partes[0];
+    const decimal = partes[1];
+
+    // Agregar comas para los miles
+    const enteroFormateado = entero.replace(/\B(?=(\d{3})+(?!\d))/g, ',');
+
+    return enteroFormateado + '.' + decimal;
+}
+
+// Función para formatear moneda en formato US
+function formatearMoneda(valor) {
+    return '$' + formatearNumero(valor);
+}
+
+// Variables globales
+let productos = [];
+let salidas = [];
+let filteredProductos = [];
+let currentPage = 1;
+const itemsPerPage = 10;
+let currentTab = 'inventario';
+
+// Inicializar la aplicación
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('=== INICIANDO SISTEMA DE SALIDA DE PRODUCTOS ===');
+
+    // Cargar productos desde la base de datos Django
+    cargarProductosDesdeDjango();
+
+    // Cargar historial desde localStorage
+    cargarHistorialDesdeStorage();
+
+    // Llamar a las funciones de renderizado
+    setupEventListeners();
+
+    console.log('Sistema inicializado');
+});
+
+// Cargar productos desde Django (datos reales)
+async function cargarProductosDesdeDjango() {
+    try {
+        console.log('Cargando productos desde Django...');
+
+        // Hacer una petición AJAX para obtener los productos reales
+        const response = await fetch('/obtener-productos-salida/');
+        const data = await response.json();
+
+        if (data.success) {
+            console.log(`✅ ${data.productos.length} productos cargados desde Django`);
+
+            productos = data.productos.map(producto => ({
+                id: producto.id,
+                nombre: producto.nombre,
+                codigo: producto.codigo,
+                categoria: producto.categoria,
+                cantidad: parseFloat(producto.cantidad),
+                precio_compra: parseFloat(producto.precio_compra),
+                subtotal: parseFloat(producto.subtotal),
+                descripcion: `Código: ${producto.codigo} | Precio: ${formatearMoneda(producto.precio_compra)}`,
+                stockMinimo: getStockMinimoByCategory(producto.categoria),
+                fechaCreacion: producto.fecha_creacion,
+                ultimaSalida: producto.ultima_salida || null
+            }));
+
+            filteredProductos = [...productos];
+            renderProductos();
+            actualizarEstadisticas();
+            cargarFiltroProductos();
+
+            mostrarNotificacion(`${productos.length} productos cargados correctamente`, 'success');
+        } else {
+            console.error('Error al cargar productos:', data.error);
+            mostrarNotificacion('Error al cargar productos desde la base de datos', 'error');
+        }
+
+    } catch (error) {
+        console.error('Error en la petición:', error);
+        mostrarNotificacion('Error de conexión al cargar productos', 'error');
+    }
+}
+
+// Cargar historial desde localStorage
+function cargarHistorialDesdeStorage() {
+    try {
+        const historialGuardado = localStorage.getItem('historialSalidasProductos');
+        if (historialGuardado) {
+            salidas = JSON.parse(historialGuardado);
+            console.log(`✅ ${salidas.length} registros de salida cargados`);
+        } else {
+            salidas = [];
+            console.log('ℹ️ No hay historial de salidas guardado');
+        }
+    } catch (error) {
+        console.error('❌ Error cargando historial:', error);
+        salidas = [];
+    }
+}
+
+// Guardar historial en localStorage
+function guardarHistorialEnStorage() {
+    try {
+        localStorage.setItem('historialSalidasProductos', JSON.stringify(salidas));
+        console.log(`💾 Historial guardado: ${salidas.length} registros`);
+    } catch (error) {
+        console.error('❌ Error guardando historial:', error);
+    }
+}
+
+// Función para obtener stock mínimo por categoría
+function getStockMinimoByCategory(categoria) {
+    const stockMinimo = {
+        'carne': 10,
+        'verdura': 15,
+        'lacteo': 12,
+        'postre': 8,
+        'otro': 5,
+        'bebida': 10  // Aunque excluimos bebidas, por si acaso
+    };
+    return stockMinimo[categoria] || 10;
+}
+
+// Configurar event listeners
+function setupEventListeners() {
+    const searchInput = document.getElementById('searchInput');
+    const categoriaFilter = document.getElementById('categoriaFilter');
+    const stockFilter = document.getElementById('stockFilter');
+    const sortFilter = document.getElementById('sortFilter');
+
+    if (searchInput) {
+        searchInput.addEventListener('input', filtrarYRenderizar);
+    }
+
+    if (categoriaFilter) {
+        categoriaFilter.addEventListener('change', filtrarYRenderizar);
+    }
+
+    if (stockFilter) {
+        stockFilter.addEventListener('change', filtrarYRenderizar);
+    }
+
+    if (sortFilter) {
+        sortFilter.addEventListener('change', filtrarYRenderizar);
+    }
+
+    // Listeners para el historial
+    const historialProductoFilter = document.getElementById('historialProductoFilter');
+    const historialMotivoFilter = document.getElementById('historialMotivoFilter');
+    const historialFechaFilter = document.getElementById('historialFechaFilter');
+
+    if (historialProductoFilter) {
+        historialProductoFilter.addEventListener('change', filtrarHistorial);
+    }
+
+    if (historialMotivoFilter) {
+        historialMotivoFilter.addEventListener('change', filtrarHistorial);
+    }
+
+    if (historialFechaFilter) {
+        historialFechaFilter.addEventListener('change', function() {
+            const valor = this.value;
+            const fechasPersonalizadas = document.getElementById('fechasPersonalizadas');
+
+            if (valor === 'personalizado') {
+                fechasPersonalizadas.style.display = 'flex';
+            } else {
+                fechasPersonalizadas.style.display = 'none';
+            }
+
+            filtrarHistorial();
+        });
+    }
+
+    // Event listeners para formatear inputs con comas
+    const cantidadSalida = document.getElementById('cantidadSalida');
+    const cantidadReabastecer = document.getElementById('cantidadReabastecer');
+
+    if (cantidadSalida) {
+        cantidadSalida.addEventListener('input', function(e) {
+            let valor = e.target.value.replace(/[^0-9.]/g, '');
+            let partes = valor.split('.');
+            if (partes.length > 2) valor = partes[0] + '.' + partes.slice(1).join('');
+            if (valor) {
+                let [entero, decimal] = valor.split('.');
+                entero = entero.replace(/\B(?=(\d{3})+(?!\d))/g, ',');
+                e.target.value = decimal !== undefined ? entero + '.' + decimal : entero;
+            }
+        });
+    }
+
+    if (cantidadReabastecer) {
+        cantidadReabastecer.addEventListener('input', function(e) {
+            let valor = e.target.value.replace(/[^0-9.]/g, '');
+            let partes = valor.split('.');
+            if (partes.length > 2) valor = partes[0] + '.' + partes.slice(1).join('');
+            if (valor) {
+                let [entero, decimal] = valor.split('.');
+                entero = entero.replace(/\B(?=(\d{3})+(?!\d))/g, ',');
+                e.target.value = decimal !== undefined ? entero + '.' + decimal : entero;
+            }
+        });
+    }
+
+    // Listeners para fechas personalizadas
+    const fechaDesde = document.getElementById('fechaDesde');
+    const fechaHasta = document.getElementById('fechaHasta');
+
+    if (fechaDesde) {
+        fechaDesde.addEventListener('change', filtrarHistorial);
+    }
+
+    if (fechaHasta) {
+        fechaHasta.addEventListener('change', filtrarHistorial);
+    }
+}
+
+// Filtrar y renderizar productos
+function filtrarYRenderizar() {
+    filtrarProductos();
+    renderProductos();
+}
+
+// Filtrar productos
+function filtrarProductos() {
+    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    const selectedCategoria = document.getElementById('categoriaFilter').value;
+    const selectedStock = document.getElementById('stockFilter').value;
+    const selectedSort = document.getElementById('sortFilter').value;
+
+    // Si no hay productos, retornar array vacío
+    if (!productos || productos.length === 0) {
+        filteredProductos = [];
+        return;
+    }
+
+    filteredProductos = productos.filter(producto => {
+        // Validar que el producto existe
+        if (!producto) return false;
+
+        // Excluir bebidas
+        if (producto.categoria === 'bebida') return false;
+
+        // 1. Filtrar por búsqueda
+        let matchesSearch = true;
+        if (searchTerm) {
+            matchesSearch = (
+                producto.nombre.toLowerCase().includes(searchTerm) ||
+                producto.codigo.toLowerCase().includes(searchTerm) ||
+                producto.categoria.toLowerCase().includes(searchTerm)
+            );
+        }
+
+        // 2. Filtrar por categoría
+        let matchesCategoria = true;
+        if (selectedCategoria) {
+            matchesCategoria = producto.categoria === selectedCategoria;
+        }
+
+        // 3. Filtrar por estado de stock
+        let matchesStock = true;
+        if (selectedStock) {
+            if (selectedStock === 'disponible') {
+                matchesStock = producto.cantidad > producto.stockMinimo;
+            } else if (selectedStock === 'bajo') {
+                matchesStock = producto.cantidad <= producto.stockMinimo && producto.cantidad > 0;
+            } else if (selectedStock === 'agotado') {
+                matchesStock = producto.cantidad === 0;
+            }
+        }
+
+        return matchesSearch && matchesCategoria && matchesStock;
+    });
+
+    // Ordenar según la opción seleccionada
+    switch(selectedSort) {
+        case 'nombre':
+            filteredProductos.sort((a, b) => a.nombre.localeCompare(b.nombre));
+            break;
+        case 'cantidad':
+            filteredProductos.sort((a, b) => b.cantidad - a.cantidad);
+            break;
+        case 'salidas':
+            // Ordenar por última salida (más reciente primero)
+            filteredProductos.sort((a, b) => {
+                const fechaA = a.ultimaSalida ? new Date(a.ultimaSalida) : new Date(0);
+                const fechaB = b.ultimaSalida ? new Date(b.ultimaSalida) : new Date(0);
+                return fechaB - fechaA;
+            });
+            break;
+    }
+
+    currentPage = 1; // Resetear a la primera página
+}
+
+// Renderizar productos
+function renderProductos() {
+    const productosBody = document.getElementById('productosBody');
+    const pagination = document.getElementById('pagination');
+
+    if (!productosBody) {
+        console.error('ERROR: No se encontró el elemento productosBody');
+        return;
+    }
+
+    // Calcular paginación
+    const totalPages = Math.ceil(filteredProductos.length / itemsPerPage);
+    const startIndex = (currentPage - 1) * itemsPerPage;
+    const endIndex = startIndex + itemsPerPage;
+    const currentItems = filteredProductos.slice(startIndex, endIndex);
+
+    // Mostrar/Ocultar paginación
+    if (filteredProductos.length > itemsPerPage) {
+        pagination.style.display = 'flex';
+        document.getElementById('pageInfo').textContent = `Página ${currentPage} de ${totalPages}`;
+    } else {
+        pagination.style.display = 'none';
+    }
+
+    // Mostrar estado vacío si no hay productos
+    if (currentItems.length === 0) {
+        productosBody.innerHTML = `
+            <tr class="empty-state">
+                <td colspan="7">
+                    <svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2" />
+                    </svg>
+                    <h3>No se encontraron productos</h3>
+                    <p>${productos.length === 0 ? 'No hay productos en la base de datos.' : 'Intenta con otros filtros de búsqueda'}</p>
+                </td>
+            </tr>
+        `;
+        return;
+    }
+
+    // Renderizar productos
+    let htmlContent = '';
+
+    for (let i = 0; i < currentItems.length; i++) {
+        const producto = currentItems[i];
+
+        // Determinar estado del stock
+        let estado = 'disponible';
+        let estadoClass = 'status-disponible';
+        let estadoTexto = 'Disponible';
+
+        if (producto.cantidad === 0) {
+            estado = 'agotado';
+            estadoClass = 'status-agotado';
+            estadoTexto = 'Agotado';
+        } else if (producto.cantidad <= producto.stockMinimo) {
+            estado = 'bajo';
+            estadoClass = 'status-bajo';
+            estadoTexto = 'Stock Bajo';
+        }
+
+        // Formatear última salida
+        let ultimaSalidaFormateada = 'No registrada';
+        if (producto.ultimaSalida) {
+            try {
+                const fecha = new Date(producto.ultimaSalida);
+                ultimaSalidaFormateada = fecha.toLocaleDateString('es-ES', {
+                    day: '2-digit',
+                    month: '2-digit',
+                    year: 'numeric',
+                    hour: '2-digit',
+                    minute: '2-digit'
+                });
+            } catch (e) {
+                console.error('Error procesando fecha:', e);
+            }
+        }
+
+        // Obtener unidad de medida
+        const unidad = getUnidadMedida(producto.categoria);
+
+        // Construir fila HTML
+        htmlContent += `
+            <tr>
+                <td>
+                    <div class="producto-info">
+                        <span class="producto-name">${producto.nombre}</span>
+                        <span class="producto-desc">${producto.descripcion}</span>
+                    </div>
+                </td>
+                <td>
+                    <span class="categoria-badge categoria-${producto.categoria}">
+                        <span>${getCategoriaIcon(producto.categoria)}</span>
+                        ${getCategoriaLabel(producto.categoria)}
+                    </span>
+                </td>
+                <td>
+                    <div class="cantidad-disponible">${formatearNumero(producto.cantidad)} ${unidad}</div>
+                </td>
+                <td>
+                    <div>${formatearNumero(producto.stockMinimo)} ${unidad}</div>
+                </td>
+                <td>
+                    <span class="status-badge ${estadoClass}">
+                        ${estadoTexto}
+                    </span>
+                </td>
+                <td>
+                    <div class="date-badge">
+                        <span><i class="fas fa-calendar-alt"></i></span>
+                        <span>${ultimaSalidaFormateada}</span>
+                    </div>
+                </td>
+                <td>
+                    <div class="action-buttons">
+                        <button class="btn-icon btn-salida" onclick="registrarSalidaModal('${producto.id}')" title="Registrar salida">
+                            <i class="fas fa-minus-circle"></i>
+                        </button>
+                        <button class="btn-icon btn-reabastecer" onclick="reabastecerModal('${producto.id}')" title="Reabastecer stock">
+                            <i class="fas fa-plus-circle"></i>
+                        </button>
+                    </div>
+                </td>
+            </tr>
+        `;
+    }
+
+    // Insertar HTML en la tabla
+    productosBody.innerHTML = htmlContent;
+}
+
+// Actualizar estadísticas
+function actualizarEstadisticas() {
+    // Total de productos (excluyendo bebidas)
+    const totalProductosElement = document.getElementById('totalProductos');
+    if (totalProductosElement) {
+        const productosSinBebidas = productos.filter(p => p.categoria !== 'bebida');
+        totalProductosElement.textContent = productosSinBebidas.length;
+    }
+
+    // Cantidad total disponible (excluyendo bebidas)
+    const cantidadTotalElement = document.getElementById('cantidadTotal');
+    if (cantidadTotalElement) {
+        const cantidadTotal = productos
+            .filter(p => p.categoria !== 'bebida')
+            .reduce((sum, producto) => sum + producto.cantidad, 0);
+        cantidadTotalElement.textContent = formatearNumero(cantidadTotal);
+    }
+
+    // Productos con stock bajo (excluyendo bebidas)
+    const productosBajosElement = document.getElementById('productosBajos');
+    if (productosBajosElement) {
+        const productosBajos = productos.filter(producto =>
+            producto.categoria !== 'bebida' &&
+            producto.cantidad <= producto.stockMinimo &&
+            producto.cantidad > 0
+        ).length;
+        productosBajosElement.textContent = productosBajos;
+    }
+
+    // Salidas hoy
+    const salidasHoyElement = document.getElementById('salidasHoy');
+    if (salidasHoyElement) {
+        const hoy = new Date();
+        hoy.setHours(0, 0, 0, 0);
+
+        const salidasHoy = salidas.filter(salida => {
+            try {
+                const fechaSalida = new Date(salida.fecha);
+                fechaSalida.setHours(0, 0, 0, 0);
+                return fechaSalida.getTime() === hoy.getTime();
+            } catch (e) {
+                return false;
+            }
+        }).length;
+
+        salidasHoyElement.textContent = salidasHoy;
+    }
+
+    // Actualizar estadísticas de reportes
+    actualizarEstadisticasReportes();
+}
+
+// Actualizar estadísticas de reportes
+function actualizarEstadisticasReportes() {
+    // Total salidas este mes
+    const totalSalidasMesElement = document.getElementById('totalSalidasMes');
+    if (totalSalidasMesElement) {
+        const hoy = new Date();
+        const primerDiaMes = new Date(hoy.getFullYear(), hoy.getMonth(), 1);
+
+        const salidasMes = salidas.filter(salida => {
+            try {
+                const fechaSalida = new Date(salida.fecha);
+                return fechaSalida >= primerDiaMes;
+            } catch (e) {
+                return false;
+            }
+        }).length;
+
+        totalSalidasMesElement.textContent = salidasMes;
+    }
+
+    // Valor de pérdidas
+    const valorPerdidasElement = document.getElementById('valorPerdidas');
+    if (valorPerdidasElement) {
+        let valorPerdidas = 0;
+
+        // Sumar el costo de las salidas por daño
+        salidas.forEach(salida => {
+            if (salida.motivo === 'dano') {
+                const producto = productos.find(p => p.id == salida.productoId);
+                if (producto) {
+                    valorPerdidas += salida.cantidad * producto.precio_compra;
+                }
+            }
+        });
+
+        valorPerdidasElement.textContent = formatearMoneda(valorPerdidas);
+    }
+
+    // Producto más salido
+    const productoMasVendidoElement = document.getElementById('productoMasVendido');
+    if (productoMasVendidoElement) {
+        // Contar salidas por producto
+        const salidasPorProducto = {};
+
+        salidas.forEach(salida => {
+            if (!salidasPorProducto[salida.productoId]) {
+                salidasPorProducto[salida.productoId] = 0;
+            }
+            salidasPorProducto[salida.productoId] += salida.cantidad;
+        });
+
+        // Encontrar el producto con más salidas
+        let productoMasVendidoId = null;
+        let maxSalidas = 0;
+
+        for (const productoId in salidasPorProducto) {
+            if (salidasPorProducto[productoId] > maxSalidas) {
+                maxSalidas = salidasPorProducto[productoId];
+                productoMasVendidoId = productoId;
+            }
+        }
+
+        if (productoMasVendidoId) {
+            const producto = productos.find(p => p.id == productoMasVendidoId);
+            productoMasVendidoElement.textContent = producto ? producto.nombre.substring(0, 10) + (producto.nombre.length > 10 ? '...' : '') : '-';
+        } else {
+            productoMasVendidoElement.textContent = '-';
+        }
+    }
+
+    // Promedio diario de salidas
+    const promedioDiarioElement = document.getElementById('promedioDiario');
+    if (promedioDiarioElement) {
+        // Calcular días desde la primera salida hasta hoy
+        if (salidas.length > 0) {
+            const fechasSalidas = salidas.map(s => new Date(s.fecha));
+            const fechaMinima = new Date(Math.min(...fechasSalidas));
+            const hoy = new Date();
+
+            const diferenciaTiempo = hoy - fechaMinima;
+            const diferenciaDias = Math.ceil(diferenciaTiempo / (1000 * 60 * 60 * 24));
+
+            const promedio = diferenciaDias > 0 ? (salidas.length / diferenciaDias).toFixed(1) : salidas.length;
+            promedioDiarioElement.textContent = promedio;
+        } else {
+            promedioDiarioElement.textContent = '0';
+        }
+    }
+}
+
+// Cambiar página
+function changePage(direction) {
+    const totalPages = Math.ceil(filteredProductos.length / itemsPerPage);
+    const newPage = currentPage + direction;
+
+    if (newPage >= 1 && newPage <= totalPages) {
+        currentPage = newPage;
+        renderProductos();
+    }
+}
+
+// Cambiar de pestaña
+function switchTab(tabName) {
+    // Actualizar tabs activos
+    const tabs = document.querySelectorAll('.tab');
+    tabs.forEach(tab => {
+        tab.classList.remove('active');
+    });
+
+    // Activar tab seleccionado
+    event.target.classList.add('active');
+
+    // Ocultar todos los contenidos
+    document.getElementById('inventarioTab').style.display = 'none';
+    document.getElementById('historialTab').style.display = 'none';
+    document.getElementById('reportesTab').style.display = 'none';
+
+    // Mostrar contenido seleccionado
+    document.getElementById(tabName + 'Tab').style.display = 'block';
+
+    // Actualizar variable de tab actual
+    currentTab = tabName;
+
+    // Si es la pestaña de historial, cargar historial
+    if (tabName === 'historial') {
+        filtrarHistorial();
+        cargarFiltroProductos();
+    }
+
+    // Si es la pestaña de reportes, actualizar gráficos
+    if (tabName === 'reportes') {
+        generarGraficoReportes();
+        actualizarEstadisticasReportes();
+    }
+}
+
+// Cargar productos en el filtro del historial
+function cargarFiltroProductos() {
+    const historialProductoFilter = document.getElementById('historialProductoFilter');
+    if (!historialProductoFilter) return;
+
+    // Limpiar opciones actuales excepto la primera
+    while (historialProductoFilter.options.length > 1) {
+        historialProductoFilter.remove(1);
+    }
+
+    // Agregar productos (excluyendo bebidas)
+    productos.forEach(producto => {
+        if (producto.categoria !== 'bebida') {
+            const option = document.createElement('option');
+            option.value = producto.id;
+            option.textContent = producto.nombre;
+            historialProductoFilter.appendChild(option);
+        }
+    });
+}
+
+// Filtrar y mostrar historial
+function filtrarHistorial() {
+    const historialBody = document.getElementById('historialBody');
+    if (!historialBody) return;
+
+    const productoId = document.getElementById('historialProductoFilter').value;
+    const motivo = document.getElementById('historialMotivoFilter').value;
+    const periodo = document.getElementById('historialFechaFilter').value;
+
+    let historialFiltrado = [...salidas];
+
+    // Filtrar por producto
+    if (productoId) {
+        historialFiltrado = historialFiltrado.filter(salida => salida.productoId == productoId);
+    }
+
+    // Filtrar por motivo
+    if (motivo) {
+        historialFiltrado = historialFiltrado.filter(salida => salida.motivo === motivo);
+    }
+
+    // Filtrar por fecha
+    if (periodo) {
+        const hoy = new Date();
+        hoy.setHours(0, 0, 0, 0);
+
+        switch(periodo) {
+            case 'hoy':
+                historialFiltrado = historialFiltrado.filter(salida => {
+                    try {
+                        const fechaSalida = new Date(salida.fecha);
+                        fechaSalida.setHours(0, 0, 0, 0);
+                        return fechaSalida.getTime() === hoy.getTime();
+                    } catch (e) {
+                        return false;
+                    }
+                });
+                break;
+            case 'ayer':
+                const ayer = new Date(hoy);
+                ayer.setDate(ayer.getDate() - 1);
+
+                historialFiltrado = historialFiltrado.filter(salida => {
+                    try {
+                        const fechaSalida = new Date(salida.fecha);
+                        fechaSalida.setHours(0, 0, 0, 0);
+                        return fechaSalida.getTime() === ayer.getTime();
+                    } catch (e) {
+                        return false;
+                    }
+                });
+                break;
+            case 'semana':
+                const semanaPasada = new Date(hoy);
+                semanaPasada.setDate(semanaPasada.getDate() - 7);
+
+                historialFiltrado = historialFiltrado.filter(salida => {
+                    try {
+                        const fechaSalida = new Date(salida.fecha);
+                        return fechaSalida >= semanaPasada;
+                    } catch (e) {
+                        return false;
+                    }
+                });
+                break;
+            case 'mes':
+                const mesPasado = new Date(hoy);
+                mesPasado.setMonth(mesPasado.getMonth() - 1);
+
+                historialFiltrado = historialFiltrado.filter(salida => {
+                    try {
+                        const fechaSalida = new Date(salida.fecha);
+                        return fechaSalida >= mesPasado;
+                    } catch (e) {
+                        return false;
+                    }
+                });
+                break;
+            case 'personalizado':
+                const fechaDesde = document.getElementById('fechaDesde').value;
+                const fechaHasta = document.getElementById('fechaHasta').value;
+
+                if (fechaDesde && fechaHasta) {
+                    const desde = new Date(fechaDesde);
+                    const hasta = new Date(fechaHasta);
+                    hasta.setHours(23, 59, 59, 999); // Incluir todo el día
+
+                    historialFiltrado = historialFiltrado.filter(salida => {
+                        try {
+                            const fechaSalida = new Date(salida.fecha);
+                            return fechaSalida >= desde && fechaSalida <= hasta;
+                        } catch (e) {
+                            return false;
+                        }
+                    });
+                }
+                break;
+        }
+    }
+
+    // Ordenar por fecha más reciente primero
+    historialFiltrado.sort((a, b) => {
+        try {
+            const fechaA = new Date(a.fecha);
+            const fechaB = new Date(b.fecha);
+            return fechaB - fechaA;
+        } catch (e) {
+            return 0;
+        }
+    });
+
+    // Mostrar estado vacío si no hay historial
+    if (historialFiltrado.length === 0) {
+        historialBody.innerHTML = `
+            <tr class="empty-state">
+                <td colspan="7">
+                    <svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2" />
+                    </svg>
+                    <h3>No hay registro de salidas</h3>
+                    <p>${salidas.length === 0 ? 'Registra la primera salida de productos' : 'Intenta con otros filtros de búsqueda'}</p>
+                </td>
+            </tr>
+        `;
+        return;
+    }
+
+    // Renderizar historial
+    let htmlContent = '';
+
+    for (let i = 0; i < historialFiltrado.length; i++) {
+        const salida = historialFiltrado[i];
+
+        // Formatear fecha
+        let fechaFormateada = '';
+        try {
+            const fecha = new Date(salida.fecha);
+            fechaFormateada = fecha.toLocaleDateString('es-ES', {
+                day: '2-digit',
+                month: '2-digit',
+                year: 'numeric',
+                hour: '2-digit',
+                minute: '2-digit'
+            });
+        } catch (e) {
+            fechaFormateada = 'Fecha no válida';
+        }
+
+        // Obtener nombre del producto
+        const producto = productos.find(p => p.id == salida.productoId);
+        const nombreProducto = producto ? producto.nombre : 'Producto no encontrado';
+
+        htmlContent += `
+            <tr>
+                <td>${fechaFormateada}</td>
+                <td><strong>${nombreProducto}</strong></td>
+                <td>${salida.cantidad} ${getUnidadMedida(producto ? producto.categoria : 'otro')}</td>
+                <td>
+                    <span class="motivo-badge motivo-${salida.motivo}">
+                        ${getMotivoLabel(salida.motivo)}
+                    </span>
+                </td>
+                <td>${salida.responsable}</td>
+                <td>${salida.observaciones || '-'}</td>
+                <td>
+                    <div class="action-buttons">
+                        <button class="btn-icon btn-eliminar" onclick="eliminarSalida('${salida.id}')" title="Eliminar registro">
+                            <i class="fas fa-trash"></i>
+                        </button>
+                    </div>
+                </td>
+            </tr>
+        `;
+    }
+
+    historialBody.innerHTML = htmlContent;
+}
+
+// Generar gráfico para reportes
+function generarGraficoReportes() {
+    const graficoBarras = document.getElementById('graficoBarras');
+    if (!graficoBarras) return;
+
+    // Agrupar salidas por producto
+    const salidasPorProducto = {};
+
+    salidas.forEach(salida => {
+        if (!salidasPorProducto[salida.productoId]) {
+            salidasPorProducto[salida.productoId] = 0;
+        }
+        salidasPorProducto[salida.productoId] += salida.cantidad;
+    });
+
+    // Obtener nombres de productos
+    const productosConSalidas = [];
+    for (const productoId in salidasPorProducto) {
+        const producto = productos.find(p => p.id == productoId);
+        if (producto) {
+            productosConSalidas.push({
+                nombre: producto.nombre,
+                cantidad: salidasPorProducto[productoId]
+            });
+        }
+    }
+
+    // Ordenar por cantidad de salidas
+    productosConSalidas.sort((a, b) => b.cantidad - a.cantidad).slice(0, 5);
+
+    // Limpiar gráfico anterior
+    graficoBarras.innerHTML = '';
+
+    // Calcular máxima altura para normalizar
+    const maxCantidad = productosConSalidas.length > 0 ?
+        Math.max(...productosConSalidas.map(p => p.cantidad)) : 0;
+
+    // Generar barras del gráfico
+    productosConSalidas.forEach(producto => {
+        const altura = maxCantidad > 0 ? (producto.cantidad / maxCantidad * 250) : 0;
+
+        const barra = document.createElement('div');
+        barra.style.cssText = `
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            width: 60px;
+        `;
+
+        barra.innerHTML = `
+            <div style="
+                height: ${altura}px;
+                width: 40px;
+                background: linear-gradient(to top, #ff7e5f, #feb47b);
+                border-radius: 8px 8px 0 0;
+                margin-bottom: 10px;
+                display: flex;
+                align-items: flex-end;
+                justify-content: center;
+                color: white;
+                font-weight: bold;
+                padding: 5px;
+                font-size: 12px;
+            ">${producto.cantidad.toFixed(1)}</div>
+            <div style="
+                font-size: 11px;
+                color: #4a5568;
+                text-align: center;
+                height: 40px;
+                overflow: hidden;
+                font-weight: 600;
+            ">${producto.nombre.substring(0, 10)}${producto.nombre.length > 10 ? '...' : ''}</div>
+        `;
+
+        graficoBarras.appendChild(barra);
+    });
+
+    // Actualizar resumen de actividad
+    actualizarResumenActividad();
+}
+
+// Actualizar resumen de actividad
+function actualizarResumenActividad() {
+    const resumenActividad = document.getElementById('resumenActividad');
+    if (!resumenActividad) return;
+
+    const hoy = new Date();
+    const ayer = new Date(hoy);
+    ayer.setDate(ayer.getDate() - 1);
+
+    // Calcular estadísticas
+    const salidasHoy = salidas.filter(salida => {
+        try {
+            const fechaSalida = new Date(salida.fecha);
+            fechaSalida.setHours(0, 0, 0, 0);
+            const hoySinHora = new Date(hoy);
+            hoySinHora.setHours(0, 0, 0, 0);
+            return fechaSalida.getTime() === hoySinHora.getTime();
+        } catch (e) {
+            return false;
+        }
+    }).length;
+
+    const salidasAyer = salidas.filter(salida => {
+        try {
+            const fechaSalida = new Date(salida.fecha);
+            fechaSalida.setHours(0, 0, 0, 0);
+            const ayerSinHora = new Date(ayer);
+            ayerSinHora.setHours(0, 0, 0, 0);
+            return fechaSalida.getTime() === ayerSinHora.getTime();
+        } catch (e) {
+            return false;
+        }
+    }).length;
+
+    const productosBajos = productos.filter(p =>
+        p.categoria !== 'bebida' &&
+        p.cantidad <= p.stockMinimo &&
+        p.cantidad > 0
+    ).length;
+
+    const productosAgotados = productos.filter(p =>
+        p.categoria !== 'bebida' &&
+        p.cantidad === 0
+    ).length;
+
+    // Calcular diferencia porcentual con ayer
+    const diferencia = salidasAyer > 0 ?
+        Math.round(((salidasHoy - salidasAyer) / salidasAyer) * 100) :
+        (salidasHoy > 0 ? 100 : 0);
+
+    const tendencia = diferencia >= 0 ? '<i class="fas fa-arrow-up"></i>' : '<i class="fas fa-arrow-down"></i>';
+    const claseTendencia = diferencia >= 0 ? 'color: #38a169;' : 'color: #e53e3e;';
+
+    resumenActividad.innerHTML = `
+        <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 1rem;">
+            <div>
+                <div style="font-weight: 600; color: #4a5568; margin-bottom: 0.5rem;">Salidas Hoy</div>
+                <div style="font-size: 1.5rem; font-weight: 700; color: #ff7e5f;">${salidasHoy}</div>
+                <div style="font-size: 0.85rem; margin-top: 0.25rem;">
+                    ${tendencia} <span style="${claseTendencia}">${Math.abs(diferencia)}%</span> vs ayer
+                </div>
+            </div>
+            <div>
+                <div style="font-weight: 600; color: #4a5568; margin-bottom: 0.5rem;">Productos con Stock Bajo</div>
+                <div style="font-size: 1.5rem; font-weight: 700; color: #d69e2e;">${productosBajos}</div>
+                <div style="font-size: 0.85rem; margin-top: 0.25rem; color: #718096;">
+                    Requieren atención
+                </div>
+            </div>
+            <div>
+                <div style="font-weight: 600; color: #4a5568; margin-bottom: 0.5rem;">Productos Agotados</div>
+                <div style="font-size: 1.5rem; font-weight: 700; color: #e53e3e;">${productosAgotados}</div>
+                <div style="font-size: 0.85rem; margin-top: 0.25rem; color: #718096;">
+                    Necesitan reabastecimiento urgente
+                </div>
+            </div>
+            <div>
+                <div style="font-weight: 600; color: #4a5568; margin-bottom: 0.5rem;">Salidas Totales</div>
+                <div style="font-size: 1.5rem; font-weight: 700; color: #9c27b0;">${salidas.length}</div>
+                <div style="font-size: 0.85rem; margin-top: 0.25rem; color: #718096;">
+                    Registros en el sistema
+                </div>
+            </div>
+        </div>
+    `;
+}
+
+// Abrir modal para registrar salida
+async function registrarSalidaModal(productoId) {
+    // Primero actualizamos los datos desde la base de datos
+    await cargarProductosDesdeDjango();
+
+    const producto = productos.find(p => p.id == productoId);
+    if (!producto) {
+        mostrarNotificacion('Producto no encontrado', 'error');
+        return;
+    }
+
+    // Verificar que no sea bebida
+    if (producto.categoria === 'bebida') {
+        mostrarNotificacion('No se puede registrar salida de bebidas', 'error');
+        return;
+    }
+
+    // Llenar datos en el modal
+    document.getElementById('productoId').value = productoId;
+    document.getElementById('productoNombre').value = producto.nombre;
+    document.getElementById('stockActual').value = `${formatearNumero(producto.cantidad)} ${getUnidadMedida(producto.categoria)}`;
+
+    // Establecer valor máximo en el input
+    const cantidadInput = document.getElementById('cantidadSalida');
+    cantidadInput.max = producto.cantidad;
+    cantidadInput.value = producto.cantidad > 0 ? formatearNumero(1.00) : '0';
+
+    // Mostrar modal
+    document.getElementById('salidaModal').classList.add('active');
+}
+
+// Registrar salida - LLAMADA AJAX AL SERVIDOR
+async function registrarSalida() {
+    const productoId = document.getElementById('productoId').value;
+    const cantidadInput = document.getElementById('cantidadSalida').value.replace(/,/g, '');
+    const cantidad = parseFloat(cantidadInput);
+    const motivo = document.getElementById('motivoSalida').value;
+    const responsable = document.getElementById('responsableSalida').value;
+    const observaciones = document.getElementById('observacionesSalida').value;
+
+    if (!productoId || !cantidad || cantidad <= 0) {
+        mostrarNotificacion('Ingresa una cantidad válida', 'error');
+        return;
+    }
+
+    // Deshabilitar botón mientras se procesa
+    const btn = document.getElementById('registrarSalidaBtn');
+    const originalText = btn.innerHTML;
+    btn.innerHTML = '<span><i class="fas fa-spinner fa-spin"></i></span><span>Procesando...</span>';
+    btn.disabled = true;
+
+    try {
+        // Enviar solicitud al servidor para registrar la salida
+        const response = await fetch('/registrar-salida/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            body: JSON.stringify({
+                producto_id: productoId,
+                cantidad: cantidad,
+                motivo: motivo,
+                responsable: responsable,
+                observaciones: observaciones
+            })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            // Actualizar producto localmente
+            const productoIndex = productos.findIndex(p => p.id == productoId);
+            if (productoIndex !== -1) {
+                productos[productoIndex].cantidad = data.nueva_cantidad;
+                productos[productoIndex].ultimaSalida = new Date().toISOString();
+            }
+
+            // Crear registro de salida para el historial
+            const producto = productos.find(p => p.id == productoId);
+            const nuevaSalida = {
+                id: salidas.length > 0 ? Math.max(...salidas.map(s => s.id)) + 1 : 1,
+                productoId: productoId,
+                cantidad: cantidad,
+                motivo: motivo,
+                responsable: responsable,
+                observaciones: observaciones,
+                fecha: new Date().toISOString()
+            };
+
+            salidas.push(nuevaSalida);
+            guardarHistorialEnStorage();
+
+            // Actualizar filteredProductos
+            const filteredIndex = filteredProductos.findIndex(p => p.id == productoId);
+            if (filteredIndex !== -1) {
+                filteredProductos[filteredIndex].cantidad = data.nueva_cantidad;
+                filteredProductos[filteredIndex].ultimaSalida = new Date().toISOString();
+            }
+
+            // Actualizar interfaz
+            renderProductos();
+            actualizarEstadisticas();
+
+            // Cerrar modal
+            closeModal();
+            mostrarNotificacion(data.message, 'success');
+
+            // Si estamos en la pestaña de historial, actualizar
+            if (currentTab === 'historial') {
+                filtrarHistorial();
+            }
+
+            // Si estamos en la pestaña de reportes, actualizar gráficos
+            if (currentTab === 'reportes') {
+                generarGraficoReportes();
+                actualizarEstadisticasReportes();
+            }
+        } else {
+            mostrarNotificacion(data.error || 'Error al registrar salida', 'error');
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        mostrarNotificacion('Error de conexión', 'error');
+    } finally {
+        // Restaurar botón
+        btn.innerHTML = originalText;
+        btn.disabled = false;
+    }
+}
+
+// Abrir modal para reabastecer stock
+async function reabastecerModal(productoId) {
+    // Primero actualizamos los datos desde la base de datos
+    await cargarProductosDesdeDjango();
+
+    const producto = productos.find(p => p.id == productoId);
+    if (!producto) {
+        mostrarNotificacion('Producto no encontrado', 'error');
+        return;
+    }
+
+    // Llenar datos en el modal
+    document.getElementById('reabastecerProductoId').value = productoId;
+    document.getElementById('reabastecerNombre').value = producto.nombre;
+    document.getElementById('reabastecerStockActual').value = `${formatearNumero(producto.cantidad)} ${getUnidadMedida(producto.categoria)}`;
+
+    // Mostrar modal
+    document.getElementById('reabastecerModal').classList.add('active');
+}
+
+// Confirmar reabastecimiento - LLAMADA AJAX AL SERVIDOR
+async function confirmarReabastecimiento() {
+    const productoId = document.getElementById('reabastecerProductoId').value;
+    const cantidadInput = document.getElementById('cantidadReabastecer').value.replace(/,/g, '');
+    const cantidad = parseFloat(cantidadInput);
+    const motivo = document.getElementById('motivoReabastecer').value;
+    const observaciones = document.getElementById('observacionesReabastecer').value;
+
+    if (!productoId || !cantidad || cantidad <= 0) {
+        mostrarNotificacion('Ingresa una cantidad válida', 'error');
+        return;
+    }
+
+    try {
+        // Enviar solicitud al servidor para reabastecer
+        const response = await fetch('/reabastecer-producto/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            body: JSON.stringify({
+                producto_id: productoId,
+                cantidad: cantidad,
+                motivo: motivo,
+                observaciones: observaciones
+            })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            // Actualizar producto localmente
+            const productoIndex = productos.findIndex(p => p.id == productoId);
+            if (productoIndex !== -1) {
+                productos[productoIndex].cantidad = data.nueva_cantidad;
+            }
+
+            // Crear registro de reabastecimiento para el historial
+            const producto = productos.find(p => p.id == productoId);
+            const reabastecimiento = {
+                id: salidas.length > 0 ? Math.max(...salidas.map(s => s.id)) + 1 : 1,
+                productoId: productoId,
+                cantidad: cantidad,
+                motivo: 'reabastecimiento',
+                responsable: 'Administrador',
+                observaciones: `Reabastecimiento: ${motivo} - ${observaciones || 'Sin observaciones'}`,
+                fecha: new Date().toISOString()
+            };
+
+            salidas.push(reabastecimiento);
+            guardarHistorialEnStorage();
+
+            // Actualizar filteredProductos
+            const filteredIndex = filteredProductos.findIndex(p => p.id == productoId);
+            if (filteredIndex !== -1) {
+                filteredProductos[filteredIndex].cantidad = data.nueva_cantidad;
+            }
+
+            // Actualizar interfaz
+            renderProductos();
+            actualizarEstadisticas();
+
+            // Cerrar modal
+            closeReabastecerModal();
+            mostrarNotificacion(data.message, 'success');
+
+            // Si estamos en la pestaña de historial, actualizar
+            if (currentTab === 'historial') {
+                filtrarHistorial();
+            }
+
+            // Si estamos en la pestaña de reportes, actualizar gráficos
+            if (currentTab === 'reportes') {
+                generarGraficoReportes();
+                actualizarEstadisticasReportes();
+            }
+        } else {
+            mostrarNotificacion(data.error || 'Error al reabastecer', 'error');
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        mostrarNotificacion('Error de conexión', 'error');
+    }
+}
+
+// Eliminar registro de salida
+function eliminarSalida(salidaId) {
+    if (!confirm('¿Estás seguro de eliminar este registro de salida? Esta acción no se puede deshacer.')) {
+        return;
+    }
+
+    const index = salidas.findIndex(s => s.id == salidaId);
+    if (index === -1) {
+        mostrarNotificacion('Registro no encontrado', 'error');
+        return;
+    }
+
+    // Recuperar el stock (solo si fue una salida, no reabastecimiento)
+    const salida = salidas[index];
+    if (salida.motivo !== 'reabastecimiento') {
+        // En un sistema real, aquí deberías hacer una petición al servidor para revertir la salida
+        // Por ahora, solo eliminamos el registro del historial local
+        console.log('Nota: Para revertir el stock, se necesita una petición al servidor');
+    }
+
+    salidas.splice(index, 1);
+    guardarHistorialEnStorage();
+
+    // Actualizar interfaz
+    actualizarEstadisticas();
+
+    if (currentTab === 'historial') {
+        filtrarHistorial();
+    }
+
+    if (currentTab === 'reportes') {
+        generarGraficoReportes();
+        actualizarEstadisticasReportes();
+    }
+
+    mostrarNotificacion('<i class="fas fa-check-circle"></i> Registro de salida eliminado correctamente', 'success');
+}
+
+// Funciones de exportación
+function exportReport() {
+    mostrarNotificacion('Generando reporte de inventario...', 'info');
+    // En un sistema real, aquí se generaría y descargaría un archivo
+    setTimeout(() => {
+        mostrarNotificacion('<i class="fas fa-check-circle"></i> Reporte de inventario exportado correctamente', 'success');
+    }, 1000);
+}
+
+function exportHistorial() {
+    mostrarNotificacion('Generando historial de salidas...', 'info');
+    // En un sistema real, aquí se generaría y descargaría un archivo
+    setTimeout(() => {
+        mostrarNotificacion('<i class="fas fa-check-circle"></i> Historial de salidas exportado correctamente', 'success');
+    }, 1000);
+}
+
+function exportReporteCompleto() {
+    mostrarNotificacion('Generando reporte completo...', 'info');
+    // En un sistema real, aquí se generaría y descargaría un archivo
+    setTimeout(() => {
+        mostrarNotificacion('<i class="fas fa-check-circle"></i> Reporte completo exportado correctamente', 'success');
+    }, 1000);
+}
+
+function generarReporteMensual() {
+    mostrarNotificacion('Generando reporte mensual...', 'info');
+    // En un sistema real, aquí se generaría y descargaría un archivo
+    setTimeout(() => {
+        mostrarNotificacion('<i class="fas fa-check-circle"></i> Reporte mensual generado correctamente', 'success');
+    }, 1000);
+}
+
+// Helper functions
+function getCategoriaLabel(categoria) {
+    const labels = {
+        'carne': 'Carne',
+        'verdura': 'Verdura',
+        'lacteo': 'Lácteo',
+        'postre': 'Postre',
+        'bebida': 'Bebida',
+        'otro': 'Otro'
+    };
+    return labels[categoria] || categoria || 'Desconocida';
+}
+
+function getCategoriaIcon(categoria) {
+    const icons = {
+        'carne': '<i class="fas fa-drumstick-bite"></i>',
+        'verdura': '<i class="fas fa-leaf"></i>',
+        'lacteo': '<i class="fas fa-glass-whiskey"></i>',
+        'postre': '<i class="fas fa-birthday-cake"></i>',
+        'bebida': '<i class="fas fa-glass-martini"></i>',
+        'otro': '<i class="fas fa-box"></i>'
+    };
+    return icons[categoria] || '<i class="fas fa-box"></i>';
+}
+
+function getUnidadMedida(categoria) {
+    // Puedes personalizar las unidades de medida según la categoría
+    const unidades = {
+        'carne': 'kg',
+        'verdura': 'kg',
+        'lacteo': 'lt',
+        'postre': 'unid',
+        'bebida': 'lt',
+        'otro': 'unid'
+    };
+    return unidades[categoria] || 'unid';
+}
+
+function getMotivoLabel(motivo) {
+    const labels = {
+        'venta': 'Venta',
+        'dano': 'Daño',
+        'ajuste': 'Ajuste',
+        'consumo': 'Consumo Interno',
+        'reabastecimiento': 'Reabastecimiento',
+        'otro': 'Otro'
+    };
+    return labels[motivo] || motivo || 'Desconocido';
+}
+
+// Función para obtener el token CSRF
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// Cerrar modales
+function closeModal() {
+    document.getElementById('salidaModal').classList.remove('active');
+}
+
+function closeReabastecerModal() {
+    document.getElementById('reabastecerModal').classList.remove('active');
+}
+
+// Mostrar notificación
+function mostrarNotificacion(message, type = 'success') {
+    const notification = document.createElement('div');
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: ${type === 'error' ? 'linear-gradient(135deg, #ff416c 0%, #ff4b2b 100%)' :
+                     type === 'warning' ? 'linear-gradient(135deg, #ffb347 0%, #ffcc33 100%)' :
+                     type === 'info' ? 'linear-gradient(135deg, #2196F3 0%, #21CBF3 100%)' :
+                     'linear-gradient(135deg, #ff7e5f 0%, #feb47b 100%)'};
+        color: white;
+        padding: 1rem 1.5rem;
+        border-radius: 12px;
+        box-shadow: 0 10px 25px rgba(0, 0, 0, 0.2);
+        z-index: 1000;
+        animation: slideIn 0.3s ease-out;
+        font-weight: 600;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+    `;
+
+    notification.innerHTML = message;
+    document.body.appendChild(notification);
+
+    // Remover después de 5 segundos
+    setTimeout(() => {
+        notification.style.animation = 'slideOut 0.3s ease-out';
+        setTimeout(() => {
+            if (notification.parentNode) {
+                notification.parentNode.removeChild(notification);
+            }
+        }, 300);
+    }, 5000);
+}
+
+// Sidebar toggle
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebarOverlay');
+    sidebar.classList.toggle('open');
+    overlay.classList.toggle('open');
+}
+
+// Añadir animación CSS para notificaciones
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+    @keyframes slideOut {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+`;
+document.head.appendChild(style);
+
+// Inicializar cuando se carga la página
+window.addEventListener('load', function() {
+    // Establecer fechas por defecto para el filtro personalizado
+    const hoy = new Date();
+    const hace7Dias = new Date(hoy);
+    hace7Dias.setDate(hace7Dias.getDate() - 7);
+
+    const fechaDesde = document.getElementById('fechaDesde');
+    const fechaHasta = document.getElementById('fechaHasta');
+
+    if (fechaDesde) {
+        fechaDesde.value = hace7Dias.toISOString().split('T')[0];
+    }
+
+    if (fechaHasta) {
+        fechaHasta.value = hoy.toISOString().split('T')[0];
+    }
+});